@@ -2,7 +2,8 @@
 """
 Backfill ESPN NBA game probabilities (ESPN core API) across many seasons.
 
-This is a thin orchestrator that runs `scripts/backfill_espn_probabilities_season.py` season-by-season,
+This is a thin orchestrator that runs `scripts/backfill/backfill_espn_probabilities_season.py` season-by-season
+(in-process, via its main(argv)),
 using a broad default date window so it also covers atypical seasons (e.g. 2019-20 / 2020-21 timing).
 
 Default window:
@@ -28,12 +29,15 @@ from __future__ import annotations
 
 import argparse
 import os
-import subprocess
 import sys
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from pathlib import Path
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.backfill import backfill_espn_probabilities_season
+from scripts.lib._pipeline_lib import run_script_main
+
 
 def parse_season_start_year(season: str) -> int:
     s = season.strip()
@@ -195,11 +199,15 @@ def parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
+def _repo_path(repo_root: Path, path: str) -> str:
+    """Anchor a relative path at the repo root, as the old cwd=repo_root subprocesses did."""
+    p = Path(path)
+    return str(p if p.is_absolute() else repo_root / p)
+
+
 def run_one_season(repo_root: Path, sw: SeasonWindow, args: argparse.Namespace) -> int:
-    error_log = str(args.error_log_template).format(season=sw.season)
+    error_log = _repo_path(repo_root, str(args.error_log_template).format(season=sw.season))
     argv = [
-        sys.executable,
-        "scripts/backfill_espn_probabilities_season.py",
         "--season-label",
         sw.season,
         "--start-date",
@@ -207,7 +215,7 @@ def run_one_season(repo_root: Path, sw: SeasonWindow, args: argparse.Namespace)
         "--end-date",
         sw.end_date,
         "--out-root",
-        str(args.out_root),
+        _repo_path(repo_root, str(args.out_root)),
         "--workers",
         str(int(args.workers)),
         "--requests-per-second",
@@ -230,16 +238,15 @@ def run_one_season(repo_root: Path, sw: SeasonWindow, args: argparse.Namespace)
     if args.verbose:
         argv.append("--verbose")
 
-    p = subprocess.run(argv, cwd=str(repo_root), text=True)
-    return int(p.returncode)
+    return run_script_main(backfill_espn_probabilities_season.main, argv)
 
 
 def run_completeness_check(repo_root: Path, sw: SeasonWindow, args: argparse.Namespace) -> int:
-    error_log = str(args.error_log_template).format(season=sw.season)
-    report_out = str(args.check_report_template).format(season=sw.season)
+    error_log = _repo_path(repo_root, str(args.error_log_template).format(season=sw.season))
+    report_out = _repo_path(repo_root, str(args.check_report_template).format(season=sw.season))
+    from scripts.utils import check_espn_probabilities_completeness
+
     argv = [
-        sys.executable,
-        "scripts/check_espn_probabilities_completeness.py",
         "--season-label",
         sw.season,
         "--start-date",
@@ -247,7 +254,7 @@ def run_completeness_check(repo_root: Path, sw: SeasonWindow, args: argparse.Nam
         "--end-date",
         sw.end_date,
         "--out-root",
-        str(args.out_root),
+        _repo_path(repo_root, str(args.out_root)),
         "--error-log",
         error_log,
         "--show-missing",
@@ -255,8 +262,7 @@ def run_completeness_check(repo_root: Path, sw: SeasonWindow, args: argparse.Nam
         "--out",
         report_out,
     ]
-    p = subprocess.run(argv, cwd=str(repo_root), text=True)
-    return int(p.returncode)
+    return run_script_main(check_espn_probabilities_completeness.main, argv)
 
 
 def _utc_now_iso() -> str:
@@ -268,38 +274,33 @@ def run_db_load(repo_root: Path, args: argparse.Namespace) -> int:
     After backfill+checks succeed, migrate and load raw probability items[] into Postgres.
     This uses existing migrations + loader script:
       - db/migrations/022_derived_espn_probabilities_raw_items_table.sql
-      - scripts/load_espn_probabilities_raw_items.py
+      - scripts/load/load_espn_probabilities_raw_items.py
     """
+    from scripts.load import load_espn_probabilities_raw_items
+    from scripts.utils import migrate
+
     ts = _utc_now_iso()
     print(f"[espn_range] db_load start ts={ts}", flush=True)
 
-    env = dict(os.environ)
-    if args.dsn:
-        env["DATABASE_URL"] = str(args.dsn).strip()
-    dsn = str(env.get("DATABASE_URL") or "").strip()
+    dsn = str(args.dsn or os.environ.get("DATABASE_URL") or "").strip()
     if not dsn:
         print("[espn_range] db_load FAILED: missing DATABASE_URL (pass --dsn or set env DATABASE_URL)", flush=True)
         return 2
 
-    mig = subprocess.run(
-        [sys.executable, "scripts/migrate.py", "--dsn", dsn],
-        cwd=str(repo_root),
-        text=True,
-        env=env,
+    mig_code = run_script_main(
+        migrate.main, ["--dsn", dsn, "--migrations-dir", _repo_path(repo_root, "db/migrations")]
     )
-    if int(mig.returncode) != 0:
-        print(f"[espn_range] db_load FAILED migrate exit_code={mig.returncode}", flush=True)
-        return int(mig.returncode)
-
-    load = subprocess.run(
-        [sys.executable, "scripts/load_espn_probabilities_raw_items.py", "--dsn", dsn],
-        cwd=str(repo_root),
-        text=True,
-        env=env,
+    if mig_code != 0:
+        print(f"[espn_range] db_load FAILED migrate exit_code={mig_code}", flush=True)
+        return mig_code
+
+    load_code = run_script_main(
+        load_espn_probabilities_raw_items.main,
+        ["--dsn", dsn, "--probabilities-root", _repo_path(repo_root, "data/raw/espn/probabilities")],
     )
-    if int(load.returncode) != 0:
-        print(f"[espn_range] db_load FAILED loader exit_code={load.returncode}", flush=True)
-        return int(load.returncode)
+    if load_code != 0:
+        print(f"[espn_range] db_load FAILED loader exit_code={load_code}", flush=True)
+        return load_code
 
     print(f"[espn_range] db_load done ts={ts}", flush=True)
     return 0
@@ -311,7 +312,7 @@ def main() -> int:
     end_mmdd = _parse_mmdd(args.end_mmdd)
     seasons = compute_seasons(args)
 
-    repo_root = Path(__file__).resolve().parents[1]
+    repo_root = Path(__file__).resolve().parents[2]
     windows = [season_window(s, start_mmdd=start_mmdd, end_mmdd=end_mmdd) for s in seasons]
 
     print(f"[espn_range] seasons={seasons} out_root={args.out_root} start_mmdd={start_mmdd} end_mmdd={end_mmdd}", flush=True)
@@ -9,7 +9,9 @@ Output layout (recommended):
   data/raw/espn/scoreboard/scoreboard_{YYYYMMDD}.json
   data/raw/espn/probabilities/{season_label}/event_{event_id}_comp_{competition_id}.json
 
-This mirrors the repo's "raw JSON + .manifest.json" archive pattern.
+This mirrors the repo's "raw JSON + .manifest.json" archive pattern. With --archive-format zst the
+probabilities payloads are stored as event_..._comp_....json.zst instead (same manifest path), and
+--parquet-sidecar adds a flattened event_..._comp_....parquet next to each one.
 """
 
 from __future__ import annotations
@@ -27,7 +29,16 @@ from typing import Any
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from scripts.lib._fetch_lib import HttpRetry, http_get_bytes, parse_json_bytes, utc_now_iso_compact, write_with_manifest
+from scripts.lib._async_fetch_lib import AsyncFetcher, FetchCheckpoint, HostRateLimiter
+from scripts.lib._fetch_lib import (
+    ARCHIVE_FORMATS,
+    HttpRetry,
+    find_archive,
+    parse_json_bytes,
+    read_archive_bytes,
+    utc_now_iso_compact,
+    write_with_manifest,
+)
 
 
 ESPN_SCOREBOARD_BASE = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
@@ -98,7 +109,7 @@ def _extract_event_keys(scoreboard_obj: dict[str, Any]) -> list[EventKey]:
     return uniq
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Backfill ESPN NBA probabilities (win/game probability) for a date range.")
     p.add_argument("--season-label", default="2024-25", help="Used for output subdir, e.g. 2024-25")
     p.add_argument("--start-date", default="20241001", help="YYYYMMDD (default: 20241001)")
@@ -112,7 +123,13 @@ def parse_args() -> argparse.Namespace:
         "--requests-per-second",
         type=float,
         default=8.0,
-        help="Global max request rate across workers (best-effort). Set 0 to disable rate limiting.",
+        help="Max request rate per host across workers (token bucket, applied to retries too). Set 0 to disable.",
+    )
+    p.add_argument(
+        "--checkpoint",
+        default="data/reports/espn_probabilities_backfill_checkpoint_{season_label}.jsonl",
+        help="JSONL journal of finished event pairs (written or unsupported) so reruns skip them (supports {season_label}). "
+        "Empty string disables.",
     )
     p.add_argument(
         "--heartbeat-seconds",
@@ -132,6 +149,13 @@ def parse_args() -> argparse.Namespace:
         help="Write per-game errors here (supports {fetched_at_utc}).",
     )
     p.add_argument("--stop-on-error", action="store_true", help="If set, abort on the first probabilities fetch error.")
+    p.add_argument(
+        "--archive-format",
+        choices=ARCHIVE_FORMATS,
+        default="json",
+        help="Storage format for probabilities payloads (scoreboards are always plain JSON).",
+    )
+    p.add_argument("--parquet-sidecar", action="store_true", help="Also write a flattened Parquet sidecar per probabilities file.")
     p.add_argument("--timeout-seconds", type=float, default=20.0)
     p.add_argument("--deadline-seconds", type=float, default=180.0, help="Max total time allowed per request (caps retries).")
     p.add_argument("--max-attempts", type=int, default=6)
@@ -139,7 +163,7 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--max-backoff-seconds", type=float, default=60.0)
     p.add_argument("--jitter-seconds", type=float, default=0.25)
     p.add_argument("--verbose", action="store_true")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 def _maybe_sleep(seconds: float) -> None:
@@ -147,32 +171,6 @@ def _maybe_sleep(seconds: float) -> None:
         time.sleep(seconds)
 
 
-class _RateLimiter:
-    """
-    Very small global rate limiter (best-effort) for HTTP GET requests.
-    Enforces a minimum interval between requests across threads.
-    """
-
-    def __init__(self, requests_per_second: float) -> None:
-        self._rps = float(requests_per_second)
-        self._lock = threading.Lock()
-        self._next_allowed = 0.0
-
-    def wait(self) -> None:
-        if self._rps <= 0:
-            return
-        min_interval = 1.0 / self._rps
-        while True:
-            with self._lock:
-                now = time.monotonic()
-                if now >= self._next_allowed:
-                    self._next_allowed = now + min_interval
-                    return
-                sleep_for = self._next_allowed - now
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-
-
 def _safe_prefix(body: bytes, limit: int = 500) -> str:
     """
     Best-effort short text prefix for logging/debugging.
@@ -186,7 +184,7 @@ def _safe_prefix(body: bytes, limit: int = 500) -> str:
 
 
 def _existing_with_manifest(path: Path) -> bool:
-    return path.exists() and path.with_suffix(path.suffix + ".manifest.json").exists()
+    return find_archive(path) is not None and path.with_suffix(path.suffix + ".manifest.json").exists()
 
 
 def _scoreboard_for_date(
@@ -196,7 +194,7 @@ def _scoreboard_for_date(
     retry: HttpRetry,
     fetched_at: str,
     overwrite: bool,
-    rate_limiter: _RateLimiter,
+    fetcher: AsyncFetcher,
     throttle_seconds: float,
     verbose: bool,
 ) -> dict[str, Any]:
@@ -207,8 +205,7 @@ def _scoreboard_for_date(
     if overwrite or (not _existing_with_manifest(scoreboard_path)):
         if verbose:
             print(f"[{_ts()}] [espn] GET scoreboard ymd={ymd}", flush=True)
-        rate_limiter.wait()
-        status, resp_headers, body = http_get_bytes(scoreboard_url, retry=retry)
+        status, resp_headers, body = fetcher.get_blocking(scoreboard_url)
         scoreboard_obj = parse_json_bytes(body)
         write_with_manifest(
             scoreboard_path,
@@ -224,7 +221,7 @@ def _scoreboard_for_date(
         _maybe_sleep(throttle_seconds)
         return scoreboard_obj
 
-    return parse_json_bytes(scoreboard_path.read_bytes())
+    return parse_json_bytes(read_archive_bytes(find_archive(scoreboard_path) or scoreboard_path))
 
 
 def _fetch_probabilities_one(
@@ -234,9 +231,11 @@ def _fetch_probabilities_one(
     retry: HttpRetry,
     fetched_at: str,
     overwrite: bool,
-    rate_limiter: _RateLimiter,
+    fetcher: AsyncFetcher,
     throttle_seconds: float,
     verbose: bool,
+    archive_format: str = "json",
+    parquet_sidecar: bool = False,
 ) -> tuple[str, EventKey, dict[str, Any] | None]:
     """
     Returns (status, k, error_record).
@@ -263,8 +262,7 @@ def _fetch_probabilities_one(
     try:
         if verbose:
             print(f"[{_ts()}] [espn] GET probabilities event={k.event_id} comp={k.competition_id} date={k.date_yyyymmdd}", flush=True)
-        rate_limiter.wait()
-        status, resp_headers, body = http_get_bytes(prob_url, retry=retry, allow_non_200=True)
+        status, resp_headers, body = fetcher.get_blocking(prob_url, allow_non_200=True)
         if status != 200:
             ct = str(resp_headers.get("content-type") or "").replace("\\", "\\\\").replace('"', '\\"')
             return (
@@ -294,6 +292,8 @@ def _fetch_probabilities_one(
             source_type="espn_probabilities",
             source_key=f"{k.event_id}:{k.competition_id}",
             fetched_at_utc=fetched_at,
+            archive_format=archive_format,
+            parquet_sidecar=parquet_sidecar,
         )
         _maybe_sleep(throttle_seconds)
         return ("written", k, None)
@@ -312,8 +312,8 @@ def _fetch_probabilities_one(
         )
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
 
     start = _parse_yyyymmdd(args.start_date)
     end = _parse_yyyymmdd(args.end_date)
@@ -338,139 +338,158 @@ def main() -> int:
     error_log_path = Path(str(args.error_log).format(fetched_at_utc=fetched_at))
     error_log_path.parent.mkdir(parents=True, exist_ok=True)
 
-    rate_limiter = _RateLimiter(float(args.requests_per_second or 0.0))
     workers = max(1, int(args.workers))
-
-    written_prob_files = 0
-    skipped_prob_files = 0
-    total_event_pairs = 0
-    total_prob_errors = 0
-    total_prob_processed = 0
-    last_heartbeat = time.monotonic()
-
-    print(
-        f"[{_ts()}] [espn] backfill start season={args.season_label} start={start.strftime('%Y%m%d')} end={end.strftime('%Y%m%d')} "
-        f"days={len(dates)} out_root={out_root} error_log={error_log_path}",
-        flush=True,
-    )
-
-    # (1) Build a deterministic task list by scanning scoreboards (cached if present).
-    tasks: list[EventKey] = []
-    for i, d in enumerate(dates):
-        ymd = d.strftime("%Y%m%d")
-        if (i == 0) or (i == len(dates) - 1) or ((i + 1) % 30 == 0):
-            print(f"[{_ts()}] [espn] scoreboard_scan day={i+1}/{len(dates)} ymd={ymd}", flush=True)
-        scoreboard_obj = _scoreboard_for_date(
-            ymd=ymd,
-            scoreboard_dir=scoreboard_dir,
-            retry=retry,
-            fetched_at=fetched_at,
-            overwrite=bool(args.overwrite),
-            rate_limiter=rate_limiter,
-            throttle_seconds=float(args.throttle_seconds),
-            verbose=bool(args.verbose),
+    # Shared fetch engine: per-host token bucket + keep-alive sessions, sized to the worker pool.
+    # Closed on every exit path: this runs in-process under the update pipeline (run_script_main).
+    with AsyncFetcher(
+        retry=retry,
+        limiter=HostRateLimiter(float(args.requests_per_second or 0.0)),
+        concurrency=workers,
+    ) as fetcher:
+        checkpoint = (
+            FetchCheckpoint(Path(str(args.checkpoint).format(season_label=args.season_label))) if args.checkpoint else None
         )
-        keys = _extract_event_keys(scoreboard_obj)
-        # annotate date
-        keys = [EventKey(event_id=k.event_id, competition_id=k.competition_id, date_yyyymmdd=ymd) for k in keys]
-        total_event_pairs += len(keys)
-        tasks.extend(keys)
-
-    # de-dupe tasks by (event_id, competition_id), keeping the first date we saw it.
-    seen2: set[str] = set()
-    uniq_tasks: list[EventKey] = []
-    for k in tasks:
-        kk = f"{k.event_id}:{k.competition_id}"
-        if kk in seen2:
-            continue
-        seen2.add(kk)
-        uniq_tasks.append(k)
-
-    # Pre-filter: split into skipped vs to-fetch so --max-games applies to actual writes.
-    to_fetch: list[EventKey] = []
-    for k in uniq_tasks:
-        out_path = probs_dir / f"event_{k.event_id}_comp_{k.competition_id}.json"
-        if (not args.overwrite) and _existing_with_manifest(out_path):
-            skipped_prob_files += 1
-            total_prob_processed += 1
-            continue
-        to_fetch.append(k)
 
-    if args.max_games and int(args.max_games) > 0:
-        to_fetch = to_fetch[: int(args.max_games)]
-
-    print(
-        f"[{_ts()}] [espn] discovered unique_event_pairs={len(uniq_tasks)} already_cached={skipped_prob_files} to_fetch={len(to_fetch)} "
-        f"workers={workers} rps={float(args.requests_per_second or 0.0)}",
-        flush=True,
-    )
+        written_prob_files = 0
+        skipped_prob_files = 0
+        total_event_pairs = 0
+        total_prob_errors = 0
+        total_prob_processed = 0
+        last_heartbeat = time.monotonic()
+
+        print(
+            f"[{_ts()}] [espn] backfill start season={args.season_label} start={start.strftime('%Y%m%d')} end={end.strftime('%Y%m%d')} "
+            f"days={len(dates)} out_root={out_root} error_log={error_log_path}",
+            flush=True,
+        )
 
-    # (2) Fetch probabilities concurrently.
-    lock = threading.Lock()
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        futs = [
-            ex.submit(
-                _fetch_probabilities_one,
-                k=k,
-                probs_dir=probs_dir,
+        # (1) Build a deterministic task list by scanning scoreboards (cached if present).
+        tasks: list[EventKey] = []
+        for i, d in enumerate(dates):
+            ymd = d.strftime("%Y%m%d")
+            if (i == 0) or (i == len(dates) - 1) or ((i + 1) % 30 == 0):
+                print(f"[{_ts()}] [espn] scoreboard_scan day={i+1}/{len(dates)} ymd={ymd}", flush=True)
+            scoreboard_obj = _scoreboard_for_date(
+                ymd=ymd,
+                scoreboard_dir=scoreboard_dir,
                 retry=retry,
                 fetched_at=fetched_at,
                 overwrite=bool(args.overwrite),
-                rate_limiter=rate_limiter,
+                fetcher=fetcher,
                 throttle_seconds=float(args.throttle_seconds),
                 verbose=bool(args.verbose),
             )
-            for k in to_fetch
-        ]
-        for fut in as_completed(futs):
-            status, k, err = fut.result()
-            with lock:
+            keys = _extract_event_keys(scoreboard_obj)
+            # annotate date
+            keys = [EventKey(event_id=k.event_id, competition_id=k.competition_id, date_yyyymmdd=ymd) for k in keys]
+            total_event_pairs += len(keys)
+            tasks.extend(keys)
+
+        # de-dupe tasks by (event_id, competition_id), keeping the first date we saw it.
+        seen2: set[str] = set()
+        uniq_tasks: list[EventKey] = []
+        for k in tasks:
+            kk = f"{k.event_id}:{k.competition_id}"
+            if kk in seen2:
+                continue
+            seen2.add(kk)
+            uniq_tasks.append(k)
+
+        # Pre-filter: split into skipped vs to-fetch so --max-games applies to actual writes.
+        to_fetch: list[EventKey] = []
+        for k in uniq_tasks:
+            out_path = probs_dir / f"event_{k.event_id}_comp_{k.competition_id}.json"
+            if (not args.overwrite) and (
+                _existing_with_manifest(out_path) or (checkpoint is not None and checkpoint.is_done(f"{k.event_id}:{k.competition_id}"))
+            ):
+                skipped_prob_files += 1
                 total_prob_processed += 1
-                if status == "written":
-                    written_prob_files += 1
-                elif status == "skipped":
-                    skipped_prob_files += 1
-                else:
-                    total_prob_errors += 1
-
-                now = time.monotonic()
-                if args.heartbeat_seconds and args.heartbeat_seconds > 0 and (now - last_heartbeat) >= args.heartbeat_seconds:
-                    print(
-                        f"[espn] heartbeat processed={total_prob_processed} wrote={written_prob_files} "
-                        f"skipped={skipped_prob_files} errors={total_prob_errors}",
-                        flush=True,
-                    )
-                    last_heartbeat = now
-                if args.progress_every and args.progress_every > 0 and (total_prob_processed % int(args.progress_every) == 0):
-                    print(
-                        f"[{_ts()}] [espn] progress processed={total_prob_processed} wrote={written_prob_files} "
-                        f"skipped={skipped_prob_files} errors={total_prob_errors}",
-                        flush=True,
-                    )
-
-                if args.verbose:
-                    print(
-                        f"[{_ts()}] [espn] result status={status} event={k.event_id} comp={k.competition_id} date={k.date_yyyymmdd}",
-                        flush=True,
-                    )
-
-            if err is not None:
-                # Always print a compact error line (even without --verbose) so you can see failures in the log.
-                http_status = err.get("http_status")
-                body_prefix = str(err.get("body_prefix") or "")
-                is_unsupported = (http_status == 400) and ("Probabilities are not supported" in body_prefix)
-                tag = "UNSUPPORTED" if is_unsupported else "ERROR"
-                if is_unsupported or args.verbose:
-                    print(
-                        f"[{_ts()}] [espn] {tag} event={err.get('event_id')} comp={err.get('competition_id')} "
-                        f"date={err.get('date')} http_status={http_status} msg={err.get('error')}",
-                        flush=True,
-                    )
-                # JSONL append (single record per line). Keep atomic-ish by opening per write.
-                with error_log_path.open("a", encoding="utf-8") as f:
-                    f.write(json.dumps(err, sort_keys=True) + "\n")
-                if args.stop_on_error:
-                    raise RuntimeError(f"Stopping due to --stop-on-error. Last error: {err}")
+                continue
+            to_fetch.append(k)
+
+        if args.max_games and int(args.max_games) > 0:
+            to_fetch = to_fetch[: int(args.max_games)]
+
+        print(
+            f"[{_ts()}] [espn] discovered unique_event_pairs={len(uniq_tasks)} already_cached={skipped_prob_files} to_fetch={len(to_fetch)} "
+            f"workers={workers} rps={float(args.requests_per_second or 0.0)}",
+            flush=True,
+        )
+
+        # (2) Fetch probabilities concurrently.
+        lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futs = [
+                ex.submit(
+                    _fetch_probabilities_one,
+                    k=k,
+                    probs_dir=probs_dir,
+                    retry=retry,
+                    fetched_at=fetched_at,
+                    overwrite=bool(args.overwrite),
+                    fetcher=fetcher,
+                    throttle_seconds=float(args.throttle_seconds),
+                    verbose=bool(args.verbose),
+                    archive_format=str(args.archive_format),
+                    parquet_sidecar=bool(args.parquet_sidecar),
+                )
+                for k in to_fetch
+            ]
+            for fut in as_completed(futs):
+                status, k, err = fut.result()
+                if checkpoint is not None and (
+                    status == "written"
+                    or (err is not None and err.get("http_status") == 400 and "Probabilities are not supported" in str(err.get("body_prefix") or ""))
+                ):
+                    # Unsupported games are terminal; journal them too so a resume doesn't re-request them.
+                    checkpoint.mark_done(f"{k.event_id}:{k.competition_id}")
+                with lock:
+                    total_prob_processed += 1
+                    if status == "written":
+                        written_prob_files += 1
+                    elif status == "skipped":
+                        skipped_prob_files += 1
+                    else:
+                        total_prob_errors += 1
+
+                    now = time.monotonic()
+                    if args.heartbeat_seconds and args.heartbeat_seconds > 0 and (now - last_heartbeat) >= args.heartbeat_seconds:
+                        print(
+                            f"[espn] heartbeat processed={total_prob_processed} wrote={written_prob_files} "
+                            f"skipped={skipped_prob_files} errors={total_prob_errors}",
+                            flush=True,
+                        )
+                        last_heartbeat = now
+                    if args.progress_every and args.progress_every > 0 and (total_prob_processed % int(args.progress_every) == 0):
+                        print(
+                            f"[{_ts()}] [espn] progress processed={total_prob_processed} wrote={written_prob_files} "
+                            f"skipped={skipped_prob_files} errors={total_prob_errors}",
+                            flush=True,
+                        )
+
+                    if args.verbose:
+                        print(
+                            f"[{_ts()}] [espn] result status={status} event={k.event_id} comp={k.competition_id} date={k.date_yyyymmdd}",
+                            flush=True,
+                        )
+
+                if err is not None:
+                    # Always print a compact error line (even without --verbose) so you can see failures in the log.
+                    http_status = err.get("http_status")
+                    body_prefix = str(err.get("body_prefix") or "")
+                    is_unsupported = (http_status == 400) and ("Probabilities are not supported" in body_prefix)
+                    tag = "UNSUPPORTED" if is_unsupported else "ERROR"
+                    if is_unsupported or args.verbose:
+                        print(
+                            f"[{_ts()}] [espn] {tag} event={err.get('event_id')} comp={err.get('competition_id')} "
+                            f"date={err.get('date')} http_status={http_status} msg={err.get('error')}",
+                            flush=True,
+                        )
+                    # JSONL append (single record per line). Keep atomic-ish by opening per write.
+                    with error_log_path.open("a", encoding="utf-8") as f:
+                        f.write(json.dumps(err, sort_keys=True) + "\n")
+                    if args.stop_on_error:
+                        raise RuntimeError(f"Stopping due to --stop-on-error. Last error: {err}")
 
     print(
         f"[{_ts()}] Done. wrote_prob_files={written_prob_files} skipped_prob_files={skipped_prob_files} prob_errors={total_prob_errors} "
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Backfill derived.game_stats: precompute /games/{id}/stats for every completed game.
+
+Notes:
+  - Games are fetched and computed in batches (one set of queries per batch, see
+    webapp.api.endpoints.stats.compute_stats_batch) and each batch is written in one
+    transaction under the same advisory lock the API's write-behind queue uses.
+  - Idempotent by default: only games without a derived.game_stats row. Use --force to
+    recompute and overwrite every completed game.
+
+Usage:
+  # Precompute stats for completed games that don't have them yet:
+  ./.venv/bin/python scripts/backfill/backfill_game_stats.py --dsn "$DATABASE_URL"
+
+  # Recompute everything (e.g. after a metric change):
+  ./.venv/bin/python scripts/backfill/backfill_game_stats.py --dsn "$DATABASE_URL" --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from contextlib import nullcontext
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from scripts.lib._db_lib import connect, get_dsn
+from webapp.api.endpoints.stats import STATS_BATCH_SIZE, STATS_SEASON_LABEL, compute_stats_batch
+from webapp.api.stats_writer import GameStatsWriter
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Precompute derived.game_stats for completed games.")
+    p.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres DSN (or set DATABASE_URL).")
+    p.add_argument("--season", default=STATS_SEASON_LABEL, help=f"ESPN season label (default: {STATS_SEASON_LABEL}).")
+    p.add_argument("--batch-size", type=int, default=STATS_BATCH_SIZE, help="Games per batched fetch/write.")
+    p.add_argument("--limit", type=int, default=None, help="Stop after this many games.")
+    p.add_argument("--force", action="store_true", help="Recompute and overwrite games that already have stats.")
+    return p.parse_args()
+
+
+def list_games(conn, season: str, force: bool) -> list[str]:
+    """Completed games of the season (without stored stats unless force)."""
+    sql = f"""
+    WITH completed AS (
+        SELECT e.game_id
+        FROM espn.prob_event_state e
+        GROUP BY e.game_id
+        HAVING MAX(e.home_score) IS NOT NULL AND MAX(e.away_score) IS NOT NULL
+    )
+    SELECT c.game_id
+    FROM completed c
+    WHERE EXISTS (
+        SELECT 1 FROM espn.probabilities_raw_items p
+        WHERE p.game_id = c.game_id AND p.season_label = %s
+    )
+    {"" if force else "AND NOT EXISTS (SELECT 1 FROM derived.game_stats s WHERE s.game_id = c.game_id)"}
+    ORDER BY c.game_id
+    """
+    return [row[0] for row in conn.execute(sql, (season,)).fetchall()]
+
+
+def main() -> int:
+    args = parse_args()
+    dsn = get_dsn(args.dsn)
+    if args.batch_size < 1:
+        raise SystemExit("--batch-size must be >= 1")
+
+    with connect(dsn) as conn:
+        game_ids = list_games(conn, args.season, args.force)
+        if args.limit is not None:
+            game_ids = game_ids[:args.limit]
+        print(f"{len(game_ids)} completed games to compute (season={args.season}, force={args.force})")
+
+        # Synchronous use of the write-behind writer: flushed after every batch on this connection
+        writer = GameStatsWriter(lambda: nullcontext(conn), overwrite=args.force, autostart=False)
+        written = 0
+        started = time.monotonic()
+        for start in range(0, len(game_ids), args.batch_size):
+            batch = game_ids[start:start + args.batch_size]
+            stats = compute_stats_batch(conn, batch, use_stored=not args.force, writer=writer)
+            written += writer.flush()
+            if writer.pending:
+                raise SystemExit(f"Failed to write stats for {writer.pending} games (see log)")
+            print(f"  {start + len(batch)}/{len(game_ids)} games: computed {len(stats)}, written {written} "
+                  f"({time.monotonic() - started:.1f}s)")
+
+    print(f"Done: wrote stats for {written} games")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
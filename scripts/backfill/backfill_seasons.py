@@ -4,16 +4,19 @@ Backfill orchestrator: discover game IDs via nba_api, fetch CDN files (PBP + box
 then load PBP into Postgres.
 
 Design goals:
-- resumable (skip games already in game_ingestion_state unless --force)
+- resumable (checkpoint journal + skip games already in game_ingestion_state unless --force)
+- network-bound, not alternating: separate bounded pools for CDN fetches (--fetch-workers) and DB loads
+  (--workers), so fetches for later games overlap the load of earlier ones
 - bounded runtime (fetchers have hard deadlines)
-- machine-readable report (JSON Lines)
+- machine-readable report (JSON Lines) including games/min and fetched bytes/s
 
 Note:
-- This orchestrator uses the existing fetch/load scripts as subprocesses so behavior stays consistent.
+- This orchestrator calls the existing fetch/load scripts' main(argv) in-process (same CLI contract as running
+  them directly) and shares one Postgres connection pool across workers.
 - Boxscore is fetched/archived but not loaded (loader is optional and not implemented in Sprint 04).
 
 Usage:
-  python scripts/backfill_seasons.py --from 2023-24 --to 2023-24 --dsn "$DATABASE_URL" --workers 2
+  python scripts/backfill_seasons.py --from 2023-24 --to 2023-24 --dsn "$DATABASE_URL" --workers 2 --fetch-workers 8
 
   # Or: backfill the previous N seasons before an end season (exclusive by default)
   python scripts/backfill_seasons.py --end-season 2025-26 --seasons-back 10 --exclude 2023-24 --exclude 2024-25 --dsn "$DATABASE_URL"
@@ -25,14 +28,21 @@ import argparse
 import csv
 import json
 import os
-import subprocess
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.fetch import fetch_boxscore, fetch_pbp
+from scripts.lib._async_fetch_lib import FetchCheckpoint
+from scripts.lib._db_lib import ConnectionPool, connect, shared_connection_pool
+from scripts.lib._pipeline_lib import call_script_main
+from scripts.load import load_pbp
 
 import psycopg
 
@@ -41,7 +51,7 @@ def utc_now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Backfill NBA seasons: discover -> fetch -> load.")
     p.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres DSN (or set DATABASE_URL).")
     # Season selection mode A (explicit range)
@@ -61,7 +71,20 @@ def parse_args() -> argparse.Namespace:
         default=[],
         help="Exclude a season (repeatable), e.g. --exclude 2023-24 --exclude 2024-25",
     )
-    p.add_argument("--workers", type=int, default=2, help="Max concurrent game workers.")
+    p.add_argument("--workers", type=int, default=2, help="Max concurrent DB load workers (load_pbp).")
+    p.add_argument("--fetch-workers", type=int, default=8, help="Max concurrent CDN fetch workers (PBP + boxscore).")
+    p.add_argument(
+        "--max-fetched-ahead",
+        type=int,
+        default=0,
+        help="Max games fetched but not yet loaded (bounds disk/memory lead of fetch over load; 0 = 4x --workers).",
+    )
+    p.add_argument(
+        "--checkpoint",
+        default="",
+        help="Checkpoint journal path (default: data/reports/backfill_seasons.checkpoint.jsonl). Loaded games are skipped on rerun.",
+    )
+    p.add_argument("--progress-seconds", type=float, default=30.0, help="Write a throughput progress line this often (0 disables).")
     p.add_argument("--force", action="store_true", help="Reprocess games even if already ingested.")
     p.add_argument("--refetch", action="store_true", help="Refetch files even if already present.")
     p.add_argument(
@@ -83,7 +106,7 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--fetch-timeout-seconds", type=float, default=30.0)
     p.add_argument("--fetch-max-attempts", type=int, default=3)
     p.add_argument("--fetch-deadline-seconds", type=float, default=120.0)
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 def parse_season_start_year(season: str) -> int:
@@ -164,24 +187,13 @@ def compute_seasons(args: argparse.Namespace) -> list[str]:
     return seasons
 
 
-def run_cmd(argv: list[str], *, cwd: str, timeout_seconds: float | None = None) -> tuple[int, str, str]:
-    p = subprocess.run(
-        argv,
-        cwd=cwd,
-        capture_output=True,
-        text=True,
-        timeout=timeout_seconds,
-    )
-    return p.returncode, p.stdout, p.stderr
-
-
 def discover_game_ids(repo_root: str, season: str, throttle: float, deadline: float) -> Path:
+    from scripts.utils import discover_game_ids as discover  # nba_api import is slow; only pay it when discovering
+
     out_dir = Path(repo_root) / "data" / "discovery"
     out_dir.mkdir(parents=True, exist_ok=True)
     out_csv = out_dir / f"game_ids_{season}.csv"
     argv = [
-        sys.executable,
-        "scripts/discover_game_ids.py",
         "--season",
         season,
         "--out",
@@ -191,9 +203,10 @@ def discover_game_ids(repo_root: str, season: str, throttle: float, deadline: fl
         "--deadline-seconds",
         str(deadline),
     ]
-    code, out, err = run_cmd(argv, cwd=repo_root, timeout_seconds=deadline + 60)
-    if code != 0:
-        raise RuntimeError(f"discover_game_ids failed for {season}: {err or out}")
+    try:
+        call_script_main(discover.main, argv)
+    except RuntimeError as e:
+        raise RuntimeError(f"discover_game_ids failed for {season}: {e}") from None
     return out_csv
 
 
@@ -210,15 +223,22 @@ def read_game_ids(csv_path: Path) -> list[str]:
     return ids
 
 
-def already_ingested(conn: psycopg.Connection, game_id: str) -> bool:
-    row = conn.execute(
-        "SELECT last_success_at, last_seen_action_count FROM game_ingestion_state WHERE game_id=%s",
-        (game_id,),
-    ).fetchone()
-    if not row:
-        return False
-    last_success_at, last_seen_action_count = row
-    return last_success_at is not None and last_seen_action_count is not None
+def ingested_game_ids(conn: psycopg.Connection, game_ids: list[str]) -> set[str]:
+    """Return the subset of game_ids with a completed ingestion, in one round trip."""
+    rows = conn.execute(
+        """
+        SELECT game_id FROM game_ingestion_state
+        WHERE game_id = ANY(%s) AND last_success_at IS NOT NULL AND last_seen_action_count IS NOT NULL
+        """,
+        (game_ids,),
+    ).fetchall()
+    return {str(r[0]) for r in rows}
+
+
+@dataclass(frozen=True)
+class GameTask:
+    season: str
+    game_id: str
 
 
 @dataclass
@@ -229,92 +249,199 @@ class GameResult:
     step: str
     elapsed_ms: int
     error: str | None = None
+    fetch_ms: int = 0
+    load_ms: int = 0
+    bytes_fetched: int = 0
 
 
-def process_one_game(
+@dataclass
+class Throughput:
+    """Running totals for the JSONL report: games/min overall and bytes/s pulled from the CDN."""
+
+    started: float = field(default_factory=time.monotonic)
+    games_done: int = 0
+    games_succeeded: int = 0
+    bytes_fetched: int = 0
+    fetch_busy_seconds: float = 0.0
+    load_busy_seconds: float = 0.0
+
+    def record(self, r: GameResult) -> None:
+        self.games_done += 1
+        self.games_succeeded += int(r.status == "succeeded")
+        self.bytes_fetched += r.bytes_fetched
+        self.fetch_busy_seconds += r.fetch_ms / 1000.0
+        self.load_busy_seconds += r.load_ms / 1000.0
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed = max(1e-9, time.monotonic() - self.started)
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "games_done": self.games_done,
+            "games_succeeded": self.games_succeeded,
+            "games_per_min": round(self.games_succeeded * 60.0 / elapsed, 2),
+            "bytes_fetched": self.bytes_fetched,
+            "bytes_per_s": round(self.bytes_fetched / elapsed, 1),
+            "fetch_busy_seconds": round(self.fetch_busy_seconds, 3),
+            "load_busy_seconds": round(self.load_busy_seconds, 3),
+        }
+
+
+def _fetch_argv(game_id: str, out: Path, fetch_timeout: float, fetch_attempts: int, fetch_deadline: float) -> list[str]:
+    return [
+        "--game-id",
+        game_id,
+        "--out",
+        str(out),
+        "--timeout-seconds",
+        str(fetch_timeout),
+        "--max-attempts",
+        str(fetch_attempts),
+        "--deadline-seconds",
+        str(fetch_deadline),
+    ]
+
+
+def _needs_fetch(out: Path, refetch: bool) -> bool:
+    return refetch or (not out.exists()) or (not out.with_suffix(out.suffix + ".manifest.json").exists())
+
+
+def fetch_game_files(
     *,
     repo_root: str,
-    dsn: str,
     season: str,
     game_id: str,
-    force: bool,
     refetch: bool,
     skip_boxscore: bool,
     require_boxscore: bool,
     fetch_timeout: float,
     fetch_attempts: int,
     fetch_deadline: float,
-) -> GameResult:
+) -> int:
+    """Network stage: archive PBP (+ best-effort boxscore) for one game. Returns bytes written this run."""
+    pbp_out = Path(repo_root) / "data" / "raw" / "pbp" / f"{game_id}.json"
+    box_out = Path(repo_root) / "data" / "raw" / "boxscore" / f"{game_id}.json"
+    fetched = 0
+
+    if _needs_fetch(pbp_out, refetch):
+        try:
+            call_script_main(fetch_pbp.main, _fetch_argv(game_id, pbp_out, fetch_timeout, fetch_attempts, fetch_deadline))
+        except RuntimeError as e:
+            raise RuntimeError(f"fetch_pbp failed: {e}") from None
+        fetched += pbp_out.stat().st_size
+
+    # Boxscore is archive-only
+    if (not skip_boxscore) and _needs_fetch(box_out, refetch):
+        try:
+            call_script_main(fetch_boxscore.main, _fetch_argv(game_id, box_out, fetch_timeout, fetch_attempts, fetch_deadline))
+            fetched += box_out.stat().st_size
+        except RuntimeError as e:
+            msg = f"fetch_boxscore failed (continuing): {e}"
+            if require_boxscore:
+                raise RuntimeError(msg.replace("(continuing)", "(required)"))
+            print(f"WARN game_id={game_id} season={season} {msg}", flush=True)
+    return fetched
+
+
+def load_game(*, repo_root: str, dsn: str, game_id: str) -> None:
+    """DB stage: load archived PBP for one game."""
+    pbp_out = Path(repo_root) / "data" / "raw" / "pbp" / f"{game_id}.json"
+    argv = [
+        "--dsn",
+        dsn,
+        "--pbp-file",
+        str(pbp_out),
+        "--manifest-file",
+        str(pbp_out.with_suffix(pbp_out.suffix + ".manifest.json")),
+    ]
+    try:
+        call_script_main(load_pbp.main, argv)
+    except RuntimeError as e:
+        raise RuntimeError(f"load_pbp failed: {e}") from None
+
+
+def _timed(fn: Callable[[GameTask], Any], task: GameTask) -> tuple[Any, int, str | None]:
     t0 = time.monotonic()
     try:
-        with psycopg.connect(dsn) as conn:
-            if (not force) and already_ingested(conn, game_id):
-                return GameResult(game_id=game_id, season=season, status="skipped", step="check_state", elapsed_ms=int((time.monotonic() - t0) * 1000))
-
-        pbp_out = Path(repo_root) / "data" / "raw" / "pbp" / f"{game_id}.json"
-        box_out = Path(repo_root) / "data" / "raw" / "boxscore" / f"{game_id}.json"
-
-        # Fetch PBP
-        if refetch or (not pbp_out.exists()) or (not pbp_out.with_suffix(pbp_out.suffix + ".manifest.json").exists()):
-            argv = [
-                sys.executable,
-                "scripts/fetch_pbp.py",
-                "--game-id",
-                game_id,
-                "--out",
-                str(pbp_out),
-                "--timeout-seconds",
-                str(fetch_timeout),
-                "--max-attempts",
-                str(fetch_attempts),
-                "--deadline-seconds",
-                str(fetch_deadline),
-            ]
-            code, out, err = run_cmd(argv, cwd=repo_root, timeout_seconds=fetch_deadline + 30)
-            if code != 0:
-                raise RuntimeError(f"fetch_pbp failed: {err or out}")
-
-        # Fetch boxscore (archive-only)
-        if (not skip_boxscore) and (refetch or (not box_out.exists()) or (not box_out.with_suffix(box_out.suffix + ".manifest.json").exists())):
-            argv = [
-                sys.executable,
-                "scripts/fetch_boxscore.py",
-                "--game-id",
-                game_id,
-                "--out",
-                str(box_out),
-                "--timeout-seconds",
-                str(fetch_timeout),
-                "--max-attempts",
-                str(fetch_attempts),
-                "--deadline-seconds",
-                str(fetch_deadline),
-            ]
-            code, out, err = run_cmd(argv, cwd=repo_root, timeout_seconds=fetch_deadline + 30)
-            if code != 0:
-                msg = f"fetch_boxscore failed (continuing): {err or out}"
-                if require_boxscore:
-                    raise RuntimeError(msg.replace("(continuing)", "(required)"))
-                print(f"WARN game_id={game_id} season={season} {msg}", flush=True)
-
-        # Load PBP
-        argv = [
-            sys.executable,
-            "scripts/load_pbp.py",
-            "--dsn",
-            dsn,
-            "--pbp-file",
-            str(pbp_out),
-            "--manifest-file",
-            str(pbp_out.with_suffix(pbp_out.suffix + ".manifest.json")),
-        ]
-        code, out, err = run_cmd(argv, cwd=repo_root, timeout_seconds=300)
-        if code != 0:
-            raise RuntimeError(f"load_pbp failed: {err or out}")
-
-        return GameResult(game_id=game_id, season=season, status="succeeded", step="load_pbp", elapsed_ms=int((time.monotonic() - t0) * 1000))
-    except Exception as e:
-        return GameResult(game_id=game_id, season=season, status="failed", step="error", elapsed_ms=int((time.monotonic() - t0) * 1000), error=str(e))
+        value = fn(task)
+        return value, int((time.monotonic() - t0) * 1000), None
+    except Exception as e:  # noqa: BLE001
+        return None, int((time.monotonic() - t0) * 1000), str(e)
+
+
+def run_fetch_load_queue(
+    tasks: Iterable[GameTask],
+    fetch_fn: Callable[[GameTask], int],
+    load_fn: Callable[[GameTask], None],
+    *,
+    fetch_workers: int,
+    load_workers: int,
+    max_fetched_ahead: int = 0,
+    checkpoint: FetchCheckpoint | None = None,
+    on_result: Callable[[GameResult], None] | None = None,
+) -> list[GameResult]:
+    """
+    Two-stage work queue: `fetch_fn` runs on a pool of `fetch_workers`, and each fetched game is handed to a
+    separate pool of `load_workers` for `load_fn`, so the network never waits for the DB (or vice versa).
+
+    At most `fetch_workers + max_fetched_ahead` games are in flight, so a slow DB applies backpressure
+    instead of letting fetched-but-unloaded games pile up. Games already in `checkpoint` are skipped;
+    a game is journaled only after its load succeeds. `fetch_fn` returns the number of bytes it fetched.
+    """
+    fetch_workers = max(1, int(fetch_workers))
+    load_workers = max(1, int(load_workers))
+    max_in_flight = fetch_workers + (int(max_fetched_ahead) if max_fetched_ahead > 0 else 4 * load_workers)
+    results: list[GameResult] = []
+
+    def settle(r: GameResult) -> None:
+        results.append(r)
+        if on_result is not None:
+            on_result(r)
+
+    pending = deque(tasks)
+    in_flight: dict[Future[tuple[Any, int, str | None]], tuple[str, GameTask, int, int]] = {}
+    with ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="backfill_fetch") as fetch_ex, ThreadPoolExecutor(
+        max_workers=load_workers, thread_name_prefix="backfill_load"
+    ) as load_ex:
+        while pending or in_flight:
+            while pending and len(in_flight) < max_in_flight:
+                task = pending.popleft()
+                if checkpoint is not None and checkpoint.is_done(task.game_id):
+                    settle(GameResult(game_id=task.game_id, season=task.season, status="skipped", step="checkpoint", elapsed_ms=0))
+                    continue
+                in_flight[fetch_ex.submit(_timed, fetch_fn, task)] = ("fetch", task, 0, 0)
+            if not in_flight:
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                stage, task, fetch_ms, fetched = in_flight.pop(fut)
+                value, ms, error = fut.result()
+                if stage == "fetch":
+                    if error is not None:
+                        settle(
+                            GameResult(
+                                game_id=task.game_id, season=task.season, status="failed", step="fetch",
+                                elapsed_ms=ms, error=error, fetch_ms=ms,
+                            )
+                        )
+                        continue
+                    in_flight[load_ex.submit(_timed, load_fn, task)] = ("load", task, ms, int(value or 0))
+                    continue
+                if error is None and checkpoint is not None:
+                    checkpoint.mark_done(task.game_id)
+                settle(
+                    GameResult(
+                        game_id=task.game_id,
+                        season=task.season,
+                        status="failed" if error else "succeeded",
+                        step="load_pbp",
+                        elapsed_ms=fetch_ms + ms,
+                        error=error,
+                        fetch_ms=fetch_ms,
+                        load_ms=ms,
+                        bytes_fetched=fetched,
+                    )
+                )
+    return results
 
 
 def write_jsonl(path: Path, rows: Iterable[dict[str, Any]]) -> None:
@@ -324,14 +451,17 @@ def write_jsonl(path: Path, rows: Iterable[dict[str, Any]]) -> None:
             f.write(json.dumps(r, sort_keys=True) + "\n")
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     if not args.dsn:
         raise SystemExit("Missing --dsn and DATABASE_URL is not set.")
 
-    repo_root = str(Path(__file__).resolve().parents[1])
+    repo_root = str(Path(__file__).resolve().parents[2])
     ts = utc_now_iso()
     report_path = Path(args.report_out) if args.report_out else Path(repo_root) / "data" / "reports" / f"backfill_{ts}.jsonl"
+    checkpoint_path = (
+        Path(args.checkpoint) if args.checkpoint else Path(repo_root) / "data" / "reports" / "backfill_seasons.checkpoint.jsonl"
+    )
 
     seasons = compute_seasons(args)
 
@@ -343,70 +473,126 @@ def main() -> int:
         season_to_games[s] = gids
 
     # Flatten into tasks
-    tasks: list[tuple[str, str]] = []
+    tasks: list[GameTask] = []
     for s in seasons:
         for gid in season_to_games[s]:
-            tasks.append((s, gid))
+            tasks.append(GameTask(season=s, game_id=gid))
     if args.limit_games and args.limit_games > 0:
         tasks = tasks[: args.limit_games]
 
-    print(f"Processing games: {len(tasks)} across seasons={seasons} workers={args.workers}", flush=True)
-    write_jsonl(report_path, [{"type": "start", "ts": ts, "seasons": seasons, "workers": args.workers, "count": len(tasks)}])
+    fetch_workers = max(1, args.fetch_workers)
+    load_workers = max(1, args.workers)
+    print(
+        f"Processing games: {len(tasks)} across seasons={seasons} fetch_workers={fetch_workers} load_workers={load_workers}",
+        flush=True,
+    )
+    write_jsonl(
+        report_path,
+        [
+            {
+                "type": "start",
+                "ts": ts,
+                "seasons": seasons,
+                "workers": load_workers,
+                "fetch_workers": fetch_workers,
+                "checkpoint": str(checkpoint_path),
+                "count": len(tasks),
+            }
+        ],
+    )
 
-    results: list[GameResult] = []
-    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
-        futs = [
-            ex.submit(
-                process_one_game,
+    throughput = Throughput()
+    last_progress = time.monotonic()
+
+    def on_result(r: GameResult) -> None:
+        nonlocal last_progress
+        throughput.record(r)
+        write_jsonl(
+            report_path,
+            [
+                {
+                    "type": "game",
+                    "season": r.season,
+                    "game_id": r.game_id,
+                    "status": r.status,
+                    "step": r.step,
+                    "elapsed_ms": r.elapsed_ms,
+                    "fetch_ms": r.fetch_ms,
+                    "load_ms": r.load_ms,
+                    "bytes_fetched": r.bytes_fetched,
+                    "error": r.error,
+                }
+            ],
+        )
+        print(
+            f"{r.status.upper():9} game_id={r.game_id} season={r.season} fetch_ms={r.fetch_ms} load_ms={r.load_ms}"
+            + (f" err={r.error}" if r.error else ""),
+            flush=True,
+        )
+        now = time.monotonic()
+        if args.progress_seconds and args.progress_seconds > 0 and (now - last_progress) >= args.progress_seconds:
+            snap = throughput.snapshot()
+            write_jsonl(report_path, [{"type": "progress", "ts": utc_now_iso(), "total": len(tasks), **snap}])
+            print(
+                f"[progress] {snap['games_done']}/{len(tasks)} games_per_min={snap['games_per_min']} "
+                f"bytes_per_s={snap['bytes_per_s']}",
+                flush=True,
+            )
+            last_progress = now
+
+    pool = ConnectionPool(args.dsn, max_size=load_workers + 1)
+    with shared_connection_pool(pool):
+        if not args.force:
+            with connect(args.dsn) as conn:
+                done = ingested_game_ids(conn, [t.game_id for t in tasks])
+            for t in tasks:
+                if t.game_id in done:
+                    on_result(GameResult(game_id=t.game_id, season=t.season, status="skipped", step="check_state", elapsed_ms=0))
+            tasks_to_run = [t for t in tasks if t.game_id not in done]
+        else:
+            tasks_to_run = tasks
+
+        results = run_fetch_load_queue(
+            tasks_to_run,
+            lambda t: fetch_game_files(
                 repo_root=repo_root,
-                dsn=args.dsn,
-                season=s,
-                game_id=gid,
-                force=args.force,
+                season=t.season,
+                game_id=t.game_id,
                 refetch=args.refetch,
                 skip_boxscore=bool(args.skip_boxscore),
                 require_boxscore=bool(args.require_boxscore),
                 fetch_timeout=args.fetch_timeout_seconds,
                 fetch_attempts=args.fetch_max_attempts,
                 fetch_deadline=args.fetch_deadline_seconds,
-            )
-            for s, gid in tasks
-        ]
-        for fut in as_completed(futs):
-            r = fut.result()
-            results.append(r)
-            write_jsonl(
-                report_path,
-                [
-                    {
-                        "type": "game",
-                        "season": r.season,
-                        "game_id": r.game_id,
-                        "status": r.status,
-                        "step": r.step,
-                        "elapsed_ms": r.elapsed_ms,
-                        "error": r.error,
-                    }
-                ],
-            )
-            print(
-                f"{r.status.upper():9} game_id={r.game_id} season={r.season} elapsed_ms={r.elapsed_ms}"
-                + (f" err={r.error}" if r.error else ""),
-                flush=True,
-            )
+            ),
+            lambda t: load_game(repo_root=repo_root, dsn=args.dsn, game_id=t.game_id),
+            fetch_workers=fetch_workers,
+            load_workers=load_workers,
+            max_fetched_ahead=args.max_fetched_ahead,
+            # --force reprocesses everything, so don't consult the journal (successes are still recorded by the DB state).
+            checkpoint=None if args.force else FetchCheckpoint(checkpoint_path),
+            on_result=on_result,
+        )
 
     # Summary
+    skipped_pre = len(tasks) - len(tasks_to_run)
     succeeded = sum(1 for r in results if r.status == "succeeded")
-    skipped = sum(1 for r in results if r.status == "skipped")
+    skipped = skipped_pre + sum(1 for r in results if r.status == "skipped")
     failed = sum(1 for r in results if r.status == "failed")
-    write_jsonl(report_path, [{"type": "summary", "ts": utc_now_iso(), "succeeded": succeeded, "skipped": skipped, "failed": failed}])
+    snap = throughput.snapshot()
+    write_jsonl(
+        report_path,
+        [{"type": "summary", "ts": utc_now_iso(), "succeeded": succeeded, "skipped": skipped, "failed": failed, **snap}],
+    )
 
-    print(f"Done. succeeded={succeeded} skipped={skipped} failed={failed}", flush=True)
+    print(
+        f"Done. succeeded={succeeded} skipped={skipped} failed={failed} "
+        f"games_per_min={snap['games_per_min']} bytes_per_s={snap['bytes_per_s']}",
+        flush=True,
+    )
     print(f"Report: {report_path}", flush=True)
     return 0 if failed == 0 else 2
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
-
@@ -29,18 +29,19 @@ import argparse
 import json
 import os
 from pathlib import Path
+from typing import Iterator
 
 import psycopg
 import pyarrow as pa
-import pyarrow.parquet as pq
 
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from scripts.lib._db_lib import get_dsn
 from scripts.lib._winprob_lib import utc_now_iso_compact
+from scripts.lib._winprob_stream_lib import write_batches
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Export regulation-safe winprob modeling events to Parquet.")
     p.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres DSN (or set DATABASE_URL).")
     p.add_argument("--out", required=True, help="Output Parquet path.")
@@ -64,7 +65,7 @@ def parse_args() -> argparse.Namespace:
         default=0,
         help="If >0, restrict to the first N game_id values (sorted ascending) after filtering. Deterministic.",
     )
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 _COL_TYPES: dict[str, pa.DataType] = {
@@ -87,8 +88,55 @@ def _rows_to_record_batch(names: list[str], rows: list[tuple[object, ...]]) -> p
     return pa.RecordBatch.from_arrays(arrays, names=names)
 
 
-def main() -> int:
-    args = parse_args()
+EVENTS_SCHEMA = pa.schema([pa.field(n, t) for n, t in _COL_TYPES.items()])
+
+
+_EVENTS_SQL = """
+WITH base AS (
+  SELECT
+    s.game_id,
+    s.event_id,
+    (2000 + substring(s.game_id from 4 for 2)::int)::smallint AS season_start,
+    s.point_differential,
+    gs.seconds_remaining_regulation AS time_remaining_regulation,
+    s.possession_side,
+    s.final_winning_team
+  FROM derived.pbp_event_state s
+  JOIN derived.game_state_by_event gs
+    ON gs.event_id = s.event_id
+  WHERE gs.period <= 4
+    AND gs.seconds_remaining_regulation IS NOT NULL
+    AND (%s = 0 OR (2000 + substring(s.game_id from 4 for 2)::int) = %s)
+),
+games_sel AS (
+  SELECT DISTINCT game_id
+  FROM base
+  ORDER BY game_id
+  LIMIT (CASE WHEN %s <= 0 THEN 2147483647 ELSE %s END)
+)
+SELECT b.*
+FROM base b
+JOIN games_sel g ON g.game_id = b.game_id
+ORDER BY b.game_id, b.event_id
+"""
+
+
+def iter_event_batches(
+    conn: psycopg.Connection, *, season_start: int = 0, limit_games: int = 0, chunk_rows: int = 200_000
+) -> Iterator[pa.RecordBatch]:
+    """Stream the modeling events (ordered by game_id, event_id) as record batches of at most chunk_rows rows."""
+    with conn.cursor() as cur:
+        cur.execute(_EVENTS_SQL, (season_start, season_start, limit_games, limit_games))
+        names = [d.name for d in cur.description]
+        while True:
+            rows = cur.fetchmany(int(chunk_rows))
+            if not rows:
+                break
+            yield _rows_to_record_batch(names, rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     dsn = get_dsn(args.dsn)
 
     out_path = Path(args.out)
@@ -102,53 +150,14 @@ def main() -> int:
     season_start = int(args.season_start or 0)
     limit_games = int(args.limit_games or 0)
 
-    sql = """
-    WITH base AS (
-      SELECT
-        s.game_id,
-        s.event_id,
-        (2000 + substring(s.game_id from 4 for 2)::int)::smallint AS season_start,
-        s.point_differential,
-        gs.seconds_remaining_regulation AS time_remaining_regulation,
-        s.possession_side,
-        s.final_winning_team
-      FROM derived.pbp_event_state s
-      JOIN derived.game_state_by_event gs
-        ON gs.event_id = s.event_id
-      WHERE gs.period <= 4
-        AND gs.seconds_remaining_regulation IS NOT NULL
-        AND (%s = 0 OR (2000 + substring(s.game_id from 4 for 2)::int) = %s)
-    ),
-    games_sel AS (
-      SELECT DISTINCT game_id
-      FROM base
-      ORDER BY game_id
-      LIMIT (CASE WHEN %s <= 0 THEN 2147483647 ELSE %s END)
-    )
-    SELECT b.*
-    FROM base b
-    JOIN games_sel g ON g.game_id = b.game_id
-    ORDER BY b.game_id, b.event_id
-    """
-
-    total_rows = 0
-    writer: pq.ParquetWriter | None = None
+    # Rows go to <out>.tmp; it is renamed to <out> only after the manifest stats query succeeds.
     with psycopg.connect(dsn) as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql, (season_start, season_start, limit_games, limit_games))
-            names = [d.name for d in cur.description]
-            schema = pa.schema([pa.field(n, _COL_TYPES.get(n, pa.null())) for n in names])
-            writer = pq.ParquetWriter(tmp_path, schema, compression=compression)
-            try:
-                while True:
-                    rows = cur.fetchmany(int(args.chunk_rows))
-                    if not rows:
-                        break
-                    batch = _rows_to_record_batch(names, rows)
-                    writer.write_batch(batch)
-                    total_rows += len(rows)
-            finally:
-                writer.close()
+        total_rows = write_batches(
+            tmp_path,
+            iter_event_batches(conn, season_start=season_start, limit_games=limit_games, chunk_rows=int(args.chunk_rows)),
+            EVENTS_SCHEMA,
+            compression=compression,
+        )
 
         # Manifest stats from DB (same filters as the export).
         stats = conn.execute(
@@ -18,10 +18,17 @@ from pathlib import Path
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from scripts.lib._fetch_lib import HttpRetry, http_get_bytes, parse_json_bytes, utc_now_iso_compact, write_with_manifest
+from scripts.lib._fetch_lib import (
+    ARCHIVE_FORMATS,
+    HttpRetry,
+    http_get_bytes,
+    parse_json_bytes,
+    utc_now_iso_compact,
+    write_with_manifest,
+)
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Fetch ESPN probabilities JSON for an NBA event/competition.")
     p.add_argument("--event-id", required=True, help="ESPN event id, e.g. 401585021")
     p.add_argument("--competition-id", required=True, help="ESPN competition id (from scoreboard competitions[].id)")
@@ -36,11 +43,18 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--base-backoff-seconds", type=float, default=1.0)
     p.add_argument("--max-backoff-seconds", type=float, default=60.0)
     p.add_argument("--jitter-seconds", type=float, default=0.25)
-    return p.parse_args()
+    p.add_argument(
+        "--archive-format",
+        choices=ARCHIVE_FORMATS,
+        default="json",
+        help="How to store the payload: plain JSON or zstd-compressed (<out>.zst). Manifest stays at <out>.manifest.json.",
+    )
+    p.add_argument("--parquet-sidecar", action="store_true", help="Also write a flattened <out>.parquet of items[].")
+    return p.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     event_id = str(args.event_id).strip()
     competition_id = str(args.competition_id).strip()
     if not event_id.isdigit():
@@ -74,7 +88,7 @@ def main() -> int:
     manifest_path = out_path.with_suffix(out_path.suffix + ".manifest.json")
     fetched_at = utc_now_iso_compact()
 
-    write_with_manifest(
+    stored_path = write_with_manifest(
         out_path,
         manifest_path,
         url=url,
@@ -84,9 +98,11 @@ def main() -> int:
         source_type="espn_probabilities",
         source_key=f"{event_id}:{competition_id}",
         fetched_at_utc=fetched_at,
+        archive_format=args.archive_format,
+        parquet_sidecar=bool(args.parquet_sidecar),
     )
 
-    print(f"Wrote {out_path} (+ manifest). event_id={event_id} competition_id={competition_id}")
+    print(f"Wrote {stored_path} (+ manifest). event_id={event_id} competition_id={competition_id}")
     return 0
 
 
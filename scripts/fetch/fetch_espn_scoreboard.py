@@ -21,7 +21,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from scripts.lib._fetch_lib import HttpRetry, http_get_bytes, parse_json_bytes, utc_now_iso_compact, write_with_manifest
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Fetch ESPN NBA scoreboard JSON for a specific date.")
     p.add_argument("--date", required=True, help="Date in YYYYMMDD format, e.g. 20241022")
     p.add_argument("--out", required=True, help="Output JSON path, e.g. data/raw/espn/scoreboard/scoreboard_20241022.json")
@@ -31,11 +31,11 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--base-backoff-seconds", type=float, default=1.0)
     p.add_argument("--max-backoff-seconds", type=float, default=60.0)
     p.add_argument("--jitter-seconds", type=float, default=0.25)
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     date = str(args.date).strip()
     if len(date) != 8 or not date.isdigit():
         raise SystemExit("--date must be YYYYMMDD")
@@ -6,6 +6,8 @@ Design Pattern: Batch Fetch with Pagination
 - Queries database for past games that have Kalshi markets
 - Fetches trades for each market ticker with pagination
 - Stores raw JSON responses with manifests
+- Each ticker's file is written (and journaled in --checkpoint) as soon as its cursor chain ends,
+  so an interrupted run resumes with the tickers it had not finished
 
 Algorithm: Linear scan O(n) where n = number of markets
 Big O: O(n) time, O(n) space for paginated trade responses
@@ -13,13 +15,15 @@ Big O: O(n) time, O(n) space for paginated trade responses
 Usage:
   python scripts/fetch_kalshi_trades.py --dsn "$DATABASE_URL"
   python scripts/fetch_kalshi_trades.py --dsn "$DATABASE_URL" --limit 10  # for testing
+  python scripts/fetch_kalshi_trades.py --dsn "$DATABASE_URL" --concurrency 8 --requests-per-second 10
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import base64
-import hashlib
+import functools
 import json
 import logging
 import sys
@@ -41,8 +45,18 @@ import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from scripts.lib._async_fetch_lib import AsyncFetcher, FetchCheckpoint, FetchResult, HostRateLimiter
 from scripts.lib._db_lib import get_dsn, parse_iso8601_z
-from scripts.lib._fetch_lib import HttpRetry, http_get_bytes, parse_json_bytes, utc_now_iso_compact, write_with_manifest
+from scripts.lib._fetch_lib import (
+    ARCHIVE_FORMATS,
+    HttpRetry,
+    find_archive,
+    http_get_bytes,
+    parse_json_bytes,
+    read_archive_bytes,
+    utc_now_iso_compact,
+    write_with_manifest,
+)
 
 # Configure verbose logging
 logging.basicConfig(
@@ -96,6 +110,106 @@ def sign_request(private_key_pem: bytes, timestamp: str, method: str, path: str)
     return base64.b64encode(signature).decode("utf-8")
 
 
+KALSHI_TRADE_API_BASE = "https://api.elections.kalshi.com/trade-api/v2"
+
+
+def _trades_url(
+    ticker: str | None,
+    limit: int,
+    cursor: str | None,
+    min_ts: int | None,
+    max_ts: int | None,
+) -> str:
+    query_params: dict[str, Any] = {}
+    if limit:
+        query_params["limit"] = limit
+    if cursor:
+        query_params["cursor"] = cursor
+    if ticker:
+        query_params["ticker"] = ticker
+    if min_ts:
+        query_params["min_ts"] = min_ts
+    if max_ts:
+        query_params["max_ts"] = max_ts
+    query_string = urlencode(query_params)
+    return f"{KALSHI_TRADE_API_BASE}/markets/trades?{query_string}" if query_string else f"{KALSHI_TRADE_API_BASE}/markets/trades"
+
+
+def _auth_headers(api_key_id: str, private_key_pem: bytes) -> dict[str, str]:
+    """Signed headers for GET /markets/trades (signature covers path only, not the query string)."""
+    timestamp = str(int(time.time() * 1000))
+    signature = sign_request(private_key_pem, timestamp, "GET", "/trade-api/v2/markets/trades")
+    return {
+        "Accept": "application/json",
+        "KALSHI-ACCESS-KEY": api_key_id,
+        "KALSHI-ACCESS-SIGNATURE": signature,
+        "KALSHI-ACCESS-TIMESTAMP": timestamp,
+    }
+
+
+def _filter_trades_to_window(
+    trades: list[dict[str, Any]],
+    min_ts: int | None,
+    max_ts: int | None,
+) -> tuple[list[dict[str, Any]], int, float]:
+    """
+    Keep trades inside [min_ts, max_ts] and sum the page volume (price * count, all trades received).
+
+    Returns (kept_trades, filtered_out_count, page_volume_dollars).
+    """
+    page_volume = 0.0
+    for trade in trades:
+        page_volume += trade.get("count", 0) * trade.get("price", 0.0)
+    if min_ts is None and max_ts is None:
+        return trades, 0, page_volume
+    
+    kept: list[dict[str, Any]] = []
+    filtered_out = 0
+    for trade in trades:
+        trade_ts_str = trade.get("created_time", "")
+        if not trade_ts_str:
+            # Include trades without timestamp (shouldn't happen)
+            kept.append(trade)
+            continue
+        try:
+            trade_dt = datetime.fromisoformat(trade_ts_str.replace("Z", "+00:00"))
+            trade_ts = int(trade_dt.timestamp())
+        except (ValueError, TypeError) as e:
+            logger.debug(f"      Could not parse trade timestamp: {trade_ts_str}: {e}")
+            # Include trade if we can't parse timestamp (shouldn't happen)
+            kept.append(trade)
+            continue
+        if (min_ts is not None and trade_ts < min_ts) or (max_ts is not None and trade_ts > max_ts):
+            filtered_out += 1
+        else:
+            kept.append(trade)
+    return kept, filtered_out, page_volume
+
+
+def _save_trades_page(
+    pages_dir: Path,
+    page_num: int,
+    ticker: str,
+    response: dict[str, Any],
+    min_ts: int | None,
+    max_ts: int | None,
+) -> str:
+    page_file = pages_dir / f"page_{page_num:05d}.json"
+    page_data = {
+        "page_num": page_num,
+        "ticker": ticker,
+        "fetch_timestamp": datetime.now(timezone.utc).isoformat(),
+        "cursor": response.get("cursor"),
+        "trades_count": len(response.get("trades", [])),
+        "min_ts": min_ts,
+        "max_ts": max_ts,
+        "raw_response": response,  # Store full response
+    }
+    page_file.write_text(json.dumps(page_data, indent=2, default=str), encoding="utf-8")
+    logger.debug(f"    Saved page response: {page_file}")
+    return str(page_file)
+
+
 def fetch_trades_with_auth(
     api_key_id: str,
     private_key_pem: bytes,
@@ -133,22 +247,12 @@ def fetch_trades_with_auth(
     log_url = url.replace(f"cursor={cursor}", f"cursor={cursor[:20]}...") if cursor and len(cursor) > 20 else url
     logger.debug(f"Request URL: {log_url}")
     
-    # Sign the request - path should be /trade-api/v2/markets/trades (without query string)
-    timestamp = str(int(time.time() * 1000))  # milliseconds
-    method = "GET"
-    url_path = f"/trade-api/v2{endpoint_path}"  # Path without query string for signing
-    
-    logger.debug(f"Signing request: method={method}, path={url_path}, timestamp={timestamp}")
-    signature = sign_request(private_key_pem, timestamp, method, url_path)
-    logger.debug(f"Signature generated: {signature[:20]}...")
-    
-    # Make the request
-    headers = {
-        "Accept": "application/json",
-        "KALSHI-ACCESS-KEY": api_key_id,
-        "KALSHI-ACCESS-SIGNATURE": signature,
-        "KALSHI-ACCESS-TIMESTAMP": timestamp,
-    }
+    # Sign per attempt (path /trade-api/v2/markets/trades, without query string): a retry after a
+    # backoff must not replay an expired signature
+    def headers() -> dict[str, str]:
+        hdrs = _auth_headers(api_key_id, private_key_pem)
+        logger.debug(f"Signed request: timestamp={hdrs['KALSHI-ACCESS-TIMESTAMP']}")
+        return hdrs
     
     retry = HttpRetry(
         max_attempts=6,
@@ -255,69 +359,14 @@ def fetch_all_trades_for_ticker(
             
             # Save raw page response if pages_dir provided
             if pages_dir and response:
-                page_file = pages_dir / f"page_{page_num:05d}.json"
-                page_data = {
-                    "page_num": page_num,
-                    "ticker": ticker,
-                    "fetch_timestamp": datetime.now(timezone.utc).isoformat(),
-                    "cursor": response.get("cursor"),
-                    "trades_count": len(trades),
-                    "min_ts": min_ts,
-                    "max_ts": max_ts,
-                    "raw_response": response,  # Store full response
-                }
-                page_file.write_text(json.dumps(page_data, indent=2, default=str), encoding="utf-8")
-                pages_saved.append(str(page_file))
-                logger.debug(f"    Saved page response: {page_file}")
+                pages_saved.append(_save_trades_page(pages_dir, page_num, ticker, response, min_ts, max_ts))
             
             if trades:
                 # Client-side filtering as backup (API filter may not work correctly)
-                # Filter trades to only include those within the time window
-                filtered_trades = []
-                page_volume = 0.0
-                
-                if min_ts is not None or max_ts is not None:
-                    for trade in trades:
-                        # Calculate volume: price * count (in dollars)
-                        trade_count = trade.get("count", 0)
-                        trade_price = trade.get("price", 0.0)
-                        trade_volume = trade_count * trade_price
-                        page_volume += trade_volume
-                        
-                        trade_ts_str = trade.get("created_time", "")
-                        if trade_ts_str:
-                            try:
-                                trade_dt = datetime.fromisoformat(trade_ts_str.replace("Z", "+00:00"))
-                                trade_ts = int(trade_dt.timestamp())
-                                
-                                # Check if trade is within window
-                                in_window = True
-                                if min_ts is not None and trade_ts < min_ts:
-                                    in_window = False
-                                if max_ts is not None and trade_ts > max_ts:
-                                    in_window = False
-                                
-                                if in_window:
-                                    filtered_trades.append(trade)
-                                else:
-                                    total_trades_filtered += 1
-                            except (ValueError, TypeError) as e:
-                                logger.debug(f"      Could not parse trade timestamp: {trade_ts_str}: {e}")
-                                # Include trade if we can't parse timestamp (shouldn't happen)
-                                filtered_trades.append(trade)
-                        else:
-                            # Include trades without timestamp (shouldn't happen)
-                            filtered_trades.append(trade)
-                    
-                    if len(filtered_trades) < len(trades):
-                        logger.debug(f"    Filtered {len(trades) - len(filtered_trades)} trades outside time window")
-                else:
-                    # No time window, include all trades and calculate volume
-                    filtered_trades = trades
-                    for trade in trades:
-                        trade_count = trade.get("count", 0)
-                        trade_price = trade.get("price", 0.0)
-                        page_volume += trade_count * trade_price
+                filtered_trades, page_filtered, page_volume = _filter_trades_to_window(trades, min_ts, max_ts)
+                total_trades_filtered += page_filtered
+                if page_filtered:
+                    logger.debug(f"    Filtered {page_filtered} trades outside time window")
                 
                 total_volume_dollars += page_volume
                 all_trades.extend(filtered_trades)
@@ -380,6 +429,280 @@ def fetch_all_trades_for_ticker(
     return all_trades, stats
 
 
+async def fetch_all_trades_for_ticker_async(
+    fetcher: AsyncFetcher,
+    api_key_id: str,
+    private_key_pem: bytes,
+    ticker: str,
+    limit: int = 1000,
+    min_ts: int | None = None,
+    max_ts: int | None = None,
+    pages_dir: Path | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Async counterpart of fetch_all_trades_for_ticker for use with the shared AsyncFetcher.
+    
+    The cursor walk for one ticker is inherently sequential, but many tickers run at once and the
+    per-host token bucket (not a fixed sleep) paces requests. Unlike the serial version, a failed
+    page raises so the ticker is reported as an error instead of being saved half-fetched.
+    Returns the same (trades, stats) shape.
+    """
+    all_trades: list[dict[str, Any]] = []
+    cursor: str | None = None
+    page_num = 0
+    total_start_time = time.time()
+    total_volume_dollars = 0.0
+    total_trades_received = 0
+    total_trades_filtered = 0
+    pages_saved: list[str] = []
+    if pages_dir:
+        pages_dir.mkdir(parents=True, exist_ok=True)
+    
+    while True:
+        page_num += 1
+        url = _trades_url(ticker, limit, cursor, min_ts, max_ts)
+        status, _resp_headers, body = await fetcher.get(
+            url,
+            headers=lambda: _auth_headers(api_key_id, private_key_pem),
+            allow_non_200=True,
+        )
+        if status != 200:
+            raise RuntimeError(f"HTTP {status} for {url}: {body.decode('utf-8', errors='replace')[:1000]}")
+        response = parse_json_bytes(body)
+        trades = response.get("trades", [])
+        total_trades_received += len(trades)
+        if pages_dir and response:
+            pages_saved.append(
+                await fetcher.run_in_worker(_save_trades_page, pages_dir, page_num, ticker, response, min_ts, max_ts)
+            )
+        if trades:
+            kept, page_filtered, page_volume = _filter_trades_to_window(trades, min_ts, max_ts)
+            total_trades_filtered += page_filtered
+            total_volume_dollars += page_volume
+            all_trades.extend(kept)
+        cursor = response.get("cursor")
+        if not cursor:
+            break
+    
+    total_elapsed = time.time() - total_start_time
+    stats = {
+        "total_trades": len(all_trades),
+        "total_trades_received": total_trades_received,
+        "total_trades_filtered": total_trades_filtered,
+        "total_volume_dollars": total_volume_dollars,
+        "total_pages": page_num,
+        "fetch_time_seconds": total_elapsed,
+        "trades_per_second": len(all_trades) / total_elapsed if total_elapsed > 0 else 0,
+        "pages_saved": pages_saved,
+    }
+    logger.info(f"  ✓ [{ticker}] {len(all_trades):,} trades, {page_num} pages in {total_elapsed:.2f}s")
+    return all_trades, stats
+
+
+def write_ticker_file(
+    session_dir: Path,
+    game: dict[str, Any],
+    trades: list[dict[str, Any]],
+    fetch_stats: dict[str, Any],
+    window: tuple[int | None, int | None],
+    *,
+    fetch_timestamp: str,
+    archive_format: str,
+    parquet_sidecar: bool,
+) -> tuple[Path, int]:
+    """Write one ticker's aggregated trades file (+ manifest). Returns (stored path, uncompressed byte size)."""
+    ticker = game["ticker"]
+    min_ts, max_ts = window
+    ticker_data = {
+        "fetch_timestamp": fetch_timestamp,
+        "ticker": ticker,
+        "event_ticker": game["event_ticker"],
+        "game_id": game["game_id"],
+        "game_time_utc": game["game_time_utc"].isoformat() if game["game_time_utc"] else None,
+        "market_status": game["market_status"],
+        "filter_type": "in_game_only",
+        "time_window_start_ts": min_ts,
+        "time_window_end_ts": max_ts,
+        "total_trades": len(trades),
+        "total_volume_dollars": fetch_stats.get("total_volume_dollars", 0.0),
+        "fetch_stats": fetch_stats,
+        "trades": trades,
+    }
+    
+    # Save aggregated file (+ manifest, optionally compressed / with Parquet sidecar)
+    ticker_file = session_dir / f"{ticker.replace('/', '_')}.json"
+    manifest_file = ticker_file.with_suffix(ticker_file.suffix + ".manifest.json")
+    body_bytes = json.dumps(ticker_data, indent=2, default=str).encode("utf-8")
+    logger.debug(f"  Writing to file: {ticker_file} (format={archive_format})")
+    stored = write_with_manifest(
+        ticker_file,
+        manifest_file,
+        url=f"https://api.elections.kalshi.com/trade-api/v2/markets/trades?ticker={ticker}",
+        http_status=200,
+        response_headers={"content-type": "application/json"},
+        body=body_bytes,
+        source_type="kalshi_trades",
+        source_key=ticker,
+        fetched_at_utc=fetch_timestamp,
+        archive_format=archive_format,
+        parquet_sidecar=parquet_sidecar,
+    )
+    return stored, len(body_bytes)
+
+
+def prefetch_trades_concurrently(
+    api_key_id: str,
+    private_key_pem: bytes,
+    markets: list[dict[str, Any]],
+    windows: dict[str, tuple[int | None, int | None]],
+    session_dir: Path,
+    *,
+    concurrency: int,
+    requests_per_second: float,
+    fetch_timestamp: str,
+    archive_format: str,
+    parquet_sidecar: bool,
+    checkpoint: FetchCheckpoint | None = None,
+) -> dict[str, FetchResult]:
+    """
+    Run per-ticker pagination pipelines concurrently, writing each ticker's file as soon as its cursor chain ends.
+
+    Only a summary is kept per ticker (trades are not held until the batch finishes), and finished tickers are
+    journaled in `checkpoint`, so an interrupted run resumes with the tickers it had not finished.
+    Returns FetchResult keyed by ticker; an ok value is {"file", "body_size", "trade_count", "fetch_stats", "write_seconds"}.
+    """
+    retry = HttpRetry(
+        max_attempts=6,
+        timeout_seconds=20.0,
+        base_backoff_seconds=1.0,
+        max_backoff_seconds=60.0,
+        jitter_seconds=0.25,
+        deadline_seconds=180.0,
+    )
+    by_ticker = {m["ticker"]: m for m in markets}
+    
+    async def pipeline(fetcher: AsyncFetcher, ticker: str) -> dict[str, Any]:
+        window = windows.get(ticker, (None, None))
+        trades, fetch_stats = await fetch_all_trades_for_ticker_async(
+            fetcher,
+            api_key_id,
+            private_key_pem,
+            ticker,
+            min_ts=window[0],
+            max_ts=window[1],
+            pages_dir=session_dir / ticker.replace("/", "_") / "pages",
+        )
+        write_start = time.time()
+        stored, body_size = await fetcher.run_in_worker(
+            functools.partial(
+                write_ticker_file,
+                session_dir,
+                by_ticker[ticker],
+                trades,
+                fetch_stats,
+                window,
+                fetch_timestamp=fetch_timestamp,
+                archive_format=archive_format,
+                parquet_sidecar=parquet_sidecar,
+            )
+        )
+        return {
+            "file": stored,
+            "body_size": body_size,
+            "trade_count": len(trades),
+            "fetch_stats": fetch_stats,
+            "write_seconds": time.time() - write_start,
+        }
+    
+    tickers = list(by_ticker)
+    logger.info(f"Prefetching trades for {len(tickers)} markets (concurrency={concurrency}, rps={requests_per_second})...")
+    with AsyncFetcher(retry=retry, limiter=HostRateLimiter(requests_per_second), concurrency=concurrency) as fetcher:
+        results = asyncio.run(fetcher.run_keyed(tickers, pipeline, checkpoint=checkpoint))
+    return {r.key: r for r in results}
+
+
+
+def compute_game_window(conn: psycopg.Connection, game: dict[str, Any]) -> tuple[int | None, int | None]:
+    """Calculate the in-game trade window (unix seconds) using ESPN data (matches webapp logic).
+    
+    Game start = event_date from espn.scoreboard_games
+    Game duration = MAX(last_modified_utc) - MIN(last_modified_utc) from ESPN probabilities
+    Game window = event_date to event_date + duration (+15 min buffer either side)
+    """
+    game_id = game["game_id"]
+    min_ts = None
+    max_ts = None
+    
+    if game["game_time_utc"] and game_id:
+        game_start = game["game_time_utc"]
+        
+        # Handle different types: datetime object, string, or None
+        if isinstance(game_start, datetime):
+            # Already a datetime object from psycopg
+            if game_start.tzinfo is None:
+                # Assume UTC if no timezone
+                game_start = game_start.replace(tzinfo=timezone.utc)
+            else:
+                # Convert to UTC
+                game_start = game_start.astimezone(timezone.utc)
+        elif isinstance(game_start, str):
+            from scripts.lib._db_lib import parse_iso8601_z
+            game_start = parse_iso8601_z(game_start)
+        
+        if game_start and isinstance(game_start, datetime):
+            # Calculate actual game duration from ESPN data (matches webapp)
+            # Query ESPN probabilities to get MIN and MAX last_modified_utc
+            with conn.cursor() as dur_cur:
+                duration_query = """
+                    SELECT 
+                        MIN(p.last_modified_utc) as first_record,
+                        MAX(p.last_modified_utc) as last_record,
+                        EXTRACT(EPOCH FROM (MAX(p.last_modified_utc) - MIN(p.last_modified_utc)))::INTEGER as duration_seconds
+                    FROM espn.probabilities_raw_items p
+                    WHERE p.game_id = %s
+                """
+                dur_cur.execute(duration_query, (game_id,))
+                dur_row = dur_cur.fetchone()
+                
+                if dur_row and dur_row[2] is not None:
+                    duration_seconds = int(dur_row[2])
+                    # Add 15 min buffer before and after (like webapp does for safety)
+                    buffer_seconds = 15 * 60
+                    game_start_ts = int(game_start.timestamp()) - buffer_seconds
+                    game_end_ts = int(game_start.timestamp()) + duration_seconds + buffer_seconds
+                    
+                    min_ts = game_start_ts
+                    max_ts = game_end_ts
+                    
+                    game_start_dt = datetime.fromtimestamp(game_start_ts, tz=timezone.utc)
+                    game_end_dt = datetime.fromtimestamp(game_end_ts, tz=timezone.utc)
+                    logger.info(f"  🎮 Game window: {game_start_dt.strftime('%Y-%m-%d %H:%M:%S')} to {game_end_dt.strftime('%H:%M:%S')} UTC")
+                    logger.info(f"  🎮 Duration: {duration_seconds / 60:.1f} minutes (from ESPN data)")
+                    logger.info(f"  🎮 Time window timestamps: {min_ts} to {max_ts}")
+                    sys.stdout.flush()
+                else:
+                    # Fallback: use fixed 3.5 hour window if no ESPN duration data
+                    logger.warning(f"  ⚠️  No ESPN duration data found, using fixed 3.5h window")
+                    game_start_ts = int(game_start.timestamp()) - (15 * 60)  # 15 min before
+                    game_end_ts = int(game_start.timestamp()) + (3 * 60 * 60) + (15 * 60)  # 3h15m after
+                    min_ts = game_start_ts
+                    max_ts = game_end_ts
+                    sys.stdout.flush()
+        else:
+            logger.warning(f"  ⚠️  Could not parse game_time_utc: {game['game_time_utc']} (type: {type(game['game_time_utc'])}), fetching all trades")
+            sys.stdout.flush()
+    else:
+        logger.warning(f"  ⚠️  No game_time_utc or game_id available, fetching all trades")
+        sys.stdout.flush()
+    
+    return min_ts, max_ts
+
+
+def compute_game_windows(dsn: str, games: list[dict[str, Any]]) -> dict[str, tuple[int | None, int | None]]:
+    """compute_game_window for every market, over one database connection. Keyed by ticker."""
+    with psycopg.connect(dsn) as conn:
+        return {g["ticker"]: compute_game_window(conn, g) for g in games}
+
+
 def get_completed_games_with_kalshi_markets(dsn: str, limit: int | None = None) -> list[dict[str, Any]]:
     """Query database for completed games from 2025-26 season with Kalshi markets.
     
@@ -443,6 +766,30 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--limit", type=int, default=None, help="Limit number of games (for testing). If not set, fetches all.")
     p.add_argument("--out-dir", default="data/raw/kalshi/trades", help="Output directory for trade data.")
     p.add_argument("--verbose", "-v", action="store_true", help="Enable verbose debug logging.")
+    p.add_argument(
+        "--archive-format",
+        choices=ARCHIVE_FORMATS,
+        default="json",
+        help="Storage format for per-ticker trade files: plain JSON or zstd-compressed (<ticker>.json.zst).",
+    )
+    p.add_argument("--parquet-sidecar", action="store_true", help="Also write a flattened <ticker>.parquet of trades.")
+    p.add_argument(
+        "--checkpoint",
+        default="data/reports/kalshi_trades_checkpoint.jsonl",
+        help="JSONL journal of tickers whose trades file was written, so reruns skip them. Empty string disables.",
+    )
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of tickers whose cursor chains are fetched in parallel. 1 keeps the original serial loop.",
+    )
+    p.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=5.0,
+        help="Token-bucket rate limit for Kalshi API requests when --concurrency > 1.",
+    )
     return p.parse_args()
 
 
@@ -501,6 +848,37 @@ def main() -> int:
     skipped_count = 0
     error_count = 0
     
+    checkpoint = FetchCheckpoint(Path(args.checkpoint)) if args.checkpoint else None
+    
+    # Windows for every market still to fetch, over one connection
+    pending = [
+        g for g in games
+        if not (checkpoint is not None and checkpoint.is_done(g["ticker"]))
+        and not any(
+            find_archive(d / f"{g['ticker'].replace('/', '_')}.json") is not None
+            for d in out_dir.glob("fetch_*") if d.is_dir()
+        )
+    ]
+    windows = compute_game_windows(dsn, pending)
+    
+    # Concurrent mode: walk every ticker's cursor chain in parallel under a shared rate limit, writing and
+    # journaling each ticker as it finishes. The per-market loop below then only reports.
+    prefetched: dict[str, FetchResult] = {}
+    if args.concurrency > 1:
+        prefetched = prefetch_trades_concurrently(
+            api_key_id,
+            private_key_pem,
+            pending,
+            windows,
+            session_dir,
+            concurrency=int(args.concurrency),
+            requests_per_second=float(args.requests_per_second),
+            fetch_timestamp=fetch_timestamp,
+            archive_format=args.archive_format,
+            parquet_sidecar=bool(args.parquet_sidecar),
+            checkpoint=checkpoint,
+        )
+    
     logger.info("=" * 70)
     logger.info(f"Starting trade fetch for {len(games)} markets ({len(unique_events)} unique games)...")
     logger.info("=" * 70)
@@ -531,14 +909,15 @@ def main() -> int:
         sys.stdout.flush()  # Force flush for real-time output
         
         # Check if we already have trade data for this ticker in ANY previous fetch session
-        # Look in all subdirectories of the trades folder
+        # Look in all subdirectories of the trades folder (tickers written by this run's prefetch aren't skips)
         existing_file = None
-        for prev_session_dir in out_dir.glob("fetch_*"):
-            if prev_session_dir.is_dir():
-                check_file = prev_session_dir / f"{ticker.replace('/', '_')}.json"
-                if check_file.exists():
-                    existing_file = check_file
-                    break
+        if ticker not in prefetched:
+            for prev_session_dir in out_dir.glob("fetch_*"):
+                if prev_session_dir.is_dir():
+                    check_file = find_archive(prev_session_dir / f"{ticker.replace('/', '_')}.json")
+                    if check_file is not None:
+                        existing_file = check_file
+                        break
         
         if existing_file:
             skipped_count += 1
@@ -561,99 +940,72 @@ def main() -> int:
             })
             continue
         
-        ticker_file = session_dir / f"{ticker.replace('/', '_')}.json"
+        if ticker not in windows:
+            # Journaled as written by an earlier run whose file has since been moved away
+            skipped_count += 1
+            logger.info(f"  ⏭️  SKIPPING: {ticker} is recorded as done in checkpoint {args.checkpoint}")
+            all_results.append({
+                "ticker": ticker,
+                "game_id": game_id,
+                "event_ticker": event_ticker,
+                "trade_count": 0,
+                "status": "skipped",
+                "reason": "checkpoint",
+                "total_volume_dollars": 0.0,
+            })
+            continue
         
         try:
-            # Calculate in-game time window using ESPN data (matches webapp logic)
-            # Game start = event_date from espn.scoreboard_games
-            # Game duration = MAX(last_modified_utc) - MIN(last_modified_utc) from ESPN probabilities
-            # Game window = event_date to event_date + duration
-            min_ts = None
-            max_ts = None
-            
-            if game["game_time_utc"] and game_id:
-                game_start = game["game_time_utc"]
-                
-                # Handle different types: datetime object, string, or None
-                if isinstance(game_start, datetime):
-                    # Already a datetime object from psycopg
-                    if game_start.tzinfo is None:
-                        # Assume UTC if no timezone
-                        game_start = game_start.replace(tzinfo=timezone.utc)
-                    else:
-                        # Convert to UTC
-                        game_start = game_start.astimezone(timezone.utc)
-                elif isinstance(game_start, str):
-                    from scripts.lib._db_lib import parse_iso8601_z
-                    game_start = parse_iso8601_z(game_start)
-                
-                if game_start and isinstance(game_start, datetime):
-                    # Calculate actual game duration from ESPN data (matches webapp)
-                    # Query ESPN probabilities to get MIN and MAX last_modified_utc
-                    with psycopg.connect(dsn) as conn:
-                        with conn.cursor() as dur_cur:
-                            duration_query = """
-                                SELECT 
-                                    MIN(p.last_modified_utc) as first_record,
-                                    MAX(p.last_modified_utc) as last_record,
-                                    EXTRACT(EPOCH FROM (MAX(p.last_modified_utc) - MIN(p.last_modified_utc)))::INTEGER as duration_seconds
-                                FROM espn.probabilities_raw_items p
-                                WHERE p.game_id = %s
-                            """
-                            dur_cur.execute(duration_query, (game_id,))
-                            dur_row = dur_cur.fetchone()
-                            
-                            if dur_row and dur_row[2] is not None:
-                                duration_seconds = int(dur_row[2])
-                                # Add 15 min buffer before and after (like webapp does for safety)
-                                buffer_seconds = 15 * 60
-                                game_start_ts = int(game_start.timestamp()) - buffer_seconds
-                                game_end_ts = int(game_start.timestamp()) + duration_seconds + buffer_seconds
-                                
-                                min_ts = game_start_ts
-                                max_ts = game_end_ts
-                                
-                                game_start_dt = datetime.fromtimestamp(game_start_ts, tz=timezone.utc)
-                                game_end_dt = datetime.fromtimestamp(game_end_ts, tz=timezone.utc)
-                                logger.info(f"  🎮 Game window: {game_start_dt.strftime('%Y-%m-%d %H:%M:%S')} to {game_end_dt.strftime('%H:%M:%S')} UTC")
-                                logger.info(f"  🎮 Duration: {duration_seconds / 60:.1f} minutes (from ESPN data)")
-                                logger.info(f"  🎮 Time window timestamps: {min_ts} to {max_ts}")
-                                sys.stdout.flush()
-                            else:
-                                # Fallback: use fixed 3.5 hour window if no ESPN duration data
-                                logger.warning(f"  ⚠️  No ESPN duration data found, using fixed 3.5h window")
-                                game_start_ts = int(game_start.timestamp()) - (15 * 60)  # 15 min before
-                                game_end_ts = int(game_start.timestamp()) + (3 * 60 * 60) + (15 * 60)  # 3h15m after
-                                min_ts = game_start_ts
-                                max_ts = game_end_ts
-                                sys.stdout.flush()
-                else:
-                    logger.warning(f"  ⚠️  Could not parse game_time_utc: {game['game_time_utc']} (type: {type(game['game_time_utc'])}), fetching all trades")
-                    sys.stdout.flush()
-            else:
-                logger.warning(f"  ⚠️  No game_time_utc or game_id available, fetching all trades")
-                sys.stdout.flush()
+            min_ts, max_ts = windows[ticker]
             
             # Create ticker-specific directory for pages
             ticker_safe = ticker.replace("/", "_")
             ticker_pages_dir = session_dir / ticker_safe / "pages"
             
             market_start_time = time.time()
-            trades, fetch_stats = fetch_all_trades_for_ticker(
-                api_key_id, 
-                private_key_pem, 
-                ticker,
-                min_ts=min_ts,
-                max_ts=max_ts,
-                pages_dir=ticker_pages_dir,
-            )
-            market_elapsed = time.time() - market_start_time
+            if ticker in prefetched:
+                # Already fetched and written (and journaled) by its pipeline
+                res = prefetched[ticker]
+                if res.status != "ok":
+                    raise RuntimeError(res.error)
+                ticker_file = res.value["file"]
+                body_size = res.value["body_size"]
+                trade_count = res.value["trade_count"]
+                fetch_stats = res.value["fetch_stats"]
+                file_elapsed = res.value["write_seconds"]
+                market_elapsed = res.elapsed_seconds
+            else:
+                trades, fetch_stats = fetch_all_trades_for_ticker(
+                    api_key_id, 
+                    private_key_pem, 
+                    ticker,
+                    min_ts=min_ts,
+                    max_ts=max_ts,
+                    pages_dir=ticker_pages_dir,
+                )
+                market_elapsed = time.time() - market_start_time
+                trade_count = len(trades)
+                
+                file_start = time.time()
+                ticker_file, body_size = write_ticker_file(
+                    session_dir,
+                    game,
+                    trades,
+                    fetch_stats,
+                    (min_ts, max_ts),
+                    fetch_timestamp=fetch_timestamp,
+                    archive_format=args.archive_format,
+                    parquet_sidecar=bool(args.parquet_sidecar),
+                )
+                file_elapsed = time.time() - file_start
+                if checkpoint is not None:
+                    checkpoint.mark_done(ticker)
             
             successful_count += 1
             
             # Log validation info
             volume = fetch_stats.get("total_volume_dollars", 0.0)
-            logger.info(f"  ✓ Successfully fetched {len(trades)} in-game trades in {market_elapsed:.2f}s")
+            logger.info(f"  ✓ Successfully fetched {trade_count} in-game trades in {market_elapsed:.2f}s")
             logger.info(f"  💰 Total Volume: ${volume:,.2f} | Pages: {fetch_stats.get('total_pages', 0)}")
             if fetch_stats.get("total_trades_filtered", 0) > 0:
                 logger.info(f"  ⚠️  Filtered {fetch_stats['total_trades_filtered']:,} trades outside time window")
@@ -668,59 +1020,15 @@ def main() -> int:
                 eta_minutes = eta_seconds / 60
                 logger.info(f"  ⏱️  ETA: ~{eta_minutes:.1f} minutes remaining ({remaining_markets} markets left)")
             
-            sys.stdout.flush()
-            
-            # Store trades for this ticker (aggregated)
-            ticker_data = {
-                "fetch_timestamp": fetch_timestamp,
-                "ticker": ticker,
-                "event_ticker": event_ticker,
-                "game_id": game_id,
-                "game_time_utc": game["game_time_utc"].isoformat() if game["game_time_utc"] else None,
-                "market_status": game["market_status"],
-                "filter_type": "in_game_only",
-                "time_window_start_ts": min_ts,
-                "time_window_end_ts": max_ts,
-                "total_trades": len(trades),
-                "total_volume_dollars": fetch_stats.get("total_volume_dollars", 0.0),
-                "fetch_stats": fetch_stats,
-                "trades": trades,
-            }
-            
-            # Save aggregated file
-            ticker_file = session_dir / f"{ticker_safe}.json"
-            logger.debug(f"  Writing to file: {ticker_file}")
-            
-            file_start = time.time()
-            ticker_file.write_text(json.dumps(ticker_data, indent=2, default=str), encoding="utf-8")
-            file_elapsed = time.time() - file_start
-            
             file_size = ticker_file.stat().st_size
-            logger.info(f"  ✓ File written: {file_size:,} bytes in {file_elapsed:.2f}s")
+            logger.info(f"  ✓ File written: {file_size:,} bytes ({body_size:,} uncompressed) in {file_elapsed:.2f}s")
             sys.stdout.flush()
             
-            # Create manifest
-            manifest_file = ticker_file.with_suffix(ticker_file.suffix + ".manifest.json")
-            body_bytes = json.dumps(ticker_data, indent=2, default=str).encode("utf-8")
-            sha256_hex = hashlib.sha256(body_bytes).hexdigest()
-            
-            manifest = {
-                "source_type": "kalshi_trades",
-                "source_key": ticker,
-                "path": str(ticker_file),
-                "fetched_at_utc": fetch_timestamp,
-                "http_status": 200,
-                "sha256_hex": sha256_hex,
-                "byte_size": len(body_bytes),
-            }
-            manifest_file.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
-            logger.debug(f"  Manifest written: {manifest_file}")
-            
             all_results.append({
                 "ticker": ticker,
                 "game_id": game_id,
                 "event_ticker": event_ticker,
-                "trade_count": len(trades),
+                "trade_count": trade_count,
                 "total_volume_dollars": fetch_stats.get("total_volume_dollars", 0.0),
                 "total_pages": fetch_stats.get("total_pages", 0),
                 "file_size_bytes": file_size,
@@ -729,11 +1037,12 @@ def main() -> int:
                 "fetch_time_seconds": market_elapsed,
             })
             
-            # Rate limiting between markets
-            sleep_time = 0.5
-            logger.info(f"  ⏳ Rate limiting: sleeping {sleep_time}s before next market...")
-            sys.stdout.flush()
-            time.sleep(sleep_time)
+            # Rate limiting between markets (serial mode only; prefetched markets were paced by the token bucket)
+            if ticker not in prefetched:
+                sleep_time = 0.5
+                logger.info(f"  ⏳ Rate limiting: sleeping {sleep_time}s before next market...")
+                sys.stdout.flush()
+                time.sleep(sleep_time)
             
         except Exception as e:
             error_count += 1
@@ -809,7 +1118,7 @@ def main() -> int:
         if first_with_trades:
             ticker_file = Path(first_with_trades["file"])
             if ticker_file.exists():
-                data = json.loads(ticker_file.read_text(encoding="utf-8"))
+                data = parse_json_bytes(read_archive_bytes(ticker_file))
                 if data.get("trades") and len(data["trades"]) > 0:
                     logger.info(f"\nExample trade from {first_with_trades['ticker']}:")
                     logger.info(json.dumps(data["trades"][0], indent=2))
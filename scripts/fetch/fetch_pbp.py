@@ -33,7 +33,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from scripts.lib._fetch_lib import HttpRetry, http_get_bytes, parse_json_bytes, utc_now_iso_compact, write_with_manifest
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Fetch NBA play-by-play JSON from cdn.nba.com.")
     p.add_argument("--game-id", required=True, help="NBA gameId string, e.g. 0022400196")
     p.add_argument("--out", required=True, help="Output JSON path, e.g. data/raw/pbp/0022400196.json")
@@ -61,7 +61,7 @@ def parse_args() -> argparse.Namespace:
         help="If set, write raw stats.nba.com response diagnostics to this file when the stats PBP fetch fails.",
     )
     p.add_argument("--verbose", action="store_true", help="Print progress (useful when retries/timeouts make it look hung).")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 def _safe_int(x: Any) -> int | None:
@@ -431,8 +431,8 @@ def _fetch_via_nba_api(
     return "nba_api.stats.endpoints.PlayByPlayV2", body
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     game_id = args.game_id
     url = f"https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{game_id}.json"
 
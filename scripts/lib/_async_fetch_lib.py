@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable
+from urllib.parse import urlsplit
+
+from scripts.lib._fetch_lib import HttpRetry, http_get_bytes
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens/second, bursts of up to `burst` requests.
+
+    A caller that finds the bucket empty reserves the next token (the balance goes negative) and sleeps
+    until it is due, so concurrent waiters are spaced 1/rate apart instead of stampeding. rate <= 0 disables.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst if burst is not None else 1.0))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        if self.rate <= 0:
+            return
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, so ESPN and Kalshi limits are enforced independently."""
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        *,
+        burst: float | None = None,
+        per_host: dict[str, float] | None = None,
+    ) -> None:
+        self._default_rps = float(requests_per_second)
+        self._burst = burst
+        self._per_host = dict(per_host or {})
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self._per_host.get(host, self._default_rps), self._burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> None:
+        self.bucket_for(url).acquire()
+
+
+class FetchCheckpoint:
+    """
+    Append-only JSONL journal of completed keys, so an interrupted backfill resumes where it stopped.
+
+    Each line is {"key": ..., "at": <unix seconds>}; a torn final line from a crash is ignored on load.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._done: set[str] = set()
+        self._lock = threading.Lock()
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    self._done.add(str(json.loads(line)["key"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def is_done(self, key: str) -> bool:
+        return key in self._done
+
+    def mark_done(self, key: str) -> None:
+        with self._lock:
+            if key in self._done:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "at": round(time.time(), 3)}) + "\n")
+            self._done.add(key)
+
+
+@dataclass(frozen=True)
+class FetchJob:
+    key: str
+    url: str
+    headers: dict[str, str] | None = None
+
+
+@dataclass
+class FetchResult:
+    key: str
+    status: str  # "ok" | "skipped" | "error"
+    value: Any = None
+    error: str | None = None
+    elapsed_seconds: float = 0.0
+
+
+class AsyncFetcher:
+    """
+    Shared concurrent fetch engine for ESPN/Kalshi backfills.
+
+    Requests run on a bounded thread pool through http_get_bytes (same retry/backoff policy as the
+    serial scripts) with one keep-alive requests.Session per host and a per-host token bucket applied
+    to every attempt. Coroutines drive the pipelines, so a per-ticker cursor walk or a per-game fetch
+    is written as straight-line async code and many of them run at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        retry: HttpRetry,
+        limiter: HostRateLimiter,
+        concurrency: int = 8,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.retry = retry
+        self.limiter = limiter
+        self.concurrency = max(1, int(concurrency))
+        self._headers = dict(headers or {})
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="async_fetch")
+        self._sessions: dict[str, Any] = {}
+        self._sessions_lock = threading.Lock()
+
+    def _session(self, url: str) -> Any:
+        import requests  # type: ignore
+
+        host = urlsplit(url).netloc.lower()
+        with self._sessions_lock:
+            s = self._sessions.get(host)
+            if s is None:
+                s = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                self._sessions[host] = s
+            return s
+
+    def get_blocking(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str] | Callable[[], dict[str, str]] | None = None,
+        allow_non_200: bool = False,
+    ) -> tuple[int, dict[str, str], bytes]:
+        if callable(headers):
+            factory = headers
+            hdrs: dict[str, str] | Callable[[], dict[str, str]] | None = lambda: {**self._headers, **factory()}
+        else:
+            hdrs = {**self._headers, **(headers or {})} or None
+        bucket = self.limiter.bucket_for(url)
+        return http_get_bytes(
+            url,
+            self.retry,
+            headers=hdrs,
+            allow_non_200=allow_non_200,
+            session=self._session(url),
+            before_attempt=bucket.acquire,
+        )
+
+    async def get(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str] | Callable[[], dict[str, str]] | None = None,
+        allow_non_200: bool = False,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """
+        Async GET. `headers` may be a callable for per-attempt values (e.g. Kalshi request signatures):
+        it is re-evaluated before every retry, after the rate limiter, so a signature is never replayed.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: self.get_blocking(url, headers=headers, allow_non_200=allow_non_200),
+        )
+
+    async def run_in_worker(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking work (parsing, file writes) on the fetch pool instead of the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def run_keyed(
+        self,
+        keys: Iterable[str],
+        pipeline: Callable[["AsyncFetcher", str], Awaitable[Any]],
+        *,
+        checkpoint: FetchCheckpoint | None = None,
+        on_result: Callable[[FetchResult], None] | None = None,
+    ) -> list[FetchResult]:
+        """
+        Run `pipeline(fetcher, key)` for every key with at most `concurrency` in flight.
+
+        Keys already in `checkpoint` are skipped; successful keys are journaled as they finish.
+        Errors are captured per key rather than aborting the batch. Results come back in input order.
+        """
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def one(key: str) -> FetchResult:
+            if checkpoint is not None and checkpoint.is_done(key):
+                res = FetchResult(key=key, status="skipped")
+            else:
+                async with sem:
+                    t0 = time.monotonic()
+                    try:
+                        value = await pipeline(self, key)
+                        res = FetchResult(key=key, status="ok", value=value, elapsed_seconds=time.monotonic() - t0)
+                        if checkpoint is not None:
+                            checkpoint.mark_done(key)
+                    except Exception as e:  # noqa: BLE001
+                        res = FetchResult(key=key, status="error", error=str(e), elapsed_seconds=time.monotonic() - t0)
+            if on_result is not None:
+                on_result(res)
+            return res
+
+        return list(await asyncio.gather(*(one(k) for k in keys)))
+
+    async def map(
+        self,
+        jobs: Iterable[FetchJob],
+        handle: Callable[[FetchJob, int, dict[str, str], bytes], Any],
+        *,
+        allow_non_200: bool = False,
+        checkpoint: FetchCheckpoint | None = None,
+        on_result: Callable[[FetchResult], None] | None = None,
+    ) -> list[FetchResult]:
+        """Fetch independent URLs concurrently; `handle(job, status, headers, body)` runs on a worker thread."""
+        by_key = {j.key: j for j in jobs}
+
+        async def pipeline(fetcher: AsyncFetcher, key: str) -> Any:
+            job = by_key[key]
+            status, resp_headers, body = await fetcher.get(job.url, headers=job.headers, allow_non_200=allow_non_200)
+            return await fetcher.run_in_worker(handle, job, status, resp_headers, body)
+
+        return await self.run_keyed(list(by_key), pipeline, checkpoint=checkpoint, on_result=on_result)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._sessions_lock:
+            for s in self._sessions.values():
+                s.close()
+            self._sessions.clear()
+
+    def __enter__(self) -> "AsyncFetcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def run_fetch_jobs(
+    jobs: Iterable[FetchJob],
+    handle: Callable[[FetchJob, int, dict[str, str], bytes], Any],
+    *,
+    retry: HttpRetry,
+    requests_per_second: float,
+    concurrency: int = 8,
+    allow_non_200: bool = False,
+    checkpoint_path: Path | None = None,
+    on_result: Callable[[FetchResult], None] | None = None,
+) -> list[FetchResult]:
+    """Synchronous entry point for scripts: fetch `jobs` concurrently under a per-host rate limit."""
+    checkpoint = FetchCheckpoint(checkpoint_path) if checkpoint_path is not None else None
+    with AsyncFetcher(retry=retry, limiter=HostRateLimiter(requests_per_second), concurrency=concurrency) as fetcher:
+        return asyncio.run(
+            fetcher.map(jobs, handle, allow_non_200=allow_non_200, checkpoint=checkpoint, on_result=on_result)
+        )
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from queue import Empty, Full, Queue
+from typing import Any, Iterable, Iterator
 
 import psycopg
 from psycopg.rows import dict_row
@@ -147,7 +150,87 @@ def finish_ingestion_run_failed(conn: psycopg.Connection, *, ingest_run_id: int,
     )
 
 
-def connect(dsn: str) -> psycopg.Connection:
+class ConnectionPool:
+    """
+    Small thread-safe pool of psycopg connections for one DSN.
+
+    `connection()` mirrors `with psycopg.connect(dsn) as conn:` (commit on success, rollback on error)
+    but hands the connection back to the pool instead of closing it.
+    """
+
+    def __init__(self, dsn: str, *, max_size: int = 4) -> None:
+        self.dsn = dsn
+        self.max_size = max(1, int(max_size))
+        self._idle: Queue[psycopg.Connection] = Queue(maxsize=self.max_size)
+
+    @contextmanager
+    def connection(self) -> Iterator[psycopg.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except Empty:
+            conn = psycopg.connect(self.dsn)
+        try:
+            yield conn
+        except BaseException:
+            if not conn.closed:
+                conn.rollback()
+            self._release(conn)
+            raise
+        if not conn.closed:
+            conn.commit()
+        self._release(conn)
+
+    def _release(self, conn: psycopg.Connection) -> None:
+        if conn.closed or conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                return
+
+
+_shared_pool: ConnectionPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+@contextmanager
+def shared_connection_pool(pool: ConnectionPool) -> Iterator[ConnectionPool]:
+    """
+    Route `connect(pool.dsn)` through `pool` for the duration of the block (all threads).
+
+    Used by in-process pipelines so each fetch/load step reuses warm connections instead of
+    opening a fresh one per script invocation. The pool is closed on exit.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            raise RuntimeError("a shared connection pool is already installed")
+        _shared_pool = pool
+    try:
+        yield pool
+    finally:
+        with _shared_pool_lock:
+            _shared_pool = None
+        pool.close()
+
+
+def connect(dsn: str):
+    """
+    Open a connection for `with connect(dsn) as conn:` blocks.
+
+    Inside `shared_connection_pool(...)` for the same DSN this borrows a pooled connection instead.
+    """
+    pool = _shared_pool
+    if pool is not None and pool.dsn == dsn:
+        return pool.connection()
     return psycopg.connect(dsn)
 
 
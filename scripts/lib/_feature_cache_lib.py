@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import re
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import psycopg
+
+# Bump when the on-disk layout or the extraction type mapping changes; old entries are then ignored.
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path("data/cache/features")
+
+# Tables the win-probability training/evaluation queries read from.
+TRAINING_SOURCE_TABLES: tuple[str, ...] = (
+    "espn.probabilities_raw_items",
+    "espn.prob_event_state",
+    "espn.scoreboard_games",
+    "external.sportsbook_odds_snapshots",
+    "derived.opening_odds_features_v1",
+)
+
+# Identifier-like columns that must stay strings (game ids have leading zeros / are not numbers to us).
+DEFAULT_STRING_COLUMNS: tuple[str, ...] = ("game_id", "season_label", "possession")
+
+_META_NAME = "_meta.json"
+
+
+def query_fingerprint(query: str, params: Sequence[Any] | None = None) -> str:
+    """Stable hash of a query + params; whitespace-insensitive so reformatting a query doesn't bust the cache."""
+    normalized = re.sub(r"\s+", " ", query).strip()
+    payload = json.dumps(
+        {"v": CACHE_FORMAT_VERSION, "query": normalized, "params": list(params or [])},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def source_watermarks(conn: psycopg.Connection, tables: Iterable[str]) -> dict[str, str]:
+    """
+    Cheap change markers for source tables: relfilenode (moves on TRUNCATE / VACUUM FULL / rewrite) plus the
+    cumulative insert/update/delete counters from pg_stat_user_tables. Any write changes the marker; a stats
+    reset only costs one extra rebuild. Tables that don't exist (yet) are left out.
+    """
+    names = list(tables)
+    rows = conn.execute(
+        """
+        SELECT c.oid::regclass::text, c.relfilenode,
+               COALESCE(s.n_tup_ins, 0), COALESCE(s.n_tup_upd, 0), COALESCE(s.n_tup_del, 0)
+        FROM pg_class c
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        WHERE c.oid = ANY(ARRAY(SELECT to_regclass(t) FROM unnest(%s::text[]) AS t))
+        """,
+        (names,),
+    ).fetchall()
+    return {str(r[0]): f"{r[1]}:{r[2]}:{r[3]}:{r[4]}" for r in rows}
+
+
+def read_query_arrow(
+    conn: psycopg.Connection,
+    query: str,
+    params: Sequence[Any] | None = None,
+    *,
+    string_columns: Iterable[str] = DEFAULT_STRING_COLUMNS,
+) -> Any:
+    """
+    Run `query` through COPY ... TO STDOUT (CSV) and parse it with Arrow's multithreaded CSV reader.
+
+    Returns a pyarrow.Table. Much faster than pd.read_sql, which materializes every row as Python objects.
+    NUMERIC columns come back as float64 rather than Decimal.
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pacsv  # type: ignore
+
+    buf = io.BytesIO()
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY (\n{query}\n) TO STDOUT WITH (FORMAT csv, HEADER true)", params) as copy:
+            for chunk in copy:
+                buf.write(chunk)
+    buf.seek(0)
+    if buf.getbuffer().nbytes == 0:
+        return pa.table({})
+    convert = pacsv.ConvertOptions(
+        column_types={c: pa.string() for c in string_columns},
+        strings_can_be_null=True,
+        true_values=["t"],
+        false_values=["f"],
+    )
+    return pacsv.read_csv(buf, convert_options=convert)
+
+
+def _partition_file(entry_dir: Path, partition_column: str, value: Any) -> Path:
+    return entry_dir / f"{partition_column}={value}.parquet"
+
+
+def write_partitioned(table: Any, entry_dir: Path, *, partition_column: str, meta: dict[str, Any]) -> None:
+    """Write one Parquet file per partition value plus _meta.json, atomically replacing `entry_dir`."""
+    import pyarrow.compute as pc  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    tmp_dir = entry_dir.with_name(entry_dir.name + f".tmp{int(time.time() * 1000)}")
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    partitions: list[str] = []
+    if table.num_rows and partition_column in table.column_names:
+        for value in pc.unique(table[partition_column]).to_pylist():
+            mask = pc.is_null(table[partition_column]) if value is None else pc.equal(table[partition_column], value)
+            path = _partition_file(tmp_dir, partition_column, value)
+            pq.write_table(table.filter(mask), path, compression="zstd")
+            partitions.append(path.name)
+    else:
+        path = tmp_dir / "all.parquet"
+        pq.write_table(table, path, compression="zstd")
+        partitions.append(path.name)
+    meta = {**meta, "partitions": sorted(partitions), "rows": int(table.num_rows)}
+    (tmp_dir / _META_NAME).write_text(json.dumps(meta, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    if entry_dir.exists():
+        shutil.rmtree(entry_dir)
+    tmp_dir.rename(entry_dir)
+
+
+def read_partitioned(entry_dir: Path, *, partitions: Iterable[str] | None = None) -> Any:
+    """Read a cache entry (optionally a subset of partition files) back into one pyarrow.Table."""
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    meta = read_meta(entry_dir) or {}
+    names = list(partitions) if partitions is not None else list(meta.get("partitions") or [])
+    tables = [pq.read_table(entry_dir / n) for n in names if (entry_dir / n).exists()]
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(tables)
+
+
+def read_meta(entry_dir: Path) -> dict[str, Any] | None:
+    path = entry_dir / _META_NAME
+    if not path.exists():
+        return None
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def entry_is_fresh(meta: dict[str, Any] | None, *, fingerprint: str, watermarks: dict[str, str]) -> bool:
+    return (
+        meta is not None
+        and meta.get("format_version") == CACHE_FORMAT_VERSION
+        and meta.get("fingerprint") == fingerprint
+        and meta.get("watermarks") == watermarks
+    )
+
+
+def _log_stderr(msg: str) -> None:
+    print(f"    [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {msg}", file=sys.stderr)
+
+
+def _extract_entry(
+    conn: psycopg.Connection,
+    query: str,
+    params: Sequence[Any] | None,
+    entry_dir: Path,
+    *,
+    name: str,
+    fingerprint: str,
+    watermarks: dict[str, str],
+    partition_column: str,
+    string_columns: Iterable[str],
+    log: Callable[[str], None],
+) -> Any:
+    t0 = time.time()
+    table = read_query_arrow(conn, query, params, string_columns=string_columns)
+    extract_s = time.time() - t0
+    write_partitioned(
+        table,
+        entry_dir,
+        partition_column=partition_column,
+        meta={
+            "format_version": CACHE_FORMAT_VERSION,
+            "name": name,
+            "fingerprint": fingerprint,
+            "params": [str(p) for p in (params or [])],
+            "watermarks": watermarks,
+            "created_at_utc": datetime.now(timezone.utc).isoformat(),
+            "extract_seconds": round(extract_s, 3),
+        },
+    )
+    log(f"Extracted {table.num_rows:,} rows in {extract_s:.2f}s; cached to {entry_dir}")
+    return table
+
+
+def load_query_cached(
+    conn: psycopg.Connection,
+    query: str,
+    params: Sequence[Any] | None = None,
+    *,
+    name: str,
+    cache_dir: Path | str | None = DEFAULT_CACHE_DIR,
+    source_tables: Iterable[str] = TRAINING_SOURCE_TABLES,
+    partition_column: str = "season_start",
+    string_columns: Iterable[str] = DEFAULT_STRING_COLUMNS,
+    refresh: bool = False,
+    log: Callable[[str], None] = _log_stderr,
+) -> Any:
+    """
+    Return the result of `query` as a pandas DataFrame, served from a season-partitioned Parquet cache when the
+    query fingerprint and the source tables' watermarks both match.
+
+    Layout: {cache_dir}/{name}/{fingerprint[:16]}/{partition_column}=<value>.parquet + _meta.json.
+    cache_dir=None disables caching (the query still goes through the Arrow COPY path).
+    """
+    if cache_dir is None:
+        t0 = time.time()
+        df = read_query_arrow(conn, query, params, string_columns=string_columns).to_pandas()
+        log(f"Query extracted via COPY/Arrow in {time.time() - t0:.2f}s ({len(df):,} rows, cache disabled)")
+        return df
+
+    fingerprint = query_fingerprint(query, params)
+    entry_dir = Path(cache_dir) / name / fingerprint[:16]
+    watermarks = source_watermarks(conn, source_tables)
+
+    if not refresh and entry_is_fresh(read_meta(entry_dir), fingerprint=fingerprint, watermarks=watermarks):
+        t0 = time.time()
+        df = read_partitioned(entry_dir).to_pandas()
+        log(f"Feature cache hit {entry_dir} ({len(df):,} rows) in {time.time() - t0:.2f}s")
+        return df
+
+    log(f"Feature cache {'refresh' if refresh else 'miss'} for {name}; extracting via COPY/Arrow...")
+    table = _extract_entry(
+        conn,
+        query,
+        params,
+        entry_dir,
+        name=name,
+        fingerprint=fingerprint,
+        watermarks=watermarks,
+        partition_column=partition_column,
+        string_columns=string_columns,
+        log=log,
+    )
+    return table.to_pandas()
+
+
+def ensure_cached(
+    conn: psycopg.Connection,
+    query: str,
+    params: Sequence[Any] | None = None,
+    *,
+    name: str,
+    cache_dir: Path | str = DEFAULT_CACHE_DIR,
+    source_tables: Iterable[str] = TRAINING_SOURCE_TABLES,
+    partition_column: str = "season_start",
+    string_columns: Iterable[str] = DEFAULT_STRING_COLUMNS,
+    refresh: bool = False,
+    log: Callable[[str], None] = _log_stderr,
+) -> Path:
+    """
+    Make sure a fresh cache entry exists for `query` and return its directory without loading it.
+
+    For consumers that stream the partitions (iter_partition_batches) instead of holding the whole frame.
+    """
+    fingerprint = query_fingerprint(query, params)
+    entry_dir = Path(cache_dir) / name / fingerprint[:16]
+    watermarks = source_watermarks(conn, source_tables)
+    if not refresh and entry_is_fresh(read_meta(entry_dir), fingerprint=fingerprint, watermarks=watermarks):
+        log(f"Feature cache hit {entry_dir}")
+        return entry_dir
+    log(f"Feature cache {'refresh' if refresh else 'miss'} for {name}; extracting via COPY/Arrow...")
+    _extract_entry(
+        conn,
+        query,
+        params,
+        entry_dir,
+        name=name,
+        fingerprint=fingerprint,
+        watermarks=watermarks,
+        partition_column=partition_column,
+        string_columns=string_columns,
+        log=log,
+    )
+    return entry_dir
+
+
+def partition_files(entry_dir: Path, *, partition_column: str = "season_start") -> dict[str, str]:
+    """Map partition value (as written in the file name) -> partition file name for a cache entry."""
+    prefix = f"{partition_column}="
+    out: dict[str, str] = {}
+    for fname in (read_meta(entry_dir) or {}).get("partitions") or []:
+        if fname.startswith(prefix) and fname.endswith(".parquet"):
+            out[fname[len(prefix):-len(".parquet")]] = fname
+    return out
+
+
+def iter_partition_batches(
+    entry_dir: Path,
+    partitions: Iterable[str],
+    *,
+    columns: Sequence[str] | None = None,
+    batch_rows: int = 262_144,
+) -> Iterator[Any]:
+    """Yield pyarrow.RecordBatches of at most `batch_rows` rows from the given partition files, one at a time."""
+    import pyarrow.parquet as pq  # type: ignore
+
+    for fname in partitions:
+        path = entry_dir / fname
+        if not path.exists():
+            continue
+        pf = pq.ParquetFile(path)
+        cols = [c for c in columns if c in pf.schema_arrow.names] if columns is not None else None
+        yield from pf.iter_batches(batch_size=int(batch_rows), columns=cols)
@@ -7,7 +7,7 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 
 def utc_now_iso_compact() -> str:
@@ -31,6 +31,196 @@ def atomic_write_json(path: Path, obj: dict[str, Any]) -> None:
     atomic_write_bytes(path, json.dumps(obj, indent=2, sort_keys=True).encode("utf-8"))
 
 
+# Raw archive formats. "json" stores the response body byte-for-byte; "zst" stores the same bytes
+# zstd-compressed under `<path>.zst`. Either way the manifest sha256/byte_size describe the original body,
+# so provenance (source_files) is identical regardless of how the payload is stored on disk.
+ARCHIVE_FORMATS = ("json", "zst")
+ZSTD_LEVEL = 9
+
+
+def archive_path(path: Path, archive_format: str = "json") -> Path:
+    """Return the on-disk path for a payload whose logical (JSON) path is `path`."""
+    if archive_format == "json":
+        return path
+    if archive_format == "zst":
+        return path.with_suffix(path.suffix + ".zst")
+    raise ValueError(f"Unknown archive format {archive_format!r} (expected one of {ARCHIVE_FORMATS})")
+
+
+def logical_archive_path(path: Path) -> Path:
+    """Inverse of archive_path(): strip a trailing .zst so names match the usual *.json patterns."""
+    return path.with_suffix("") if path.suffix == ".zst" else path
+
+
+def find_archive(path: Path) -> Path | None:
+    """Return the stored file for logical path `path` in any archive format (plain JSON first), or None."""
+    for fmt in ARCHIVE_FORMATS:
+        p = archive_path(path, fmt)
+        if p.exists():
+            return p
+    return None
+
+
+def zstd_compress(data: bytes, level: int = ZSTD_LEVEL) -> bytes:
+    # Import lazily so plain-JSON archives don't require zstandard.
+    import zstandard  # type: ignore
+
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def read_archive_bytes(path: Path) -> bytes:
+    """Read a stored payload, transparently decompressing .zst archives back to the original body."""
+    data = path.read_bytes()
+    if path.suffix == ".zst":
+        import zstandard  # type: ignore
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def _espn_probabilities_rows(obj: dict[str, Any]) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for it in obj.get("items") or []:
+        if not isinstance(it, dict):
+            continue
+        play = it.get("play")
+        rows.append(
+            {
+                "sequence_number": it.get("sequenceNumber"),
+                "last_modified": it.get("lastModified"),
+                "home_win_percentage": it.get("homeWinPercentage"),
+                "away_win_percentage": it.get("awayWinPercentage"),
+                "tie_percentage": it.get("tiePercentage"),
+                "play_ref": play.get("$ref") if isinstance(play, dict) else None,
+            }
+        )
+    return rows
+
+
+def _kalshi_trades_rows(obj: dict[str, Any]) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for t in obj.get("trades") or []:
+        if not isinstance(t, dict):
+            continue
+        rows.append(
+            {
+                "trade_id": t.get("trade_id"),
+                "ticker": t.get("ticker") or obj.get("ticker"),
+                "created_time": t.get("created_time"),
+                "count": t.get("count"),
+                "price": t.get("price"),
+                "yes_price": t.get("yes_price"),
+                "no_price": t.get("no_price"),
+                "taker_side": t.get("taker_side"),
+            }
+        )
+    return rows
+
+
+def _kalshi_candlesticks_rows(obj: dict[str, Any]) -> list[dict[str, Any]]:
+    data = (obj.get("response") or {}).get("data") or {}
+    rows: list[dict[str, Any]] = []
+    for c in data.get("candlesticks") or []:
+        if not isinstance(c, dict):
+            continue
+        price = c.get("price") or {}
+        rows.append(
+            {
+                "end_period_ts": c.get("end_period_ts"),
+                "price_open": price.get("open"),
+                "price_high": price.get("high"),
+                "price_low": price.get("low"),
+                "price_close": price.get("close"),
+                "volume": c.get("volume"),
+                "open_interest": c.get("open_interest"),
+            }
+        )
+    return rows
+
+
+# Hot feeds that get a columnar sidecar: source_type -> (row extractor, column arrow types).
+SIDECAR_SOURCES: dict[str, tuple[Any, list[tuple[str, str]]]] = {
+    "espn_probabilities": (
+        _espn_probabilities_rows,
+        [
+            ("sequence_number", "int64"),
+            ("last_modified", "string"),
+            ("home_win_percentage", "float64"),
+            ("away_win_percentage", "float64"),
+            ("tie_percentage", "float64"),
+            ("play_ref", "string"),
+        ],
+    ),
+    "kalshi_trades": (
+        _kalshi_trades_rows,
+        [
+            ("trade_id", "string"),
+            ("ticker", "string"),
+            ("created_time", "string"),
+            ("count", "int64"),
+            ("price", "float64"),
+            ("yes_price", "int64"),
+            ("no_price", "int64"),
+            ("taker_side", "string"),
+        ],
+    ),
+    "kalshi_candlesticks": (
+        _kalshi_candlesticks_rows,
+        [
+            ("end_period_ts", "int64"),
+            ("price_open", "int64"),
+            ("price_high", "int64"),
+            ("price_low", "int64"),
+            ("price_close", "int64"),
+            ("volume", "int64"),
+            ("open_interest", "int64"),
+        ],
+    ),
+}
+
+
+def _coerce(value: Any, typ: str) -> Any:
+    # Feeds are loosely typed (ESPN sends sequenceNumber as a string); unparseable values become null.
+    if value is None:
+        return None
+    try:
+        if typ == "int64":
+            return int(float(value))
+        if typ == "float64":
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+def sidecar_path(path: Path) -> Path:
+    """Parquet sidecar location for logical payload path `path` (e.g. foo.json -> foo.parquet)."""
+    return path.with_suffix(".parquet")
+
+
+def write_parquet_sidecar(path: Path, *, source_type: str, obj: dict[str, Any]) -> tuple[Path, int]:
+    """
+    Flatten a hot-feed payload into a typed Parquet file next to its archive.
+    Returns (sidecar_path, row_count).
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    if source_type not in SIDECAR_SOURCES:
+        raise ValueError(f"No Parquet sidecar defined for source_type={source_type!r}")
+    extract, columns = SIDECAR_SOURCES[source_type]
+    rows = [{name: _coerce(r.get(name), typ) for name, typ in columns} for r in extract(obj)]
+    schema = pa.schema([(name, pa.type_for_alias(typ)) for name, typ in columns])
+    table = pa.Table.from_pylist(rows, schema=schema)
+
+    out = sidecar_path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(out.suffix + ".tmp")
+    pq.write_table(table, tmp, compression="zstd")
+    tmp.replace(out)
+    return out, table.num_rows
+
+
 @dataclass(frozen=True)
 class HttpRetry:
     max_attempts: int = 6
@@ -51,13 +241,20 @@ def _sleep(seconds: float, jitter_seconds: float) -> None:
 def http_get_bytes(
     url: str,
     retry: HttpRetry,
-    headers: dict[str, str] | None = None,
+    headers: dict[str, str] | Callable[[], dict[str, str]] | None = None,
     *,
     allow_non_200: bool = False,
+    session: Any | None = None,
+    before_attempt: Callable[[], None] | None = None,
 ) -> tuple[int, dict[str, str], bytes]:
     """
     Returns (http_status, response_headers_lower, body_bytes).
     Retries on network errors and on 5xx/429/403 with backoff.
+
+    `headers` may be a callable, evaluated before every attempt after `before_attempt`, for values
+    that expire (e.g. Kalshi request signatures) and must not be replayed on a retry.
+    `session` (a requests.Session) reuses keep-alive connections across calls; `before_attempt`
+    runs before every attempt, including retries (used for rate limiting).
     """
     # Import lazily so callers that only use nba_api fallbacks don't require requests at import time.
     import requests  # type: ignore
@@ -71,7 +268,7 @@ def http_get_bytes(
         ),
         "Accept": "application/json,text/plain,*/*",
     }
-    if headers:
+    if headers and not callable(headers):
         hdrs.update(headers)
 
     last_err: BaseException | None = None
@@ -81,7 +278,11 @@ def http_get_bytes(
         if elapsed > retry.deadline_seconds:
             raise RuntimeError(f"Deadline exceeded after {elapsed:.1f}s for {url}")
         try:
-            resp = requests.get(url, headers=hdrs, timeout=retry.timeout_seconds)
+            if before_attempt is not None:
+                before_attempt()
+            attempt_hdrs = {**hdrs, **headers()} if callable(headers) else hdrs
+            getter = session.get if session is not None else requests.get
+            resp = getter(url, headers=attempt_hdrs, timeout=retry.timeout_seconds)
             status = int(resp.status_code)
             resp_headers = {k.lower(): v for k, v in resp.headers.items()}
             body = resp.content
@@ -134,24 +335,49 @@ def write_with_manifest(
     source_type: str,
     source_key: str,
     fetched_at_utc: str,
-) -> None:
+    archive_format: str = "json",
+    parquet_sidecar: bool = False,
+) -> Path:
+    """
+    Store `body` at out_json_path (or its .zst variant) and write the provenance manifest.
+
+    sha256_hex/byte_size always describe the uncompressed body; `path` is the file actually on disk.
+    With parquet_sidecar=True, hot feeds listed in SIDECAR_SOURCES also get a flattened Parquet copy.
+    Returns the stored payload path.
+    """
     sha = sha256_hex(body)
-    atomic_write_bytes(out_json_path, body)
-    atomic_write_json(
-        out_manifest_path,
-        {
-            "source_type": source_type,
-            "source_key": source_key,
-            "url": url,
-            "fetched_at_utc": fetched_at_utc,
-            "http_status": http_status,
-            "etag": response_headers.get("etag"),
-            "last_modified": response_headers.get("last-modified"),
-            "content_type": response_headers.get("content-type"),
-            "sha256_hex": sha,
-            "byte_size": len(body),
-            "path": str(out_json_path),
-        },
-    )
+    stored_path = archive_path(out_json_path, archive_format)
+    stored = zstd_compress(body) if archive_format == "zst" else body
+    atomic_write_bytes(stored_path, stored)
+    # Drop a stale copy in the other format so readers never see two versions of one payload.
+    for fmt in ARCHIVE_FORMATS:
+        other = archive_path(out_json_path, fmt)
+        if other != stored_path and other.exists():
+            other.unlink()
+
+    manifest: dict[str, Any] = {
+        "source_type": source_type,
+        "source_key": source_key,
+        "url": url,
+        "fetched_at_utc": fetched_at_utc,
+        "http_status": http_status,
+        "etag": response_headers.get("etag"),
+        "last_modified": response_headers.get("last-modified"),
+        "content_type": response_headers.get("content-type"),
+        "sha256_hex": sha,
+        "byte_size": len(body),
+        "path": str(stored_path),
+        "archive_format": archive_format,
+        "stored_byte_size": len(stored),
+    }
+    if parquet_sidecar and source_type in SIDECAR_SOURCES:
+        side_path, side_rows = write_parquet_sidecar(out_json_path, source_type=source_type, obj=parse_json_bytes(body))
+        manifest["sidecar_path"] = str(side_path)
+        manifest["sidecar_rows"] = side_rows
+    else:
+        # No sidecar this time: remove one left by an earlier write so it can't disagree with the payload.
+        sidecar_path(out_json_path).unlink(missing_ok=True)
+    atomic_write_json(out_manifest_path, manifest)
+    return stored_path
 
 
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from scripts.lib._winprob_lib import (
+    WinProbArtifact,
+    encode_possession_vectorized,
+    load_catboost_model,
+    logit,
+    resolve_catboost_model_path,
+    sigmoid,
+    uses_opening_odds_baseline,
+)
+
+# Scaled numeric features: feature name -> (input column, PreprocessParams prefix, NaN/inf -> 0 after scaling).
+# Order is the build_design_matrix order.
+_SCALED_FEATURES: tuple[tuple[str, str, str, bool], ...] = (
+    ("point_differential_scaled", "point_differential", "point_diff", False),
+    ("time_remaining_regulation_scaled", "time_remaining_regulation", "time_rem", False),
+)
+_INTERACTION_FEATURES: tuple[tuple[str, str, str, bool], ...] = (
+    ("score_diff_div_sqrt_time_remaining_scaled", "score_diff_div_sqrt_time_remaining", "score_diff_div_sqrt_time_rem", True),
+    ("espn_home_prob_scaled", "espn_home_prob", "espn_home_prob", True),
+    ("espn_home_prob_lag_1_scaled", "espn_home_prob_lag_1", "espn_home_prob_lag_1", True),
+    ("espn_home_prob_delta_1_scaled", "espn_home_prob_delta_1", "espn_home_prob_delta_1", True),
+)
+_POSSESSION_FEATURES = ("possession_home", "possession_away", "possession_unknown")
+_PERIOD_FEATURES = ("period_1", "period_2", "period_3", "period_4")
+_ODDS_FEATURES = ("opening_overround", "has_opening_spread", "has_opening_total")
+
+# logit(1 - 1e-15): predict_proba applies Platt to logit(clamp01(p)), i.e. to the margin clipped at this bound.
+_PLATT_LOGIT_BOUND = float(logit(np.array([1.0 - 1e-15]))[0])
+
+
+@dataclass(frozen=True)
+class _Column:
+    """One design-matrix column: where it comes from and how it is transformed."""
+
+    name: str
+    kind: str  # "scaled" | "raw" | "possession" | "period"
+    source: str | None = None
+    mean: float = 0.0
+    std: float = 1.0
+    fill_nonfinite: bool = False
+    slot: int = 0  # index within a one-hot block
+
+
+def _feature_plan(artifact: WinProbArtifact, *, odds_nan_policy: str) -> list[_Column]:
+    """
+    Map artifact.feature_names onto the build_design_matrix layout, resolving preprocessing constants once.
+
+    Raises ValueError for feature layouts build_design_matrix cannot produce (e.g. pre-v2 odds artifacts).
+    """
+    names = list(artifact.feature_names)
+    pre = artifact.preprocess
+    plan: list[_Column] = []
+    for name, source, prefix, fill in _SCALED_FEATURES + _INTERACTION_FEATURES:
+        if name not in names:
+            continue
+        mean = getattr(pre, f"{prefix}_mean")
+        std = getattr(pre, f"{prefix}_std")
+        if mean is None or std is None:
+            raise ValueError(f"{source} is a model feature but its normalization params are missing")
+        if fill and float(std) == 0.0:
+            std = 1.0
+        plan.append(_Column(name, "scaled", source, float(mean), float(std), fill))
+        if name == "time_remaining_regulation_scaled":
+            plan.extend(_Column(n, "possession", "possession", slot=i) for i, n in enumerate(_POSSESSION_FEATURES))
+    if "period_1" in names:
+        plan.extend(_Column(n, "period", "period", slot=i + 1) for i, n in enumerate(_PERIOD_FEATURES))
+    for name in _ODDS_FEATURES:
+        if name in names:
+            plan.append(_Column(name, "raw", name, fill_nonfinite=(name == "opening_overround" and odds_nan_policy == "zero")))
+
+    expected = [c.name for c in plan]
+    if expected != names:
+        raise ValueError(f"Unsupported feature layout {names}; build_design_matrix order would be {expected}")
+    return plan
+
+
+def _column(columns: Any, name: str) -> np.ndarray | None:
+    """Column `name` as a numpy array from a mapping, a pandas DataFrame or a pyarrow RecordBatch/Table."""
+    schema = getattr(columns, "schema", None)
+    if schema is not None and hasattr(columns, "column"):
+        idx = schema.get_field_index(name)
+        if idx < 0:
+            return None
+        col = columns.column(idx)
+        if hasattr(col, "combine_chunks"):
+            col = col.combine_chunks()
+        return col.to_numpy(zero_copy_only=False)
+    if name not in columns:
+        return None
+    values = columns[name]
+    return values.to_numpy() if hasattr(values, "to_numpy") else np.asarray(values)
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values)
+    return values if values.dtype == np.float64 else values.astype(np.float64)
+
+
+class CompiledModel:
+    """
+    Batch scorer compiled once from a WinProbArtifact.
+
+    Everything predict_proba re-derives per call is resolved up front: the feature plan (which input columns
+    feed which design-matrix columns, with their scaling constants), the CatBoost model (path resolved and
+    loaded once), whether the opening-odds baseline applies, and the calibrator. Logistic regression is
+    scored without a design matrix: standardization is folded into the weights. CatBoost is scored on its
+    raw margin (plus baseline), so Platt scaling stays in logit space.
+
+    score() takes column arrays named like the training frame (point_differential, time_remaining_regulation,
+    possession, espn_home_prob, ..., opening_overround, opening_prob_home_fair) as a dict, a pandas DataFrame
+    or a pyarrow RecordBatch/Table, and returns calibrated home-win probabilities matching predict_proba.
+    """
+
+    def __init__(self, artifact: WinProbArtifact, *, artifact_dir: Path | None = None) -> None:
+        self.artifact = artifact
+        self.is_catboost = artifact.model_type == "catboost" and artifact.catboost_model_path is not None
+        self.plan = _feature_plan(artifact, odds_nan_policy="keep" if self.is_catboost else "zero")
+        self.uses_baseline = self.is_catboost and uses_opening_odds_baseline(artifact)
+
+        required = {c.source for c in self.plan if c.kind != "possession"}
+        if self.uses_baseline:
+            required.add("opening_prob_home_fair")
+        self.input_columns: tuple[str, ...] = tuple(sorted(required))
+
+        self._model = None
+        self.catboost_path: str | None = None
+        if self.is_catboost:
+            self.catboost_path = resolve_catboost_model_path(artifact, artifact_dir=artifact_dir)
+            self._model = load_catboost_model(self.catboost_path)
+        else:
+            self._fold_logreg()
+
+    def _fold_logreg(self) -> None:
+        w = np.asarray(self.artifact.model.weights, dtype=np.float64)
+        if len(w) != len(self.plan):
+            raise ValueError(f"Artifact has {len(w)} weights for {len(self.plan)} features")
+        intercept = float(self.artifact.model.intercept)
+        linear: list[tuple[str, float, float | None]] = []  # (source, coefficient on raw value, NaN fill value)
+        possession = np.zeros(3)
+        period = np.zeros(5)  # index 0 = unknown/other period (all-zero one-hot)
+        for wj, col in zip(w, self.plan):
+            if col.kind == "scaled":
+                intercept -= wj * col.mean / col.std
+                linear.append((col.source, wj / col.std, col.mean if col.fill_nonfinite else None))
+            elif col.kind == "raw":
+                linear.append((col.source, wj, 0.0 if col.fill_nonfinite else None))
+            elif col.kind == "possession":
+                possession[col.slot] = wj
+            else:
+                period[col.slot] = wj
+        self._intercept = intercept
+        self._linear = linear
+        self._possession_w = possession if np.any(possession) else None
+        self._period_w = period if any(c.kind == "period" for c in self.plan) else None
+
+    def _inputs(self, columns: Any) -> tuple[dict[str, np.ndarray], int]:
+        data: dict[str, np.ndarray] = {}
+        for name in self.input_columns:
+            values = _column(columns, name)
+            if values is None:
+                raise ValueError(f"Missing input column {name!r}; model needs {list(self.input_columns)}")
+            data[name] = values
+        n = len(data["point_differential"])
+        for name, values in data.items():
+            if len(values) != n:
+                raise ValueError(f"Column {name!r} has {len(values)} rows, expected {n}")
+        possession = _column(columns, "possession")
+        data["possession"] = possession if possession is not None else np.full(n, "unknown")
+        return data, n
+
+    @staticmethod
+    def _period_codes(values: np.ndarray) -> np.ndarray:
+        period = np.trunc(np.nan_to_num(_as_float(values), nan=0.0, posinf=0.0, neginf=0.0)).astype(np.int64)
+        return np.where((period >= 1) & (period <= 4), period, 0)
+
+    def design_matrix(self, columns: Any, *, dtype: Any = np.float64) -> np.ndarray:
+        """The build_design_matrix output for `columns`, written into one preallocated array."""
+        data, n = self._inputs(columns)
+        X = np.empty((n, len(self.plan)), dtype=dtype)
+        poss = periods = None
+        for j, col in enumerate(self.plan):
+            if col.kind == "scaled":
+                v = (_as_float(data[col.source]) - col.mean) / col.std
+                X[:, j] = np.nan_to_num(v, nan=0.0, posinf=0.0, neginf=0.0) if col.fill_nonfinite else v
+            elif col.kind == "raw":
+                v = _as_float(data[col.source])
+                X[:, j] = np.nan_to_num(v, nan=0.0, posinf=0.0, neginf=0.0) if col.fill_nonfinite else v
+            elif col.kind == "possession":
+                if poss is None:
+                    poss = encode_possession_vectorized(data["possession"])
+                X[:, j] = poss[:, col.slot]
+            else:
+                if periods is None:
+                    periods = self._period_codes(data["period"])
+                X[:, j] = periods == col.slot
+        return X
+
+    def margin(self, columns: Any, *, thread_count: int = -1) -> np.ndarray:
+        """Uncalibrated log-odds (including the opening-odds baseline when the model uses one)."""
+        if self.is_catboost:
+            X = self.design_matrix(columns, dtype=np.float32)
+            z = np.asarray(
+                self._model.predict(X, prediction_type="RawFormulaVal", thread_count=thread_count), dtype=np.float64
+            )
+            if self.uses_baseline:
+                p0 = _as_float(_column(columns, "opening_prob_home_fair"))
+                has_odds = ~np.isnan(p0)
+                z[has_odds] += logit(p0[has_odds])
+            return z
+
+        data, n = self._inputs(columns)
+        z = np.full(n, self._intercept)
+        for source, coef, fill in self._linear:
+            v = _as_float(data[source])
+            if fill is not None:
+                v = np.where(np.isfinite(v), v, fill)
+            z += coef * v
+        if self._possession_w is not None:
+            z += encode_possession_vectorized(data["possession"]) @ self._possession_w
+        if self._period_w is not None:
+            z += self._period_w[self._period_codes(data["period"])]
+        return z
+
+    def score(self, columns: Any, *, thread_count: int = -1) -> np.ndarray:
+        """Calibrated home-win probabilities, one per input row."""
+        z = self.margin(columns, thread_count=thread_count)
+        if self.artifact.isotonic is not None:
+            return self.artifact.isotonic.apply(sigmoid(z))
+        if self.artifact.platt is not None:
+            return self.artifact.platt.apply_on_logits(np.clip(z, -_PLATT_LOGIT_BOUND, _PLATT_LOGIT_BOUND))
+        return sigmoid(z)
+
+
+# id(artifact) -> (artifact, compiled); holding the artifact keeps the id from being reused while cached
+_compiled_cache: dict[int, tuple[WinProbArtifact, CompiledModel]] = {}
+
+
+def compile_artifact(artifact: WinProbArtifact, *, artifact_dir: Path | None = None) -> CompiledModel:
+    """CompiledModel for `artifact`, built once per artifact object per process."""
+    hit = _compiled_cache.get(id(artifact))
+    if hit is not None and hit[0] is artifact:
+        return hit[1]
+    compiled = CompiledModel(artifact, artifact_dir=artifact_dir)
+    _compiled_cache[id(artifact)] = (artifact, compiled)
+    return compiled
+
+
+def release_compiled(artifact: WinProbArtifact) -> None:
+    """Drop the cached CompiledModel for `artifact` (e.g. after its file was reloaded)."""
+    hit = _compiled_cache.get(id(artifact))
+    if hit is not None and hit[0] is artifact:
+        del _compiled_cache[id(artifact)]
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+METRIC_NAMES: tuple[str, ...] = ("logloss", "brier", "roc_auc", "ece_binned")
+
+
+def _as_arrays(p: Any, y: Any) -> tuple[np.ndarray, np.ndarray]:
+    return np.asarray(p, dtype=np.float64).ravel(), np.asarray(y, dtype=np.float64).ravel()
+
+
+def _wmean(values: np.ndarray, weights: np.ndarray | None) -> float:
+    if weights is None:
+        return float(np.mean(values))
+    return float(np.dot(weights, values) / np.sum(weights))
+
+
+def brier(p: Any, y: Any, *, weights: np.ndarray | None = None) -> float:
+    p, y = _as_arrays(p, y)
+    return _wmean((p - y) ** 2, weights)
+
+
+def logloss(p: Any, y: Any, *, eps: float = 1e-15, weights: np.ndarray | None = None) -> float:
+    p, y = _as_arrays(p, y)
+    pp = np.clip(p, eps, 1.0 - eps)
+    return -_wmean(y * np.log(pp) + (1.0 - y) * np.log(1.0 - pp), weights)
+
+
+def tie_groups(p: np.ndarray) -> tuple[np.ndarray, int]:
+    """Index of each row's distinct score in ascending order (ties share an index), plus the distinct count."""
+    uniq, inv = np.unique(p, return_inverse=True)
+    return inv.ravel(), int(len(uniq))
+
+
+def _auc_from_groups(inv: np.ndarray, n_groups: int, y: np.ndarray, weights: np.ndarray | None) -> float | None:
+    # Mann-Whitney U with average ranks: each positive scores 1 per negative strictly below it and 1/2 per tie.
+    pos_w = y == 1
+    neg_w = y == 0
+    if weights is not None:
+        pos_w = pos_w * weights
+        neg_w = neg_w * weights
+    pos = np.bincount(inv, weights=pos_w, minlength=n_groups)
+    neg = np.bincount(inv, weights=neg_w, minlength=n_groups)
+    n1 = float(pos.sum())
+    n0 = float(neg.sum())
+    if n1 <= 0 or n0 <= 0:
+        return None
+    neg_below = np.cumsum(neg) - neg
+    return float(np.dot(pos, neg_below + 0.5 * neg) / (n1 * n0))
+
+
+def roc_auc(p: Any, y: Any, *, weights: np.ndarray | None = None) -> float | None:
+    """
+    AUC via tie-averaged rank statistics in O(n log n) (one np.unique, two bincounts).
+    Returns None if y has only one class.
+    """
+    p, y = _as_arrays(p, y)
+    inv, n_groups = tie_groups(p)
+    return _auc_from_groups(inv, n_groups, y, weights)
+
+
+def bin_index(p: Any, bins: int) -> np.ndarray:
+    """Equal-width probability bin per row: floor(p * bins), clipped to [0, bins - 1]."""
+    p = np.asarray(p, dtype=np.float64)
+    return np.clip(np.floor(p * bins), 0, bins - 1).astype(np.intp)
+
+
+def binned_sums(
+    idx: np.ndarray, p: Any, y: Any, bins: int, *, weights: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(count, sum of p, sum of y) per bin in one pass each, for precomputed bin indices."""
+    p, y = _as_arrays(p, y)
+    if weights is None:
+        count = np.bincount(idx, minlength=bins).astype(np.float64)
+        return count, np.bincount(idx, weights=p, minlength=bins), np.bincount(idx, weights=y, minlength=bins)
+    return (
+        np.bincount(idx, weights=weights, minlength=bins),
+        np.bincount(idx, weights=weights * p, minlength=bins),
+        np.bincount(idx, weights=weights * y, minlength=bins),
+    )
+
+
+def ece_binned(p: Any, y: Any, *, bins: int, weights: np.ndarray | None = None) -> float | None:
+    p, y = _as_arrays(p, y)
+    if bins <= 0 or len(p) == 0:
+        return None
+    bins = int(bins)
+    count, sum_p, sum_y = binned_sums(bin_index(p, bins), p, y, bins, weights=weights)
+    # sum_b (n_b / n) * |mean_y_b - mean_p_b| == sum_b |sum_y_b - sum_p_b| / n
+    return float(np.sum(np.abs(sum_y - sum_p)) / np.sum(count))
+
+
+def reliability_bins(p: Any, y: Any, *, bins: int) -> list[dict[str, Any]]:
+    """Non-empty equal-width calibration bins: bin, range, n, avg_p, obs_rate, gap (obs_rate - avg_p)."""
+    p, y = _as_arrays(p, y)
+    bins = max(1, int(bins))
+    count, sum_p, sum_y = binned_sums(bin_index(p, bins), p, y, bins)
+    rows: list[dict[str, Any]] = []
+    for b in np.flatnonzero(count > 0):
+        avg_p = float(sum_p[b] / count[b])
+        obs = float(sum_y[b] / count[b])
+        rows.append(
+            {
+                "bin": int(b),
+                "range": [float(b / bins), float((b + 1) / bins)],
+                "n": int(count[b]),
+                "avg_p": avg_p,
+                "obs_rate": obs,
+                "gap": float(obs - avg_p),
+            }
+        )
+    return rows
+
+
+def metrics_summary(p: Any, y: Any, *, bins: int) -> dict[str, Any]:
+    """n, logloss, brier, roc_auc, ece_binned and prevalence_home_win for one prediction set."""
+    p, y = _as_arrays(p, y)
+    return {
+        "n": int(len(p)),
+        "logloss": logloss(p, y),
+        "brier": brier(p, y),
+        "roc_auc": roc_auc(p, y),
+        "ece_binned": ece_binned(p, y, bins=bins),
+        "prevalence_home_win": float(np.mean(y)) if len(y) else None,
+    }
+
+
+def bootstrap_ci(
+    p: Any,
+    y: Any,
+    *,
+    bins: int,
+    n_boot: int = 200,
+    alpha: float = 0.05,
+    groups: Sequence[Any] | np.ndarray | None = None,
+    metrics: Iterable[str] = METRIC_NAMES,
+    seed: int = 0,
+) -> dict[str, dict[str, float | None]]:
+    """
+    Percentile bootstrap confidence intervals for the metrics in METRIC_NAMES.
+
+    Replicates are expressed as per-row multiplicity weights instead of resampled copies, so the sort behind
+    the AUC ranks, the calibration bin indices and the per-row losses are computed once and every replicate
+    is a handful of O(n) dot products / bincounts. With `groups` (e.g. game_id) whole groups are resampled,
+    which is the honest interval for event rows that are strongly correlated within a game.
+
+    Returns {metric: {"lo", "hi", "std"}}; an entry is None when a metric is undefined on every replicate.
+    """
+    p, y = _as_arrays(p, y)
+    metrics = [m for m in metrics if m in METRIC_NAMES]
+    n = len(p)
+    if n == 0 or n_boot <= 0:
+        return {m: {"lo": None, "hi": None, "std": None} for m in metrics}
+
+    rng = np.random.default_rng(seed)
+    pp = np.clip(p, 1e-15, 1.0 - 1e-15)
+    losses = {
+        "brier": (p - y) ** 2,
+        "logloss": -(y * np.log(pp) + (1.0 - y) * np.log(1.0 - pp)),
+    }
+    inv, n_groups = tie_groups(p) if "roc_auc" in metrics else (None, 0)
+    bidx = bin_index(p, max(1, int(bins))) if "ece_binned" in metrics else None
+    if groups is not None:
+        _, group_inv = np.unique(np.asarray(groups), return_inverse=True)
+        group_inv = group_inv.ravel()
+        n_units = int(group_inv.max()) + 1
+    else:
+        group_inv = None
+        n_units = n
+
+    draws = {m: np.full(n_boot, np.nan) for m in metrics}
+    for r in range(n_boot):
+        counts = np.bincount(rng.integers(0, n_units, size=n_units), minlength=n_units).astype(np.float64)
+        w = counts if group_inv is None else counts[group_inv]
+        total = w.sum()
+        if total <= 0:
+            continue
+        for m in metrics:
+            if m in losses:
+                draws[m][r] = float(np.dot(w, losses[m]) / total)
+            elif m == "roc_auc":
+                auc = _auc_from_groups(inv, n_groups, y, w)
+                draws[m][r] = np.nan if auc is None else auc
+            else:
+                count, sum_p, sum_y = binned_sums(bidx, p, y, max(1, int(bins)), weights=w)
+                draws[m][r] = float(np.sum(np.abs(sum_y - sum_p)) / total)
+
+    out: dict[str, dict[str, float | None]] = {}
+    for m in metrics:
+        vals = draws[m][np.isfinite(draws[m])]
+        if len(vals) == 0:
+            out[m] = {"lo": None, "hi": None, "std": None}
+            continue
+        lo, hi = np.quantile(vals, [alpha / 2.0, 1.0 - alpha / 2.0])
+        out[m] = {"lo": float(lo), "hi": float(hi), "std": float(np.std(vals, ddof=1)) if len(vals) > 1 else 0.0}
+    return out
+
+
+def _grouped_auc(p: np.ndarray, y: np.ndarray, cell: np.ndarray, n_cells: int) -> np.ndarray:
+    """Tie-averaged AUC per cell id (NaN where a cell has one class), from one sort over all rows."""
+    order = np.lexsort((p, cell))
+    ps, ys, cs = p[order], y[order], cell[order]
+    new_tie = np.empty(len(ps), dtype=bool)
+    new_tie[0] = True
+    new_tie[1:] = (cs[1:] != cs[:-1]) | (ps[1:] != ps[:-1])
+    tie = np.cumsum(new_tie) - 1
+    pos = np.bincount(tie, weights=(ys == 1).astype(np.float64))
+    neg = np.bincount(tie, weights=(ys == 0).astype(np.float64))
+    tie_cell = cs[new_tie]
+
+    # Negatives strictly below each tie group within its own cell.
+    new_cell = np.empty(len(tie_cell), dtype=bool)
+    new_cell[0] = True
+    new_cell[1:] = tie_cell[1:] != tie_cell[:-1]
+    neg_before = np.cumsum(neg) - neg
+    neg_below = neg_before - neg_before[new_cell][np.cumsum(new_cell) - 1]
+
+    u = np.bincount(tie_cell, weights=pos * (neg_below + 0.5 * neg), minlength=n_cells)
+    n1 = np.bincount(tie_cell, weights=pos, minlength=n_cells)
+    n0 = np.bincount(tie_cell, weights=neg, minlength=n_cells)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((n1 > 0) & (n0 > 0), u / (n1 * n0), np.nan)
+
+
+def _py(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def grouped_metrics(
+    probs: Mapping[str, Any],
+    y: Any,
+    *,
+    keys: Mapping[str, Any] | None = None,
+    bins: int,
+    include_overall: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    metrics_summary for every model x every group of every grouping key, in long format:
+    [{"model", "group_by", "group", "n", "logloss", "brier", "roc_auc", "ece_binned", "prevalence_home_win"}, ...]
+
+    `probs` maps model name -> per-row probabilities (all aligned with `y`); `keys` maps a grouping name
+    (e.g. "time_bucket", "period", "season_start", "has_odds") -> per-row group values. With include_overall
+    a ("overall", "all") group is added. For each key every metric is a single bincount over a stacked
+    (model, group) cell index (one sort for AUC), instead of a mask and a metric call per model per group.
+    """
+    names = list(probs)
+    y = np.asarray(y, dtype=np.float64).ravel()
+    n = len(y)
+    if not names or n == 0:
+        return []
+    P = np.vstack([np.asarray(probs[m], dtype=np.float64).ravel() for m in names])
+    if P.shape[1] != n:
+        raise ValueError(f"probabilities have {P.shape[1]} rows, labels have {n}")
+    n_models = len(names)
+    bins = max(1, int(bins))
+
+    pp = np.clip(P, 1e-15, 1.0 - 1e-15)
+    y_all = np.tile(y, n_models)
+    brier_loss = ((P - y) ** 2).ravel()
+    log_loss = (-(y * np.log(pp) + (1.0 - y) * np.log(1.0 - pp))).ravel()
+    p_flat = P.ravel()
+    bin_flat = bin_index(P, bins).ravel()
+
+    groupings: dict[str, Any] = {"overall": np.full(n, "all")} if include_overall else {}
+    groupings.update(keys or {})
+
+    rows: list[dict[str, Any]] = []
+    for group_by, values in groupings.items():
+        values = np.asarray(values)
+        if len(values) != n:
+            raise ValueError(f"grouping {group_by!r} has {len(values)} rows, labels have {n}")
+        uniq, codes = np.unique(values, return_inverse=True)
+        codes = codes.ravel()
+        n_groups = len(uniq)
+        n_cells = n_models * n_groups
+        cell = (np.arange(n_models)[:, None] * n_groups + codes[None, :]).ravel()
+
+        count = np.bincount(codes, minlength=n_groups).astype(np.float64)
+        prevalence = np.bincount(codes, weights=y, minlength=n_groups) / count
+        brier_g = np.bincount(cell, weights=brier_loss, minlength=n_cells).reshape(n_models, n_groups) / count
+        logloss_g = np.bincount(cell, weights=log_loss, minlength=n_cells).reshape(n_models, n_groups) / count
+        cell_bin = cell * bins + bin_flat
+        sum_p = np.bincount(cell_bin, weights=p_flat, minlength=n_cells * bins)
+        sum_y = np.bincount(cell_bin, weights=y_all, minlength=n_cells * bins)
+        ece_g = np.abs(sum_y - sum_p).reshape(n_models, n_groups, bins).sum(axis=2) / count
+        auc_g = _grouped_auc(p_flat, y_all, cell, n_cells).reshape(n_models, n_groups)
+
+        for m, name in enumerate(names):
+            for g in range(n_groups):
+                auc = auc_g[m, g]
+                rows.append(
+                    {
+                        "model": name,
+                        "group_by": group_by,
+                        "group": _py(uniq[g]),
+                        "n": int(count[g]),
+                        "logloss": float(logloss_g[m, g]),
+                        "brier": float(brier_g[m, g]),
+                        "roc_auc": None if np.isnan(auc) else float(auc),
+                        "ece_binned": float(ece_g[m, g]),
+                        "prevalence_home_win": float(prevalence[g]),
+                    }
+                )
+    return rows
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from scripts.lib._inference_lib import CompiledModel, compile_artifact, release_compiled
+from scripts.lib._winprob_lib import WinProbArtifact, evict_catboost_model, load_artifact
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Named models used by grid search / simulation / precompute (paths relative to the repo root).
+MODEL_FILES: dict[str, str] = {
+    # "logreg_platt": "data/models/winprob_logreg_platt_2017-2023.json",
+    # "logreg_isotonic": "data/models/winprob_logreg_isotonic_2017-2023.json",
+    # "catboost_platt": "data/models/winprob_catboost_platt_2017-2023.json",
+    # "catboost_isotonic": "data/models/winprob_catboost_isotonic_2017-2023.json",
+    # Pre-game odds integration models (baseline and odds, each with platt and isotonic calibration) - v1 (moved to v1/)
+    "catboost_baseline_platt": "artifacts/v1/winprob_catboost_baseline_platt.json",
+    "catboost_baseline_isotonic": "artifacts/v1/winprob_catboost_baseline_isotonic.json",
+    "catboost_odds_platt": "artifacts/v1/winprob_catboost_odds_platt.json",
+    "catboost_odds_isotonic": "artifacts/v1/winprob_catboost_odds_isotonic.json",
+    # No-interaction models (baseline and odds, each with platt and isotonic calibration) - v1 (moved to v1/)
+    "catboost_baseline_no_interaction_platt": "artifacts/v1/winprob_catboost_baseline_no_interaction_platt.json",
+    "catboost_baseline_no_interaction_isotonic": "artifacts/v1/winprob_catboost_baseline_no_interaction_isotonic.json",
+    "catboost_odds_no_interaction_platt": "artifacts/v1/winprob_catboost_odds_no_interaction_platt.json",
+    "catboost_odds_no_interaction_isotonic": "artifacts/v1/winprob_catboost_odds_no_interaction_isotonic.json",
+    # v2 models (with updated feature set and uses_opening_odds_baseline flag)
+    "catboost_baseline_platt_v2": "artifacts/winprob_catboost_baseline_platt_v2.json",
+    "catboost_baseline_isotonic_v2": "artifacts/winprob_catboost_baseline_isotonic_v2.json",
+    "catboost_odds_platt_v2": "artifacts/winprob_catboost_odds_platt_v2.json",
+    "catboost_odds_isotonic_v2": "artifacts/winprob_catboost_odds_isotonic_v2.json",
+    "catboost_baseline_no_interaction_platt_v2": "artifacts/winprob_catboost_baseline_no_interaction_platt_v2.json",
+    "catboost_baseline_no_interaction_isotonic_v2": "artifacts/winprob_catboost_baseline_no_interaction_isotonic_v2.json",
+    "catboost_odds_no_interaction_platt_v2": "artifacts/winprob_catboost_odds_no_interaction_platt_v2.json",
+    "catboost_odds_no_interaction_isotonic_v2": "artifacts/winprob_catboost_odds_no_interaction_isotonic_v2.json",
+}
+
+# Directories whose *.json artifacts are also addressable by file stem.
+MODEL_DIRS: tuple[str, ...] = ("data/models", "artifacts", "artifacts/v1")
+
+
+@dataclass
+class _Loaded:
+    stamp: tuple[int, int]  # (st_mtime_ns, st_size) of the artifact JSON when it was parsed
+    artifact: WinProbArtifact
+    compiled: CompiledModel | None = None
+
+
+class ModelRegistry:
+    """
+    Process-wide index of win-prob artifacts, loaded lazily and memoized by file mtime/size.
+
+    The name index (MODEL_FILES plus every *.json under MODEL_DIRS, by stem) is built once on first use.
+    get() parses an artifact the first time it is asked for and afterwards only stats the file; a changed
+    file is reparsed (and its CatBoost model reloaded) on the next call. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        root: Path | str = REPO_ROOT,
+        named: dict[str, str] | None = None,
+        model_dirs: Iterable[str] = MODEL_DIRS,
+    ) -> None:
+        self.root = Path(root)
+        self._named = dict(MODEL_FILES if named is None else named)
+        self._model_dirs = tuple(model_dirs)
+        self._index: dict[str, Path] | None = None
+        self._loaded: dict[Path, _Loaded] = {}
+        self._lock = threading.RLock()
+
+    def _build_index(self) -> dict[str, Path]:
+        index: dict[str, Path] = {}
+        for model_dir in self._model_dirs:
+            for path in sorted((self.root / model_dir).glob("*.json")):
+                index.setdefault(path.stem, path)
+        for name, rel in self._named.items():
+            index[name] = self.root / rel
+        return index
+
+    def index(self) -> dict[str, Path]:
+        """Model name -> artifact path (named models may point at files that don't exist yet)."""
+        with self._lock:
+            if self._index is None:
+                self._index = self._build_index()
+            return dict(self._index)
+
+    def refresh_index(self) -> None:
+        with self._lock:
+            self._index = None
+
+    def path(self, name: str) -> Path:
+        """
+        Artifact path for an indexed model name. File paths are not accepted: names can come from web requests,
+        and an arbitrary artifact JSON would also pick the CatBoost model file it points at.
+        """
+        index = self.index()
+        if name in index:
+            return index[name]
+        raise ValueError(f"Unknown model name: {name}. Valid options: {sorted(index)}")
+
+    def _entry(self, name: str) -> tuple[Path, _Loaded]:
+        path = self.path(name)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Model file not found: {path}") from None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._loaded.get(path)
+            if entry is not None and entry.stamp == stamp:
+                return path, entry
+            if entry is not None:
+                logger.info(f"[MODEL] {path} changed on disk; reloading")
+                release_compiled(entry.artifact)
+                if entry.compiled is not None and entry.compiled.catboost_path is not None:
+                    evict_catboost_model(entry.compiled.catboost_path)
+            t0 = time.time()
+            entry = _Loaded(stamp=stamp, artifact=load_artifact(path))
+            self._loaded[path] = entry
+            logger.debug(f"[MODEL] Loaded {name} in {time.time() - t0:.2f}s from {path}")
+            return path, entry
+
+    def get(self, name: str) -> WinProbArtifact:
+        """The artifact for `name` (parsed once per file version)."""
+        return self._entry(name)[1].artifact
+
+    def compiled(self, name: str) -> CompiledModel:
+        """CompiledModel for `name`; also what compile_artifact() returns for the same artifact object."""
+        path, entry = self._entry(name)
+        with self._lock:
+            if entry.compiled is None:
+                entry.compiled = compile_artifact(entry.artifact, artifact_dir=path.parent)
+            return entry.compiled
+
+    def warm(self, names: Iterable[str] | None = None, *, stop: threading.Event | None = None) -> list[str]:
+        """Load and compile models (CatBoost .cbm included); missing files are skipped. Returns names warmed."""
+        warmed: list[str] = []
+        targets = list(names) if names is not None else list(self._named)
+        for name in targets:
+            if stop is not None and stop.is_set():
+                break
+            try:
+                if not self.path(name).exists():
+                    continue
+                self.compiled(name)
+                warmed.append(name)
+            except Exception as e:
+                logger.warning(f"[MODEL] Warm-up skipped {name}: {e}")
+        return warmed
+
+    def warm_in_background(
+        self, names: Iterable[str] | None = None, *, stop: threading.Event | None = None
+    ) -> threading.Thread:
+        def _run() -> None:
+            t0 = time.time()
+            warmed = self.warm(names, stop=stop)
+            logger.info(f"[MODEL] Warmed {len(warmed)} models in {time.time() - t0:.1f}s")
+
+        thread = threading.Thread(target=_run, name="model-registry-warm", daemon=True)
+        thread.start()
+        return thread
+
+
+_registry: ModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """The process-wide ModelRegistry (created on first use)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import psycopg
+
+from scripts.lib._winprob_lib import compute_opening_odds_features
+
+logger = logging.getLogger(__name__)
+
+OPENING_ODDS_FEATURES_TABLE = "derived.opening_odds_features_v1"
+OPENING_ODDS_BUILDS_TABLE = "derived.opening_odds_features_builds_v1"
+
+OPENING_ODDS_FEATURES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS derived.opening_odds_features_v1 (
+  espn_game_id            TEXT PRIMARY KEY,
+  opening_moneyline_home  DOUBLE PRECISION,
+  opening_moneyline_away  DOUBLE PRECISION,
+  opening_spread          DOUBLE PRECISION,
+  opening_total           DOUBLE PRECISION,
+  opening_prob_home_fair  DOUBLE PRECISION,
+  opening_overround       DOUBLE PRECISION,
+  updated_at              TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- One row per full build. Per-game refreshes only keep an already fully built table current, so readers
+-- treat the feature table as complete only once a row exists here.
+CREATE TABLE IF NOT EXISTS derived.opening_odds_features_builds_v1 (
+  built_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  games     INTEGER NOT NULL
+);
+"""
+
+# Raw opening lines (as the training queries used to pivot them) followed by the engineered features.
+OPENING_ODDS_RAW_COLUMNS: tuple[str, ...] = (
+    "opening_moneyline_home",
+    "opening_moneyline_away",
+    "opening_spread",
+    "opening_total",
+)
+OPENING_ODDS_COLUMNS: tuple[str, ...] = OPENING_ODDS_RAW_COLUMNS + ("opening_prob_home_fair", "opening_overround")
+
+# One row per game from external.sportsbook_odds_snapshots; {scope} narrows it to a list of games.
+_PIVOT_SQL = """
+SELECT
+    espn_game_id,
+    MAX(odds_decimal) FILTER (WHERE market_type = 'moneyline' AND side = 'home') AS opening_moneyline_home,
+    MAX(odds_decimal) FILTER (WHERE market_type = 'moneyline' AND side = 'away') AS opening_moneyline_away,
+    MAX(line_value) FILTER (WHERE market_type = 'spread' AND side = 'home') AS opening_spread,
+    MAX(line_value) FILTER (WHERE market_type = 'total' AND side = 'over') AS opening_total
+FROM external.sportsbook_odds_snapshots
+WHERE is_opening_line = TRUE
+  AND espn_game_id IS NOT NULL
+  {scope}
+GROUP BY espn_game_id
+"""
+
+_INSERT_SQL = f"""
+INSERT INTO {OPENING_ODDS_FEATURES_TABLE} (espn_game_id, {", ".join(OPENING_ODDS_COLUMNS)})
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+# Per-game features: espn_game_id -> one float per OPENING_ODDS_COLUMNS (NaN where missing)
+OpeningOddsStore = Mapping[str, tuple[float, ...]]
+
+
+def _float_or_nan(v: Any) -> float:
+    return np.nan if v is None else float(v)
+
+
+def engineer_opening_odds(rows: Iterable[tuple]) -> dict[str, tuple[float, ...]]:
+    """(espn_game_id, ml_home, ml_away, spread, total) rows -> store entries, engineered with compute_opening_odds_features."""
+    rows = list(rows)
+    game_ids = [str(r[0]) for r in rows]
+    raw = np.array([[_float_or_nan(v) for v in r[1:5]] for r in rows], dtype=np.float64).reshape(len(rows), 4)
+    feats = compute_opening_odds_features(
+        opening_moneyline_home=raw[:, 0],
+        opening_moneyline_away=raw[:, 1],
+        opening_spread=raw[:, 2],
+        opening_total=raw[:, 3],
+    )
+    table = np.column_stack([raw, feats["opening_prob_home_fair"], feats["opening_overround"]])
+    return {gid: tuple(float(x) for x in values) for gid, values in zip(game_ids, table)}
+
+
+def _pivot(conn: psycopg.Connection, game_ids: list[str] | None) -> list[tuple]:
+    if game_ids is None:
+        return conn.execute(_PIVOT_SQL.format(scope="")).fetchall()
+    return conn.execute(_PIVOT_SQL.format(scope="AND espn_game_id = ANY(%s::text[])"), (game_ids,)).fetchall()
+
+
+def _is_built(conn: psycopg.Connection) -> bool:
+    """Whether the feature table has had a full build (False if the tables don't exist yet)."""
+    try:
+        # Savepoint: a missing table must not abort the caller's transaction.
+        with conn.transaction():
+            return bool(conn.execute(f"SELECT EXISTS (SELECT 1 FROM {OPENING_ODDS_BUILDS_TABLE})").fetchone()[0])
+    except psycopg.errors.UndefinedTable:
+        return False
+
+
+def refresh_opening_odds_features(conn: psycopg.Connection, game_ids: Iterable[str] | None = None) -> int:
+    """
+    Recompute the per-game opening-odds features from external.sportsbook_odds_snapshots and commit.
+
+    With game_ids, only those games are rewritten (a game whose opening lines disappeared loses its row);
+    otherwise the whole table is rebuilt and the build is recorded. A scoped refresh against a table that was
+    never fully built does the full build instead, so it can't leave a table holding only the touched games.
+    Returns the number of games written.
+    """
+    scope = None if game_ids is None else sorted({str(g) for g in game_ids if g is not None})
+    conn.execute(OPENING_ODDS_FEATURES_TABLE_SQL)
+    if scope is not None and not _is_built(conn):
+        logger.info(f"{OPENING_ODDS_FEATURES_TABLE} has not been fully built; building it for every game")
+        scope = None
+    if scope == []:
+        conn.commit()
+        return 0
+    store = engineer_opening_odds(_pivot(conn, scope))
+    with conn.cursor() as cur:
+        if scope is None:
+            cur.execute(f"DELETE FROM {OPENING_ODDS_FEATURES_TABLE}")
+        else:
+            cur.execute(f"DELETE FROM {OPENING_ODDS_FEATURES_TABLE} WHERE espn_game_id = ANY(%s::text[])", (scope,))
+        cur.executemany(
+            _INSERT_SQL,
+            [(gid, *(None if np.isnan(x) else x for x in values)) for gid, values in store.items()],
+        )
+        if scope is None:
+            cur.execute(f"INSERT INTO {OPENING_ODDS_BUILDS_TABLE} (games) VALUES (%s)", (len(store),))
+    conn.commit()
+    return len(store)
+
+
+def ensure_opening_odds_features(conn: psycopg.Connection) -> None:
+    """Create the feature table if needed and build it once if it never was (later loads refresh it per game)."""
+    conn.execute(OPENING_ODDS_FEATURES_TABLE_SQL)
+    built = _is_built(conn)
+    conn.commit()
+    if not built:
+        n = refresh_opening_odds_features(conn)
+        logger.info(f"Built {OPENING_ODDS_FEATURES_TABLE} for {n} games")
+
+
+def load_opening_odds_features(conn: psycopg.Connection, game_ids: Iterable[str] | None = None) -> dict[str, tuple[float, ...]]:
+    """
+    Per-game opening-odds features (espn_game_id -> OPENING_ODDS_COLUMNS values) for `game_ids` (or all games).
+
+    Reads the feature table, building it first (ensure_opening_odds_features) if it has never been fully built,
+    so games a scoped refresh didn't touch are not silently missing.
+    """
+    scope = None if game_ids is None else sorted({str(g) for g in game_ids if g is not None})
+    if scope == []:
+        return {}
+    if not _is_built(conn):
+        ensure_opening_odds_features(conn)
+    sql = f"SELECT espn_game_id, {', '.join(OPENING_ODDS_COLUMNS)} FROM {OPENING_ODDS_FEATURES_TABLE}"
+    if scope is None:
+        rows = conn.execute(sql).fetchall()
+    else:
+        rows = conn.execute(sql + " WHERE espn_game_id = ANY(%s::text[])", (scope,)).fetchall()
+    return {str(r[0]): tuple(_float_or_nan(v) for v in r[1:]) for r in rows}
+
+
+def broadcast_opening_odds(game_ids: Iterable[Any], store: OpeningOddsStore) -> dict[str, np.ndarray]:
+    """OPENING_ODDS_COLUMNS as per-row arrays for a column of game ids (NaN for games without opening odds)."""
+    ids = np.asarray([str(g) for g in game_ids], dtype=object)
+    if len(ids) == 0:
+        return {name: np.empty(0, dtype=np.float64) for name in OPENING_ODDS_COLUMNS}
+    uniq, inverse = np.unique(ids, return_inverse=True)
+    missing = (np.nan,) * len(OPENING_ODDS_COLUMNS)
+    per_game = np.array([store.get(g, missing) for g in uniq], dtype=np.float64).reshape(len(uniq), len(OPENING_ODDS_COLUMNS))
+    rows = per_game[inverse]
+    return {name: rows[:, j] for j, name in enumerate(OPENING_ODDS_COLUMNS)}
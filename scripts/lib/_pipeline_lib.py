@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Sequence
+
+
+@dataclass(frozen=True)
+class PipelineStep:
+    """
+    One node of an in-process pipeline.
+
+    `fn` receives a dict of {dependency name: dependency return value} and returns this step's value.
+    Raising marks the step failed; steps downstream of a failure are skipped, independent branches keep going.
+    A step still running `timeout_seconds` after it started is reported failed the same way.
+    """
+
+    name: str
+    fn: Callable[[dict[str, Any]], Any]
+    depends_on: tuple[str, ...] = ()
+    timeout_seconds: float | None = None
+
+
+@dataclass
+class StepResult:
+    name: str
+    status: str  # "succeeded" | "failed" | "skipped"
+    value: Any = None
+    error: str | None = None
+    started_at: str | None = None
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        if not isinstance(d["value"], (str, int, float, bool, type(None), list, dict)):
+            d["value"] = repr(d["value"])
+        return d
+
+
+@dataclass
+class PipelineReport:
+    steps: list[StepResult] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    # Timed-out steps whose threads may still be running: name -> future of the discarded result
+    abandoned: dict[str, Future[StepResult]] = field(default_factory=dict, repr=False)
+
+    def __getitem__(self, name: str) -> StepResult:
+        for r in self.steps:
+            if r.name == name:
+                return r
+        raise KeyError(name)
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status == "succeeded" for r in self.steps)
+
+    def still_running(self) -> list[str]:
+        """Timed-out steps whose threads have not returned yet."""
+        return [name for name, fut in self.abandoned.items() if not fut.done()]
+
+    def wait_abandoned(self, timeout: float | None = None) -> list[str]:
+        """
+        Block until the threads of timed-out steps return (their results stay discarded), or `timeout` passes.
+
+        Callers that own resources a step may still be using (a connection pool, a lock against a concurrent
+        run of the same loaders) release them only after this. Returns the steps still running.
+        """
+        if self.abandoned:
+            wait(list(self.abandoned.values()), timeout=timeout)
+        return self.still_running()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "steps": [r.as_dict() for r in self.steps],
+        }
+
+
+# How often to check whether a submitted step with a timeout has started running.
+_START_POLL_SECONDS = 0.05
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _validate(steps: Sequence[PipelineStep]) -> None:
+    names = [s.name for s in steps]
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        raise ValueError(f"duplicate pipeline step names: {dupes}")
+    known = set(names)
+    for s in steps:
+        missing = [d for d in s.depends_on if d not in known]
+        if missing:
+            raise ValueError(f"step {s.name!r} depends on unknown steps: {missing}")
+    # Kahn's algorithm, only to reject cycles up front.
+    indeg = {s.name: len(s.depends_on) for s in steps}
+    ready = [n for n, d in indeg.items() if d == 0]
+    seen = 0
+    while ready:
+        n = ready.pop()
+        seen += 1
+        for s in steps:
+            if n in s.depends_on:
+                indeg[s.name] -= 1
+                if indeg[s.name] == 0:
+                    ready.append(s.name)
+    if seen != len(steps):
+        raise ValueError("pipeline steps contain a dependency cycle")
+
+
+def run_pipeline(
+    steps: Iterable[PipelineStep],
+    *,
+    max_workers: int = 4,
+    on_step: Callable[[StepResult], None] | None = None,
+) -> PipelineReport:
+    """
+    Run `steps` as a DAG on a thread pool: each step starts as soon as all of its dependencies succeed,
+    so independent branches (e.g. ESPN scoreboards vs. Kalshi markets vs. candlesticks) overlap.
+
+    Results are returned in declaration order with per-step timing; `on_step` fires as each step settles.
+
+    A step past its timeout_seconds is settled as failed without waiting for it. Threads cannot be
+    interrupted, so its thread is abandoned: the pool is shut down without waiting, whatever the step
+    returns later is discarded, and its future is kept in the report's `abandoned` so the caller can
+    wait for it (PipelineReport.wait_abandoned) before tearing down anything the step still uses.
+    """
+    steps = list(steps)
+    _validate(steps)
+    by_name = {s.name: s for s in steps}
+    results: dict[str, StepResult] = {}
+    started: dict[str, tuple[str, float]] = {}  # name -> (started_at, monotonic start), set by the worker
+    t0 = time.monotonic()
+
+    def settle(res: StepResult) -> None:
+        results[res.name] = res
+        if on_step is not None:
+            on_step(res)
+
+    def execute(step: PipelineStep, upstream: dict[str, Any]) -> StepResult:
+        started_at = _utc_now_iso()
+        s0 = time.monotonic()
+        started[step.name] = (started_at, s0)
+        try:
+            value = step.fn(upstream)
+            return StepResult(step.name, "succeeded", value=value, started_at=started_at, elapsed_seconds=time.monotonic() - s0)
+        except Exception as e:  # noqa: BLE001
+            return StepResult(step.name, "failed", error=str(e), started_at=started_at, elapsed_seconds=time.monotonic() - s0)
+
+    def next_timeout() -> float | None:
+        """Seconds until the earliest running step's deadline (None: no deadline to watch)."""
+        waits = []
+        for name in running.values():
+            limit = by_name[name].timeout_seconds
+            if limit is None:
+                continue
+            if name not in started:
+                waits.append(_START_POLL_SECONDS)  # Queued or just submitted: its clock starts in the worker
+                continue
+            waits.append(started[name][1] + limit - time.monotonic())
+        return max(0.0, min(waits)) if waits else None
+
+    def expire() -> None:
+        now = time.monotonic()
+        for fut, name in list(running.items()):
+            limit = by_name[name].timeout_seconds
+            if limit is None or name not in started or now - started[name][1] < limit:
+                continue
+            running.pop(fut)
+            abandoned[name] = fut
+            started_at, s0 = started[name]
+            settle(StepResult(name, "failed", error=f"timed out after {limit:g}s", started_at=started_at, elapsed_seconds=now - s0))
+
+    ex = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="pipeline")
+    running: dict[Future[StepResult], str] = {}
+    abandoned: dict[str, Future[StepResult]] = {}
+    try:
+        pending = list(steps)
+        while pending or running:
+            for step in list(pending):
+                deps = [results.get(d) for d in step.depends_on]
+                if any(r is None for r in deps):
+                    continue
+                pending.remove(step)
+                blocked = [r.name for r in deps if r is not None and r.status != "succeeded"]
+                if blocked:
+                    settle(StepResult(step.name, "skipped", error=f"upstream not succeeded: {', '.join(blocked)}"))
+                    continue
+                upstream = {d: results[d].value for d in step.depends_on}
+                running[ex.submit(execute, step, upstream)] = step.name
+            if not running:
+                # Everything left was just skipped in this pass; loop again to cascade.
+                continue
+            done, _ = wait(running, timeout=next_timeout(), return_when=FIRST_COMPLETED)
+            for fut in done:
+                running.pop(fut)
+                settle(fut.result())
+            expire()
+    finally:
+        # A timed-out step must not hold up the report: don't join the pool behind it.
+        ex.shutdown(wait=not abandoned, cancel_futures=True)
+
+    return PipelineReport(
+        steps=[results[n] for n in by_name], elapsed_seconds=time.monotonic() - t0, abandoned=abandoned
+    )
+
+
+def _invoke_main(main: Callable[[list[str] | None], int | None], argv: list[str]) -> tuple[int, str | None]:
+    try:
+        rc = main(argv)
+    except SystemExit as e:
+        if e.code is None:
+            return 0, None
+        if isinstance(e.code, int):
+            return e.code, None
+        return 1, str(e.code)
+    return int(rc or 0), None
+
+
+def run_script_main(main: Callable[[list[str] | None], int | None], argv: list[str]) -> int:
+    """
+    Call a script's `main(argv)` in-process and return its exit code, the way subprocess.run().returncode would.
+
+    A SystemExit carrying a message is printed to stderr and reported as exit code 1.
+    """
+    rc, message = _invoke_main(main, argv)
+    if message:
+        print(message, file=sys.stderr, flush=True)
+    return rc
+
+
+def call_script_main(main: Callable[[list[str] | None], int | None], argv: list[str]) -> None:
+    """
+    Call a script's `main(argv)` in-process, turning a nonzero exit (return code or SystemExit) into RuntimeError.
+    """
+    rc, message = _invoke_main(main, argv)
+    if rc != 0:
+        raise RuntimeError(message or f"exited with code {rc}")
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+EVALUATIONS_DIR = REPO_ROOT / "data" / "models" / "evaluations"
+
+REPORT_GLOB = "winprob_eval_*.json"
+# Pre-rendered plot assets written next to a report by evaluate_winprob_model.py --plot-calibration.
+PLOT_ASSETS: tuple[tuple[str, str], ...] = (
+    ("calibration", "svg"),
+    ("calibration", "jpg"),
+    ("calibration_context", "svg"),
+    ("calibration_context", "jpg"),
+)
+# Kept in a subdirectory so rewriting it doesn't bump the reports directory mtime (the staleness signal).
+CATALOG_SUBDIR = "_catalog"
+CATALOG_FILE = "catalog.json"
+CATALOG_VERSION = 1
+
+# (path, mtime_ns, size) -> sha256 prefix of the artifact file
+_artifact_hash_cache: dict[tuple[str, int, int], str] = {}
+
+
+def artifact_hash(artifact_path: str, artifact_meta: dict[str, Any] | None = None, *, root: Path = REPO_ROOT) -> str:
+    """Content hash of the evaluated artifact JSON; falls back to hashing the report's artifact_meta."""
+    if artifact_path:
+        path = Path(artifact_path)
+        if not path.is_absolute():
+            path = root / path
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        if st is not None:
+            key = (str(path), st.st_mtime_ns, st.st_size)
+            if key not in _artifact_hash_cache:
+                _artifact_hash_cache[key] = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+            return _artifact_hash_cache[key]
+    blob = json.dumps(artifact_meta or {}, sort_keys=True, default=str).encode("utf-8")
+    return "meta-" + hashlib.sha256(blob).hexdigest()[:16]
+
+
+def _plot_assets(stem: str, names: set[str]) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for plot_type, ext in PLOT_ASSETS:
+        fname = f"{stem}.{plot_type}.{ext}"
+        if fname in names:
+            out[f"{plot_type}.{ext}"] = fname
+    return out
+
+
+def summarize_report(path: Path, data: dict[str, Any], *, root: Path = REPO_ROOT) -> dict[str, Any]:
+    """Compact catalog entry for one evaluation report (everything the stats endpoints serve from it)."""
+    ev = data.get("eval") or {}
+    st = path.stat()
+    artifact_path = str(data.get("artifact_path", "") or "")
+    artifact_meta = data.get("artifact_meta") or {}
+    return {
+        "name": path.stem,
+        "file": path.name,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "artifact_path": artifact_path,
+        "artifact_hash": artifact_hash(artifact_path, artifact_meta, root=root),
+        "artifact_meta": artifact_meta,
+        "season_start": ev.get("season_start"),
+        "overall": ev.get("overall") or {},
+        "calibration_bins": ev.get("calibration_bins") or [],
+        "groups": ev.get("groups") or [],
+        "plots": {},
+    }
+
+
+class ReportCatalog:
+    """
+    Index of evaluation reports in one directory, persisted as <dir>/_catalog/catalog.json.
+
+    Each entry is the compact summary from summarize_report, keyed by report name, plus the pre-rendered
+    plot files that exist for it; by_artifact maps artifact hash -> report names. Evaluation scripts call
+    add() when they write a report. Readers call refresh(), which costs a stat of the directory and of the
+    catalog file when nothing changed and otherwise re-reads only new or modified report files (a report
+    rewritten in place by something other than add() needs refresh(force=True)). Derived responses can be
+    memoized per catalog revision with memo().
+    """
+
+    def __init__(self, reports_dir: Path | str, *, root: Path = REPO_ROOT) -> None:
+        self.reports_dir = Path(reports_dir)
+        self.root = root
+        self.path = self.reports_dir / CATALOG_SUBDIR / CATALOG_FILE
+        self._lock = threading.RLock()
+        self._data: dict[str, Any] | None = None
+        self._file_stamp: tuple[int, int] | None = None
+        self._revision = 0
+        self._memo: dict[Any, tuple[int, Any]] = {}
+
+    @staticmethod
+    def _empty() -> dict[str, Any]:
+        return {"version": CATALOG_VERSION, "dir_mtime_ns": None, "reports": {}, "by_artifact": {}}
+
+    def _stat_file(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load_file(self) -> None:
+        stamp = self._stat_file()
+        if stamp is not None and stamp == self._file_stamp and self._data is not None:
+            return
+        data = None
+        if stamp is not None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable report catalog {self.path}: {e}")
+        if not isinstance(data, dict) or data.get("version") != CATALOG_VERSION:
+            data = self._empty()
+        self._data = data
+        self._file_stamp = stamp
+        self._revision += 1
+
+    def _save(self, *, changed: bool = True) -> None:
+        assert self._data is not None
+        by_artifact: dict[str, list[str]] = {}
+        for name, entry in sorted(self._data["reports"].items()):
+            by_artifact.setdefault(entry["artifact_hash"], []).append(name)
+        self._data["by_artifact"] = by_artifact
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._data, separators=(",", ":")) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._file_stamp = self._stat_file()
+        if changed:
+            self._revision += 1
+
+    def _read_entry(self, path: Path) -> dict[str, Any] | None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return summarize_report(path, data, root=self.root)
+        except Exception as e:
+            logger.warning(f"Failed to index evaluation report {path}: {e}")
+            return None
+
+    def refresh(self, *, force: bool = False) -> bool:
+        """Bring the catalog up to date with the directory; returns True if any entry changed."""
+        with self._lock:
+            self._load_file()
+            assert self._data is not None
+            try:
+                dir_mtime = self.reports_dir.stat().st_mtime_ns
+            except OSError:
+                # No reports directory (yet): nothing to index, and nowhere to persist the catalog.
+                if self._data["reports"]:
+                    self._data = self._empty()
+                    self._revision += 1
+                return False
+            if not force and self._data.get("dir_mtime_ns") == dir_mtime:
+                return False
+
+            reports: dict[str, dict[str, Any]] = self._data["reports"]
+            names = {p.name for p in self.reports_dir.iterdir()}
+            current: dict[str, dict[str, Any]] = {}
+            changed = False
+            for fname in sorted(n for n in names if fnmatch.fnmatch(n, REPORT_GLOB)):
+                path = self.reports_dir / fname
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entry = reports.get(path.stem)
+                if entry is None or (entry["mtime_ns"], entry["size"]) != (st.st_mtime_ns, st.st_size):
+                    entry = self._read_entry(path)
+                    changed = True
+                    if entry is None:
+                        continue
+                plots = _plot_assets(path.stem, names)
+                if plots != entry.get("plots"):
+                    entry["plots"] = plots
+                    changed = True
+                current[path.stem] = entry
+            changed = changed or set(current) != set(reports)
+            self._data["reports"] = current
+            self._data["dir_mtime_ns"] = dir_mtime
+            try:
+                self._save(changed=changed)
+            except OSError as e:
+                # Read-only deployments still serve from the in-memory catalog.
+                logger.warning(f"Could not persist report catalog {self.path}: {e}")
+                if changed:
+                    self._revision += 1
+            return changed
+
+    def add(self, report_path: Path | str) -> dict[str, Any] | None:
+        """Index (or re-index) one report right after it was written, with its plot assets."""
+        report_path = Path(report_path)
+        with self._lock:
+            self._load_file()
+            assert self._data is not None
+            entry = self._read_entry(report_path)
+            if entry is None:
+                return None
+            names = {p.name for p in self.reports_dir.iterdir()}
+            entry["plots"] = _plot_assets(report_path.stem, names)
+            self._data["reports"][report_path.stem] = entry
+            self._save()
+            return entry
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Report name -> catalog entry (after refresh())."""
+        with self._lock:
+            self.refresh()
+            assert self._data is not None
+            return self._data["reports"]
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        return self.entries().get(name)
+
+    def by_artifact(self, artifact_hash_: str) -> list[dict[str, Any]]:
+        with self._lock:
+            entries = self.entries()
+            return [entries[n] for n in self._data["by_artifact"].get(artifact_hash_, []) if n in entries]
+
+    def glob(self, pattern: str) -> list[dict[str, Any]]:
+        """Entries whose report file name matches `pattern`, newest first."""
+        matches = [e for e in self.entries().values() if fnmatch.fnmatch(e["file"], pattern)]
+        return sorted(matches, key=lambda e: e["mtime_ns"], reverse=True)
+
+    def memo(self, key: Any, build: Callable[[], Any]) -> Any:
+        """build() once per catalog revision for `key` (e.g. an endpoint's response for given query params)."""
+        with self._lock:
+            self.refresh()
+            hit = self._memo.get(key)
+            if hit is not None and hit[0] == self._revision:
+                return hit[1]
+            value = build()
+            self._memo[key] = (self._revision, value)
+            return value
+
+
+_catalogs: dict[Path, ReportCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(reports_dir: Path | str = EVALUATIONS_DIR) -> ReportCatalog:
+    """The process-wide ReportCatalog for a reports directory."""
+    key = Path(reports_dir).resolve()
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = ReportCatalog(key)
+        return _catalogs[key]
+
+
+def record_report(report_path: Path | str) -> dict[str, Any] | None:
+    """Index a freshly written evaluation report in its directory's catalog (no-op for other file names)."""
+    report_path = Path(report_path)
+    if not fnmatch.fnmatch(report_path.name, REPORT_GLOB):
+        return None
+    return get_catalog(report_path.parent).add(report_path)
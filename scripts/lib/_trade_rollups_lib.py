@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+TRADE_CANDLES_TABLE = "kalshi.trade_candles_v1"
+TRADE_CANDLES_COVERAGE_TABLE = "kalshi.trade_candles_coverage_v1"
+
+# Intervals materialized per ticker. Each divides the largest, so a window aligned to it covers whole periods of all.
+ROLLUP_INTERVALS: tuple[int, ...] = (1, 10, 60)
+_ALIGN_SECONDS = max(ROLLUP_INTERVALS)
+
+TRADE_CANDLES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS kalshi.trade_candles_v1 (
+  ticker                 TEXT    NOT NULL,
+  interval_seconds       INTEGER NOT NULL,
+  period_ts              BIGINT  NOT NULL,  -- Unix seconds, end of period (as served by the candles endpoint)
+  price_open_cents       INTEGER NOT NULL,
+  price_high_cents       INTEGER NOT NULL,
+  price_low_cents        INTEGER NOT NULL,
+  price_close_cents      INTEGER NOT NULL,
+  price_mean_cents       INTEGER NOT NULL,
+  volume                 BIGINT  NOT NULL,
+  yes_price_close_cents  INTEGER,
+  no_price_close_cents   INTEGER,
+  updated_at             TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (ticker, interval_seconds, period_ts)
+);
+
+-- Per-ticker watermark: every trade created at or after rolled_from_ts is in the rollups (0 = whole history).
+-- Tickers without a row have not been backfilled, so their rollups may hold only the minutes a load touched.
+CREATE TABLE IF NOT EXISTS kalshi.trade_candles_coverage_v1 (
+  ticker          TEXT   PRIMARY KEY,
+  rolled_from_ts  BIGINT NOT NULL,
+  updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+# Candle fields stored per row, in table column order after (ticker, interval_seconds, period_ts).
+CANDLE_COLUMNS: tuple[str, ...] = (
+    "price_open_cents",
+    "price_high_cents",
+    "price_low_cents",
+    "price_close_cents",
+    "price_mean_cents",
+    "volume",
+    "yes_price_close_cents",
+    "no_price_close_cents",
+)
+
+_TRADES_SQL = """
+SELECT created_time, yes_price, no_price, count, price, taker_side, trade_id
+FROM kalshi.trades
+WHERE ticker = %s
+  AND created_time >= %s
+  AND created_time < %s
+ORDER BY created_time ASC, trade_id ASC
+"""
+
+_SPAN_SQL = "SELECT MIN(created_time), MAX(created_time) FROM kalshi.trades WHERE ticker = %s"
+
+_MARK_COVERED_SQL = f"""
+INSERT INTO {TRADE_CANDLES_COVERAGE_TABLE} (ticker, rolled_from_ts)
+VALUES (%s, %s)
+ON CONFLICT (ticker) DO UPDATE SET rolled_from_ts = EXCLUDED.rolled_from_ts, updated_at = now()
+"""
+
+_INSERT_SQL = f"""
+INSERT INTO {TRADE_CANDLES_TABLE} (ticker, interval_seconds, period_ts, {", ".join(CANDLE_COLUMNS)})
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+_SELECT_SQL = f"""
+SELECT period_ts, {", ".join(CANDLE_COLUMNS)}
+FROM {TRADE_CANDLES_TABLE}
+WHERE ticker = %s
+  AND interval_seconds = %s
+  AND period_ts > %s
+  AND period_ts <= %s
+ORDER BY period_ts
+"""
+
+
+def aggregate_trades(
+    trade_rows: list[dict[str, Any]],
+    interval_seconds: int,
+) -> list[dict[str, Any]]:
+    """
+    Aggregate trade rows into candlesticks by time interval.
+    
+    Pure function (no DB dependency) for testability.
+    Returns sparse series (only intervals with trades).
+    
+    CRITICAL: 
+    - Uses integer cents end-to-end (no float math)
+    - Sorts trades by created_time within each interval
+    - Only returns intervals that contain ≥1 trade with valid price/volume pairs
+    - Derives canonical executed price from yes_price (YES market) or 100 - no_price (NO execution)
+    
+    Args:
+        trade_rows: List of trade dicts with created_time, yes_price, no_price, count, taker_side, etc.
+        interval_seconds: Aggregation interval in seconds (1, 10, 60, etc.)
+    
+    Returns:
+        List of candlestick dicts with keys:
+        - period_ts: End of interval (TIMESTAMPTZ) - matches kalshi.candlesticks.period_ts convention
+        - interval_seconds: Interval length
+        - price_open_cents: First trade executed price in interval (integer cents)
+        - price_high_cents: Highest trade executed price in interval
+        - price_low_cents: Lowest trade executed price in interval
+        - price_close_cents: Last trade executed price in interval
+        - price_mean_cents: VWAP (volume-weighted average price) in cents
+        - volume: Total volume (SUM(count))
+        - yes_price_close_cents: Yes price from last trade
+        - no_price_close_cents: No price from last trade
+        - is_filled: False (actual data, not interpolated)
+    """
+    if not trade_rows:
+        return []
+    
+    # Group trades by interval (truncate to interval boundary)
+    trades_by_interval = defaultdict(list)
+    
+    for trade in trade_rows:
+        created_time = trade["created_time"]
+        if isinstance(created_time, datetime):
+            # Normalize to UTC-aware datetime for consistent bucketing
+            if created_time.tzinfo is None:
+                # Naive datetime - assume UTC
+                created_time = created_time.replace(tzinfo=timezone.utc)
+            elif created_time.tzinfo != timezone.utc:
+                # Convert to UTC
+                created_time = created_time.astimezone(timezone.utc)
+            
+            # Truncate to interval boundary
+            # Example: interval_seconds=1: truncate microseconds
+            # Example: interval_seconds=10: truncate to 10-second boundary
+            if interval_seconds == 1:
+                interval_key = created_time.replace(microsecond=0)
+            else:
+                # Truncate to interval_seconds boundary
+                total_seconds = int(created_time.timestamp())
+                truncated_seconds = (total_seconds // interval_seconds) * interval_seconds
+                interval_key = datetime.fromtimestamp(truncated_seconds, tz=timezone.utc)
+        else:
+            # Fallback: assume it's already a datetime-like object
+            interval_key = created_time
+        
+        trades_by_interval[interval_key].append(trade)
+    
+    candlesticks = []
+    
+    for interval_ts, interval_trades in sorted(trades_by_interval.items()):
+        # CRITICAL: Sort trades by created_time within each interval
+        # Do NOT assume list order
+        interval_trades_sorted = sorted(
+            interval_trades,
+            key=lambda t: t["created_time"]
+        )
+        
+        # Build paired (price, volume) tuples to ensure correct VWAP calculation
+        # Derive canonical executed price: use yes_price if available, else derive from no_price
+        # For YES market: executed price is yes_price (when taker_side='yes') or yes_price (when taker_side='no', still represents YES price)
+        # If yes_price is None but no_price exists, derive: 100 - no_price (convert NO market to YES market space)
+        pairs = []
+        for t in interval_trades_sorted:
+            executed_price_cents = None
+            volume = t.get("count")
+            
+            # Determine executed price in YES market space (cents)
+            if t.get("yes_price") is not None:
+                executed_price_cents = int(t["yes_price"])
+            elif t.get("no_price") is not None:
+                # Convert NO market price to YES market space: YES = 100 - NO
+                executed_price_cents = 100 - int(t["no_price"])
+            elif t.get("price") is not None:
+                # Fallback: use price field if it exists (convert from 0-1 to cents)
+                executed_price_cents = int(float(t["price"]) * 100)
+            
+            # Only include trades with both valid price and volume
+            if executed_price_cents is not None and volume is not None:
+                pairs.append((executed_price_cents, volume))
+        
+        if not pairs:
+            continue  # Skip intervals with no valid price/volume pairs
+        
+        # Extract prices and volumes from paired tuples (guaranteed aligned)
+        executed_prices_cents = [p for p, _ in pairs]
+        volumes = [v for _, v in pairs]
+        
+        # Calculate OHLC using integer cents
+        price_open_cents = executed_prices_cents[0]  # First trade in interval
+        price_close_cents = executed_prices_cents[-1]  # Last trade in interval
+        price_high_cents = max(executed_prices_cents)
+        price_low_cents = min(executed_prices_cents)
+        
+        # Calculate VWAP in cents (volume-weighted average)
+        # Use paired tuples to ensure correct alignment (fixes VWAP bug)
+        # Use integer division for cents VWAP (floors); if you want rounding, add + total_volume/2 before //
+        total_price_volume = sum(p * v for p, v in pairs)
+        total_volume = sum(volumes)
+        price_mean_cents = total_price_volume // total_volume if total_volume > 0 else price_close_cents
+        
+        # Get yes/no prices from last trade (for reference)
+        # Note: These are the raw prices from the trade, not the executed price we calculated
+        last_trade = interval_trades_sorted[-1]
+        
+        # period_ts as Unix timestamp (seconds) for frontend compatibility
+        period_end = interval_ts + timedelta(seconds=interval_seconds)
+        candlestick = {
+            "period_ts": int(period_end.timestamp()),  # Unix timestamp (seconds) - end of period
+            "interval_seconds": interval_seconds,
+            "price_open_cents": price_open_cents,
+            "price_high_cents": price_high_cents,
+            "price_low_cents": price_low_cents,
+            "price_close_cents": price_close_cents,
+            "price_mean_cents": price_mean_cents,
+            "volume": total_volume,
+            "yes_price_close_cents": last_trade.get("yes_price"),
+            "no_price_close_cents": last_trade.get("no_price"),
+            "is_filled": False,  # Actual data, not interpolated
+        }
+        
+        candlesticks.append(candlestick)
+    
+    return candlesticks
+
+
+def aligned_window(start_ts: int, end_ts: int, align: int = _ALIGN_SECONDS) -> tuple[int, int]:
+    """[start, end) widened outward to multiples of align seconds (end is exclusive, so end_ts itself is covered)."""
+    return start_ts - start_ts % align, end_ts - end_ts % align + align
+
+
+def _fetch_trade_rows(conn: psycopg.Connection, ticker: str, start_ts: int, end_ts: int) -> list[dict[str, Any]]:
+    rows = conn.execute(
+        _TRADES_SQL,
+        (ticker, datetime.fromtimestamp(start_ts, tz=timezone.utc), datetime.fromtimestamp(end_ts, tz=timezone.utc)),
+    ).fetchall()
+    keys = ("created_time", "yes_price", "no_price", "count", "price", "taker_side", "trade_id")
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def refresh_trade_rollups(conn: psycopg.Connection, ticker: str, start_ts: int, end_ts: int) -> int:
+    """
+    Recompute the ROLLUP_INTERVALS candles of `ticker` covering trades in [start_ts, end_ts] from kalshi.trades.
+
+    The window is widened to whole minutes so every touched period is rebuilt from all of its trades; existing
+    rows in it are replaced. Runs in the caller's transaction (the loader commits with the trades themselves).
+    Returns the number of candles written.
+    """
+    lo, hi = aligned_window(int(start_ts), int(end_ts))
+    trades = _fetch_trade_rows(conn, ticker, lo, hi)
+    rows = [
+        (ticker, interval, candle["period_ts"], *(candle[c] for c in CANDLE_COLUMNS))
+        for interval in ROLLUP_INTERVALS
+        for candle in aggregate_trades(trades, interval)
+    ]
+    with conn.cursor() as cur:
+        # period_ts is the end of a period, so the periods starting in [lo, hi) end in (lo, hi]
+        cur.execute(
+            f"DELETE FROM {TRADE_CANDLES_TABLE} WHERE ticker = %s AND period_ts > %s AND period_ts <= %s",
+            (ticker, lo, hi),
+        )
+        if rows:
+            cur.executemany(_INSERT_SQL, rows)
+    return len(rows)
+
+
+def backfill_trade_rollups(conn: psycopg.Connection, ticker: str) -> int:
+    """
+    Roll up the whole trade history of `ticker` and mark it covered from the start (rolled_from_ts 0).
+
+    Runs in the caller's transaction, so the loader can backfill a ticker it sees for the first time together
+    with the file that introduced it. Returns the number of candles written.
+    """
+    first, last = conn.execute(_SPAN_SQL, (ticker,)).fetchone() or (None, None)
+    written = 0
+    if first is not None:
+        written = refresh_trade_rollups(conn, ticker, int(first.timestamp()), int(last.timestamp()))
+    conn.execute(_MARK_COVERED_SQL, (ticker, 0))
+    return written
+
+
+def trade_rollup_watermarks(conn: psycopg.Connection, tickers: Iterable[str]) -> dict[str, int]:
+    """rolled_from_ts of each of `tickers` that has been backfilled; tickers missing from the result have not."""
+    scope = sorted({str(t) for t in tickers})
+    if not scope:
+        return {}
+    rows = conn.execute(
+        f"SELECT ticker, rolled_from_ts FROM {TRADE_CANDLES_COVERAGE_TABLE} WHERE ticker = ANY(%s::text[])",
+        (scope,),
+    ).fetchall()
+    return {str(row[0]): int(row[1]) for row in rows}
+
+
+def rebuild_trade_rollups(conn: psycopg.Connection, tickers: Iterable[str] | None = None) -> int:
+    """
+    Rebuild the rollups of `tickers` (or of every ticker in kalshi.trades) over their whole trade history.
+
+    Commits after each ticker. Returns the number of candles written.
+    """
+    conn.execute(TRADE_CANDLES_TABLE_SQL)
+    sql = "SELECT ticker, MIN(created_time), MAX(created_time) FROM kalshi.trades {scope} GROUP BY ticker ORDER BY ticker"
+    if tickers is None:
+        spans = conn.execute(sql.format(scope="")).fetchall()
+    else:
+        scope = sorted({str(t) for t in tickers})
+        spans = conn.execute(sql.format(scope="WHERE ticker = ANY(%s::text[])"), (scope,)).fetchall()
+    conn.commit()
+    written = 0
+    for ticker, first, last in spans:
+        written += refresh_trade_rollups(conn, ticker, int(first.timestamp()), int(last.timestamp()))
+        conn.execute(_MARK_COVERED_SQL, (ticker, 0))
+        conn.commit()
+    logger.info(f"Rebuilt {TRADE_CANDLES_TABLE} for {len(spans)} tickers ({written} candles)")
+    return written
+
+
+def ensure_trade_rollups(conn: psycopg.Connection) -> None:
+    """
+    Create the rollup tables if needed and backfill every ticker once if none has been yet.
+
+    This covers databases whose trades predate the rollups, including ones where earlier loads only rolled up
+    the minutes they touched. After that, loads refresh touched minutes and backfill tickers they see first.
+    """
+    conn.execute(TRADE_CANDLES_TABLE_SQL)
+    covered = conn.execute(f"SELECT EXISTS (SELECT 1 FROM {TRADE_CANDLES_COVERAGE_TABLE})").fetchone()[0]
+    conn.commit()
+    if not covered:
+        rebuild_trade_rollups(conn)
+
+
+def load_trade_rollups(
+    conn: Any,
+    ticker: str,
+    interval_seconds: int,
+    start_ts: int,
+    end_ts: int,
+) -> list[dict[str, Any]] | None:
+    """
+    Materialized candles of `ticker` for the periods starting in [start_ts, end_ts), in aggregate_trades' format.
+
+    start_ts and end_ts must be multiples of interval_seconds. Returns None when interval_seconds is not
+    materialized, the rollup tables don't exist in this database, or the ticker's rollups are not known to
+    hold every trade from start_ts on (not backfilled, or rolled_from_ts later than start_ts); callers then
+    aggregate raw trades rather than serve a partly rolled-up window.
+    """
+    if interval_seconds not in ROLLUP_INTERVALS:
+        return None
+    try:
+        # Savepoint: a missing table must not abort the caller's transaction.
+        with conn.transaction():
+            watermark = conn.execute(
+                f"SELECT rolled_from_ts FROM {TRADE_CANDLES_COVERAGE_TABLE} WHERE ticker = %s", (ticker,)
+            ).fetchone()
+            if watermark is None or int(watermark[0]) > start_ts:
+                return None
+            rows = conn.execute(_SELECT_SQL, (ticker, interval_seconds, start_ts, end_ts)).fetchall()
+    except psycopg.errors.UndefinedTable:
+        logger.warning(f"{TRADE_CANDLES_TABLE} does not exist; aggregating trades on the fly")
+        return None
+    return [
+        {"period_ts": int(row[0]), "interval_seconds": interval_seconds,
+         **dict(zip(CANDLE_COLUMNS, row[1:])), "is_filled": False}
+        for row in rows
+    ]
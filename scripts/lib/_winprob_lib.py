@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import json
 import math
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 import numpy as np
 from sklearn.isotonic import IsotonicRegression
 
+from scripts.lib import _metrics_lib as _metrics
+
 # Module-level cache for CatBoost models (keyed by absolute model path)
 _catboost_model_cache: dict[str, Any] = {}
 
@@ -39,66 +42,43 @@ def logit(p: np.ndarray, eps: float = 1e-15) -> np.ndarray:
 
 
 def brier(p: np.ndarray, y: np.ndarray) -> float:
-    return float(np.mean((p - y) ** 2))
+    return _metrics.brier(p, y)
 
 
 def logloss(p: np.ndarray, y: np.ndarray) -> float:
-    pp = clamp01(p)
-    return float(-np.mean(y * np.log(pp) + (1.0 - y) * np.log(1.0 - pp)))
+    return _metrics.logloss(p, y)
 
 
 def roc_auc(p: np.ndarray, y: np.ndarray) -> float | None:
     """
-    AUC using rank statistics.
+    AUC using rank statistics (tie-averaged, O(n log n); see _metrics_lib.roc_auc).
     Returns None if y has only one class.
     """
-    y0 = (y == 0)
-    y1 = (y == 1)
-    n0 = int(np.sum(y0))
-    n1 = int(np.sum(y1))
-    if n0 == 0 or n1 == 0:
-        return None
-
-    # Rank by p ascending; tie-handled by average ranks.
-    order = np.argsort(p, kind="mergesort")
-    ps = p[order]
-    ys = y[order]
-
-    ranks = np.empty_like(ps, dtype=np.float64)
-    i = 0
-    r = 1.0
-    while i < len(ps):
-        j = i + 1
-        while j < len(ps) and ps[j] == ps[i]:
-            j += 1
-        # average rank for ties in [i, j)
-        avg = (r + (r + (j - i) - 1.0)) / 2.0
-        ranks[i:j] = avg
-        r += (j - i)
-        i = j
-
-    sum_ranks_pos = float(np.sum(ranks[ys == 1]))
-    # Mann–Whitney U for positives
-    u1 = sum_ranks_pos - (n1 * (n1 + 1) / 2.0)
-    return float(u1 / (n0 * n1))
+    return _metrics.roc_auc(p, y)
 
 
 def ece_binned(p: np.ndarray, y: np.ndarray, *, bins: int) -> float | None:
-    if bins <= 0 or len(p) == 0:
-        return None
-    bins = int(bins)
-    idx = np.minimum(bins - 1, np.maximum(0, np.floor(p * bins).astype(np.int32)))
-    ece = 0.0
-    n = float(len(p))
-    for b in range(bins):
-        mask = idx == b
-        nb = int(np.sum(mask))
-        if nb <= 0:
-            continue
-        pb = float(np.mean(p[mask]))
-        yb = float(np.mean(y[mask]))
-        ece += (nb / n) * abs(yb - pb)
-    return float(ece)
+    return _metrics.ece_binned(p, y, bins=bins)
+
+
+# Evaluation time buckets (label, exclusive lower bound on time_remaining_regulation), from game start to end.
+TIME_BUCKETS: tuple[tuple[str, float], ...] = (
+    ("2880-2400", 2400),
+    ("2400-1800", 1800),
+    ("1800-1200", 1200),
+    ("1200-600", 600),
+    ("600-120", 120),
+    ("120-0", float("-inf")),
+)
+
+
+def time_bucket_labels(time_remaining: Any) -> np.ndarray:
+    """TIME_BUCKETS label per row (NaN falls in the last bucket)."""
+    t = np.asarray(time_remaining, dtype=np.float64)
+    edges = np.array([b for _, b in TIME_BUCKETS[-2::-1]])  # ascending: 120, 600, ..., 2400
+    labels = np.array([label for label, _ in TIME_BUCKETS[::-1]])
+    idx = np.searchsorted(edges, t, side="left")
+    return labels[np.where(np.isnan(t), 0, idx)]
 
 
 @dataclass(frozen=True)
@@ -568,6 +548,71 @@ def build_design_matrix(
     return np.column_stack(final_features)
 
 
+# Resolved absolute .cbm path per (artifact catboost_model_path, artifact dir, cwd); avoids re-walking candidates
+_catboost_path_cache: dict[tuple[str, str, str], str] = {}
+
+
+def resolve_catboost_model_path(artifact: WinProbArtifact, *, artifact_dir: Path | None = None) -> str:
+    """Absolute path of an artifact's CatBoost .cbm file (memoized).
+
+    Relative paths are tried against the artifact's directory (when known), then data/models, artifacts and
+    the current directory.
+    """
+    if artifact.catboost_model_path is None:
+        raise ValueError("Artifact has no catboost_model_path")
+    key = (artifact.catboost_model_path, str(artifact_dir or ""), os.getcwd())
+    cached = _catboost_path_cache.get(key)
+    if cached is not None:
+        return cached
+
+    model_path = Path(artifact.catboost_model_path)
+    if not model_path.is_absolute():
+        possible_paths = [Path("data/models") / model_path, Path("artifacts") / model_path, model_path]
+        if artifact_dir is not None:
+            possible_paths.insert(0, Path(artifact_dir) / model_path)
+        model_path = next((p for p in possible_paths if p.exists()), Path("data/models") / model_path)
+
+    if not model_path.exists():
+        raise FileNotFoundError(
+            f"CatBoost model file not found: {model_path}\n"
+            f"Artifact specified: {artifact.catboost_model_path}\n"
+            f"Tried locations: artifact directory, data/models, artifacts, current directory"
+        )
+    try:
+        resolved = str(model_path.resolve(strict=True))
+    except (OSError, RuntimeError):
+        resolved = str(model_path.absolute())
+    _catboost_path_cache[key] = resolved
+    return resolved
+
+
+def load_catboost_model(model_path: str) -> Any:
+    """CatBoostClassifier for an absolute .cbm path, loaded once per process."""
+    model = _catboost_model_cache.get(model_path)
+    if model is None:
+        from catboost import CatBoostClassifier
+
+        model = CatBoostClassifier()
+        model.load_model(model_path)
+        _catboost_model_cache[model_path] = model
+    return model
+
+
+def evict_catboost_model(model_path: str) -> None:
+    """Forget a loaded CatBoost model so the next load_catboost_model() rereads the .cbm file."""
+    _catboost_model_cache.pop(model_path, None)
+
+
+def uses_opening_odds_baseline(artifact: WinProbArtifact) -> bool:
+    """Whether the model expects logit(opening_prob_home_fair) as a baseline (explicit flag, else old-artifact heuristic)."""
+    uses_baseline = getattr(artifact, "uses_opening_odds_baseline", None)
+    if uses_baseline is None:
+        has_opening_odds_features = any("opening" in fn.lower() or "overround" in fn.lower() for fn in artifact.feature_names)
+        opening_prob_not_a_feature = "opening_prob_home_fair" not in artifact.feature_names
+        uses_baseline = has_opening_odds_features and opening_prob_not_a_feature
+    return bool(uses_baseline)
+
+
 def predict_proba(
     artifact: WinProbArtifact, 
     *, 
@@ -588,63 +633,12 @@ def predict_proba(
     """
     if artifact.model_type == "catboost" and artifact.catboost_model_path is not None:
         # Use CatBoost model
-        from catboost import CatBoostClassifier, Pool
-        # Resolve model path relative to artifact location
-        model_path = Path(artifact.catboost_model_path)
-        if not model_path.is_absolute():
-            # Try multiple locations: artifact's directory, data/models, artifacts
-            # First, try to get artifact directory from the calling context if available
-            # Otherwise, try common locations
-            possible_paths = [
-                Path("data/models") / model_path,
-                Path("artifacts") / model_path,
-                model_path,  # Current directory
-            ]
-            # If we have access to the artifact file path, use that
-            # For now, try data/models first (where we save models)
-            found = False
-            for possible_path in possible_paths:
-                if possible_path.exists():
-                    model_path = possible_path
-                    found = True
-                    break
-            if not found:
-                # Last resort: try data/models (most likely location)
-                model_path = Path("data/models") / model_path
-        
-        # Verify path exists before resolving
-        if not model_path.exists():
-            raise FileNotFoundError(
-                f"CatBoost model file not found: {model_path}\n"
-                f"Artifact specified: {artifact.catboost_model_path}\n"
-                f"Tried locations: data/models, artifacts, current directory"
-            )
-        
-        # Use absolute path as cache key (use resolve with strict=False for safety)
-        try:
-            model_path_abs = str(model_path.resolve(strict=True))
-        except (OSError, RuntimeError):
-            # Fallback: use absolute() if resolve fails
-            model_path_abs = str(model_path.absolute())
-        
-        # Check cache first
-        if model_path_abs not in _catboost_model_cache:
-            # Load model and cache it
-            model = CatBoostClassifier()
-            model.load_model(str(model_path))
-            _catboost_model_cache[model_path_abs] = model
-        else:
-            # Use cached model
-            model = _catboost_model_cache[model_path_abs]
-        
+        from catboost import Pool
+        model = load_catboost_model(resolve_catboost_model_path(artifact))
+
         # CRITICAL FIX: Check if model was trained with baseline
         # Use explicit flag if available, fall back to heuristic for backwards compatibility with older artifacts
-        uses_baseline = getattr(artifact, 'uses_opening_odds_baseline', None)
-        if uses_baseline is None:
-            # Fallback heuristic for older artifacts: check if opening odds features exist but opening_prob_home_fair is not a feature
-            has_opening_odds_features = any("opening" in fn.lower() or "overround" in fn.lower() for fn in artifact.feature_names)
-            opening_prob_not_a_feature = "opening_prob_home_fair" not in artifact.feature_names
-            uses_baseline = has_opening_odds_features and opening_prob_not_a_feature
+        uses_baseline = uses_opening_odds_baseline(artifact)
         
         # Compute baseline if needed (model trained with baseline and we have opening odds data)
         baseline = None
@@ -700,12 +694,16 @@ def fit_logistic_regression_irls(
     l2_lambda: float,
     max_iter: int,
     tol: float,
+    init_weights: np.ndarray | None = None,
+    init_intercept: float = 0.0,
 ) -> tuple[np.ndarray, float]:
     """
     Fit logistic regression with L2 regularization via IRLS/Newton.
 
     Model: p = sigmoid(intercept + X @ w)
     Penalty: (l2_lambda/2) * ||w||^2 (intercept is not penalized)
+
+    init_weights/init_intercept warm-start the Newton iterations (e.g. from a previous artifact's model).
     """
     if X.ndim != 2:
         raise ValueError("X must be 2D")
@@ -725,8 +723,7 @@ def fit_logistic_regression_irls(
     X1 = np.concatenate([np.ones((n, 1), dtype=np.float64), X.astype(np.float64)], axis=1)
     dd = d + 1
 
-    # Initialize at zeros.
-    theta = np.zeros(dd, dtype=np.float64)
+    theta = _initial_theta(d, init_weights, init_intercept)
 
     # Penalty matrix: do not penalize intercept.
     P = np.zeros((dd, dd), dtype=np.float64)
@@ -757,6 +754,91 @@ def fit_logistic_regression_irls(
     return weights, intercept
 
 
+def _initial_theta(d: int, init_weights: np.ndarray | None, init_intercept: float) -> np.ndarray:
+    """[intercept, w...] starting point; zeros unless warm-started."""
+    theta = np.zeros(d + 1, dtype=np.float64)
+    if init_weights is not None:
+        w0 = np.asarray(init_weights, dtype=np.float64).ravel()
+        if len(w0) != d:
+            raise ValueError(f"init_weights has {len(w0)} entries, expected {d}")
+        theta[0] = float(init_intercept)
+        theta[1:] = w0
+    return theta
+
+
+def fit_logistic_regression_irls_chunked(
+    *,
+    chunks: Callable[[], Iterable[tuple[np.ndarray, np.ndarray]]],
+    l2_lambda: float,
+    max_iter: int,
+    tol: float,
+    init_weights: np.ndarray | None = None,
+    init_intercept: float = 0.0,
+) -> tuple[np.ndarray, float]:
+    """
+    Out-of-core variant of fit_logistic_regression_irls: same model, penalty and Newton steps, but X is never
+    held in memory as a whole.
+
+    `chunks()` must return a fresh iterable of (X_chunk, y_chunk) on every call; it is re-read once per Newton
+    iteration (e.g. Parquet row groups or DB cursor batches). Chunks may be float32; each chunk is upcast to
+    float64 on its own while X'WX and X'Wz are accumulated in float64, so the solution matches the in-memory fit
+    on the same data. Peak memory is O(chunk_rows * d + d^2).
+    """
+    lam = max(0.0, float(l2_lambda))
+    tol = float(tol)
+    theta: np.ndarray | None = None
+    d = -1
+
+    for _ in range(int(max_iter)):
+        A: np.ndarray | None = None
+        b: np.ndarray | None = None
+        n = 0
+        for X_chunk, y_chunk in chunks():
+            if X_chunk.ndim != 2 or y_chunk.ndim != 1 or len(X_chunk) != len(y_chunk):
+                raise ValueError("chunks must yield 2D X and 1D y of equal length")
+            if len(X_chunk) == 0:
+                continue
+            if theta is None:
+                d = X_chunk.shape[1]
+                theta = _initial_theta(d, init_weights, init_intercept)
+            elif X_chunk.shape[1] != d:
+                raise ValueError(f"chunk has {X_chunk.shape[1]} columns, expected {d}")
+            if A is None:
+                A = np.zeros((d + 1, d + 1), dtype=np.float64)
+                b = np.zeros(d + 1, dtype=np.float64)
+
+            Xc = np.asarray(X_chunk, dtype=np.float64)
+            yc = np.asarray(y_chunk, dtype=np.float64)
+            eta = theta[0] + Xc @ theta[1:]
+            p = sigmoid(eta)
+            w = np.maximum(1e-12, p * (1.0 - p))
+            wz = w * eta + (yc - p)  # = w * z with z = eta + (y - p) / w
+
+            # Blocks of X1' W X1 and X1' W z for X1 = [1 | X], without materializing X1.
+            WX = Xc * w[:, None]
+            A[0, 0] += float(np.sum(w))
+            col = WX.sum(axis=0)
+            A[0, 1:] += col
+            A[1:, 0] += col
+            A[1:, 1:] += Xc.T @ WX
+            b[0] += float(np.sum(wz))
+            b[1:] += Xc.T @ wz
+            n += len(Xc)
+
+        if A is None or n < 5:
+            raise ValueError("need at least 5 rows to fit")
+        A[1:, 1:] += lam * np.eye(d)
+        theta_new = np.linalg.solve(A, b)
+        step = theta_new - theta
+        theta = theta_new
+        if float(np.linalg.norm(step)) < tol:
+            break
+
+    if theta is None:
+        raise ValueError("need at least 5 rows to fit")
+    return theta[1:], float(theta[0])
+
+
 def fit_platt_calibrator_on_probs(
     *,
     p_base: np.ndarray,
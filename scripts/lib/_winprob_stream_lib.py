@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from scripts.lib._inference_lib import CompiledModel
+from scripts.lib._winprob_lib import utc_now_iso_compact
+
+# Record-batch stages of the events -> snapshots -> odds join -> paper trade chain.
+# Each stage takes an iterable of pyarrow.RecordBatches and yields its output lazily, so stages chain in one
+# process and only one input batch (plus one partial game) is held at a time.
+
+SNAPSHOT_SCHEMA = pa.schema(
+    [
+        pa.field("game_id", pa.string()),
+        pa.field("season_start", pa.int16()),
+        pa.field("bucket_seconds_remaining", pa.int32()),
+        pa.field("event_id", pa.int64()),
+        pa.field("point_differential", pa.int32()),
+        pa.field("time_remaining_regulation", pa.int32()),
+        pa.field("possession_side", pa.int8()),
+        pa.field("possession", pa.string()),
+        pa.field("final_winning_team", pa.int8()),
+    ]
+)
+
+# Event columns the snapshot stage reads.
+EVENT_COLUMNS: tuple[str, ...] = (
+    "game_id",
+    "event_id",
+    "season_start",
+    "point_differential",
+    "time_remaining_regulation",
+    "possession_side",
+    "final_winning_team",
+)
+
+# Snapshot columns the odds join reads.
+SNAPSHOT_JOIN_COLUMNS: tuple[str, ...] = (
+    "game_id",
+    "bucket_seconds_remaining",
+    "point_differential",
+    "time_remaining_regulation",
+    "possession",
+    "final_winning_team",
+    "season_start",
+)
+
+JOINED_SCHEMA = pa.schema(
+    [
+        pa.field("game_id", pa.string()),
+        pa.field("bucket_seconds_remaining", pa.int64()),
+        pa.field("point_differential", pa.int64()),
+        pa.field("time_remaining_regulation", pa.int64()),
+        pa.field("possession", pa.string()),
+        pa.field("season_start", pa.int64()),
+        pa.field("model_p_home", pa.float64()),
+        pa.field("model_p_away", pa.float64()),
+        pa.field("book_id", pa.string()),
+        pa.field("book_name", pa.string()),
+        pa.field("odds_home_dec", pa.float64()),
+        pa.field("odds_away_dec", pa.float64()),
+        pa.field("implied_home_raw", pa.float64()),
+        pa.field("implied_away_raw", pa.float64()),
+        pa.field("implied_home", pa.float64()),
+        pa.field("implied_away", pa.float64()),
+        pa.field("edge_home", pa.float64()),
+        pa.field("edge_away", pa.float64()),
+    ]
+)
+
+
+def iter_parquet_batches(
+    path: Path, *, columns: Sequence[str] | None = None, batch_rows: int = 250_000
+) -> Iterator[pa.RecordBatch]:
+    pf = pq.ParquetFile(path)
+    yield from pf.iter_batches(batch_size=int(batch_rows), columns=list(columns) if columns is not None else None)
+
+
+def write_batches(
+    path: Path, batches: Iterable[pa.RecordBatch], schema: pa.Schema, *, compression: str | None = "zstd"
+) -> int:
+    """Stream batches into a Parquet file (written to <path>.tmp, then renamed). Returns rows written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    rows = 0
+    writer = pq.ParquetWriter(tmp_path, schema, compression=compression)
+    try:
+        for rb in batches:
+            writer.write_batch(rb)
+            rows += rb.num_rows
+    finally:
+        writer.close()
+    tmp_path.replace(path)
+    return rows
+
+
+def filter_games(batches: Iterable[pa.RecordBatch], game_ids: Iterable[str]) -> Iterator[pa.RecordBatch]:
+    """Keep only rows whose game_id is in `game_ids` (e.g. today's games before building snapshots)."""
+    value_set = pa.array(sorted({str(g) for g in game_ids}), type=pa.string())
+    for rb in batches:
+        out = rb.filter(pc.is_in(rb.column("game_id").cast(pa.string()), value_set=value_set))
+        if out.num_rows:
+            yield out
+
+
+def _run_starts(game_id: pa.Array) -> np.ndarray:
+    """Start offset of each run of equal consecutive game_id values."""
+    n = len(game_id)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    changed = pc.not_equal(game_id.slice(1), game_id.slice(0, n - 1)).to_numpy(zero_copy_only=False)
+    return np.concatenate([[0], np.flatnonzero(changed) + 1]).astype(np.int64)
+
+
+def _concat(batches: list[pa.RecordBatch]) -> pa.RecordBatch:
+    if len(batches) == 1:
+        return batches[0]
+    return pa.Table.from_batches(batches).combine_chunks().to_batches()[0]
+
+
+def iter_whole_games(batches: Iterable[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+    """
+    Re-cut a stream of events ordered by game_id into batches that never split a game.
+
+    The trailing (possibly incomplete) game of each input batch is carried into the next one.
+    """
+    carry: list[pa.RecordBatch] = []
+    for rb in batches:
+        if rb.num_rows == 0:
+            continue
+        tail = int(_run_starts(rb.column("game_id"))[-1])
+        if tail > 0:
+            yield _concat(carry + [rb.slice(0, tail)])
+            carry = []
+        carry.append(rb.slice(tail))
+    if carry:
+        yield _concat(carry)
+
+
+def select_snapshots(events: pa.RecordBatch, buckets: Sequence[int]) -> pa.RecordBatch:
+    """
+    One row per (game run, bucket): the event minimizing |time_remaining_regulation - bucket|, ties broken by
+    the maximum event_id. `events` must hold whole games, each as one contiguous run of game_id.
+
+    Rows are sorted once by (game, time remaining, event_id) and every (game, bucket) query is answered with
+    a single searchsorted over a combined game/time key: the answer is the last row (max event_id) of the
+    nearest time value at or above the bucket, or the row just below it.
+    """
+    n = events.num_rows
+    if n == 0 or not buckets:
+        return pa.RecordBatch.from_pylist([], schema=SNAPSHOT_SCHEMA)
+
+    starts = _run_starts(events.column("game_id"))
+    ends = np.append(starts[1:], n)
+    run = np.repeat(np.arange(len(starts), dtype=np.int64), ends - starts)
+    t = events.column("time_remaining_regulation").to_numpy(zero_copy_only=False).astype(np.int64)
+    ev = events.column("event_id").to_numpy(zero_copy_only=False).astype(np.int64)
+
+    order = np.lexsort((ev, t, run))
+    t_sorted = t[order]
+    ev_sorted = ev[order]
+    t_min = int(t_sorted.min())
+    t_max = int(t_sorted.max())
+    span = t_max - t_min + 1
+    keys = run[order] * span + (t_sorted - t_min)
+
+    b = np.asarray(buckets, dtype=np.int64)
+    q_run = np.repeat(np.arange(len(starts), dtype=np.int64), len(b))
+    q_b = np.tile(b, len(starts))
+    pos = np.searchsorted(keys, q_run * span + (np.clip(q_b, t_min, t_max) - t_min), side="left")
+
+    first = starts[q_run]
+    last = ends[q_run] - 1
+    below = np.clip(pos - 1, first, last)
+    above = np.searchsorted(keys, keys[np.clip(pos, first, last)], side="right") - 1
+    d_below = np.abs(t_sorted[below] - q_b)
+    d_above = np.abs(t_sorted[above] - q_b)
+    take_above = (d_above < d_below) | ((d_above == d_below) & (ev_sorted[above] >= ev_sorted[below]))
+    sel = events.take(pa.array(order[np.where(take_above, above, below)]))
+
+    side = sel.column("possession_side").cast(pa.int8())
+    possession = pc.fill_null(
+        pc.if_else(pc.equal(side, 0), "home", pc.if_else(pc.equal(side, 1), "away", "unknown")), "unknown"
+    )
+    return pa.RecordBatch.from_arrays(
+        [
+            sel.column("game_id").cast(pa.string()),
+            sel.column("season_start").cast(pa.int16()),
+            pa.array(q_b, type=pa.int32()),
+            sel.column("event_id").cast(pa.int64()),
+            sel.column("point_differential").cast(pa.int32()),
+            sel.column("time_remaining_regulation").cast(pa.int32()),
+            side,
+            possession,
+            sel.column("final_winning_team").cast(pa.int8()),
+        ],
+        schema=SNAPSHOT_SCHEMA,
+    )
+
+
+def snapshot_batches(events: Iterable[pa.RecordBatch], buckets: Sequence[int]) -> Iterator[pa.RecordBatch]:
+    """Events (ordered by game_id) -> fixed time-bucket snapshot rows, one output batch per whole-game batch."""
+    for rb in iter_whole_games(events):
+        yield select_snapshots(rb, buckets)
+
+
+def join_odds_batches(
+    snapshots: Iterable[pa.RecordBatch],
+    *,
+    model: CompiledModel,
+    odds: Mapping[str, Mapping[str, Any]],
+    bucket: int,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Snapshot rows at `bucket` for games with 2-way odds -> model probabilities, implied probabilities and edge.
+
+    `odds` maps game_id -> {"book_id", "book_name", "home_odds_dec", "away_odds_dec"}.
+    """
+    value_set = pa.array(list(odds), type=pa.string())
+    for rb in snapshots:
+        gid = rb.column("game_id").cast(pa.string())
+        mask = pc.and_(pc.equal(rb.column("bucket_seconds_remaining"), int(bucket)), pc.is_in(gid, value_set=value_set))
+        sel = rb.filter(mask)
+        if sel.num_rows == 0:
+            continue
+
+        gids = sel.column("game_id").cast(pa.string()).to_pylist()
+        books = [odds[g] for g in gids]
+        p_home = np.asarray(model.score(sel), dtype=np.float64)
+        home_dec = np.array([float(o["home_odds_dec"]) for o in books])
+        away_dec = np.array([float(o["away_odds_dec"]) for o in books])
+        imp_home_raw = 1.0 / home_dec
+        imp_away_raw = 1.0 / away_dec
+        s = imp_home_raw + imp_away_raw
+        with np.errstate(divide="ignore", invalid="ignore"):
+            imp_home = np.where(s > 0, imp_home_raw / s, np.nan)
+            imp_away = np.where(s > 0, imp_away_raw / s, np.nan)
+
+        def nullable(values: np.ndarray) -> pa.Array:
+            return pa.array(values, type=pa.float64(), from_pandas=True)
+
+        yield pa.RecordBatch.from_arrays(
+            [
+                pa.array(gids, type=pa.string()),
+                pa.array(np.full(len(gids), int(bucket)), type=pa.int64()),
+                sel.column("point_differential").cast(pa.int64()),
+                sel.column("time_remaining_regulation").cast(pa.int64()),
+                sel.column("possession").cast(pa.string()),
+                sel.column("season_start").cast(pa.int64()),
+                pa.array(p_home),
+                pa.array(1.0 - p_home),
+                pa.array([str(o["book_id"]) for o in books], type=pa.string()),
+                pa.array([None if o.get("book_name") is None else str(o["book_name"]) for o in books], type=pa.string()),
+                pa.array(home_dec),
+                pa.array(away_dec),
+                pa.array(imp_home_raw),
+                pa.array(imp_away_raw),
+                nullable(imp_home),
+                nullable(imp_away),
+                nullable(p_home - imp_home),
+                nullable((1.0 - p_home) - imp_away),
+            ],
+            schema=JOINED_SCHEMA,
+        )
+
+
+def paper_trade_decisions(
+    joined: Iterable[pa.RecordBatch], *, min_edge: float, max_trades: int = 0
+) -> Iterator[dict[str, Any]]:
+    """
+    Decision-log records for joined rows (in the order given; callers sort by game_id for determinism).
+
+    Bet the side with the larger edge when it is >= min_edge; rows without implied probabilities are skipped.
+    With max_trades > 0 the stream stops right after that many bets.
+    """
+    min_edge = float(min_edge)
+    bets = 0
+    for rb in joined:
+        rb = rb.filter(
+            pc.and_(
+                pc.and_(pc.is_valid(rb.column("implied_home")), pc.is_valid(rb.column("implied_away"))),
+                pc.and_(pc.is_valid(rb.column("edge_home")), pc.is_valid(rb.column("edge_away"))),
+            )
+        )
+        if rb.num_rows == 0:
+            continue
+        cols = rb.to_pydict()
+        edge_home = np.asarray(cols["edge_home"], dtype=np.float64)
+        edge_away = np.asarray(cols["edge_away"], dtype=np.float64)
+        bet_home = (edge_home >= edge_away) & (edge_home >= min_edge)
+        bet_away = ~bet_home & (edge_away > edge_home) & (edge_away >= min_edge)
+        edge = np.maximum(edge_home, edge_away)
+        created_at_utc = utc_now_iso_compact()
+
+        for i in range(rb.num_rows):
+            if bet_home[i]:
+                side, model_p, implied_p, odds = "home", cols["model_p_home"][i], cols["implied_home"][i], cols["odds_home_dec"][i]
+            elif bet_away[i]:
+                side, model_p, implied_p, odds = "away", cols["model_p_away"][i], cols["implied_away"][i], cols["odds_away_dec"][i]
+            else:
+                side, model_p, implied_p, odds = "no_bet", None, None, None
+            yield {
+                "created_at_utc": created_at_utc,
+                "game_id": str(cols["game_id"][i]),
+                "bucket_seconds_remaining": int(cols["bucket_seconds_remaining"][i]),
+                "inputs": {
+                    "point_differential": int(cols["point_differential"][i]),
+                    "time_remaining_regulation": int(cols["time_remaining_regulation"][i]),
+                    "possession": str(cols["possession"][i]),
+                },
+                "model": {
+                    "p_home": float(cols["model_p_home"][i]),
+                    "p_away": float(cols["model_p_away"][i]),
+                },
+                "market": {
+                    "book_id": str(cols["book_id"][i]),
+                    "book_name": cols["book_name"][i],
+                    "odds_home_dec": float(cols["odds_home_dec"][i]),
+                    "odds_away_dec": float(cols["odds_away_dec"][i]),
+                    "implied_home": float(cols["implied_home"][i]),
+                    "implied_away": float(cols["implied_away"][i]),
+                },
+                "decision": {
+                    "action": ("bet" if side in ("home", "away") else "no_bet"),
+                    "side": side,
+                    "min_edge": min_edge,
+                    "edge": float(edge[i]),
+                    "model_p_selected": (None if model_p is None else float(model_p)),
+                    "implied_p_selected": (None if implied_p is None else float(implied_p)),
+                    "odds_selected_dec": (None if odds is None else float(odds)),
+                },
+            }
+            if side != "no_bet":
+                bets += 1
+                if int(max_trades) > 0 and bets >= int(max_trades):
+                    return
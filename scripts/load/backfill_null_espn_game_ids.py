@@ -22,6 +22,7 @@ import psycopg
 from psycopg.rows import dict_row
 
 from scripts.lib._db_lib import get_dsn, connect
+from scripts.lib._odds_features_lib import refresh_opening_odds_features
 from scripts.lib.team_name_mapping import normalize_team_name
 from scripts.load.load_sportsbook_odds import map_to_espn_game_ids_batch
 
@@ -176,6 +177,12 @@ def backfill_espn_game_ids(conn: Any, dry_run: bool = False, limit: int = None)
     conn.commit()
     
     print(f"Updated {updated_count} records")
+    
+    # Newly mapped games now have opening lines: refresh their per-game odds features
+    refreshed = refresh_opening_odds_features(
+        conn, [gid for key, gid in game_id_map.items() if gid and key in record_map]
+    )
+    print(f"Refreshed opening-odds features for {refreshed} games")
     print()
     
     return {
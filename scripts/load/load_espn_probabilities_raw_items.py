@@ -4,6 +4,7 @@ Load ESPN probabilities payload items[] into Postgres as JSON-identical rows.
 
 Input files:
   data/raw/espn/probabilities/{season_label}/event_{event_id}_comp_{competition_id}.json
+  (or the zstd-compressed .json.zst archive variant)
 
 Output table:
   espn.probabilities_raw_items
@@ -31,10 +32,11 @@ import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from scripts.lib._db_lib import get_dsn
+from scripts.lib._db_lib import connect, get_dsn
+from scripts.lib._fetch_lib import read_archive_bytes
 
 
-PROB_FILE_RE = re.compile(r"^event_(?P<event>\d+)_comp_(?P<comp>\d+)\.json$")
+PROB_FILE_RE = re.compile(r"^event_(?P<event>\d+)_comp_(?P<comp>\d+)\.json(\.zst)?$")
 
 
 def _utc_now_iso() -> str:
@@ -106,18 +108,23 @@ def _iter_prob_files(prob_dir: Path) -> list[FileKey]:
     if not prob_dir.exists():
         return []
     out: list[FileKey] = []
+    seen: set[str] = set()
     for p in sorted(prob_dir.iterdir()):
-        if not (p.is_file() and p.name.endswith(".json")):
+        if not p.is_file():
             continue
         m = PROB_FILE_RE.match(p.name)
         if not m:
             continue
         game_id = m.group("comp")
+        # One payload per game: plain .json sorts before .json.zst, so it wins if both exist.
+        if game_id in seen:
+            continue
+        seen.add(game_id)
         out.append(FileKey(season_label=str(prob_dir.name), game_id=str(game_id), path=p))
     return out
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Load ESPN probabilities items[] (raw JSON) into Postgres.")
     p.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres DSN (or set DATABASE_URL).")
     p.add_argument("--season-label", default="", help="If set, only load this season (e.g. 2024-25).")
@@ -133,11 +140,11 @@ def parse_args() -> argparse.Namespace:
     )
     p.add_argument("--heartbeat-seconds", type=float, default=10.0, help="Print a progress heartbeat at least this often. 0 disables.")
     p.add_argument("--verbose", action="store_true", help="Print per-file details.")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     dsn = get_dsn(args.dsn)
 
     root = Path(args.probabilities_root)
@@ -231,7 +238,7 @@ def main() -> int:
         cur.executemany(upsert_sql, rows)
         return len(rows)
 
-    with psycopg.connect(dsn) as conn:
+    with connect(dsn) as conn:
         with conn.cursor() as cur:
             pending_rows: list[tuple[Any, ...]] = []
             for i, fk in enumerate(files, start=1):
@@ -245,7 +252,7 @@ def main() -> int:
                     last_hb = now
 
                 try:
-                    obj = json.loads(fk.path.read_text(encoding="utf-8"))
+                    obj = json.loads(read_archive_bytes(fk.path).decode("utf-8"))
                     items = obj.get("items")
                     if not isinstance(items, list):
                         if args.verbose:
@@ -31,7 +31,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from scripts.lib._db_lib import get_dsn
+from scripts.lib._db_lib import connect, get_dsn
 
 
 SCOREBOARD_FILE_RE = re.compile(r"^scoreboard_(?P<date>\d{8})\.json$")
@@ -108,7 +108,7 @@ def _iter_scoreboard_files(scoreboard_dir: Path) -> list[FileKey]:
     return out
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Load ESPN scoreboard data (raw JSON) into Postgres.")
     p.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres DSN (or set DATABASE_URL).")
     p.add_argument("--scoreboard-dir", default="data/raw/espn/scoreboard", help="Dir containing scoreboard_YYYYMMDD.json files.")
@@ -123,7 +123,7 @@ def parse_args() -> argparse.Namespace:
     )
     p.add_argument("--heartbeat-seconds", type=float, default=10.0, help="Print a progress heartbeat at least this often. 0 disables.")
     p.add_argument("--verbose", action="store_true", help="Print per-file details.")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 def _find_competitor(competitors: list[dict], home_away: str) -> dict | None:
@@ -134,8 +134,8 @@ def _find_competitor(competitors: list[dict], home_away: str) -> dict | None:
     return None
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     dsn = get_dsn(args.dsn)
 
     scoreboard_dir = Path(args.scoreboard_dir)
@@ -237,7 +237,7 @@ def main() -> int:
         cur.executemany(upsert_sql, rows)
         return len(rows)
 
-    with psycopg.connect(dsn) as conn:
+    with connect(dsn) as conn:
         with conn.cursor() as cur:
             pending_rows: list[tuple[Any, ...]] = []
             for i, fk in enumerate(files, start=1):
@@ -4,7 +4,9 @@ Load Kalshi candlestick time-series data into PostgreSQL.
 
 Design Pattern: Idempotent Time-Series Upsert
 - Scans candlestick JSON files from a fetch directory
-- Uses UPSERT (ON CONFLICT) for idempotent inserts by (ticker, period_ts, period_interval)
+- Uses UPSERT (ON CONFLICT) for idempotent inserts by (ticker, period_ts, period_interval); rows whose values
+  did not change are left untouched
+- Marks the ESPN games of changed tickers dirty for scripts/process/refresh_snapshot_features.py
 
 Algorithm: Linear scan O(n) where n = total candlesticks across all files
 Big O: O(n) time complexity, O(1) space per batch
@@ -49,23 +51,34 @@ from scripts.lib._db_lib import (
     get_dsn,
     start_ingestion_run,
 )
+from scripts.lib._fetch_lib import logical_archive_path, read_archive_bytes
+from scripts.process.refresh_snapshot_features import mark_games_dirty_for_tickers
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Load Kalshi candlestick data into Postgres.")
     p.add_argument("--dsn", default=None, help="Postgres DSN (or set DATABASE_URL).")
     p.add_argument("--candlesticks-dir", help="Directory containing candlestick JSON files")
     p.add_argument("--candlesticks-file", help="Single candlestick JSON file")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
-def compute_file_hash(path: Path) -> str:
-    """Compute SHA256 hash of file contents."""
+def compute_file_hash(path: Path) -> tuple[str, int]:
+    """
+    (SHA256, byte size) of the file's payload.
+
+    For .json.zst archives both describe the uncompressed body, matching the fetch manifests.
+    """
+    if path.suffix == ".zst":
+        body = read_archive_bytes(path)
+        return hashlib.sha256(body).hexdigest(), len(body)
     h = hashlib.sha256()
+    size = 0
     with open(path, "rb") as f:
         for chunk in iter(lambda: f.read(8192), b""):
             h.update(chunk)
-    return h.hexdigest()
+            size += len(chunk)
+    return h.hexdigest(), size
 
 
 def ts_to_datetime(ts: int | None) -> datetime | None:
@@ -76,18 +89,20 @@ def ts_to_datetime(ts: int | None) -> datetime | None:
 
 
 def find_candlestick_files(base_dir: Path) -> Iterator[Path]:
-    """Recursively find all candlestick JSON files in a directory."""
+    """Recursively find all candlestick JSON (or zstd-compressed .json.zst) files in a directory."""
     for path in base_dir.rglob("candlesticks_*.json"):
         yield path
+    for path in base_dir.rglob("candlesticks_*.json.zst"):
+        yield path
 
 
 def upsert_candlestick_source_file(conn: Any, path: Path) -> int:
     """Create a source_files record for a candlestick file."""
-    sha256_hex = compute_file_hash(path)
+    sha256_hex, byte_size = compute_file_hash(path)
     fetched_at = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
     
     # Extract ticker from filename like "candlesticks_KXNBAGAME_25DEC19CHICLE_CLE.json"
-    source_key = path.stem  # filename without extension
+    source_key = logical_archive_path(path).stem  # filename without extension (.json / .json.zst)
     
     sql = """
     INSERT INTO source_files(source_type, source_key, path, fetched_at, http_status, sha256_hex, byte_size)
@@ -108,18 +123,24 @@ def upsert_candlestick_source_file(conn: Any, path: Path) -> int:
             fetched_at,
             200,
             sha256_hex,
-            path.stat().st_size,
+            byte_size,
         ),
     ).fetchone()
     return int(row[0])
 
 
-def load_candlestick_file(conn: Any, path: Path, source_file_id: int | None) -> tuple[int, int]:
+def load_candlestick_file(
+    conn: Any,
+    path: Path,
+    source_file_id: int | None,
+    changed_tickers: set[str] | None = None,
+) -> tuple[int, int]:
     """
     Load candlesticks from a single JSON file.
-    Returns (inserted_count, updated_count).
+    Returns (inserted_count, updated_count); rows already holding the same values count as neither.
+    The file's ticker is added to `changed_tickers` when any row was inserted or updated.
     """
-    data = json.loads(path.read_text(encoding="utf-8"))
+    data = json.loads(read_archive_bytes(path).decode("utf-8"))
     
     # Extract request info
     request = data.get("request", {})
@@ -192,6 +213,21 @@ def load_candlestick_file(conn: Any, path: Path, source_file_id: int | None) ->
                 yes_ask_close = EXCLUDED.yes_ask_close,
                 volume = EXCLUDED.volume,
                 open_interest = EXCLUDED.open_interest
+            WHERE (
+                kalshi.candlesticks.price_open, kalshi.candlesticks.price_high, kalshi.candlesticks.price_low,
+                kalshi.candlesticks.price_close, kalshi.candlesticks.price_mean, kalshi.candlesticks.price_previous,
+                kalshi.candlesticks.yes_bid_open, kalshi.candlesticks.yes_bid_high, kalshi.candlesticks.yes_bid_low,
+                kalshi.candlesticks.yes_bid_close, kalshi.candlesticks.yes_ask_open, kalshi.candlesticks.yes_ask_high,
+                kalshi.candlesticks.yes_ask_low, kalshi.candlesticks.yes_ask_close, kalshi.candlesticks.volume,
+                kalshi.candlesticks.open_interest
+            ) IS DISTINCT FROM (
+                EXCLUDED.price_open, EXCLUDED.price_high, EXCLUDED.price_low,
+                EXCLUDED.price_close, EXCLUDED.price_mean, EXCLUDED.price_previous,
+                EXCLUDED.yes_bid_open, EXCLUDED.yes_bid_high, EXCLUDED.yes_bid_low,
+                EXCLUDED.yes_bid_close, EXCLUDED.yes_ask_open, EXCLUDED.yes_ask_high,
+                EXCLUDED.yes_ask_low, EXCLUDED.yes_ask_close, EXCLUDED.volume,
+                EXCLUDED.open_interest
+            )
             RETURNING (xmax = 0) AS inserted
             """,
             (
@@ -218,16 +254,20 @@ def load_candlestick_file(conn: Any, path: Path, source_file_id: int | None) ->
             ),
         ).fetchone()
         
-        if result and result[0]:
+        if result is None:
+            continue  # Unchanged
+        if result[0]:
             inserted += 1
         else:
             updated += 1
     
+    if changed_tickers is not None and (inserted or updated):
+        changed_tickers.add(ticker)
     return inserted, updated
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     dsn = get_dsn(args.dsn)
 
     if not args.candlesticks_dir and not args.candlesticks_file:
@@ -255,6 +295,7 @@ def main() -> int:
     total_inserted = 0
     total_updated = 0
     files_processed = 0
+    changed_tickers: set[str] = set()
 
     with connect(dsn) as conn:
         run_id = None
@@ -271,7 +312,7 @@ def main() -> int:
                 for file_path in files_to_process:
                     try:
                         source_file_id = upsert_candlestick_source_file(conn, file_path)
-                        inserted, updated = load_candlestick_file(conn, file_path, source_file_id)
+                        inserted, updated = load_candlestick_file(conn, file_path, source_file_id, changed_tickers)
                         total_inserted += inserted
                         total_updated += updated
                         files_processed += 1
@@ -282,6 +323,8 @@ def main() -> int:
                         print(f"Warning: Failed to process {file_path}: {e}")
                         continue
 
+                games_marked = mark_games_dirty_for_tickers(conn, changed_tickers)
+
                 finish_ingestion_run_success(
                     conn,
                     ingest_run_id=run_id,
@@ -290,7 +333,10 @@ def main() -> int:
                     rows_deleted=0,
                 )
 
-            print(f"Loaded Kalshi candlesticks: files={files_processed} inserted={total_inserted} updated={total_updated}")
+            print(
+                f"Loaded Kalshi candlesticks: files={files_processed} inserted={total_inserted} updated={total_updated} "
+                f"tickers_changed={len(changed_tickers)} feature_games_marked={games_marked}"
+            )
             return 0
 
         except Exception as e:
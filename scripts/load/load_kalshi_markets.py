@@ -14,6 +14,7 @@ Idempotency:
 - Upserts source_files by (source_type, source_key, sha256_hex)
 - Upserts kalshi_market_snapshots by unique (source_file_id)
 - Rebuilds kalshi_markets for snapshot_id via delete+insert
+- Marks ESPN games with a newly matched market dirty for scripts/process/refresh_snapshot_features.py
 
 Usage:
   python scripts/load_kalshi_markets.py \\
@@ -52,14 +53,15 @@ from scripts.lib._db_lib import (
     parse_iso8601_z,
     start_ingestion_run,
 )
+from scripts.process.refresh_snapshot_features import mark_games_dirty_for_market_snapshot
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Load Kalshi markets snapshot JSON into Postgres.")
     p.add_argument("--dsn", default=None, help="Postgres DSN (or set DATABASE_URL).")
     p.add_argument("--markets-file", required=True, help="Path to all_markets.json")
     p.add_argument("--manifest-file", help="Optional path to manifest JSON (auto-generated if not provided)")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 def compute_file_hash(path: Path) -> str:
@@ -152,8 +154,8 @@ def upsert_kalshi_source_file(conn: Any, manifest: dict[str, Any]) -> int:
     return int(row[0])
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     dsn = get_dsn(args.dsn)
 
     markets_path = Path(args.markets_file)
@@ -409,6 +411,7 @@ def main() -> int:
                     RETURNING km.ticker
                 """, (snapshot_id,)).fetchall()
                 espn_games_matched = len(espn_matches)
+                feature_games_marked = mark_games_dirty_for_market_snapshot(conn, snapshot_id)
 
                 finish_ingestion_run_success(
                     conn,
@@ -418,7 +421,7 @@ def main() -> int:
                     rows_deleted=rows_deleted,
                 )
 
-            print(f"Loaded Kalshi markets snapshot: series={series_ticker} total={total_markets} inserted={rows_inserted} deleted={rows_deleted} nba_games_matched={games_matched} espn_games_matched={espn_games_matched}")
+            print(f"Loaded Kalshi markets snapshot: series={series_ticker} total={total_markets} inserted={rows_inserted} deleted={rows_deleted} nba_games_matched={games_matched} espn_games_matched={espn_games_matched} feature_games_marked={feature_games_marked}")
             return 0
 
         except Exception as e:
@@ -15,11 +15,19 @@ Idempotency:
 - Inserts trades with ON CONFLICT DO NOTHING (trade_id is unique)
 - Safe to re-run without duplicating data
 
+Rollups:
+- The 1s/10s/60s candles in kalshi.trade_candles_v1 are refreshed for the minutes that received new trades,
+  in the same transaction as the trades (--rebuild-rollups recomputes them from scratch)
+- A ticker not yet backfilled (no kalshi.trade_candles_coverage_v1 row) gets its whole history rolled up instead,
+  and the first run against a database without coverage rows backfills every ticker
+
 Usage:
   python scripts/load_kalshi_trades.py \\
     --trades-dir data/raw/kalshi/trades \\
     --dsn "$DATABASE_URL"
 
+  python scripts/load_kalshi_trades.py --rebuild-rollups --dsn "$DATABASE_URL"
+
 Pros:
 - Full historical data preserved for replay/reprocessing
 - Matches existing codebase patterns
@@ -56,6 +64,14 @@ from scripts.lib._db_lib import (
     parse_iso8601_z,
     start_ingestion_run,
 )
+from scripts.lib._fetch_lib import logical_archive_path, read_archive_bytes
+from scripts.lib._trade_rollups_lib import (
+    backfill_trade_rollups,
+    ensure_trade_rollups,
+    rebuild_trade_rollups,
+    refresh_trade_rollups,
+    trade_rollup_watermarks,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -74,17 +90,21 @@ def load_trades_file(
     conn: Any,
     trades_file: Path,
     source_type: str = "kalshi_trades",
+    touched: dict[str, list[int]] | None = None,
 ) -> tuple[int, int]:
     """
     Load trades from a single JSON file.
     
+    Args:
+        touched: If given, updated with ticker -> [first, last] Unix second of the newly inserted trades
+    
     Returns:
         Tuple of (trades_inserted, trades_skipped)
     """
     logger.info(f"Loading trades from: {trades_file}")
     
-    # Read file
-    body_bytes = trades_file.read_bytes()
+    # Read file (.json or zstd-compressed .json.zst; the hash is always over the uncompressed body)
+    body_bytes = read_archive_bytes(trades_file)
     sha256_hex = sha256_hex_bytes(body_bytes)
     
     # Parse JSON
@@ -219,6 +239,10 @@ def load_trades_file(
             
             if result.rowcount > 0:
                 trades_inserted += 1
+                if touched is not None:
+                    ts = int(created_time.timestamp())
+                    span = touched.setdefault(ticker or trade.get("ticker", ""), [ts, ts])
+                    span[0], span[1] = min(span[0], ts), max(span[1], ts)
             else:
                 trades_skipped += 1  # Already exists
                 
@@ -238,8 +262,8 @@ def main() -> int:
     parser.add_argument(
         "--trades-dir",
         type=str,
-        required=True,
-        help="Directory containing trade JSON files (will search recursively)",
+        default=None,
+        help="Directory containing trade JSON (or .json.zst) files (will search recursively)",
     )
     parser.add_argument(
         "--dsn",
@@ -253,6 +277,11 @@ def main() -> int:
         default=None,
         help="Limit number of files to process (for testing)",
     )
+    parser.add_argument(
+        "--rebuild-rollups",
+        action="store_true",
+        help="Recompute the 1s/10s/60s trade candle rollups for every ticker (after loading --trades-dir, if given)",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -260,6 +289,8 @@ def main() -> int:
     )
     
     args = parser.parse_args()
+    if args.trades_dir is None and not args.rebuild_rollups:
+        parser.error("--trades-dir is required unless --rebuild-rollups is given")
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -271,6 +302,11 @@ def main() -> int:
     dsn = get_dsn(args.dsn)
     logger.debug(f"Database DSN: {dsn[:20]}...")
     
+    if args.trades_dir is None:
+        with connect(dsn) as conn:
+            rebuild_trade_rollups(conn)
+        return 0
+    
     trades_dir = Path(args.trades_dir)
     if not trades_dir.exists():
         logger.error(f"Trades directory does not exist: {trades_dir}")
@@ -279,8 +315,8 @@ def main() -> int:
     # Find all trade JSON files (excluding manifests, summaries, and page files)
     # Note: We only load ticker-level aggregated files, not page files (which are duplicates)
     trade_files = [
-        f for f in trades_dir.rglob("*.json")
-        if not f.name.endswith(".manifest.json") 
+        f for f in sorted([*trades_dir.rglob("*.json"), *trades_dir.rglob("*.json.zst")])
+        if not logical_archive_path(f).name.endswith(".manifest.json")
         and f.name != "summary.json"
         and "pages" not in f.parts  # Skip page files - they're duplicates of ticker-level files
     ]
@@ -310,15 +346,28 @@ def main() -> int:
             run_id = run.ingest_run_id
             total_inserted = 0
             total_skipped = 0
+            total_candles = 0
+            ensure_trade_rollups(conn)
             
             for i, trade_file in enumerate(trade_files, 1):
                 logger.info(f"[{i}/{len(trade_files)}] Processing: {trade_file.name}")
                 
                 try:
-                    inserted, skipped = load_trades_file(conn, trade_file)
+                    touched: dict[str, list[int]] = {}
+                    inserted, skipped = load_trades_file(conn, trade_file, touched=touched)
                     total_inserted += inserted
                     total_skipped += skipped
                     
+                    # Re-roll only the minutes that received new trades, unless the ticker's older trades
+                    # aren't rolled up yet: then roll up its whole history
+                    watermarks = trade_rollup_watermarks(conn, touched)
+                    for ticker, (first_ts, last_ts) in touched.items():
+                        rolled_from = watermarks.get(ticker)
+                        if rolled_from is not None and rolled_from <= first_ts:
+                            total_candles += refresh_trade_rollups(conn, ticker, first_ts, last_ts)
+                        else:
+                            total_candles += backfill_trade_rollups(conn, ticker)
+                    
                     # Commit after each file for progress tracking
                     conn.commit()
                     
@@ -333,6 +382,7 @@ def main() -> int:
             logger.info(f"Total trades inserted: {total_inserted:,}")
             logger.info(f"Total trades skipped: {total_skipped:,}")
             logger.info(f"Total files processed: {len(trade_files)}")
+            logger.info(f"Total rollup candles written: {total_candles:,}")
             
             finish_ingestion_run_success(
                 conn,
@@ -342,6 +392,9 @@ def main() -> int:
                 rows_deleted=0,
             )
             
+            if args.rebuild_rollups:
+                rebuild_trade_rollups(conn)
+            
             return 0
             
     except Exception as e:
@@ -45,7 +45,7 @@ from scripts.lib._db_lib import (
 )
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Load NBA PBP JSON into Postgres (one game).")
     p.add_argument("--dsn", default=None, help="Postgres DSN (or set DATABASE_URL).")
     p.add_argument("--pbp-file", required=True, help="Path to archived PBP JSON")
@@ -55,7 +55,7 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Do NOT rebuild qualifiers/people_filter (not recommended). Default behavior rebuilds.",
     )
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 def _safe_int(v: Any) -> int | None:
@@ -105,8 +105,8 @@ def _upsert_official(conn, official_id: int) -> None:
     )
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     dsn = get_dsn(args.dsn)
 
     pbp_path = Path(args.pbp_file)
@@ -4,7 +4,8 @@ Load sportsbook odds data from CSV files into PostgreSQL.
 
 Design Pattern: ETL Pattern (Extract, Transform, Load)
 Algorithm: CSV parsing → team name normalization → odds conversion → 
-           opening line identification → ESPN game mapping → database insert
+           opening line identification → ESPN game mapping → database insert →
+           per-game opening-odds features (derived.opening_odds_features_v1) for the touched games
 Big O: O(n) where n = number of odds records
 
 Supports two data sources:
@@ -39,6 +40,7 @@ from psycopg.types.json import Jsonb
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from scripts.lib._odds_features_lib import refresh_opening_odds_features
 from scripts.lib.team_name_mapping import normalize_team_name
 from scripts.lib.odds_conversion import (
     american_to_decimal,
@@ -747,6 +749,10 @@ def main() -> int:
         
         if not args.dry_run:
             logger.info(f"Successfully loaded {inserted_count} records into database")
+            # Re-engineer opening-odds features (overround, fair prob) once per touched game
+            game_ids = transformed_df['espn_game_id'].dropna().astype(str).unique().tolist()
+            refreshed = refresh_opening_odds_features(conn, game_ids)
+            logger.info(f"Refreshed opening-odds features for {refreshed} games")
         else:
             logger.info(f"DRY RUN: Would load {inserted_count} records")
     
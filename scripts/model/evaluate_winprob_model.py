@@ -5,7 +5,8 @@ Evaluate a saved win-probability pipeline artifact on a held-out season.
 This script:
 - loads the artifact JSON
 - scores snapshot rows from ESPN tables
-- reports overall metrics and per-bucket metrics
+- reports overall metrics and per-bucket metrics (optionally with game-level bootstrap CIs, --bootstrap N)
+- reports metrics by bucket, time bucket, period and has-odds in one grouped pass (eval.groups)
 - writes a JSON report (and optionally a calibration SVG without external plotting libs)
 
 For detailed usage instructions, see: cursor-files/docs/evaluate_winprob_model_guide.md
@@ -28,7 +29,6 @@ import logging
 import math
 import sys
 import time
-import warnings
 from pathlib import Path
 from typing import Any
 
@@ -44,14 +44,15 @@ import pandas as pd
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from scripts.lib._db_lib import get_dsn, connect
+from scripts.lib._feature_cache_lib import DEFAULT_CACHE_DIR, load_query_cached
+from scripts.lib._metrics_lib import bootstrap_ci, grouped_metrics, metrics_summary, reliability_bins
+from scripts.lib._odds_features_lib import ensure_opening_odds_features
+from scripts.lib._report_catalog_lib import record_report
 from scripts.lib._winprob_lib import (
-    brier,
     build_design_matrix,
-    ece_binned,
     load_artifact,
-    logloss,
     predict_proba,
-    roc_auc,
+    time_bucket_labels,
     utc_now_iso_compact,
 )
 
@@ -66,10 +67,13 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--season-start", type=int, required=True, help="Season_start to evaluate (e.g. 2024).")
     p.add_argument("--out", required=True, help="Output JSON report path.")
     p.add_argument("--bins", type=int, default=20, help="Bins for ECE/reliability (default: 20).")
+    p.add_argument("--bootstrap", type=int, default=0, help="Bootstrap replicates for 95%% CIs on overall metrics, resampling whole games (default: 0, off).")
     p.add_argument("--plot-calibration", action="store_true", help="Write an SVG reliability diagram next to the JSON report.")
     p.add_argument("--verbose", action="store_true", help="Enable verbose logging with detailed progress information.")
-    p.add_argument("--workers", type=int, default=8, help="Number of parallel workers for per-bucket metrics (default: 1, no parallelization). NOTE: Currently not implemented due to artifact pickling limitations.")
+    p.add_argument("--workers", type=int, default=8, help="Unused (kept for compatibility): per-bucket metrics are computed in a single grouped pass.")
     p.add_argument("--disable-calibration", action="store_true", help="Evaluate model without Platt calibration (for comparison).")
+    p.add_argument("--feature-cache-dir", type=str, default=str(DEFAULT_CACHE_DIR), help=f"Versioned feature cache directory (default: {DEFAULT_CACHE_DIR}).")
+    p.add_argument("--no-feature-cache", action="store_true", help="Always re-extract evaluation data from the database.")
     return p.parse_args()
 
 
@@ -379,7 +383,7 @@ def _write_calibration_context_svg(
     out_path.write_text("\n".join(parts) + "\n", encoding="utf-8")
 
 
-def _load_evaluation_data(conn, season_start: int, artifact) -> pd.DataFrame:
+def _load_evaluation_data(conn, season_start: int, artifact, cache_dir: str | Path | None = None) -> pd.DataFrame:
     """
     Load evaluation data from ESPN tables for a specific season.
     
@@ -389,42 +393,28 @@ def _load_evaluation_data(conn, season_start: int, artifact) -> pd.DataFrame:
     use_opening_odds = any("opening" in fn.lower() for fn in artifact.feature_names)
     
     # Base query: ESPN probabilities + game state
-    # Add opening odds CTE if needed
-    opening_odds_cte = ""
+    # Opening odds come from the per-game feature store (scripts/lib/_odds_features_lib.py)
     opening_odds_join = ""
     opening_odds_select = ""
     
     if use_opening_odds:
-        opening_odds_cte = """
-        opening_odds AS (
-            -- Pivot opening odds by market_type and side
-            SELECT 
-                espn_game_id,
-                MAX(odds_decimal) FILTER (WHERE market_type = 'moneyline' AND side = 'home') AS opening_moneyline_home,
-                MAX(odds_decimal) FILTER (WHERE market_type = 'moneyline' AND side = 'away') AS opening_moneyline_away,
-                MAX(line_value) FILTER (WHERE market_type = 'spread' AND side = 'home') AS opening_spread,
-                MAX(line_value) FILTER (WHERE market_type = 'total' AND side = 'over') AS opening_total
-            FROM external.sportsbook_odds_snapshots
-            WHERE is_opening_line = TRUE
-                AND espn_game_id IS NOT NULL
-            GROUP BY espn_game_id
-        ),
-        """
+        ensure_opening_odds_features(conn)
         opening_odds_join = """
-            LEFT JOIN opening_odds oo
-                ON e.game_id = oo.espn_game_id
+    LEFT JOIN derived.opening_odds_features_v1 oo
+        ON e.game_id = oo.espn_game_id
         """
         opening_odds_select = """
         ,
         oo.opening_moneyline_home,
         oo.opening_moneyline_away,
         oo.opening_spread,
-        oo.opening_total
+        oo.opening_total,
+        oo.opening_prob_home_fair,
+        oo.opening_overround
         """
     
     base_query = f"""
-    WITH {opening_odds_cte}
-    espn_base AS (
+    WITH espn_base AS (
         SELECT 
             p.season_label,
             p.game_id,
@@ -519,25 +509,14 @@ def _load_evaluation_data(conn, season_start: int, artifact) -> pd.DataFrame:
     ORDER BY e.season_label, e.game_id, e.sequence_number
     """
     
-    # Suppress pandas warning about psycopg connection
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=UserWarning, message=".*pandas only supports SQLAlchemy.*")
-        df = pd.read_sql(query, conn, params=(season_start,))
-    
-    # Compute opening odds engineered features if needed
-    if use_opening_odds and len(df) > 0:
-        from scripts.lib._winprob_lib import compute_opening_odds_features
-        
-        odds_features = compute_opening_odds_features(
-            opening_moneyline_home=df['opening_moneyline_home'].to_numpy() if 'opening_moneyline_home' in df.columns else None,
-            opening_moneyline_away=df['opening_moneyline_away'].to_numpy() if 'opening_moneyline_away' in df.columns else None,
-            opening_spread=df['opening_spread'].to_numpy() if 'opening_spread' in df.columns else None,
-            opening_total=df['opening_total'].to_numpy() if 'opening_total' in df.columns else None,
-        )
-        
-        # Add engineered features to dataframe
-        df['opening_prob_home_fair'] = odds_features['opening_prob_home_fair']
-        df['opening_overround'] = odds_features['opening_overround']
+    df = load_query_cached(
+        conn,
+        query,
+        (season_start,),
+        name="evaluate_winprob",
+        cache_dir=cache_dir,
+        log=lambda msg: logging.getLogger(__name__).info(msg),
+    )
     
     return df
 
@@ -592,7 +571,7 @@ def main() -> int:
     logger.info(f"Loading evaluation data for season_start={ss}")
     load_start = time.time()
     with connect(dsn) as conn:
-        df = _load_evaluation_data(conn, ss, art)
+        df = _load_evaluation_data(conn, ss, art, cache_dir=None if args.no_feature_cache else args.feature_cache_dir)
     logger.debug(f"Loaded {len(df)} rows from database in {time.time() - load_start:.2f}s")
 
     df = df[df["final_winning_team"].notna()].copy()
@@ -665,110 +644,48 @@ def main() -> int:
     # Overall metrics
     logger.info("Calculating overall metrics")
     metrics_start = time.time()
-    overall = {
-        "n": int(len(df)),
-        "logloss": logloss(p, y),
-        "brier": brier(p, y),
-        "roc_auc": roc_auc(p, y),
-        "ece_binned": ece_binned(p, y, bins=int(args.bins)),
-        "prevalence_home_win": float(np.mean(y)),
-    }
+    overall = metrics_summary(p, y, bins=int(args.bins))
+    if int(args.bootstrap) > 0:
+        groups = df["game_id"].astype(str).to_numpy() if "game_id" in df.columns else None
+        overall["ci"] = {
+            "level": 0.95,
+            "n_boot": int(args.bootstrap),
+            "resample": "game_id" if groups is not None else "row",
+            **bootstrap_ci(p, y, bins=int(args.bins), n_boot=int(args.bootstrap), groups=groups),
+        }
     logger.debug(f"Overall metrics calculated in {time.time() - metrics_start:.2f}s")
     logger.info(f"Overall metrics: logloss={overall['logloss']:.6f}, brier={overall['brier']:.6f}, ece={overall['ece_binned']:.6f}, auc={overall['roc_auc']:.6f}")
 
     # Calibration bins
     logger.info(f"Calculating calibration bins (bins={args.bins})")
     bins = max(1, int(args.bins))
-    idx = np.minimum(bins - 1, np.maximum(0, np.floor(p * bins).astype(np.int32)))
-    calib_rows: list[dict[str, Any]] = []
-    for b in range(bins):
-        mask = idx == b
-        nb = int(np.sum(mask))
-        if nb <= 0:
-            continue
-        avg_p = float(np.mean(p[mask]))
-        obs = float(np.mean(y[mask]))
-        lo = b / bins
-        hi = (b + 1) / bins
-        calib_rows.append({"bin": int(b), "range": [float(lo), float(hi)], "n": int(nb), "avg_p": avg_p, "obs_rate": obs, "gap": float(obs - avg_p)})
+    calib_rows = reliability_bins(p, y, bins=bins)
     logger.debug(f"Created {len(calib_rows)} calibration bins")
 
-    # Per-bucket metrics (bucket_seconds_remaining)
-    logger.info("Calculating per-bucket metrics")
+    # Per-bucket and per-group metrics: the per-row predictions above are grouped in one pass
+    logger.info("Calculating grouped metrics")
     bucket_start = time.time()
-    unique_buckets = sorted(df["bucket_seconds_remaining"].astype(int).unique().tolist(), reverse=True)
-    logger.debug(f"Found {len(unique_buckets)} unique time buckets")
-    
-    per_bucket: list[dict[str, Any]] = []
-    workers = max(1, int(args.workers))
-    
-    if workers > 1:
-        logger.warning(f"--workers={workers} specified but parallel processing not yet implemented (artifact pickling limitations). Using sequential processing.")
-    
-    for i, b in enumerate(unique_buckets):
-        if (i + 1) % 10 == 0:
-            logger.debug(f"Processing bucket {i+1}/{len(unique_buckets)}: {b} seconds remaining")
-        sub = df[df["bucket_seconds_remaining"].astype(int) == int(b)]
-        yb = (sub["final_winning_team"].astype(int) == 0).astype(int).to_numpy(dtype=np.float64)
-        
-        # Build design matrix with optional interaction terms
-        build_matrix_kwargs_b = {
-            "point_differential": sub["point_differential"].to_numpy(),
-            "time_remaining_regulation": sub["time_remaining_regulation"].to_numpy(),
-            "possession": sub["possession"].astype(str).tolist(),
-            "preprocess": art.preprocess,
-        }
-        
-        if use_interaction_terms:
-            if "score_diff_div_sqrt_time_remaining" in sub.columns:
-                build_matrix_kwargs_b["score_diff_div_sqrt_time_remaining"] = sub["score_diff_div_sqrt_time_remaining"].astype(float).to_numpy()
-            if "espn_home_prob" in sub.columns:
-                build_matrix_kwargs_b["espn_home_prob"] = sub["espn_home_prob"].astype(float).to_numpy()
-            if "espn_home_prob_lag_1" in sub.columns:
-                build_matrix_kwargs_b["espn_home_prob_lag_1"] = sub["espn_home_prob_lag_1"].astype(float).to_numpy()
-            if "espn_home_prob_delta_1" in sub.columns:
-                build_matrix_kwargs_b["espn_home_prob_delta_1"] = sub["espn_home_prob_delta_1"].astype(float).to_numpy()
-            if "period" in sub.columns:
-                build_matrix_kwargs_b["period"] = sub["period"].astype(int).tolist()
-        
-        # Add opening odds features if present in artifact (same as overall metrics)
-        # Note: opening_prob_home_fair, opening_spread, opening_total are NOT features - they're baseline inputs
-        if use_opening_odds:
-            if "opening_overround" in sub.columns:
-                build_matrix_kwargs_b["opening_overround"] = sub["opening_overround"].astype(float).to_numpy()
-            # Pass odds_nan_policy="keep" for CatBoost models
-            build_matrix_kwargs_b["odds_nan_policy"] = "keep"
-        
-        Xb = build_design_matrix(**build_matrix_kwargs_b)
-        # Check if model uses baseline using the artifact flag
-        uses_baseline = getattr(art, 'uses_opening_odds_baseline', None)
-        if uses_baseline is None:
-            # Fallback heuristic for older artifacts
-            has_opening_odds_features = any("opening" in fn.lower() or "overround" in fn.lower() for fn in art.feature_names)
-            opening_prob_not_a_feature = "opening_prob_home_fair" not in art.feature_names
-            uses_baseline = has_opening_odds_features and opening_prob_not_a_feature
-        
-        if uses_baseline and "opening_prob_home_fair" in sub.columns:
-            pb = predict_proba(
-                art, 
-                X=Xb,
-                opening_prob_home_fair=sub["opening_prob_home_fair"].astype(float).to_numpy(),
-            )
-        else:
-            pb = predict_proba(art, X=Xb)
-        per_bucket.append(
-            {
-                "bucket_seconds_remaining": int(b),
-                "n": int(len(sub)),
-                "logloss": logloss(pb, yb),
-                "brier": brier(pb, yb),
-                "roc_auc": roc_auc(pb, yb),
-                "ece_binned": ece_binned(pb, yb, bins=bins),
-                "prevalence_home_win": float(np.mean(yb)),
-            }
-        )
-    
-    logger.debug(f"Per-bucket metrics calculated in {time.time() - bucket_start:.2f}s")
+    keys: dict[str, Any] = {
+        "bucket_seconds_remaining": df["bucket_seconds_remaining"].astype(int).to_numpy(),
+        "time_bucket": time_bucket_labels(df["time_remaining_regulation"].to_numpy(dtype=np.float64)),
+    }
+    if "period" in df.columns:
+        keys["period"] = df["period"].fillna(0).astype(int).to_numpy()
+    if "opening_prob_home_fair" in df.columns:
+        keys["has_odds"] = df["opening_prob_home_fair"].notna().to_numpy()
+    groups = grouped_metrics({"model": p}, y, keys=keys, bins=bins, include_overall=False)
+    for r in groups:
+        del r["model"]
+    per_bucket: list[dict[str, Any]] = sorted(
+        (
+            {"bucket_seconds_remaining": int(r["group"]), **{k: v for k, v in r.items() if k not in ("group_by", "group")}}
+            for r in groups
+            if r["group_by"] == "bucket_seconds_remaining"
+        ),
+        key=lambda r: r["bucket_seconds_remaining"],
+        reverse=True,
+    )
+    logger.debug(f"{len(per_bucket)} buckets, {len(groups)} groups calculated in {time.time() - bucket_start:.2f}s")
 
     report = {
         "created_at_utc": utc_now_iso_compact(),
@@ -788,6 +705,7 @@ def main() -> int:
             "overall": overall,
             "calibration_bins": calib_rows,
             "per_bucket_seconds_remaining": per_bucket,
+            "groups": groups,
         },
     }
     logger.info("Writing JSON report")
@@ -852,6 +770,8 @@ def main() -> int:
         
         logger.debug("Calibration plots generated")
 
+    # Index the report (and any plots just written) so the stats endpoints serve it without re-reading files.
+    record_report(out_path)
     return 0
 
 
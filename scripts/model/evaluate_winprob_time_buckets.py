@@ -13,6 +13,9 @@ Time Buckets:
 - 600-120s: Q4 mid to final 2 minutes
 - 120-0s: Final 2 minutes
 
+All metrics for both models and every group (time bucket, period, season, has-odds) come from one grouped
+pass (scripts/lib/_metrics_lib.grouped_metrics); --out-results also stores them in long format under "groups".
+
 Usage:
   python scripts/model/evaluate_winprob_time_buckets.py \
     --baseline-artifact artifacts/winprob_catboost_baseline.json \
@@ -27,42 +30,36 @@ import argparse
 import json
 import sys
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import brier_score_loss, log_loss
 
 # Add project root to path
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from scripts.lib._db_lib import get_dsn, connect
+from scripts.lib._feature_cache_lib import DEFAULT_CACHE_DIR, load_query_cached
+from scripts.lib._metrics_lib import grouped_metrics
+from scripts.lib._odds_features_lib import ensure_opening_odds_features
 from scripts.lib._winprob_lib import (
+    TIME_BUCKETS,
     WinProbArtifact,
     load_artifact,
     build_design_matrix,
     predict_proba,
     ODDS_FEATURES,
+    time_bucket_labels,
 )
 
 
 def assign_time_bucket(time_remaining: float) -> str:
     """Assign time bucket based on time_remaining."""
-    if time_remaining > 2400:
-        return "2880-2400"
-    elif time_remaining > 1800:
-        return "2400-1800"
-    elif time_remaining > 1200:
-        return "1800-1200"
-    elif time_remaining > 600:
-        return "1200-600"
-    elif time_remaining > 120:
-        return "600-120"
-    else:
-        return "120-0"
+    return str(time_bucket_labels([time_remaining])[0])
 
 
-def load_test_data(conn, test_season_start: int, artifact: WinProbArtifact) -> pd.DataFrame:
+def load_test_data(conn, test_season_start: int, artifact: WinProbArtifact, cache_dir: str | Path | None = None) -> pd.DataFrame:
     """Load test set data matching the artifact's feature requirements."""
     # Load from ESPN tables (same as training, but only test season)
     query = """
@@ -99,18 +96,6 @@ def load_test_data(conn, test_season_start: int, artifact: WinProbArtifact) -> p
             LAG(espn_home_prob, 1) OVER (PARTITION BY game_id ORDER BY sequence_number) AS espn_home_prob_lag_1
         FROM espn_base
     ),
-    opening_odds AS (
-        SELECT 
-            espn_game_id,
-            MAX(odds_decimal) FILTER (WHERE market_type = 'moneyline' AND side = 'home') AS opening_moneyline_home,
-            MAX(odds_decimal) FILTER (WHERE market_type = 'moneyline' AND side = 'away') AS opening_moneyline_away,
-            MAX(line_value) FILTER (WHERE market_type = 'spread' AND side = 'home') AS opening_spread,
-            MAX(line_value) FILTER (WHERE market_type = 'total' AND side = 'over') AS opening_total
-        FROM external.sportsbook_odds_snapshots
-        WHERE is_opening_line = TRUE
-            AND espn_game_id IS NOT NULL
-        GROUP BY espn_game_id
-    ),
     espn_with_features AS (
         SELECT DISTINCT ON (e.season_label, e.game_id, e.sequence_number)
             e.season_start,
@@ -133,11 +118,13 @@ def load_test_data(conn, test_season_start: int, artifact: WinProbArtifact) -> p
             oo.opening_moneyline_home,
             oo.opening_moneyline_away,
             oo.opening_spread,
-            oo.opening_total
+            oo.opening_total,
+            oo.opening_prob_home_fair,
+            oo.opening_overround
         FROM espn_with_lag e
         LEFT JOIN espn.scoreboard_games sg 
             ON e.game_id = sg.event_id
-        LEFT JOIN opening_odds oo
+        LEFT JOIN derived.opening_odds_features_v1 oo
             ON e.game_id = oo.espn_game_id
         WHERE sg.home_score IS NOT NULL 
           AND sg.away_score IS NOT NULL
@@ -159,38 +146,22 @@ def load_test_data(conn, test_season_start: int, artifact: WinProbArtifact) -> p
         e.opening_moneyline_home,
         e.opening_moneyline_away,
         e.opening_spread,
-        e.opening_total
+        e.opening_total,
+        e.opening_prob_home_fair,
+        e.opening_overround
     FROM espn_with_features e
     WHERE e.final_winning_team IS NOT NULL
     ORDER BY e.season_label, e.game_id, e.sequence_number
     """.format(test_season_start=test_season_start)
     
-    df = pd.read_sql(query, conn)
-    
-    # Compute opening odds engineered features if needed
-    if any(col in df.columns for col in ["opening_moneyline_home", "opening_moneyline_away"]):
-        from scripts.lib._winprob_lib import compute_opening_odds_features
-        
-        if len(df) > 0:
-            odds_features = compute_opening_odds_features(
-                opening_moneyline_home=df['opening_moneyline_home'].to_numpy() if 'opening_moneyline_home' in df.columns else None,
-                opening_moneyline_away=df['opening_moneyline_away'].to_numpy() if 'opening_moneyline_away' in df.columns else None,
-                opening_spread=df['opening_spread'].to_numpy() if 'opening_spread' in df.columns else None,
-                opening_total=df['opening_total'].to_numpy() if 'opening_total' in df.columns else None,
-            )
-            
-            df['opening_prob_home_fair'] = odds_features['opening_prob_home_fair']
-            df['opening_overround'] = odds_features['opening_overround']
+    ensure_opening_odds_features(conn)
+    df = load_query_cached(conn, query, name="evaluate_winprob_time_buckets", cache_dir=cache_dir)
     
     return df
 
 
-def evaluate_model(
-    artifact: WinProbArtifact,
-    df: pd.DataFrame,
-    model_name: str
-) -> dict[str, float]:
-    """Evaluate model on test set and return metrics."""
+def predict_model(artifact: WinProbArtifact, df: pd.DataFrame) -> np.ndarray:
+    """Home-win probabilities for every row of the test set."""
     # Build design matrix
     build_kwargs = {
         "point_differential": df["point_differential"].astype(float).to_numpy(),
@@ -237,37 +208,59 @@ def evaluate_model(
         )
     else:
         y_pred = predict_proba(artifact, X=X)
+    return y_pred
+
+
+def evaluate_models(
+    predictions: dict[str, np.ndarray],
+    df: pd.DataFrame,
+    *,
+    bins: int = 20,
+) -> tuple[dict[str, dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Metrics for several models over the same test rows in one grouped pass.
+
+    Returns (per-model summary in the evaluate_model format, long-format grouped rows from
+    _metrics_lib.grouped_metrics over time bucket, period, season and has-odds).
+    """
     y_true = (df["final_winning_team"].astype(int) == 0).astype(int).to_numpy()
-    
-    # Assign time buckets
-    df["time_bucket"] = df["time_remaining_regulation"].apply(assign_time_bucket)
-    
-    # Compute overall metrics
-    brier_overall = float(brier_score_loss(y_true, y_pred))
-    logloss_overall = float(log_loss(y_true, y_pred))
-    
-    # Compute per-bucket metrics
-    bucket_metrics = {}
-    for bucket in ["2880-2400", "2400-1800", "1800-1200", "1200-600", "600-120", "120-0"]:
-        bucket_mask = df["time_bucket"] == bucket
-        if np.sum(bucket_mask) > 0:
-            y_bucket_true = y_true[bucket_mask]
-            y_bucket_pred = y_pred[bucket_mask]
-            bucket_metrics[f"brier_{bucket}"] = float(brier_score_loss(y_bucket_true, y_bucket_pred))
-            bucket_metrics[f"logloss_{bucket}"] = float(log_loss(y_bucket_true, y_bucket_pred))
-            bucket_metrics[f"count_{bucket}"] = int(np.sum(bucket_mask))
-        else:
-            bucket_metrics[f"brier_{bucket}"] = None
-            bucket_metrics[f"logloss_{bucket}"] = None
-            bucket_metrics[f"count_{bucket}"] = 0
-    
-    return {
-        "model_name": model_name,
-        "brier_overall": brier_overall,
-        "logloss_overall": logloss_overall,
-        "total_snapshots": len(df),
-        **bucket_metrics,
-    }
+    keys: dict[str, Any] = {"time_bucket": time_bucket_labels(df["time_remaining_regulation"].to_numpy(dtype=np.float64))}
+    if "period" in df.columns:
+        keys["period"] = df["period"].fillna(0).astype(int).to_numpy()
+    if "season_start" in df.columns:
+        keys["season_start"] = df["season_start"].astype(int).to_numpy()
+    if "opening_prob_home_fair" in df.columns:
+        keys["has_odds"] = df["opening_prob_home_fair"].notna().to_numpy()
+    groups = grouped_metrics(predictions, y_true, keys=keys, bins=bins)
+
+    summaries: dict[str, dict[str, Any]] = {}
+    for model_name in predictions:
+        rows = {(r["group_by"], r["group"]): r for r in groups if r["model"] == model_name}
+        bucket_metrics: dict[str, Any] = {}
+        for bucket, _ in TIME_BUCKETS:
+            r = rows.get(("time_bucket", bucket))
+            bucket_metrics[f"brier_{bucket}"] = None if r is None else r["brier"]
+            bucket_metrics[f"logloss_{bucket}"] = None if r is None else r["logloss"]
+            bucket_metrics[f"count_{bucket}"] = 0 if r is None else r["n"]
+        overall = rows[("overall", "all")]
+        summaries[model_name] = {
+            "model_name": model_name,
+            "brier_overall": overall["brier"],
+            "logloss_overall": overall["logloss"],
+            "total_snapshots": len(df),
+            **bucket_metrics,
+        }
+    return summaries, groups
+
+
+def evaluate_model(
+    artifact: WinProbArtifact,
+    df: pd.DataFrame,
+    model_name: str
+) -> dict[str, float]:
+    """Evaluate model on test set and return metrics."""
+    summaries, _ = evaluate_models({model_name: predict_model(artifact, df)}, df)
+    return summaries[model_name]
 
 
 def main():
@@ -277,6 +270,8 @@ def main():
     parser.add_argument("--dsn", type=str, default=None, help="Database connection string (default: use DATABASE_URL env var)")
     parser.add_argument("--test-season-start", type=int, required=True, help="Test season_start to evaluate on")
     parser.add_argument("--out-results", type=str, default=None, help="Path to save results JSON file (optional)")
+    parser.add_argument("--feature-cache-dir", type=str, default=str(DEFAULT_CACHE_DIR), help=f"Versioned feature cache directory (default: {DEFAULT_CACHE_DIR}).")
+    parser.add_argument("--no-feature-cache", action="store_true", help="Always re-extract test data from the database.")
     args = parser.parse_args()
     
     # Load artifacts
@@ -293,15 +288,22 @@ def main():
     with connect(dsn) as conn:
         # Load test data (use odds artifact to determine if opening odds needed)
         print(f"Loading test data for season {args.test_season_start}...", file=sys.stderr)
-        df_test = load_test_data(conn, args.test_season_start, odds_artifact)
+        df_test = load_test_data(
+            conn,
+            args.test_season_start,
+            odds_artifact,
+            cache_dir=None if args.no_feature_cache else args.feature_cache_dir,
+        )
         print(f"Loaded {len(df_test)} test snapshots", file=sys.stderr)
     
     # Evaluate both models
-    print("\nEvaluating baseline model...", file=sys.stderr)
-    baseline_metrics = evaluate_model(baseline_artifact, df_test, "baseline")
-    
-    print("Evaluating odds-enabled model...", file=sys.stderr)
-    odds_metrics = evaluate_model(odds_artifact, df_test, "odds_enabled")
+    print("\nScoring baseline model...", file=sys.stderr)
+    predictions = {"baseline": predict_model(baseline_artifact, df_test)}
+    print("Scoring odds-enabled model...", file=sys.stderr)
+    predictions["odds_enabled"] = predict_model(odds_artifact, df_test)
+    summaries, groups = evaluate_models(predictions, df_test)
+    baseline_metrics = summaries["baseline"]
+    odds_metrics = summaries["odds_enabled"]
     
     # Compute improvements
     brier_improvement = ((baseline_metrics["brier_overall"] - odds_metrics["brier_overall"]) / baseline_metrics["brier_overall"]) * 100
@@ -319,7 +321,7 @@ def main():
     print(f"\nTime-Bucketed Metrics:", file=sys.stderr)
     print(f"{'Bucket':<15} {'Baseline Brier':<15} {'Odds Brier':<15} {'Brier Δ%':<12} {'Count':<10}", file=sys.stderr)
     print("-" * 80, file=sys.stderr)
-    for bucket in ["2880-2400", "2400-1800", "1800-1200", "1200-600", "600-120", "120-0"]:
+    for bucket, _ in TIME_BUCKETS:
         baseline_brier = baseline_metrics.get(f"brier_{bucket}")
         odds_brier = odds_metrics.get(f"brier_{bucket}")
         count = baseline_metrics.get(f"count_{bucket}", 0)
@@ -342,6 +344,7 @@ def main():
                 "brier_overall_pct": float(brier_improvement),
                 "logloss_overall_pct": float(logloss_improvement),
             },
+            "groups": groups,
         }
         
         results_path = Path(args.out_results)
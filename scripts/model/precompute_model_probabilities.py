@@ -4,6 +4,8 @@ Pre-compute model probabilities for all snapshots in derived.snapshot_features_v
 
 This script scores all snapshots with all 4 win probability models and stores
 the results in derived.model_probabilities_v1 for fast grid search queries.
+Each artifact is compiled once (scripts/lib/_inference_lib.py CompiledModel) and
+scores every snapshot in a single batch call.
 
 Design Pattern: Batch Processing Pattern
 Algorithm: Vectorized Model Scoring
@@ -14,7 +16,6 @@ import argparse
 import logging
 import os
 import sys
-from pathlib import Path
 from typing import Any
 
 import numpy as np
@@ -24,13 +25,10 @@ import psycopg
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from scripts.lib._db_lib import get_dsn, connect
-from scripts.lib._winprob_lib import (
-    WinProbArtifact,
-    load_artifact,
-    build_design_matrix,
-    predict_proba,
-    compute_opening_odds_features,
-)
+from scripts.lib._inference_lib import CompiledModel
+from scripts.lib._model_registry_lib import get_registry
+from scripts.lib._odds_features_lib import OpeningOddsStore, broadcast_opening_odds, load_opening_odds_features
+from scripts.lib._winprob_lib import compute_opening_odds_features
 
 logging.basicConfig(
     level=logging.INFO,
@@ -249,289 +247,163 @@ def create_table(conn: psycopg.Connection) -> None:
     logger.info("✅ Table created")
 
 
-def load_all_models() -> dict[str, WinProbArtifact]:
-    """Load all model artifacts (4 original + 8 new models: baseline/odds × platt/isotonic × with/without interactions)."""
+# Models scored into derived.model_probabilities_v1 (names from the model registry's MODEL_FILES)
+PRECOMPUTE_MODELS = (
+    # v2 models (with updated feature set and uses_opening_odds_baseline flag)
+    "catboost_baseline_platt_v2",
+    "catboost_baseline_isotonic_v2",
+    "catboost_odds_platt_v2",
+    "catboost_odds_isotonic_v2",
+    "catboost_baseline_no_interaction_platt_v2",
+    "catboost_baseline_no_interaction_isotonic_v2",
+    "catboost_odds_no_interaction_platt_v2",
+    "catboost_odds_no_interaction_isotonic_v2",
+    # v1 models (commented out by default, uncomment as needed)
+    # "catboost_baseline_platt",
+    # "catboost_baseline_isotonic",
+    # "catboost_odds_platt",
+    # "catboost_odds_isotonic",
+    # "catboost_baseline_no_interaction_platt",
+    # "catboost_baseline_no_interaction_isotonic",
+    # "catboost_odds_no_interaction_platt",
+    # "catboost_odds_no_interaction_isotonic",
+)
+
+
+def load_all_models(names: tuple[str, ...] = PRECOMPUTE_MODELS) -> dict[str, CompiledModel]:
+    """Load and compile the precompute models through the shared model registry (missing files are skipped)."""
     logger.info("Loading model artifacts...")
-    
-    model_paths = {
-        # v2 models (with updated feature set and uses_opening_odds_baseline flag)
-        "catboost_baseline_platt_v2": Path("artifacts/winprob_catboost_baseline_platt_v2.json"),
-        "catboost_baseline_isotonic_v2": Path("artifacts/winprob_catboost_baseline_isotonic_v2.json"),
-        "catboost_odds_platt_v2": Path("artifacts/winprob_catboost_odds_platt_v2.json"),
-        "catboost_odds_isotonic_v2": Path("artifacts/winprob_catboost_odds_isotonic_v2.json"),
-        "catboost_baseline_no_interaction_platt_v2": Path("artifacts/winprob_catboost_baseline_no_interaction_platt_v2.json"),
-        "catboost_baseline_no_interaction_isotonic_v2": Path("artifacts/winprob_catboost_baseline_no_interaction_isotonic_v2.json"),
-        "catboost_odds_no_interaction_platt_v2": Path("artifacts/winprob_catboost_odds_no_interaction_platt_v2.json"),
-        "catboost_odds_no_interaction_isotonic_v2": Path("artifacts/winprob_catboost_odds_no_interaction_isotonic_v2.json"),
-        
-        # v1 models (commented out by default, uncomment as needed)
-        # "logreg_platt": Path("data/models/winprob_logreg_platt_2017-2023.json"),
-        # "logreg_isotonic": Path("data/models/winprob_logreg_isotonic_2017-2023.json"),
-        # "catboost_platt": Path("data/models/winprob_catboost_platt_2017-2023.json"),
-        # "catboost_isotonic": Path("data/models/winprob_catboost_isotonic_2017-2023.json"),
-        # "catboost_baseline_platt": Path("artifacts/winprob_catboost_baseline_platt.json"),
-        # "catboost_baseline_isotonic": Path("artifacts/winprob_catboost_baseline_isotonic.json"),
-        # "catboost_odds_platt": Path("artifacts/winprob_catboost_odds_platt.json"),
-        # "catboost_odds_isotonic": Path("artifacts/winprob_catboost_odds_isotonic.json"),
-        # "catboost_baseline_no_interaction_platt": Path("artifacts/winprob_catboost_baseline_no_interaction_platt.json"),
-        # "catboost_baseline_no_interaction_isotonic": Path("artifacts/winprob_catboost_baseline_no_interaction_isotonic.json"),
-        # "catboost_odds_no_interaction_platt": Path("artifacts/winprob_catboost_odds_no_interaction_platt.json"),
-        # "catboost_odds_no_interaction_isotonic": Path("artifacts/winprob_catboost_odds_no_interaction_isotonic.json"),
-    }
-    
+    registry = get_registry()
+
     models = {}
-    for name, path in model_paths.items():
-        if not path.exists():
-            logger.warning(f"⚠️  Model file not found: {path}")
-            continue
+    for name in names:
         try:
-            models[name] = load_artifact(path)
-            logger.info(f"✅ Loaded {name}: {len(models[name].feature_names)} features")
+            path = registry.path(name)
+            if not path.exists():
+                logger.warning(f"⚠️  Model file not found: {path}")
+                continue
+            models[name] = registry.compiled(name)
+            logger.info(f"✅ Loaded {name}: {len(models[name].artifact.feature_names)} features")
         except Exception as e:
+            # Includes old artifacts whose features build_design_matrix no longer produces
             logger.error(f"❌ Failed to load {name}: {e}")
     
     if len(models) == 0:
         raise ValueError("No models loaded")
     
-    logger.info(f"✅ Loaded {len(models)}/{len(model_paths)} models")
+    logger.info(f"✅ Loaded {len(models)}/{len(names)} models")
     return models
 
 
-def score_snapshot(
-    snapshot: dict[str, Any],
-    models: dict[str, WinProbArtifact]
-) -> dict[str, float | None]:
-    """Score a single snapshot with all models."""
-    results = {
-        "logreg_platt_prob": None,
-        "logreg_isotonic_prob": None,
-        "catboost_platt_prob": None,
-        "catboost_isotonic_prob": None,
-        "catboost_baseline_platt_prob": None,
-        "catboost_baseline_isotonic_prob": None,
-        "catboost_odds_platt_prob": None,
-        "catboost_odds_isotonic_prob": None,
-        "catboost_baseline_no_interaction_platt_prob": None,
-        "catboost_baseline_no_interaction_isotonic_prob": None,
-        "catboost_odds_no_interaction_platt_prob": None,
-        "catboost_odds_no_interaction_isotonic_prob": None,
-        # v2 models
-        "catboost_baseline_platt_v2_prob": None,
-        "catboost_baseline_isotonic_v2_prob": None,
-        "catboost_odds_platt_v2_prob": None,
-        "catboost_odds_isotonic_v2_prob": None,
-        "catboost_baseline_no_interaction_platt_v2_prob": None,
-        "catboost_baseline_no_interaction_isotonic_v2_prob": None,
-        "catboost_odds_no_interaction_platt_v2_prob": None,
-        "catboost_odds_no_interaction_isotonic_v2_prob": None,
+# derived.model_probabilities_v1 probability columns, in INSERT order ("<model name>_prob")
+PROB_COLUMNS = (
+    "logreg_platt_prob",
+    "logreg_isotonic_prob",
+    "catboost_platt_prob",
+    "catboost_isotonic_prob",
+    "catboost_baseline_platt_prob",
+    "catboost_baseline_isotonic_prob",
+    "catboost_odds_platt_prob",
+    "catboost_odds_isotonic_prob",
+    "catboost_baseline_no_interaction_platt_prob",
+    "catboost_baseline_no_interaction_isotonic_prob",
+    "catboost_odds_no_interaction_platt_prob",
+    "catboost_odds_no_interaction_isotonic_prob",
+    # v2 models
+    "catboost_baseline_platt_v2_prob",
+    "catboost_baseline_isotonic_v2_prob",
+    "catboost_odds_platt_v2_prob",
+    "catboost_odds_isotonic_v2_prob",
+    "catboost_baseline_no_interaction_platt_v2_prob",
+    "catboost_baseline_no_interaction_isotonic_v2_prob",
+    "catboost_odds_no_interaction_platt_v2_prob",
+    "catboost_odds_no_interaction_isotonic_v2_prob",
+)
+
+
+def _float_column(values: list[Any], default: float | None = None) -> np.ndarray:
+    """Python values (None / Decimal / float) -> float64 array, with None replaced by `default` (else NaN)."""
+    arr = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+    if default is not None:
+        arr[np.isnan(arr) & np.array([v is None for v in values])] = default
+    return arr
+
+
+def snapshot_model_inputs(rows: list[tuple], opening_odds: OpeningOddsStore | None = None) -> dict[str, np.ndarray]:
+    """
+    Model input columns for snapshot_features_v1 rows (query column order of precompute_all).
+
+    Missing values get the defaults the models have always been scored with: score_diff 0, full game
+    remaining, ESPN prob 0.5, score_diff/sqrt(time+1) from its components, lag = current prob, delta 0,
+    period 1. Opening odds are broadcast per game_id from `opening_odds` (the per-game feature store); without
+    it they are engineered with compute_opening_odds_features from the raw opening columns 11-14 of each row.
+    """
+    cols = list(zip(*rows)) if rows else [[] for _ in range(15)]
+    score_diff = _float_column(cols[4], default=0.0)
+    time_remaining = _float_column(cols[5], default=2880.0)
+    espn_home_prob = _float_column(cols[6], default=0.5)
+    score_diff_div_sqrt = _float_column(cols[7])
+    missing_sdd = np.array([v is None for v in cols[7]], dtype=bool)
+    score_diff_div_sqrt[missing_sdd] = score_diff[missing_sdd] / np.sqrt(time_remaining[missing_sdd] + 1)
+    lag_1 = _float_column(cols[8])
+    missing_lag = np.array([v is None for v in cols[8]], dtype=bool)
+    lag_1[missing_lag] = espn_home_prob[missing_lag]
+
+    if opening_odds is not None:
+        odds = broadcast_opening_odds(cols[1], opening_odds)
+        opening_spread = odds["opening_spread"]
+        opening_total = odds["opening_total"]
+    else:
+        opening_spread = _float_column(cols[13]) if len(cols) > 13 else np.full(len(rows), np.nan)
+        opening_total = _float_column(cols[14]) if len(cols) > 14 else np.full(len(rows), np.nan)
+        odds = compute_opening_odds_features(
+            opening_moneyline_home=_float_column(cols[11]) if len(cols) > 11 else None,
+            opening_moneyline_away=_float_column(cols[12]) if len(cols) > 12 else None,
+            opening_spread=opening_spread,
+            opening_total=opening_total,
+        )
+    return {
+        "point_differential": score_diff,
+        "time_remaining_regulation": time_remaining,
+        "possession": np.full(len(rows), "unknown"),  # Default possession (not used by current models)
+        "score_diff_div_sqrt_time_remaining": score_diff_div_sqrt,
+        "espn_home_prob": espn_home_prob,
+        "espn_home_prob_lag_1": lag_1,
+        "espn_home_prob_delta_1": _float_column(cols[9], default=0.0),
+        "period": _float_column(cols[10], default=1.0),
+        "opening_overround": np.asarray(odds["opening_overround"], dtype=np.float64),
+        "opening_prob_home_fair": np.asarray(odds["opening_prob_home_fair"], dtype=np.float64),
+        # Old (pre-v2.2) odds artifacts also expect presence flags
+        "has_opening_spread": (~np.isnan(opening_spread)).astype(np.float64),
+        "has_opening_total": (~np.isnan(opening_total)).astype(np.float64),
     }
-    
-    # Extract features
-    score_diff = snapshot.get("score_diff")
-    time_remaining = snapshot.get("time_remaining")
-    espn_home_prob = snapshot.get("espn_home_prob")
-    score_diff_div_sqrt = snapshot.get("score_diff_div_sqrt_time_remaining")
-    espn_home_prob_lag_1 = snapshot.get("espn_home_prob_lag_1")
-    espn_home_prob_delta_1 = snapshot.get("espn_home_prob_delta_1")
-    period = snapshot.get("period")
-    
-    # Extract opening odds (raw, will be engineered)
-    opening_moneyline_home = snapshot.get("opening_moneyline_home")
-    opening_moneyline_away = snapshot.get("opening_moneyline_away")
-    opening_spread = snapshot.get("opening_spread")
-    opening_total = snapshot.get("opening_total")
-    
-    # Handle missing features with defaults
-    if score_diff is None:
-        score_diff = 0.0
-    if time_remaining is None:
-        time_remaining = 2880.0  # Default to full game
-    if espn_home_prob is None:
-        espn_home_prob = 0.5  # Default to 50%
-    # CRITICAL FIX: Calculate score_diff_div_sqrt from components if NULL (matches training formula)
-    # This ensures consistency with on-the-fly computation and training data
-    if score_diff_div_sqrt is None:
-        if score_diff is not None and time_remaining is not None:
-            import math
-            score_diff_div_sqrt = float(score_diff) / math.sqrt(float(time_remaining) + 1)
-        else:
-            score_diff_div_sqrt = 0.0  # Fallback if components missing
-    if espn_home_prob_lag_1 is None:
-        espn_home_prob_lag_1 = espn_home_prob  # Use current if lag missing
-    if espn_home_prob_delta_1 is None:
-        espn_home_prob_delta_1 = 0.0
-    if period is None:
-        period = 1
-    
-    # Compute opening odds engineered features using shared helper (prevents code drift)
-    # Convert scalar inputs to arrays to ensure consistent return type
-    odds_features = compute_opening_odds_features(
-        opening_moneyline_home=np.array([opening_moneyline_home]) if opening_moneyline_home is not None else None,
-        opening_moneyline_away=np.array([opening_moneyline_away]) if opening_moneyline_away is not None else None,
-        opening_spread=np.array([opening_spread]) if opening_spread is not None else None,
-        opening_total=np.array([opening_total]) if opening_total is not None else None,
-    )
-    
-    # Score each model
-    for model_name, artifact in models.items():
+
+
+def score_snapshots(inputs: dict[str, np.ndarray], models: dict[str, CompiledModel]) -> dict[str, np.ndarray | None]:
+    """Score all snapshots with each model in one batch; {prob column: probabilities, or None if the model failed}."""
+    results: dict[str, np.ndarray | None] = {col: None for col in PROB_COLUMNS}
+    for model_name, model in models.items():
+        column = f"{model_name}_prob"
+        if column not in results:
+            logger.warning(f"Skipping {model_name}: no {column} column in derived.model_probabilities_v1")
+            continue
         try:
-            # Build design matrix - all parameters must be numpy arrays (or None)
-            # Opening odds features may be NaNs (CatBoost handles natively)
-            build_kwargs = {
-                "point_differential": np.array([float(score_diff)]),
-                "time_remaining_regulation": np.array([float(time_remaining)]),
-                "possession": ["unknown"],  # Default possession (not used by current models)
-                "preprocess": artifact.preprocess,
-            }
-            
-            # Add interaction terms if present in artifact (check feature_names)
-            # Models trained with --no-interaction-terms won't have these features
-            use_interaction_terms = any("scaled" in fn and ("score_diff_div_sqrt" in fn or "espn_home_prob" in fn or "period" in fn) for fn in artifact.feature_names)
-            if use_interaction_terms:
-                if any("score_diff_div_sqrt" in fn for fn in artifact.feature_names):
-                    build_kwargs["score_diff_div_sqrt_time_remaining"] = np.array([score_diff_div_sqrt])
-                # FIX: Use exact match for espn_home_prob_scaled (matches on-the-fly logic)
-                if any(fn == "espn_home_prob_scaled" for fn in artifact.feature_names):
-                    build_kwargs["espn_home_prob"] = np.array([espn_home_prob])
-                if any("espn_home_prob_lag_1" in fn for fn in artifact.feature_names):
-                    build_kwargs["espn_home_prob_lag_1"] = np.array([espn_home_prob_lag_1])
-                if any("espn_home_prob_delta_1" in fn for fn in artifact.feature_names):
-                    build_kwargs["espn_home_prob_delta_1"] = np.array([espn_home_prob_delta_1])
-                # FIX: Use "period" substring match (matches on-the-fly logic, more general)
-                # Note: Feature names are period_1, period_2, period_3, period_4, so "period" in fn works
-                if any("period" in fn for fn in artifact.feature_names):
-                    build_kwargs["period"] = np.array([period])
-            
-            # Add opening odds features if model expects them (check if any odds feature in artifact)
-            # NOTE: opening_prob_home_fair is used as baseline (NOT a feature), opening_spread/total removed (redundant)
-            # Only check for features that actually exist: opening_overround, has_opening_*
-            # Skip old artifacts that have removed features (opening_prob_home_fair as feature, or old interaction terms)
-            has_old_features = (
-                "opening_prob_home_fair" in artifact.feature_names or
-                any("opening_prob_home_fair_div_time_remaining_scaled" in fn for fn in artifact.feature_names) or
-                any("opening_spread_div_time_remaining_scaled" in fn for fn in artifact.feature_names) or
-                any("opening_total_div_time_remaining_scaled" in fn for fn in artifact.feature_names)
-            )
-            
-            if has_old_features:
-                # Old artifact with removed features - skip (incompatible with current build_design_matrix)
-                logger.warning(f"Skipping {model_name}: artifact has removed features (opening_prob_home_fair as feature or old interaction terms)")
-                continue
-            
-            if "opening_overround" in artifact.feature_names:
-                # Use engineered features from helper (handles NaNs correctly)
-                # NOTE: opening_prob_home_fair NOT passed to build_design_matrix (used as baseline only)
-                # NOTE: opening_spread and opening_total removed (redundant features)
-                # NOTE: has_opening_moneyline removed (perfectly redundant with opening_overround)
-                # NOTE: has_opening_spread and has_opening_total removed - use only opening_overround
-                # odds_features already returns arrays (not scalars) since we passed arrays to compute_opening_odds_features
-                build_kwargs["opening_overround"] = np.asarray(odds_features["opening_overround"]).flatten()
-                
-                # Backward compatibility: Check if old model artifact expects binary flags
-                # Old models (trained before v2.2) may have has_opening_spread and has_opening_total in feature_names
-                if "has_opening_spread" in artifact.feature_names:
-                    # Old model expects has_opening_spread - compute it for backward compatibility
-                    if opening_spread is not None:
-                        has_opening_spread_val = 1.0 if not np.isnan(float(opening_spread)) else 0.0
-                    else:
-                        has_opening_spread_val = 0.0
-                    build_kwargs["has_opening_spread"] = np.array([has_opening_spread_val], dtype=np.float64)
-                
-                if "has_opening_total" in artifact.feature_names:
-                    # Old model expects has_opening_total - compute it for backward compatibility
-                    if opening_total is not None:
-                        has_opening_total_val = 1.0 if not np.isnan(float(opening_total)) else 0.0
-                    else:
-                        has_opening_total_val = 0.0
-                    build_kwargs["has_opening_total"] = np.array([has_opening_total_val], dtype=np.float64)
-                
-                # CatBoost can use NaN as signal, so pass odds_nan_policy="keep"
-                build_kwargs["odds_nan_policy"] = "keep"
-            
-            X = build_design_matrix(**build_kwargs)
-            
-            # Predict probability - pass baseline data if model uses it
-            # Use explicit flag if available, fall back to heuristic for old artifacts
-            uses_baseline = getattr(artifact, 'uses_opening_odds_baseline', None)
-            if uses_baseline is None:
-                # Fallback heuristic for older artifacts
-                has_opening_odds_features = any("opening" in fn.lower() or "overround" in fn.lower() for fn in artifact.feature_names)
-                opening_prob_not_a_feature = "opening_prob_home_fair" not in artifact.feature_names
-                uses_baseline = has_opening_odds_features and opening_prob_not_a_feature
-            
-            if uses_baseline:
-                # Model uses baseline - pass opening_prob_home_fair (has_opening_moneyline inferred from NaN pattern)
-                # odds_features already returns arrays (not scalars) since we passed arrays to compute_opening_odds_features
-                prob_array = predict_proba(
-                    artifact, 
-                    X=X,
-                    opening_prob_home_fair=np.asarray(odds_features["opening_prob_home_fair"]).flatten(),
-                )
-            else:
-                # Model doesn't use baseline
-                prob_array = predict_proba(artifact, X=X)
-            prob = float(prob_array[0])
-            
-            # Validate range
-            if prob < 0.0 or prob > 1.0:
-                logger.warning(f"Model {model_name} returned out-of-range prob: {prob}")
-                prob = max(0.0, min(1.0, prob))
-            
-            # Map model name to column name
-            if model_name == "logreg_platt":
-                results["logreg_platt_prob"] = prob
-            elif model_name == "logreg_isotonic":
-                results["logreg_isotonic_prob"] = prob
-            elif model_name == "catboost_platt":
-                results["catboost_platt_prob"] = prob
-            elif model_name == "catboost_isotonic":
-                results["catboost_isotonic_prob"] = prob
-            elif model_name == "catboost_baseline_platt":
-                results["catboost_baseline_platt_prob"] = prob
-            elif model_name == "catboost_baseline_isotonic":
-                results["catboost_baseline_isotonic_prob"] = prob
-            elif model_name == "catboost_odds_platt":
-                results["catboost_odds_platt_prob"] = prob
-            elif model_name == "catboost_odds_isotonic":
-                results["catboost_odds_isotonic_prob"] = prob
-            elif model_name == "catboost_baseline_no_interaction_platt":
-                results["catboost_baseline_no_interaction_platt_prob"] = prob
-            elif model_name == "catboost_baseline_no_interaction_isotonic":
-                results["catboost_baseline_no_interaction_isotonic_prob"] = prob
-            elif model_name == "catboost_odds_no_interaction_platt":
-                results["catboost_odds_no_interaction_platt_prob"] = prob
-            elif model_name == "catboost_odds_no_interaction_isotonic":
-                results["catboost_odds_no_interaction_isotonic_prob"] = prob
-            # v2 models
-            elif model_name == "catboost_baseline_platt_v2":
-                results["catboost_baseline_platt_v2_prob"] = prob
-            elif model_name == "catboost_baseline_isotonic_v2":
-                results["catboost_baseline_isotonic_v2_prob"] = prob
-            elif model_name == "catboost_odds_platt_v2":
-                results["catboost_odds_platt_v2_prob"] = prob
-            elif model_name == "catboost_odds_isotonic_v2":
-                results["catboost_odds_isotonic_v2_prob"] = prob
-            elif model_name == "catboost_baseline_no_interaction_platt_v2":
-                results["catboost_baseline_no_interaction_platt_v2_prob"] = prob
-            elif model_name == "catboost_baseline_no_interaction_isotonic_v2":
-                results["catboost_baseline_no_interaction_isotonic_v2_prob"] = prob
-            elif model_name == "catboost_odds_no_interaction_platt_v2":
-                results["catboost_odds_no_interaction_platt_v2_prob"] = prob
-            elif model_name == "catboost_odds_no_interaction_isotonic_v2":
-                results["catboost_odds_no_interaction_isotonic_v2_prob"] = prob
-            
+            probs = model.score(inputs)
         except Exception as e:
-            logger.warning(f"Failed to score {model_name} for snapshot: {e}")
+            logger.warning(f"Failed to score {model_name}: {e}")
             continue
-    
+        out_of_range = (probs < 0.0) | (probs > 1.0)
+        if np.any(out_of_range):
+            logger.warning(f"Model {model_name} returned {int(out_of_range.sum())} out-of-range probs; clipping")
+        results[column] = np.clip(probs, 0.0, 1.0)
     return results
 
 
-def precompute_all(conn: psycopg.Connection, models: dict[str, WinProbArtifact], batch_size: int = 1000) -> None:
+def precompute_all(conn: psycopg.Connection, models: dict[str, CompiledModel], batch_size: int = 1000) -> None:
     """Pre-compute probabilities for all snapshots."""
     logger.info("Querying all snapshots from derived.snapshot_features_v1...")
     
-    # Query all snapshots with required features (including opening odds)
+    # Query all snapshots with required features (opening odds are joined per game from the feature store)
     query_sql = """
     SELECT 
         season_label,
@@ -544,12 +416,7 @@ def precompute_all(conn: psycopg.Connection, models: dict[str, WinProbArtifact],
         score_diff_div_sqrt_time_remaining,
         espn_home_prob_lag_1,
         espn_home_prob_delta_1,
-        period,
-        -- Opening odds columns (raw, will be engineered in score_snapshot)
-        opening_moneyline_home,
-        opening_moneyline_away,
-        opening_spread,
-        opening_total
+        period
     FROM derived.snapshot_features_v1
     ORDER BY season_label, game_id, sequence_number, snapshot_ts
     """
@@ -571,7 +438,6 @@ def precompute_all(conn: psycopg.Connection, models: dict[str, WinProbArtifact],
     total = len(all_rows)
     processed = 0
     inserted = 0
-    errors = 0
     
     insert_sql = """
     INSERT INTO derived.model_probabilities_v1 (
@@ -610,84 +476,28 @@ def precompute_all(conn: psycopg.Connection, models: dict[str, WinProbArtifact],
         catboost_odds_no_interaction_isotonic_v2_prob = EXCLUDED.catboost_odds_no_interaction_isotonic_v2_prob
     """
     
-    batch = []
-    for row in all_rows:
-        snapshot = {
-            "season_label": row[0],
-            "game_id": row[1],
-            "sequence_number": row[2],
-            "snapshot_ts": row[3],
-            "score_diff": row[4],
-            "time_remaining": row[5],
-            "espn_home_prob": row[6],
-            "score_diff_div_sqrt_time_remaining": row[7],
-            "espn_home_prob_lag_1": row[8],
-            "espn_home_prob_delta_1": row[9],
-            "period": row[10],
-            # Opening odds columns (raw, will be engineered in score_snapshot)
-            "opening_moneyline_home": row[11] if len(row) > 11 else None,
-            "opening_moneyline_away": row[12] if len(row) > 12 else None,
-            "opening_spread": row[13] if len(row) > 13 else None,
-            "opening_total": row[14] if len(row) > 14 else None,
-        }
-        
-        try:
-            # Score snapshot with all models
-            probs = score_snapshot(snapshot, models)
-            
-            # Add to batch (use None for missing models)
-            batch.append((
-                snapshot["season_label"],
-                snapshot["game_id"],
-                snapshot["sequence_number"],
-                snapshot["snapshot_ts"],
-                probs.get("logreg_platt_prob"),
-                probs.get("logreg_isotonic_prob"),
-                probs.get("catboost_platt_prob"),
-                probs.get("catboost_isotonic_prob"),
-                probs.get("catboost_baseline_platt_prob"),
-                probs.get("catboost_baseline_isotonic_prob"),
-                probs.get("catboost_odds_platt_prob"),
-                probs.get("catboost_odds_isotonic_prob"),
-                probs.get("catboost_baseline_no_interaction_platt_prob"),
-                probs.get("catboost_baseline_no_interaction_isotonic_prob"),
-                probs.get("catboost_odds_no_interaction_platt_prob"),
-                probs.get("catboost_odds_no_interaction_isotonic_prob"),
-                # v2 models
-                probs.get("catboost_baseline_platt_v2_prob"),
-                probs.get("catboost_baseline_isotonic_v2_prob"),
-                probs.get("catboost_odds_platt_v2_prob"),
-                probs.get("catboost_odds_isotonic_v2_prob"),
-                probs.get("catboost_baseline_no_interaction_platt_v2_prob"),
-                probs.get("catboost_baseline_no_interaction_isotonic_v2_prob"),
-                probs.get("catboost_odds_no_interaction_platt_v2_prob"),
-                probs.get("catboost_odds_no_interaction_isotonic_v2_prob"),
-            ))
-            
-            processed += 1
-            
-            # Insert batch when full
-            if len(batch) >= batch_size:
-                with conn.cursor() as cur:
-                    cur.executemany(insert_sql, batch)
-                conn.commit()
-                inserted += len(batch)
-                logger.info(f"Processed {processed}/{total} snapshots ({inserted} inserted)")
-                batch = []
-        
-        except Exception as e:
-            errors += 1
-            logger.warning(f"Error processing snapshot {snapshot['game_id']}:{snapshot['sequence_number']}: {e}")
-            continue
-    
-    # Insert remaining batch
-    if batch:
+    opening_odds = load_opening_odds_features(conn)
+    logger.info(f"Loaded opening-odds features for {len(opening_odds)} games")
+
+    logger.info(f"Scoring {total} snapshots with {len(models)} models...")
+    probs = score_snapshots(snapshot_model_inputs(all_rows, opening_odds), models)
+    errors = sum(1 for name in models if probs.get(f"{name}_prob") is None)
+    prob_lists = [probs[col].tolist() if probs[col] is not None else [None] * total for col in PROB_COLUMNS]
+
+    for start in range(0, total, batch_size):
+        end = min(start + batch_size, total)
+        batch = [
+            (*all_rows[i][:4], *(column[i] for column in prob_lists))
+            for i in range(start, end)
+        ]
         with conn.cursor() as cur:
             cur.executemany(insert_sql, batch)
         conn.commit()
+        processed = end
         inserted += len(batch)
+        logger.info(f"Processed {processed}/{total} snapshots ({inserted} inserted)")
     
-    logger.info(f"✅ Completed: {processed}/{total} processed, {inserted} inserted, {errors} errors")
+    logger.info(f"✅ Completed: {processed}/{total} processed, {inserted} inserted, {errors} models failed")
 
 
 def main():
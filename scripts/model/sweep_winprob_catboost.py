@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Train the CatBoost win-probability variant matrix (feature sets x hyperparameters x calibration methods) in one run.
+
+train_winprob_catboost.py trains one configuration per invocation, so refreshing every artifact used to mean
+re-running it (and reloading the training frame) once per variant. This driver instead:
+
+- loads the training frame once (versioned feature cache or --cache-parquet, same query as the single-run script);
+- builds each feature set's design matrix and opening-odds baseline once and writes the train/calib/test slices
+  as .npy files in a work directory;
+- trains the (feature set, iterations, learning rate) combinations in a process pool. Each process gets
+  cores // workers CatBoost threads, memory-maps the shared slices and caches the resulting Pools, so a process
+  that draws several combinations for the same feature set builds its Pools once;
+- fits Platt *and* isotonic calibrators from each base model (calibration never needs a retrain);
+- writes every artifact (+ its sibling .cbm) using the existing naming scheme, plus a comparison table
+  (sweep_summary.json / sweep_summary.csv) with calibration- and test-season metrics.
+
+Artifact names: winprob_catboost_{feature_set}_{method}[_it{N}_lr{R}][_{version}].json, where the hyperparameter tag
+is only added when more than one combination is swept and the version suffix is omitted for v1
+(e.g. winprob_catboost_odds_no_interaction_isotonic_v2.json).
+
+Usage:
+  python scripts/model/sweep_winprob_catboost.py --out-dir artifacts --version v2 --dsn "$DATABASE_URL"
+  python scripts/model/sweep_winprob_catboost.py --feature-sets odds odds_no_interaction \\
+    --iterations 500 1000 --learning-rate 0.05 0.1 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from scripts.lib._db_lib import connect, get_dsn
+from scripts.lib._feature_cache_lib import DEFAULT_CACHE_DIR
+from scripts.lib._winprob_lib import (
+    ModelParams,
+    PreprocessParams,
+    WinProbArtifact,
+    brier,
+    ece_binned,
+    fit_isotonic_calibrator_on_probs,
+    fit_platt_calibrator_on_raw_margins,
+    logit,
+    logloss,
+    roc_auc,
+    save_artifact,
+    utc_now_iso_compact,
+)
+from scripts.model.train_winprob_catboost import (
+    _build_features,
+    _calculate_buckets,
+    _compute_preprocess,
+    _load_training_data,
+    _new_catboost_model,
+    _odds_baseline,
+)
+
+
+@dataclass(frozen=True)
+class FeatureSet:
+    name: str
+    use_interaction_terms: bool
+    use_opening_odds: bool
+
+
+FEATURE_SETS: dict[str, FeatureSet] = {
+    fs.name: fs
+    for fs in (
+        FeatureSet("baseline", use_interaction_terms=True, use_opening_odds=False),
+        FeatureSet("odds", use_interaction_terms=True, use_opening_odds=True),
+        FeatureSet("baseline_no_interaction", use_interaction_terms=False, use_opening_odds=False),
+        FeatureSet("odds_no_interaction", use_interaction_terms=False, use_opening_odds=True),
+    )
+}
+
+CALIBRATION_METHODS = ("platt", "isotonic")
+
+SUMMARY_COLUMNS = (
+    "artifact",
+    "status",
+    "feature_set",
+    "calibration",
+    "iterations",
+    "learning_rate",
+    "n_features",
+    "train_seconds",
+    "calib_brier",
+    "calib_logloss",
+    "calib_ece",
+    "test_brier_base",
+    "test_logloss_base",
+    "test_brier",
+    "test_logloss",
+    "test_ece",
+    "test_auc",
+    "error",
+)
+
+_SPLITS = ("train", "calib", "test")
+
+
+@dataclass(frozen=True)
+class _SweepJob:
+    """Everything one worker process needs to train a (feature set, hyperparameters) combination."""
+
+    feature_set: str
+    data_dir: str
+    iterations: int
+    learning_rate: float
+    tag: str
+    thread_count: int
+    methods: tuple[str, ...]
+    out_dir: str
+    version: str
+    train_season_start_max: int
+    calib_season_start: int
+    test_season_start: int
+    buckets_seconds_remaining: tuple[int, ...]
+    preprocess: PreprocessParams
+    feature_names: tuple[str, ...]
+    uses_opening_odds_baseline: bool
+
+
+def _log_stderr(msg: str) -> None:
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {msg}", file=sys.stderr, flush=True)
+
+
+def artifact_name(feature_set: str, method: str, *, tag: str = "", version: str = "v1") -> str:
+    suffix = "" if version == "v1" else f"_{version}"
+    return f"winprob_catboost_{feature_set}_{method}{tag}{suffix}.json"
+
+
+def _hyperparameter_tag(iterations: int, learning_rate: float, *, multiple: bool) -> str:
+    return f"_it{iterations}_lr{learning_rate:g}" if multiple else ""
+
+
+def _write_feature_set(
+    data_dir: Path,
+    X_all: np.ndarray,
+    y: np.ndarray,
+    baseline_all: np.ndarray,
+    masks: dict[str, np.ndarray],
+) -> None:
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for split in _SPLITS:
+        mask = masks[split]
+        np.save(data_dir / f"X_{split}.npy", np.ascontiguousarray(X_all[mask]))
+        np.save(data_dir / f"y_{split}.npy", y[mask])
+        np.save(data_dir / f"baseline_{split}.npy", baseline_all[mask])
+
+
+# Per-process cache: a worker that trains several hyperparameter combinations of one feature set builds its
+# Pools once. Keyed by feature-set data dir.
+_POOL_CACHE: dict[str, dict[str, Any]] = {}
+
+
+def _pools_for(data_dir: str) -> dict[str, Any]:
+    cached = _POOL_CACHE.get(data_dir)
+    if cached is None:
+        from catboost import Pool
+
+        cached = {}
+        for split in _SPLITS:
+            X = np.load(os.path.join(data_dir, f"X_{split}.npy"), mmap_mode="r")
+            y = np.load(os.path.join(data_dir, f"y_{split}.npy"))
+            baseline = np.load(os.path.join(data_dir, f"baseline_{split}.npy"))
+            cached[split] = Pool(np.asarray(X), y, baseline=baseline) if len(y) else None
+            cached[f"y_{split}"] = y
+        _POOL_CACHE[data_dir] = cached
+    return cached
+
+
+def _metrics(p: np.ndarray, y: np.ndarray) -> dict[str, float | None]:
+    return {"brier": brier(p, y), "logloss": logloss(p, y), "ece": ece_binned(p, y, bins=10), "auc": roc_auc(p, y)}
+
+
+def _train_variant(job: _SweepJob) -> list[dict[str, Any]]:
+    """Worker entry point: train one base model, fit every calibration method on it, save the artifacts."""
+    pools = _pools_for(job.data_dir)
+    model = _new_catboost_model(
+        iterations=job.iterations,
+        learning_rate=job.learning_rate,
+        thread_count=job.thread_count,
+        verbose=False,
+    )
+    t0 = time.time()
+    model.fit(pools["train"], eval_set=pools["calib"])
+    train_seconds = time.time() - t0
+
+    y_calib = pools["y_calib"]
+    p_calib = model.predict_proba(pools["calib"])[:, 1].astype(np.float64)
+    y_test = pools["y_test"]
+    p_test = model.predict_proba(pools["test"])[:, 1].astype(np.float64) if pools["test"] is not None else None
+    base_test = _metrics(p_test, y_test) if p_test is not None else {}
+
+    calibrators: dict[str, Any] = {}
+    if "platt" in job.methods:
+        # logit(p_base) = baseline + raw margin, which is what PlattCalibrator.apply() sees at prediction time.
+        calibrators["platt"] = fit_platt_calibrator_on_raw_margins(raw_margins=logit(p_calib), y=y_calib)
+    if "isotonic" in job.methods:
+        calibrators["isotonic"] = fit_isotonic_calibrator_on_probs(p_base=p_calib, y=y_calib)
+
+    out_dir = Path(job.out_dir)
+    rows: list[dict[str, Any]] = []
+    for method, calibrator in calibrators.items():
+        out_path = out_dir / artifact_name(job.feature_set, method, tag=job.tag, version=job.version)
+        cbm_path = out_path.with_suffix(".cbm")
+        model.save_model(str(cbm_path))
+        artifact = WinProbArtifact(
+            created_at_utc=utc_now_iso_compact(),
+            version=job.version,
+            train_season_start_max=job.train_season_start_max,
+            calib_season_start=job.calib_season_start,
+            test_season_start=job.test_season_start,
+            buckets_seconds_remaining=list(job.buckets_seconds_remaining),
+            preprocess=job.preprocess,
+            feature_names=list(job.feature_names),
+            model=ModelParams(weights=[0.0] * len(job.feature_names), intercept=0.0, l2_lambda=0.0, max_iter=0, tol=0.0),
+            platt=calibrator if method == "platt" else None,
+            isotonic=calibrator if method == "isotonic" else None,
+            model_type="catboost",
+            catboost_model_path=cbm_path.name,
+            uses_opening_odds_baseline=job.uses_opening_odds_baseline,
+        )
+        save_artifact(out_path, artifact)
+
+        calib_m = _metrics(calibrator.apply(p_calib), y_calib)
+        test_m = _metrics(calibrator.apply(p_test), y_test) if p_test is not None else {}
+        rows.append(
+            {
+                "artifact": str(out_path),
+                "status": "ok",
+                "feature_set": job.feature_set,
+                "calibration": method,
+                "iterations": job.iterations,
+                "learning_rate": job.learning_rate,
+                "n_features": len(job.feature_names),
+                "train_seconds": round(train_seconds, 2),
+                "calib_brier": calib_m["brier"],
+                "calib_logloss": calib_m["logloss"],
+                "calib_ece": calib_m["ece"],
+                "test_brier_base": base_test.get("brier"),
+                "test_logloss_base": base_test.get("logloss"),
+                "test_brier": test_m.get("brier"),
+                "test_logloss": test_m.get("logloss"),
+                "test_ece": test_m.get("ece"),
+                "test_auc": test_m.get("auc"),
+                "error": None,
+            }
+        )
+    return rows
+
+
+def write_summary(rows: list[dict[str, Any]], out_dir: Path, *, config: dict[str, Any]) -> tuple[Path, Path]:
+    json_path = out_dir / "sweep_summary.json"
+    csv_path = out_dir / "sweep_summary.csv"
+    json_path.write_text(
+        json.dumps({"created_at_utc": utc_now_iso_compact(), "config": config, "rows": rows}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    with csv_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(SUMMARY_COLUMNS))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: row.get(k) for k in SUMMARY_COLUMNS})
+    return json_path, csv_path
+
+
+def _rank_key(row: dict[str, Any]) -> tuple[int, float]:
+    value = row.get("test_logloss")
+    return (0, float(value)) if row.get("status") == "ok" and value is not None else (1, 0.0)
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    *,
+    out_dir: Path | str,
+    feature_sets: list[str] | tuple[str, ...] = tuple(FEATURE_SETS),
+    iterations: list[int] | tuple[int, ...] = (1000,),
+    learning_rates: list[float] | tuple[float, ...] = (0.1,),
+    methods: tuple[str, ...] = CALIBRATION_METHODS,
+    train_season_start_max: int = 2022,
+    calib_season_start: int = 2023,
+    test_season_start: int = 2024,
+    version: str = "v1",
+    workers: int | None = None,
+    bucket_step_seconds: int = 60,
+    work_dir: Path | str | None = None,
+    log: Callable[[str], None] = _log_stderr,
+) -> list[dict[str, Any]]:
+    """
+    Train every (feature set, iterations, learning rate) combination on one shared training frame and write the
+    artifacts plus sweep_summary.{json,csv} to `out_dir`. Returns the summary rows sorted by test log loss.
+
+    `df` is the frame _load_training_data returns (interaction-term query, so it covers every feature set).
+    """
+    unknown = [n for n in feature_sets if n not in FEATURE_SETS]
+    if unknown:
+        raise ValueError(f"unknown feature sets: {unknown} (choose from {sorted(FEATURE_SETS)})")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    df = df[df["final_winning_team"].notna()] if df["final_winning_team"].isna().any() else df
+    y = (df["final_winning_team"].astype(int) == 0).astype(int).to_numpy(dtype=np.float64)
+    season = df["season_start"].astype(int).to_numpy()
+    # Same leak-proof split as train_winprob_catboost.py with calibration enabled.
+    masks = {
+        "train": (season <= int(train_season_start_max)) & (season != int(calib_season_start)),
+        "calib": season == int(calib_season_start),
+        "test": season == int(test_season_start),
+    }
+    if int(np.sum(masks["train"])) < 5:
+        raise SystemExit(f"Training set is empty for season_start <= {train_season_start_max}")
+    if int(np.sum(masks["calib"])) < 5:
+        raise SystemExit(f"Calibration season {calib_season_start} has < 5 rows; the sweep always calibrates")
+    buckets = tuple(_calculate_buckets(df["time_remaining_regulation"], bucket_step_seconds))
+
+    combos = [(int(it), float(lr)) for it in iterations for lr in learning_rates]
+    multiple = len(combos) > 1
+    n_jobs = len(feature_sets) * len(combos)
+    cores = os.cpu_count() or 1
+    workers = max(1, min(int(workers or n_jobs), n_jobs, cores))
+    thread_count = max(1, cores // workers)
+
+    with tempfile.TemporaryDirectory(prefix=".sweep-", dir=str(work_dir or out_dir)) as tmp:
+        jobs: list[_SweepJob] = []
+        for name in feature_sets:
+            fs = FEATURE_SETS[name]
+            t0 = time.time()
+            preprocess = _compute_preprocess(df, masks["train"], use_interaction_terms=fs.use_interaction_terms)
+            X_all, feature_names = _build_features(
+                df, preprocess, use_interaction_terms=fs.use_interaction_terms, use_opening_odds=fs.use_opening_odds
+            )
+            baseline_all = _odds_baseline(df, use_opening_odds=fs.use_opening_odds)
+            uses_baseline = bool(
+                fs.use_opening_odds
+                and "opening_prob_home_fair" in df.columns
+                and (~df.loc[masks["train"], "opening_prob_home_fair"].isna()).any()
+            )
+            data_dir = Path(tmp) / name
+            _write_feature_set(data_dir, X_all, y, baseline_all, masks)
+            log(f"Feature set {name}: {X_all.shape[1]} features, built in {time.time() - t0:.2f}s")
+            for it, lr in combos:
+                jobs.append(
+                    _SweepJob(
+                        feature_set=name,
+                        data_dir=str(data_dir),
+                        iterations=it,
+                        learning_rate=lr,
+                        tag=_hyperparameter_tag(it, lr, multiple=multiple),
+                        thread_count=thread_count,
+                        methods=tuple(methods),
+                        out_dir=str(out_dir),
+                        version=str(version),
+                        train_season_start_max=int(train_season_start_max),
+                        calib_season_start=int(calib_season_start),
+                        test_season_start=int(test_season_start),
+                        buckets_seconds_remaining=buckets,
+                        preprocess=preprocess,
+                        feature_names=tuple(feature_names),
+                        uses_opening_odds_baseline=uses_baseline,
+                    )
+                )
+
+        log(f"Training {len(jobs)} base models ({len(jobs) * len(methods)} artifacts) on {workers} processes x {thread_count} threads")
+        rows: list[dict[str, Any]] = []
+        # spawn, not fork: CatBoost's thread pool does not survive fork reliably.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            futures = {ex.submit(_train_variant, job): job for job in jobs}
+            for fut in as_completed(futures):
+                job = futures[fut]
+                try:
+                    job_rows = fut.result()
+                except Exception as e:  # noqa: BLE001
+                    log(f"FAILED {job.feature_set}{job.tag}: {e}")
+                    rows.append({
+                        "artifact": None,
+                        "status": "failed",
+                        "feature_set": job.feature_set,
+                        "iterations": job.iterations,
+                        "learning_rate": job.learning_rate,
+                        "error": str(e),
+                    })
+                    continue
+                for row in job_rows:
+                    log(f"  {Path(row['artifact']).name}: test logloss={row['test_logloss']} brier={row['test_brier']} ({row['train_seconds']}s)")
+                rows.extend(job_rows)
+
+    rows.sort(key=_rank_key)
+    config = {
+        "feature_sets": list(feature_sets),
+        "iterations": [int(i) for i in iterations],
+        "learning_rates": [float(lr) for lr in learning_rates],
+        "methods": list(methods),
+        "train_season_start_max": int(train_season_start_max),
+        "calib_season_start": int(calib_season_start),
+        "test_season_start": int(test_season_start),
+        "version": str(version),
+        "workers": workers,
+        "thread_count": thread_count,
+    }
+    json_path, csv_path = write_summary(rows, out_dir, config=config)
+    log(f"Wrote {json_path} and {csv_path}")
+    return rows
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Train all CatBoost win-probability variants from one shared training frame.")
+    p.add_argument("--out-dir", default="artifacts", help="Directory for artifacts and sweep_summary.{json,csv} (default: artifacts).")
+    p.add_argument("--dsn", help="Database connection string (or use DATABASE_URL env var)")
+    p.add_argument("--version", default="v1", help="Artifact version string; non-v1 versions are appended to file names (default: v1).")
+    p.add_argument("--train-season-start-max", type=int, default=2022, help="Max season_start included in training (default: 2022).")
+    p.add_argument("--calib-season-start", type=int, default=2023, help="Season_start used for calibration (default: 2023).")
+    p.add_argument("--test-season-start", type=int, default=2024, help="Held-out test season_start (default: 2024).")
+    p.add_argument("--feature-sets", nargs="+", choices=sorted(FEATURE_SETS), default=list(FEATURE_SETS), help="Feature sets to train (default: all four).")
+    p.add_argument("--calibration-methods", nargs="+", choices=list(CALIBRATION_METHODS), default=list(CALIBRATION_METHODS), help="Calibrators fitted per base model (default: platt isotonic).")
+    p.add_argument("--iterations", type=int, nargs="+", default=[1000], help="CatBoost iterations to sweep (default: 1000).")
+    p.add_argument("--learning-rate", type=float, nargs="+", default=[0.1], help="CatBoost learning rates to sweep (default: 0.1).")
+    p.add_argument("--workers", type=int, default=None, help="Training processes (default: one per base model, capped at CPU count).")
+    p.add_argument("--bucket-step-seconds", type=int, default=60, help="Bucket step in seconds for artifact metadata (default: 60).")
+    p.add_argument("--work-dir", type=str, default=None, help="Where the shared design matrices are staged (default: a temp dir inside --out-dir).")
+    p.add_argument("--cache-parquet", type=str, default=None, help="Path to a frozen Parquet snapshot of the training data (no invalidation).")
+    p.add_argument("--feature-cache-dir", type=str, default=str(DEFAULT_CACHE_DIR), help=f"Versioned feature cache directory (default: {DEFAULT_CACHE_DIR}).")
+    p.add_argument("--no-feature-cache", action="store_true", help="Always re-extract training data from the database.")
+    p.add_argument("--refresh-feature-cache", action="store_true", help="Re-extract and overwrite the feature cache entry.")
+    p.add_argument("--work-mem", type=str, default="4GB", help="PostgreSQL work_mem setting for the extraction query (default: 4GB).")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    start = time.time()
+
+    cache_path = Path(args.cache_parquet) if args.cache_parquet else None
+    if cache_path and cache_path.exists():
+        _log_stderr(f"Loading training data from Parquet snapshot: {cache_path}")
+        df = pd.read_parquet(cache_path)
+    else:
+        with connect(get_dsn(args.dsn)) as conn:
+            conn.execute(f"SET work_mem = '{args.work_mem}'")
+            # The interaction-term query returns a superset of columns, so one frame serves every feature set.
+            df = _load_training_data(
+                conn,
+                train_season_start_max=int(args.train_season_start_max),
+                test_season_start=int(args.test_season_start),
+                calib_season_start=int(args.calib_season_start),
+                use_interaction_terms=True,
+                cache_dir=None if args.no_feature_cache else args.feature_cache_dir,
+                refresh_cache=bool(args.refresh_feature_cache),
+            )
+        if cache_path:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_path, index=False, compression="snappy")
+    if len(df) == 0:
+        raise SystemExit("No training data loaded. Check database connection and data availability.")
+    _log_stderr(f"Training frame: {len(df):,} rows")
+
+    rows = run_sweep(
+        df,
+        out_dir=args.out_dir,
+        feature_sets=args.feature_sets,
+        iterations=args.iterations,
+        learning_rates=args.learning_rate,
+        methods=tuple(args.calibration_methods),
+        train_season_start_max=args.train_season_start_max,
+        calib_season_start=args.calib_season_start,
+        test_season_start=args.test_season_start,
+        version=args.version,
+        workers=args.workers,
+        bucket_step_seconds=args.bucket_step_seconds,
+        work_dir=args.work_dir,
+    )
+    failed = [r for r in rows if r.get("status") != "ok"]
+    _log_stderr(f"Sweep finished in {(time.time() - start) / 60:.2f} minutes: {len(rows) - len(failed)} artifacts, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
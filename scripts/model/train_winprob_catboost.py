@@ -6,7 +6,7 @@ This script uses CatBoost for gradient boosting, which can automatically find in
 
 Inputs:
 - ESPN tables: espn.probabilities_raw_items, espn.prob_event_state, espn.scoreboard_games
-- Opening odds (optional): external.sportsbook_odds_snapshots
+- Opening odds (optional): derived.opening_odds_features_v1 (per-game features from external.sportsbook_odds_snapshots)
 
 Split policy (leak-proof, game-level by season_start):
 - train seasons: season_start <= --train-season-start-max (default 2022)
@@ -23,9 +23,13 @@ Label:
 - y_home_win = 1 if final_winning_team == 0 else 0
 
 Performance Optimizations:
-- Parquet caching: Use --cache-parquet to save/load training data (saves ~60s on subsequent runs)
+- Feature cache: query results are cached as season-partitioned Parquet under --feature-cache-dir, keyed by
+  query fingerprint + source-table watermarks, and extracted via COPY/Arrow instead of pd.read_sql
+- Parquet snapshot: --cache-parquet pins a single frozen file (no invalidation; works offline)
 - work_mem: Configurable via --work-mem (default 4GB) to avoid disk spills
 - ORDER BY removed from SQL queries (saves ~15s)
+- Full variant refresh: scripts/model/sweep_winprob_catboost.py trains every feature set x calibration from one
+  loaded frame in parallel processes (this script's feature/baseline/model helpers are shared with it)
 
 Recommended database indexes (run once):
     CREATE INDEX CONCURRENTLY ix_prob_event_state_game_event 
@@ -47,7 +51,6 @@ import argparse
 import json
 import sys
 import time
-import warnings
 from datetime import datetime
 from pathlib import Path
 
@@ -58,6 +61,8 @@ from catboost import CatBoostClassifier, Pool
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from scripts.lib._db_lib import get_dsn, connect
+from scripts.lib._feature_cache_lib import DEFAULT_CACHE_DIR, load_query_cached
+from scripts.lib._odds_features_lib import ensure_opening_odds_features
 from scripts.lib._winprob_lib import (
     PreprocessParams,
     ModelParams,  # Still needed for artifact structure, but won't be used for prediction
@@ -110,12 +115,15 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--no-interaction-terms", dest="use_interaction_terms", action="store_false", default=True, help="Disable interaction terms. Default: enabled.")
     p.add_argument("--save-split-file", type=str, default=None, help="Path to save train/test/calib split file (JSON format) for reproducibility.")
     p.add_argument("--disable-opening-odds", action="store_true", help="Disable opening odds features (for baseline model training).")
-    p.add_argument("--cache-parquet", type=str, default=None, help="Path to cache training data as Parquet (saves ~60s on subsequent runs).")
+    p.add_argument("--cache-parquet", type=str, default=None, help="Path to a frozen Parquet snapshot of the training data (no invalidation).")
+    p.add_argument("--feature-cache-dir", type=str, default=str(DEFAULT_CACHE_DIR), help=f"Versioned feature cache directory (default: {DEFAULT_CACHE_DIR}).")
+    p.add_argument("--no-feature-cache", action="store_true", help="Always re-extract training data from the database.")
+    p.add_argument("--refresh-feature-cache", action="store_true", help="Re-extract and overwrite the feature cache entry.")
     p.add_argument("--work-mem", type=str, default="4GB", help="PostgreSQL work_mem setting for query optimization (default: 4GB).")
     return p.parse_args()
 
 
-def _load_training_data(conn, train_season_start_max: int, test_season_start: int, calib_season_start: int | None, use_interaction_terms: bool = True) -> pd.DataFrame:
+def _load_training_data(conn, train_season_start_max: int, test_season_start: int, calib_season_start: int | None, use_interaction_terms: bool = True, cache_dir: str | Path | None = None, refresh_cache: bool = False) -> pd.DataFrame:
     """
     Load training data directly from ESPN tables with opening odds join (Option B approach).
     
@@ -125,15 +133,16 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
     - Canonical dataset is optimized for simulation (ESPN + Kalshi join) and excludes 94% of training data
     
     **Opening Odds Integration (Option B)**:
-    - LEFT JOIN with external.sportsbook_odds_snapshots filtered for is_opening_line = TRUE
+    - LEFT JOIN with derived.opening_odds_features_v1 (one row per game, refreshed by load_sportsbook_odds.py)
     - Join on espn_game_id (ESPN event_id = external.espn_game_id)
-    - Pivots opening odds: moneyline (home/away), spread (home), total (over)
+    - Carries the pivoted opening lines (moneyline home/away, spread home, total over) and the engineered
+      opening_prob_home_fair / opening_overround, so nothing is pivoted or de-vigged per snapshot
     
     Maps ESPN columns to model features:
     - score_diff -> point_differential
     - time_remaining -> time_remaining_regulation
     - possession -> 'unknown' (not reliably available)
-    - opening_moneyline_home, opening_moneyline_away, opening_spread, opening_total -> engineered features
+    - opening_prob_home_fair, opening_overround -> precomputed per game
     """
     print(f"    [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Building SQL query...", file=sys.stderr)
     print(f"      Interaction terms: {'enabled' if use_interaction_terms else 'disabled'}", file=sys.stderr)
@@ -194,19 +203,6 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
             WHERE sg.status_completed = TRUE
             ORDER BY sg.event_id, sg.scoreboard_date DESC
         ),
-        opening_odds AS MATERIALIZED (
-            -- Pivot opening odds by market_type and side (scoped to needed games)
-            SELECT 
-                s.espn_game_id,
-                MAX(s.odds_decimal) FILTER (WHERE s.market_type = 'moneyline' AND s.side = 'home') AS opening_moneyline_home,
-                MAX(s.odds_decimal) FILTER (WHERE s.market_type = 'moneyline' AND s.side = 'away') AS opening_moneyline_away,
-                MAX(s.line_value) FILTER (WHERE s.market_type = 'spread' AND s.side = 'home') AS opening_spread,
-                MAX(s.line_value) FILTER (WHERE s.market_type = 'total' AND s.side = 'over') AS opening_total
-            FROM external.sportsbook_odds_snapshots s
-            JOIN needed_games g ON g.game_id = s.espn_game_id
-            WHERE s.is_opening_line = TRUE
-            GROUP BY s.espn_game_id
-        ),
         espn_with_features AS (
             SELECT
                 e.season_start,
@@ -231,15 +227,17 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
                         (FLOOR(e.time_remaining / 60.0) * 60)::INTEGER
                     ELSE NULL
                 END AS bucket_seconds_remaining,
-                -- Opening odds from external.sportsbook_odds_snapshots (Option B)
+                -- Opening odds from the per-game feature store (scripts/lib/_odds_features_lib.py)
                 oo.opening_moneyline_home,
                 oo.opening_moneyline_away,
                 oo.opening_spread,
-                oo.opening_total
+                oo.opening_total,
+                oo.opening_prob_home_fair,
+                oo.opening_overround
             FROM espn_with_lag e
             LEFT JOIN scoreboard_final sg 
                 ON e.game_id = sg.event_id
-            LEFT JOIN opening_odds oo
+            LEFT JOIN derived.opening_odds_features_v1 oo
                 ON e.game_id = oo.espn_game_id
             WHERE sg.home_score IS NOT NULL 
               AND sg.away_score IS NOT NULL
@@ -259,11 +257,13 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
             e.espn_home_prob_delta_1,
             e.period,
             e.bucket_seconds_remaining,
-            -- Opening odds columns (raw, will be engineered after loading)
+            -- Opening odds columns (raw lines plus the engineered features, materialized per game)
             e.opening_moneyline_home,
             e.opening_moneyline_away,
             e.opening_spread,
-            e.opening_total
+            e.opening_total,
+            e.opening_prob_home_fair,
+            e.opening_overround
         FROM espn_with_features e
         -- REMOVED ORDER BY: saves ~15s and 600MB disk spill (not needed for training)
         """.format(
@@ -311,19 +311,6 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
             WHERE sg.status_completed = TRUE
             ORDER BY sg.event_id, sg.scoreboard_date DESC
         ),
-        opening_odds AS MATERIALIZED (
-            -- Pivot opening odds by market_type and side (scoped to needed games)
-            SELECT 
-                s.espn_game_id,
-                MAX(s.odds_decimal) FILTER (WHERE s.market_type = 'moneyline' AND s.side = 'home') AS opening_moneyline_home,
-                MAX(s.odds_decimal) FILTER (WHERE s.market_type = 'moneyline' AND s.side = 'away') AS opening_moneyline_away,
-                MAX(s.line_value) FILTER (WHERE s.market_type = 'spread' AND s.side = 'home') AS opening_spread,
-                MAX(s.line_value) FILTER (WHERE s.market_type = 'total' AND s.side = 'over') AS opening_total
-            FROM external.sportsbook_odds_snapshots s
-            JOIN needed_games g ON g.game_id = s.espn_game_id
-            WHERE s.is_opening_line = TRUE
-            GROUP BY s.espn_game_id
-        ),
         espn_with_features AS (
             SELECT
                 e.season_start,
@@ -343,15 +330,17 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
                         (FLOOR(e.time_remaining / 60.0) * 60)::INTEGER
                     ELSE NULL
                 END AS bucket_seconds_remaining,
-                -- Opening odds from external.sportsbook_odds_snapshots (Option B)
+                -- Opening odds from the per-game feature store (scripts/lib/_odds_features_lib.py)
                 oo.opening_moneyline_home,
                 oo.opening_moneyline_away,
                 oo.opening_spread,
-                oo.opening_total
+                oo.opening_total,
+                oo.opening_prob_home_fair,
+                oo.opening_overround
             FROM espn_base_filtered e
             LEFT JOIN scoreboard_final sg 
                 ON e.game_id = sg.event_id
-            LEFT JOIN opening_odds oo
+            LEFT JOIN derived.opening_odds_features_v1 oo
                 ON e.game_id = oo.espn_game_id
             WHERE sg.home_score IS NOT NULL 
               AND sg.away_score IS NOT NULL
@@ -366,11 +355,13 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
             e.possession,
             e.final_winning_team,
             e.bucket_seconds_remaining,
-            -- Opening odds columns (raw, will be engineered after loading)
+            -- Opening odds columns (raw lines plus the engineered features, materialized per game)
             e.opening_moneyline_home,
             e.opening_moneyline_away,
             e.opening_spread,
-            e.opening_total
+            e.opening_total,
+            e.opening_prob_home_fair,
+            e.opening_overround
         FROM espn_with_features e
         -- REMOVED ORDER BY: saves ~15s and 600MB disk spill (not needed for training)
         """.format(
@@ -379,42 +370,19 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
             calib_season_start=calib_season_start if calib_season_start is not None else 'NULL'
         )
     
-    # Suppress pandas warning about psycopg connection (it works fine, just not officially supported)
-    print(f"    [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Executing SQL query (this may take several minutes)...", file=sys.stderr)
+    # Opening-odds features are read from their per-game table; build it on first use.
+    ensure_opening_odds_features(conn)
+    print(f"    [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Executing SQL query (cached by fingerprint + source watermarks)...", file=sys.stderr)
     query_start = time.time()
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=UserWarning, message=".*pandas only supports SQLAlchemy.*")
-        df = pd.read_sql(query, conn)
+    df = load_query_cached(conn, query, name="train_winprob", cache_dir=cache_dir, refresh=refresh_cache)
     query_time = time.time() - query_start
     print(f"    [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] SQL query completed in {query_time:.2f} seconds", file=sys.stderr)
     print(f"      Rows returned: {len(df):,}", file=sys.stderr)
     
-    # Compute opening odds engineered features using shared helper function
-    print(f"    [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Computing opening odds engineered features...", file=sys.stderr)
-    from scripts.lib._winprob_lib import compute_opening_odds_features
-    
-    # Apply helper function vectorized (handles arrays natively)
     if len(df) > 0:
-        odds_start = time.time()
-        odds_features = compute_opening_odds_features(
-            opening_moneyline_home=df['opening_moneyline_home'].to_numpy() if 'opening_moneyline_home' in df.columns else None,
-            opening_moneyline_away=df['opening_moneyline_away'].to_numpy() if 'opening_moneyline_away' in df.columns else None,
-            opening_spread=df['opening_spread'].to_numpy() if 'opening_spread' in df.columns else None,
-            opening_total=df['opening_total'].to_numpy() if 'opening_total' in df.columns else None,
-        )
-        
-        # Add engineered features to DataFrame
-        df['opening_prob_home_fair'] = odds_features['opening_prob_home_fair']
-        df['opening_overround'] = odds_features['opening_overround']
-        odds_time = time.time() - odds_start
         # Count rows with opening odds (use opening_overround to infer, since has_opening_moneyline removed)
-        odds_count = (~df['opening_overround'].isna()).sum() if 'opening_overround' in df.columns else 0
-        print(f"      Opening odds features computed in {odds_time:.2f} seconds", file=sys.stderr)
+        odds_count = (~df['opening_overround'].isna()).sum()
         print(f"      Snapshots with opening odds: {odds_count:,} ({100.0 * odds_count / len(df):.1f}%)", file=sys.stderr)
-    else:
-        # Empty DataFrame - add columns with empty arrays
-        df['opening_prob_home_fair'] = pd.Series(dtype=float)
-        df['opening_overround'] = pd.Series(dtype=float)
     
     # REMOVED: opening_prob_home_fair_time_weighted (double-feeding odds)
     # We already use opening_prob_home_fair as CatBoost baseline, so adding it as a feature
@@ -561,6 +529,115 @@ def _validate_calibration_quality(
         print(f"  ⚠️  WARNING: Calibration did not improve metrics - consider using isotonic or fixing fit input", file=sys.stderr)
 
 
+# (raw column, PreprocessParams field prefix) for the scaled interaction features, in design-matrix order.
+_INTERACTION_COLUMNS = (
+    ("score_diff_div_sqrt_time_remaining", "score_diff_div_sqrt_time_rem"),
+    ("espn_home_prob", "espn_home_prob"),
+    ("espn_home_prob_lag_1", "espn_home_prob_lag_1"),
+    ("espn_home_prob_delta_1", "espn_home_prob_delta_1"),
+)
+
+
+def _compute_preprocess(df: pd.DataFrame, train_mask: np.ndarray, *, use_interaction_terms: bool) -> PreprocessParams:
+    """Standardization params fitted on training rows only (NaNs ignored for interaction terms)."""
+    pd_train = df.loc[train_mask, "point_differential"].astype(float).to_numpy()
+    tr_train = df.loc[train_mask, "time_remaining_regulation"].astype(float).to_numpy()
+    pd_std = float(np.std(pd_train, ddof=0))
+    tr_std = float(np.std(tr_train, ddof=0))
+    interaction_params: dict[str, float] = {}
+    if use_interaction_terms:
+        for column, prefix in _INTERACTION_COLUMNS:
+            if column not in df.columns:
+                continue
+            values = df.loc[train_mask, column].astype(float).to_numpy()
+            values = values[~np.isnan(values)]
+            if len(values) > 0:
+                interaction_params[f"{prefix}_mean"] = float(np.mean(values))
+                interaction_params[f"{prefix}_std"] = float(np.std(values, ddof=0)) or 1.0
+        # REMOVED: opening_prob_home_fair_time_weighted normalization (feature removed to prevent double-feeding)
+    return PreprocessParams(
+        point_diff_mean=float(np.mean(pd_train)),
+        point_diff_std=pd_std if pd_std != 0.0 else 1.0,
+        time_rem_mean=float(np.mean(tr_train)),
+        time_rem_std=tr_std if tr_std != 0.0 else 1.0,
+        **interaction_params,
+    )
+
+
+def _build_features(
+    df: pd.DataFrame,
+    preprocess: PreprocessParams,
+    *,
+    use_interaction_terms: bool,
+    use_opening_odds: bool,
+) -> tuple[np.ndarray, list[str]]:
+    """
+    Build the design matrix for every row of `df` plus its feature names (base + interaction terms + opening odds).
+
+    opening_prob_home_fair is deliberately not a feature: it is the CatBoost baseline (see _odds_baseline).
+    """
+    build_matrix_kwargs = {
+        "point_differential": df["point_differential"].to_numpy(dtype=np.float64),
+        "time_remaining_regulation": df["time_remaining_regulation"].to_numpy(dtype=np.float64),
+        "possession": df["possession"].to_numpy(),  # Vectorized encoding handles the array
+        "preprocess": preprocess,
+    }
+    feature_names = [
+        "point_differential_scaled",
+        "time_remaining_regulation_scaled",
+        "possession_home",
+        "possession_away",
+        "possession_unknown",
+    ]
+    if use_interaction_terms:
+        for column, _ in _INTERACTION_COLUMNS:
+            if column in df.columns:
+                build_matrix_kwargs[column] = df[column].to_numpy(dtype=np.float64)
+                feature_names.append(f"{column}_scaled")
+        if "period" in df.columns:
+            # Pass as numpy array - _safe_int_or_zero handles NaN/None robustly
+            build_matrix_kwargs["period"] = df["period"].to_numpy()
+            feature_names.extend(["period_1", "period_2", "period_3", "period_4"])
+    if use_opening_odds:
+        # Keep only opening_overround (opening_spread/total and has_opening_* removed as redundant)
+        if "opening_overround" in df.columns:
+            build_matrix_kwargs["opening_overround"] = df["opening_overround"].to_numpy(dtype=np.float64)
+            feature_names.append("opening_overround")
+        # CatBoost can use NaN as signal, so keep them (default is "zero" for logreg safety)
+        build_matrix_kwargs["odds_nan_policy"] = "keep"
+    return build_design_matrix(**build_matrix_kwargs), feature_names
+
+
+def _odds_baseline(df: pd.DataFrame, *, use_opening_odds: bool) -> np.ndarray:
+    """Per-row CatBoost baseline: logit(opening_prob_home_fair) where opening odds exist, else 0.0 (50/50 prior)."""
+    baseline = np.zeros(len(df), dtype=np.float64)
+    if use_opening_odds and "opening_prob_home_fair" in df.columns:
+        p0 = df["opening_prob_home_fair"].to_numpy(dtype=np.float64)
+        # Infer odds availability from opening_overround
+        has_odds = (~df["opening_overround"].isna()).to_numpy() if "opening_overround" in df.columns else np.zeros(len(df), dtype=bool)
+        baseline[has_odds] = logit(p0[has_odds])
+    return baseline
+
+
+def _new_catboost_model(*, iterations: int, learning_rate: float, thread_count: int = -1, verbose: int | bool = 500) -> CatBoostClassifier:
+    """The regularized CatBoost configuration every win-prob variant is trained with."""
+    return CatBoostClassifier(
+        iterations=int(iterations),
+        depth=3,  # REDUCE from 4 to 3 for stronger regularization
+        learning_rate=float(learning_rate),
+        l2_leaf_reg=20.0,  # INCREASE from 10.0 to 20.0 for stronger regularization
+        subsample=0.8,  # Use 80% of data per tree for regularization
+        random_strength=1.0,
+        bagging_temperature=1.0,
+        loss_function='Logloss',
+        eval_metric='AUC',
+        verbose=verbose,
+        random_seed=42,
+        allow_writing_files=False,  # Don't write temp files
+        thread_count=int(thread_count),  # -1 = all cores; sweeps split cores across worker processes
+    )
+
+
 def main() -> int:
     start_time = time.time()
     args = parse_args()
@@ -603,6 +680,8 @@ def main() -> int:
                     test_season_start=int(args.test_season_start),
                     calib_season_start=calib_season_start,
                     use_interaction_terms=bool(args.use_interaction_terms),
+                    cache_dir=None if args.no_feature_cache else args.feature_cache_dir,
+                    refresh_cache=bool(args.refresh_feature_cache),
                 )
                 load_time = time.time() - load_start
                 print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Data loading completed in {load_time:.2f} seconds", file=sys.stderr)
@@ -743,155 +822,37 @@ def main() -> int:
 
     # Preprocess params computed from train rows only.
     print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Computing preprocessing parameters from training data...", file=sys.stderr)
-    pd_train = df.loc[train_mask, "point_differential"].astype(float).to_numpy()
-    tr_train = df.loc[train_mask, "time_remaining_regulation"].astype(float).to_numpy()
-    pd_mean = float(np.mean(pd_train))
-    pd_std = float(np.std(pd_train, ddof=0))
-    tr_mean = float(np.mean(tr_train))
-    tr_std = float(np.std(tr_train, ddof=0))
-    if pd_std == 0.0:
-        pd_std = 1.0
-    if tr_std == 0.0:
-        tr_std = 1.0
-    print(f"  Point diff: mean={pd_mean:.4f}, std={pd_std:.4f}", file=sys.stderr)
-    print(f"  Time remaining: mean={tr_mean:.4f}, std={tr_std:.4f}", file=sys.stderr)
-    
-    # Calculate normalization params for interaction terms if enabled
     use_interaction_terms = bool(args.use_interaction_terms)
-    interaction_params = {}
+    preprocess = _compute_preprocess(df, train_mask, use_interaction_terms=use_interaction_terms)
+    print(f"  Point diff: mean={preprocess.point_diff_mean:.4f}, std={preprocess.point_diff_std:.4f}", file=sys.stderr)
+    print(f"  Time remaining: mean={preprocess.time_rem_mean:.4f}, std={preprocess.time_rem_std:.4f}", file=sys.stderr)
     if use_interaction_terms:
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Computing interaction term normalization parameters...", file=sys.stderr)
-        if "score_diff_div_sqrt_time_remaining" in df.columns:
-            sddst_train = df.loc[train_mask, "score_diff_div_sqrt_time_remaining"].astype(float).to_numpy()
-            sddst_train = sddst_train[~np.isnan(sddst_train)]
-            if len(sddst_train) > 0:
-                interaction_params["score_diff_div_sqrt_time_rem_mean"] = float(np.mean(sddst_train))
-                interaction_params["score_diff_div_sqrt_time_rem_std"] = float(np.std(sddst_train, ddof=0)) or 1.0
-        
-        if "espn_home_prob" in df.columns:
-            ehp_train = df.loc[train_mask, "espn_home_prob"].astype(float).to_numpy()
-            ehp_train = ehp_train[~np.isnan(ehp_train)]
-            if len(ehp_train) > 0:
-                interaction_params["espn_home_prob_mean"] = float(np.mean(ehp_train))
-                interaction_params["espn_home_prob_std"] = float(np.std(ehp_train, ddof=0)) or 1.0
-        
-        if "espn_home_prob_lag_1" in df.columns:
-            ehpl1_train = df.loc[train_mask, "espn_home_prob_lag_1"].astype(float).to_numpy()
-            ehpl1_train = ehpl1_train[~np.isnan(ehpl1_train)]
-            if len(ehpl1_train) > 0:
-                interaction_params["espn_home_prob_lag_1_mean"] = float(np.mean(ehpl1_train))
-                interaction_params["espn_home_prob_lag_1_std"] = float(np.std(ehpl1_train, ddof=0)) or 1.0
-        
-        if "espn_home_prob_delta_1" in df.columns:
-            ehpd1_train = df.loc[train_mask, "espn_home_prob_delta_1"].astype(float).to_numpy()
-            ehpd1_train = ehpd1_train[~np.isnan(ehpd1_train)]
-            if len(ehpd1_train) > 0:
-                interaction_params["espn_home_prob_delta_1_mean"] = float(np.mean(ehpd1_train))
-                interaction_params["espn_home_prob_delta_1_std"] = float(np.std(ehpd1_train, ddof=0)) or 1.0
-        
-        # REMOVED: opening_prob_home_fair_time_weighted normalization (feature removed to prevent double-feeding)
-        # NOTE: Removed opening_spread and opening_total time interactions (redundant features)
-        print(f"  Computed {len(interaction_params)} interaction term parameters", file=sys.stderr)
+        interaction_count = sum(1 for _, prefix in _INTERACTION_COLUMNS if getattr(preprocess, f"{prefix}_mean") is not None)
+        print(f"  Computed {2 * interaction_count} interaction term parameters", file=sys.stderr)
     else:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Interaction terms disabled, skipping normalization", file=sys.stderr)
-    
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Creating PreprocessParams object...", file=sys.stderr)
-    preprocess = PreprocessParams(
-        point_diff_mean=pd_mean,
-        point_diff_std=pd_std,
-        time_rem_mean=tr_mean,
-        time_rem_std=tr_std,
-        **interaction_params
-    )
 
     # ============================================================================
     # OPTIMIZATION: Build X_all ONCE and slice by masks (eliminates 3x repeated work)
     # ============================================================================
     print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Building design matrix for ALL data (build once, slice later)...", file=sys.stderr)
     print(f"  Total samples: {len(df):,} (train: {train_rows:,}, calib: {calib_rows:,}, test: {test_rows:,})", file=sys.stderr)
-    
-    # Extract column arrays ONCE (avoid repeated .to_numpy() calls)
-    point_diff_all = df["point_differential"].to_numpy(dtype=np.float64)
-    time_rem_all = df["time_remaining_regulation"].to_numpy(dtype=np.float64)
-    possession_all = df["possession"].to_numpy()  # Pass as array, vectorized encoding handles it
-    
-    build_matrix_kwargs = {
-        "point_differential": point_diff_all,
-        "time_remaining_regulation": time_rem_all,
-        "possession": possession_all,
-        "preprocess": preprocess,
-    }
-    
-    # Add interaction terms if enabled
-    if use_interaction_terms:
-        if "score_diff_div_sqrt_time_remaining" in df.columns:
-            build_matrix_kwargs["score_diff_div_sqrt_time_remaining"] = df["score_diff_div_sqrt_time_remaining"].to_numpy(dtype=np.float64)
-        if "espn_home_prob" in df.columns:
-            build_matrix_kwargs["espn_home_prob"] = df["espn_home_prob"].to_numpy(dtype=np.float64)
-        if "espn_home_prob_lag_1" in df.columns:
-            build_matrix_kwargs["espn_home_prob_lag_1"] = df["espn_home_prob_lag_1"].to_numpy(dtype=np.float64)
-        if "espn_home_prob_delta_1" in df.columns:
-            build_matrix_kwargs["espn_home_prob_delta_1"] = df["espn_home_prob_delta_1"].to_numpy(dtype=np.float64)
-        if "period" in df.columns:
-            # Pass as numpy array - _safe_int_or_zero handles NaN/None robustly
-            build_matrix_kwargs["period"] = df["period"].to_numpy()
-        
-        # REMOVED: opening_prob_home_fair_time_weighted (double-feeding odds - baseline already provides this signal)
-        # NOTE: Removed opening_spread and opening_total time interactions (redundant features)
-    
-    # Add opening odds features if available and not disabled
-    # FIXED: Removed opening_prob_home_fair (used as baseline instead), removed opening_spread and opening_total (redundant)
-    # Keep only opening_overround (has_opening_spread and has_opening_total removed)
-    if not args.disable_opening_odds:
-        if "opening_overround" in df.columns:
-            build_matrix_kwargs["opening_overround"] = df["opening_overround"].to_numpy(dtype=np.float64)
-        # CatBoost can use NaN as signal, so keep them (default changed to "zero" for logreg safety)
-        build_matrix_kwargs["odds_nan_policy"] = "keep"
-        print(f"  Added {len([k for k in build_matrix_kwargs.keys() if 'opening' in k.lower()])} opening odds features (opening_prob_home_fair used as baseline, opening_spread/total removed)", file=sys.stderr)
-    
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Constructing design matrix...", file=sys.stderr)
     matrix_start = time.time()
-    X_all = build_design_matrix(**build_matrix_kwargs)
+    X_all, feature_names = _build_features(
+        df,
+        preprocess,
+        use_interaction_terms=use_interaction_terms,
+        use_opening_odds=not args.disable_opening_odds,
+    )
     matrix_time = time.time() - matrix_start
     print(f"  Design matrix shape: {X_all.shape}", file=sys.stderr)
     print(f"  Design matrix construction took {matrix_time:.2f} seconds", file=sys.stderr)
-    
+
     # Slice X_all by masks (views, not copies - very fast)
     X_train = X_all[train_mask]
     y_train = y[train_mask]
     print(f"  X_train shape: {X_train.shape}", file=sys.stderr)
 
-    # Feature ordering by contract (base + optional interaction terms + opening odds)
-    # IMPORTANT: Build feature_names BEFORE asserting (avoid UnboundLocalError)
-    feature_names = [
-        "point_differential_scaled",
-        "time_remaining_regulation_scaled",
-        "possession_home",
-        "possession_away",
-        "possession_unknown",
-    ]
-    
-    # Add interaction term feature names if enabled
-    if use_interaction_terms:
-        if "score_diff_div_sqrt_time_remaining" in df.columns:
-            feature_names.append("score_diff_div_sqrt_time_remaining_scaled")
-        if "espn_home_prob" in df.columns:
-            feature_names.append("espn_home_prob_scaled")
-        if "espn_home_prob_lag_1" in df.columns:
-            feature_names.append("espn_home_prob_lag_1_scaled")
-        if "espn_home_prob_delta_1" in df.columns:
-            feature_names.append("espn_home_prob_delta_1_scaled")
-        if "period" in df.columns:
-            feature_names.extend(["period_1", "period_2", "period_3", "period_4"])
-    
-    # Add opening odds feature names if available and not disabled
-    # NOTE: opening_prob_home_fair used as baseline (not a feature)
-    # NOTE: opening_spread and opening_total removed (redundant)
-    # NOTE: has_opening_spread and has_opening_total removed - use only opening_overround
-    if not args.disable_opening_odds:
-        if "opening_overround" in df.columns:
-            feature_names.append("opening_overround")
-    
     # CRITICAL: Assert feature count matches design matrix columns (after building feature_names)
     if X_train.shape[1] != len(feature_names):
         raise RuntimeError(
@@ -915,35 +876,16 @@ def main() -> int:
     print(f"  Depth: 3 (reduced from {args.depth} for stronger regularization)", file=sys.stderr)
     print(f"  Learning rate: {args.learning_rate}", file=sys.stderr)
     print(f"  Regularization: l2_leaf_reg=20.0, subsample=0.8, random_strength=1.0, bagging_temperature=1.0", file=sys.stderr)
-    model = CatBoostClassifier(
-        iterations=int(args.iterations),
-        depth=3,  # REDUCE from 4 to 3 for stronger regularization
-        learning_rate=float(args.learning_rate),
-        l2_leaf_reg=20.0,  # INCREASE from 10.0 to 20.0 for stronger regularization
-        subsample=0.8,  # ADD: Use 80% of data per tree for regularization
-        random_strength=1.0,  # ADD: Regularization
-        bagging_temperature=1.0,  # ADD: Regularization
-        loss_function='Logloss',
-        eval_metric='AUC',
-        verbose=500,  # Optimization 2.1: Reduced verbosity (was 100)
-        random_seed=42,
-        allow_writing_files=False,  # Don't write temp files
-        thread_count=-1,  # Optimization 2.2: Use all available CPU cores
-    )
+    model = _new_catboost_model(iterations=int(args.iterations), learning_rate=float(args.learning_rate))
     
     # ============================================================================
     # OPTIMIZATION: Compute baseline_all ONCE and slice by masks
     # ============================================================================
     print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Computing CatBoost baseline from opening odds (build once, slice later)...", file=sys.stderr)
-    baseline_all = np.zeros(len(df), dtype=np.float64)
+    baseline_all = _odds_baseline(df, use_opening_odds=not args.disable_opening_odds)
     uses_opening_odds_baseline = False  # Track if baseline was actually used in TRAINING (not just CLI flag)
     if not args.disable_opening_odds and "opening_prob_home_fair" in df.columns:
-        p0_all = df["opening_prob_home_fair"].to_numpy(dtype=np.float64)
-        # Check if any rows have opening odds (use opening_overround to infer)
-        has_odds_all = (~df["opening_overround"].isna()).to_numpy() if "opening_overround" in df.columns else np.zeros(len(df), dtype=bool)
-        # Set baseline to logit(opening_prob_home_fair) when odds available, else 0.0 (50/50 prior)
-        baseline_all[has_odds_all] = logit(p0_all[has_odds_all])
-        odds_baseline_count = int(np.sum(has_odds_all))
+        odds_baseline_count = int((~df["opening_overround"].isna()).sum()) if "opening_overround" in df.columns else 0
         print(f"  Baseline set from opening_prob_home_fair for {odds_baseline_count:,} samples ({100.0 * odds_baseline_count / len(df):.1f}%)", file=sys.stderr)
         print(f"  Baseline stats: min={baseline_all.min():.4f}, max={baseline_all.max():.4f}, mean={baseline_all.mean():.4f}", file=sys.stderr)
     else:
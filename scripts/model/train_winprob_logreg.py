@@ -20,18 +20,26 @@ Features (prediction-time):
 Label:
 - y_home_win = 1 if final_winning_team == 0 else 0
 
+Out-of-core mode (--streaming): the query result stays on disk as the feature cache's season partitions and IRLS
+accumulates X'WX / X'Wz over float32 chunks, so every season back to 2017 fits in a small-memory container.
+--warm-start-artifact starts the Newton iterations from a previous logreg artifact with the same features.
+
 Usage:
   ./.venv/bin/python scripts/train_winprob_logreg.py \
     --out-artifact artifacts/winprob_logreg_v1.json \
     --dsn "$DATABASE_URL"
+  ./.venv/bin/python scripts/model/train_winprob_logreg.py --streaming --batch-rows 200000 \
+    --warm-start-artifact artifacts/winprob_logreg_v1.json --out-artifact artifacts/winprob_logreg_v2.json
 """
 
 from __future__ import annotations
 
 import argparse
 import sys
-import warnings
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
 
 import numpy as np
 import pandas as pd
@@ -39,12 +47,21 @@ import pandas as pd
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from scripts.lib._db_lib import get_dsn, connect
+from scripts.lib._feature_cache_lib import (
+    DEFAULT_CACHE_DIR,
+    ensure_cached,
+    iter_partition_batches,
+    load_query_cached,
+    partition_files,
+    read_partitioned,
+)
 from scripts.lib._winprob_lib import (
     PreprocessParams,
     ModelParams,
     WinProbArtifact,
     build_design_matrix,
     fit_logistic_regression_irls,
+    fit_logistic_regression_irls_chunked,
     fit_platt_calibrator_on_probs,
     fit_isotonic_calibrator_on_probs,
     load_artifact,
@@ -84,10 +101,16 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--bucket-step-seconds", type=int, default=60, help="Bucket step in seconds for artifact metadata (default: 60).")
     p.add_argument("--use-interaction-terms", action="store_true", default=True, help="Use interaction terms from canonical dataset (default: True).")
     p.add_argument("--no-interaction-terms", dest="use_interaction_terms", action="store_false", help="Disable interaction terms (use basic model only).")
+    p.add_argument("--feature-cache-dir", type=str, default=str(DEFAULT_CACHE_DIR), help=f"Versioned feature cache directory (default: {DEFAULT_CACHE_DIR}).")
+    p.add_argument("--no-feature-cache", action="store_true", help="Always re-extract training data from the database.")
+    p.add_argument("--refresh-feature-cache", action="store_true", help="Re-extract and overwrite the feature cache entry.")
+    p.add_argument("--streaming", action="store_true", help="Fit out-of-core from the feature cache's Parquet partitions (float32 chunks, bounded memory).")
+    p.add_argument("--batch-rows", type=int, default=262_144, help="Rows per streamed chunk with --streaming (default: 262144).")
+    p.add_argument("--warm-start-artifact", type=str, default=None, help="Start IRLS from this logreg artifact's weights (used only if its feature names match).")
     return p.parse_args()
 
 
-def _load_training_data(conn, train_season_start_max: int, test_season_start: int, calib_season_start: int | None, use_interaction_terms: bool = True) -> pd.DataFrame:
+def _load_training_data(conn, train_season_start_max: int, test_season_start: int, calib_season_start: int | None, use_interaction_terms: bool = True, cache_dir: str | Path | None = None, refresh_cache: bool = False) -> pd.DataFrame:
     """
     Load training data directly from ESPN tables (bypasses canonical dataset).
     
@@ -110,6 +133,12 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
     - espn_home_prob_delta_1 (current - lag_1)
     - period (calculated from time_remaining)
     """
+    query = _training_query(use_interaction_terms)
+    return load_query_cached(conn, query, name="train_winprob_logreg", cache_dir=cache_dir, refresh=refresh_cache)
+
+
+def _training_query(use_interaction_terms: bool) -> str:
+    """All seasons (the split happens after loading); see _load_training_data for the column mapping."""
     # Base query: ESPN probabilities + game state
     base_query = """
     WITH espn_base AS (
@@ -199,13 +228,289 @@ def _load_training_data(conn, train_season_start_max: int, test_season_start: in
         ON e.game_id = sg.event_id
     ORDER BY e.season_label, e.game_id, e.sequence_number
     """
-    
-    # Suppress pandas warning about psycopg connection (it works fine, just not officially supported)
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=UserWarning, message=".*pandas only supports SQLAlchemy.*")
-        df = pd.read_sql(query, conn)
-    
-    return df
+    return query
+
+
+# (raw column, PreprocessParams field prefix) for the scaled interaction features, in design-matrix order.
+_INTERACTION_COLUMNS = (
+    ("score_diff_div_sqrt_time_remaining", "score_diff_div_sqrt_time_rem"),
+    ("espn_home_prob", "espn_home_prob"),
+    ("espn_home_prob_lag_1", "espn_home_prob_lag_1"),
+    ("espn_home_prob_delta_1", "espn_home_prob_delta_1"),
+)
+_BASE_COLUMNS = ("season_start", "point_differential", "time_remaining_regulation", "possession", "final_winning_team")
+
+
+def _build_matrix(frame: pd.DataFrame, preprocess: PreprocessParams, use_interaction_terms: bool) -> np.ndarray:
+    build_matrix_kwargs = {
+        "point_differential": frame["point_differential"].to_numpy(),
+        "time_remaining_regulation": frame["time_remaining_regulation"].to_numpy(),
+        "possession": frame["possession"].astype(str).tolist(),
+        "preprocess": preprocess,
+    }
+    # Add interaction terms if enabled
+    if use_interaction_terms:
+        for column, _ in _INTERACTION_COLUMNS:
+            if column in frame.columns:
+                build_matrix_kwargs[column] = frame[column].astype(float).to_numpy()
+        if "period" in frame.columns:
+            build_matrix_kwargs["period"] = frame["period"].astype(int).tolist()
+    return build_design_matrix(**build_matrix_kwargs)
+
+
+def _feature_names(columns, use_interaction_terms: bool) -> list[str]:
+    """Feature ordering by contract (base + optional interaction terms); must match _build_matrix."""
+    feature_names = [
+        "point_differential_scaled",
+        "time_remaining_regulation_scaled",
+        "possession_home",
+        "possession_away",
+        "possession_unknown",
+    ]
+    if use_interaction_terms:
+        for column, _ in _INTERACTION_COLUMNS:
+            if column in columns:
+                feature_names.append(f"{column}_scaled")
+        if "period" in columns:
+            feature_names.extend(["period_1", "period_2", "period_3", "period_4"])
+    return feature_names
+
+
+def _warm_start_params(artifact: WinProbArtifact | None, feature_names: list[str]) -> tuple[np.ndarray | None, float]:
+    """Initial (weights, intercept) from a previous logreg artifact, or (None, 0.0) when it doesn't fit this run."""
+    if artifact is None:
+        return None, 0.0
+    if artifact.model_type != "logreg" or list(artifact.feature_names) != list(feature_names):
+        print("Warm-start artifact ignored: model type or feature names differ; starting from zeros", file=sys.stderr)
+        return None, 0.0
+    print("Warm-starting IRLS from previous artifact weights", file=sys.stderr)
+    return np.asarray(artifact.model.weights, dtype=np.float64), float(artifact.model.intercept)
+
+
+def _calibrate_and_save(
+    args: argparse.Namespace,
+    *,
+    out_path: Path,
+    preprocess: PreprocessParams,
+    feature_names: list[str],
+    weights: np.ndarray,
+    intercept: float,
+    calib_frame: pd.DataFrame | None,
+    buckets: list[int],
+) -> int:
+    calib_season_start = int(args.calib_season_start) if args.calib_season_start is not None else None
+    use_interaction_terms = bool(args.use_interaction_terms)
+    model = ModelParams(
+        weights=[float(x) for x in weights.tolist()],
+        intercept=float(intercept),
+        l2_lambda=float(args.l2_lambda),
+        max_iter=int(args.max_iter),
+        tol=float(args.tol),
+    )
+
+    # Optional calibration on calibration season (Platt or Isotonic).
+    platt = None
+    isotonic = None
+    if not bool(args.disable_calibration) and calib_season_start is not None and calib_frame is not None and len(calib_frame) >= 5:
+        X_calib = _build_matrix(calib_frame, preprocess, use_interaction_terms)
+        # Base model probabilities (no calibration yet).
+        tmp_art = WinProbArtifact(
+            created_at_utc=utc_now_iso_compact(),
+            version=str(args.version),
+            train_season_start_max=int(args.train_season_start_max),
+            calib_season_start=calib_season_start,
+            test_season_start=int(args.test_season_start),
+            buckets_seconds_remaining=buckets,
+            preprocess=preprocess,
+            feature_names=feature_names,
+            model=model,
+            platt=None,
+            isotonic=None,
+        )
+        p_base = predict_proba(tmp_art, X=X_calib)
+        y_calib = (calib_frame["final_winning_team"].astype(int) == 0).astype(int).to_numpy(dtype=np.float64)
+
+        # Fit calibration based on method
+        if args.calibration_method == "isotonic":
+            isotonic = fit_isotonic_calibrator_on_probs(p_base=p_base, y=y_calib)
+        else:  # default to platt
+            platt = fit_platt_calibrator_on_probs(p_base=p_base, y=y_calib)
+
+    artifact = WinProbArtifact(
+        created_at_utc=utc_now_iso_compact(),
+        version=str(args.version),
+        train_season_start_max=int(args.train_season_start_max),
+        calib_season_start=(None if bool(args.disable_calibration) else calib_season_start),
+        test_season_start=int(args.test_season_start),
+        buckets_seconds_remaining=buckets,
+        preprocess=preprocess,
+        feature_names=feature_names,
+        model=model,
+        platt=platt,
+        isotonic=isotonic,
+    )
+
+    save_artifact(out_path, artifact)
+    # Reload roundtrip sanity.
+    _ = load_artifact(out_path)
+    print(f"Wrote {out_path}")
+    return 0
+
+
+@dataclass
+class _RunningMoments:
+    """Streaming mean / population std over NaN-skipped values (pairwise merge of per-chunk moments)."""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        v = np.asarray(values, dtype=np.float64)
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            return
+        n_b = len(v)
+        mean_b = float(v.mean())
+        m2_b = float(np.sum((v - mean_b) ** 2))
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / self.n)) if self.n else 0.0
+
+
+def _labeled_frames(entry_dir: Path, partitions: list[str], columns: list[str], batch_rows: int) -> Iterator[pd.DataFrame]:
+    for batch in iter_partition_batches(entry_dir, partitions, columns=columns, batch_rows=batch_rows):
+        frame = batch.to_pandas()
+        frame = frame[frame["final_winning_team"].notna()]
+        if len(frame):
+            yield frame
+
+
+def _streaming_preprocess(
+    entry_dir: Path, partitions: list[str], columns: list[str], *, use_interaction_terms: bool, batch_rows: int
+) -> tuple[PreprocessParams, int]:
+    """Pass 1: train-row standardization params (same definition as the in-memory path) and the labeled row count."""
+    moments = {c: _RunningMoments() for c in ("point_differential", "time_remaining_regulation")}
+    if use_interaction_terms:
+        moments.update({c: _RunningMoments() for c, _ in _INTERACTION_COLUMNS if c in columns})
+    rows = 0
+    for frame in _labeled_frames(entry_dir, partitions, columns, batch_rows):
+        rows += len(frame)
+        for column, m in moments.items():
+            m.update(frame[column].astype(float).to_numpy())
+
+    interaction_params = {}
+    for column, prefix in _INTERACTION_COLUMNS:
+        m = moments.get(column)
+        if m is not None and m.n > 0:
+            interaction_params[f"{prefix}_mean"] = m.mean
+            interaction_params[f"{prefix}_std"] = m.std or 1.0
+    pd_m = moments["point_differential"]
+    tr_m = moments["time_remaining_regulation"]
+    preprocess = PreprocessParams(
+        point_diff_mean=pd_m.mean,
+        point_diff_std=pd_m.std or 1.0,
+        time_rem_mean=tr_m.mean,
+        time_rem_std=tr_m.std or 1.0,
+        **interaction_params,
+    )
+    return preprocess, rows
+
+
+def _main_streaming(
+    args: argparse.Namespace,
+    *,
+    out_path: Path,
+    dsn: str,
+    calib_season_start: int | None,
+    warm_start: WinProbArtifact | None,
+) -> int:
+    """
+    Out-of-core training: the query result stays on disk as the feature cache's season partitions.
+
+    Pass 1 streams the train partitions for standardization params; pass 2 writes the float32 design matrix to a
+    memory-mapped .npy; each IRLS iteration then reads it back in --batch-rows chunks. Only the calibration season
+    is loaded as a frame. Memory is bounded by the chunk size, not the number of seasons.
+    """
+    if args.no_feature_cache:
+        raise SystemExit("--streaming reads from the feature cache; drop --no-feature-cache")
+    use_interaction_terms = bool(args.use_interaction_terms)
+    batch_rows = max(1, int(args.batch_rows))
+    with connect(dsn) as conn:
+        query = _training_query(use_interaction_terms)
+        entry_dir = ensure_cached(conn, query, name="train_winprob_logreg", cache_dir=args.feature_cache_dir, refresh=bool(args.refresh_feature_cache))
+
+    files = partition_files(entry_dir)
+    seasons = {int(v): f for v, f in files.items() if v.lstrip("-").isdigit()}
+    train_parts = [f for season, f in sorted(seasons.items()) if season <= int(args.train_season_start_max)]
+    import pyarrow.parquet as pq  # type: ignore
+
+    schema_cols = pq.ParquetFile(entry_dir / train_parts[0]).schema_arrow.names if train_parts else []
+    columns = [c for c in schema_cols if c in _BASE_COLUMNS or c == "period" or c in dict(_INTERACTION_COLUMNS)]
+    print(f"Streaming {len(train_parts)} train partitions from {entry_dir} in chunks of {batch_rows:,} rows", file=sys.stderr)
+
+    preprocess, train_rows = _streaming_preprocess(
+        entry_dir, train_parts, columns, use_interaction_terms=use_interaction_terms, batch_rows=batch_rows
+    )
+    min_train = max(5, int(args.min_train_rows))
+    if train_rows < min_train:
+        raise SystemExit(
+            f"\nERROR: Training set has < {min_train} rows after filtering (got {train_rows}).\n"
+            f"Available seasons: {', '.join(map(str, sorted(seasons)))}"
+        )
+    if int(args.test_season_start) not in seasons:
+        raise SystemExit(f"\nERROR: Test season ({args.test_season_start}) has 0 rows in canonical dataset.")
+
+    feature_names = _feature_names(columns, use_interaction_terms)
+    init_weights, init_intercept = _warm_start_params(warm_start, feature_names)
+
+    with tempfile.TemporaryDirectory(prefix="winprob_logreg_") as tmp:
+        X_mm = np.lib.format.open_memmap(Path(tmp) / "X.npy", mode="w+", dtype=np.float32, shape=(train_rows, len(feature_names)))
+        y_mm = np.lib.format.open_memmap(Path(tmp) / "y.npy", mode="w+", dtype=np.float32, shape=(train_rows,))
+        offset = 0
+        for frame in _labeled_frames(entry_dir, train_parts, columns, batch_rows):
+            n = len(frame)
+            X_mm[offset:offset + n] = _build_matrix(frame, preprocess, use_interaction_terms)
+            y_mm[offset:offset + n] = (frame["final_winning_team"].astype(int) == 0).to_numpy()
+            offset += n
+        X_mm.flush()
+        y_mm.flush()
+        print(f"Design matrix spilled to disk: {train_rows:,} x {len(feature_names)} float32", file=sys.stderr)
+
+        weights, intercept = fit_logistic_regression_irls_chunked(
+            chunks=lambda: ((X_mm[i:i + batch_rows], y_mm[i:i + batch_rows]) for i in range(0, train_rows, batch_rows)),
+            l2_lambda=float(args.l2_lambda),
+            max_iter=int(args.max_iter),
+            tol=float(args.tol),
+            init_weights=init_weights,
+            init_intercept=init_intercept,
+        )
+        del X_mm, y_mm
+
+    calib_frame = None
+    if calib_season_start is not None and calib_season_start in seasons:
+        calib_frame = read_partitioned(entry_dir, partitions=[seasons[calib_season_start]]).to_pandas()
+        calib_frame = calib_frame[calib_frame["final_winning_team"].notna()]
+    max_time = max(
+        (pq.read_table(entry_dir / f, columns=["time_remaining_regulation"]).column(0).to_pandas().max() for f in seasons.values()),
+        default=None,
+    )
+    return _calibrate_and_save(
+        args,
+        out_path=out_path,
+        preprocess=preprocess,
+        feature_names=feature_names,
+        weights=weights,
+        intercept=intercept,
+        calib_frame=calib_frame,
+        buckets=_calculate_buckets(pd.Series([] if max_time is None else [max_time], dtype=float), args.bucket_step_seconds),
+    )
 
 
 def main() -> int:
@@ -213,8 +518,12 @@ def main() -> int:
     out_path = Path(args.out_artifact)
     dsn = get_dsn(args.dsn)
 
-    # Load data from canonical dataset
     calib_season_start = int(args.calib_season_start) if args.calib_season_start is not None else None
+    warm_start = load_artifact(Path(args.warm_start_artifact)) if args.warm_start_artifact else None
+    if args.streaming:
+        return _main_streaming(args, out_path=out_path, dsn=dsn, calib_season_start=calib_season_start, warm_start=warm_start)
+
+    # Load data from canonical dataset
     with connect(dsn) as conn:
         df = _load_training_data(
             conn,
@@ -222,6 +531,8 @@ def main() -> int:
             test_season_start=int(args.test_season_start),
             calib_season_start=calib_season_start,
             use_interaction_terms=bool(args.use_interaction_terms),
+            cache_dir=None if args.no_feature_cache else args.feature_cache_dir,
+            refresh_cache=bool(args.refresh_feature_cache),
         )
 
     # Debug: Print available seasons and row counts BEFORE filtering
@@ -348,29 +659,10 @@ def main() -> int:
         **interaction_params
     )
 
-    # Build X for train
-    build_matrix_kwargs = {
-        "point_differential": df.loc[train_mask, "point_differential"].to_numpy(),
-        "time_remaining_regulation": df.loc[train_mask, "time_remaining_regulation"].to_numpy(),
-        "possession": df.loc[train_mask, "possession"].astype(str).tolist(),
-        "preprocess": preprocess,
-    }
-    
-    # Add interaction terms if enabled
-    if use_interaction_terms:
-        if "score_diff_div_sqrt_time_remaining" in df.columns:
-            build_matrix_kwargs["score_diff_div_sqrt_time_remaining"] = df.loc[train_mask, "score_diff_div_sqrt_time_remaining"].astype(float).to_numpy()
-        if "espn_home_prob" in df.columns:
-            build_matrix_kwargs["espn_home_prob"] = df.loc[train_mask, "espn_home_prob"].astype(float).to_numpy()
-        if "espn_home_prob_lag_1" in df.columns:
-            build_matrix_kwargs["espn_home_prob_lag_1"] = df.loc[train_mask, "espn_home_prob_lag_1"].astype(float).to_numpy()
-        if "espn_home_prob_delta_1" in df.columns:
-            build_matrix_kwargs["espn_home_prob_delta_1"] = df.loc[train_mask, "espn_home_prob_delta_1"].astype(float).to_numpy()
-        if "period" in df.columns:
-            build_matrix_kwargs["period"] = df.loc[train_mask, "period"].astype(int).tolist()
-    
-    X_train = build_design_matrix(**build_matrix_kwargs)
+    X_train = _build_matrix(df.loc[train_mask], preprocess, use_interaction_terms)
     y_train = y[train_mask]
+    feature_names = _feature_names(df.columns, use_interaction_terms)
+    init_weights, init_intercept = _warm_start_params(warm_start, feature_names)
 
     weights, intercept = fit_logistic_regression_irls(
         X=X_train,
@@ -378,113 +670,21 @@ def main() -> int:
         l2_lambda=float(args.l2_lambda),
         max_iter=int(args.max_iter),
         tol=float(args.tol),
+        init_weights=init_weights,
+        init_intercept=init_intercept,
     )
 
-    # Feature ordering by contract (base + optional interaction terms)
-    feature_names = [
-        "point_differential_scaled",
-        "time_remaining_regulation_scaled",
-        "possession_home",
-        "possession_away",
-        "possession_unknown",
-    ]
-    
-    # Add interaction term feature names if enabled
-    if use_interaction_terms:
-        if "score_diff_div_sqrt_time_remaining" in df.columns:
-            feature_names.append("score_diff_div_sqrt_time_remaining_scaled")
-        if "espn_home_prob" in df.columns:
-            feature_names.append("espn_home_prob_scaled")
-        if "espn_home_prob_lag_1" in df.columns:
-            feature_names.append("espn_home_prob_lag_1_scaled")
-        if "espn_home_prob_delta_1" in df.columns:
-            feature_names.append("espn_home_prob_delta_1_scaled")
-        if "period" in df.columns:
-            feature_names.extend(["period_1", "period_2", "period_3", "period_4"])
-
-    # Optional calibration on calibration season (Platt or Isotonic).
-    platt = None
-    isotonic = None
-    if not bool(args.disable_calibration) and calib_season_start is not None and int(np.sum(calib_mask)) >= 5:
-        calib_matrix_kwargs = {
-            "point_differential": df.loc[calib_mask, "point_differential"].to_numpy(),
-            "time_remaining_regulation": df.loc[calib_mask, "time_remaining_regulation"].to_numpy(),
-            "possession": df.loc[calib_mask, "possession"].astype(str).tolist(),
-            "preprocess": preprocess,
-        }
-        
-        # Add interaction terms for calibration if enabled
-        if use_interaction_terms:
-            if "score_diff_div_sqrt_time_remaining" in df.columns:
-                calib_matrix_kwargs["score_diff_div_sqrt_time_remaining"] = df.loc[calib_mask, "score_diff_div_sqrt_time_remaining"].astype(float).to_numpy()
-            if "espn_home_prob" in df.columns:
-                calib_matrix_kwargs["espn_home_prob"] = df.loc[calib_mask, "espn_home_prob"].astype(float).to_numpy()
-            if "espn_home_prob_lag_1" in df.columns:
-                calib_matrix_kwargs["espn_home_prob_lag_1"] = df.loc[calib_mask, "espn_home_prob_lag_1"].astype(float).to_numpy()
-            if "espn_home_prob_delta_1" in df.columns:
-                calib_matrix_kwargs["espn_home_prob_delta_1"] = df.loc[calib_mask, "espn_home_prob_delta_1"].astype(float).to_numpy()
-            if "period" in df.columns:
-                calib_matrix_kwargs["period"] = df.loc[calib_mask, "period"].astype(int).tolist()
-        
-        X_calib = build_design_matrix(**calib_matrix_kwargs)
-        # Base model probabilities (no calibration yet).
-        base_model = ModelParams(
-            weights=[float(x) for x in weights.tolist()],
-            intercept=float(intercept),
-            l2_lambda=float(args.l2_lambda),
-            max_iter=int(args.max_iter),
-            tol=float(args.tol),
-        )
-        tmp_art = WinProbArtifact(
-            created_at_utc=utc_now_iso_compact(),
-            version=str(args.version),
-            train_season_start_max=int(args.train_season_start_max),
-            calib_season_start=calib_season_start,
-            test_season_start=int(args.test_season_start),
-            buckets_seconds_remaining=_calculate_buckets(df["time_remaining_regulation"], args.bucket_step_seconds),
-            preprocess=preprocess,
-            feature_names=feature_names,
-            model=base_model,
-            platt=None,
-            isotonic=None,
-        )
-        p_base = predict_proba(tmp_art, X=X_calib)
-        y_calib = y[calib_mask]
-        
-        # Fit calibration based on method
-        if args.calibration_method == "isotonic":
-            isotonic = fit_isotonic_calibrator_on_probs(p_base=p_base, y=y_calib)
-        else:  # default to platt
-            platt = fit_platt_calibrator_on_probs(p_base=p_base, y=y_calib)
-
-    model = ModelParams(
-        weights=[float(x) for x in weights.tolist()],
-        intercept=float(intercept),
-        l2_lambda=float(args.l2_lambda),
-        max_iter=int(args.max_iter),
-        tol=float(args.tol),
-    )
-
-    artifact = WinProbArtifact(
-        created_at_utc=utc_now_iso_compact(),
-        version=str(args.version),
-        train_season_start_max=int(args.train_season_start_max),
-        calib_season_start=(None if bool(args.disable_calibration) else calib_season_start),
-        test_season_start=int(args.test_season_start),
-        buckets_seconds_remaining=_calculate_buckets(df["time_remaining_regulation"], args.bucket_step_seconds),
+    return _calibrate_and_save(
+        args,
+        out_path=out_path,
         preprocess=preprocess,
         feature_names=feature_names,
-        model=model,
-        platt=platt,
-        isotonic=isotonic,
+        weights=weights,
+        intercept=intercept,
+        calib_frame=df.loc[calib_mask],
+        buckets=_calculate_buckets(df["time_remaining_regulation"], args.bucket_step_seconds),
     )
 
-    save_artifact(out_path, artifact)
-    # Reload roundtrip sanity.
-    _ = load_artifact(out_path)
-    print(f"Wrote {out_path}")
-    return 0
-
 
 if __name__ == "__main__":
     raise SystemExit(main())
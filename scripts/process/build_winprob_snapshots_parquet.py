@@ -14,6 +14,10 @@ This ensures:
 - each game contributes exactly len(buckets) rows
 - selection is deterministic given fixed input ordering/contents
 
+Input is streamed in Arrow record batches (input must be ordered by game_id, as the exporter writes it);
+selection is one searchsorted per batch (scripts/lib/_winprob_stream_lib.py), so memory stays bounded by
+--batch-rows regardless of input size.
+
 Usage:
   ./.venv/bin/python scripts/build_winprob_snapshots_parquet.py \
     --in-parquet data/exports/winprob_modeling_events.parquet \
@@ -25,19 +29,25 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Any
+from typing import Iterator
 
-import numpy as np
 import pyarrow as pa
-import pyarrow.parquet as pq
+import pyarrow.compute as pc
 
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from scripts.lib._winprob_lib import utc_now_iso_compact
+from scripts.lib._winprob_stream_lib import (
+    EVENT_COLUMNS,
+    SNAPSHOT_SCHEMA,
+    iter_parquet_batches,
+    snapshot_batches,
+    write_batches,
+)
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Convert per-event winprob events to fixed time-bucket snapshots (Parquet).")
     p.add_argument("--in-parquet", required=True, help="Input events Parquet path.")
     p.add_argument("--out", required=True, help="Output snapshots Parquet path.")
@@ -57,7 +67,7 @@ def parse_args() -> argparse.Namespace:
         choices=["zstd", "snappy", "gzip", "brotli", "none"],
         help="Parquet compression codec (default: zstd).",
     )
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 def _parse_int_list_csv(s: str) -> list[int]:
@@ -82,95 +92,10 @@ def _default_buckets(*, max_s: int, min_s: int, step: int) -> list[int]:
     return out
 
 
-def _possession_text(side: int | None) -> str:
-    if side == 0:
-        return "home"
-    if side == 1:
-        return "away"
-    return "unknown"
-
-
-_OUT_SCHEMA = pa.schema(
-    [
-        pa.field("game_id", pa.string()),
-        pa.field("season_start", pa.int16()),
-        pa.field("bucket_seconds_remaining", pa.int32()),
-        pa.field("event_id", pa.int64()),
-        pa.field("point_differential", pa.int32()),
-        pa.field("time_remaining_regulation", pa.int32()),
-        pa.field("possession_side", pa.int8()),
-        pa.field("possession", pa.string()),
-        pa.field("final_winning_team", pa.int8()),
-    ]
-)
-
-
-def _pick_snapshot_indices(
-    *,
-    event_ids: np.ndarray,
-    time_remaining: np.ndarray,
-    buckets: list[int],
-) -> list[int]:
-    # For each bucket, compute argmin of abs diff with event_id tie-break.
-    # Uses vectorized computation per bucket; game sizes are small enough for this to be fast.
-    idxs: list[int] = []
-    for b in buckets:
-        dist = np.abs(time_remaining - int(b))
-        min_dist = int(np.min(dist))
-        candidates = np.where(dist == min_dist)[0]
-        if len(candidates) == 1:
-            idxs.append(int(candidates[0]))
-            continue
-        # tie-break by maximum event_id
-        best = int(candidates[np.argmax(event_ids[candidates])])
-        idxs.append(best)
-    return idxs
-
-
-def _rows_for_game(
-    *,
-    game_id: str,
-    season_start: int,
-    event_id: np.ndarray,
-    point_differential: np.ndarray,
-    time_remaining: np.ndarray,
-    possession_side: np.ndarray,
-    final_winning_team: np.ndarray,
-    buckets: list[int],
-) -> pa.RecordBatch:
-    idxs = _pick_snapshot_indices(event_ids=event_id, time_remaining=time_remaining, buckets=buckets)
-
-    out_game_id = [game_id] * len(buckets)
-    out_season = [int(season_start)] * len(buckets)
-    out_bucket = [int(b) for b in buckets]
-
-    out_event = [int(event_id[i]) for i in idxs]
-    out_pd = [int(point_differential[i]) for i in idxs]
-    out_tr = [int(time_remaining[i]) for i in idxs]
-    out_ps = [None if possession_side[i] < -0.5 else int(possession_side[i]) for i in idxs]
-    out_pos = [_possession_text(None if possession_side[i] < -0.5 else int(possession_side[i])) for i in idxs]
-    out_y = [None if final_winning_team[i] < -0.5 else int(final_winning_team[i]) for i in idxs]
-
-    arrays: list[pa.Array] = [
-        pa.array(out_game_id, type=pa.string()),
-        pa.array(out_season, type=pa.int16()),
-        pa.array(out_bucket, type=pa.int32()),
-        pa.array(out_event, type=pa.int64()),
-        pa.array(out_pd, type=pa.int32()),
-        pa.array(out_tr, type=pa.int32()),
-        pa.array(out_ps, type=pa.int8()),
-        pa.array(out_pos, type=pa.string()),
-        pa.array(out_y, type=pa.int8()),
-    ]
-    return pa.RecordBatch.from_arrays(arrays, schema=_OUT_SCHEMA)
-
-
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     in_path = Path(args.in_parquet)
     out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
 
     manifest_path = Path(args.manifest_out) if args.manifest_out else out_path.with_suffix(out_path.suffix + ".manifest.json")
 
@@ -183,66 +108,6 @@ def main() -> int:
 
     compression = None if args.compression == "none" else args.compression
 
-    # Input columns
-    cols = [
-        "game_id",
-        "event_id",
-        "season_start",
-        "point_differential",
-        "time_remaining_regulation",
-        "possession_side",
-        "final_winning_team",
-    ]
-
-    pf = pq.ParquetFile(in_path)
-    writer = pq.ParquetWriter(tmp_path, _OUT_SCHEMA, compression=compression)
-
-    # Streaming group-by-game buffer.
-    cur_game_id: str | None = None
-    buf: dict[str, list[Any]] = {k: [] for k in cols}
-
-    def flush_one_game() -> tuple[int, int, int, int]:
-        # returns (rows_out, games_out, null_possession_count_in_selected, null_label_count_in_selected)
-        nonlocal cur_game_id, buf
-        if cur_game_id is None:
-            return (0, 0, 0, 0)
-        n = len(buf["event_id"])
-        if n <= 0:
-            cur_game_id = None
-            buf = {k: [] for k in cols}
-            return (0, 0, 0, 0)
-
-        season_start = int(buf["season_start"][0])
-        event_id = np.asarray(buf["event_id"], dtype=np.int64)
-        point_diff = np.asarray(buf["point_differential"], dtype=np.int32)
-        time_rem = np.asarray(buf["time_remaining_regulation"], dtype=np.int32)
-
-        # Nullable smallints: convert None -> -1 sentinel for internal arrays.
-        poss = np.asarray([(-1 if v is None else int(v)) for v in buf["possession_side"]], dtype=np.int16)
-        y = np.asarray([(-1 if v is None else int(v)) for v in buf["final_winning_team"]], dtype=np.int16)
-
-        batch = _rows_for_game(
-            game_id=str(cur_game_id),
-            season_start=season_start,
-            event_id=event_id,
-            point_differential=point_diff,
-            time_remaining=time_rem,
-            possession_side=poss,
-            final_winning_team=y,
-            buckets=buckets,
-        )
-        writer.write_batch(batch)
-
-        # Null accounting for the selected rows only
-        ps_selected = batch.column("possession_side").to_pylist()
-        y_selected = batch.column("final_winning_team").to_pylist()
-        null_poss = sum(1 for v in ps_selected if v is None)
-        null_y = sum(1 for v in y_selected if v is None)
-
-        cur_game_id = None
-        buf = {k: [] for k in cols}
-        return (batch.num_rows, 1, int(null_poss), int(null_y))
-
     rows_out = 0
     games_out = 0
     null_poss_selected = 0
@@ -250,41 +115,24 @@ def main() -> int:
     min_season = None
     max_season = None
 
-    try:
-        for rb in pf.iter_batches(batch_size=int(args.batch_rows), columns=cols):
-            # Convert to python lists for grouping; batch sizes are large, but per-row operations are simple.
-            data = rb.to_pydict()
-            gids = data["game_id"]
-            for i in range(len(gids)):
-                gid = str(gids[i])
-                if cur_game_id is None:
-                    cur_game_id = gid
-                if gid != cur_game_id:
-                    ro, go, np0, ny0 = flush_one_game()
-                    rows_out += ro
-                    games_out += go
-                    null_poss_selected += np0
-                    null_y_selected += ny0
-                    cur_game_id = gid
-
-                for k in cols:
-                    buf[k].append(data[k][i])
-
-                ss = int(data["season_start"][i])
-                if min_season is None or ss < min_season:
-                    min_season = ss
-                if max_season is None or ss > max_season:
-                    max_season = ss
-
-        ro, go, np0, ny0 = flush_one_game()
-        rows_out += ro
-        games_out += go
-        null_poss_selected += np0
-        null_y_selected += ny0
-    finally:
-        writer.close()
-
-    tmp_path.replace(out_path)
+    def with_stats(batches: Iterator[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+        nonlocal rows_out, games_out, null_poss_selected, null_y_selected, min_season, max_season
+        for batch in batches:
+            if batch.num_rows == 0:
+                continue
+            rows_out += batch.num_rows
+            games_out += batch.num_rows // len(buckets)
+            # Null accounting for the selected rows only
+            null_poss_selected += batch.column("possession_side").null_count
+            null_y_selected += batch.column("final_winning_team").null_count
+            mm = pc.min_max(batch.column("season_start"))
+            lo, hi = mm["min"].as_py(), mm["max"].as_py()
+            min_season = lo if min_season is None else min(min_season, lo)
+            max_season = hi if max_season is None else max(max_season, hi)
+            yield batch
+
+    events = iter_parquet_batches(in_path, columns=EVENT_COLUMNS, batch_rows=int(args.batch_rows))
+    write_batches(out_path, with_stats(snapshot_batches(events, buckets)), SNAPSHOT_SCHEMA, compression=compression)
 
     manifest = {
         "created_at_utc": utc_now_iso_compact(),
@@ -296,7 +144,7 @@ def main() -> int:
             "path": str(out_path),
             "format": "parquet",
             "compression": (args.compression if args.compression != "none" else None),
-            "schema": [f.name for f in _OUT_SCHEMA],
+            "schema": [f.name for f in SNAPSHOT_SCHEMA],
         },
         "buckets": {
             "anchors_seconds_remaining": buckets,
@@ -9,7 +9,15 @@ Writes into:
   )
 
 Source files:
-  data/raw/espn/probabilities/{season_label}/event_{event_id}_comp_{competition_id}.json
+  data/raw/espn/probabilities/{season_label}/event_{event_id}_comp_{competition_id}.json (or .json.zst)
+
+Incremental by default: espn.prob_event_state_watermarks records the last sequence_number / lastModified
+processed per game, so reruns skip unchanged games and append only new snapshots (including for games still
+in progress). A game is rewritten in full only on first materialization over pre-existing rows or when
+overtime changes max_period (which shifts time_remaining for every earlier row). The lowest touched
+sequence_number is recorded in features_dirty_from_seq for scripts/process/refresh_snapshot_features.py.
+Snapshots whose play can't be resolved hold the watermark below them for at most MAX_UNRESOLVED_ATTEMPTS runs
+without new snapshots (retried per play); the game-level plays collection is refetched only when the tail grew.
 
 This script fetches ESPN play payloads referenced by the probabilities file and caches them locally:
   data/raw/espn/plays/{season_label}/play_{play_id}.json (+ manifest)
@@ -21,6 +29,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
 import re
@@ -34,11 +43,39 @@ import psycopg
 
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from scripts.lib._db_lib import get_dsn
-from scripts.lib._fetch_lib import HttpRetry, http_get_bytes, parse_json_bytes, utc_now_iso_compact, write_with_manifest
-
+from scripts.lib._async_fetch_lib import AsyncFetcher, FetchJob, FetchResult, HostRateLimiter
+from scripts.lib._db_lib import connect, get_dsn
+from scripts.lib._fetch_lib import (
+    HttpRetry,
+    parse_json_bytes,
+    read_archive_bytes,
+    utc_now_iso_compact,
+    write_with_manifest,
+)
+
+
+PROB_FILE_RE = re.compile(r"^event_(?P<event>\d+)_comp_(?P<comp>\d+)\.json(\.zst)?$")
+
+
+WATERMARK_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS espn.prob_event_state_watermarks (
+  game_id                  TEXT PRIMARY KEY,
+  season_label             TEXT NOT NULL,
+  max_sequence_number      INTEGER NOT NULL,
+  last_modified_utc        TIMESTAMPTZ,
+  max_period               INTEGER NOT NULL,
+  final_home_score         INTEGER,
+  final_away_score         INTEGER,
+  row_count                INTEGER NOT NULL,
+  features_dirty_from_seq  INTEGER,
+  updated_at               TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+ALTER TABLE espn.prob_event_state_watermarks ADD COLUMN IF NOT EXISTS seen_max_sequence_number INTEGER;
+ALTER TABLE espn.prob_event_state_watermarks ADD COLUMN IF NOT EXISTS unresolved_attempts INTEGER NOT NULL DEFAULT 0;
+"""
 
-PROB_FILE_RE = re.compile(r"^event_(?P<event>\d+)_comp_(?P<comp>\d+)\.json$")
+# Runs (without new snapshots) a game's unresolvable plays may hold its watermark before they are skipped for good.
+MAX_UNRESOLVED_ATTEMPTS = 3
 
 
 @dataclass(frozen=True)
@@ -46,6 +83,17 @@ class ProbRow:
     play_ref: str
     play_id: int
     sequence_number: int
+    last_modified: str | None = None
+
+
+@dataclass(frozen=True)
+class GameWatermark:
+    max_sequence_number: int
+    max_period: int
+    final_home_score: int | None
+    final_away_score: int | None
+    seen_max_sequence_number: int | None = None  # Newest snapshot in the file last run, even if the watermark was held
+    unresolved_attempts: int = 0  # Consecutive runs that ended with plays unresolved
 
 
 def _to_int(x: Any) -> int | None:
@@ -159,7 +207,17 @@ def _infer_possession_side_from_play(
 def _iter_prob_files(prob_dir: Path) -> list[Path]:
     if not prob_dir.exists():
         return []
-    out = [p for p in sorted(prob_dir.iterdir()) if p.is_file() and p.name.endswith(".json") and PROB_FILE_RE.match(p.name)]
+    out: list[Path] = []
+    seen: set[str] = set()
+    for p in sorted(prob_dir.iterdir()):
+        m = PROB_FILE_RE.match(p.name)
+        if not (p.is_file() and m):
+            continue
+        # Plain .json sorts before .json.zst, so it wins if both archive formats exist.
+        if m.group("comp") in seen:
+            continue
+        seen.add(m.group("comp"))
+        out.append(p)
     return out
 
 
@@ -170,7 +228,7 @@ def _load_prob_rows(prob_path: Path) -> tuple[str, str, int | None, int | None,
     espn_event_id = m.group("event")
     espn_competition_id = m.group("comp")
 
-    obj = json.loads(prob_path.read_text(encoding="utf-8"))
+    obj = json.loads(read_archive_bytes(prob_path).decode("utf-8"))
     if not isinstance(obj, dict):
         raise RuntimeError("probabilities file must be a JSON object")
     items = obj.get("items")
@@ -205,11 +263,13 @@ def _load_prob_rows(prob_path: Path) -> tuple[str, str, int | None, int | None,
         if play_id is None or seq is None:
             continue
 
+        last_modified = it.get("lastModified")
         rows.append(
             ProbRow(
                 play_ref=str(play_ref),
                 play_id=int(play_id),
                 sequence_number=int(seq),
+                last_modified=str(last_modified) if last_modified else None,
             )
         )
 
@@ -238,7 +298,7 @@ def _fetch_game_plays_cached(
     espn_event_id: str,
     espn_competition_id: str,
     plays_dir: Path,
-    retry: HttpRetry,
+    fetcher: AsyncFetcher,
     overwrite: bool,
     fetched_at: str,
 ) -> list[dict[str, Any]]:
@@ -254,7 +314,7 @@ def _fetch_game_plays_cached(
     if (not overwrite) and out_path.exists() and manifest_path.exists():
         obj = json.loads(out_path.read_text(encoding="utf-8"))
     else:
-        status, resp_headers, body = http_get_bytes(url, retry=retry, allow_non_200=True)
+        status, resp_headers, body = fetcher.get_blocking(url, allow_non_200=True)
         if status != 200:
             ct = str(resp_headers.get("content-type") or "").replace("\\", "\\\\").replace('"', '\\"')
             raise RuntimeError(f"HTTP {status} content_type={ct} body_prefix={_safe_prefix(body)} url={url}")
@@ -278,22 +338,25 @@ def _fetch_game_plays_cached(
     return plays
 
 
-def _fetch_play_cached(play_ref: str, *, plays_dir: Path, retry: HttpRetry, overwrite: bool, fetched_at: str) -> dict[str, Any]:
-    play_id = _extract_play_id_from_ref(play_ref)
-    if play_id is None:
-        raise RuntimeError(f"Could not parse play id from ref: {play_ref}")
+def _play_cache_path(plays_dir: Path, play_id: int) -> Path:
+    return plays_dir / f"play_{play_id}.json"
 
-    out_path = plays_dir / f"play_{play_id}.json"
-    manifest_path = out_path.with_suffix(out_path.suffix + ".manifest.json")
 
-    if (not overwrite) and out_path.exists() and manifest_path.exists():
+def _read_play_cached(play_id: int, *, plays_dir: Path) -> dict[str, Any] | None:
+    out_path = _play_cache_path(plays_dir, play_id)
+    manifest_path = out_path.with_suffix(out_path.suffix + ".manifest.json")
+    if out_path.exists() and manifest_path.exists():
         return json.loads(out_path.read_text(encoding="utf-8"))
+    return None
 
-    status, resp_headers, body = http_get_bytes(play_ref, retry=retry, allow_non_200=True)
+
+def _store_play(play_id: int, play_ref: str, *, plays_dir: Path, status: int, resp_headers: dict[str, str], body: bytes, fetched_at: str) -> dict[str, Any]:
     if status != 200:
         ct = str(resp_headers.get("content-type") or "").replace("\\", "\\\\").replace('"', '\\"')
         raise RuntimeError(f"HTTP {status} content_type={ct} body_prefix={_safe_prefix(body)} ref={play_ref}")
 
+    out_path = _play_cache_path(plays_dir, play_id)
+    manifest_path = out_path.with_suffix(out_path.suffix + ".manifest.json")
     obj = parse_json_bytes(body)
     write_with_manifest(
         out_path,
@@ -309,6 +372,54 @@ def _fetch_play_cached(play_ref: str, *, plays_dir: Path, retry: HttpRetry, over
     return obj
 
 
+def _fetch_plays_concurrently(
+    missing: list[ProbRow],
+    *,
+    plays_dir: Path,
+    fetcher: AsyncFetcher,
+    overwrite: bool,
+    fetched_at: str,
+    on_result: Any = None,
+) -> dict[int, dict[str, Any]]:
+    """
+    Resolve play refs that the game-level collection did not include.
+
+    Cached payloads are read from disk; the rest are fetched concurrently through the run's shared
+    AsyncFetcher (one session pool and token bucket per host for every game), so throughput is bounded
+    by --requests-per-second rather than per-request latency.
+    """
+    out: dict[int, dict[str, Any]] = {}
+    jobs: list[FetchJob] = []
+    refs: dict[str, ProbRow] = {}
+    for r in missing:
+        cached = None if overwrite else _read_play_cached(r.play_id, plays_dir=plays_dir)
+        if cached is not None:
+            out[r.play_id] = cached
+            continue
+        key = str(r.play_id)
+        if key not in refs:
+            refs[key] = r
+            jobs.append(FetchJob(key=key, url=r.play_ref))
+    if not jobs:
+        return out
+
+    def handle(job: FetchJob, status: int, resp_headers: dict[str, str], body: bytes) -> dict[str, Any]:
+        r = refs[job.key]
+        return _store_play(
+            r.play_id, r.play_ref, plays_dir=plays_dir, status=status, resp_headers=resp_headers, body=body, fetched_at=fetched_at
+        )
+
+    results: list[FetchResult] = asyncio.run(fetcher.map(jobs, handle, allow_non_200=True, on_result=on_result))
+    errors = [res for res in results if res.status == "error"]
+    if errors:
+        # Left unresolved: the caller holds the watermark below them for a bounded number of retries.
+        print(f"[espn_materialize] failed to fetch {len(errors)}/{len(jobs)} plays; first: key={errors[0].key} err={errors[0].error}", flush=True)
+    for res in results:
+        if res.status == "ok":
+            out[int(res.key)] = res.value
+    return out
+
+
 def _seconds_remaining_game(period: int, clock_seconds: int, max_period: int) -> int | None:
     if period <= 0 or clock_seconds < 0 or max_period <= 0:
         return None
@@ -332,7 +443,205 @@ def _winning_side(home_score: int | None, away_score: int | None) -> int | None:
     return None
 
 
-def parse_args() -> argparse.Namespace:
+def _index_game_plays(game_plays: list[dict[str, Any]]) -> tuple[dict[int, dict[str, Any]], int, int | None, int | None]:
+    """Index a plays collection by play id; also return max period and the score on the last play."""
+    plays_by_id: dict[int, dict[str, Any]] = {}
+    max_period = 0
+    final_home = None
+    final_away = None
+    max_seq_all = -1
+    for p in game_plays:
+        pid = _to_int(p.get("id"))
+        if pid is None:
+            continue
+        plays_by_id[int(pid)] = p
+        per = p.get("period", {})
+        per_num = _to_int(per.get("number") if isinstance(per, dict) else None) or 0
+        if per_num > max_period:
+            max_period = per_num
+        seq = _to_int(p.get("sequenceNumber")) or -1
+        if seq > max_seq_all:
+            max_seq_all = seq
+            final_home = _to_int(p.get("homeScore"))
+            final_away = _to_int(p.get("awayScore"))
+    return plays_by_id, max_period, final_home, final_away
+
+
+def _is_up_to_date(prob_rows: list[ProbRow], watermark: GameWatermark | None) -> bool:
+    return watermark is not None and bool(prob_rows) and max(r.sequence_number for r in prob_rows) <= watermark.max_sequence_number
+
+
+def _tail_grew(prob_rows: list[ProbRow], watermark: GameWatermark | None) -> bool:
+    """Whether the probabilities file has snapshots newer than any seen on the last run (always true the first time)."""
+    if watermark is None or watermark.seen_max_sequence_number is None:
+        return True
+    return max(r.sequence_number for r in prob_rows) > watermark.seen_max_sequence_number
+
+
+def _unresolved_attempts(watermark: GameWatermark | None, *, tail_grew: bool, unresolved: list[ProbRow]) -> int:
+    """Consecutive runs ending with unresolved plays, this one included; new snapshots start the count over."""
+    if not unresolved:
+        return 0
+    prior = 0 if watermark is None or tail_grew else watermark.unresolved_attempts
+    return prior + 1
+
+
+def _watermark_sequence(prob_rows: list[ProbRow], unresolved: list[ProbRow], *, attempts: int = 1) -> int:
+    """
+    Highest sequence_number the watermark may record: just below the first snapshot whose play could not be
+    resolved, so the next run retries it (rows already written are skipped by event_id) instead of the
+    watermark short-circuit dropping it for good. After MAX_UNRESOLVED_ATTEMPTS such runs the plays are given
+    up on and the watermark moves to the newest snapshot, so a finished game is not retried forever.
+    """
+    if unresolved and attempts < MAX_UNRESOLVED_ATTEMPTS:
+        return min(r.sequence_number for r in unresolved) - 1
+    return max(r.sequence_number for r in prob_rows)
+
+
+def _plan_game_write(
+    prob_rows: list[ProbRow],
+    *,
+    existing_event_ids: set[int],
+    watermark: GameWatermark | None,
+    max_period: int,
+) -> tuple[str, list[ProbRow]]:
+    """
+    Decide how to bring one game's espn.prob_event_state rows up to date.
+
+    Returns ("noop", []), ("append", new_rows) or ("rewrite", all_rows). A rewrite is needed when rows
+    exist without a watermark (materialized before watermarks were tracked) or when max_period moved,
+    since time_remaining for every earlier row is computed against the game's final period count.
+    """
+    new_rows = [r for r in prob_rows if r.play_id not in existing_event_ids]
+    if not new_rows:
+        return "noop", []
+    if existing_event_ids and (watermark is None or watermark.max_period != max_period):
+        return "rewrite", list(prob_rows)
+    return "append", new_rows
+
+
+def _build_state_row(
+    r: ProbRow,
+    play_obj: dict[str, Any],
+    *,
+    game_id: str,
+    max_period: int,
+    final_winner: int | None,
+    home_team_id: int | None,
+    away_team_id: int | None,
+) -> tuple[Any, ...]:
+    home_score = _to_int(play_obj.get("homeScore"))
+    away_score = _to_int(play_obj.get("awayScore"))
+    point_diff = (home_score or 0) - (away_score or 0)
+
+    p = play_obj.get("period", {})
+    period_num = _to_int(p.get("number") if isinstance(p, dict) else None)
+
+    clock = play_obj.get("clock", {})
+    clock_val = _to_float(clock.get("value") if isinstance(clock, dict) else None)
+    clock_seconds = int(round(clock_val)) if clock_val is not None else None
+
+    time_remaining = (
+        _seconds_remaining_game(int(period_num or 0), int(clock_seconds or 0), int(max_period or 0))
+        if period_num is not None and clock_seconds is not None
+        else None
+    )
+
+    possession_side = _infer_possession_side_from_play(
+        play_obj,
+        home_team_id=home_team_id,
+        away_team_id=away_team_id,
+    )
+
+    return (
+        game_id,  # game_id (ESPN competition id)
+        int(r.play_id),  # event_id (ESPN play id)
+        int(point_diff),
+        time_remaining,
+        home_score,
+        away_score,
+        _winning_side(home_score, away_score),
+        final_winner,
+        possession_side,
+    )
+
+
+def _load_watermark(conn: psycopg.Connection, game_id: str) -> GameWatermark | None:
+    row = conn.execute(
+        """
+        SELECT max_sequence_number, max_period, final_home_score, final_away_score,
+               seen_max_sequence_number, unresolved_attempts
+        FROM espn.prob_event_state_watermarks WHERE game_id=%s;
+        """,
+        (game_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    return GameWatermark(int(row[0]), int(row[1]), row[2], row[3], row[4], int(row[5] or 0))
+
+
+def _upsert_watermark(
+    cur: psycopg.Cursor,
+    *,
+    game_id: str,
+    season_label: str,
+    prob_rows: list[ProbRow],
+    max_sequence_number: int,
+    max_period: int,
+    final_home: int | None,
+    final_away: int | None,
+    dirty_from_seq: int | None,
+    unresolved_attempts: int,
+) -> None:
+    last_modified = max((r.last_modified for r in prob_rows if r.last_modified), default=None)
+    cur.execute(
+        """
+        INSERT INTO espn.prob_event_state_watermarks (
+          game_id, season_label, max_sequence_number, last_modified_utc, max_period,
+          final_home_score, final_away_score, row_count, features_dirty_from_seq,
+          seen_max_sequence_number, unresolved_attempts, updated_at
+        )
+        VALUES (
+          %s, %s, %s, %s::timestamptz, %s,
+          %s, %s, (SELECT count(*) FROM espn.prob_event_state WHERE game_id=%s), %s,
+          %s, %s, now()
+        )
+        ON CONFLICT (game_id) DO UPDATE SET
+          season_label = EXCLUDED.season_label,
+          max_sequence_number = EXCLUDED.max_sequence_number,
+          last_modified_utc = EXCLUDED.last_modified_utc,
+          max_period = EXCLUDED.max_period,
+          final_home_score = EXCLUDED.final_home_score,
+          final_away_score = EXCLUDED.final_away_score,
+          row_count = EXCLUDED.row_count,
+          features_dirty_from_seq = CASE
+            WHEN EXCLUDED.features_dirty_from_seq IS NULL THEN espn.prob_event_state_watermarks.features_dirty_from_seq
+            ELSE LEAST(
+              COALESCE(espn.prob_event_state_watermarks.features_dirty_from_seq, EXCLUDED.features_dirty_from_seq),
+              EXCLUDED.features_dirty_from_seq
+            )
+          END,
+          seen_max_sequence_number = EXCLUDED.seen_max_sequence_number,
+          unresolved_attempts = EXCLUDED.unresolved_attempts,
+          updated_at = now();
+        """,
+        (
+            game_id,
+            season_label,
+            max_sequence_number,
+            last_modified,
+            int(max_period),
+            final_home,
+            final_away,
+            game_id,
+            dirty_from_seq,
+            max(r.sequence_number for r in prob_rows),
+            unresolved_attempts,
+        ),
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Populate espn.prob_event_state from ESPN probabilities + plays.")
     p.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres DSN (or set DATABASE_URL).")
     p.add_argument("--season-label", default="2024-25", help="Season label used in data/raw/espn/* subdirs.")
@@ -343,9 +652,19 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Re-fetch cached play payloads (and game-level plays collections) even if cached.",
     )
-    p.add_argument("--overwrite-db", action="store_true", help="Delete+reinsert for competitions already present.")
+    p.add_argument(
+        "--overwrite-db",
+        action="store_true",
+        help="Delete+reinsert every competition, ignoring watermarks (default: append only new snapshots).",
+    )
     p.add_argument("--limit-games", type=int, default=0, help="Limit number of competition files processed (0=no limit).")
-    p.add_argument("--throttle-seconds", type=float, default=0.1, help="Sleep between ESPN play fetches (best-effort).")
+    p.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=10.0,
+        help="Rate limit for ESPN play fetches (token bucket, shared across workers). 0 disables.",
+    )
+    p.add_argument("--concurrency", type=int, default=8, help="Max concurrent ESPN play fetches.")
     p.add_argument(
         "--heartbeat-seconds",
         type=float,
@@ -365,11 +684,11 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--max-backoff-seconds", type=float, default=60.0)
     p.add_argument("--jitter-seconds", type=float, default=0.25)
     p.add_argument("--verbose", action="store_true")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     dsn = get_dsn(args.dsn)
 
     season = str(args.season_label)
@@ -395,11 +714,16 @@ def main() -> int:
 
     total_rows = 0
     total_games = 0
+    skipped_games = 0
     last_heartbeat = time.monotonic()
 
     print(f"[espn_materialize] start season={season} prob_dir={prob_dir} plays_dir={plays_dir} files={len(prob_files)}", flush=True)
 
-    with psycopg.connect(dsn) as conn:
+    # One fetcher for the whole run: every game shares its keep-alive sessions and per-host token bucket.
+    limiter = HostRateLimiter(float(args.requests_per_second or 0.0))
+    with connect(dsn) as conn, AsyncFetcher(retry=retry, limiter=limiter, concurrency=int(args.concurrency)) as fetcher:
+        conn.execute(WATERMARK_TABLE_SQL)
+        conn.commit()
         for i, prob_path in enumerate(prob_files, start=1):
             espn_event_id, espn_comp_id, home_team_id, away_team_id, prob_rows = _load_prob_rows(prob_path)
             if not prob_rows:
@@ -407,135 +731,150 @@ def main() -> int:
                     print(f"[{i}/{len(prob_files)}] {prob_path.name}: no usable items[]", flush=True)
                 continue
 
-            print(f"[{i}/{len(prob_files)}] comp={espn_comp_id} plays_in_prob={len(prob_rows)}", flush=True)
-
-            # Check if game already exists
-            already = conn.execute(
-                "SELECT 1 FROM espn.prob_event_state WHERE game_id=%s LIMIT 1;",
-                (espn_comp_id,),
-            ).fetchone()
-            
-            if already:
-                if not args.overwrite_db:
-                    if args.verbose:
-                        print(f"[{i}/{len(prob_files)}] {prob_path.name}: already materialized (skip)", flush=True)
-                    continue
-                else:
-                    print(f"[{i}/{len(prob_files)}] comp={espn_comp_id}: game exists, will overwrite", flush=True)
-            else:
-                print(f"[{i}/{len(prob_files)}] comp={espn_comp_id}: new game, will insert", flush=True)
+            watermark = None if args.overwrite_db else _load_watermark(conn, espn_comp_id)
+            if _is_up_to_date(prob_rows, watermark):
+                skipped_games += 1
+                if args.verbose:
+                    print(f"[{i}/{len(prob_files)}] {prob_path.name}: up to date at seq={watermark.max_sequence_number} (skip)", flush=True)
+                continue
+
+            existing_event_ids: set[int] = set()
+            if not args.overwrite_db:
+                existing_event_ids = {
+                    int(r[0])
+                    for r in conn.execute("SELECT event_id FROM espn.prob_event_state WHERE game_id=%s;", (espn_comp_id,)).fetchall()
+                }
+            print(
+                f"[{i}/{len(prob_files)}] comp={espn_comp_id} plays_in_prob={len(prob_rows)} "
+                f"existing={len(existing_event_ids)} watermark_seq={watermark.max_sequence_number if watermark else None}",
+                flush=True,
+            )
 
             # Fetch game-level plays collection once and index by play_id
             game_plays = _fetch_game_plays_cached(
                 espn_event_id=espn_event_id,
                 espn_competition_id=espn_comp_id,
                 plays_dir=plays_dir,
-                retry=retry,
+                fetcher=fetcher,
                 overwrite=bool(args.overwrite_plays),
                 fetched_at=fetched_at,
             )
-            plays_by_id: dict[int, dict[str, Any]] = {}
-            max_period = 0
-            final_home = None
-            final_away = None
-            max_seq_all = -1
-            for p in game_plays:
-                pid = _to_int(p.get("id"))
-                if pid is None:
-                    continue
-                plays_by_id[int(pid)] = p
-                per = p.get("period", {})
-                per_num = _to_int(per.get("number") if isinstance(per, dict) else None) or 0
-                if per_num > max_period:
-                    max_period = per_num
-                seq = _to_int(p.get("sequenceNumber")) or -1
-                if seq > max_seq_all:
-                    max_seq_all = seq
-                    final_home = _to_int(p.get("homeScore"))
-                    final_away = _to_int(p.get("awayScore"))
+            plays_by_id, max_period, final_home, final_away = _index_game_plays(game_plays)
+
+            # An in-progress game's cached collection is stale once new snapshots arrive: refresh it before
+            # falling back to per-play fetches. Only when the snapshot tail grew since the last run (plays held
+            # back by an unresolved play are retried per play) and not for plays already in the per-play cache.
+            tail_grew = _tail_grew(prob_rows, watermark)
+            if not args.overwrite_plays and tail_grew and any(
+                r.play_id not in plays_by_id and _read_play_cached(r.play_id, plays_dir=plays_dir) is None
+                for r in prob_rows
+                if r.play_id not in existing_event_ids
+            ):
+                game_plays = _fetch_game_plays_cached(
+                    espn_event_id=espn_event_id,
+                    espn_competition_id=espn_comp_id,
+                    plays_dir=plays_dir,
+                    fetcher=fetcher,
+                    overwrite=True,
+                    fetched_at=fetched_at,
+                )
+                plays_by_id, max_period, final_home, final_away = _index_game_plays(game_plays)
+
+            mode, rows_to_write = _plan_game_write(
+                prob_rows, existing_event_ids=existing_event_ids, watermark=watermark, max_period=max_period
+            )
+            if args.overwrite_db:
+                mode, rows_to_write = "rewrite", list(prob_rows)
 
             # Fallback: ensure we can resolve plays referenced in probabilities (rarely missing)
-            missing = [r for r in prob_rows if r.play_id not in plays_by_id]
+            missing = [r for r in rows_to_write if r.play_id not in plays_by_id]
             if missing:
                 print(f"[{i}/{len(prob_files)}] comp={espn_comp_id} missing_plays={len(missing)} (fallback fetch)", flush=True)
-            for j, r in enumerate(missing, start=1):
+            fetched_count = 0
+
+            def _on_play_result(res: FetchResult) -> None:
+                nonlocal fetched_count, last_heartbeat
+                fetched_count += 1
                 now = time.monotonic()
                 if args.heartbeat_seconds and args.heartbeat_seconds > 0 and (now - last_heartbeat) >= args.heartbeat_seconds:
                     print(
                         f"[espn_materialize] heartbeat file={i}/{len(prob_files)} comp={espn_comp_id} "
-                        f"fetched_missing={j-1}/{len(missing)} total_rows={total_rows}",
+                        f"fetched_missing={fetched_count}/{len(missing)} total_rows={total_rows}",
                         flush=True,
                     )
                     last_heartbeat = now
-                if args.play_progress_every and args.play_progress_every > 0 and (j % int(args.play_progress_every) == 0):
-                    print(f"[{i}/{len(prob_files)}] comp={espn_comp_id} fetched_missing={j}/{len(missing)}", flush=True)
+                if args.play_progress_every and args.play_progress_every > 0 and (fetched_count % int(args.play_progress_every) == 0):
+                    print(f"[{i}/{len(prob_files)}] comp={espn_comp_id} fetched_missing={fetched_count}/{len(missing)}", flush=True)
 
-                play_obj = _fetch_play_cached(
-                    r.play_ref,
-                    plays_dir=plays_dir,
-                    retry=retry,
-                    overwrite=bool(args.overwrite_plays),
-                    fetched_at=fetched_at,
+            if missing:
+                plays_by_id.update(
+                    _fetch_plays_concurrently(
+                        missing,
+                        plays_dir=plays_dir,
+                        fetcher=fetcher,
+                        overwrite=bool(args.overwrite_plays),
+                        fetched_at=fetched_at,
+                        on_result=_on_play_result,
+                    )
                 )
-                plays_by_id[r.play_id] = play_obj
-
-                # Throttle only when we actually perform a network fetch.
-                if args.throttle_seconds and args.throttle_seconds > 0:
-                    time.sleep(args.throttle_seconds)
 
             final_winner = _winning_side(final_home, final_away)
 
             rows_to_insert: list[tuple[Any, ...]] = []
-            for r in prob_rows:
+            unresolved: list[ProbRow] = []
+            for r in rows_to_write:
                 play_obj = plays_by_id.get(r.play_id)
                 if not isinstance(play_obj, dict):
+                    unresolved.append(r)
                     continue
-                home_score = _to_int(play_obj.get("homeScore"))
-                away_score = _to_int(play_obj.get("awayScore"))
-                point_diff = (home_score or 0) - (away_score or 0)
-
-                p = play_obj.get("period", {})
-                period_num = _to_int(p.get("number") if isinstance(p, dict) else None)
-
-                clock = play_obj.get("clock", {})
-                clock_val = _to_float(clock.get("value") if isinstance(clock, dict) else None)
-                clock_seconds = int(round(clock_val)) if clock_val is not None else None
-
-                time_remaining = (
-                    _seconds_remaining_game(int(period_num or 0), int(clock_seconds or 0), int(max_period or 0))
-                    if period_num is not None and clock_seconds is not None
-                    else None
+                rows_to_insert.append(
+                    _build_state_row(
+                        r,
+                        play_obj,
+                        game_id=espn_comp_id,
+                        max_period=max_period,
+                        final_winner=final_winner,
+                        home_team_id=home_team_id,
+                        away_team_id=away_team_id,
+                    )
                 )
 
-                current_winner = _winning_side(home_score, away_score)
-
-                possession_side = _infer_possession_side_from_play(
-                    play_obj,
-                    home_team_id=home_team_id,
-                    away_team_id=away_team_id,
+            attempts = _unresolved_attempts(watermark, tail_grew=tail_grew, unresolved=unresolved)
+            watermark_seq = _watermark_sequence(prob_rows, unresolved, attempts=attempts)
+            if unresolved:
+                held = (
+                    f"watermark held at seq={watermark_seq}, attempt {attempts}/{MAX_UNRESOLVED_ATTEMPTS}"
+                    if attempts < MAX_UNRESOLVED_ATTEMPTS
+                    else f"skipped after {attempts} attempts"
                 )
-
-                rows_to_insert.append(
-                    (
-                        espn_comp_id,  # game_id (ESPN competition id)
-                        int(r.play_id),  # event_id (ESPN play id)
-                        int(point_diff),
-                        time_remaining,
-                        home_score,
-                        away_score,
-                        current_winner,
-                        final_winner,
-                        possession_side,
-                    )
+                print(
+                    f"[{i}/{len(prob_files)}] comp={espn_comp_id} unresolved_plays={len(unresolved)} "
+                    f"first_seq={min(r.sequence_number for r in unresolved)} "
+                    f"play_ids={sorted(r.play_id for r in unresolved)[:10]} ({held})",
+                    flush=True,
                 )
 
+            if mode == "rewrite":
+                dirty_from_seq = min(r.sequence_number for r in prob_rows)
+            elif rows_to_write:
+                dirty_from_seq = min(r.sequence_number for r in rows_to_write)
+            else:
+                dirty_from_seq = None
+
             with conn.transaction():
                 with conn.cursor() as cur:
-                    # Only delete if game exists and we're overwriting
-                    if already and args.overwrite_db:
+                    if mode == "rewrite":
                         cur.execute("DELETE FROM espn.prob_event_state WHERE game_id=%s;", (espn_comp_id,))
-                    
-                    # Insert new rows (for new games or after deletion for overwrites)
+                    elif existing_event_ids:
+                        # The last play's score moves while a game is in progress; keep earlier rows' label in step.
+                        cur.execute(
+                            """
+                            UPDATE espn.prob_event_state SET final_winning_team=%s
+                            WHERE game_id=%s AND final_winning_team IS DISTINCT FROM %s;
+                            """,
+                            (final_winner, espn_comp_id, final_winner),
+                        )
+
                     if rows_to_insert:
                         cur.executemany(
                             """
@@ -551,15 +890,32 @@ def main() -> int:
                             rows_to_insert,
                         )
 
+                    _upsert_watermark(
+                        cur,
+                        game_id=espn_comp_id,
+                        season_label=season,
+                        prob_rows=prob_rows,
+                        max_sequence_number=watermark_seq,
+                        max_period=max_period,
+                        final_home=final_home,
+                        final_away=final_away,
+                        dirty_from_seq=dirty_from_seq,
+                        unresolved_attempts=attempts,
+                    )
+
             total_rows += len(rows_to_insert)
             total_games += 1
-            print(f"[{i}/{len(prob_files)}] materialized comp={espn_comp_id} rows={len(rows_to_insert)} final={final_home}-{final_away}")
+            print(
+                f"[{i}/{len(prob_files)}] materialized comp={espn_comp_id} mode={mode} rows={len(rows_to_insert)} "
+                f"final={final_home}-{final_away}"
+            )
 
-    print(f"Done. competitions={total_games} rows={total_rows} prob_dir={prob_dir} plays_dir={plays_dir}")
+    print(
+        f"Done. competitions={total_games} up_to_date={skipped_games} rows={total_rows} "
+        f"prob_dir={prob_dir} plays_dir={plays_dir}"
+    )
     return 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
-
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Bring derived.snapshot_features_v1 up to date for the games whose ESPN or Kalshi inputs changed.
+
+Dirty games come from espn.prob_event_state_watermarks.features_dirty_from_seq (the lowest sequence_number
+written since the last refresh). The ESPN materializer marks the snapshots it writes; the Kalshi loaders mark
+whole games (from_seq -1) through mark_games_dirty_for_tickers / mark_games_dirty_for_market_snapshot, since
+new candles or a new market mapping move the game's Kalshi window and so any of its aligned prices.
+Two storage modes, detected from pg_class:
+
+  materialized view (as built from cursor-files/docs/most-up-to-date-material-view.md):
+    Postgres can only refresh it whole, so this runs REFRESH MATERIALIZED VIEW CONCURRENTLY, and only
+    when at least one game is dirty.
+
+  table (after a one-time --convert-to-table):
+    The view definition is kept as derived.snapshot_features_v1_source and only each dirty game's tail
+    (sequence_number >= features_dirty_from_seq) is deleted and re-inserted from it. LAG/delta features are
+    windowed over the whole game inside the source view, so espn_home_prob_lag_1 on the first tail row still
+    sees the last untouched snapshot; rows before the tail are never rewritten.
+
+Dirty marks are cleared compare-and-set on updated_at, so a game re-marked while a refresh runs stays dirty.
+
+Usage:
+  python scripts/process/refresh_snapshot_features.py --dsn "$DATABASE_URL"
+  python scripts/process/refresh_snapshot_features.py --convert-to-table
+  python scripts/process/refresh_snapshot_features.py --game-id 401704907   # force a full-game recompute
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Iterable
+
+import psycopg
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from scripts.lib._db_lib import connect, get_dsn
+from scripts.process.materialize_espn_prob_event_state import WATERMARK_TABLE_SQL
+
+
+FEATURES_RELATION = "derived.snapshot_features_v1"
+SOURCE_VIEW = "derived.snapshot_features_v1_source"
+
+# features_dirty_from_seq for a Kalshi-side change (and --game-id): recompute the game from its first snapshot.
+WHOLE_GAME_FROM_SEQ = -1
+
+# Same indexes the materialized view carries (unique key is what REFRESH ... CONCURRENTLY relies on).
+TABLE_INDEX_SQL = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_snapshot_features_v1_pkey "
+    "ON derived.snapshot_features_v1(season_label, game_id, sequence_number, snapshot_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_snapshot_features_v1_game ON derived.snapshot_features_v1(game_id, sequence_number)",
+    "CREATE INDEX IF NOT EXISTS idx_snapshot_features_v1_season_game ON derived.snapshot_features_v1(season_label, game_id)",
+)
+
+
+def _relkind(conn: psycopg.Connection) -> str | None:
+    row = conn.execute(
+        """
+        SELECT c.relkind
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'derived' AND c.relname = 'snapshot_features_v1';
+        """
+    ).fetchone()
+    return str(row[0]) if row else None
+
+
+def convert_to_table(conn: psycopg.Connection) -> None:
+    """Swap the materialized view for a table with the same rows/indexes, keeping its query as SOURCE_VIEW."""
+    viewdef = conn.execute("SELECT pg_get_viewdef(%s::regclass, true);", (FEATURES_RELATION,)).fetchone()[0]
+    viewdef = str(viewdef).strip().rstrip(";")
+    with conn.transaction():
+        conn.execute(f"CREATE OR REPLACE VIEW {SOURCE_VIEW} AS {viewdef}")
+        conn.execute(f"CREATE TABLE derived.snapshot_features_v1__table AS SELECT * FROM {FEATURES_RELATION}")
+        # No CASCADE: fail loudly rather than silently dropping dependents.
+        conn.execute(f"DROP MATERIALIZED VIEW {FEATURES_RELATION}")
+        conn.execute("ALTER TABLE derived.snapshot_features_v1__table RENAME TO snapshot_features_v1")
+        for sql in TABLE_INDEX_SQL:
+            conn.execute(sql)
+
+
+_MARK_GAMES_DIRTY_SQL = """
+UPDATE espn.prob_event_state_watermarks w
+SET features_dirty_from_seq = %s, updated_at = now()
+WHERE w.game_id IN ({games});
+"""
+
+
+def mark_games_dirty_for_tickers(conn: Any, tickers: Iterable[str]) -> int:
+    """
+    Mark every ESPN game mapped (kalshi.markets.espn_event_id) to one of `tickers` for a full recompute.
+    Runs in the caller's transaction. Returns the number of games marked.
+
+    Games without a watermark row yet are left alone: the materializer marks them when it first writes them.
+    updated_at is always bumped, so a refresh already running against the old mark will not clear this one.
+    """
+    tickers = sorted({t for t in tickers if t})
+    if not tickers:
+        return 0
+    conn.execute(WATERMARK_TABLE_SQL)
+    games = "SELECT DISTINCT km.espn_event_id::text FROM kalshi.markets km WHERE km.ticker = ANY(%s) AND km.espn_event_id IS NOT NULL"
+    return int(conn.execute(_MARK_GAMES_DIRTY_SQL.format(games=games), (WHOLE_GAME_FROM_SEQ, tickers)).rowcount or 0)
+
+
+def mark_games_dirty_for_market_snapshot(conn: Any, snapshot_id: int) -> int:
+    """
+    Mark the games whose Kalshi market mapping first appears in markets snapshot `snapshot_id` (a ticker newly
+    matched to the game), so a game mapped after its ESPN rows were materialized gets feature rows.
+    Tickers already mapped the same way in an earlier snapshot are not re-marked. Returns the number of games marked.
+    """
+    conn.execute(WATERMARK_TABLE_SQL)
+    games = """
+        SELECT DISTINCT km.espn_event_id::text
+        FROM kalshi.markets km
+        WHERE km.snapshot_id = %s
+          AND km.espn_event_id IS NOT NULL
+          AND NOT EXISTS (
+            SELECT 1 FROM kalshi.markets prev
+            WHERE prev.ticker = km.ticker AND prev.snapshot_id <> km.snapshot_id AND prev.espn_event_id = km.espn_event_id
+          )
+    """
+    return int(conn.execute(_MARK_GAMES_DIRTY_SQL.format(games=games), (WHOLE_GAME_FROM_SEQ, snapshot_id)).rowcount or 0)
+
+
+def _dirty_games(conn: psycopg.Connection, forced: list[str]) -> list[tuple[str, int, Any]]:
+    """Return (game_id, from_seq, updated_at) for games whose features are behind prob_event_state."""
+    rows = conn.execute(
+        """
+        SELECT game_id, features_dirty_from_seq, updated_at
+        FROM espn.prob_event_state_watermarks
+        WHERE features_dirty_from_seq IS NOT NULL
+        ORDER BY game_id;
+        """
+    ).fetchall()
+    out = {str(r[0]): (str(r[0]), int(r[1]), r[2]) for r in rows}
+    for game_id in forced:
+        prev = out.get(game_id)
+        out[game_id] = (game_id, WHOLE_GAME_FROM_SEQ, prev[2] if prev else None)
+    return sorted(out.values())
+
+
+def _refresh_tail(conn: psycopg.Connection, dirty: list[tuple[str, int, Any]]) -> int:
+    game_ids = [g for g, _, _ in dirty]
+    from_seqs = [s for _, s, _ in dirty]
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                DELETE FROM {FEATURES_RELATION} f
+                USING unnest(%s::text[], %s::int[]) AS d(game_id, from_seq)
+                WHERE f.game_id = d.game_id AND f.sequence_number >= d.from_seq;
+                """,
+                (game_ids, from_seqs),
+            )
+            cur.execute(
+                f"""
+                INSERT INTO {FEATURES_RELATION}
+                SELECT s.*
+                FROM {SOURCE_VIEW} s
+                JOIN unnest(%s::text[], %s::int[]) AS d(game_id, from_seq)
+                  ON s.game_id = d.game_id AND s.sequence_number >= d.from_seq;
+                """,
+                (game_ids, from_seqs),
+            )
+            return int(cur.rowcount or 0)
+
+
+def _clear_dirty(conn: psycopg.Connection, dirty: list[tuple[str, int, Any]]) -> None:
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.executemany(
+                """
+                UPDATE espn.prob_event_state_watermarks
+                SET features_dirty_from_seq = NULL
+                WHERE game_id = %s AND updated_at = %s;
+                """,
+                [(g, updated_at) for g, _, updated_at in dirty if updated_at is not None],
+            )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Incrementally refresh derived.snapshot_features_v1 for changed games.")
+    p.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres DSN (or set DATABASE_URL).")
+    p.add_argument(
+        "--convert-to-table",
+        action="store_true",
+        help="One-time: replace the materialized view with a table so refreshes can rewrite only the dirty tail.",
+    )
+    p.add_argument(
+        "--game-id",
+        action="append",
+        default=[],
+        help="Recompute this game from its first snapshot even if it is not marked dirty (repeatable).",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    dsn = get_dsn(args.dsn)
+
+    with connect(dsn) as conn:
+        kind = _relkind(conn)
+        if kind is None:
+            raise SystemExit(f"{FEATURES_RELATION} does not exist; create it first (see cursor-files/docs/most-up-to-date-material-view.md)")
+        if args.convert_to_table:
+            if kind != "m":
+                print(f"[snapshot_features] {FEATURES_RELATION} is already a table (relkind={kind})", flush=True)
+            else:
+                t0 = time.monotonic()
+                convert_to_table(conn)
+                print(f"[snapshot_features] converted {FEATURES_RELATION} to a table in {time.monotonic() - t0:.1f}s", flush=True)
+            kind = "r"
+
+        conn.execute(WATERMARK_TABLE_SQL)
+        conn.commit()
+        dirty = _dirty_games(conn, [str(g) for g in args.game_id])
+        if not dirty:
+            print("[snapshot_features] no dirty games; nothing to refresh", flush=True)
+            return 0
+
+        t0 = time.monotonic()
+        if kind == "m":
+            conn.commit()
+            conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {FEATURES_RELATION};")
+            conn.commit()
+            print(f"[snapshot_features] full refresh (materialized view) games_dirty={len(dirty)} in {time.monotonic() - t0:.1f}s", flush=True)
+        else:
+            inserted = _refresh_tail(conn, dirty)
+            print(f"[snapshot_features] tail refresh games={len(dirty)} rows={inserted} in {time.monotonic() - t0:.1f}s", flush=True)
+        _clear_dirty(conn, dirty)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -45,7 +45,8 @@ from scripts.lib._db_lib import get_dsn, connect
 from scripts.trade.simulate_trading_strategy import get_aligned_data, simulate_trading_strategy
 
 # Import model loading
-from scripts.lib._winprob_lib import load_artifact, WinProbArtifact
+from scripts.lib._model_registry_lib import get_registry
+from scripts.lib._winprob_lib import WinProbArtifact
 
 # Import cache utilities for shared caching with webapp
 try:
@@ -138,7 +139,8 @@ def load_model_artifact(model_name: Optional[str], verbose: bool = False) -> Opt
                    'catboost_odds_no_interaction_platt', 'catboost_odds_no_interaction_isotonic',
                    'catboost_baseline_platt_v2', 'catboost_baseline_isotonic_v2', 'catboost_odds_platt_v2', 'catboost_odds_isotonic_v2',
                    'catboost_baseline_no_interaction_platt_v2', 'catboost_baseline_no_interaction_isotonic_v2',
-                   'catboost_odds_no_interaction_platt_v2', 'catboost_odds_no_interaction_isotonic_v2') or None
+                   'catboost_odds_no_interaction_platt_v2', 'catboost_odds_no_interaction_isotonic_v2'; see MODEL_FILES in
+                   scripts/lib/_model_registry_lib.py, which also indexes artifact file stems under data/models and artifacts/) or None
         verbose: Whether to log model loading timing
     
     Returns:
@@ -153,44 +155,14 @@ def load_model_artifact(model_name: Optional[str], verbose: bool = False) -> Opt
     
     load_start = time.time()
     
-    model_file_map = {
-        # "logreg_platt": "data/models/winprob_logreg_platt_2017-2023.json",
-        # "logreg_isotonic": "data/models/winprob_logreg_isotonic_2017-2023.json",
-        # "catboost_platt": "data/models/winprob_catboost_platt_2017-2023.json",
-        # "catboost_isotonic": "data/models/winprob_catboost_isotonic_2017-2023.json",
-        # Pre-game odds integration models (baseline and odds, each with platt and isotonic calibration) - v1 (moved to v1/)
-        "catboost_baseline_platt": "artifacts/v1/winprob_catboost_baseline_platt.json",
-        "catboost_baseline_isotonic": "artifacts/v1/winprob_catboost_baseline_isotonic.json",
-        "catboost_odds_platt": "artifacts/v1/winprob_catboost_odds_platt.json",
-        "catboost_odds_isotonic": "artifacts/v1/winprob_catboost_odds_isotonic.json",
-        # No-interaction models (baseline and odds, each with platt and isotonic calibration) - v1 (moved to v1/)
-        "catboost_baseline_no_interaction_platt": "artifacts/v1/winprob_catboost_baseline_no_interaction_platt.json",
-        "catboost_baseline_no_interaction_isotonic": "artifacts/v1/winprob_catboost_baseline_no_interaction_isotonic.json",
-        "catboost_odds_no_interaction_platt": "artifacts/v1/winprob_catboost_odds_no_interaction_platt.json",
-        "catboost_odds_no_interaction_isotonic": "artifacts/v1/winprob_catboost_odds_no_interaction_isotonic.json",
-        # v2 models (with updated feature set and uses_opening_odds_baseline flag)
-        "catboost_baseline_platt_v2": "artifacts/winprob_catboost_baseline_platt_v2.json",
-        "catboost_baseline_isotonic_v2": "artifacts/winprob_catboost_baseline_isotonic_v2.json",
-        "catboost_odds_platt_v2": "artifacts/winprob_catboost_odds_platt_v2.json",
-        "catboost_odds_isotonic_v2": "artifacts/winprob_catboost_odds_isotonic_v2.json",
-        "catboost_baseline_no_interaction_platt_v2": "artifacts/winprob_catboost_baseline_no_interaction_platt_v2.json",
-        "catboost_baseline_no_interaction_isotonic_v2": "artifacts/winprob_catboost_baseline_no_interaction_isotonic_v2.json",
-        "catboost_odds_no_interaction_platt_v2": "artifacts/winprob_catboost_odds_no_interaction_platt_v2.json",
-        "catboost_odds_no_interaction_isotonic_v2": "artifacts/winprob_catboost_odds_no_interaction_isotonic_v2.json",
-    }
-    
-    if model_name not in model_file_map:
-        raise ValueError(f"Unknown model name: {model_name}. Valid options: {list(model_file_map.keys())}")
-    
-    model_path = Path(model_file_map[model_name])
-    if not model_path.exists():
-        raise FileNotFoundError(f"Model file not found: {model_path}")
-    
-    artifact = load_artifact(model_path)
+    # Process-wide registry: parsed once per artifact file version, not once per call
+    registry = get_registry()
+    model_path = registry.path(model_name)  # ValueError for unknown names
+    artifact = registry.get(model_name)  # FileNotFoundError if the file is missing
     load_elapsed = time.time() - load_start
     
     if verbose:
-        logger.debug(f"[MODEL] Loaded {model_name} in {load_elapsed:.2f}s from {model_path}")
+        logger.debug(f"[MODEL] Got {model_name} in {load_elapsed:.2f}s from {model_path}")
     
     # Model validation warnings
     if artifact:
@@ -23,6 +23,11 @@ Usage:
     --bucket-seconds-remaining 2880 \
     --book-id 4 \
     --out data/exports/winprob_with_odds_20251214.parquet
+
+Snapshots are streamed in Arrow record batches and filtered to the bucket and the odds file's games before
+scoring. With --events-parquet instead of --snapshots-parquet, the snapshot step runs in the same process for
+just those games and that bucket, and --paper-trades-jsonl appends the paper-trade decisions too, so the
+daily snapshot -> join -> paper-trade chain runs in one process in constant memory.
 """
 
 from __future__ import annotations
@@ -32,21 +37,35 @@ import json
 from pathlib import Path
 from typing import Any
 
-import numpy as np
-import pandas as pd
 import pyarrow as pa
-import pyarrow.parquet as pq
 
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from scripts.lib._winprob_lib import build_design_matrix, load_artifact, predict_proba, utc_now_iso_compact
-
-
-def parse_args() -> argparse.Namespace:
+from scripts.lib._inference_lib import compile_artifact
+from scripts.lib._winprob_lib import load_artifact, utc_now_iso_compact
+from scripts.lib._winprob_stream_lib import (
+    EVENT_COLUMNS,
+    JOINED_SCHEMA,
+    SNAPSHOT_JOIN_COLUMNS,
+    filter_games,
+    iter_parquet_batches,
+    join_odds_batches,
+    paper_trade_decisions,
+    snapshot_batches,
+    write_batches,
+)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Join winprob model outputs to odds snapshot and compute edge.")
     p.add_argument("--artifact", required=True, help="Winprob artifact JSON path.")
-    p.add_argument("--snapshots-parquet", required=True, help="Snapshots Parquet path.")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--snapshots-parquet", help="Snapshots Parquet path.")
+    src.add_argument(
+        "--events-parquet",
+        help="Modeling events Parquet path; builds the bucket snapshot for the odds file's games on the fly (no snapshots file).",
+    )
     p.add_argument("--odds-file", required=True, help="odds_todaysGames JSON path.")
     p.add_argument("--bucket-seconds-remaining", type=int, default=2880, help="Snapshot bucket to score (default: 2880).")
     p.add_argument("--market-group", default="regular", help='Market group_name (default: "regular").')
@@ -54,7 +73,14 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--book-id", default="", help="Optional book id to select (string). If empty, choose first book with both outcomes.")
     p.add_argument("--out", required=True, help="Output Parquet path.")
     p.add_argument("--manifest-out", default="", help="Manifest JSON path (default: <out>.manifest.json).")
-    return p.parse_args()
+    p.add_argument("--batch-rows", type=int, default=250_000, help="Arrow read batch size (default: 250000).")
+    p.add_argument(
+        "--paper-trades-jsonl",
+        default="",
+        help="If set, also append paper-trade decisions (as scripts/trade/paper_trade_winprob.py) to this JSONL path.",
+    )
+    p.add_argument("--min-edge", type=float, default=0.02, help="Paper-trade minimum edge (default: 0.02).")
+    return p.parse_args(argv)
 
 
 def _to_float(x: Any) -> float | None:
@@ -109,99 +135,56 @@ def _extract_2way_odds_for_game(game_obj: dict[str, Any], *, market_group: str,
     return None
 
 
-def main() -> int:
-    args = parse_args()
+def odds_by_game(games: list[Any], *, market_group: str, market_name: str, book_id: str) -> dict[str, dict[str, Any]]:
+    """game_id -> selected 2-way odds, for games in the odds feed that have them (first entry per game wins)."""
+    out: dict[str, dict[str, Any]] = {}
+    for g in games:
+        if not isinstance(g, dict):
+            continue
+        gid = str(g.get("gameId") or "")
+        if not gid or gid in out:
+            continue
+        odds = _extract_2way_odds_for_game(g, market_group=market_group, market_name=market_name, book_id=book_id)
+        if odds is not None:
+            out[gid] = odds
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     art = load_artifact(Path(args.artifact))
     odds_obj = json.loads(Path(args.odds_file).read_text(encoding="utf-8"))
     games = odds_obj.get("games")
     if not isinstance(games, list):
         raise SystemExit("odds file missing top-level games[]")
-
-    # Load snapshots and filter to the requested bucket.
-    bucket = int(args.bucket_seconds_remaining)
-    pf = pq.ParquetFile(Path(args.snapshots_parquet))
-    tab = pf.read(
-        columns=[
-            "game_id",
-            "bucket_seconds_remaining",
-            "point_differential",
-            "time_remaining_regulation",
-            "possession",
-            "final_winning_team",
-            "season_start",
-        ]
+    odds = odds_by_game(
+        games, market_group=str(args.market_group), market_name=str(args.market_name), book_id=str(args.book_id or "")
     )
-    df = tab.to_pandas()
-    df = df[df["bucket_seconds_remaining"].astype(int) == bucket].copy()
-    df["game_id"] = df["game_id"].astype(str)
-    df_by_gid = {gid: row for gid, row in df.set_index("game_id").iterrows()}
 
-    out_rows: list[dict[str, Any]] = []
-    for g in games:
-        if not isinstance(g, dict):
-            continue
-        gid = str(g.get("gameId") or "")
-        if not gid:
-            continue
-        snap = df_by_gid.get(gid)
-        if snap is None:
-            continue
-        odds = _extract_2way_odds_for_game(
-            g, market_group=str(args.market_group), market_name=str(args.market_name), book_id=str(args.book_id or "")
-        )
-        if odds is None:
-            continue
-
-        X = build_design_matrix(
-            point_differential=np.array([float(snap["point_differential"])], dtype=np.float64),
-            time_remaining_regulation=np.array([float(snap["time_remaining_regulation"])], dtype=np.float64),
-            possession=[str(snap["possession"])],
-            preprocess=art.preprocess,
-        )
-        p_home = float(predict_proba(art, X=X)[0])
-        p_away = 1.0 - p_home
-
-        home_dec = float(odds["home_odds_dec"])
-        away_dec = float(odds["away_odds_dec"])
-        imp_home_raw = 1.0 / home_dec
-        imp_away_raw = 1.0 / away_dec
-        s = imp_home_raw + imp_away_raw
-        imp_home = imp_home_raw / s if s > 0 else None
-        imp_away = imp_away_raw / s if s > 0 else None
-
-        out_rows.append(
-            {
-                "game_id": gid,
-                "bucket_seconds_remaining": bucket,
-                "point_differential": int(snap["point_differential"]),
-                "time_remaining_regulation": int(snap["time_remaining_regulation"]),
-                "possession": str(snap["possession"]),
-                "season_start": int(snap["season_start"]),
-                "model_p_home": p_home,
-                "model_p_away": p_away,
-                "book_id": str(odds["book_id"]),
-                "book_name": odds.get("book_name"),
-                "odds_home_dec": home_dec,
-                "odds_away_dec": away_dec,
-                "implied_home_raw": imp_home_raw,
-                "implied_away_raw": imp_away_raw,
-                "implied_home": imp_home,
-                "implied_away": imp_away,
-                "edge_home": (None if imp_home is None else p_home - imp_home),
-                "edge_away": (None if imp_away is None else p_away - imp_away),
-            }
+    bucket = int(args.bucket_seconds_remaining)
+    if args.events_parquet:
+        # Chained mode: today's games' events -> snapshot at this bucket only, without a snapshots file.
+        events = iter_parquet_batches(Path(args.events_parquet), columns=EVENT_COLUMNS, batch_rows=int(args.batch_rows))
+        snapshots = snapshot_batches(filter_games(events, odds), [bucket])
+        source = {"events_parquet": str(Path(args.events_parquet))}
+    else:
+        snapshots = iter_parquet_batches(
+            Path(args.snapshots_parquet), columns=SNAPSHOT_JOIN_COLUMNS, batch_rows=int(args.batch_rows)
         )
+        source = {"snapshots_parquet": str(Path(args.snapshots_parquet))}
 
-    out_df = pd.DataFrame(out_rows)
+    # One row per game with odds: small enough to keep for the optional paper-trade pass.
+    joined = pa.Table.from_batches(
+        list(join_odds_batches(snapshots, model=compile_artifact(art), odds=odds, bucket=bucket)), schema=JOINED_SCHEMA
+    )
     out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    pq.write_table(pa.Table.from_pandas(out_df, preserve_index=False), out_path, compression="zstd")
+    write_batches(out_path, joined.to_batches(), JOINED_SCHEMA, compression="zstd")
 
     manifest_path = Path(args.manifest_out) if args.manifest_out else out_path.with_suffix(out_path.suffix + ".manifest.json")
     manifest = {
         "created_at_utc": utc_now_iso_compact(),
         "artifact": {"path": str(Path(args.artifact))},
-        "inputs": {"snapshots_parquet": str(Path(args.snapshots_parquet)), "odds_file": str(Path(args.odds_file))},
+        "inputs": {**source, "odds_file": str(Path(args.odds_file))},
         "join_policy": {
             "key": "game_id",
             "bucket_seconds_remaining": bucket,
@@ -209,15 +192,26 @@ def main() -> int:
             "market_name": str(args.market_name),
             "book_id": (None if not args.book_id else str(args.book_id)),
         },
-        "output": {"path": str(out_path), "rows": int(len(out_df))},
+        "output": {"path": str(out_path), "rows": int(joined.num_rows)},
         "notes": [
             "Implied probabilities are computed from decimal odds and normalized to remove the 2-way overround.",
             "This join uses a fixed snapshot bucket and does not perform timestamp-as-of alignment.",
         ],
     }
     manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=False) + "\n", encoding="utf-8")
-    print(f"Wrote {out_path} rows={len(out_df)}")
+    print(f"Wrote {out_path} rows={joined.num_rows}")
     print(f"Wrote {manifest_path}")
+
+    if args.paper_trades_jsonl:
+        trades_path = Path(args.paper_trades_jsonl)
+        trades_path.parent.mkdir(parents=True, exist_ok=True)
+        decisions = list(paper_trade_decisions(joined.sort_by("game_id").to_batches(), min_edge=float(args.min_edge)))
+        # Append-only write
+        with trades_path.open("a", encoding="utf-8") as f:
+            for d in decisions:
+                f.write(json.dumps(d, sort_keys=False) + "\n")
+        n_bets = sum(1 for d in decisions if d["decision"]["action"] == "bet")
+        print(f"Wrote {trades_path} decisions={len(decisions)} bets={n_bets}")
     return 0
 
 
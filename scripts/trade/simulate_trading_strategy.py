@@ -28,7 +28,9 @@ import numpy as np
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from scripts.lib._db_lib import get_dsn, connect
-from scripts.lib._winprob_lib import WinProbArtifact, build_design_matrix, predict_proba
+from scripts.lib._inference_lib import compile_artifact
+from scripts.lib._odds_features_lib import broadcast_opening_odds, load_opening_odds_features
+from scripts.lib._winprob_lib import WinProbArtifact
 
 # Set up logger - use same logger as webapp for consistency
 try:
@@ -84,6 +86,60 @@ class SimulationState:
             self.trades = []
 
 
+def _apply_model_probabilities(
+    game_id: str,
+    model_artifact: WinProbArtifact,
+    aligned_data: list[dict[str, Any]],
+    pending: list[tuple[int, dict[str, Any]]],
+    opening_odds: dict[str, tuple[float, ...]] | None = None,
+) -> None:
+    """
+    Score rows without a pre-computed probability in one CompiledModel batch and write the results into
+    aligned_data[i]["espn_prob"]. Rows keep the ESPN probability if scoring fails or returns a value outside [0, 1].
+
+    Missing optional inputs use the same defaults as precompute: score_diff/sqrt(time+1) from its components,
+    lag = current ESPN prob, delta 0, period 1. Opening-odds features are the game's row from the per-game
+    feature store, broadcast to every snapshot (NaN when the game has none).
+    """
+    rows = [features for _, features in pending]
+
+    def column(name: str) -> np.ndarray:
+        return np.array([np.nan if r.get(name) is None else float(r[name]) for r in rows], dtype=np.float64)
+
+    score_diff = column("score_diff")
+    time_remaining = column("time_remaining")
+    espn_home_prob = column("espn_home_prob")
+    score_diff_div_sqrt = column("score_diff_div_sqrt_time_remaining")
+    score_diff_div_sqrt = np.where(np.isnan(score_diff_div_sqrt), score_diff / np.sqrt(time_remaining + 1), score_diff_div_sqrt)
+    lag_1 = column("espn_home_prob_lag_1")
+    odds = broadcast_opening_odds([game_id] * len(rows), opening_odds or {})
+    inputs = {
+        "point_differential": score_diff,
+        "time_remaining_regulation": time_remaining,
+        "possession": np.full(len(rows), "unknown"),  # Canonical dataset doesn't have possession
+        "score_diff_div_sqrt_time_remaining": score_diff_div_sqrt,
+        "espn_home_prob": espn_home_prob,
+        "espn_home_prob_lag_1": np.where(np.isnan(lag_1), espn_home_prob, lag_1),
+        "espn_home_prob_delta_1": np.nan_to_num(column("espn_home_prob_delta_1"), nan=0.0),
+        "period": np.nan_to_num(column("period"), nan=1.0),
+        "opening_overround": odds["opening_overround"],
+        "opening_prob_home_fair": odds["opening_prob_home_fair"],
+    }
+
+    try:
+        probs = compile_artifact(model_artifact).score(inputs)
+    except Exception as e:
+        logger.warning(f"[ALIGN_DATA] Game {game_id}: Error scoring model for {len(rows)} rows: {e}, using ESPN prob")
+        return
+
+    for (i, _), prob in zip(pending, probs):
+        prob = float(prob)
+        if 0.0 <= prob <= 1.0:
+            aligned_data[i]["espn_prob"] = prob
+        else:
+            logger.warning(f"[ALIGN_DATA] Game {game_id}: Model prob out of range: {prob}, using ESPN prob")
+
+
 def get_aligned_data(
     conn: psycopg.Connection,
     game_id: str,
@@ -268,13 +324,8 @@ def get_aligned_data(
             uses_baseline = has_opening_odds_features_check and opening_prob_not_a_feature
         
         if has_opening_odds_features or uses_baseline:
+            # One per-game lookup instead of four opening-odds columns on every snapshot row
             needs_opening_odds = True
-            base_columns.extend([
-                "sf.opening_moneyline_home",
-                "sf.opening_moneyline_away",
-                "sf.opening_spread",
-                "sf.opening_total"
-            ])
     
     # Build SQL query - join with pre-computed probabilities if model_name provided
     if model_name and model_prob_column:
@@ -346,6 +397,19 @@ def get_aligned_data(
     first_snapshot_ts = min(r[0] for r in canonical_rows if r[0] is not None) if canonical_rows else None
     first_snapshot_timestamp = int(first_snapshot_ts.timestamp()) if first_snapshot_ts else None
     
+    # Model feature columns after score_diff, in SQL query order (only those the model uses were selected)
+    optional_model_columns: list[tuple[str, bool]] = []
+    if model_artifact is not None:
+        feature_names = model_artifact.feature_names
+        optional_model_columns = [
+            ("score_diff_div_sqrt_time_remaining", any("score_diff_div_sqrt" in fn for fn in feature_names)),
+            ("espn_home_prob_lag_1", any("espn_home_prob_lag_1" in fn for fn in feature_names)),
+            ("espn_home_prob_delta_1", any("espn_home_prob_delta_1" in fn for fn in feature_names)),
+            ("period", any("period" in fn for fn in feature_names)),
+        ]
+    # (aligned_data index, raw model inputs) for rows scored on the fly
+    pending_model_rows: list[tuple[int, dict[str, Any]]] = []
+
     for row in canonical_rows:
         snapshot_ts = row[0]  # TIMESTAMPTZ (ESPN recording timestamp)
         espn_home_prob = row[1]  # May be 0-1 or 0-100 format (will normalize)
@@ -537,200 +601,26 @@ def get_aligned_data(
                 logger.warning(f"[ALIGN_DATA] Game {game_id}: Pre-computed prob out of range: {final_prob}, using ESPN prob")
                 final_prob = float(espn_home_prob)
         elif model_artifact is not None:
-            try:
-                # Extract model features from row
-                # Row indices: 0=snapshot_ts, 1=espn_home_prob, 2-7=kalshi, 8=time_remaining
-                # If model_name provided: 9=precomputed_prob
-                # If model_artifact provided: 9 or 10=score_diff (depending on whether precomputed_prob exists), then optional features
-                # Note: Column order must match SQL query order exactly
-                if len(row) < 9:
-                    logger.warning(f"[ALIGN_DATA] Game {game_id}: Row has insufficient columns ({len(row)} < 9), using ESPN prob")
-                    final_prob = float(espn_home_prob)
-                    continue
-                
-                # Start after base columns (0-8) and pre-computed prob (if present)
-                row_idx = 9  # Base columns end at 8
-                if model_prob_col_idx is not None:
-                    row_idx += 1  # Skip pre-computed prob column
-                
-                score_diff = row[row_idx] if len(row) > row_idx else None
-                row_idx += 1
-                
-                # Extract optional features if present
-                score_diff_div_sqrt_time_remaining = None
-                espn_home_prob_lag_1 = None
-                espn_home_prob_delta_1 = None
-                period_val = None
-                
-                if any("score_diff_div_sqrt" in fn for fn in model_artifact.feature_names):
-                    score_diff_div_sqrt_time_remaining = row[row_idx] if len(row) > row_idx else None
-                    row_idx += 1
-                if any("espn_home_prob_lag_1" in fn for fn in model_artifact.feature_names):
-                    espn_home_prob_lag_1 = row[row_idx] if len(row) > row_idx else None
-                    row_idx += 1
-                if any("espn_home_prob_delta_1" in fn for fn in model_artifact.feature_names):
-                    espn_home_prob_delta_1 = row[row_idx] if len(row) > row_idx else None
-                    row_idx += 1
-                if any("period" in fn for fn in model_artifact.feature_names):
-                    period_val = row[row_idx] if len(row) > row_idx else None
-                    row_idx += 1
-                
-                # Extract opening odds if model needs them
-                opening_moneyline_home = None
-                opening_moneyline_away = None
-                opening_spread = None
-                opening_total = None
-                
-                if needs_opening_odds:
-                    opening_moneyline_home = row[row_idx] if len(row) > row_idx else None
+            # On-the-fly scoring: collect this row's model inputs; the whole game is scored in one batch below
+            # Row indices: 0=snapshot_ts, 1=espn_home_prob, 2-7=kalshi, 8=time_remaining
+            # If model_name provided: 9=precomputed_prob
+            # Then score_diff, then the optional feature columns in SQL query order
+            row_idx = 9  # Base columns end at 8
+            if model_prob_col_idx is not None:
+                row_idx += 1  # Skip pre-computed prob column
+            features = {"score_diff": row[row_idx] if len(row) > row_idx else None}
+            row_idx += 1
+            for name, present in optional_model_columns:
+                if present:
+                    features[name] = row[row_idx] if len(row) > row_idx else None
                     row_idx += 1
-                    opening_moneyline_away = row[row_idx] if len(row) > row_idx else None
-                    row_idx += 1
-                    opening_spread = row[row_idx] if len(row) > row_idx else None
-                    row_idx += 1
-                    opening_total = row[row_idx] if len(row) > row_idx else None
-                    row_idx += 1
-                
-                # Validate required features
-                if score_diff is None or time_remaining is None:
-                    logger.warning(f"[ALIGN_DATA] Game {game_id}: Missing required model features (score_diff or time_remaining), using ESPN prob")
-                else:
-                    # Build design matrix for single snapshot
-                    point_differential = np.array([float(score_diff)])
-                    time_remaining_regulation = np.array([float(time_remaining)])
-                    possession = ["unknown"]  # Canonical dataset doesn't have possession, default to unknown
-                    
-                    # Build optional arrays - must pass if model uses them, even if value is None
-                    # build_design_matrix will only add features if they're not None, so we need to provide defaults
-                    score_diff_div_sqrt_arr = None
-                    if any("score_diff_div_sqrt" in fn for fn in model_artifact.feature_names):
-                        if score_diff_div_sqrt_time_remaining is not None:
-                            score_diff_div_sqrt_arr = np.array([float(score_diff_div_sqrt_time_remaining)])
-                        else:
-                            # Model expects this but value is missing - calculate from score_diff and time_remaining
-                            if score_diff is not None and time_remaining is not None:
-                                import math
-                                score_diff_div_sqrt_arr = np.array([float(score_diff) / math.sqrt(float(time_remaining) + 1)])
-                    
-                    espn_prob_arr = None
-                    # Check specifically for "espn_home_prob_scaled" (not lag_1 or delta_1)
-                    if any(fn == "espn_home_prob_scaled" for fn in model_artifact.feature_names):
-                        # espn_home_prob is always available (it's in base columns)
-                        espn_prob_arr = np.array([float(espn_home_prob)])
-                    
-                    espn_prob_lag_1_arr = None
-                    if any("espn_home_prob_lag_1" in fn for fn in model_artifact.feature_names):
-                        if espn_home_prob_lag_1 is not None:
-                            espn_prob_lag_1_arr = np.array([float(espn_home_prob_lag_1)])
-                        else:
-                            # Model expects this but value is missing - use current espn_home_prob as fallback
-                            espn_prob_lag_1_arr = np.array([float(espn_home_prob)])
-                    
-                    espn_prob_delta_1_arr = None
-                    if any("espn_home_prob_delta_1" in fn for fn in model_artifact.feature_names):
-                        if espn_home_prob_delta_1 is not None:
-                            espn_prob_delta_1_arr = np.array([float(espn_home_prob_delta_1)])
-                        else:
-                            # Model expects this but value is missing - use 0 as fallback (no change)
-                            espn_prob_delta_1_arr = np.array([0.0])
-                    
-                    period_arr = None
-                    if any("period" in fn for fn in model_artifact.feature_names):
-                        if period_val is not None:
-                            period_arr = [int(period_val)]
-                        else:
-                            # Model expects period but value is missing - default to 1 (first period)
-                            period_arr = [1]
-                    
-                    # Compute opening odds features and baseline if model needs them
-                    opening_overround_arr = None
-                    opening_prob_home_fair_arr = None
-                    
-                    if needs_opening_odds:
-                        from scripts.lib._winprob_lib import compute_opening_odds_features
-                        
-                        odds_features = compute_opening_odds_features(
-                            opening_moneyline_home=np.array([opening_moneyline_home]) if opening_moneyline_home is not None else None,
-                            opening_moneyline_away=np.array([opening_moneyline_away]) if opening_moneyline_away is not None else None,
-                            opening_spread=np.array([opening_spread]) if opening_spread is not None else None,
-                            opening_total=np.array([opening_total]) if opening_total is not None else None,
-                        )
-                        
-                        # Check if model uses opening odds features
-                        has_opening_odds_features = "opening_overround" in model_artifact.feature_names
-                        # Check if model uses baseline
-                        uses_baseline = getattr(model_artifact, 'uses_opening_odds_baseline', None)
-                        if uses_baseline is None:
-                            has_opening_odds_features_check = any("opening" in fn.lower() or "overround" in fn.lower() 
-                                                                 for fn in model_artifact.feature_names)
-                            opening_prob_not_a_feature = "opening_prob_home_fair" not in model_artifact.feature_names
-                            uses_baseline = has_opening_odds_features_check and opening_prob_not_a_feature
-                        
-                        # For features (if model uses opening odds features)
-                        if has_opening_odds_features:
-                            opening_overround_arr = np.array([odds_features["opening_overround"]])
-                        
-                        # For baseline (if model uses baseline)
-                        if uses_baseline:
-                            opening_prob_home_fair_arr = np.array([odds_features["opening_prob_home_fair"]])
-                    
-                    # Build design matrix
-                    build_matrix_kwargs = {
-                        "point_differential": point_differential,
-                        "time_remaining_regulation": time_remaining_regulation,
-                        "possession": possession,
-                        "preprocess": model_artifact.preprocess,
-                        "score_diff_div_sqrt_time_remaining": score_diff_div_sqrt_arr,
-                        "espn_home_prob": espn_prob_arr,
-                        "espn_home_prob_lag_1": espn_prob_lag_1_arr,
-                        "espn_home_prob_delta_1": espn_prob_delta_1_arr,
-                        "period": period_arr,
-                    }
-                    
-                    # Add opening odds features if model uses them
-                    if needs_opening_odds:
-                        has_opening_odds_features = "opening_overround" in model_artifact.feature_names
-                        if has_opening_odds_features:
-                            build_matrix_kwargs["opening_overround"] = opening_overround_arr
-                            build_matrix_kwargs["odds_nan_policy"] = "keep"
-                    
-                    X = build_design_matrix(**build_matrix_kwargs)
-                    
-                    # Validate design matrix shape matches model expectations BEFORE prediction
-                    expected_features = len(model_artifact.feature_names)
-                    actual_features = X.shape[1] if X.ndim == 2 else X.shape[0]
-                    if actual_features != expected_features:
-                        logger.warning(
-                            f"[ALIGN_DATA] Game {game_id}: Design matrix feature mismatch: "
-                            f"expected {expected_features} features, got {actual_features}. "
-                            f"Model features: {model_artifact.feature_names}. "
-                            f"Design matrix shape: {X.shape}. Using ESPN prob instead."
-                        )
-                        final_prob = float(espn_home_prob)
-                    else:
-                        # Predict probability - pass baseline if model uses it
-                        try:
-                            prob_array = predict_proba(
-                                model_artifact, 
-                                X=X,
-                                opening_prob_home_fair=opening_prob_home_fair_arr,
-                            )
-                            final_prob = float(prob_array[0])
-                        except Exception as pred_error:
-                            logger.warning(
-                                f"[ALIGN_DATA] Game {game_id}: Prediction error: {pred_error}. "
-                                f"X shape: {X.shape}, model weights: {len(model_artifact.model.weights)}. "
-                                f"Using ESPN prob instead."
-                            )
-                            final_prob = float(espn_home_prob)
-                    
-                    # Validate model probability is in [0,1]
-                    if final_prob < 0.0 or final_prob > 1.0:
-                        logger.warning(f"[ALIGN_DATA] Game {game_id}: Model prob out of range: {final_prob}, using ESPN prob")
-                        final_prob = float(espn_home_prob)
-            except Exception as e:
-                logger.warning(f"[ALIGN_DATA] Game {game_id}: Error scoring model: {e}, using ESPN prob")
-                final_prob = float(espn_home_prob)
+
+            if features["score_diff"] is None or time_remaining is None:
+                logger.warning(f"[ALIGN_DATA] Game {game_id}: Missing required model features (score_diff or time_remaining), using ESPN prob")
+            else:
+                features["time_remaining"] = time_remaining
+                features["espn_home_prob"] = espn_home_prob
+                pending_model_rows.append((len(aligned_data), features))
         
         aligned_data.append({
             "timestamp": aligned_timestamp,
@@ -740,6 +630,10 @@ def get_aligned_data(
             "kalshi_ask": float(kalshi_ask) if kalshi_ask is not None else None,
         })
     
+    if pending_model_rows:
+        opening_odds = load_opening_odds_features(conn, [game_id]) if needs_opening_odds else None
+        _apply_model_probabilities(game_id, model_artifact, aligned_data, pending_model_rows, opening_odds)
+
     logger.debug(f"[ALIGN_DATA] Game {game_id}: Processed {len(aligned_data)} aligned data points")
     logger.debug(f"[ALIGN_DATA] Game {game_id}: Filtered out - {filtered_by_time_window} by time window, {filtered_missing_espn} missing ESPN, {filtered_missing_kalshi} missing Kalshi, {filtered_out_of_range} out of range")
     logger.debug(f"[ALIGN_DATA] Game {game_id}: Price source usage - used_home_prices={used_home_prices}, used_away_fallback_prices={used_away_fallback_prices}")
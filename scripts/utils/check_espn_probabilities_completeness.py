@@ -125,7 +125,7 @@ def _collect_unsupported_keys(error_logs: list[Path]) -> set[str]:
     return unsupported
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Check completeness of locally cached ESPN probabilities for a season.")
     p.add_argument("--season-label", required=True, help="Season label used for probabilities subdir, e.g. 2019-20")
     p.add_argument("--start-date", required=True, help="YYYYMMDD (inclusive) for expected scoreboard scan")
@@ -139,11 +139,11 @@ def parse_args() -> argparse.Namespace:
     )
     p.add_argument("--show-missing", type=int, default=25, help="Print up to N missing games (default: 25). 0 disables.")
     p.add_argument("--out", default="", help="Write JSON report to this path (optional).")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     season = str(args.season_label)
     start = _parse_yyyymmdd(args.start_date)
     end = _parse_yyyymmdd(args.end_date)
@@ -186,7 +186,7 @@ def write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
             w.writerow(r)
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Discover NBA game IDs for a season via nba_api LeagueGameFinder.")
     p.add_argument("--season", required=True, help="NBA season string, e.g. 2023-24")
     p.add_argument("--league-id", default="00", help="NBA league id (00=NBA)")
@@ -207,11 +207,11 @@ def parse_args() -> argparse.Namespace:
         default="data/raw/nba_api/leaguegamefinder",
         help="Base directory for raw response archival.",
     )
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
 
     retry = RetryPolicy(
         max_attempts=args.max_attempts,
@@ -38,7 +38,7 @@ class Migration:
     path: Path
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Apply SQL migrations to PostgreSQL.")
     p.add_argument(
         "--dsn",
@@ -55,7 +55,7 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print which migrations would run, but do not apply anything.",
     )
-    args = p.parse_args()
+    args = p.parse_args(argv)
     if not args.dry_run and not args.dsn:
         p.error("Missing --dsn and DATABASE_URL is not set.")
     return args
@@ -91,8 +91,8 @@ def apply_migration(conn: psycopg.Connection, m: Migration) -> None:
             cur.execute("INSERT INTO schema_migrations(version) VALUES (%s);", (m.version,))
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     migrations_dir = Path(args.migrations_dir)
     migrations = discover_migrations(migrations_dir)
 
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental aggregate statistics (webapp/api/stats_partials.py behind /api/stats/aggregate).
+
+Covers:
+1. Merging per-game partials matches pooling the games' points (reliability curve, disagreement bins) and
+   summarizing their per-game values; partials survive the JSON round trip through storage
+2. A refresh reuses stored partials, reads the series of new and in-progress games only, and stores the
+   partials of final games
+"""
+
+import json
+import math
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from webapp.api import stats_partials  # noqa: E402
+from webapp.api.endpoints import aggregate_stats  # noqa: E402
+from webapp.api.endpoints.stats import calculate_brier_score, calculate_reliability_curve  # noqa: E402
+
+DURATION = 9000
+
+
+def _game(g, rng, final=True):
+    start = datetime(2025, 11, 1, tzinfo=timezone.utc) + timedelta(days=g)
+    n = 300
+    p = np.clip(0.5 + np.cumsum(rng.normal(0, 0.03, n)), 0.01, 0.99)
+    home_won = g % 3 != 0
+    if final:
+        p[-1] = 1.0 if home_won else 0.0
+    espn = [(start + timedelta(seconds=int(i * DURATION / (n - 1))), float(p[i]), 1 - float(p[i])) for i in range(n)]
+    candles = []
+    for t in range(0, DURATION + 1, 60):
+        price = float(np.clip(p[min(int(t / DURATION * (n - 1)), n - 1)] * 100 + rng.normal(0, 3), 1, 99))
+        candles.append((start + timedelta(seconds=t), round(price), None, None))
+    info = {"event_date": start, "home_won": home_won, "final_home_score": 100 + g,
+            "final_away_score": 95 if home_won else 110}
+    return {"id": f"40{g}", "info": info, "espn": espn, "kalshi": [("home", *c) for c in candles]}
+
+
+def _games(n=8, seed=3):
+    rng = np.random.default_rng(seed)
+    return [_game(g, rng, final=g != n - 1) for g in range(n)]
+
+
+def _close(a, b):
+    if isinstance(a, dict):
+        assert set(a) == set(b)
+        return all(_close(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_close(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and b is not None:
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    return a == b
+
+
+def test_merged_partials_match_pooled_games():
+    games = _games()
+    partials = [stats_partials.compute_game_partial(g["info"], g["espn"], g["kalshi"], DURATION) for g in games]
+    assert [p["final"] for p in partials] == [True] * 7 + [False]
+    merged = stats_partials.merge_game_partials(partials, total_games=len(games))
+    assert merged["games_with_stats"] == 8
+
+    # Per-game values are summarized exactly
+    outcomes = [1 if g["info"]["home_won"] else 0 for g in games]
+    briers = [calculate_brier_score([e[1] for e in g["espn"]], y) for g, y in zip(games, outcomes)]
+    summary = merged["espn"]["time_averaged_in_game_brier_error"]
+    assert summary["distribution"] == sorted(briers) and summary["count"] == 8
+    assert summary["mean"] == pytest.approx(sum(briers) / 8)
+
+    # Point-level aggregates come from added bin sums, as if every game's points were pooled
+    pooled_p = [e[1] for g in games for e in g["espn"]]
+    pooled_y = [y for g, y in zip(games, outcomes) for _ in g["espn"]]
+    assert _close(merged["espn"]["reliability_curve"], calculate_reliability_curve(pooled_p, pooled_y, bins=10))
+    bins = merged["comparison"]["disagreement_vs_outcome"]
+    assert sum(b["count"] for b in bins) <= merged["comparison"]["total_aligned_data_points"]
+    assert all(0 <= b["home_win_rate"] <= 1 for b in bins)
+    pairs = merged["comparison"]["espn_volatility_vs_kalshi_volatility"]
+    assert [p["espn"] for p in pairs] == [p["espn"]["volatility"] for p in partials]
+
+    # Stored form (JSON) merges to the same result, and merging is incremental
+    stored = [json.loads(json.dumps(p)) for p in partials]
+    assert _close(stats_partials.merge_game_partials(stored, total_games=8), merged)
+    first = stats_partials.merge_game_partials(partials[:5], total_games=5)
+    assert first["espn"]["time_averaged_in_game_brier_error"]["distribution"] == sorted(briers[:5])
+
+
+def test_refresh_reuses_stored_partials(monkeypatch):
+    games = _games()
+    by_id = {g["id"]: g for g in games}
+    rows = [(g["id"], g["info"]["event_date"], "H", "A", "Home", "Away", g["info"]["final_home_score"],
+             g["info"]["final_away_score"], 0 if g["info"]["home_won"] else 1) for g in games]
+    store, fetched = {}, []
+
+    class _Conn:
+        def execute(self, sql, params=None):
+            assert "game_outcomes" in sql
+            return type("Result", (), {"fetchall": lambda _self: rows})()
+
+        def rollback(self):
+            pass
+
+    @contextmanager
+    def connect():
+        yield _Conn()
+
+    def fetch_series(conn, game_ids):
+        fetched.append(list(game_ids))
+        return ({g: by_id[g]["espn"] for g in game_ids}, {g: by_id[g]["kalshi"] for g in game_ids},
+                {g: (by_id[g]["info"]["event_date"], DURATION) for g in game_ids})
+
+    monkeypatch.setattr(aggregate_stats, "get_db_connection", connect)
+    monkeypatch.setattr(aggregate_stats, "_fetch_game_series", fetch_series)
+    monkeypatch.setattr(aggregate_stats, "load_partials", lambda conn, ids: {g: store[g] for g in ids if g in store})
+    monkeypatch.setattr(aggregate_stats, "save_partials", lambda conn, partials: store.update(partials) or len(partials))
+    compute = aggregate_stats.get_aggregate_stats.__wrapped__
+
+    cold = compute("2025-26")
+    assert fetched == [[g["id"] for g in games]]
+    assert sorted(store) == sorted(g["id"] for g in games[:-1])  # the in-progress game isn't stored
+
+    warm = compute("2025-26")
+    assert fetched[-1] == [games[-1]["id"]]  # only the in-progress game is read again
+    assert _close(warm, cold)
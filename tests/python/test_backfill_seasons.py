@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the backfill_seasons fetch/load work queue (scripts/backfill/backfill_seasons.py).
+
+Covers:
+1. Fetches overlap loads (separate pools) instead of alternating per game
+2. Fetch failures skip the load; load failures are reported per game
+3. Checkpoint journal: loaded games are skipped on rerun
+4. Throughput totals for the JSONL report
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.backfill.backfill_seasons import (  # noqa: E402
+    GameResult,
+    GameTask,
+    Throughput,
+    run_fetch_load_queue,
+)
+from scripts.lib._async_fetch_lib import FetchCheckpoint  # noqa: E402
+
+
+def _tasks(n):
+    return [GameTask(season="2023-24", game_id=f"00223000{i:02d}") for i in range(n)]
+
+
+def test_fetch_overlaps_load():
+    def fetch(task):
+        time.sleep(0.1)
+        return 1000
+
+    loading = threading.Lock()
+
+    def load(task):
+        # One DB worker: loads must never run concurrently.
+        assert loading.acquire(blocking=False)
+        try:
+            time.sleep(0.1)
+        finally:
+            loading.release()
+
+    t0 = time.monotonic()
+    results = run_fetch_load_queue(_tasks(6), fetch, load, fetch_workers=3, load_workers=1)
+    elapsed = time.monotonic() - t0
+
+    assert sorted(r.status for r in results) == ["succeeded"] * 6
+    assert all(r.bytes_fetched == 1000 and r.fetch_ms >= 90 and r.load_ms >= 90 for r in results)
+    # Alternating fetch/load per game would take 6 * 0.2s = 1.2s; the load pool is the bottleneck at ~0.7s.
+    assert elapsed < 0.95, elapsed
+
+
+def test_failures_are_per_stage():
+    def fetch(task):
+        if task.game_id.endswith("01"):
+            raise RuntimeError("fetch_pbp failed: HTTP 403")
+        return 0
+
+    loaded = []
+
+    def load(task):
+        if task.game_id.endswith("02"):
+            raise RuntimeError("load_pbp failed: bad manifest")
+        loaded.append(task.game_id)
+
+    by_id = {r.game_id: r for r in run_fetch_load_queue(_tasks(3), fetch, load, fetch_workers=2, load_workers=2)}
+    assert by_id["0022300001"].step == "fetch" and "HTTP 403" in by_id["0022300001"].error
+    assert "0022300001" not in loaded
+    assert by_id["0022300002"].status == "failed" and by_id["0022300002"].step == "load_pbp"
+    assert by_id["0022300000"].status == "succeeded"
+
+
+def test_checkpoint_skips_loaded_games():
+    with tempfile.TemporaryDirectory() as d:
+        cp_path = Path(d) / "checkpoint.jsonl"
+        fetched = []
+
+        def fetch(task):
+            fetched.append(task.game_id)
+            return 10
+
+        def load(task):
+            if task.game_id.endswith("01"):
+                raise RuntimeError("db down")
+
+        run_fetch_load_queue(_tasks(3), fetch, load, fetch_workers=2, load_workers=1, checkpoint=FetchCheckpoint(cp_path))
+        fetched.clear()
+        second = run_fetch_load_queue(
+            _tasks(3), fetch, lambda t: None, fetch_workers=2, load_workers=1, checkpoint=FetchCheckpoint(cp_path)
+        )
+        assert fetched == ["0022300001"]
+        assert sorted((r.game_id, r.status) for r in second) == [
+            ("0022300000", "skipped"),
+            ("0022300001", "succeeded"),
+            ("0022300002", "skipped"),
+        ]
+
+
+def test_throughput_snapshot():
+    tp = Throughput(started=time.monotonic() - 60.0)
+    tp.record(GameResult("a", "2023-24", "succeeded", "load_pbp", 300, fetch_ms=200, load_ms=100, bytes_fetched=6000))
+    tp.record(GameResult("b", "2023-24", "skipped", "checkpoint", 0))
+    snap = tp.snapshot()
+    assert snap["games_done"] == 2 and snap["games_succeeded"] == 1
+    assert 0.9 < snap["games_per_min"] <= 1.0
+    assert 99 < snap["bytes_per_s"] <= 100
+    assert snap["fetch_busy_seconds"] == 0.2 and snap["load_busy_seconds"] == 0.1
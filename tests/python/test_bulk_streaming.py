@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming bulk endpoints (webapp/api/streaming.py, /api/simulation/bulk/stream, /games/stats/bulk/stream).
+
+Covers:
+1. NDJSON / SSE framing, numpy and datetime values, non-finite floats sent as null, and rejection of
+   unknown formats before streaming
+2. The simulation stream sends every game as it completes and ends with the buffered endpoint's aggregate
+3. The stats stream sends one record per game, reports skipped games and ends with a summary, or with an
+   error record when a batch fails mid-stream
+"""
+
+import asyncio
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from webapp.api.endpoints import simulation, stats  # noqa: E402
+from webapp.api.streaming import encode_record, stream_records  # noqa: E402
+
+
+def _body(response) -> str:
+    async def collect():
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+def _ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in _body(response).splitlines()]
+
+
+def test_framing_and_format_validation():
+    record = {"type": "game", "n": np.int64(3), "p": np.float32(0.5), "a": np.arange(2),
+              "at": datetime(2025, 11, 3, tzinfo=timezone.utc)}
+    line = encode_record(record)
+    assert line.endswith("\n") and line.count("\n") == 1
+    assert json.loads(line) == {"type": "game", "n": 3, "p": 0.5, "a": [0, 1], "at": "2025-11-03T00:00:00+00:00"}
+    frame = encode_record(record, "sse")
+    event, data = frame.rstrip("\n").split("\n")
+    assert event == "event: game" and json.loads(data[len("data: "):]) == json.loads(line)
+    assert frame.endswith("\n\n")
+
+    # NaN/Infinity are not JSON: they go out as null, wherever they sit
+    nan_line = encode_record({"type": "game", "brier": float("nan"), "p": np.float32("inf"),
+                              "ps": [0.5, float("-inf")], "a": np.array([np.nan, 1.0]), "n": np.int64(2)})
+    assert "NaN" not in nan_line and "Infinity" not in nan_line
+    assert json.loads(nan_line) == {"type": "game", "brier": None, "p": None, "ps": [0.5, None], "a": [None, 1.0], "n": 2}
+
+    resp = stream_records(iter([{"type": "a"}, {"type": "b"}]), "sse")
+    assert resp.media_type == "text/event-stream" and resp.headers["x-accel-buffering"] == "no"
+    assert _body(resp) == "event: a\ndata: {\"type\":\"a\"}\n\nevent: b\ndata: {\"type\":\"b\"}\n\n"
+    with pytest.raises(HTTPException) as exc:
+        stream_records(iter([]), "xml")
+    assert exc.value.status_code == 400
+
+
+def _aligned(seed: int, n: int = 300) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    espn = np.clip(0.5 + np.cumsum(rng.normal(0, 0.02, n)), 0.02, 0.98)
+    kalshi = np.clip(espn + rng.normal(0, 0.06, n), 0.02, 0.98)
+    start = 1_700_000_000 + seed * 86_400
+    return [{"timestamp": start + 10 * i, "espn_prob": float(espn[i]), "kalshi_price": float(kalshi[i]),
+             "kalshi_bid": float(kalshi[i]) - 0.01, "kalshi_ask": float(kalshi[i]) + 0.01} for i in range(n)]
+
+
+class _Catalog:
+    # Four candidates, one of which fails: the replacement batch is a single game, so both runs pick the same three
+    def query(self, season, **kw):
+        return {"games": [{"game_id": f"40{i}", "game_date": f"2025-11-{10 - i:02d}"} for i in range(4)]}
+
+
+class _Conn:
+    def execute(self, sql, params=None):
+        return type("Result", (), {"fetchone": lambda _self: (None, None)})()  # not completed: no result caching
+
+
+@contextmanager
+def _connect():
+    yield _Conn()
+
+
+def test_simulation_stream_matches_buffered_endpoint(monkeypatch):
+    def aligned(conn, game_id, **kw):
+        if game_id == "401":
+            return [], None, None, None  # replaced by the next candidate
+        data = _aligned(int(game_id))
+        return data, data[0]["timestamp"], 3000, int(game_id) % 2
+
+    monkeypatch.setattr(simulation, "get_game_catalog", lambda: _Catalog())
+    monkeypatch.setattr(simulation, "get_db_connection", _connect)
+    monkeypatch.setattr(simulation, "get_aligned_data", aligned)
+    params = dict(num_games=3, entry_threshold=0.05, exit_threshold=0.01, exclude_first_seconds=0,
+                  exclude_last_seconds=0, bet_amount=20.0, slippage_rate=0.0, min_hold_seconds=30,
+                  use_trade_data=False, enable_fees=False, request_id=None)
+
+    buffered = simulation.get_bulk_simulation_results(**params)
+    records = _ndjson(simulation.stream_bulk_simulation_results(**params, format="ndjson"))
+
+    assert records[0] == {"type": "start", "num_games_requested": 3, "num_games_selected": 3}
+    assert records[-1]["type"] == "aggregate"
+    games = [r["result"] for r in records if r["type"] == "game"]
+    assert [r for r in records if r["type"] == "failed"] == [{"type": "failed", "game_id": "401", "reason": "No aligned data"}]
+    by_id = lambda results: sorted(results, key=lambda g: g["game_id"])  # noqa: E731
+    assert by_id(games) == by_id(json.loads(json.dumps(buffered["game_results"])))
+    assert sum(g["num_trades"] for g in games) > 0
+
+    aggregate = records[-1]["result"]
+    expected = {k: v for k, v in buffered.items() if k not in ("game_results", "trades")}
+    assert set(aggregate) == set(expected)
+    # Completion order differs between runs; the aggregate is order-independent up to float rounding.
+    for key in ("num_games", "num_trades", "num_games_failed", "failed_game_ids", "position_breakdown"):
+        assert aggregate[key] == expected[key]
+    assert aggregate["total_profit_cents"] == pytest.approx(expected["total_profit_cents"])
+    assert aggregate["sharpe_ratio"] == pytest.approx(expected["sharpe_ratio"])
+
+
+def test_stats_stream_records_and_summary(monkeypatch):
+    def fake_batch(game_ids):
+        return {g: {"game_id": g, "espn": {"mean": np.float64(0.5)}} for g in game_ids if g != "bad"}
+
+    monkeypatch.setattr(stats, "get_game_stats_batch", fake_batch)
+    records = _ndjson(stats.stream_bulk_game_stats(game_ids="401, bad,402,", format="ndjson"))
+    assert records == [
+        {"type": "game", "game_id": "401", "stats": {"game_id": "401", "espn": {"mean": 0.5}}},
+        {"type": "skipped", "game_id": "bad", "reason": "No ESPN probability data for game bad"},
+        {"type": "game", "game_id": "402", "stats": {"game_id": "402", "espn": {"mean": 0.5}}},
+        {"type": "summary", "num_games": 2, "num_requested": 3, "skipped_game_ids": ["bad"]},
+    ]
+    with pytest.raises(HTTPException):
+        stats.stream_bulk_game_stats(game_ids="401", format="csv")
+
+
+def test_stats_stream_ends_with_error_record_when_a_batch_fails(monkeypatch):
+    def failing_batch(game_ids):
+        if "402" in game_ids:
+            raise RuntimeError("connection lost")
+        return {g: {"game_id": g} for g in game_ids}
+
+    monkeypatch.setattr(stats, "STATS_BATCH_SIZE", 1)
+    monkeypatch.setattr(stats, "get_game_stats_batch", failing_batch)
+    records = _ndjson(stats.stream_bulk_game_stats(game_ids="401,402,403", format="ndjson"))
+    assert records == [
+        {"type": "game", "game_id": "401", "stats": {"game_id": "401"}},
+        {"type": "error", "message": "Error calculating game stats: connection lost"},
+    ]
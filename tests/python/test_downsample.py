@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for server-side series downsampling (webapp/api/utils/downsample.py) and its use in the probability endpoints.
+
+Covers:
+1. LTTB keeps the endpoints and sharp features within max_points; min/max keeps every time bucket's extremes
+2. Pyramid viewport queries return full resolution when it fits and never exceed max_points
+3. /games/{id}/probs and /kalshi-candles downsample per request on top of the cached full series
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from webapp.api.endpoints import probabilities  # noqa: E402
+from webapp.api.utils.downsample import (  # noqa: E402
+    SeriesPyramid,
+    downsample_records,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def _series(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(n, dtype=float) * 3.0
+    y = 0.5 + np.cumsum(rng.normal(0, 0.002, n))
+    y[1234] += 0.3  # a spike that must survive downsampling
+    return x, y
+
+
+def test_lttb_and_minmax_selection():
+    x, y = _series()
+    idx = lttb_indices(x, y, 300)
+    assert len(idx) == 300 and idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 1234 in idx
+    assert np.array_equal(lttb_indices(x, y, 6000), np.arange(5000))
+
+    y_nan = y.copy()
+    y_nan[100:200] = np.nan
+    assert not np.isnan(y_nan[lttb_indices(x, y_nan, 300)][1:-1]).all()
+
+    mm = minmax_indices(x, y, 300)
+    assert len(mm) <= 300 and mm[0] == 0 and mm[-1] == len(x) - 1 and np.all(np.diff(mm) > 0)
+    assert 1234 in mm and int(np.argmin(y)) in mm
+    # Every time bucket's extremes are kept
+    buckets = np.minimum((x / x[-1] * 149).astype(int), 148)
+    for b in (0, 37, 148):
+        members = np.flatnonzero(buckets == b)
+        assert members[np.argmax(y[members])] in mm and members[np.argmin(y[members])] in mm
+
+
+def test_pyramid_viewport_queries():
+    x, y = _series(n=4096)
+    pyramid = SeriesPyramid(x, y)
+    sizes = [len(level) for level in pyramid.levels]
+    assert sizes == [4096, 2048, 1024, 512, 256, 128]
+    assert all(np.array_equal(lx, x[level]) for level, lx in zip(pyramid.levels, pyramid.level_x))
+
+    full = pyramid.select(1000)
+    assert len(full) == 1000 and 1234 in full
+    # Zoomed into 300 points of raw data: served at full resolution
+    zoom = pyramid.select(1000, start=x[1000], end=x[1299])
+    assert np.array_equal(zoom, np.arange(1000, 1300))
+    assert len(pyramid.select(50)) <= 50  # below the coarsest level
+
+    records = [{"time": int(t), "home_prob": float(v)} for t, v in zip(x, y)]
+    window = downsample_records(records, 100, y="home_prob", start=3000, end=9000)
+    assert len(window) == 100 and window[0]["time"] == 3000 and window[-1]["time"] == 9000
+    assert downsample_records(records, None, y="home_prob", start=0, end=30) == records[:11]
+
+
+def test_probability_endpoints_downsample_cached_series(monkeypatch):
+    x, y = _series(n=3000)
+    y = np.clip(y, 0.0, 1.0)
+    y[-1] = 1.0  # final: pyramids are built
+    full = {
+        "espn": [{"time": int(t), "home_prob": float(p), "away_prob": 1 - float(p)} for t, p in zip(x, y)],
+        "kalshi": {"KXHOME": {"team_side": "home", "data": [{"time": int(t), "price": float(p) * 100}
+                                                             for t, p in zip(x[::10], y[::10])]}},
+        "kalshi_validation": {"game_id": "401"},
+    }
+    calls = []
+
+    def load(game_id, include_kalshi):
+        calls.append((game_id, include_kalshi))
+        return full
+
+    monkeypatch.setattr(probabilities, "_load_game_probabilities", load)
+    args = dict(include_kalshi=True, start_ts=None, end_ts=None, downsample="lttb")
+    assert probabilities.get_game_probabilities("401", max_points=None, **args) is full
+
+    out = probabilities.get_game_probabilities("401", max_points=400, **args)
+    assert 200 < len(out["espn"]) <= 400 and len(out["kalshi"]["KXHOME"]["data"]) == 300
+    assert out["downsampling"]["source_points"] == {"espn": 3000, "kalshi": {"KXHOME": 300}}
+    assert len(full["espn"]) == 3000  # cached result untouched
+    assert ("401", True, "espn", "lttb") in probabilities._pyramids
+
+    zoomed = probabilities.get_game_probabilities("401", max_points=400, **{**args, "start_ts": 300, "end_ts": 900})
+    assert zoomed["espn"] == full["espn"][100:301]
+    with pytest.raises(HTTPException) as exc:
+        probabilities.get_game_probabilities("401", max_points=400, **{**args, "downsample": "avg"})
+    assert exc.value.status_code == 400
+    assert calls == [("401", True)] * 3  # every request reads the one cached full series; bad params fail first
+
+    candles = {"markets": [{"ticker": "KXHOME", "candles": [
+        {"period_ts": int(t), "price_close_cents": int(p * 100), "volume": 1} for t, p in zip(x, y)]}],
+        "interval_seconds": 1, "source": "trades"}
+    monkeypatch.setattr(probabilities, "_load_kalshi_candles", lambda *a: candles)
+    thinned = probabilities.get_kalshi_candles("401", interval_seconds=1, source="trades", ticker=None, start_ts=None,
+                                               end_ts=None, max_points=500, downsample="minmax")
+    market = thinned["markets"][0]
+    assert len(market["candles"]) <= 500 and market["source_candles"] == 3000
+    assert market["candles"][0] == candles["markets"][0]["candles"][0]
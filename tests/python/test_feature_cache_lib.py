@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned Parquet feature cache (scripts/lib/_feature_cache_lib.py).
+
+Covers:
+1. Query fingerprints ignore formatting but not params
+2. Season-partitioned write/read round trip (string ids preserved, partial reads)
+3. Freshness requires matching format version, fingerprint and source watermarks
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._feature_cache_lib import (  # noqa: E402
+    CACHE_FORMAT_VERSION,
+    entry_is_fresh,
+    query_fingerprint,
+    read_meta,
+    read_partitioned,
+    write_partitioned,
+)
+
+
+def test_fingerprint_normalizes_whitespace_only():
+    q1 = "SELECT a,\n       b\nFROM t WHERE s = %s"
+    q2 = "SELECT a, b FROM t   WHERE s = %s"
+    assert query_fingerprint(q1, (2024,)) == query_fingerprint(q2, (2024,))
+    assert query_fingerprint(q1, (2024,)) != query_fingerprint(q1, (2023,))
+    assert query_fingerprint(q1) != query_fingerprint("SELECT a FROM t")
+
+
+def test_partitioned_round_trip():
+    table = pa.table(
+        {
+            "season_start": [2022, 2022, 2023, 2024],
+            "game_id": ["0401", "0402", "0501", "0601"],
+            "point_differential": [1.0, -3.0, 0.0, 7.0],
+        }
+    )
+    with tempfile.TemporaryDirectory() as d:
+        entry = Path(d) / "train" / "abc"
+        write_partitioned(table, entry, partition_column="season_start", meta={"fingerprint": "abc"})
+        meta = read_meta(entry)
+        assert meta["rows"] == 4
+        assert meta["partitions"] == ["season_start=2022.parquet", "season_start=2023.parquet", "season_start=2024.parquet"]
+
+        df = read_partitioned(entry).to_pandas().sort_values("game_id").reset_index(drop=True)
+        assert df["game_id"].tolist() == ["0401", "0402", "0501", "0601"]
+        assert df["season_start"].tolist() == [2022, 2022, 2023, 2024]
+
+        only_2023 = read_partitioned(entry, partitions=["season_start=2023.parquet"]).to_pandas()
+        assert only_2023["game_id"].tolist() == ["0501"]
+
+        # Rewriting replaces the entry rather than mixing old partitions in.
+        write_partitioned(table.slice(0, 1), entry, partition_column="season_start", meta={"fingerprint": "abc"})
+        assert read_meta(entry)["partitions"] == ["season_start=2022.parquet"]
+        assert sorted(p.name for p in entry.iterdir()) == ["_meta.json", "season_start=2022.parquet"]
+
+
+def test_freshness_checks_fingerprint_and_watermarks():
+    meta = {"format_version": CACHE_FORMAT_VERSION, "fingerprint": "f1", "watermarks": {"espn.prob_event_state": "1:10:0:0"}}
+    assert entry_is_fresh(meta, fingerprint="f1", watermarks={"espn.prob_event_state": "1:10:0:0"})
+    assert not entry_is_fresh(meta, fingerprint="f1", watermarks={"espn.prob_event_state": "1:11:0:0"})
+    assert not entry_is_fresh(meta, fingerprint="f2", watermarks={"espn.prob_event_state": "1:10:0:0"})
+    assert not entry_is_fresh({**meta, "format_version": -1}, fingerprint="f1", watermarks=meta["watermarks"])
+    assert not entry_is_fresh(None, fingerprint="f1", watermarks={})
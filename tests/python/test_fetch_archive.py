@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for raw-fetch archiving (scripts/lib/_fetch_lib.py) and the candlestick loader's provenance.
+
+Covers:
+1. write_with_manifest/read_archive_bytes round trip in both formats; the manifest's sha256/byte_size
+   describe the uncompressed body, and rewriting in another format drops the stale copy
+2. find_archive precedence (plain JSON before .zst) and logical_archive_path
+3. Parquet sidecars: typed rows, manifest sidecar fields, unknown feeds are rejected, stale sidecars removed
+4. The candlestick source_files row hashes and sizes the same (uncompressed) bytes for .json and .json.zst
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import pyarrow.parquet as pq
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._fetch_lib import (  # noqa: E402
+    archive_path,
+    find_archive,
+    logical_archive_path,
+    read_archive_bytes,
+    sidecar_path,
+    write_parquet_sidecar,
+    write_with_manifest,
+)
+from scripts.load import load_kalshi_candlesticks  # noqa: E402
+
+CANDLES = {
+    "request": {"ticker": "KXNBAGAME-25DEC19CHICLE-CLE", "period_interval": 1},
+    "response": {"data": {"candlesticks": [
+        {"end_period_ts": 1766190000 + 60 * i, "price": {"open": 40 + i, "high": 45 + i, "low": 39, "close": 42 + i},
+         "volume": 10 * i, "open_interest": 100}
+        for i in range(5)
+    ]}},
+}
+BODY = json.dumps(CANDLES).encode("utf-8")
+
+
+def _write(tmp_path, fmt, sidecar=False):
+    return write_with_manifest(
+        tmp_path / "candlesticks_X.json", tmp_path / "candlesticks_X.manifest.json",
+        url="https://example.test/candles", http_status=200, response_headers={"etag": "abc"}, body=BODY,
+        source_type="kalshi_candlesticks", source_key="candlesticks_X", fetched_at_utc="20251219T000000Z",
+        archive_format=fmt, parquet_sidecar=sidecar,
+    )
+
+
+def test_archive_round_trip_and_precedence(tmp_path):
+    logical = tmp_path / "candlesticks_X.json"
+    stored = _write(tmp_path, "zst")
+    assert stored == archive_path(logical, "zst") and stored.name == "candlesticks_X.json.zst"
+    assert read_archive_bytes(stored) == BODY and stored.read_bytes() != BODY
+    manifest = json.loads((tmp_path / "candlesticks_X.manifest.json").read_text())
+    assert manifest["sha256_hex"] == hashlib.sha256(BODY).hexdigest() and manifest["byte_size"] == len(BODY)
+    assert manifest["archive_format"] == "zst" and manifest["stored_byte_size"] == stored.stat().st_size
+    assert manifest["path"] == str(stored) and "sidecar_path" not in manifest
+    assert find_archive(logical) == stored and logical_archive_path(stored) == logical
+
+    # Rewriting as plain JSON replaces the .zst copy
+    assert _write(tmp_path, "json") == logical and not stored.exists()
+    assert read_archive_bytes(logical) == BODY and find_archive(logical) == logical
+
+    # With both present (e.g. a partial migration), plain JSON wins; with neither, None
+    stored.write_bytes(b"stale")
+    assert find_archive(logical) == logical
+    logical.unlink()
+    assert find_archive(logical) == stored
+    stored.unlink()
+    assert find_archive(logical) is None
+    with pytest.raises(ValueError):
+        archive_path(logical, "gz")
+
+
+def test_parquet_sidecar_and_candlestick_provenance(tmp_path):
+    _write(tmp_path, "zst", sidecar=True)
+    manifest = json.loads((tmp_path / "candlesticks_X.manifest.json").read_text())
+    side = sidecar_path(tmp_path / "candlesticks_X.json")
+    assert manifest["sidecar_path"] == str(side) and manifest["sidecar_rows"] == 5
+    table = pq.read_table(side)
+    assert str(table.schema.field("price_close").type) == "int64"
+    assert table.column("price_close").to_pylist() == [42, 43, 44, 45, 46]
+    assert table.column("end_period_ts").to_pylist()[0] == 1766190000
+    with pytest.raises(ValueError):
+        write_parquet_sidecar(tmp_path / "x.json", source_type="kalshi_markets", obj={})
+
+    # Rewriting without a sidecar removes the old one
+    _write(tmp_path, "zst")
+    assert not side.exists()
+    assert "sidecar_path" not in json.loads((tmp_path / "candlesticks_X.manifest.json").read_text())
+
+    # source_files: sha256 and byte_size both describe the uncompressed body, whatever the format on disk
+    executed = []
+
+    class _Conn:
+        def execute(self, sql, params):
+            executed.append(params)
+            return type("R", (), {"fetchone": lambda self: (7,)})()
+
+    zst = tmp_path / "candlesticks_X.json.zst"
+    plain = tmp_path / "plain" / "candlesticks_X.json"
+    plain.parent.mkdir()
+    plain.write_bytes(BODY)
+    for path in (zst, plain):
+        assert load_kalshi_candlesticks.upsert_candlestick_source_file(_Conn(), path) == 7
+    (_, key_z, _, _, _, sha_z, size_z), (_, key_p, _, _, _, sha_p, size_p) = executed
+    assert key_z == key_p == "candlesticks_X"
+    assert sha_z == sha_p == hashlib.sha256(BODY).hexdigest() and size_z == size_p == len(BODY)
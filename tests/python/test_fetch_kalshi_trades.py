@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent Kalshi trades fetch (scripts/fetch/fetch_kalshi_trades.py).
+
+Covers:
+1. Each ticker's file is written and journaled as its pipeline finishes; only a summary is returned,
+   failed tickers are not journaled, and a rerun with the checkpoint skips the finished ones
+2. Game windows for every market are computed over one database connection
+"""
+
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("cryptography")  # request signing, imported by the fetch script
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.fetch import fetch_kalshi_trades  # noqa: E402
+from scripts.lib._async_fetch_lib import FetchCheckpoint  # noqa: E402
+from scripts.lib._fetch_lib import read_archive_bytes  # noqa: E402
+
+GAME_TIME = datetime(2025, 12, 19, 0, 30, tzinfo=timezone.utc)
+
+
+def _market(ticker):
+    return {"ticker": ticker, "event_ticker": "KXNBAGAME-25DEC19CHICLE", "game_id": "401", "game_time_utc": GAME_TIME,
+            "market_status": "finalized"}
+
+
+def test_tickers_are_written_and_journaled_as_they_finish(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_fetch(fetcher, api_key_id, pem, ticker, *, min_ts, max_ts, pages_dir):
+        calls.append(ticker)
+        if ticker == "BAD":
+            raise RuntimeError("HTTP 500")
+        return [{"trade_id": f"{ticker}-1", "yes_price": 40, "count": 3}], {"total_volume_dollars": 1.2, "total_pages": 1}
+
+    monkeypatch.setattr(fetch_kalshi_trades, "fetch_all_trades_for_ticker_async", fake_fetch)
+    markets = [_market("A"), _market("BAD"), _market("B")]
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+
+    def run():
+        return fetch_kalshi_trades.prefetch_trades_concurrently(
+            "key", b"pem", markets, {"A": (1, 2)}, tmp_path / "fetch_1",
+            concurrency=2, requests_per_second=0, fetch_timestamp="20251219T000000Z",
+            archive_format="zst", parquet_sidecar=False, checkpoint=FetchCheckpoint(checkpoint_path),
+        )
+
+    results = run()
+    assert {k: r.status for k, r in results.items()} == {"A": "ok", "BAD": "error", "B": "ok"}
+    summary = results["A"].value
+    assert "trades" not in summary and summary["trade_count"] == 1
+    assert summary["file"] == tmp_path / "fetch_1" / "A.json.zst"
+    data = json.loads(read_archive_bytes(summary["file"]))
+    assert data["trades"][0]["trade_id"] == "A-1" and (data["time_window_start_ts"], data["time_window_end_ts"]) == (1, 2)
+    assert len(read_archive_bytes(summary["file"])) == summary["body_size"]
+    cp = FetchCheckpoint(checkpoint_path)
+    assert cp.is_done("A") and cp.is_done("B") and not cp.is_done("BAD")
+
+    # A restart only refetches the ticker that did not finish
+    calls.clear()
+    results = run()
+    assert calls == ["BAD"] and results["A"].status == results["B"].status == "skipped"
+
+
+def test_game_windows_share_one_connection(monkeypatch):
+    opened = []
+
+    class _Cursor:
+        def execute(self, sql, params):
+            self.params = params
+
+        def fetchone(self):
+            return (None, None, 2 * 3600)
+
+    class _Conn:
+        @contextmanager
+        def cursor(self):
+            yield _Cursor()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(fetch_kalshi_trades.psycopg, "connect", lambda dsn: opened.append(dsn) or _Conn())
+    windows = fetch_kalshi_trades.compute_game_windows("postgresql://x", [_market("A"), _market("B")])
+    start = int(GAME_TIME.timestamp())
+    assert opened == ["postgresql://x"]
+    assert windows == {"A": (start - 900, start + 7200 + 900), "B": (start - 900, start + 7200 + 900)}
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory game catalog (webapp/api/game_catalog.py) behind /api/games.
+
+Covers:
+1. Sorting (NULLS LAST in both directions), team/date filters and offset pagination match the SQL semantics
+2. Keyset cursors walk the full ordering, survive inserts between pages and reject mismatched orderings
+3. The catalog queries the database once per season and data version; list_games serves from it
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from webapp.api import game_catalog  # noqa: E402
+from webapp.api.endpoints import games as games_endpoint  # noqa: E402
+from webapp.api.game_catalog import GameCatalog, SeasonSnapshot  # noqa: E402
+
+
+def _row(gid, day, home, away, hs, as_, std, rng, *, season="2025-26"):
+    event = datetime(2025, 11, day, 0, 30, tzinfo=timezone.utc) if day else None
+    return (gid, season, 500, event, hs, as_, None if hs is None else int(hs < as_),
+            home, away, f"{home} name", f"{away} name", event, True, 0.1, 0.9, 0.5, std, rng)
+
+
+ROWS = [
+    _row("401", 3, "BOS", "NYK", 110, 100, 0.20, 0.7),
+    _row("402", 1, "LAL", "BOS", 98, 120, 0.10, 0.5),
+    _row("403", 5, "GSW", "LAL", None, None, None, 0.9),
+    _row("404", None, "MIA", "CHI", 101, 99, 0.30, None),
+    _row("405", 3, "NYK", "MIA", 90, 95, 0.10, 0.4),
+]
+
+
+def _ids(page):
+    return [g["game_id"] for g in page["games"]]
+
+
+def test_sorting_filters_and_offset_pages():
+    snap = SeasonSnapshot("2025-26", ROWS)
+    # Date ties break on game_id; games without a date sort last in both directions.
+    assert _ids(snap.page(limit=None)) == ["403", "401", "405", "402", "404"]
+    assert _ids(snap.page(sort_order="asc", limit=None)) == ["402", "401", "405", "403", "404"]
+    assert _ids(snap.page(sort_by="std_dev", sort_order="asc", limit=None)) == ["402", "405", "401", "404", "403"]
+    assert _ids(snap.page(sort_by="volatility", limit=None)) == ["404", "401", "402", "405", "403"]
+    assert _ids(snap.page(sort_by="range", limit=None)) == ["403", "401", "402", "405", "404"]
+    assert _ids(snap.page(sort_by="score", limit=None)) == ["402", "401", "404", "405", "403"]
+    assert _ids(snap.page(sort_by="bogus", sort_order="sideways", limit=None)) == _ids(snap.page(limit=None))
+
+    boston = snap.page(team="bos", limit=None)
+    assert _ids(boston) == ["401", "402"] and boston["total"] == 2
+    window = snap.page(date_from=datetime(2025, 11, 2), date_to=datetime(2025, 11, 4), limit=None)
+    assert _ids(window) == ["401", "405"]
+    assert _ids(snap.page(date_to=datetime(2025, 11, 3), limit=None)) == ["402"]  # midnight bound, as in SQL
+
+    page = snap.page(limit=2, offset=2)
+    assert _ids(page) == ["405", "402"] and page["total"] == 5 and page["has_more"] and page["offset"] == 2
+    last = snap.page(limit=2, offset=4)
+    assert _ids(last) == ["404"] and not last["has_more"] and last["next_cursor"] is None
+
+    # Callers get copies; mutating a page must not leak into the catalog.
+    page["games"][0]["stats"]["min_probability"] = -1
+    assert snap.page(limit=3)["games"][2]["stats"]["min_probability"] == 0.1
+    g = snap.page(team="GSW")["games"][0]
+    assert g["final_home_score"] is None and g["home_won"] is None and g["game_date"].startswith("2025-11-05")
+
+
+def test_keyset_cursor_pagination():
+    snap = SeasonSnapshot("2025-26", ROWS)
+    seen, cursor = [], None
+    while True:
+        page = snap.page(sort_by="score", limit=2, cursor=cursor)
+        seen += _ids(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == _ids(snap.page(sort_by="score", limit=None))
+
+    # A game inserted ahead of the cursor position doesn't shift the next page (offset paging would repeat one).
+    first = snap.page(limit=2)
+    grown = SeasonSnapshot("2025-26", ROWS + [_row("406", 6, "PHX", "DEN", 120, 118, 0.2, 0.6)])
+    assert _ids(grown.page(limit=2, cursor=first["next_cursor"])) == ["405", "402"]
+    assert grown.page(limit=2, cursor=first["next_cursor"])["offset"] == 3
+
+    with pytest.raises(ValueError):
+        snap.page(sort_order="asc", cursor=first["next_cursor"])
+    with pytest.raises(ValueError):
+        snap.page(cursor="not-a-cursor")
+
+
+class _FakeConn:
+    def __init__(self, state):
+        self.state = state
+
+    def execute(self, sql, params=None):
+        if "pg_stat_user_tables" in sql:
+            rows = [("espn.probabilities_raw_items", 1, self.state["writes"], 0, 0)]
+        else:
+            self.state["queries"].append(params[0])
+            rows = [r for r in self.state["rows"] if r[1] == params[0]]
+        return type("Result", (), {"fetchall": lambda _self: rows})()
+
+
+def test_catalog_rebuilds_on_version_change_and_serves_list_games(monkeypatch):
+    state = {"writes": 10, "queries": [], "rows": list(ROWS) + [_row("301", 2, "BOS", "LAL", 1, 2, 0.1, 0.1, season="2024-25")]}
+    now = [0.0]
+
+    @contextmanager
+    def connect():
+        yield _FakeConn(state)
+
+    catalog = GameCatalog(connect, check_interval=30.0, clock=lambda: now[0])
+    assert catalog.query("2025-26", limit=2)["total"] == 5
+    assert catalog.query("2025-26", sort_by="score")["total"] == 5
+    assert catalog.query("2024-25")["total"] == 1
+    assert state["queries"] == ["2025-26", "2024-25"]
+
+    # New rows land: not visible until the version check is due, then every season rebuilds on demand.
+    state["rows"].append(_row("406", 6, "PHX", "DEN", 120, 118, 0.2, 0.6))
+    state["writes"] += 1
+    now[0] = 10.0
+    assert catalog.query("2025-26")["total"] == 5
+    now[0] = 31.0
+    assert catalog.query("2025-26")["total"] == 6
+    assert state["queries"] == ["2025-26", "2024-25", "2025-26"]
+    now[0] = 62.0
+    assert catalog.query("2025-26")["total"] == 6 and len(state["queries"]) == 3
+    assert catalog.invalidate() == 1
+    assert catalog.query("2025-26")["total"] == 6 and len(state["queries"]) == 4
+
+    monkeypatch.setattr(game_catalog, "_catalog", catalog)
+    resp = games_endpoint.list_games(season="2025-26", limit=2, offset=0, has_kalshi=True, sort_by="date",
+                                     sort_order="desc", team_filter=None, date_from=None, date_to=None, cursor=None)
+    assert _ids(resp) == ["406", "403"] and resp["total"] == 6 and resp["has_more"] and resp["limit"] == 2
+    nxt = games_endpoint.list_games(season="2025-26", limit=2, offset=0, has_kalshi=True, sort_by="date",
+                                    sort_order="desc", team_filter=None, date_from=None, date_to=None,
+                                    cursor=resp["next_cursor"])
+    assert _ids(nxt) == ["401", "405"] and nxt["offset"] == 2
+    empty = games_endpoint.list_games(season="2025-26", limit=2, offset=0, has_kalshi=False, sort_by="date",
+                                      sort_order="desc", team_filter=None, date_from=None, date_to=None, cursor=None)
+    assert empty["games"] == [] and empty["total"] == 0
+    for bad in ({"date_from": "11/01/2025"}, {"cursor": "garbage"}):
+        params = {"season": "2025-26", "limit": 2, "offset": 0, "has_kalshi": True, "sort_by": "date",
+                  "sort_order": "desc", "team_filter": None, "date_from": None, "date_to": None, "cursor": None}
+        with pytest.raises(HTTPException) as exc:
+            games_endpoint.list_games(**(params | bad))
+        assert exc.value.status_code == 400
+    assert len(state["queries"]) == 4
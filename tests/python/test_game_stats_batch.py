@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch game stats engine (webapp/api/endpoints/stats.py) and its write-behind queue
+(webapp/api/stats_writer.py).
+
+Covers:
+1. compute_stats_batch answers many games with a fixed number of queries, returns stored stats for
+   completed games, computes the rest exactly as compute_game_stats does per game, and queues only
+   newly computed completed games for storage
+2. The writer coalesces repeated writes per game, flushes them in one transaction under a fixed
+   advisory lock key (independent of hash randomization), and re-queues rows of a failed flush
+3. A row that keeps failing is isolated after MAX_FLUSH_ATTEMPTS batches and dropped, so later
+   games' stats are still written
+"""
+
+import json
+import os
+import sys
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from webapp.api.endpoints import stats  # noqa: E402
+from webapp.api.stats_writer import GAME_STATS_LOCK_KEY, MAX_FLUSH_ATTEMPTS, GameStatsWriter  # noqa: E402
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return list(self._rows)
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def executemany(self, sql, rows):
+        if self.conn.fail:
+            raise RuntimeError("connection lost")
+        if any(row[0] in self.conn.bad for row in rows):
+            raise ValueError("invalid row")
+        self.conn.written.extend(rows)
+
+
+class _FakeConn:
+    def __init__(self, games=None, completed=(), stored=None):
+        self.games = games or {}
+        self.completed = set(completed)
+        self.stored = stored or {}
+        self.queries = []
+        self.written = []
+        self.locks = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail = False
+        self.bad = set()
+
+    def execute(self, sql, params=()):
+        self.queries.append(sql)
+        ids = params[0] if params else []
+        if "pg_advisory_xact_lock" in sql:
+            self.locks.append(params[0])
+            return _Result([])
+        if "HAVING MAX(e.home_score)" in sql:
+            return _Result([(g,) for g in ids if g in self.completed])
+        if "FROM derived.game_stats" in sql:
+            return _Result([(g, *self.stored[g]) for g in ids if g in self.stored])
+        if "WITH outcomes" in sql:
+            return _Result([(g, *row) for g in ids if g in self.games for row in self.games[g]["espn"]])
+        if "DISTINCT ON (sg.event_id)" in sql:
+            return _Result([(g, self.games[g]["start"], "HOM", "AWY") for g in ids if g in self.games])
+        if "kalshi.candlesticks" in sql:
+            return _Result([(g, *row) for g in ids if g in self.games for row in self.games[g]["kalshi"]])
+        raise AssertionError(f"unexpected query: {sql}")
+
+    @contextmanager
+    def cursor(self):
+        yield _Cursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _game(g, rng, final=True):
+    start = datetime(2025, 11, 1, tzinfo=timezone.utc) + timedelta(days=g)
+    n = 200
+    p = np.clip(0.5 + np.cumsum(rng.normal(0, 0.03, n)), 0.01, 0.99)
+    home_won = g % 2 == 0
+    if final:
+        p[-1] = 1.0 if home_won else 0.0
+    winner = (0 if home_won else 1) if final else None
+    scores = (110, 100) if home_won else (100, 110)
+    espn = [(start + timedelta(seconds=i * 45), float(p[i]), 1 - float(p[i]), *scores, winner) for i in range(n)]
+    kalshi = []
+    for t in range(0, 200 * 45, 60):
+        price = float(np.clip(p[t // 45] * 100 + rng.normal(0, 3), 1, 99))
+        kalshi.append(("home", start + timedelta(seconds=t), round(price) if t % 300 else None, 40, 46))
+    return {"start": start, "espn": espn, "kalshi": kalshi}
+
+
+def test_batch_matches_per_game_and_queues_completed_games():
+    rng = np.random.default_rng(5)
+    games = {f"40{g}": _game(g, rng, final=g != 3) for g in range(5)}
+    stored_row = ({"data_points": 1}, None, None, 120, 99, True)
+    conn = _FakeConn(games, completed={"400", "401", "402", "404", "409"}, stored={"404": stored_row})
+    writer = GameStatsWriter(lambda: nullcontext(conn), autostart=False)
+
+    ids = ["403", "400", "404", "499", "401", "402", "400"]
+    result = stats.compute_stats_batch(conn, ids, writer=writer)
+    assert list(result) == ["403", "400", "404", "401", "402"]  # request order, deduped, no-data game dropped
+    assert len(conn.queries) == 5  # completion, stored, ESPN, schedule, Kalshi: one each for the whole batch
+
+    assert result["404"] == {"game_id": "404", "home_won": True, "final_score": {"home": 120, "away": 99},
+                             "espn": {"data_points": 1}, "kalshi": None, "divergence": None}
+    for game_id in ("400", "401", "402", "403"):
+        game = games[game_id]
+        expected = stats.compute_game_stats(game_id, game["espn"], game["start"], game["kalshi"])
+        assert result[game_id] == expected
+    assert result["403"]["espn"]["data_points"] == 200 and "log_loss" in result["400"]["espn"]
+    assert "decision_weighted" in result["401"]["divergence"]
+
+    # Completed, freshly computed games only (not the in-progress 403 or the stored 404)
+    assert writer.pending == 3 and writer.flush() == 3
+    assert [row[0] for row in conn.written] == ["400", "401", "402"]
+    assert conn.written[0][1:4] == ("2025-26", "HOM", "AWY")
+    assert json.loads(conn.written[1][7]) == json.loads(json.dumps(result["401"]["espn"]))
+
+    # use_stored=False recomputes stored games too (backfill --force)
+    conn.queries.clear()
+    forced = stats.compute_stats_batch(conn, ["404", "400"], use_stored=False)
+    assert forced["400"] == result["400"] and forced["404"]["espn"]["data_points"] == 200
+    assert not any("derived.game_stats" in q for q in conn.queries)
+
+
+def test_writer_coalesces_and_flushes_under_fixed_lock():
+    assert GAME_STATS_LOCK_KEY == 411613988  # crc32 of the table name: the same in every process
+
+    conn = _FakeConn()
+    writer = GameStatsWriter(lambda: nullcontext(conn), autostart=False)
+    base = {"home_won": True, "final_score": {"home": 101, "away": 99}, "kalshi": None, "divergence": None}
+    meta = {"season_label": "2025-26", "home_team_abbrev": "BOS", "away_team_abbrev": "NYK"}
+    writer.enqueue("402", {**base, "espn": {"v": 1}}, meta)
+    writer.enqueue("401", {**base, "espn": {"v": 1}}, meta)
+    writer.enqueue("402", {**base, "espn": {"v": 2}}, meta)
+
+    conn.fail = True
+    assert writer.flush() == 0 and writer.pending == 2  # failed rows stay queued
+    writer.enqueue("401", {**base, "espn": {"v": 3}}, meta)  # newer than the re-queued row
+    conn.fail = False
+    assert writer.flush() == 2 and writer.pending == 0
+    assert [(row[0], json.loads(row[7])["v"]) for row in conn.written] == [("401", 3), ("402", 2)]
+    assert conn.locks == [GAME_STATS_LOCK_KEY, GAME_STATS_LOCK_KEY] and (conn.commits, conn.rollbacks) == (1, 1)
+    assert writer.flush() == 0 and conn.commits == 1  # nothing pending: no transaction
+
+    # Autostarted background flusher; stop() drains what is left
+    threaded = GameStatsWriter(lambda: nullcontext(conn), flush_interval=60)
+    threaded.enqueue("403", {**base, "espn": {}}, meta)
+    threaded.stop()
+    assert conn.written[-1][0] == "403" and threaded.pending == 0
+
+
+def test_writer_drops_a_row_that_keeps_failing():
+    conn = _FakeConn()
+    conn.bad = {"401"}
+    writer = GameStatsWriter(lambda: nullcontext(conn), autostart=False)
+    base = {"home_won": True, "final_score": {"home": 101, "away": 99}, "kalshi": None, "divergence": None}
+    meta = {"season_label": "2025-26", "home_team_abbrev": "BOS", "away_team_abbrev": "NYK"}
+    writer.enqueue("401", {**base, "espn": {}}, meta)
+    writer.enqueue("402", {**base, "espn": {}}, meta)
+
+    for _ in range(MAX_FLUSH_ATTEMPTS - 1):
+        assert writer.flush() == 0 and writer.pending == 2
+    writer.enqueue("403", {**base, "espn": {}}, meta)  # Joins late: not yet out of attempts
+    # Last batch attempt fails too: 401 and 402 are written on their own, 401 is dropped
+    assert writer.flush() == 1 and [row[0] for row in conn.written] == ["402"]
+    assert writer.pending == 1
+    assert writer.flush() == 1 and [row[0] for row in conn.written] == ["402", "403"]
+    assert writer.pending == 0 and writer.flush() == 0
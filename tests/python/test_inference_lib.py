@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled batch scorer (scripts/lib/_inference_lib.py) and its precompute caller.
+
+Covers:
+1. Logistic regression with folded scaling matches build_design_matrix + predict_proba (Platt / isotonic / none)
+2. CatBoost raw-margin scoring with the opening-odds baseline matches predict_proba; Arrow batches score the same
+3. Missing inputs and feature layouts build_design_matrix cannot produce are rejected up front
+4. Precompute scores rows with the old per-snapshot defaults for missing values
+"""
+
+import os
+import sys
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from catboost import CatBoostClassifier
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._inference_lib import CompiledModel, compile_artifact  # noqa: E402
+from scripts.lib._winprob_lib import (  # noqa: E402
+    IsotonicCalibrator,
+    ModelParams,
+    PlattCalibrator,
+    PreprocessParams,
+    WinProbArtifact,
+    build_design_matrix,
+    predict_proba,
+)
+from scripts.model.precompute_model_probabilities import score_snapshots, snapshot_model_inputs  # noqa: E402
+
+FEATURES = [
+    "point_differential_scaled",
+    "time_remaining_regulation_scaled",
+    "possession_home",
+    "possession_away",
+    "possession_unknown",
+    "score_diff_div_sqrt_time_remaining_scaled",
+    "espn_home_prob_scaled",
+    "espn_home_prob_lag_1_scaled",
+    "espn_home_prob_delta_1_scaled",
+    "period_1",
+    "period_2",
+    "period_3",
+    "period_4",
+    "opening_overround",
+]
+PREPROCESS = PreprocessParams(1.0, 10.0, 1400.0, 800.0, 0.1, 1.2, 0.5, 0.3, 0.5, 0.3, 0.0, 0.05)
+ISOTONIC = IsotonicCalibrator(np.array([0.0, 0.3, 0.6, 1.0]), np.array([0.0, 0.2, 0.7, 1.0]), 0.0, 1.0)
+
+
+def _columns(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "point_differential": rng.integers(-30, 30, n).astype(float),
+        "time_remaining_regulation": rng.uniform(0, 2880, n),
+        "possession": rng.choice(["home", "away", "unknown", " HOME "], n),
+        "score_diff_div_sqrt_time_remaining": rng.normal(size=n),
+        "espn_home_prob": rng.random(n),
+        "espn_home_prob_lag_1": np.where(rng.random(n) < 0.1, np.nan, rng.random(n)),
+        "espn_home_prob_delta_1": rng.normal(0, 0.05, n),
+        "period": rng.integers(0, 6, n).astype(float),
+        "opening_overround": np.where(rng.random(n) < 0.3, np.nan, 0.045),
+        "opening_prob_home_fair": np.where(rng.random(n) < 0.3, np.nan, rng.uniform(0.2, 0.8, n)),
+    }
+
+
+def _design(cols, odds_nan_policy):
+    return build_design_matrix(
+        point_differential=cols["point_differential"],
+        time_remaining_regulation=cols["time_remaining_regulation"],
+        possession=cols["possession"],
+        preprocess=PREPROCESS,
+        score_diff_div_sqrt_time_remaining=cols["score_diff_div_sqrt_time_remaining"],
+        espn_home_prob=cols["espn_home_prob"],
+        espn_home_prob_lag_1=cols["espn_home_prob_lag_1"],
+        espn_home_prob_delta_1=cols["espn_home_prob_delta_1"],
+        period=cols["period"],
+        opening_overround=cols["opening_overround"],
+        odds_nan_policy=odds_nan_policy,
+    )
+
+
+def _artifact(*, platt=None, isotonic=None, weights=(), **kwargs):
+    return WinProbArtifact(
+        created_at_utc="20250101T000000Z",
+        version="v1",
+        train_season_start_max=2022,
+        calib_season_start=2023,
+        test_season_start=2024,
+        buckets_seconds_remaining=[],
+        preprocess=PREPROCESS,
+        feature_names=kwargs.pop("feature_names", FEATURES),
+        model=ModelParams(list(weights), 0.3, 1.0, 50, 1e-6),
+        platt=platt,
+        isotonic=isotonic,
+        **kwargs,
+    )
+
+
+def test_logreg_fused_scoring_matches_predict_proba():
+    cols = _columns()
+    X = _design(cols, "zero")
+    weights = np.random.default_rng(1).normal(size=len(FEATURES))
+    for platt, isotonic in ((PlattCalibrator(0.1, 1.2), None), (None, ISOTONIC), (None, None)):
+        art = _artifact(platt=platt, isotonic=isotonic, weights=weights)
+        np.testing.assert_allclose(CompiledModel(art).score(cols), predict_proba(art, X=X), rtol=0, atol=1e-12)
+    assert compile_artifact(art) is compile_artifact(art)
+
+
+def test_catboost_margin_scoring_matches_predict_proba():
+    cols = _columns(seed=2)
+    X = _design(cols, "keep")
+    y = (np.random.default_rng(3).random(len(X)) < 0.5).astype(int)
+    with tempfile.TemporaryDirectory() as d:
+        model = CatBoostClassifier(iterations=30, depth=3, verbose=0, allow_writing_files=False)
+        model.fit(X, y)
+        model.save_model(str(Path(d) / "m.cbm"))
+        for platt, isotonic, baseline in ((PlattCalibrator(0.1, 1.2), None, True), (None, ISOTONIC, False)):
+            art = _artifact(
+                platt=platt,
+                isotonic=isotonic,
+                model_type="catboost",
+                catboost_model_path="m.cbm",
+                uses_opening_odds_baseline=baseline,
+            )
+            compiled = CompiledModel(art, artifact_dir=Path(d))
+            assert ("opening_prob_home_fair" in compiled.input_columns) == baseline
+            ref = predict_proba(
+                _artifact(
+                    platt=platt,
+                    isotonic=isotonic,
+                    model_type="catboost",
+                    catboost_model_path=str(Path(d) / "m.cbm"),
+                    uses_opening_odds_baseline=baseline,
+                ),
+                X=X,
+                opening_prob_home_fair=cols["opening_prob_home_fair"] if baseline else None,
+            )
+            got = compiled.score(cols)
+            # CatBoost keeps Pool baselines in float32; the compiled path adds the baseline in float64.
+            np.testing.assert_allclose(got, ref, rtol=0, atol=1e-6)
+            np.testing.assert_array_equal(compiled.score(pa.RecordBatch.from_pydict(cols)), got)
+
+
+def test_missing_inputs_and_unsupported_layouts_are_rejected():
+    art = _artifact(weights=np.ones(len(FEATURES)))
+    cols = _columns(n=10)
+    del cols["espn_home_prob_lag_1"]
+    with pytest.raises(ValueError, match="espn_home_prob_lag_1"):
+        CompiledModel(art).score(cols)
+    old = FEATURES[:5] + ["opening_prob_home_fair", "opening_overround"]
+    with pytest.raises(ValueError, match="Unsupported feature layout"):
+        CompiledModel(_artifact(weights=np.ones(len(old)), feature_names=old))
+
+
+def test_precompute_inputs_apply_missing_value_defaults():
+    weights = np.random.default_rng(4).normal(size=len(FEATURES))
+    art = _artifact(platt=PlattCalibrator(0.0, 1.0), weights=weights)
+    rows = [
+        ("2024-25", "g1", 1, None, 3, 1200.0, Decimal("0.61"), 0.08, 0.6, 0.01, 2, 1.8, 2.1, -3.5, 221.5),
+        ("2024-25", "g1", 2, None, None, None, None, None, None, None, None, None, None, None, None),
+    ]
+    probs = score_snapshots(snapshot_model_inputs(rows), {"logreg_platt": CompiledModel(art)})
+    assert probs["catboost_odds_platt_v2_prob"] is None
+
+    # Second row as the old per-snapshot path filled it in: 0 diff, full game, 0.5 prob, period 1.
+    X = build_design_matrix(
+        point_differential=np.array([3.0, 0.0]),
+        time_remaining_regulation=np.array([1200.0, 2880.0]),
+        possession=["unknown", "unknown"],
+        preprocess=PREPROCESS,
+        score_diff_div_sqrt_time_remaining=np.array([0.08, 0.0]),
+        espn_home_prob=np.array([0.61, 0.5]),
+        espn_home_prob_lag_1=np.array([0.6, 0.5]),
+        espn_home_prob_delta_1=np.array([0.01, 0.0]),
+        period=[2, 1],
+        opening_overround=np.array([1 / 1.8 + 1 / 2.1 - 1.0, 0.0]),
+    )
+    np.testing.assert_allclose(probs["logreg_platt_prob"], predict_proba(art, X=X), rtol=0, atol=1e-12)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable background job queue (webapp/api/jobs.py).
+
+Covers:
+1. The job table: identical active requests share one job, the running-job limit, cancellation of queued jobs,
+   recovery of jobs orphaned by a dead dispatcher, and pruning of old finished jobs with their result files
+2. Jobs run in spawned worker processes: results land on disk, progress and updates are reported,
+   a running job stops when cancelled, and a crashed worker fails its job
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from webapp.api.jobs import JobQueue, JobStore  # noqa: E402
+
+
+def test_store_dedup_limits_cancel_and_recovery(tmp_path):
+    store = JobStore(tmp_path)
+    assert store.get("missing") is None
+
+    job, created = store.submit("sim", "k1", {"n": 1}, now=100.0)
+    same, created_again = store.submit("sim", "k1", {"n": 1}, now=101.0)
+    other, _ = store.submit("sim", "k2", {"n": 2}, now=102.0)
+    assert created and not created_again and same.id == job.id
+    assert job.status == "queued" and job.params == {"n": 1}
+
+    claimed = store.claim("owner-a", ("sim",), limit=1, now=110.0)
+    assert claimed.id == job.id and claimed.status == "running" and claimed.attempts == 1
+    assert store.claim("owner-a", ("sim",), limit=1, now=110.0) is None  # limit reached
+    assert store.claim("owner-a", ("other",), limit=5, now=110.0) is None  # no queued job of that kind
+
+    # Queued jobs are cancelled at once; a finished job no longer deduplicates
+    assert store.request_cancel(other.id, now=111.0).status == "cancelled"
+    assert store.submit("sim", "k2", {"n": 2}, now=112.0)[1]
+
+    # The dispatcher dies: its running job is re-queued once the heartbeat is stale, and fails after max attempts
+    assert store.requeue_orphans(now=150.0, timeout=60.0) == 0
+    assert store.requeue_orphans(now=171.0, timeout=60.0) == 1
+    assert store.get(job.id).status == "queued"
+    store.claim("owner-b", ("sim",), limit=1, now=200.0)
+    assert store.requeue_orphans(now=300.0, timeout=60.0, max_attempts=2) == 1
+    failed = store.get(job.id)
+    assert failed.status == "error" and "Interrupted 2 times" in failed.error
+
+    store.write_result(job.id, {"profit": 1.5})
+    assert store.read_result(job.id) == {"profit": 1.5}
+    assert store.prune(now=200.0, retention=100) == 0
+    assert store.prune(now=1000.0, retention=100) == 2  # the failed and the cancelled job
+    assert store.get(job.id) is None and store.read_result(job.id) is None
+
+
+def _sum_runner(params, job):
+    total = 0
+    for i, value in enumerate(params["values"]):
+        total += value
+        job.report({"current": i + 1, "total": len(params["values"])}, force=True)
+    return {"total": total}
+
+
+def _wait_runner(params, job):
+    job.report({"current": 0, "total": 1}, force=True)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        job.check_cancelled()
+        time.sleep(0.05)
+    return {"finished": True}
+
+
+def _crash_runner(params, job):
+    os._exit(3)
+
+
+def _drive(queue, job_id, statuses=("complete", "error", "cancelled"), timeout=60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        queue.run_once()
+        job = queue.get(job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {queue.get(job_id).status}")
+
+
+def test_jobs_run_in_worker_processes(tmp_path, monkeypatch):
+    updates = []
+    queue = JobQueue(JobStore(tmp_path), max_concurrent=2)
+    queue.register("sum", _sum_runner, on_update=updates.append)
+    queue.register("wait", _wait_runner)
+    queue.register("crash", _crash_runner)
+    monkeypatch.setattr(queue, "start", lambda: None)  # drive the dispatcher by hand instead of from its thread
+
+    job, created = queue.submit("sum", "a", {"values": [1, 2, 3]})
+    assert created
+    done = _drive(queue, job.id)
+    assert done.status == "complete" and done.progress == {"current": 3, "total": 3}
+    assert queue.result(job.id) == {"total": 6}
+    queue.run_once()
+    assert updates[-1].status == "complete" and updates[-1].id == job.id
+
+    waiting, _ = queue.submit("wait", "b", {})
+    _drive(queue, waiting.id, statuses=("running",))
+    assert queue.submit("wait", "b", {})[0].id == waiting.id  # joins the running job
+    assert queue.cancel(waiting.id).cancel_requested
+    cancelled = _drive(queue, waiting.id)
+    assert cancelled.status == "cancelled" and queue.result(waiting.id) is None
+
+    crashed, _ = queue.submit("crash", "c", {})
+    failed = _drive(queue, crashed.id)
+    assert failed.status == "error" and "exit code 3" in failed.error
+    assert not queue._processes
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for out-of-core logistic regression fitting (fit_logistic_regression_irls_chunked in
+scripts/lib/_winprob_lib.py) and the streaming path of scripts/model/train_winprob_logreg.py.
+
+Covers:
+1. Chunked IRLS over float32 chunks reaches the in-memory IRLS solution, independent of chunk size
+2. Warm-starting from a previous solution converges immediately
+3. Streaming standardization params over cached Parquet partitions match the in-memory computation
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._feature_cache_lib import iter_partition_batches, partition_files, write_partitioned  # noqa: E402
+from scripts.lib._winprob_lib import (  # noqa: E402
+    fit_logistic_regression_irls,
+    fit_logistic_regression_irls_chunked,
+)
+from scripts.model.train_winprob_logreg import _streaming_preprocess  # noqa: E402
+
+
+def _problem(n=5000, d=6, seed=3):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, d)).astype(np.float32)
+    true_w = rng.normal(size=d)
+    y = (rng.random(n) < 1 / (1 + np.exp(-(0.3 + X @ true_w)))).astype(np.float64)
+    return X, y
+
+
+def _chunks(X, y, size):
+    return lambda: ((X[i:i + size], y[i:i + size]) for i in range(0, len(X), size))
+
+
+def test_chunked_irls_matches_in_memory_solution():
+    X, y = _problem()
+    w_ref, b_ref = fit_logistic_regression_irls(X=X, y=y, l2_lambda=1.0, max_iter=50, tol=1e-10)
+    for size in (7, 1000, len(X)):
+        w, b = fit_logistic_regression_irls_chunked(chunks=_chunks(X, y, size), l2_lambda=1.0, max_iter=50, tol=1e-10)
+        np.testing.assert_allclose(w, w_ref, rtol=0, atol=1e-9)
+        assert abs(b - b_ref) < 1e-9
+
+
+def test_warm_start_converges_immediately():
+    X, y = _problem(seed=11)
+    w_ref, b_ref = fit_logistic_regression_irls(X=X, y=y, l2_lambda=0.5, max_iter=50, tol=1e-12)
+    calls = []
+
+    def counting_chunks():
+        calls.append(1)
+        return _chunks(X, y, 512)()
+
+    w, b = fit_logistic_regression_irls_chunked(
+        chunks=counting_chunks, l2_lambda=0.5, max_iter=50, tol=1e-8, init_weights=w_ref, init_intercept=b_ref
+    )
+    assert len(calls) == 1
+    np.testing.assert_allclose(w, w_ref, atol=1e-9)
+
+    w_mem, _ = fit_logistic_regression_irls(X=X, y=y, l2_lambda=0.5, max_iter=1, tol=1e-8, init_weights=w_ref, init_intercept=b_ref)
+    np.testing.assert_allclose(w_mem, w_ref, atol=1e-9)
+
+
+def test_streaming_preprocess_matches_in_memory():
+    rng = np.random.default_rng(5)
+    n = 3000
+    seasons = rng.choice([2019, 2020, 2021], size=n)
+    lag = rng.random(n)
+    lag[::10] = np.nan
+    table = pa.table(
+        {
+            "season_start": seasons,
+            "point_differential": rng.integers(-30, 30, size=n).astype(float),
+            "time_remaining_regulation": rng.uniform(0, 2880, size=n),
+            "possession": ["unknown"] * n,
+            "final_winning_team": np.where(np.arange(n) % 17 == 0, np.nan, rng.integers(0, 2, size=n)),
+            "espn_home_prob": rng.random(n),
+            "espn_home_prob_lag_1": lag,
+        }
+    )
+    with tempfile.TemporaryDirectory() as d:
+        entry = Path(d) / "entry"
+        write_partitioned(table, entry, partition_column="season_start", meta={})
+        parts = [f for _, f in sorted(partition_files(entry).items())]
+        assert len(parts) == 3
+        assert max(b.num_rows for b in iter_partition_batches(entry, parts, batch_rows=100)) == 100
+
+        columns = table.column_names
+        preprocess, rows = _streaming_preprocess(entry, parts, columns, use_interaction_terms=True, batch_rows=97)
+
+    df = table.to_pandas()
+    df = df[df["final_winning_team"].notna()]
+    assert rows == len(df)
+    assert abs(preprocess.point_diff_mean - df["point_differential"].mean()) < 1e-9
+    assert abs(preprocess.time_rem_std - np.std(df["time_remaining_regulation"].to_numpy(), ddof=0)) < 1e-6
+    lag_vals = df["espn_home_prob_lag_1"].dropna().to_numpy()
+    assert abs(preprocess.espn_home_prob_lag_1_mean - lag_vals.mean()) < 1e-12
+    assert abs(preprocess.espn_home_prob_lag_1_std - np.std(lag_vals, ddof=0)) < 1e-12
+    assert preprocess.score_diff_div_sqrt_time_rem_mean is None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized metrics core (scripts/lib/_metrics_lib.py) and the callers that delegate to it.
+
+Covers:
+1. Tie-averaged AUC and one-pass ECE / reliability bins match the previous loop implementations
+2. Bootstrap CIs: weight-based replicates equal explicit resampling; game-level resampling widens intervals
+3. stats.py Brier / log-loss / reliability curve keep their output format and values
+4. Grouped metrics for several models and grouping keys equal per-group metrics_summary
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib import _metrics_lib  # noqa: E402
+from scripts.lib._winprob_lib import ece_binned, roc_auc  # noqa: E402
+from webapp.api.endpoints import stats  # noqa: E402
+
+
+def _loop_auc(p, y):
+    order = np.argsort(p, kind="mergesort")
+    ps, ys = p[order], y[order]
+    ranks = np.empty(len(ps))
+    i, r = 0, 1.0
+    while i < len(ps):
+        j = i + 1
+        while j < len(ps) and ps[j] == ps[i]:
+            j += 1
+        ranks[i:j] = (r + (r + (j - i) - 1.0)) / 2.0
+        r += j - i
+        i = j
+    n1, n0 = int(np.sum(y == 1)), int(np.sum(y == 0))
+    return (float(np.sum(ranks[ys == 1])) - n1 * (n1 + 1) / 2.0) / (n0 * n1)
+
+
+def _loop_ece(p, y, bins):
+    idx = np.minimum(bins - 1, np.maximum(0, np.floor(p * bins).astype(np.int32)))
+    ece = 0.0
+    for b in range(bins):
+        mask = idx == b
+        if mask.any():
+            ece += mask.sum() / len(p) * abs(y[mask].mean() - p[mask].mean())
+    return ece
+
+
+def _scores(n=4000, seed=1):
+    rng = np.random.default_rng(seed)
+    # Rounded scores force plenty of ties (as ESPN probabilities have).
+    p = np.round(rng.beta(2, 2, size=n), 2)
+    y = (rng.random(n) < p).astype(np.float64)
+    return p, y
+
+
+def test_auc_ece_and_reliability_match_loop_versions():
+    p, y = _scores()
+    assert abs(roc_auc(p, y) - _loop_auc(p, y)) < 1e-12
+    assert roc_auc(p, np.ones_like(p)) is None
+    for bins in (1, 10, 20, 37):
+        assert abs(ece_binned(p, y, bins=bins) - _loop_ece(p, y, bins)) < 1e-12
+    assert ece_binned(p[:0], y[:0], bins=10) is None
+
+    rows = _metrics_lib.reliability_bins(p, y, bins=20)
+    assert sum(r["n"] for r in rows) == len(p)
+    for r in rows:
+        mask = np.minimum(19, np.floor(p * 20).astype(int)) == r["bin"]
+        assert r["n"] == mask.sum()
+        assert abs(r["avg_p"] - p[mask].mean()) < 1e-12
+        assert abs(r["gap"] - (y[mask].mean() - p[mask].mean())) < 1e-12
+
+    summary = _metrics_lib.metrics_summary(p, y, bins=20)
+    assert summary["n"] == len(p) and abs(summary["prevalence_home_win"] - y.mean()) < 1e-12
+
+
+def test_bootstrap_weights_match_resampling_and_respect_groups():
+    p, y = _scores(n=600, seed=4)
+    # One replicate, reproduced by materializing the resample the weights stand for.
+    ci = _metrics_lib.bootstrap_ci(p, y, bins=10, n_boot=1, seed=9)
+    draw = np.random.default_rng(9).integers(0, len(p), size=len(p))
+    ps, ys = p[draw], y[draw]
+    assert abs(ci["brier"]["lo"] - np.mean((ps - ys) ** 2)) < 1e-12
+    assert abs(ci["roc_auc"]["lo"] - _loop_auc(ps, ys)) < 1e-12
+    assert abs(ci["ece_binned"]["lo"] - _loop_ece(ps, ys, 10)) < 1e-12
+
+    # 30 "games" of 20 near-identical rows: row resampling badly understates the spread.
+    rng = np.random.default_rng(2)
+    games = np.repeat(np.arange(30), 20)
+    p_game = np.clip(np.repeat(rng.random(30), 20) + rng.normal(0, 0.02, size=600), 0, 1)
+    y_game = np.repeat((rng.random(30) < 0.5).astype(float), 20)
+    rows_ci = _metrics_lib.bootstrap_ci(p_game, y_game, bins=10, n_boot=300, seed=0)
+    game_ci = _metrics_lib.bootstrap_ci(p_game, y_game, bins=10, n_boot=300, seed=0, groups=games)
+    point = _metrics_lib.brier(p_game, y_game)
+    assert game_ci["brier"]["lo"] <= point <= game_ci["brier"]["hi"]
+    assert game_ci["brier"]["std"] > 2 * rows_ci["brier"]["std"]
+
+
+def test_stats_endpoint_metrics_keep_format():
+    probs = [0.0, 0.05, 0.1, 0.3, 0.3, 0.55, 0.7, 0.99, 1.0]
+    for outcome in (0, 1):
+        brier_ref = sum((q - outcome) ** 2 for q in probs) / len(probs)
+        clipped = [max(0.01, min(0.99, q)) for q in probs]
+        ll_ref = -sum(outcome * math.log(q) + (1 - outcome) * math.log(1 - q) for q in clipped) / len(clipped)
+        assert abs(stats.calculate_brier_score(probs, outcome) - brier_ref) < 1e-12
+        assert abs(stats.calculate_log_loss(probs, outcome) - ll_ref) < 1e-12
+    assert stats.calculate_brier_score([], 1) is None
+
+    outcomes = [0, 0, 1, 0, 1, 1, 1, 1, 1]
+    curve = stats.calculate_reliability_curve(probs, outcomes, bins=10)["bins"]
+    assert len(curve) == 10
+    by_bin: dict[int, list[tuple[float, int]]] = {}
+    for q, o in zip(probs, outcomes):
+        by_bin.setdefault(min(int(q / 0.1), 9), []).append((q, o))
+    for i, row in enumerate(curve):
+        members = by_bin.get(i, [])
+        assert row["count"] == len(members)
+        if members:
+            assert abs(row["predicted_prob"] - sum(q for q, _ in members) / len(members)) < 1e-12
+            assert abs(row["actual_freq"] - sum(o for _, o in members) / len(members)) < 1e-12
+        else:
+            assert row["actual_freq"] is None and row["calibration_error"] is None
+            assert row["predicted_prob"] == row["bin_center"]
+    assert stats.calculate_reliability_curve([0.5], [1, 0]) == {"bins": []}
+
+
+def test_grouped_metrics_match_per_group_summaries():
+    rng = np.random.default_rng(7)
+    n = 3000
+    y = (rng.random(n) < 0.55).astype(np.float64)
+    probs = {f"m{i}": np.round(np.clip(y * 0.3 + rng.random(n) * 0.7, 0, 1), 2) for i in range(3)}
+    period = rng.integers(1, 5, n)
+    has_odds = rng.random(n) < 0.8
+    # A group with a single class: AUC is undefined there.
+    y[period == 4] = 1.0
+    keys = {"period": period, "has_odds": has_odds}
+    rows = _metrics_lib.grouped_metrics(probs, y, keys=keys, bins=10)
+    assert len(rows) == 3 * (1 + 4 + 2)
+    for r in rows:
+        mask = np.ones(n, dtype=bool) if r["group_by"] == "overall" else keys[r["group_by"]] == r["group"]
+        ref = _metrics_lib.metrics_summary(probs[r["model"]][mask], y[mask], bins=10)
+        for k in ("n", "logloss", "brier", "ece_binned", "prevalence_home_win"):
+            assert abs(r[k] - ref[k]) < 1e-12, (r, k)
+        if ref["roc_auc"] is None:
+            assert r["roc_auc"] is None and r["group"] == 4
+        else:
+            assert abs(r["roc_auc"] - ref["roc_auc"]) < 1e-12
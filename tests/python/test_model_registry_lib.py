@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy model registry (scripts/lib/_model_registry_lib.py).
+
+Covers:
+1. Name index: named models plus artifact file stems; unknown names, file paths and missing files raise
+2. get()/compiled() parse once per file version and reload after the file changes on disk
+3. warm() compiles existing models and skips missing ones
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._inference_lib import compile_artifact  # noqa: E402
+from scripts.lib._model_registry_lib import ModelRegistry  # noqa: E402
+from scripts.lib._winprob_lib import ModelParams, PreprocessParams, WinProbArtifact, save_artifact  # noqa: E402
+
+FEATURES = ["point_differential_scaled", "time_remaining_regulation_scaled", "possession_home", "possession_away", "possession_unknown"]
+
+
+def _write(path: Path, intercept: float) -> None:
+    art = WinProbArtifact(
+        created_at_utc="20250101T000000Z",
+        version="v1",
+        train_season_start_max=2022,
+        calib_season_start=2023,
+        test_season_start=2024,
+        buckets_seconds_remaining=[],
+        preprocess=PreprocessParams(0.0, 10.0, 1440.0, 800.0),
+        feature_names=FEATURES,
+        model=ModelParams([0.5, -0.1, 0.2, -0.2, 0.0], intercept, 1.0, 50, 1e-6),
+        platt=None,
+        isotonic=None,
+    )
+    save_artifact(path, art)
+
+
+def _registry(root: Path) -> ModelRegistry:
+    (root / "models").mkdir()
+    _write(root / "models" / "winprob_a.json", 0.1)
+    _write(root / "models" / "winprob_b.json", 0.2)
+    return ModelRegistry(root=root, named={"alias": "models/winprob_a.json", "gone": "models/missing.json"}, model_dirs=("models",))
+
+
+def test_index_resolves_named_models_and_file_stems():
+    with tempfile.TemporaryDirectory() as d:
+        reg = _registry(Path(d))
+        index = reg.index()
+        assert set(index) == {"alias", "gone", "winprob_a", "winprob_b"}
+        assert reg.path("alias") == reg.path("winprob_a")
+        with pytest.raises(ValueError, match="Unknown model name"):
+            reg.path("nope")
+        # An existing artifact outside the index is not loadable by its path
+        stray = Path(d) / "stray.json"
+        _write(stray, 0.3)
+        for name in (str(stray), str(reg.path("winprob_a"))):
+            with pytest.raises(ValueError, match="Unknown model name"):
+                reg.get(name)
+        with pytest.raises(FileNotFoundError):
+            reg.get("gone")
+
+
+def test_get_is_memoized_until_the_file_changes():
+    with tempfile.TemporaryDirectory() as d:
+        reg = _registry(Path(d))
+        art = reg.get("winprob_a")
+        assert reg.get("alias") is art
+        compiled = reg.compiled("winprob_a")
+        assert compiled is reg.compiled("alias") is compile_artifact(art)
+
+        path = reg.path("winprob_a")
+        _write(path, 0.7)
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        reloaded = reg.get("winprob_a")
+        assert reloaded is not art and reloaded.model.intercept == 0.7
+        recompiled = reg.compiled("winprob_a")
+        assert recompiled is not compiled
+        cols = {"point_differential": np.array([3.0]), "time_remaining_regulation": np.array([600.0])}
+        assert recompiled.score(cols)[0] != compiled.score(cols)[0]
+
+
+def test_warm_skips_missing_models():
+    with tempfile.TemporaryDirectory() as d:
+        reg = _registry(Path(d))
+        assert reg.warm() == ["alias"]
+        assert reg.warm(["winprob_b", "gone", "nope"]) == ["winprob_b"]
+        thread = reg.warm_in_background(["winprob_a"])
+        thread.join(timeout=10)
+        assert not thread.is_alive()
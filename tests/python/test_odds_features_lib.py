@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-game opening-odds feature store (scripts/lib/_odds_features_lib.py).
+
+Covers:
+1. Per-game engineering matches compute_opening_odds_features, including missing / invalid lines
+2. Broadcasting to snapshot rows, and precompute inputs from the store match the per-row engineering path
+3. A scoped refresh before the first full build builds every game and records the build; later scoped
+   refreshes rewrite only their games, and loading builds a never-built table instead of trusting it
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._odds_features_lib import (  # noqa: E402
+    OPENING_ODDS_COLUMNS,
+    broadcast_opening_odds,
+    engineer_opening_odds,
+    load_opening_odds_features,
+    refresh_opening_odds_features,
+)
+from scripts.lib._winprob_lib import compute_opening_odds_features  # noqa: E402
+from scripts.model.precompute_model_probabilities import snapshot_model_inputs  # noqa: E402
+
+PIVOT_ROWS = [
+    ("g1", 1.8, 2.1, -3.5, 221.5),
+    ("g2", None, 1.9, None, 230.0),  # no home moneyline
+    ("g3", 1.0, 3.0, 2.5, None),  # invalid decimal odds
+    ("g4", 1.55, 2.6, -6.0, 218.0),
+]
+
+
+def test_engineering_matches_per_row_features():
+    store = engineer_opening_odds(PIVOT_ROWS)
+    assert list(store) == ["g1", "g2", "g3", "g4"]
+    for gid, ml_home, ml_away, spread, total in PIVOT_ROWS:
+        ref = compute_opening_odds_features(
+            opening_moneyline_home=np.nan if ml_home is None else ml_home,
+            opening_moneyline_away=ml_away,
+            opening_spread=np.nan if spread is None else spread,
+            opening_total=np.nan if total is None else total,
+        )
+        got = dict(zip(OPENING_ODDS_COLUMNS, store[gid]))
+        np.testing.assert_equal(got["opening_prob_home_fair"], ref["opening_prob_home_fair"])
+        np.testing.assert_equal(got["opening_overround"], ref["opening_overround"])
+        np.testing.assert_equal(got["opening_spread"], np.nan if spread is None else spread)
+    assert np.isnan(store["g2"][4]) and np.isnan(store["g3"][5])
+    assert engineer_opening_odds([]) == {}
+
+
+def test_broadcast_and_precompute_inputs_match_row_path():
+    store = engineer_opening_odds(PIVOT_ROWS)
+    game_ids = ["g4", "g1", "g1", "missing", "g4", "g2"]
+    out = broadcast_opening_odds(game_ids, store)
+    for j, name in enumerate(OPENING_ODDS_COLUMNS):
+        expected = [store.get(g, (np.nan,) * len(OPENING_ODDS_COLUMNS))[j] for g in game_ids]
+        np.testing.assert_array_equal(out[name], np.array(expected, dtype=np.float64))
+    assert all(len(v) == 0 for v in broadcast_opening_odds([], store).values())
+
+    # Rows as precompute reads them (first 11 columns) plus the raw opening lines the old path read per row.
+    raw = {r[0]: r[1:] for r in PIVOT_ROWS}
+    rows = []
+    for i, gid in enumerate(game_ids):
+        base = ("2024-25", gid, i, None, i - 2, 2000.0 - 100 * i, 0.4 + 0.05 * i, None, None, None, 1 + i % 4)
+        rows.append(base + tuple(raw.get(gid, (None, None, None, None))))
+    from_store = snapshot_model_inputs([r[:11] for r in rows], store)
+    per_row = snapshot_model_inputs(rows)
+    assert from_store.keys() == per_row.keys()
+    for name in from_store:
+        np.testing.assert_array_equal(from_store[name], per_row[name], err_msg=name)
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class _FakeConn:
+    """external.sportsbook_odds_snapshots (as pivot rows) plus the feature and build-marker tables in memory."""
+
+    def __init__(self, pivot_rows):
+        self.pivot_rows = pivot_rows
+        self.features = {}
+        self.builds = []
+        self.pivots = []  # scope of each pivot query (None = every game)
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    @contextmanager
+    def cursor(self):
+        yield self
+
+    def commit(self):
+        pass
+
+    def execute(self, sql, params=()):
+        if "CREATE TABLE" in sql:
+            return _Result([])
+        if "FROM external.sportsbook_odds_snapshots" in sql:
+            scope = params[0] if params else None
+            self.pivots.append(scope)
+            return _Result([r for r in self.pivot_rows if scope is None or r[0] in scope])
+        if "opening_odds_features_builds_v1" in sql:
+            if sql.lstrip().startswith("INSERT"):
+                self.builds.append(params[0])
+                return _Result([])
+            return _Result([(bool(self.builds),)])
+        if sql.lstrip().startswith("DELETE"):
+            for gid in [g for g in self.features if not params or g in params[0]]:
+                del self.features[gid]
+            return _Result([])
+        rows = [(gid, *values) for gid, values in sorted(self.features.items()) if not params or gid in params[0]]
+        return _Result(rows)
+
+    def executemany(self, sql, rows):
+        for row in rows:
+            self.features[row[0]] = row[1:]
+
+
+def test_scoped_refresh_before_first_build_builds_every_game():
+    conn = _FakeConn(PIVOT_ROWS)
+    # The first load only touched g2, but the table has never been built: every game is written
+    assert refresh_opening_odds_features(conn, ["g2"]) == 4
+    assert conn.pivots == [None] and sorted(conn.features) == ["g1", "g2", "g3", "g4"] and conn.builds == [4]
+
+    # Once built, a scoped refresh rewrites only its games
+    conn.pivot_rows = [("g1", 2.0, 1.8, 1.5, 219.0), *PIVOT_ROWS[1:]]
+    assert refresh_opening_odds_features(conn, ["g1"]) == 1
+    assert conn.pivots[-1] == ["g1"] and conn.features["g1"][:4] == (2.0, 1.8, 1.5, 219.0) and conn.builds == [4]
+
+    # Loading from a database whose table was never built builds it rather than returning a partial store
+    fresh = _FakeConn(PIVOT_ROWS)
+    fresh.features = {"g2": (None, 1.9, None, 230.0, None, None)}
+    store = load_opening_odds_features(fresh)
+    assert sorted(store) == ["g1", "g2", "g3", "g4"] and fresh.builds == [4]
+    np.testing.assert_equal(store["g4"], engineer_opening_odds(PIVOT_ROWS)["g4"])
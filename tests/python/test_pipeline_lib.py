@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process DAG pipeline runner (scripts/lib/_pipeline_lib.py).
+
+Covers:
+1. Independent branches run concurrently; dependents wait for their upstream
+2. Failures skip only their downstream steps and are reported per step
+3. Invalid graphs (cycles, unknown deps) are rejected up front
+4. In-process script main(argv) exit-code handling
+5. Per-step timeouts: a hung step is reported failed without being waited for, its downstream is
+   skipped, the clock starts when the step starts (not while it is queued), and the report can wait
+   for the abandoned thread to return
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._pipeline_lib import (  # noqa: E402
+    PipelineStep,
+    call_script_main,
+    run_pipeline,
+    run_script_main,
+)
+
+
+def _sleeper(seconds, value):
+    def fn(upstream):
+        time.sleep(seconds)
+        return value
+
+    return fn
+
+
+def test_independent_branches_overlap_and_pass_values():
+    order = []
+    lock = threading.Lock()
+
+    def record(name, value):
+        def fn(upstream):
+            time.sleep(0.2)
+            with lock:
+                order.append(name)
+            return (value, upstream)
+
+        return fn
+
+    steps = [
+        PipelineStep("espn", record("espn", 1)),
+        PipelineStep("kalshi", record("kalshi", 2)),
+        PipelineStep("load", record("load", 3), depends_on=("espn",)),
+    ]
+    t0 = time.monotonic()
+    report = run_pipeline(steps, max_workers=4)
+    elapsed = time.monotonic() - t0
+
+    assert report.ok
+    assert [r.name for r in report.steps] == ["espn", "kalshi", "load"]
+    assert order.index("load") > order.index("espn")
+    assert report["load"].value == (3, {"espn": (1, {})})
+    # Serial would be 0.6s; the two roots overlap so the critical path is 0.4s.
+    assert elapsed < 0.55, elapsed
+    assert all(r.elapsed_seconds >= 0.19 and r.started_at for r in report.steps)
+
+
+def test_failure_skips_downstream_only():
+    def boom(upstream):
+        raise RuntimeError("scoreboard fetch failed")
+
+    steps = [
+        PipelineStep("fetch", boom),
+        PipelineStep("load", _sleeper(0, "x"), depends_on=("fetch",)),
+        PipelineStep("after_load", _sleeper(0, "y"), depends_on=("load",)),
+        PipelineStep("kalshi", _sleeper(0.05, "ok")),
+    ]
+    seen = []
+    report = run_pipeline(steps, on_step=lambda r: seen.append(r.name))
+
+    assert not report.ok
+    assert report["fetch"].status == "failed" and "scoreboard fetch failed" in report["fetch"].error
+    assert report["load"].status == "skipped"
+    assert report["after_load"].status == "skipped"
+    assert report["kalshi"].status == "succeeded"
+    assert sorted(seen) == sorted(s.name for s in steps)
+    assert report.as_dict()["steps"][0]["status"] == "failed"
+
+
+def test_step_timeout_fails_step_without_waiting():
+    release = threading.Event()
+
+    def hang(upstream):
+        release.wait(5)
+        return "late"
+
+    steps = [
+        PipelineStep("queued", _sleeper(0.2, "a")),
+        PipelineStep("slow_but_in_budget", _sleeper(0.25, "b"), timeout_seconds=0.35),  # 0.45s counted from submission
+        PipelineStep("hung", hang, timeout_seconds=0.3),
+        PipelineStep("after_hung", _sleeper(0, "c"), depends_on=("hung",)),
+    ]
+    try:
+        t0 = time.monotonic()
+        # One worker: slow_but_in_budget waits 0.2s in the queue, which must not count against it
+        report = run_pipeline(steps, max_workers=1)
+        elapsed = time.monotonic() - t0
+        assert report.still_running() == ["hung"]
+        assert report.wait_abandoned(timeout=0.05) == ["hung"]
+    finally:
+        release.set()
+    assert report.wait_abandoned() == [] and report["hung"].status == "failed"
+
+    assert report["slow_but_in_budget"].status == "succeeded"
+    assert report["hung"].status == "failed" and report["hung"].error == "timed out after 0.3s"
+    assert 0.3 <= report["hung"].elapsed_seconds < 1.0
+    assert report["after_hung"].status == "skipped"
+    assert elapsed < 2.0, elapsed  # did not wait for the hung thread
+
+
+def test_invalid_graphs_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        run_pipeline([PipelineStep("a", _sleeper(0, 1), ("b",)), PipelineStep("b", _sleeper(0, 1), ("a",))])
+    with pytest.raises(ValueError, match="unknown"):
+        run_pipeline([PipelineStep("a", _sleeper(0, 1), ("missing",))])
+
+
+def test_script_main_exit_codes():
+    def ok(argv):
+        assert argv == ["--flag"]
+        return 0
+
+    def exits_with_message(argv):
+        raise SystemExit("No scoreboard files found")
+
+    call_script_main(ok, ["--flag"])
+    assert run_script_main(lambda argv: 2, []) == 2
+    assert run_script_main(exits_with_message, []) == 1
+    with pytest.raises(RuntimeError, match="No scoreboard files found"):
+        call_script_main(exits_with_message, [])
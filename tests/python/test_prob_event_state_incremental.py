@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental espn.prob_event_state materialization (scripts/process/materialize_espn_prob_event_state.py).
+
+Covers:
+1. Watermark short-circuit for games with no new snapshots
+2. Append-only planning for in-progress games
+3. Full rewrite when overtime moves max_period or rows predate watermarks
+4. Plays-collection indexing (max period, final score from the last play)
+5. The watermark stops below snapshots whose play could not be resolved, so they are retried, but only for
+   MAX_UNRESOLVED_ATTEMPTS runs without new snapshots; the plays collection is refetched only when the tail grew
+6. Kalshi candlestick loads mark only the tickers whose rows changed, and their games for a whole-game refresh
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.load.load_kalshi_candlesticks import load_candlestick_file  # noqa: E402
+from scripts.process.materialize_espn_prob_event_state import (  # noqa: E402
+    MAX_UNRESOLVED_ATTEMPTS,
+    GameWatermark,
+    ProbRow,
+    _build_state_row,
+    _index_game_plays,
+    _is_up_to_date,
+    _plan_game_write,
+    _tail_grew,
+    _unresolved_attempts,
+    _watermark_sequence,
+)
+from scripts.process.refresh_snapshot_features import WHOLE_GAME_FROM_SEQ, mark_games_dirty_for_tickers  # noqa: E402
+
+
+def _rows(*seq_play):
+    return [ProbRow(play_ref=f"http://x/plays/{pid}", play_id=pid, sequence_number=seq) for seq, pid in seq_play]
+
+
+def _play(pid, seq, period, clock, home, away):
+    return {
+        "id": str(pid),
+        "sequenceNumber": str(seq),
+        "period": {"number": period},
+        "clock": {"value": clock},
+        "homeScore": home,
+        "awayScore": away,
+    }
+
+
+def test_up_to_date_uses_max_sequence_number():
+    rows = _rows((1, 10), (2, 11), (3, 12))
+    assert not _is_up_to_date(rows, None)
+    assert _is_up_to_date(rows, GameWatermark(3, 4, 100, 98))
+    assert not _is_up_to_date(rows, GameWatermark(2, 4, 100, 98))
+
+
+def test_in_progress_game_appends_only_new_tail():
+    rows = _rows((1, 10), (2, 11), (3, 12), (4, 13))
+    mode, new = _plan_game_write(rows, existing_event_ids={10, 11}, watermark=GameWatermark(2, 2, 50, 48), max_period=2)
+    assert mode == "append"
+    assert [r.play_id for r in new] == [12, 13]
+
+    mode, new = _plan_game_write(rows, existing_event_ids=set(), watermark=None, max_period=2)
+    assert mode == "append" and len(new) == 4
+
+    assert _plan_game_write(rows, existing_event_ids={10, 11, 12, 13}, watermark=None, max_period=4) == ("noop", [])
+
+
+def test_overtime_or_missing_watermark_rewrites_game():
+    rows = _rows((1, 10), (2, 11), (3, 12))
+    mode, out = _plan_game_write(rows, existing_event_ids={10, 11}, watermark=GameWatermark(2, 4, 100, 100), max_period=5)
+    assert mode == "rewrite" and out == rows
+    mode, out = _plan_game_write(rows, existing_event_ids={10}, watermark=None, max_period=4)
+    assert mode == "rewrite" and out == rows
+
+
+def test_index_plays_and_state_row_time_remaining():
+    plays = [_play(10, 1, 1, 720, 0, 0), _play(11, 2, 4, 3, 99, 99), _play(12, 3, 5, 0, 104, 101)]
+    by_id, max_period, final_home, final_away = _index_game_plays(plays)
+    assert sorted(by_id) == [10, 11, 12]
+    assert (max_period, final_home, final_away) == (5, 104, 101)
+
+    row = _build_state_row(
+        _rows((2, 11))[0], by_id[11], game_id="401", max_period=max_period, final_winner=0, home_team_id=1, away_team_id=2
+    )
+    # 3s left in Q4 plus one 5-minute overtime still to play.
+    assert row[:4] == ("401", 11, 0, 303)
+    assert row[6:8] == (None, 0)
+
+
+def test_watermark_holds_below_unresolved_plays():
+    rows = _rows((1, 10), (2, 11), (3, 12), (4, 13))
+    assert _watermark_sequence(rows, []) == 4
+    seq = _watermark_sequence(rows, [rows[2], rows[3]])
+    assert seq == 2
+    # Next run is not short-circuited, and only the unresolved (unwritten) plays are planned again
+    assert not _is_up_to_date(rows, GameWatermark(seq, 4, 100, 98))
+    mode, new = _plan_game_write(rows, existing_event_ids={10, 11}, watermark=GameWatermark(seq, 4, 100, 98), max_period=4)
+    assert mode == "append" and [r.play_id for r in new] == [12, 13]
+
+
+def test_unresolved_plays_are_retried_a_bounded_number_of_times():
+    rows = _rows((1, 10), (2, 11), (3, 12), (4, 13))
+    unresolved = [rows[2]]
+    assert _tail_grew(rows, None) and _tail_grew(rows, GameWatermark(2, 4, 100, 98))  # no seen_max recorded yet
+
+    # First run: new snapshots, one play unresolved -> attempt 1, watermark held
+    attempts = _unresolved_attempts(None, tail_grew=True, unresolved=unresolved)
+    assert attempts == 1 and _watermark_sequence(rows, unresolved, attempts=attempts) == 2
+
+    # Later runs over the same finished game: no tail growth (no collection refetch), the count climbs
+    watermark = GameWatermark(2, 4, 100, 98, seen_max_sequence_number=4, unresolved_attempts=attempts)
+    for _ in range(MAX_UNRESOLVED_ATTEMPTS - 1):
+        assert not _tail_grew(rows, watermark)
+        attempts = _unresolved_attempts(watermark, tail_grew=False, unresolved=unresolved)
+        watermark = GameWatermark(
+            _watermark_sequence(rows, unresolved, attempts=attempts), 4, 100, 98,
+            seen_max_sequence_number=4, unresolved_attempts=attempts,
+        )
+    # ... until the play is given up on: the watermark reaches the tail and the game short-circuits
+    assert attempts == MAX_UNRESOLVED_ATTEMPTS and watermark.max_sequence_number == 4
+    assert _is_up_to_date(rows, watermark)
+
+    # New snapshots start the count over; resolving everything clears it
+    grown = rows + _rows((5, 14))
+    assert _tail_grew(grown, watermark)
+    assert _unresolved_attempts(watermark, tail_grew=True, unresolved=unresolved) == 1
+    assert _unresolved_attempts(watermark, tail_grew=False, unresolved=[]) == 0
+
+
+class _Conn:
+    def __init__(self, returns):
+        self.returns = list(returns)
+        self.executed = []
+
+    def execute(self, sql, params=()):
+        self.executed.append((sql, params))
+        conn = self
+
+        class _R:
+            rowcount = 2
+
+            def fetchone(self):
+                return conn.returns.pop(0) if conn.returns else None
+
+        return _R()
+
+
+def test_candlestick_load_marks_changed_tickers_dirty(tmp_path):
+    path = tmp_path / "candlesticks_T.json"
+    candles = [{"end_period_ts": 1766190000 + 60 * i, "price": {"close": 50}} for i in range(3)]
+    path.write_text(json.dumps({"request": {"ticker": "T-HOME"}, "response": {"data": {"candlesticks": candles}}}))
+
+    changed = set()
+    # Every row already held these values: the guarded upsert returns nothing, the ticker is not marked
+    assert load_candlestick_file(_Conn([None, None, None]), path, 1, changed) == (0, 0) and changed == set()
+    assert load_candlestick_file(_Conn([None, (False,), (True,)]), path, 1, changed) == (1, 1) and changed == {"T-HOME"}
+
+    conn = _Conn([])
+    assert mark_games_dirty_for_tickers(conn, set()) == 0 and conn.executed == []
+    assert mark_games_dirty_for_tickers(conn, ["T-AWAY", "T-HOME", "T-HOME"]) == 2
+    sql, params = conn.executed[-1]
+    assert "espn.prob_event_state_watermarks" in sql and "kalshi.markets" in sql
+    assert params == (WHOLE_GAME_FROM_SEQ, ["T-AWAY", "T-HOME"])
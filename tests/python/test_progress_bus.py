@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the progress pub/sub bus (webapp/api/progress_bus.py) behind the progress WebSockets.
+
+Covers:
+1. Updates published from a worker thread reach subscribers coalesced, ending with the terminal state
+2. Throttled (non-forced) updates still deliver the latest state; idle / finished channels expire after the TTL
+3. relay_progress sends the initial state, answers pings, pushes updates and closes on completion
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from webapp.api.endpoints import simulation  # noqa: E402
+from webapp.api.progress_bus import ProgressBus, relay_progress  # noqa: E402
+
+
+def test_thread_updates_are_coalesced_and_end_terminal():
+    bus = ProgressBus(min_interval=0.02)
+    bus.publish("r1", {"status": "running", "current": 0, "total": 5000})
+
+    async def run():
+        received = []
+        async with bus.subscribe("r1") as sub:
+            assert sub.current == {"status": "running", "current": 0, "total": 5000}
+
+            def worker():
+                for i in range(1, 5001):
+                    bus.update("r1", current=i)
+                bus.update("r1", status="complete")
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            while True:
+                state = await asyncio.wait_for(sub.next(), timeout=5)
+                received.append(state)
+                if state["status"] == "complete":
+                    break
+            thread.join()
+        return received
+
+    received = asyncio.run(run())
+    assert received[-1] == {"status": "complete", "current": 5000, "total": 5000}
+    assert len(received) < 500  # thousands of updates, a handful of deliveries
+    currents = [s["current"] for s in received]
+    assert currents == sorted(currents)
+    assert bus.update("unknown", current=1) is None and bus.get("unknown") is None
+    # Snapshots handed out by get() are copies
+    bus.get("r1")["status"] = "mutated"
+    assert bus.get("r1")["status"] == "complete"
+
+
+def test_trailing_delivery_and_ttl_cleanup():
+    bus = ProgressBus(min_interval=0.05)
+
+    async def run():
+        async with bus.subscribe("r2") as sub:
+            assert sub.current is None  # subscribed before the job published anything
+            bus.publish("r2", {"status": "running", "current": 1}, force=True)
+            assert (await asyncio.wait_for(sub.next(), timeout=1))["current"] == 1
+            for i in range(2, 6):
+                bus.update("r2", current=i)  # inside the throttle window: coalesced, delivered late
+            return await asyncio.wait_for(sub.next(), timeout=1)
+
+    assert asyncio.run(run())["current"] == 5
+
+    now = [0.0]
+    clocked = ProgressBus(ttl_seconds=100.0, clock=lambda: now[0])
+    clocked.publish("done", {"status": "complete"})
+    now[0] = 50.0
+    clocked.publish("running", {"status": "running"})
+    now[0] = 120.0
+    assert clocked.cleanup() == 1
+    assert clocked.get("done") is None and clocked.get("running") is not None
+    now[0] = 500.0
+    assert clocked.cleanup() == 1  # a job that stopped publishing is dropped too
+
+
+class _FakeWebSocket:
+    def __init__(self, incoming):
+        self.sent = []
+        self.closed = None
+        self._incoming = incoming
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def receive_text(self):
+        return await self._incoming.get()
+
+    async def close(self, code=1000, reason=None):
+        self.closed = (code, reason)
+
+
+def test_relay_progress_and_simulation_progress_endpoint(monkeypatch):
+    bus = ProgressBus(min_interval=0.0)
+    monkeypatch.setattr(simulation, "_progress_bus", bus)
+
+    async def run():
+        incoming = asyncio.Queue()
+        ws = _FakeWebSocket(incoming)
+        async with bus.subscribe("r3") as sub:
+            bus.publish("r3", {"status": "running", "current": 0, "total": 2})
+            relay = asyncio.create_task(relay_progress(ws, sub, {"status": "not_found"}, label="Simulation"))
+            await incoming.put(json.dumps({"type": "ping"}))
+            await asyncio.sleep(0.01)
+            simulation._set_progress_status("r3", "complete")
+            await asyncio.wait_for(relay, timeout=1)
+        return ws
+
+    ws = asyncio.run(run())
+    assert ws.sent[0] == {"type": "progress", "progress": {"status": "not_found"}}
+    assert any(m["type"] == "pong" for m in ws.sent)
+    assert ws.sent[-1] == {"type": "progress", "progress": {"status": "complete", "current": 0, "total": 2}}
+    assert ws.closed == (1000, "Simulation complete")
+    assert simulation.get_simulation_progress("r3")["status"] == "complete"
+    assert simulation.get_simulation_progress("missing") == {"status": "not_found", "current": 0, "total": 0}
+
+    # A job that already finished: initial state is sent and the socket closes immediately
+    finished = _FakeWebSocket(None)
+    asyncio.run(relay_progress(finished, None, {"status": "error"}, label="Simulation"))
+    assert finished.closed == (1000, "Simulation error") and len(finished.sent) == 1
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for the evaluation report catalog (scripts/lib/_report_catalog_lib.py) and the endpoints served from it.
+
+Covers:
+1. Incremental indexing: new, rewritten and deleted reports and plot files are picked up; the catalog is
+   persisted and reloaded; reports are grouped by artifact content hash
+2. Memoized responses are rebuilt only after a report lands (record_report or a directory change)
+3. /stats/model-evaluation, /stats/model-evaluation/plot and /stats/model-comparison answer from the catalog
+   with the same payloads as the report files
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._report_catalog_lib import (  # noqa: E402
+    CATALOG_FILE,
+    CATALOG_SUBDIR,
+    ReportCatalog,
+    get_catalog,
+    record_report,
+)
+from webapp.api.endpoints import model_comparison, model_evaluation  # noqa: E402
+
+
+def _report(season: int, logloss: float, *, artifact_path: str = "", groups=None) -> dict:
+    return {
+        "artifact_path": artifact_path,
+        "artifact_meta": {"train_season_start_max": 2022, "version": "v1"},
+        "eval": {
+            "season_start": season,
+            "overall": {"n": 100, "logloss": logloss, "brier": 0.2, "ece_binned": 0.01, "roc_auc": 0.8,
+                        "ci": {"logloss": [0.4, 0.6]}},
+            "calibration_bins": [
+                {"avg_p": 0.25, "obs_rate": 0.3, "n": 40, "gap": 0.05},
+                {"avg_p": 0.75, "obs_rate": 0.7, "n": 60, "gap": -0.05},
+                {"avg_p": 0.95, "obs_rate": 0.0, "n": 0, "gap": 0.0},
+            ],
+            "groups": groups or [],
+        },
+    }
+
+
+def _write(path: Path, data: dict, *, bump_ns: int = 0) -> None:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if bump_ns:
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def _touch_dir(d: Path, bump_ns: int) -> None:
+    # Directory mtimes are the staleness signal; make sure a change is visible even on coarse clocks.
+    st = d.stat()
+    os.utime(d, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def test_incremental_refresh_plots_and_artifact_hash():
+    with tempfile.TemporaryDirectory() as d:
+        d = Path(d)
+        (d / "art.json").write_text('{"model": 1}')
+        _write(d / "winprob_eval_logreg_platt_on_2024.json", _report(2024, 0.5, artifact_path="art.json"))
+        _write(d / "winprob_eval_logreg_isotonic_on_2024.json", _report(2024, 0.6, artifact_path="art.json"))
+        _write(d / "winprob_eval_2023.json", _report(2023, 0.7))
+        (d / "notes.json").write_text("{}")
+        (d / "winprob_eval_broken.json").write_text("{not json")
+
+        cat = ReportCatalog(d, root=d)
+        entries = cat.entries()
+        assert set(entries) == {"winprob_eval_logreg_platt_on_2024", "winprob_eval_logreg_isotonic_on_2024", "winprob_eval_2023"}
+        e = entries["winprob_eval_logreg_platt_on_2024"]
+        assert e["overall"]["logloss"] == 0.5 and e["plots"] == {}
+        assert e["season_start"] == 2024 and len(e["calibration_bins"]) == 3
+        assert (d / CATALOG_SUBDIR / CATALOG_FILE).exists()
+
+        same = {x["name"] for x in cat.by_artifact(e["artifact_hash"])}
+        assert same == {"winprob_eval_logreg_platt_on_2024", "winprob_eval_logreg_isotonic_on_2024"}
+        assert entries["winprob_eval_2023"]["artifact_hash"].startswith("meta-")
+
+        # Unchanged directory: nothing is re-read.
+        assert cat.refresh() is False
+
+        (d / "winprob_eval_logreg_platt_on_2024.calibration.svg").write_text("<svg/>")
+        (d / "winprob_eval_2023.json").unlink()
+        _write(d / "winprob_eval_logreg_isotonic_on_2024.json", _report(2024, 0.55, artifact_path="art.json"), bump_ns=10**9)
+        _touch_dir(d, 10**9)
+        assert cat.refresh() is True
+        entries = cat.entries()
+        assert set(entries) == {"winprob_eval_logreg_platt_on_2024", "winprob_eval_logreg_isotonic_on_2024"}
+        assert entries["winprob_eval_logreg_platt_on_2024"]["plots"] == {"calibration.svg": "winprob_eval_logreg_platt_on_2024.calibration.svg"}
+        assert entries["winprob_eval_logreg_isotonic_on_2024"]["overall"]["logloss"] == 0.55
+
+        # A fresh process reloads the persisted catalog without re-indexing.
+        reloaded = ReportCatalog(d, root=d)
+        assert reloaded.refresh() is False
+        assert reloaded.entries() == entries
+        assert [x["name"] for x in reloaded.glob("winprob_eval_*isotonic*")] == ["winprob_eval_logreg_isotonic_on_2024"]
+
+
+def test_memo_rebuilds_after_a_report_lands():
+    with tempfile.TemporaryDirectory() as d:
+        d = Path(d)
+        _write(d / "winprob_eval_2024.json", _report(2024, 0.5))
+        cat = get_catalog(d)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return sorted(cat.entries())
+
+        assert cat.memo("names", build) == ["winprob_eval_2024"]
+        assert cat.memo("names", build) == ["winprob_eval_2024"]
+        assert len(calls) == 1
+
+        _write(d / "winprob_eval_2025.json", _report(2025, 0.4))
+        assert record_report(d / "winprob_eval_2025.json")["season_start"] == 2025
+        assert record_report(d / "other.json") is None
+        assert cat.memo("names", build) == ["winprob_eval_2024", "winprob_eval_2025"]
+        assert len(calls) == 2
+
+        (d / "winprob_eval_2024.json").unlink()
+        _touch_dir(d, 10**9)
+        assert cat.memo("names", build) == ["winprob_eval_2025"]
+        assert len(calls) == 3
+
+
+def test_endpoints_serve_catalog_entries(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        d = Path(d)
+        groups = [{"model": "m", "group_by": "period", "group": "1", "n": 10, "logloss": 0.5}]
+        platt = _report(2024, 0.5, groups=groups)
+        _write(d / "winprob_eval_logreg_platt_2017-2023_calib_2023_on_2024.json", platt)
+        _write(d / "winprob_eval_catboost_isotonic_2017-2023_calib_2023_on_2024.json", _report(2024, 0.45))
+        (d / "winprob_eval_logreg_platt_2017-2023_calib_2023_on_2024.calibration.svg").write_text("<svg/>")
+        catalog = get_catalog(d)
+
+        def build(**kw):
+            params = {"season_start": None, "all_seasons": False, "model_type": None} | kw
+            return model_evaluation._build_model_evaluation(catalog, **params)
+
+        single = build(season_start=2024, model_type="logreg_platt")
+        assert single["eval"]["overall"] == platt["eval"]["overall"]
+        assert single["eval"]["calibration_bins"] == platt["eval"]["calibration_bins"]
+        assert single["eval"]["groups"] == groups
+        assert [p["x"] for p in single["eval"]["calibration_points"]] == [0.25, 0.75]
+        assert single["model_type_full"] == "logreg_platt"
+        assert build(season_start=2024, model_type="catboost_isotonic")["eval"]["overall"]["logloss"] == 0.45
+        with pytest.raises(HTTPException) as exc:
+            build(season_start=2019)
+        assert exc.value.status_code == 404
+
+        pooled = build(all_seasons=True)
+        assert set(pooled["model_types"]) == {"logreg_platt", "catboost_isotonic"}
+        assert pooled["models"]["logreg_platt"]["eval"]["overall"] == {"n": 100}
+
+    # The routes resolve data/models/evaluations from the repo root above their module file.
+    with tempfile.TemporaryDirectory() as root:
+        reports = Path(root) / "data" / "models" / "evaluations"
+        reports.mkdir(parents=True)
+        name = "winprob_eval_logreg_platt_2017-2023_calib_2023_on_2024"
+        _write(reports / f"{name}.json", platt)
+        (reports / f"{name}.calibration.svg").write_text("<svg/>")
+        fake_file = Path(root) / "webapp" / "api" / "endpoints" / "x.py"
+        monkeypatch.setattr(model_evaluation, "__file__", str(fake_file))
+        monkeypatch.setattr(model_comparison, "__file__", str(fake_file))
+
+        resp = model_evaluation.get_model_evaluation_plot(report_name=name, plot_type="calibration", format="svg")
+        assert Path(resp.path) == reports / f"{name}.calibration.svg" and resp.media_type == "image/svg+xml"
+        for bad in ({"report_name": name, "format": "jpg"}, {"report_name": "../" + name, "format": "svg"}):
+            with pytest.raises(HTTPException) as exc:
+                model_evaluation.get_model_evaluation_plot(plot_type="calibration", **bad)
+            assert exc.value.status_code == 404
+
+        comparison = model_comparison.get_model_comparison()
+        assert comparison is model_comparison.get_model_comparison()
+        (m,) = comparison["models"]
+        assert m["model_label"] == "Logistic Regression + Platt" and m["metrics"]["logloss"] == 0.5
+        assert m["calibration_points"][1] == {"x": 0.75, "y": 0.7, "n": 60}
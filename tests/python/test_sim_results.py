@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar simulation results (webapp/api/sim_results.py) used by /api/simulation/bulk.
+
+Covers:
+1. GameSimResult round-trips simulate_trading_strategy output (summary, trades, None fields) and is read-only
+2. aggregate_game_results matches the list-of-dicts aggregation it replaced (chronological trades, metrics),
+   including trades without an exit time (kept as None, left out of the average duration)
+3. Cached records pickle compactly and are shared without copying
+"""
+
+import os
+import pickle
+import statistics
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.trade.simulate_trading_strategy import simulate_trading_strategy  # noqa: E402
+from webapp.api.sim_results import GameSimResult, GameSimRun, aggregate_game_results  # noqa: E402
+
+BET = 20.0
+
+
+def _aligned(seed: int, n: int = 400) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    espn = np.clip(0.5 + np.cumsum(rng.normal(0, 0.02, n)), 0.02, 0.98)
+    kalshi = np.clip(espn + rng.normal(0, 0.06, n), 0.02, 0.98)
+    start = 1_700_000_000 + seed * 86_400
+    return [
+        {
+            "timestamp": start + 10 * i,
+            "espn_prob": float(espn[i]),
+            "kalshi_price": float(kalshi[i]),
+            "kalshi_bid": None if i % 97 == 5 else float(kalshi[i]) - 0.01,
+            "kalshi_ask": None if i % 89 == 7 else float(kalshi[i]) + 0.01,
+        }
+        for i in range(n)
+    ]
+
+
+def _simulate(seed: int) -> dict:
+    data = _aligned(seed)
+    return simulate_trading_strategy(
+        data, 0.05, 0.01, seed % 2, bet_amount_dollars=BET, min_hold_seconds=30,
+        game_start_timestamp=data[0]["timestamp"], game_duration_seconds=4000,
+    )
+
+
+def _reference(game_results: list[dict]) -> dict:
+    # The bulk aggregation as it was computed over per-game result dicts.
+    total_profit_cents = sum(r.get("total_profit_cents", 0.0) for r in game_results)
+    total_trades = sum(r.get("num_trades", 0) for r in game_results)
+    all_trades = [t for r in game_results for t in r.get("trades", [])]
+    all_trades.sort(key=lambda t: (t.get("game_date", "") or "", t.get("exit_time") or t.get("entry_time") or 0))
+    win_rate = len([t for t in all_trades if (t.get("net_profit_cents") or 0) > 0]) / total_trades if total_trades else 0.0
+    long_trades = [t for t in all_trades if t.get("position_type") == "long_espn"]
+    profits = [(t.get("net_profit_cents") or 0) / 100.0 for t in all_trades]
+    returns = [p / BET for p in profits]
+    winning = [p for p in profits if p > 0]
+    losing = [p for p in profits if p < 0]
+    peak = max_dd = pct = 0.0
+    running = 0.0
+    curve = []
+    for p in profits:
+        running += p
+        curve.append(running)
+        peak = max(peak, running)
+        if peak - running > max_dd:
+            max_dd = peak - running
+            pct = max_dd / peak * 100.0 if peak > 0 else max_dd / (total_trades * BET) * 100.0
+    s = sorted(profits)
+    n = len(s)
+    return {
+        "total_profit_cents": total_profit_cents,
+        "total_trades": total_trades,
+        "trades": all_trades,
+        "win_rate": win_rate,
+        "long_count": len(long_trades),
+        "long_profit": sum(t.get("net_profit_cents", 0) or 0 for t in long_trades) / 100.0,
+        "std_dev": statistics.stdev(profits) if n > 1 else 0.0,
+        "median_cents": statistics.median([t.get("net_profit_cents") or 0 for t in all_trades]) if n else 0.0,
+        "sharpe": statistics.mean(returns) / statistics.stdev(returns) if n > 1 else 0.0,
+        "quartiles": (s[int(n * 0.25)], statistics.median(s), s[int(n * 0.75)]) if n > 1 else None,
+        "entry_div": statistics.mean(abs(t["entry_espn_prob"] - t["entry_kalshi_price"]) * 100 for t in all_trades) if n else 0.0,
+        "duration": statistics.mean(durations) if (durations := [
+            t["exit_time"] - t["entry_time"] for t in all_trades if t.get("exit_time") is not None
+        ]) else 0.0,
+        "expectancy": win_rate * (statistics.mean(winning) if winning else 0.0)
+        - (len(losing) / total_trades if total_trades else 0.0) * (abs(statistics.mean(losing)) if losing else 0.0),
+        "profit_factor": sum(winning) / abs(sum(losing)) if losing else (sum(winning) if winning else 0.0),
+        "max_dd": max_dd,
+        "max_dd_pct": pct,
+        "curve": curve,
+    }
+
+
+def test_round_trip_and_immutability():
+    results = _simulate(3)
+    assert results["num_trades"] > 0
+    rec = GameSimResult.from_simulation(results)
+    out = rec.to_dict("401", "2025-11-03T00:30:00+00:00")
+    expected = dict(results, trades=[dict(t, game_id="401", game_date="2025-11-03T00:30:00+00:00") for t in results["trades"]])
+    expected.update(game_id="401", game_date="2025-11-03T00:30:00+00:00")
+    assert out == expected and list(out) == list(expected)
+    assert list(out["trades"][0]) == list(expected["trades"][0])
+
+    with pytest.raises(ValueError):
+        rec.trades["net_profit_cents"][0] = 0.0
+    empty = GameSimResult.from_simulation(dict(results, trades=[], num_trades=0))
+    assert empty.to_dict("402", None)["trades"] == [] and len(empty.trades) == 0
+
+
+def test_aggregate_matches_dict_aggregation():
+    dates = ["2025-11-05", "2025-11-01", None, "2025-11-03", "2025-11-01"]
+    runs = [GameSimRun(f"40{i}", d, GameSimResult.from_simulation(_simulate(i))) for i, d in enumerate(dates)]
+    agg = aggregate_game_results(runs, BET)
+    ref = _reference([run.result.to_dict(run.game_id, run.game_date) for run in runs])
+
+    assert agg["trades"] == ref["trades"]
+    assert agg["total_trades"] == ref["total_trades"] and agg["total_profit_cents"] == ref["total_profit_cents"]
+    assert agg["win_rate"] == ref["win_rate"]
+    assert agg["position_breakdown"]["long"]["count"] == ref["long_count"]
+    assert agg["position_breakdown"]["long"]["profit_dollars"] == pytest.approx(ref["long_profit"])
+    assert agg["risk_metrics"]["std_dev_dollars"] == pytest.approx(ref["std_dev"])
+    assert agg["median_profit_cents"] == pytest.approx(ref["median_cents"])
+    assert agg["sharpe_ratio"] == pytest.approx(ref["sharpe"])
+    q = agg["distribution_quartiles"]
+    assert (q["q1_dollars"], q["q2_dollars"], q["q3_dollars"]) == pytest.approx(ref["quartiles"])
+    assert agg["divergence_metrics"]["avg_entry_divergence_cents"] == pytest.approx(ref["entry_div"])
+    assert agg["avg_trade_duration_seconds"] == pytest.approx(ref["duration"])
+    assert agg["expectancy_dollars"] == pytest.approx(ref["expectancy"])
+    assert agg["profit_factor"] == pytest.approx(ref["profit_factor"])
+    assert agg["max_drawdown_dollars"] == pytest.approx(ref["max_dd"])
+    assert agg["max_drawdown_percent"] == pytest.approx(ref["max_dd_pct"])
+    assert [p["cumulative_profit_dollars"] for p in agg["equity_curve"]] == pytest.approx(ref["curve"])
+    assert [g["game_id"] for g in agg["per_game_summary"]] == [r.game_id for r in runs]
+    # Game results and the combined list share the same trade dicts.
+    assert agg["game_results"][1]["trades"][0] in agg["trades"]
+
+    lean = aggregate_game_results(runs, BET, include_trades=False)
+    assert "trades" not in lean and "game_results" not in lean
+    assert lean == {k: v for k, v in agg.items() if k not in ("trades", "game_results")}
+
+    empty = aggregate_game_results([], BET)
+    assert empty["trades"] == [] and empty["sharpe_ratio"] == 0.0 and empty["max_drawdown_dollars"] == 0.0
+
+
+def test_missing_exit_time_round_trips_and_is_not_a_duration():
+    results = _simulate(4)
+    trades = [dict(t) for t in results["trades"]]
+    trades[0]["exit_time"] = None
+    results = dict(results, trades=trades)
+    rec = GameSimResult.from_simulation(results)
+    assert rec.to_dict("404", None)["trades"][0]["exit_time"] is None
+
+    runs = [GameSimRun("404", "2025-11-04", rec)]
+    agg = aggregate_game_results(runs, BET)
+    ref = _reference([rec.to_dict("404", "2025-11-04")])
+    assert agg["trades"] == ref["trades"]
+    assert agg["avg_trade_duration_seconds"] == pytest.approx(ref["duration"])
+    closed = [t["exit_time"] - t["entry_time"] for t in trades[1:]]
+    assert agg["avg_trade_duration_seconds"] == pytest.approx(statistics.mean(closed))
+
+    only_open = GameSimResult.from_simulation(dict(results, trades=[trades[0]], num_trades=1))
+    assert aggregate_game_results([GameSimRun("405", None, only_open)], BET)["avg_trade_duration_seconds"] == 0.0
+
+
+def test_cached_record_is_compact_and_shared():
+    results = _simulate(7)
+    rec = GameSimResult.from_simulation(results)
+    assert len(pickle.dumps(rec)) < len(pickle.dumps(results))
+    restored = pickle.loads(pickle.dumps(rec))
+    assert restored.to_dict("407", None) == rec.to_dict("407", None)
+    # Two responses built from one cached record don't interfere.
+    a = rec.to_dict("407", None)
+    a["trades"][0]["net_profit_cents"] = -1e9
+    assert rec.to_dict("407", None)["trades"][0]["net_profit_cents"] != -1e9
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized per-game stats kernel (webapp/api/stats_kernel.py).
+
+Covers:
+1. searchsorted alignment picks the same Kalshi point as the pointer scan it replaces (ties, gaps,
+   duplicate timestamps)
+2. The kernel's espn/kalshi/divergence blocks equal the scalar calculate_* functions in
+   endpoints/stats.py composed the way get_game_stats used them, across outcomes, missing timing,
+   missing bid/ask, flat and one-point series. Floats are compared exactly where the builtin sum()
+   adds left to right (CPython < 3.12); newer versions compensate sum(), so they get a 1e-12 tolerance
+"""
+
+import math
+import os
+import sys
+import zlib
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from webapp.api import stats_kernel  # noqa: E402
+from webapp.api.endpoints import stats  # noqa: E402
+
+EXACT = sys.version_info < (3, 12)
+
+
+def _same(a, b, path="result"):
+    if isinstance(a, dict) and isinstance(b, dict):
+        assert list(a) == list(b), path
+        for key in a:
+            _same(a[key], b[key], f"{path}.{key}")
+    elif isinstance(a, list) and isinstance(b, list):
+        assert len(a) == len(b), path
+        for i, (x, y) in enumerate(zip(a, b)):
+            _same(x, y, f"{path}[{i}]")
+    elif isinstance(a, float) and isinstance(b, float) and not EXACT:
+        assert math.isclose(a, b, rel_tol=1e-12, abs_tol=1e-15), (path, a, b)
+    else:
+        assert type(a) is type(b) and a == b, (path, a, b)
+
+
+def _scan_nearest(espn_times, kalshi_times):
+    """The pointer scan get_game_stats used: (espn index, kalshi index) pairs within 60 seconds."""
+    pairs = []
+    kalshi_idx = 0
+    for i, espn_time in enumerate(espn_times):
+        while kalshi_idx < len(kalshi_times) - 1 and abs(kalshi_times[kalshi_idx] - espn_time) > abs(kalshi_times[kalshi_idx + 1] - espn_time):
+            kalshi_idx += 1
+        if kalshi_idx < len(kalshi_times) and abs(kalshi_times[kalshi_idx] - espn_time) <= 60:
+            pairs.append((i, kalshi_idx))
+    return pairs
+
+
+def _reference(espn_probs, espn_times, kalshi_probs, kalshi_times, bid_ask, home_won, start, duration):
+    """get_game_stats' metric section before the kernel, built from the scalar functions."""
+    espn = {
+        "data_points": len(espn_probs),
+        "min_probability": min(espn_probs) if espn_probs else None,
+        "max_probability": max(espn_probs) if espn_probs else None,
+        "mean_probability": sum(espn_probs) / len(espn_probs) if espn_probs else None,
+        "final_probability": espn_probs[-1] if espn_probs else None,
+        "volatility": stats.calculate_probability_volatility(espn_probs),
+        "max_swing": stats.calculate_max_probability_swing(espn_probs),
+        "lead_changes": stats.calculate_lead_changes(espn_probs),
+        "time_weighted_avg": stats.calculate_time_weighted_average(espn_probs, espn_times),
+        "standard_deviation": stats.calculate_standard_deviation(espn_probs),
+        "variance": stats.calculate_variance(espn_probs),
+        "mean_absolute_deviation": stats.calculate_mean_absolute_deviation(espn_probs),
+        "coefficient_of_variation": stats.calculate_coefficient_of_variation(espn_probs),
+    }
+    empty_slices = {"q1": None, "halftime": None, "start_q4": None, "final_2_minutes": None}
+    outcome = None if home_won is None else (1 if home_won else 0)
+    if outcome is not None:
+        espn["time_averaged_in_game_brier_error"] = stats.calculate_brier_score(espn_probs, outcome)
+        espn["log_loss"] = stats.calculate_log_loss(espn_probs, outcome)
+        espn["prediction_correct"] = (espn_probs[-1] > 0.5) == home_won if espn_probs else None
+        if start is not None and espn_times:
+            espn["brier_score_time_sliced"] = stats.calculate_time_sliced_brier_scores(
+                espn_probs, espn_times, start, outcome, duration)
+        else:
+            espn["brier_score_time_sliced"] = dict(empty_slices)
+    if not kalshi_probs:
+        return espn, None, None
+
+    kalshi = {
+        "data_points": len(kalshi_probs),
+        "min_probability": min(kalshi_probs),
+        "max_probability": max(kalshi_probs),
+        "mean_probability": sum(kalshi_probs) / len(kalshi_probs),
+        "final_probability": kalshi_probs[-1],
+        "volatility": stats.calculate_probability_volatility(kalshi_probs),
+        "max_swing": stats.calculate_max_probability_swing(kalshi_probs),
+        "lead_changes": stats.calculate_lead_changes(kalshi_probs),
+        "time_weighted_avg": stats.calculate_time_weighted_average(kalshi_probs, kalshi_times),
+        "standard_deviation": stats.calculate_standard_deviation(kalshi_probs),
+        "variance": stats.calculate_variance(kalshi_probs),
+        "mean_absolute_deviation": stats.calculate_mean_absolute_deviation(kalshi_probs),
+        "coefficient_of_variation": stats.calculate_coefficient_of_variation(kalshi_probs),
+    }
+    if outcome is not None:
+        kalshi["time_averaged_in_game_brier_error"] = stats.calculate_brier_score(kalshi_probs, outcome)
+        if start is not None:
+            kalshi["brier_score_time_sliced"] = stats.calculate_time_sliced_brier_scores(
+                kalshi_probs, kalshi_times, start, outcome, duration)
+        else:
+            kalshi["brier_score_time_sliced"] = dict(empty_slices)
+        kalshi["reliability_curve"] = stats.calculate_reliability_curve(
+            kalshi_probs, [outcome] * len(kalshi_probs), bins=10)
+    else:
+        kalshi["brier_score_time_sliced"] = dict(empty_slices)
+
+    divergence = stats.calculate_espn_kalshi_divergence(
+        espn_probs, kalshi_probs, espn_times, kalshi_times, start, duration)
+    pairs = _scan_nearest(espn_times, kalshi_times)
+    if espn_probs and pairs:
+        divergence["decision_weighted"] = stats.calculate_decision_weighted_metrics(
+            [espn_probs[i] for i, _ in pairs], [kalshi_probs[k] for _, k in pairs],
+            [kalshi_times[k] for _, k in pairs], [bid_ask[k] for _, k in pairs],
+            outcome, start, duration)
+    return espn, kalshi, divergence
+
+
+def _walk(rng, n, step=0.03):
+    return np.clip(0.5 + np.cumsum(rng.normal(0, step, n)), 0.01, 0.99).tolist()
+
+
+def _game(rng, case):
+    start = None if case == "no_start" else 1_700_000_000 + int(rng.integers(0, 10**6))
+    base = start if start is not None else 1_700_500_000
+    n = {"one_point": 1, "flat": 50}.get(case, int(rng.integers(300, 700)))
+    espn_times = (base + np.sort(rng.choice(3200, n, replace=False))).tolist()
+    espn_probs = [0.5] * n if case == "flat" else _walk(rng, n)
+    if case == "final":
+        espn_probs[-1] = 1.0
+    m = int(rng.integers(20, 80))
+    kalshi_times = (base + np.sort(rng.choice(np.arange(0, 3300, 30), m, replace=False))).tolist()
+    kalshi_probs = [round(p * 100) / 100.0 for p in _walk(rng, m, 0.05)]
+    bid_ask = (rng.random(m) > (1.0 if case == "no_bid_ask" else 0.2)).tolist()
+    home_won = None if case == "unknown" else bool(rng.random() > 0.5)
+    duration = espn_times[-1] - espn_times[0]
+    return espn_probs, espn_times, kalshi_probs, kalshi_times, bid_ask, home_won, start, duration
+
+
+def test_searchsorted_alignment_matches_pointer_scan():
+    rng = np.random.default_rng(11)
+    for _ in range(200):
+        espn = np.sort(rng.integers(0, 5000, int(rng.integers(1, 300)))).tolist()
+        kalshi = np.sort(rng.choice(np.arange(0, 5000, 20), int(rng.integers(1, 120)), replace=False)).tolist()
+        espn_idx, kalshi_idx = stats_kernel.align_nearest(espn, kalshi)
+        assert list(zip(espn_idx.tolist(), kalshi_idx.tolist())) == _scan_nearest(espn, kalshi)
+    # Equidistant points go to the earlier Kalshi point; duplicate Kalshi times use the scan itself
+    assert [k.tolist() for k in stats_kernel.align_nearest([10, 30, 200], [0, 20, 40])] == [[0, 1], [0, 1]]
+    dupes = [0, 0, 50, 100]
+    assert list(zip(*[k.tolist() for k in stats_kernel.align_nearest([10, 60, 99], dupes)])) == _scan_nearest([10, 60, 99], dupes)
+
+
+@pytest.mark.parametrize("case", ["known", "final", "unknown", "no_start", "no_bid_ask", "flat", "one_point"])
+def test_kernel_matches_scalar_functions(case):
+    rng = np.random.default_rng(zlib.crc32(case.encode()))
+    for _ in range(8):
+        espn_probs, espn_times, kalshi_probs, kalshi_times, bid_ask, home_won, start, duration = _game(rng, case)
+        expected = _reference(espn_probs, espn_times, kalshi_probs, kalshi_times, bid_ask, home_won, start, duration)
+        actual = stats_kernel.game_stats(espn_probs, espn_times, kalshi_probs, kalshi_times, bid_ask,
+                                         home_won, start, duration)
+        _same(actual, expected)
+        assert expected[2]["data_points"] > 0 or case == "one_point"
+
+    # No Kalshi series: no kalshi or divergence blocks
+    assert stats_kernel.game_stats(espn_probs, espn_times, None, None, None, home_won, start, duration)[1:] == (None, None)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the CatBoost variant sweep driver (scripts/model/sweep_winprob_catboost.py) on a synthetic training frame.
+
+Covers:
+1. One sweep writes every feature set x calibration artifact (+ .cbm) and a ranked comparison table
+2. Platt and isotonic artifacts of a feature set share one base model (identical raw predictions)
+3. Feature sets differ only where they should (interaction terms / opening-odds feature and baseline)
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostClassifier, Pool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._winprob_lib import load_artifact  # noqa: E402
+from scripts.model.sweep_winprob_catboost import FEATURE_SETS, artifact_name, run_sweep  # noqa: E402
+
+
+def _synthetic_frame(games_per_season: int = 30, snapshots: int = 20) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    rows = []
+    for season in (2020, 2021, 2022, 2023, 2024):
+        for g in range(games_per_season):
+            strength = rng.normal(0, 4)
+            home_wins = rng.random() < 1 / (1 + np.exp(-strength / 3))
+            p_open = float(np.clip(1 / (1 + np.exp(-strength / 4)), 0.05, 0.95))
+            has_odds = g % 3 != 0
+            prev_prob = None
+            for s in range(snapshots):
+                time_rem = 2880.0 * (1 - s / snapshots)
+                diff = float(round(strength * s / snapshots * 3 + rng.normal(0, 3)))
+                prob = float(np.clip(0.5 + diff / 40, 0.01, 0.99))
+                rows.append(
+                    {
+                        "season_start": season,
+                        "season_label": f"{season}-{str(season + 1)[2:]}",
+                        "game_id": f"{season}{g:04d}",
+                        "sequence_number": s,
+                        "point_differential": diff,
+                        "time_remaining_regulation": time_rem,
+                        "possession": "unknown",
+                        "final_winning_team": 0 if home_wins else 1,
+                        "score_diff_div_sqrt_time_remaining": diff / np.sqrt(time_rem + 1),
+                        "espn_home_prob": prob,
+                        "espn_home_prob_lag_1": prev_prob,
+                        "espn_home_prob_delta_1": None if prev_prob is None else prob - prev_prob,
+                        "period": min(4, 1 + s * 4 // snapshots),
+                        "opening_prob_home_fair": p_open if has_odds else np.nan,
+                        "opening_overround": 0.045 if has_odds else np.nan,
+                    }
+                )
+                prev_prob = prob
+    return pd.DataFrame(rows)
+
+
+def test_sweep_writes_all_variants_and_shares_base_models():
+    df = _synthetic_frame()
+    with tempfile.TemporaryDirectory() as d:
+        rows = run_sweep(df, out_dir=d, iterations=(25,), learning_rates=(0.2,), version="v2", workers=2, log=lambda m: None)
+
+        assert len(rows) == len(FEATURE_SETS) * 2
+        assert all(r["status"] == "ok" for r in rows), [r.get("error") for r in rows]
+        losses = [r["test_logloss"] for r in rows]
+        assert losses == sorted(losses)
+
+        out = Path(d)
+        for fs in FEATURE_SETS:
+            for method in ("platt", "isotonic"):
+                path = out / artifact_name(fs, method, version="v2")
+                assert path.name.endswith(f"_{method}_v2.json")
+                artifact = load_artifact(path)
+                assert artifact.model_type == "catboost" and artifact.version == "v2"
+                assert (artifact.platt is not None) == (method == "platt")
+                assert (artifact.isotonic is not None) == (method == "isotonic")
+                assert (out / artifact.catboost_model_path).exists()
+
+        summary = json.loads((out / "sweep_summary.json").read_text())
+        assert summary["config"]["feature_sets"] == list(FEATURE_SETS)
+        with (out / "sweep_summary.csv").open() as f:
+            assert len(list(csv.DictReader(f))) == len(rows)
+        # Staged design matrices are cleaned up.
+        assert not [p for p in out.iterdir() if p.name.startswith(".sweep-")]
+
+        # Both calibrations of a feature set come from one fitted base model.
+        X = np.random.default_rng(0).normal(size=(10, 5 + 4 + 4 + 1))
+        preds = []
+        for method in ("platt", "isotonic"):
+            m = CatBoostClassifier()
+            m.load_model(str(out / artifact_name("odds", method, version="v2").replace(".json", ".cbm")))
+            preds.append(m.predict_proba(Pool(X))[:, 1])
+        np.testing.assert_allclose(preds[0], preds[1])
+
+
+def test_feature_sets_toggle_interactions_and_odds():
+    df = _synthetic_frame(games_per_season=6, snapshots=8)
+    with tempfile.TemporaryDirectory() as d:
+        run_sweep(
+            df,
+            out_dir=d,
+            feature_sets=["baseline", "odds_no_interaction"],
+            iterations=(5, 10),
+            learning_rates=(0.3,),
+            methods=("platt",),
+            workers=1,
+            log=lambda m: None,
+        )
+        baseline = load_artifact(Path(d) / artifact_name("baseline", "platt", tag="_it5_lr0.3"))
+        odds = load_artifact(Path(d) / artifact_name("odds_no_interaction", "platt", tag="_it10_lr0.3"))
+
+    assert "espn_home_prob_scaled" in baseline.feature_names and "opening_overround" not in baseline.feature_names
+    assert baseline.uses_opening_odds_baseline is False
+    assert odds.feature_names[-1] == "opening_overround" and "period_1" not in odds.feature_names
+    assert odds.uses_opening_odds_baseline is True
+    assert odds.preprocess.espn_home_prob_mean is None
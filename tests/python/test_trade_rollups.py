@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tests for the materialized trade candle rollups (scripts/lib/_trade_rollups_lib.py) and their block-cached serving
+(webapp/api/utils/trade_candles.fetch_candles).
+
+Covers:
+1. A refresh rewrites exactly the whole minutes around new trades, with candles identical to aggregate_trades
+2. Serving reads aligned blocks by range scan, reuses cached blocks for overlapping windows, and falls back to
+   raw trades for other intervals, missing rollup tables and windows that aren't rolled up
+3. Partly materialized windows (minutes rolled up by a load, but the ticker never backfilled, or a window
+   starting before the coverage watermark) are served from raw trades, not truncated; a backfill marks coverage
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import psycopg
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._trade_rollups_lib import (  # noqa: E402
+    CANDLE_COLUMNS,
+    ROLLUP_INTERVALS,
+    aggregate_trades,
+    aligned_window,
+    backfill_trade_rollups,
+    refresh_trade_rollups,
+    trade_rollup_watermarks,
+)
+from webapp.api.utils import trade_candles  # noqa: E402
+
+T0 = 1_700_000_000 - 1_700_000_000 % 3600  # an hour boundary
+
+
+def _trades(n=3000, seed=1):
+    rng = np.random.default_rng(seed)
+    times = T0 + np.sort(rng.uniform(0, 3 * 3600, n))
+    trades = []
+    for i, t in enumerate(times):
+        yes = int(rng.integers(1, 100))
+        trades.append({
+            "created_time": datetime.fromtimestamp(float(t), tz=timezone.utc),
+            "yes_price": yes if i % 7 else None,
+            "no_price": 100 - yes,
+            "count": int(rng.integers(1, 50)),
+            "price": None,
+            "taker_side": "yes",
+            "trade_id": f"t{i:05d}",
+        })
+    return trades
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class _FakeConn:
+    """kalshi.trades and kalshi.trade_candles_v1 in memory, answering the queries the rollup code issues."""
+
+    def __init__(self, trades, has_table=True):
+        self.trades = trades
+        self.candles = {}  # (ticker, interval, period_ts) -> row tuple
+        self.coverage = {}  # ticker -> rolled_from_ts
+        self.has_table = has_table
+        self.queries = []
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    @contextmanager
+    def cursor(self):
+        yield self
+
+    def execute(self, sql, params=()):
+        if "MIN(created_time)" in sql:
+            times = [t["created_time"] for t in self.trades if params[0] == "KX"]
+            return _Result([(min(times), max(times))] if times else [(None, None)])
+        if "FROM kalshi.trades" in sql:
+            self.queries.append(("trades", params[1:]))
+            ticker, lo, hi = params
+            rows = [tuple(t.values()) for t in self.trades if ticker == "KX" and lo <= t["created_time"] < hi]
+            return _Result(rows)
+        if not self.has_table:
+            raise psycopg.errors.UndefinedTable("relation does not exist")
+        if "trade_candles_coverage_v1" in sql:
+            if sql.lstrip().startswith("INSERT"):
+                self.coverage[params[0]] = params[1]
+                return _Result([])
+            tickers = params[0] if isinstance(params[0], list) else [params[0]]
+            rows = [(t, self.coverage[t]) for t in tickers if t in self.coverage]
+            return _Result(rows if isinstance(params[0], list) else [row[1:] for row in rows])
+        if sql.lstrip().startswith("DELETE"):
+            ticker, lo, hi = params
+            for key in [k for k in self.candles if k[0] == ticker and lo < k[2] <= hi]:
+                del self.candles[key]
+            return _Result([])
+        ticker, interval, lo, hi = params
+        self.queries.append(("rollups", (interval, lo, hi)))
+        keys = sorted(k for k in self.candles if k[:2] == (ticker, interval) and lo < k[2] <= hi)
+        return _Result([(k[2], *self.candles[k]) for k in keys])
+
+    def executemany(self, sql, rows):
+        for row in rows:
+            self.candles[tuple(row[:3])] = tuple(row[3:])
+
+
+def _strip(candles):
+    return [{k: c[k] for k in ("period_ts", *CANDLE_COLUMNS)} for c in candles]
+
+
+def test_refresh_rewrites_touched_minutes_like_aggregate_trades():
+    trades = _trades()
+    conn = _FakeConn(trades)
+    assert aligned_window(T0 + 61, T0 + 119) == (T0 + 60, T0 + 120)
+    assert aligned_window(T0 + 60, T0 + 120) == (T0 + 60, T0 + 180)
+
+    written = refresh_trade_rollups(conn, "KX", T0, T0 + 3 * 3600)
+    assert written == len(conn.candles)
+    for interval in ROLLUP_INTERVALS:
+        stored = sorted((k[2], v) for k, v in conn.candles.items() if k[1] == interval)
+        expected = aggregate_trades(trades, interval)
+        assert [(c["period_ts"], tuple(c[col] for col in CANDLE_COLUMNS)) for c in expected] == stored
+
+    # A late trade inside one minute: only that minute's candles are rebuilt, and they include it
+    late = dict(trades[500], trade_id="late", yes_price=99, count=1000)
+    conn.trades.append(late)
+    conn.trades.sort(key=lambda t: t["created_time"])
+    before = dict(conn.candles)
+    ts = int(late["created_time"].timestamp())
+    refresh_trade_rollups(conn, "KX", ts, ts)
+    changed = {k for k in conn.candles if conn.candles[k] != before.get(k)}
+    minute = ts - ts % 60
+    assert changed and all(minute < k[2] <= minute + 60 for k in changed)
+    assert conn.candles[("KX", 60, minute + 60)][CANDLE_COLUMNS.index("price_high_cents")] == 99
+
+
+def test_fetch_candles_serves_aligned_blocks(monkeypatch):
+    monkeypatch.setattr(trade_candles, "CACHE_ENABLED", True)
+    monkeypatch.setattr(trade_candles, "_block_cache", trade_candles.OrderedDict())
+    monkeypatch.setattr(trade_candles, "_trade_cache", {})
+    trades = _trades()
+    conn = _FakeConn(trades)
+    backfill_trade_rollups(conn, "KX")
+    conn.queries.clear()
+
+    def from_trades(start, end, interval):
+        window = [t for t in trades if start <= t["created_time"].timestamp() < end]
+        return _strip(aggregate_trades(window, interval))
+
+    # Same candles as aggregating the window's raw trades; one range scan covering both blocks
+    start, end = T0 + 1800, T0 + 5400
+    assert _strip(trade_candles.fetch_candles(conn, "KX", 10, start, end)) == from_trades(start, end, 10)
+    assert conn.queries == [("rollups", (10, T0, T0 + 7200))]
+
+    # Zoom/pan into overlapping windows: cached blocks are reused, only the new block is scanned
+    conn.queries.clear()
+    assert _strip(trade_candles.fetch_candles(conn, "KX", 10, T0 + 100, T0 + 200)) == from_trades(T0 + 100, T0 + 200, 10)
+    assert conn.queries == []
+    assert _strip(trade_candles.fetch_candles(conn, "KX", 10, T0 + 5000, T0 + 9000)) == from_trades(T0 + 5000, T0 + 9000, 10)
+    assert conn.queries == [("rollups", (10, T0 + 7200, T0 + 10800))]
+
+    # Intervals that aren't materialized, unknown tickers and databases without the table use the raw trades
+    conn.queries.clear()
+    assert _strip(trade_candles.fetch_candles(conn, "KX", 5, start, end)) == from_trades(start, end, 5)
+    assert [q[0] for q in conn.queries] == ["trades"]
+    conn.queries.clear()
+    assert trade_candles.fetch_candles(conn, "KY", 1, start, end) == []
+    assert [q[0] for q in conn.queries] == ["trades"]
+    bare = _FakeConn(trades, has_table=False)
+    assert _strip(trade_candles.fetch_candles(bare, "KX", 60, start, end)) == from_trades(start, end, 60)
+
+
+def test_partly_rolled_up_window_falls_back_to_raw_trades(monkeypatch):
+    monkeypatch.setattr(trade_candles, "CACHE_ENABLED", False)
+    trades = _trades()
+    conn = _FakeConn(trades)
+
+    def from_trades(start, end, interval):
+        window = [t for t in trades if start <= t["created_time"].timestamp() < end]
+        return _strip(aggregate_trades(window, interval))
+
+    # A load rolled up only the second hour (the trades around it predate the rollups): not served from them
+    refresh_trade_rollups(conn, "KX", T0 + 3600, T0 + 7199)
+    assert conn.candles and trade_rollup_watermarks(conn, ["KX"]) == {}
+    start, end = T0 + 1800, T0 + 9000
+    conn.queries.clear()
+    assert _strip(trade_candles.fetch_candles(conn, "KX", 60, start, end)) == from_trades(start, end, 60)
+    assert [q[0] for q in conn.queries] == ["trades"]
+
+    # Rolled up from the second hour on: windows inside are served from the rollups, earlier starts are not
+    refresh_trade_rollups(conn, "KX", T0 + 3600, T0 + 3 * 3600)
+    conn.coverage["KX"] = T0 + 3600
+    conn.queries.clear()
+    assert _strip(trade_candles.fetch_candles(conn, "KX", 60, T0 + 3600, end)) == from_trades(T0 + 3600, end, 60)
+    assert [q[0] for q in conn.queries] == ["rollups"]
+    conn.queries.clear()
+    assert _strip(trade_candles.fetch_candles(conn, "KX", 60, start, end)) == from_trades(start, end, 60)
+    assert [q[0] for q in conn.queries] == ["trades"]
+
+    # A backfill covers the whole history, so the same window now comes from the rollups
+    backfill_trade_rollups(conn, "KX")
+    assert trade_rollup_watermarks(conn, ["KX", "KY"]) == {"KX": 0}
+    conn.queries.clear()
+    assert _strip(trade_candles.fetch_candles(conn, "KX", 60, start, end)) == from_trades(start, end, 60)
+    assert [q[0] for q in conn.queries] == ["rollups"]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming events -> snapshots -> odds join -> paper trade stages (scripts/lib/_winprob_stream_lib.py).
+
+Covers:
+1. Snapshot selection matches the per-game argmin / max-event_id rule, with games split across input batches
+   (in memory or streamed from a Parquet file)
+2. The join scores like build_design_matrix + predict_proba, and the chained --events-parquet run writes the
+   same joined rows and paper-trade decisions as the snapshot file -> join -> paper trade scripts
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+from scripts.lib._winprob_lib import (  # noqa: E402
+    ModelParams,
+    PlattCalibrator,
+    PreprocessParams,
+    WinProbArtifact,
+    build_design_matrix,
+    predict_proba,
+    save_artifact,
+)
+from scripts.lib._winprob_stream_lib import EVENT_COLUMNS, iter_parquet_batches, snapshot_batches  # noqa: E402
+from scripts.process import build_winprob_snapshots_parquet as build_snapshots  # noqa: E402
+from scripts.trade import join_winprob_to_odds_snapshot as join_odds  # noqa: E402
+from scripts.trade import paper_trade_winprob as paper_trade  # noqa: E402
+
+BUCKETS = [2880, 2000, 1440, 725, 60, 0]
+
+
+def _events(n_games=40, seed=0) -> pa.Table:
+    rng = np.random.default_rng(seed)
+    cols = {k: [] for k in EVENT_COLUMNS}
+    event_id = 0
+    for g in range(n_games):
+        n = int(rng.integers(1, 60))
+        # Coarse times force exact ties in distance and repeated times (tie-break on event_id).
+        t = np.sort(rng.choice(np.arange(0, 2881, 120), size=n))[::-1]
+        for i in range(n):
+            event_id += int(rng.integers(1, 3))
+            cols["game_id"].append(f"00224{g:05d}")
+            cols["event_id"].append(event_id)
+            cols["season_start"].append(2024)
+            cols["point_differential"].append(int(rng.integers(-15, 15)))
+            cols["time_remaining_regulation"].append(int(t[i]))
+            cols["possession_side"].append(None if rng.random() < 0.2 else int(rng.integers(0, 2)))
+            cols["final_winning_team"].append(None if g == 3 else g % 2)
+    return pa.table(cols)
+
+
+def _reference_snapshots(tab: pa.Table) -> list[dict]:
+    rows = []
+    data = tab.to_pydict()
+    gids = data["game_id"]
+    for gid in dict.fromkeys(gids):
+        idx = [i for i, g in enumerate(gids) if g == gid]
+        t = np.array([data["time_remaining_regulation"][i] for i in idx])
+        ev = np.array([data["event_id"][i] for i in idx])
+        for b in BUCKETS:
+            dist = np.abs(t - b)
+            cand = np.where(dist == dist.min())[0]
+            j = idx[int(cand[np.argmax(ev[cand])])]
+            side = data["possession_side"][j]
+            rows.append(
+                {
+                    "game_id": gid,
+                    "bucket_seconds_remaining": b,
+                    "event_id": data["event_id"][j],
+                    "possession_side": side,
+                    "possession": {0: "home", 1: "away"}.get(side, "unknown"),
+                    "final_winning_team": data["final_winning_team"][j],
+                }
+            )
+    return rows
+
+
+def _artifact() -> WinProbArtifact:
+    return WinProbArtifact(
+        created_at_utc="20250101T000000Z",
+        version="v1",
+        train_season_start_max=2022,
+        calib_season_start=2023,
+        test_season_start=2024,
+        buckets_seconds_remaining=BUCKETS,
+        preprocess=PreprocessParams(0.5, 9.0, 1440.0, 830.0),
+        feature_names=["point_differential_scaled", "time_remaining_regulation_scaled", "possession_home", "possession_away", "possession_unknown"],
+        model=ModelParams([0.9, -0.2, 0.1, -0.1, 0.0], 0.15, 1.0, 50, 1e-6),
+        platt=PlattCalibrator(0.05, 1.1),
+        isotonic=None,
+    )
+
+
+def test_snapshot_selection_matches_reference_across_batches():
+    tab = _events()
+    expected = _reference_snapshots(tab)
+    keep = ["game_id", "bucket_seconds_remaining", "event_id", "possession_side", "possession", "final_winning_team"]
+    for batch_rows in (7, 64, tab.num_rows):
+        got = pa.Table.from_batches(list(snapshot_batches(tab.to_batches(max_chunksize=batch_rows), BUCKETS)))
+        assert got.select(keep).to_pylist() == expected
+
+    with tempfile.TemporaryDirectory() as d:
+        events_path = Path(d) / "events.parquet"
+        pq.write_table(tab, events_path)
+        streamed = list(iter_parquet_batches(events_path, columns=EVENT_COLUMNS, batch_rows=13))
+        assert max(rb.num_rows for rb in streamed) <= 13 and streamed[0].schema.names == list(EVENT_COLUMNS)
+        got = pa.Table.from_batches(list(snapshot_batches(streamed, BUCKETS)))
+        assert got.select(keep).to_pylist() == expected
+        out = Path(d) / "snap.parquet"
+        assert build_snapshots.main(["--in-parquet", str(events_path), "--out", str(out), "--buckets-seconds-remaining",
+                                     ",".join(map(str, BUCKETS)), "--batch-rows", "13"]) == 0
+        assert pq.read_table(out).select(keep).to_pylist() == expected
+        manifest = json.loads(Path(str(out) + ".manifest.json").read_text())
+        assert manifest["stats"]["games_total"] == 40 and manifest["stats"]["rows_null_label_selected"] == len(BUCKETS)
+
+
+def test_chained_join_and_paper_trade_match_file_stages():
+    tab = _events(n_games=12, seed=5)
+    art = _artifact()
+    games = [
+        {
+            "gameId": f"00224{g:05d}",
+            "markets": [{"group_name": "regular", "name": "2way", "books": [
+                {"id": "4", "name": "Book", "outcomes": [{"type": "home", "odds": str(1.3 + 0.1 * g)}, {"type": "away", "odds": "2.1"}]}
+            ]}],
+        }
+        for g in (9, 2, 5, 7, 99)
+    ]
+    with tempfile.TemporaryDirectory() as d:
+        d = Path(d)
+        pq.write_table(tab, d / "events.parquet")
+        save_artifact(d / "art.json", art)
+        (d / "odds.json").write_text(json.dumps({"games": games}))
+        build_snapshots.main(["--in-parquet", str(d / "events.parquet"), "--out", str(d / "snap.parquet")])
+
+        common = ["--artifact", str(d / "art.json"), "--odds-file", str(d / "odds.json"), "--bucket-seconds-remaining", "720"]
+        join_odds.main(common + ["--snapshots-parquet", str(d / "snap.parquet"), "--out", str(d / "joined.parquet"),
+                                 "--batch-rows", "50"])
+        paper_trade.main(["--joined-parquet", str(d / "joined.parquet"), "--out-jsonl", str(d / "trades.jsonl")])
+        join_odds.main(common + ["--events-parquet", str(d / "events.parquet"), "--out", str(d / "chained.parquet"),
+                                 "--batch-rows", "20", "--paper-trades-jsonl", str(d / "chained.jsonl")])
+
+        joined = pq.read_table(d / "joined.parquet")
+        assert sorted(joined.column("game_id").to_pylist()) == ["0022400002", "0022400005", "0022400007", "0022400009"]
+        assert pq.read_table(d / "chained.parquet").sort_by("game_id").equals(joined.sort_by("game_id"))
+
+        j = joined.to_pydict()
+        X = build_design_matrix(
+            point_differential=np.array(j["point_differential"], dtype=np.float64),
+            time_remaining_regulation=np.array(j["time_remaining_regulation"], dtype=np.float64),
+            possession=j["possession"],
+            preprocess=art.preprocess,
+        )
+        np.testing.assert_allclose(j["model_p_home"], predict_proba(art, X=X), rtol=0, atol=1e-12)
+        home_raw = 1 / np.array(j["odds_home_dec"])
+        np.testing.assert_allclose(j["implied_home"], home_raw / (home_raw + 1 / 2.1), rtol=0, atol=1e-12)
+
+        def decisions(name):
+            out = [json.loads(line) for line in (d / name).read_text().splitlines()]
+            for rec in out:
+                rec.pop("created_at_utc")
+            return out
+
+        trades = decisions("trades.jsonl")
+        assert trades == decisions("chained.jsonl")
+        assert [t["game_id"] for t in trades] == sorted(j["game_id"])
+        for t in trades:
+            i = j["game_id"].index(t["game_id"])
+            best = max(j["edge_home"][i], j["edge_away"][i])
+            assert t["decision"]["edge"] == best
+            assert (t["decision"]["action"] == "bet") == (best >= 0.02)
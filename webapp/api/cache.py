@@ -35,6 +35,16 @@ else:
 CACHE_DIR = Path(__file__).parent.parent / ".cache"
 CACHE_DIR.mkdir(exist_ok=True)
 
+# Cleared in background job worker processes: they read the persisted caches but must not write
+# their (partial) copies back over the files the API process owns
+_PERSISTENCE_ENABLED = True
+
+
+def disable_disk_persistence() -> None:
+    """Stop every SimpleCache in this process from writing its cache file (reads are unaffected)."""
+    global _PERSISTENCE_ENABLED
+    _PERSISTENCE_ENABLED = False
+
 
 class SimpleCache:
     """
@@ -107,7 +117,7 @@ class SimpleCache:
     def _save_to_disk(self) -> None:
         """Save cache to disk."""
         cache_path = self._get_cache_path()
-        if not cache_path:
+        if not cache_path or not _PERSISTENCE_ENABLED:
             return
         
         # Check if Python is shutting down (sys.meta_path becomes None during shutdown)
@@ -451,7 +461,7 @@ def cached(ttl_seconds: int = 300, dynamic_ttl: Optional[Callable[[Any], int]] =
                     logger.debug(f"[CACHE] {func.__name__}: Cache HIT - returning cached result (key: {cache_key[:80]}...)")
                 else:
                     if func.__name__ == "get_aggregate_stats":
-                        logger.info(f"[CACHE] {func.__name__}: Cache HIT - using cached data from disk (24h TTL)")
+                        logger.info(f"[CACHE] {func.__name__}: Cache HIT - using cached data from disk (TTL: {ttl_seconds / 3600:.2g}h)")
                 return cached_result
             
             if stale_result is not None:
@@ -16,8 +16,6 @@ import threading
 import uuid
 import time
 from datetime import datetime, timezone
-import asyncio
-import json
 
 import pandas as pd
 import numpy as np
@@ -25,6 +23,8 @@ import numpy as np
 from ..db import get_db_connection
 from ..logging_config import get_logger
 from ..cache import SimpleCache
+from ..progress_bus import ProgressBus, relay_progress
+from ..jobs import Job, JobCancelled, JobContext, get_job_queue
 import hashlib
 import json as json_lib
 
@@ -128,21 +128,11 @@ GRID_SEARCH_CACHE_VERSION = 1
 _grid_search_cache = SimpleCache(ttl_seconds=86400 * 30, cache_file="grid_search_results.cache")  # 30 day TTL
 _grid_search_cache_lock = threading.Lock()  # Thread-safe cache access
 
-# WebSocket connections registry for event-driven updates (no polling!)
-# request_id -> set of WebSocket connections
-# Using weakref to avoid memory leaks
-import weakref
-from typing import Set
-from collections import defaultdict
-_grid_search_websockets: dict[str, Set[weakref.ref]] = {}
-_websocket_lock = threading.Lock()
-_main_event_loop: Optional[asyncio.AbstractEventLoop] = None
+# Progress channels for event-driven WebSocket updates (no polling!)
+# The background thread publishes progress views; subscribed WebSockets are pushed coalesced updates
+_grid_search_progress_bus = ProgressBus(min_interval=0.5)
 
-# Throttling for WebSocket updates to avoid overwhelming the system
-# Track last update time and count per request_id
-_last_websocket_update: dict[str, dict] = defaultdict(lambda: {"time": 0, "count": 0})
-_websocket_update_lock = threading.Lock()
-# Throttle: send update every N games OR every X milliseconds
+# Progress callback publishes every N games OR every X milliseconds
 WEBSOCKET_UPDATE_INTERVAL_GAMES = 2000  # Send update every 2000 games
 WEBSOCKET_UPDATE_INTERVAL_MS = 4000  # OR every 4000ms, whichever comes first
 
@@ -209,118 +199,32 @@ def process_combination_with_pool(
     return results
 
 
+def _progress_view(progress_data: dict) -> dict:
+    """The progress fields sent to WebSocket clients (the progress dict also holds results and cache keys)."""
+    current_combo_raw = progress_data.get("current_combo")
+    return {
+        "status": progress_data.get("status", "unknown"),
+        "current": progress_data.get("current", 0),
+        "total": progress_data.get("total", 0),
+        "current_combo": "" if current_combo_raw is None else str(current_combo_raw)
+    }
+
+
 def _push_progress_update(request_id: str, progress_data: dict, force: bool = False) -> None:
     """
-    Push progress update to all WebSocket connections for a request_id.
-    Called from background thread - bridges to async event loop.
+    Publish a progress update for request_id to subscribed WebSocket connections.
+    Safe to call from the background thread - the bus hands delivery to the event loop.
     
-    Design Pattern: Event-Driven Pattern + Thread-to-Async Bridge + Throttling Pattern
-    Algorithm: Throttled push on progress change (every N games OR every X ms)
-    Big O: O(n) where n = number of connected WebSockets
+    Design Pattern: Event-Driven Pattern + Publish-Subscribe
+    Algorithm: Latest-value channel; non-forced updates are coalesced (at most one per bus interval)
+    Big O: O(1) per publish, O(n) per delivery where n = number of connected WebSockets
     
     Args:
         request_id: Grid search request ID
         progress_data: Progress data dictionary
-        force: If True, bypass throttling and send immediately
+        force: If True, deliver immediately instead of coalescing
     """
-    current_count = progress_data.get("current", 0)
-    current_time_ms = int(time.time() * 1000)
-    
-    # Check throttling (unless forced)
-    if not force:
-        with _websocket_update_lock:
-            last_update = _last_websocket_update[request_id]
-            games_since_update = current_count - last_update["count"]
-            time_since_update_ms = current_time_ms - last_update["time"]
-            
-            # Throttle: only send if enough games OR enough time has passed
-            if (games_since_update < WEBSOCKET_UPDATE_INTERVAL_GAMES and 
-                time_since_update_ms < WEBSOCKET_UPDATE_INTERVAL_MS):
-                return  # Skip this update, throttled
-            
-            # Update last update tracking
-            _last_websocket_update[request_id] = {
-                "time": current_time_ms,
-                "count": current_count
-            }
-    
-    # Get current WebSocket connections for this request_id
-    with _websocket_lock:
-        websocket_refs = list(_grid_search_websockets.get(request_id, set()))
-    
-    if not websocket_refs:
-        return
-    
-    # Prepare progress message
-    current_combo_raw = progress_data.get("current_combo")
-    current_combo_str = "" if current_combo_raw is None else str(current_combo_raw)
-    
-    progress_message = {
-        "type": "progress",
-        "progress": {
-            "status": progress_data.get("status", "unknown"),
-            "current": progress_data.get("current", 0),
-            "total": progress_data.get("total", 0),
-            "current_combo": current_combo_str
-        }
-    }
-    
-    # Push to all WebSocket connections via event loop
-    # Get the main event loop (set when first WebSocket connects)
-    global _main_event_loop
-    if _main_event_loop is None:
-        # Try to get the event loop from the current thread (won't work in background thread)
-        try:
-            _main_event_loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # No event loop in this thread - need to get it from the main thread
-            # Try to get it from the default event loop policy
-            try:
-                loop = asyncio.get_event_loop()
-                if loop and loop.is_running():
-                    _main_event_loop = loop
-                else:
-                    logger.warning(f"No running event loop available for WebSocket push: {request_id}")
-                    return
-            except RuntimeError:
-                logger.warning(f"No event loop available for WebSocket push: {request_id}")
-                return
-    
-    # Schedule async send to all WebSocket connections
-    sent_count = 0
-    for ws_ref in websocket_refs:
-        ws = ws_ref()
-        if ws is None:
-            # WebSocket was garbage collected, will be cleaned up
-            continue
-        
-        try:
-            # Schedule coroutine in event loop (from background thread to async context)
-            asyncio.run_coroutine_threadsafe(
-                _send_progress_update_safe(ws, progress_message),
-                _main_event_loop
-            )
-            sent_count += 1
-        except Exception as e:
-            logger.debug(f"Failed to schedule WebSocket update for {request_id}: {e}")
-
-
-async def _send_progress_update_safe(websocket: WebSocket, message: dict) -> None:
-    """Helper function to safely send progress update via WebSocket."""
-    try:
-        await websocket.send_json(message)
-    except Exception as e:
-        logger.debug(f"Failed to send WebSocket progress update: {e}")
-        # Connection might be closed, will be cleaned up on disconnect
-
-
-def _cleanup_websocket_ref(request_id: str, ws_ref: weakref.ref) -> None:
-    """Clean up WebSocket reference when connection is closed."""
-    with _websocket_lock:
-        if request_id in _grid_search_websockets:
-            _grid_search_websockets[request_id].discard(ws_ref)
-            if not _grid_search_websockets[request_id]:
-                del _grid_search_websockets[request_id]
+    _grid_search_progress_bus.publish(request_id, _progress_view(progress_data), force=force)
 
 
 def _run_grid_search_background(
@@ -346,9 +250,20 @@ def _run_grid_search_background(
     workers: int,
     seed: int,
     dsn: str,
-    model_name: Optional[str] = None
+    model_name: Optional[str] = None,
+    job: Optional[JobContext] = None
 ):
-    """Background task to run grid search."""
+    """
+    Background task to run grid search.
+
+    When run as a queued job (job is set, inside a worker process), progress is also reported to the
+    job table and cancellation requests stop the search; failures propagate so the job records them.
+    """
+    def publish(progress_data: dict, force: bool = False) -> None:
+        _push_progress_update(request_id, progress_data, force=force)
+        if job is not None:
+            job.report(_progress_view(progress_data), force=force)
+
     try:
         with _grid_search_lock:
             # Preserve cache_key if it exists (set before background thread started)
@@ -366,7 +281,7 @@ def _run_grid_search_background(
             initial_progress = _grid_search_progress[request_id].copy()
         
         # Force initial update to notify WebSocket clients
-        _push_progress_update(request_id, initial_progress, force=True)
+        publish(initial_progress, force=True)
         
         # Create config
         from pathlib import Path
@@ -482,7 +397,7 @@ def _run_grid_search_background(
                         progress_data = _grid_search_progress[request_id].copy()
                 
                 # Push update to WebSocket connections (throttled check happens inside)
-                _push_progress_update(request_id, progress_data, force=False)
+                publish(progress_data, force=False)
                 last_update_time_ms[0] = current_time_ms  # Update time tracking
                 
                 # Log progress periodically (every 100 games, every 1%, or at completion)
@@ -526,17 +441,24 @@ def _run_grid_search_background(
                 
                 def advance(self, task_id, increment):
                     """Called by run_simulation_for_games after each game."""
+                    if job is not None:
+                        job.check_cancelled()  # Escapes run_simulation_for_games via its per-game error path
                     for _ in range(increment):
                         self.callback()
                 
                 def update(self, task_id, current=None):
                     """Called by run_simulation_for_games to update status."""
+                    if job is not None:
+                        job.check_cancelled()
                     # Update current_combo when starting a new game
                     if current and "entry=" in str(current):
                         with _grid_search_lock:
                             if request_id in _grid_search_progress:
                                 _grid_search_progress[request_id]["current_combo"] = str(current)
             
+            if job is not None:
+                job.check_cancelled()  # Combinations still queued in the pool are skipped once cancelled
+            
             # Create progress object with callback
             progress_obj = SimpleProgress(update_progress_callback)
             
@@ -562,6 +484,9 @@ def _run_grid_search_background(
                     completed_combos += 1
                     if completed_combos % 10 == 0 or completed_combos == len(combinations):
                         logger.info(f"Grid search {request_id}: Completed {completed_combos}/{len(combinations)} combinations")
+                except JobCancelled:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
                 except Exception as e:
                     logger.error(f"Error processing combination: {e}", exc_info=True)
         
@@ -573,7 +498,7 @@ def _run_grid_search_background(
                 final_progress = _grid_search_progress[request_id].copy()
         
         # Force final progress update
-        _push_progress_update(request_id, final_progress, force=True)
+        publish(final_progress, force=True)
         
         # Aggregate results by split
         train_results = []
@@ -748,10 +673,15 @@ def _run_grid_search_background(
                 logger.warning(f"Grid search {request_id}: No cache_key found in final_progress, skipping cache. Keys in final_progress: {list(final_progress.keys())[:10]}")
         
         # Force final update to notify WebSocket clients
-        _push_progress_update(request_id, final_progress, force=True)
+        publish(final_progress, force=True)
     
+    except JobCancelled:
+        logger.info(f"Grid search {request_id} cancelled")
+        raise
     except Exception as e:
         logger.error(f"Error in grid search background task: {e}", exc_info=True)
+        if job is not None:
+            raise  # The worker records the failure on the job
         with _grid_search_lock:
             if request_id in _grid_search_progress:
                 _grid_search_progress[request_id].update({
@@ -764,6 +694,40 @@ def _run_grid_search_background(
         _push_progress_update(request_id, error_progress, force=True)
 
 
+def _grid_search_job(params: dict, job: JobContext) -> dict:
+    """Job runner (worker process): run the grid search and return its final progress dict as the job result."""
+    params = dict(params)
+    with _grid_search_lock:
+        _grid_search_progress[job.job_id] = {"_cache_key": params.pop("cache_key")}
+    _run_grid_search_background(job.job_id, job=job, **params)
+    with _grid_search_lock:
+        result = _grid_search_progress.pop(job.job_id)
+    result.pop("_cache_key", None)
+    return result
+
+
+def _job_progress_view(job: Job) -> dict:
+    """Progress view of a queued grid search job (the worker reports _progress_view dicts)."""
+    view = {**_progress_view({}), **job.progress, "status": job.status}
+    if job.error:
+        view["error"] = job.error
+    return view
+
+
+def _on_grid_search_job_update(job: Job) -> None:
+    """Dispatcher callback (API process): relay job progress to WebSockets and cache completed results."""
+    if job.status == "complete":
+        result = get_job_queue().result(job.id)
+        if result is not None:
+            with _grid_search_cache_lock:
+                _grid_search_cache.set(job.key, result)
+                _grid_search_cache.save()
+    _grid_search_progress_bus.publish(job.id, _job_progress_view(job), force=job.finished)
+
+
+get_job_queue().register("grid_search", _grid_search_job, on_update=_on_grid_search_job_update)
+
+
 def _generate_grid_search_cache_key(
     season: str,
     entry_min: float,
@@ -1348,62 +1312,68 @@ def run_grid_search(
                 "source": "cache"
             }
     
-    # Priority 3: Files and cache don't exist - start new grid search
-    logger.info(f"Grid search files and cache MISS for key: {cache_key[:32]}..., starting background task")
-    
-    # Generate unique request_id
-    request_id = str(uuid.uuid4())
+    # Priority 3: Files and cache don't exist - queue the grid search
+    # Runs in a job worker process; an identical search already queued or running is joined instead
+    logger.info(f"Grid search files and cache MISS for key: {cache_key[:32]}..., queueing job")
     
     # Get DSN from environment
     dsn = os.getenv("DATABASE_URL")
     if not dsn:
         raise HTTPException(status_code=500, detail="DATABASE_URL environment variable not set")
     
-    # Store cache_key in progress for later use when storing results
-    with _grid_search_lock:
-        if request_id not in _grid_search_progress:
-            _grid_search_progress[request_id] = {}
-        _grid_search_progress[request_id]["_cache_key"] = cache_key
-    
-    # Start background task
-    thread = threading.Thread(
-        target=_run_grid_search_background,
-        args=(
-            request_id,
-            season,
-            entry_min,
-            entry_max,
-            entry_step,
-            exit_min,
-            exit_max,
-            exit_step,
-            bet_amount,
-            enable_fees,
-            slippage_rate,
-            exclude_first_seconds,
-            exclude_last_seconds,
-            train_ratio,
-            valid_ratio,
-            test_ratio,
-            top_n,
-            min_trade_count,
-            max_games,
-            workers,
-            seed,
-            model_name,
-            dsn
-        ),
-        daemon=True
-    )
-    thread.start()
+    job, created = get_job_queue().submit("grid_search", cache_key, {
+        "cache_key": cache_key,
+        "season": season,
+        "entry_min": entry_min,
+        "entry_max": entry_max,
+        "entry_step": entry_step,
+        "exit_min": exit_min,
+        "exit_max": exit_max,
+        "exit_step": exit_step,
+        "bet_amount": bet_amount,
+        "enable_fees": enable_fees,
+        "slippage_rate": slippage_rate,
+        "exclude_first_seconds": exclude_first_seconds,
+        "exclude_last_seconds": exclude_last_seconds,
+        "train_ratio": train_ratio,
+        "valid_ratio": valid_ratio,
+        "test_ratio": test_ratio,
+        "top_n": top_n,
+        "min_trade_count": min_trade_count,
+        "max_games": max_games,
+        "workers": workers,
+        "seed": seed,
+        "dsn": dsn,
+        "model_name": model_name,
+    })
     
     return {
-        "request_id": request_id,
-        "status": "started",
-        "cached": False
+        "request_id": job.id,
+        "status": "started" if created else job.status,
+        "cached": False,
+        "deduplicated": not created
     }
 
 
+def _load_job_result(request_id: str) -> Optional[dict]:
+    """
+    Progress dict for a grid search run as a queued job, or None if request_id is not a job.
+    
+    Completed results are read from the job's result file and kept in _grid_search_progress.
+    """
+    job = get_job_queue().get(request_id)
+    if job is None:
+        return None
+    if job.status != "complete":
+        return _job_progress_view(job)
+    result = get_job_queue().result(request_id)
+    if result is None:
+        return {**_job_progress_view(job), "status": "error", "error": "Job result file is missing"}
+    with _grid_search_lock:
+        _grid_search_progress[request_id] = result
+    return result
+
+
 @router.get("/api/grid-search/progress/{request_id}")
 def get_grid_search_progress(request_id: str) -> dict[str, Any]:
     """
@@ -1413,16 +1383,19 @@ def get_grid_search_progress(request_id: str) -> dict[str, Any]:
     For real-time updates, use WebSocket endpoint at /ws/grid-search/{request_id}
     """
     with _grid_search_lock:
-        if request_id not in _grid_search_progress:
+        progress = _grid_search_progress.get(request_id)
+        progress = progress.copy() if progress is not None else None
+    if progress is None:
+        job = get_job_queue().get(request_id)
+        if job is None:
             raise HTTPException(status_code=404, detail="Request ID not found")
-        
-        progress = _grid_search_progress[request_id].copy()
-        return {
-            "status": progress.get("status", "unknown"),
-            "current": progress.get("current", 0),
-            "total": progress.get("total", 0),
-            "current_combo": progress.get("current_combo")
-        }
+        progress = _job_progress_view(job)
+    return {
+        "status": progress.get("status", "unknown"),
+        "current": progress.get("current", 0),
+        "total": progress.get("total", 0),
+        "current_combo": progress.get("current_combo")
+    }
 
 
 @router.websocket("/ws/grid-search/{request_id}")
@@ -1431,14 +1404,14 @@ async def websocket_grid_search_progress(websocket: WebSocket, request_id: str):
     WebSocket endpoint for streaming grid search progress in real-time.
     
     Design Pattern: WebSocket Handler Pattern + Observer Pattern
-    Algorithm: File monitoring with polling + broadcast to connected clients
+    Algorithm: Subscribe to the request's progress channel; updates are pushed by the background task
     Big O: O(1) per connection, O(1) per progress update
     
     Message format sent to client:
         {
             "type": "progress",
             "progress": {
-                "status": "running" | "complete" | "error",
+                "status": "queued" | "running" | "complete" | "error" | "cancelled",
                 "current": int,
                 "total": int,
                 "current_combo": str,
@@ -1446,7 +1419,7 @@ async def websocket_grid_search_progress(websocket: WebSocket, request_id: str):
             }
         }
     
-    Connection closes automatically when grid search completes or errors.
+    Connection closes automatically when grid search completes, errors or is cancelled.
     """
     client_ip = None
     if websocket.client:
@@ -1454,94 +1427,31 @@ async def websocket_grid_search_progress(websocket: WebSocket, request_id: str):
     
     logger.info(f"WebSocket grid search progress connection attempt: request_id={request_id}, client_ip={client_ip}")
     
-    # Validate request_id exists or will exist soon
-    with _grid_search_lock:
-        if request_id not in _grid_search_progress:
-            # Request might not exist yet if grid search just started
-            # Allow connection but will send initial state when available
-            initial_status = {
-                "status": "not_found",
-                "current": 0,
-                "total": 0,
-                "current_combo": ""
-            }
-        else:
-            progress = _grid_search_progress[request_id].copy()
-            initial_status = {
-                "status": progress.get("status", "unknown"),
-                "current": progress.get("current", 0),
-                "total": progress.get("total", 0),
-                "current_combo": progress.get("current_combo", "")
-            }
-    
-    # Store main event loop for thread-to-async bridge
-    global _main_event_loop
-    try:
-        _main_event_loop = asyncio.get_running_loop()
-    except RuntimeError:
-        pass  # Will be set when WebSocket connects
-    
     try:
-        await websocket.accept()
-        logger.info(f"WebSocket grid search progress connection accepted: request_id={request_id}, client_ip={client_ip}")
-        
-        # Register this WebSocket connection for event-driven updates (no polling!)
-        ws_ref = weakref.ref(websocket, lambda ref: _cleanup_websocket_ref(request_id, ref))
-        with _websocket_lock:
-            if request_id not in _grid_search_websockets:
-                _grid_search_websockets[request_id] = set()
-            _grid_search_websockets[request_id].add(ws_ref)
-        
-        # Send initial progress state
-        await websocket.send_json({
-            "type": "progress",
-            "progress": initial_status
-        })
-        
-        # EVENT-DRIVEN: Wait for messages and handle disconnection
-        # Progress updates are pushed immediately when they occur via _push_progress_update()
-        # No polling loop - updates come as events!
-        try:
-            while True:
-                try:
-                    # Wait for incoming messages (ping/pong) or disconnection
-                    # Progress updates come via event-driven push from background task
-                    message = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                    try:
-                        data = json.loads(message)
-                        if data.get("type") == "ping":
-                            await websocket.send_json({
-                                "type": "pong",
-                                "timestamp": asyncio.get_event_loop().time()
-                            })
-                    except json.JSONDecodeError:
-                        pass
-                except asyncio.TimeoutError:
-                    # No message received, check if task is complete (only check periodically)
-                    with _grid_search_lock:
-                        if request_id in _grid_search_progress:
-                            status = _grid_search_progress[request_id].get("status", "unknown")
-                            if status == "complete" or status == "error":
-                                logger.info(f"Grid search {request_id} finished with status {status}, closing WebSocket connection")
-                                await websocket.close(code=1000, reason=f"Grid search {status}")
-                                break
-                    # Continue waiting for updates (they come via events, not polling)
-                    continue
-                    
-        except WebSocketDisconnect:
-            logger.info(f"WebSocket grid search progress connection disconnected: request_id={request_id}")
-        except Exception as e:
-            logger.error(f"Error in grid search progress WebSocket: {e}", exc_info=True)
-            try:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": f"Error: {str(e)}"
-                })
-            except Exception:
-                pass
-        finally:
-            # Unregister WebSocket connection
-            _cleanup_websocket_ref(request_id, ws_ref)
+        # Subscribe before reading the initial state so no update in between is missed
+        async with _grid_search_progress_bus.subscribe(request_id) as subscription:
+            initial_status = subscription.current
+            if initial_status is None:
+                # No progress published (yet): results loaded from cache/files, or a queued job
+                with _grid_search_lock:
+                    progress = _grid_search_progress.get(request_id)
+                if progress:
+                    initial_status = _progress_view(progress)
+                else:
+                    job = get_job_queue().get(request_id)
+                    initial_status = _job_progress_view(job) if job is not None else {
+                        "status": "not_found",
+                        "current": 0,
+                        "total": 0,
+                        "current_combo": ""
+                    }
+            
+            await websocket.accept()
+            logger.info(f"WebSocket grid search progress connection accepted: request_id={request_id}, client_ip={client_ip}")
+            
+            # EVENT-DRIVEN: progress updates are pushed via _push_progress_update(); pings are answered while waiting
+            await relay_progress(websocket, subscription, initial_status, label="Grid search")
+            logger.info(f"Grid search {request_id} WebSocket finished (status {(subscription.current or initial_status).get('status')})")
     
     except WebSocketDisconnect:
         logger.info(f"WebSocket grid search progress connection closed normally: request_id={request_id}")
@@ -1557,34 +1467,52 @@ async def websocket_grid_search_progress(websocket: WebSocket, request_id: str):
 def get_grid_search_results(request_id: str) -> dict[str, Any]:
     """Get results for a completed grid search."""
     with _grid_search_lock:
-        if request_id not in _grid_search_progress:
+        progress = _grid_search_progress.get(request_id)
+    if progress is None:
+        progress = _load_job_result(request_id)
+        if progress is None:
             raise HTTPException(status_code=404, detail="Request ID not found")
-        
-        progress = _grid_search_progress[request_id]
-        status = progress.get("status")
-        
-        if status == "running":
-            raise HTTPException(status_code=202, detail="Grid search still running. Check progress endpoint.")
-        
-        if status == "error":
-            error = progress.get("error", "Unknown error")
-            raise HTTPException(status_code=500, detail=f"Grid search failed: {error}")
-        
-        if status != "complete":
-            raise HTTPException(status_code=400, detail=f"Unexpected status: {status}")
-        
-        # Convert numpy types to native Python types for JSON serialization
-        results = {
-            "final_selection": progress.get("final_selection"),
-            "training_results": progress.get("training_results", []),
-            "validation_results": progress.get("validation_results", []),
-            "test_results": progress.get("test_results", []),
-            "pattern_detection": progress.get("pattern_detection", {}),
-            "visualization_data": progress.get("visualization_data", {}),
-            "metadata": progress.get("metadata", {})
-        }
-        
-        return _convert_numpy_types(results)
+    
+    status = progress.get("status")
+    
+    if status in ("queued", "running"):
+        raise HTTPException(status_code=202, detail="Grid search still running. Check progress endpoint.")
+    
+    if status == "error":
+        error = progress.get("error", "Unknown error")
+        raise HTTPException(status_code=500, detail=f"Grid search failed: {error}")
+    
+    if status == "cancelled":
+        raise HTTPException(status_code=409, detail="Grid search was cancelled")
+    
+    if status != "complete":
+        raise HTTPException(status_code=400, detail=f"Unexpected status: {status}")
+    
+    # Convert numpy types to native Python types for JSON serialization
+    results = {
+        "final_selection": progress.get("final_selection"),
+        "training_results": progress.get("training_results", []),
+        "validation_results": progress.get("validation_results", []),
+        "test_results": progress.get("test_results", []),
+        "pattern_detection": progress.get("pattern_detection", {}),
+        "visualization_data": progress.get("visualization_data", {}),
+        "metadata": progress.get("metadata", {})
+    }
+    
+    return _convert_numpy_types(results)
+
+
+@router.post("/api/grid-search/cancel/{request_id}")
+def cancel_grid_search(request_id: str) -> dict[str, Any]:
+    """
+    Cancel a queued or running grid search.
+    
+    A queued search is cancelled immediately; a running one stops at its next progress check.
+    """
+    job = get_job_queue().cancel(request_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Request ID not found")
+    return {**_job_progress_view(job), "cancel_requested": job.cancel_requested}
 
 
 @router.get("/api/grid-search/comparison")
@@ -2,8 +2,8 @@
 Model comparison endpoint - serve comparison data for all models.
 
 Design Pattern: Service Pattern for model comparison
-Algorithm: File I/O and data transformation
-Big O: O(n) where n is total calibration points across all models
+Algorithm: Data transformation over report catalog entries (scripts/lib/_report_catalog_lib.py)
+Big O: O(n) where n is total calibration points across all models, once per catalog revision (memoized)
 
 Supports:
 - Original 4 models (LogReg/CatBoost × Platt/Isotonic) with standard evaluation format
@@ -11,7 +11,7 @@ Supports:
 - v2 models (catboost_baseline_platt_v2, catboost_baseline_isotonic_v2, catboost_odds_platt_v2, catboost_odds_isotonic_v2, and their no_interaction variants) with updated feature set and uses_opening_odds_baseline flag
 """
 
-import json
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -19,6 +19,11 @@ from fastapi import APIRouter, HTTPException
 
 from ..logging_config import get_logger
 
+repo_root_dir = Path(__file__).parent.parent.parent.parent
+if str(repo_root_dir) not in sys.path:
+    sys.path.insert(0, str(repo_root_dir))
+from scripts.lib._report_catalog_lib import get_catalog
+
 router = APIRouter()
 logger = get_logger(__name__)
 
@@ -84,7 +89,7 @@ def get_model_color(model_label: str) -> str:
 
 
 def load_evaluation_reports(reports_dir: Path) -> list[dict[str, Any]]:
-    """Load all evaluation reports (original 4 models + pre-game odds integration models + no-interaction models)."""
+    """Load all evaluation reports (original 4 models + pre-game odds integration models + no-interaction models) from the report catalog."""
     # All models (standard format) - original 4 + pre-game odds integration models + no-interaction models
     model_files = [
         "winprob_eval_logreg_platt_2017-2023_calib_2023_on_2024.json",
@@ -103,26 +108,23 @@ def load_evaluation_reports(reports_dir: Path) -> list[dict[str, Any]]:
         "winprob_eval_catboost_odds_no_interaction_isotonic_calib_2023_on_2024.json",
     ]
     
+    catalog = get_catalog(reports_dir)
     reports = []
     for filename in model_files:
-        filepath = reports_dir / filename
-        if not filepath.exists():
-            logger.warning(f"Evaluation file not found: {filepath}, skipping")
+        entry = catalog.get(Path(filename).stem)
+        if entry is None:
+            logger.warning(f"Evaluation file not found: {reports_dir / filename}, skipping")
             continue
         
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            model_label = get_model_label(filename)
-            data["model_label"] = model_label
-            data["model_color"] = get_model_color(model_label)
-            data["filename"] = filename
-            data["format"] = "standard"  # Mark as standard format
-            reports.append(data)
-        except Exception as e:
-            logger.error(f"Error loading evaluation file {filepath}: {e}", exc_info=True)
-            continue
+        model_label = get_model_label(filename)
+        reports.append({
+            "artifact_path": entry["artifact_path"],
+            "eval": {"overall": entry["overall"], "calibration_bins": entry["calibration_bins"]},
+            "model_label": model_label,
+            "model_color": get_model_color(model_label),
+            "filename": filename,
+            "format": "standard",  # Mark as standard format
+        })
     
     # Note: Removed fallback to time-bucketed format - all models should use standard format
     
@@ -220,6 +222,46 @@ def find_best_models(metrics: list[dict[str, Any]]) -> dict[str, str]:
     return best
 
 
+def _build_model_comparison(reports_dir: Path) -> dict[str, Any]:
+    """Comparison response for the reports in `reports_dir` (memoized per catalog revision by the route)."""
+    # Load all evaluation reports
+    reports = load_evaluation_reports(reports_dir)
+    
+    if len(reports) == 0:
+        raise HTTPException(
+            status_code=404,
+            detail="No evaluation reports found in data/models/evaluations/"
+        )
+    
+    # Extract metrics and calibration points
+    metrics = extract_metrics(reports)
+    best_models = find_best_models(metrics)
+    
+    # Build response with models array
+    models_data = []
+    for report in reports:
+        calibration_points = extract_calibration_points(report)
+        overall = report.get("eval", {}).get("overall", {})
+        
+        models_data.append({
+            "model_label": report["model_label"],
+            "model_color": report["model_color"],
+            "metrics": {
+                "logloss": overall.get("logloss", 0.0),
+                "brier": overall.get("brier", 0.0),
+                "ece": overall.get("ece_binned", 0.0),
+                "auc": overall.get("roc_auc", 0.0),
+                "n": overall.get("n", 0),
+            },
+            "calibration_points": calibration_points,
+        })
+    
+    return {
+        "models": models_data,
+        "best_models": best_models,
+    }
+
+
 @router.get("/stats/model-comparison")
 def get_model_comparison() -> dict[str, Any]:
     """
@@ -244,42 +286,7 @@ def get_model_comparison() -> dict[str, Any]:
                 detail=f"Evaluations directory not found: {reports_dir}"
             )
         
-        # Load all evaluation reports
-        reports = load_evaluation_reports(reports_dir)
-        
-        if len(reports) == 0:
-            raise HTTPException(
-                status_code=404,
-                detail="No evaluation reports found in data/models/evaluations/"
-            )
-        
-        # Extract metrics and calibration points
-        metrics = extract_metrics(reports)
-        best_models = find_best_models(metrics)
-        
-        # Build response with models array
-        models_data = []
-        for report in reports:
-            calibration_points = extract_calibration_points(report)
-            overall = report.get("eval", {}).get("overall", {})
-            
-            models_data.append({
-                "model_label": report["model_label"],
-                "model_color": report["model_color"],
-                "metrics": {
-                    "logloss": overall.get("logloss", 0.0),
-                    "brier": overall.get("brier", 0.0),
-                    "ece": overall.get("ece_binned", 0.0),
-                    "auc": overall.get("roc_auc", 0.0),
-                    "n": overall.get("n", 0),
-                },
-                "calibration_points": calibration_points,
-            })
-        
-        return {
-            "models": models_data,
-            "best_models": best_models,
-        }
+        return get_catalog(reports_dir).memo(("model-comparison",), lambda: _build_model_comparison(reports_dir))
         
     except HTTPException:
         raise
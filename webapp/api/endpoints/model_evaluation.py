@@ -2,17 +2,22 @@
 Model evaluation endpoint - serve calibration charts and evaluation metrics.
 
 Design Pattern: Service Pattern for model evaluation
-Algorithm: Load pre-computed evaluation results
-Big O: O(1) - file read operation
+Algorithm: Serve pre-computed evaluation summaries from the report catalog (scripts/lib/_report_catalog_lib.py)
+Big O: O(1) per request once the catalog is current (a directory stat + memoized response)
 """
 
-import json
+import sys
 from pathlib import Path
 from typing import Any, Optional
 from fastapi import APIRouter, HTTPException, Query
 
 from ..logging_config import get_logger
 
+repo_root_dir = Path(__file__).parent.parent.parent.parent
+if str(repo_root_dir) not in sys.path:
+    sys.path.insert(0, str(repo_root_dir))
+from scripts.lib._report_catalog_lib import get_catalog
+
 router = APIRouter()
 logger = get_logger(__name__)
 
@@ -34,10 +39,25 @@ def get_model_evaluation(
     - winprob_eval_*_no_platt_on_{season_start}.json (detailed format without Platt)
     
     Returns calibration data suitable for Chart.js rendering with model labels.
+    Served from the report catalog; the response is memoized until a report is added or changed.
     """
     # Resolve repo root: webapp/api/endpoints/model_evaluation.py -> repo root
     repo_root = Path(__file__).parent.parent.parent.parent.resolve()
-    reports_dir = repo_root / "data" / "models" / "evaluations"
+    catalog = get_catalog(repo_root / "data" / "models" / "evaluations")
+    return catalog.memo(
+        ("model-evaluation", season_start, all_seasons, model_type),
+        lambda: _build_model_evaluation(catalog, season_start=season_start, all_seasons=all_seasons, model_type=model_type),
+    )
+
+
+def _build_model_evaluation(
+    catalog: Any,
+    *,
+    season_start: Optional[int],
+    all_seasons: bool,
+    model_type: Optional[str],
+) -> dict[str, Any]:
+    reports_dir = catalog.reports_dir
     
     # Helper function to determine model type and calibration from filename
     def get_model_info_from_filename(filename: str) -> tuple[str, str]:
@@ -95,7 +115,7 @@ def get_model_evaluation(
     
     # If all_seasons=True, aggregate all evaluation reports
     if all_seasons or season_start is None:
-        eval_files = list(reports_dir.glob("winprob_eval_*.json"))
+        eval_files = [Path(e["file"]) for e in catalog.glob("winprob_eval_*.json")]
         # Filter out smoke test files
         eval_files = [f for f in eval_files if "smoke" not in f.name]
         
@@ -133,7 +153,7 @@ def get_model_evaluation(
         no_platt_files = [f for f in eval_files if get_model_type_from_filename(f.name) == "no_platt"]
         
         def aggregate_calibration(files: list[Path], label: str) -> dict[str, Any]:
-            """Aggregate calibration data from a list of evaluation files."""
+            """Aggregate calibration data from the catalog entries of a list of evaluation files."""
             all_calibration_points = []
             all_calibration_bins = []
             total_n = 0
@@ -141,31 +161,26 @@ def get_model_evaluation(
             artifact_metas = []
             
             for eval_file in sorted(files):
-                try:
-                    with open(eval_file, 'r') as f:
-                        eval_data = json.load(f)
-                    
-                    artifact_paths.add(eval_data.get("artifact_path", ""))
-                    artifact_metas.append(eval_data.get("artifact_meta", {}))
-                    
-                    bins = eval_data.get("eval", {}).get("calibration_bins", [])
-                    for bin_data in bins:
-                        avg_p = bin_data.get("avg_p", 0)
-                        obs_rate = bin_data.get("obs_rate", 0)
-                        n = bin_data.get("n", 0)
-                        if n > 0:
-                            all_calibration_points.append({
-                                "x": avg_p,
-                                "y": obs_rate,
-                                "n": n,
-                                "gap": bin_data.get("gap", 0),
-                                "season": eval_data.get("eval", {}).get("season_start"),
-                            })
-                            all_calibration_bins.append(bin_data)
-                            total_n += n
-                except Exception as e:
-                    logger.warning(f"Failed to read evaluation report {eval_file}: {e}")
+                entry = catalog.get(eval_file.stem)
+                if entry is None:
                     continue
+                artifact_paths.add(entry["artifact_path"])
+                artifact_metas.append(entry["artifact_meta"])
+                
+                for bin_data in entry["calibration_bins"]:
+                    avg_p = bin_data.get("avg_p", 0)
+                    obs_rate = bin_data.get("obs_rate", 0)
+                    n = bin_data.get("n", 0)
+                    if n > 0:
+                        all_calibration_points.append({
+                            "x": avg_p,
+                            "y": obs_rate,
+                            "n": n,
+                            "gap": bin_data.get("gap", 0),
+                            "season": entry["season_start"],
+                        })
+                        all_calibration_bins.append(bin_data)
+                        total_n += n
             
             if not all_calibration_points:
                 return None
@@ -250,89 +265,72 @@ def get_model_evaluation(
             "model_types": list(results.keys()),
         }
     
-    # Single season evaluation
-    eval_report_path = None
+    # Single season evaluation (catalog entries, newest report first)
+    def newest(pattern: str) -> Optional[dict[str, Any]]:
+        matches = catalog.glob(pattern)
+        return matches[0] if matches else None
     
     # First, try simple format
-    simple_path = reports_dir / f"winprob_eval_{season_start}.json"
-    if simple_path.exists():
-        eval_report_path = simple_path
-    else:
+    eval_entry = catalog.get(f"winprob_eval_{season_start}")
+    if eval_entry is None:
         # Try detailed format patterns - support all 4 model types
         # Check for specific model_type requests first
         if model_type == "logreg_platt":
             # Try logreg + platt (exact match)
-            platt_files = list(reports_dir.glob(f"winprob_eval_logreg_platt*_on_{season_start}.json"))
-            if not platt_files:
-                platt_files = list(reports_dir.glob(f"winprob_eval_*logreg*platt*_on_{season_start}.json"))
-            if platt_files:
-                eval_report_path = sorted(platt_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+            eval_entry = newest(f"winprob_eval_logreg_platt*_on_{season_start}.json") or newest(
+                f"winprob_eval_*logreg*platt*_on_{season_start}.json"
+            )
         
         elif model_type == "logreg_isotonic":
             # Try logreg + isotonic (exact match)
-            isotonic_files = list(reports_dir.glob(f"winprob_eval_logreg_isotonic*_on_{season_start}.json"))
-            if not isotonic_files:
-                isotonic_files = list(reports_dir.glob(f"winprob_eval_*logreg*isotonic*_on_{season_start}.json"))
-            if isotonic_files:
-                eval_report_path = sorted(isotonic_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+            eval_entry = newest(f"winprob_eval_logreg_isotonic*_on_{season_start}.json") or newest(
+                f"winprob_eval_*logreg*isotonic*_on_{season_start}.json"
+            )
         
         elif model_type == "catboost_platt":
             # Try catboost + platt (exact match)
-            catboost_platt_files = list(reports_dir.glob(f"winprob_eval_catboost_platt*_on_{season_start}.json"))
-            if not catboost_platt_files:
-                catboost_platt_files = list(reports_dir.glob(f"winprob_eval_*catboost*platt*_on_{season_start}.json"))
-            if catboost_platt_files:
-                eval_report_path = sorted(catboost_platt_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+            eval_entry = newest(f"winprob_eval_catboost_platt*_on_{season_start}.json") or newest(
+                f"winprob_eval_*catboost*platt*_on_{season_start}.json"
+            )
         
         elif model_type == "catboost_isotonic":
             # Try catboost + isotonic (exact match)
-            catboost_isotonic_files = list(reports_dir.glob(f"winprob_eval_catboost_isotonic*_on_{season_start}.json"))
-            if not catboost_isotonic_files:
-                catboost_isotonic_files = list(reports_dir.glob(f"winprob_eval_*catboost*isotonic*_on_{season_start}.json"))
-            if catboost_isotonic_files:
-                eval_report_path = sorted(catboost_isotonic_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+            eval_entry = newest(f"winprob_eval_catboost_isotonic*_on_{season_start}.json") or newest(
+                f"winprob_eval_*catboost*isotonic*_on_{season_start}.json"
+            )
         
         elif model_type is None or model_type in ["platt"]:
             # Try any platt model (backward compatibility)
-            platt_files = list(reports_dir.glob(f"winprob_eval_*_calib_*_on_{season_start}.json"))
-            if not platt_files:
-                platt_files = list(reports_dir.glob(f"winprob_eval_*platt*_on_{season_start}.json"))
-            if platt_files:
-                eval_report_path = sorted(platt_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+            eval_entry = newest(f"winprob_eval_*_calib_*_on_{season_start}.json") or newest(
+                f"winprob_eval_*platt*_on_{season_start}.json"
+            )
         
         elif model_type == "isotonic":
             # Try any isotonic model
-            isotonic_files = list(reports_dir.glob(f"winprob_eval_*isotonic*_on_{season_start}.json"))
-            if isotonic_files:
-                eval_report_path = sorted(isotonic_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+            eval_entry = newest(f"winprob_eval_*isotonic*_on_{season_start}.json")
         
-        if eval_report_path is None and (model_type == "no_platt" or model_type is None):
-            no_platt_files = list(reports_dir.glob(f"winprob_eval_*_no_platt_on_{season_start}.json"))
-            if no_platt_files:
-                eval_report_path = sorted(no_platt_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+        if eval_entry is None and (model_type == "no_platt" or model_type is None):
+            eval_entry = newest(f"winprob_eval_*_no_platt_on_{season_start}.json")
         
         # If still not found and model_type not specified, try any pattern
-        if eval_report_path is None and model_type is None:
-            any_files = list(reports_dir.glob(f"winprob_eval_*_{season_start}*.json"))
-            if any_files:
-                eval_report_path = sorted(any_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+        if eval_entry is None and model_type is None:
+            eval_entry = newest(f"winprob_eval_*_{season_start}*.json")
     
-    if eval_report_path is None or not eval_report_path.exists():
+    if eval_entry is None:
         # Try to find any evaluation report for this season
         if reports_dir.exists():
-            eval_files = list(reports_dir.glob(f"*{season_start}*.json"))
-            eval_files = [f for f in eval_files if "smoke" not in f.name and "winprob_eval" in f.name]
-            if eval_files:
+            eval_entries = [e for e in catalog.glob(f"*{season_start}*.json") if "smoke" not in e["file"]]
+            if eval_entries:
                 # Filter by model_type if specified
                 if model_type:
                     if model_type == "platt":
-                        eval_files = [f for f in eval_files if get_model_type_from_filename(f.name) == "platt"]
+                        eval_entries = [e for e in eval_entries if get_model_type_from_filename(e["file"]) == "platt"]
                     elif model_type == "no_platt":
-                        eval_files = [f for f in eval_files if get_model_type_from_filename(f.name) == "no_platt"]
+                        eval_entries = [e for e in eval_entries if get_model_type_from_filename(e["file"]) == "no_platt"]
                 
-                if eval_files:
-                    eval_report_path = sorted(eval_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
-                    logger.info(f"Using evaluation report: {eval_report_path.name}")
+                if eval_entries:
+                    eval_entry = eval_entries[0]
+                    logger.info(f"Using evaluation report: {eval_entry['file']}")
                 else:
                     raise HTTPException(
                         status_code=404,
@@ -349,15 +347,8 @@ def get_model_evaluation(
                 detail=f"Evaluation reports directory does not exist: {reports_dir}"
             )
     
-    try:
-        with open(eval_report_path, 'r') as f:
-            eval_data = json.load(f)
-    except Exception as e:
-        logger.error(f"Failed to read evaluation report: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to read evaluation report: {e}")
-    
     # Extract calibration data for Chart.js
-    calibration_bins = eval_data.get("eval", {}).get("calibration_bins", [])
+    calibration_bins = eval_entry["calibration_bins"]
     
     # Format for Chart.js scatter plot
     calibration_points = []
@@ -374,22 +365,24 @@ def get_model_evaluation(
             })
     
     # Determine model label and type info
-    model_label = get_model_label(eval_report_path.name, eval_data.get("artifact_meta", {}))
-    model_type, calibration = get_model_info_from_filename(eval_report_path.name)
+    model_label = get_model_label(eval_entry["file"], eval_entry["artifact_meta"])
+    model_type, calibration = get_model_info_from_filename(eval_entry["file"])
     
     return {
-        "artifact_path": str(eval_data.get("artifact_path", "")),
-        "artifact_meta": eval_data.get("artifact_meta", {}),
+        "artifact_path": eval_entry["artifact_path"],
+        "artifact_meta": eval_entry["artifact_meta"],
         "model_label": model_label,
         "model_type": calibration,  # Backward compatibility
         "model_type_full": f"{model_type}_{calibration}",  # New: full model type
         "base_model_type": model_type,  # New: just the base model (logreg/catboost)
         "calibration_method": calibration,  # New: just the calibration (platt/isotonic/no_platt)
         "eval": {
-            "season_start": eval_data.get("eval", {}).get("season_start"),
-            "overall": eval_data.get("eval", {}).get("overall", {}),
+            "season_start": eval_entry["season_start"],
+            "overall": eval_entry["overall"],
             "calibration_bins": calibration_bins,
             "calibration_points": calibration_points,  # For Chart.js
+            # Long-format grouped metrics ({group_by, group, n, logloss, brier, roc_auc, ece_binned, ...}); empty for older reports
+            "groups": eval_entry["groups"],
         },
     }
 
@@ -425,15 +418,15 @@ def get_model_evaluation_plot(
     if plot_type not in ["calibration", "calibration_context"]:
         raise HTTPException(status_code=400, detail=f"Invalid plot_type: {plot_type}. Must be 'calibration' or 'calibration_context'")
     
-    # Construct file path
-    file_extension = "svg" if format == "svg" else "jpg"
-    plot_path = reports_dir / f"{report_name}.{plot_type}.{file_extension}"
-    
-    if not plot_path.exists():
+    # Plot files are pre-rendered by the evaluation script and indexed with the report
+    entry = get_catalog(reports_dir).get(report_name)
+    plot_name = (entry or {}).get("plots", {}).get(f"{plot_type}.{format}")
+    if plot_name is None:
         raise HTTPException(
             status_code=404,
-            detail=f"Plot file not found: {plot_path.name}. Make sure the evaluation was run with --plot-calibration flag."
+            detail=f"Plot file not found: {report_name}.{plot_type}.{format}. Make sure the evaluation was run with --plot-calibration flag."
         )
+    plot_path = reports_dir / plot_name
     
     # Determine Content-Type
     if format == "svg":
@@ -6,7 +6,9 @@ Algorithm: Game-timeline normalization - ESPN timestamps normalized to synthetic
 Big O: O(n + m) where n = ESPN points, m = Kalshi candles
 """
 
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 from fastapi import APIRouter, Query, HTTPException
@@ -15,17 +17,100 @@ from ..db import get_db_connection
 from ..cache import cached
 from ..logging_config import get_logger
 from .utils import get_cache_ttl_for_game
-from ..utils.trade_candles import fetch_trades, aggregate_trades, derive_game_window
+from ..utils.trade_candles import derive_game_window, fetch_candles
+from ..utils.downsample import MIN_MAX_POINTS, SeriesPyramid, check_downsample_method, downsample_records
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Downsampling pyramids for completed games' series (LRU), keyed by (game_id, include_kalshi, series, method)
+# Value: (fingerprint of the full series, pyramid) - rebuilt if the cached full series changes
+_pyramids: OrderedDict[tuple, tuple[tuple, SeriesPyramid]] = OrderedDict()
+_pyramids_lock = threading.Lock()
+_pyramids_max_size = 256
+
+
+def _candle_price(candle: dict[str, Any]) -> Optional[float]:
+    """Display price of a candle / Kalshi point in any of the endpoint formats (close, else bid/ask mid)."""
+    for key in ("price", "price_close", "price_close_cents"):
+        if candle.get(key) is not None:
+            return candle[key]
+    bid = candle.get("yes_bid_close", candle.get("bid"))
+    ask = candle.get("yes_ask_close", candle.get("ask"))
+    return (bid + ask) / 2.0 if bid is not None and ask is not None else None
+
+
+def _espn_is_final(espn_data: list[dict[str, Any]]) -> bool:
+    # ESPN pins the win probability to 0 / 1 once the game is over
+    return bool(espn_data) and espn_data[-1]["home_prob"] in (0.0, 1.0)
+
+
+def _get_pyramid(key: tuple, records: list[dict[str, Any]], y: Any, method: str) -> SeriesPyramid:
+    fingerprint = (len(records), records[0]["time"], records[-1]["time"]) if records else (0,)
+    with _pyramids_lock:
+        entry = _pyramids.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            _pyramids.move_to_end(key)
+            return entry[1]
+    pyramid = SeriesPyramid.from_records(records, y=y, method=method)
+    with _pyramids_lock:
+        _pyramids[key] = (fingerprint, pyramid)
+        _pyramids.move_to_end(key)
+        while len(_pyramids) > _pyramids_max_size:
+            _pyramids.popitem(last=False)
+    return pyramid
+
+
+def _downsample_probabilities(
+    game_id: str,
+    include_kalshi: bool,
+    result: dict[str, Any],
+    max_points: Optional[int],
+    start_ts: Optional[int],
+    end_ts: Optional[int],
+    method: str,
+) -> dict[str, Any]:
+    """
+    Viewport + downsampled copy of a full get_game_probabilities result (the cached full result is not modified).
+
+    Completed games are served from per-series pyramids so repeated zooms only slice precomputed levels;
+    in-progress games (whose series still grow) are downsampled directly.
+    """
+    use_pyramid = _espn_is_final(result["espn"])
+
+    def select(name: str, records: list[dict[str, Any]], y: Any) -> list[dict[str, Any]]:
+        if not use_pyramid:
+            return downsample_records(records, max_points, y=y, method=method, start=start_ts, end=end_ts)
+        pyramid = _get_pyramid((game_id, include_kalshi, name, method), records, y, method)
+        return [records[int(i)] for i in pyramid.select(max_points, start_ts, end_ts)]
+
+    out = dict(result)
+    out["espn"] = select("espn", result["espn"], "home_prob")
+    out["kalshi"] = {
+        ticker: {**market, "data": select(f"kalshi:{ticker}", market["data"], "price")}
+        for ticker, market in result.get("kalshi", {}).items()
+    }
+    out["downsampling"] = {
+        "method": method,
+        "max_points": max_points,
+        "start_ts": start_ts,
+        "end_ts": end_ts,
+        "source_points": {
+            "espn": len(result["espn"]),
+            "kalshi": {ticker: len(market["data"]) for ticker, market in result.get("kalshi", {}).items()},
+        },
+    }
+    return out
+
 
 @router.get("/games/{game_id}/probs")
-@cached(ttl_seconds=86400 * 365, dynamic_ttl=lambda result: get_cache_ttl_for_game(result))
 def get_game_probabilities(
     game_id: str,
     include_kalshi: bool = Query(True, description="Include Kalshi candlestick data"),
+    max_points: Optional[int] = Query(None, ge=MIN_MAX_POINTS, description="Downsample each series to at most this many points (e.g. chart width in pixels); default: every point"),
+    start_ts: Optional[int] = Query(None, description="Viewport start Unix timestamp (seconds); default: game start"),
+    end_ts: Optional[int] = Query(None, description="Viewport end Unix timestamp (seconds); default: game end"),
+    downsample: str = Query("lttb", description="Downsampling method: 'lttb' (Largest-Triangle-Three-Buckets) or 'minmax' (min/max per time bucket)"),
 ) -> dict[str, Any]:
     """
     Get probability time series for a game.
@@ -35,10 +120,24 @@ def get_game_probabilities(
     ESPN data: {time (Unix timestamp), home_prob, away_prob, home_score, away_score}
     Kalshi data: {time (Unix timestamp), price} where price is in cents (0-100)
     
+    With max_points and/or start_ts/end_ts, each series is cut to the viewport and downsampled
+    (shape-preserving point selection; points are returned unchanged), and a "downsampling" entry
+    reports the full series sizes. Payload size then follows the chart width, not the data density.
+    
     Design Pattern: Composite data aggregation from multiple sources
     Algorithm: Game-timeline normalization - ESPN timestamps normalized to synthetic timeline anchored at event_date, Kalshi uses actual timestamps
     Big O: O(n + m) where n = ESPN points, m = Kalshi candles
     """
+    check_downsample_method(downsample)
+    result = _load_game_probabilities(game_id, include_kalshi)
+    if max_points is None and start_ts is None and end_ts is None:
+        return result
+    return _downsample_probabilities(game_id, include_kalshi, result, max_points, start_ts, end_ts, downsample)
+
+
+@cached(ttl_seconds=86400 * 365, dynamic_ttl=lambda result: get_cache_ttl_for_game(result))
+def _load_game_probabilities(game_id: str, include_kalshi: bool) -> dict[str, Any]:
+    """Full-resolution get_game_probabilities result (cached; downsampling is applied per request on top)."""
     request_start = time.time()
     with get_db_connection() as conn:
         db_conn_time = time.time() - request_start
@@ -397,7 +496,6 @@ def get_game_probabilities(
 
 
 @router.get("/probabilities/{game_id}/kalshi-candles")
-@cached(ttl_seconds=3600)  # 1 hour TTL, in-memory cache (per-worker)
 def get_kalshi_candles(
     game_id: str,
     interval_seconds: int = Query(60, ge=1, le=3600, description="Candlestick interval in seconds (1, 10, 60)"),
@@ -405,6 +503,8 @@ def get_kalshi_candles(
     ticker: Optional[str] = Query(None, description="Specific market ticker (optional, for multi-ticker games)"),
     start_ts: Optional[int] = Query(None, description="Start Unix timestamp (seconds)"),
     end_ts: Optional[int] = Query(None, description="End Unix timestamp (seconds)"),
+    max_points: Optional[int] = Query(None, ge=MIN_MAX_POINTS, description="Downsample candles to at most this many per market (e.g. chart width in pixels); default: every candle"),
+    downsample: str = Query("lttb", description="Downsampling method: 'lttb' (Largest-Triangle-Three-Buckets) or 'minmax' (min/max per time bucket)"),
 ) -> dict[str, Any]:
     """
     Get Kalshi candlesticks for a game.
@@ -413,15 +513,17 @@ def get_kalshi_candles(
     - For 1-second resolution: max_points=3600 (1 hour) enforced
     - If window too large: returns 400 with message "Zoom in to use 1-second view"
     - If start_ts/end_ts omitted: derives from game window (event_date + duration)
+    - max_points downsamples the (cached) candles per request, selecting candles by close price,
+      and adds "source_candles" with the full count per market
     
     Multi-ticker support:
     - If ticker provided: returns {"candles": [...], "ticker": "..."}
     - If ticker omitted: returns {"markets": [{"ticker": "...", "candles": [...]}, ...]}
     - Primary market selection: first ticker by snapshot_id DESC (most recent)
     
-    Design Pattern: Query-Time Aggregation with Bounded Windows
-    Algorithm: Time-Window OHLC Aggregation
-    Big O: O(log n + k) for fetch, O(k) for aggregate where k = trades in window
+    Design Pattern: Materialized Rollups with Bounded Windows (query-time aggregation as fallback)
+    Algorithm: Range scan of 1s/10s/60s trade candles in aligned, cached blocks
+    Big O: O(log n + c) where c = candles in uncached blocks; fallback O(log n + k) where k = trades in window
     
     Args:
         game_id: ESPN game_id
@@ -434,6 +536,34 @@ def get_kalshi_candles(
     Returns:
         JSON response with candles array or markets array
     """
+    check_downsample_method(downsample)
+    result = _load_kalshi_candles(game_id, interval_seconds, source, ticker, start_ts, end_ts)
+    if max_points is None:
+        return result
+
+    def thin(candles: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return downsample_records(candles, max_points, x="period_ts", y=_candle_price, method=downsample)
+
+    out = dict(result)
+    if "markets" in result:
+        out["markets"] = [{**market, "candles": thin(market["candles"]), "source_candles": len(market["candles"])}
+                          for market in result["markets"]]
+    else:
+        out["candles"] = thin(result["candles"])
+        out["source_candles"] = len(result["candles"])
+    return out
+
+
+@cached(ttl_seconds=3600)  # 1 hour TTL, in-memory cache (per-worker)
+def _load_kalshi_candles(
+    game_id: str,
+    interval_seconds: int,
+    source: str,
+    ticker: Optional[str],
+    start_ts: Optional[int],
+    end_ts: Optional[int],
+) -> dict[str, Any]:
+    """Full-resolution get_kalshi_candles result (cached; downsampling is applied per request on top)."""
     request_start = time.time()
     logger.debug(f"[TIMING] get_kalshi_candles({game_id}, interval={interval_seconds}, source={source}) - START")
     
@@ -569,7 +699,7 @@ def _get_trade_candles(
     start_ts: Optional[int],
     end_ts: Optional[int],
 ) -> dict[str, Any]:
-    """Get trade-derived candlesticks from kalshi.trades table."""
+    """Get trade-derived candlesticks (materialized rollups, else kalshi.trades aggregated on the fly)."""
     # Derive time window if not provided
     if start_ts is None or end_ts is None:
         window = derive_game_window(conn, game_id)
@@ -615,8 +745,7 @@ def _get_trade_candles(
     if len(selected_tickers) == 1:
         # Single ticker: return simple format
         ticker_str = selected_tickers[0]
-        trades = fetch_trades(conn, ticker_str, start_ts, end_ts)
-        candles = aggregate_trades(trades, interval_seconds)
+        candles = fetch_candles(conn, ticker_str, interval_seconds, start_ts, end_ts)
         
         return {
             "candles": candles,
@@ -629,8 +758,7 @@ def _get_trade_candles(
         # Multiple tickers: return markets array
         markets = []
         for ticker_str in selected_tickers:
-            trades = fetch_trades(conn, ticker_str, start_ts, end_ts)
-            candles = aggregate_trades(trades, interval_seconds)
+            candles = fetch_candles(conn, ticker_str, interval_seconds, start_ts, end_ts)
             markets.append({
                 "ticker": ticker_str,
                 "team_side": ticker_to_team_side.get(ticker_str),
@@ -10,13 +10,26 @@ from typing import Any, Optional
 from fastapi import APIRouter, HTTPException, Query
 import math
 import json
-import threading
+import sys
+from pathlib import Path
+
+import numpy as np
 
 from ..db import get_db_connection
 from ..cache import cached
 from ..logging_config import get_logger
+from ..streaming import check_stream_format, stream_records
+from ..stats_writer import GameStatsWriter, get_game_stats_writer
 from .utils import get_cache_ttl_for_game
 
+# Shared vectorized metric kernels live in scripts/lib (same import path the update endpoint uses)
+repo_root_dir = Path(__file__).parent.parent.parent.parent
+if str(repo_root_dir) not in sys.path:
+    sys.path.insert(0, str(repo_root_dir))
+from scripts.lib import _metrics_lib
+from .. import stats_kernel
+from ..stats_kernel import reliability_bin_sums, reliability_curve_from_sums  # noqa: F401  (re-exported)
+
 router = APIRouter()
 logger = get_logger(__name__)
 
@@ -30,7 +43,7 @@ def calculate_brier_score(probabilities: list[float], actual_outcome: int) -> fl
     """
     if not probabilities:
         return None
-    return sum((p - actual_outcome) ** 2 for p in probabilities) / len(probabilities)
+    return _metrics_lib.brier(probabilities, np.full(len(probabilities), float(actual_outcome)))
 
 
 def calculate_time_sliced_brier_scores(
@@ -213,11 +226,7 @@ def calculate_log_loss(probabilities: list[float], actual_outcome: int, epsilon:
     if not probabilities:
         return None
     # Clip to 0.01-0.99 range to prevent extreme penalties and avoid log(0)
-    clipped_probs = [max(epsilon, min(1 - epsilon, p)) for p in probabilities]
-    return -sum(
-        actual_outcome * math.log(p) + (1 - actual_outcome) * math.log(1 - p)
-        for p in clipped_probs
-    ) / len(clipped_probs)
+    return _metrics_lib.logloss(probabilities, np.full(len(probabilities), float(actual_outcome)), eps=epsilon)
 
 
 def calculate_probability_volatility(probabilities: list[float]) -> float:
@@ -404,47 +413,7 @@ def calculate_reliability_curve(
     """
     if not probabilities or len(probabilities) != len(actual_outcomes):
         return {"bins": []}
-    
-    # Group predictions into bins
-    bin_size = 1.0 / bins
-    bin_data: dict[int, list[tuple[float, int]]] = {}
-    
-    for prob, outcome in zip(probabilities, actual_outcomes):
-        # Determine which bin this probability falls into
-        bin_idx = min(int(prob / bin_size), bins - 1)  # Handle edge case where prob = 1.0
-        if bin_idx not in bin_data:
-            bin_data[bin_idx] = []
-        bin_data[bin_idx].append((prob, outcome))
-    
-    # Calculate statistics for each bin
-    reliability_bins = []
-    for bin_idx in range(bins):
-        bin_min = bin_idx * bin_size
-        bin_max = (bin_idx + 1) * bin_size if bin_idx < bins - 1 else 1.0
-        
-        if bin_idx in bin_data:
-            probs_in_bin, outcomes_in_bin = zip(*bin_data[bin_idx])
-            predicted_prob = sum(probs_in_bin) / len(probs_in_bin)
-            actual_freq = sum(outcomes_in_bin) / len(outcomes_in_bin)
-            count = len(probs_in_bin)
-            calibration_error = predicted_prob - actual_freq
-        else:
-            predicted_prob = (bin_min + bin_max) / 2.0  # Bin center
-            actual_freq = None
-            count = 0
-            calibration_error = None
-        
-        reliability_bins.append({
-            "bin_min": bin_min,
-            "bin_max": bin_max,
-            "bin_center": (bin_min + bin_max) / 2.0,
-            "predicted_prob": predicted_prob,
-            "actual_freq": actual_freq,
-            "count": count,
-            "calibration_error": calibration_error,
-        })
-    
-    return {"bins": reliability_bins}
+    return reliability_curve_from_sums(*reliability_bin_sums(probabilities, actual_outcomes, bins), bins=bins)
 
 
 def calculate_decision_weighted_metrics(
@@ -981,106 +950,311 @@ def calculate_espn_kalshi_divergence(
     }
 
 
-def _is_game_completed(conn, game_id: str) -> bool:
-    """Check if a game is completed (has final scores)."""
-    check_sql = """
-    SELECT MAX(e.home_score) as final_home_score, MAX(e.away_score) as final_away_score
+STATS_SEASON_LABEL = "2025-26"  # Season the per-game stats queries read ESPN probabilities from
+STATS_BATCH_SIZE = 50  # Games per batched fetch in bulk/stream/backfill
+
+def _completed_game_ids(conn, game_ids: list[str]) -> set[str]:
+    """Games that are completed (have final scores), in one grouped query."""
+    sql = """
+    SELECT e.game_id
     FROM espn.prob_event_state e
-    WHERE e.game_id = %s
+    WHERE e.game_id = ANY(%s)
+    GROUP BY e.game_id
+    HAVING MAX(e.home_score) IS NOT NULL AND MAX(e.away_score) IS NOT NULL
     """
-    row = conn.execute(check_sql, (game_id,)).fetchone()
-    return row and row[0] is not None and row[1] is not None
+    return {row[0] for row in conn.execute(sql, (game_ids,)).fetchall()}
 
 
-def _get_stats_from_db(conn, game_id: str) -> Optional[dict[str, Any]]:
-    """Retrieve stats from database if they exist."""
+def _get_stored_stats(conn, game_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Retrieve stored stats from derived.game_stats for the games that have them."""
     sql = """
     SELECT 
+        game_id,
         espn_stats,
         kalshi_stats,
         divergence_stats,
-        season_label,
-        home_team_abbrev,
-        away_team_abbrev,
         final_home_score,
         final_away_score,
         home_won
     FROM derived.game_stats
-    WHERE game_id = %s
+    WHERE game_id = ANY(%s)
     """
-    row = conn.execute(sql, (game_id,)).fetchone()
-    if row:
-        logger.debug(f"Found stats in database for game {game_id}")
-        return {
-            "game_id": game_id,
-            "home_won": row[8],
+    stored = {}
+    for row in conn.execute(sql, (game_ids,)).fetchall():
+        stored[row[0]] = {
+            "game_id": row[0],
+            "home_won": row[6],
             "final_score": {
-                "home": row[6],
-                "away": row[7],
+                "home": row[4],
+                "away": row[5],
             },
-            "espn": row[0],
-            "kalshi": row[1],
-            "divergence": row[2],
+            "espn": row[1],
+            "kalshi": row[2],
+            "divergence": row[3],
         }
-    return None
+    return stored
 
 
-def _save_stats_to_db(conn, game_id: str, stats: dict[str, Any], game_metadata: dict[str, Any]) -> None:
-    """Save calculated stats to database (in background thread to avoid blocking)."""
-    import json
-    import threading
+def _fetch_game_inputs(conn, game_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Fetch everything compute_game_stats needs for many games in three queries.
     
-    def _save():
-        try:
-            with get_db_connection() as save_conn:
-                # Use advisory lock to prevent duplicate inserts from concurrent requests
-                lock_id = hash(f"game_stats_{game_id}") % (2**31)  # PostgreSQL advisory lock range
-                save_conn.execute("SELECT pg_advisory_lock(%s)", (lock_id,))
-                try:
-                    # Check again if stats were inserted by another request
-                    existing = save_conn.execute(
-                        "SELECT game_id FROM derived.game_stats WHERE game_id = %s",
-                        (game_id,)
-                    ).fetchone()
-                    
-                    if existing:
-                        logger.debug(f"Stats already exist in DB for game {game_id}, skipping insert")
-                        return
-                    
-                    insert_sql = """
-                    INSERT INTO derived.game_stats (
-                        game_id, season_label, home_team_abbrev, away_team_abbrev,
-                        final_home_score, final_away_score, home_won,
-                        espn_stats, kalshi_stats, divergence_stats
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (game_id) DO UPDATE SET
-                        espn_stats = EXCLUDED.espn_stats,
-                        kalshi_stats = EXCLUDED.kalshi_stats,
-                        divergence_stats = EXCLUDED.divergence_stats,
-                        calculated_at = now()
-                    """
-                    save_conn.execute(insert_sql, (
-                        game_id,
-                        game_metadata.get("season_label"),
-                        game_metadata.get("home_team_abbrev"),
-                        game_metadata.get("away_team_abbrev"),
-                        stats.get("final_score", {}).get("home"),
-                        stats.get("final_score", {}).get("away"),
-                        stats.get("home_won"),
-                        json.dumps(stats.get("espn", {})),
-                        json.dumps(stats.get("kalshi")) if stats.get("kalshi") else None,
-                        json.dumps(stats.get("divergence")) if stats.get("divergence") else None,
-                    ))
-                    save_conn.commit()
-                    logger.info(f"Saved stats to database for game {game_id}")
-                finally:
-                    save_conn.execute("SELECT pg_advisory_unlock(%s)", (lock_id,))
-        except Exception as e:
-            logger.warning(f"Failed to save stats to database for game {game_id}: {e}", exc_info=True)
+    Returns {game_id: {"espn_rows", "game_start_utc", "kalshi_rows", "metadata"}} for games with ESPN rows.
+    Per game, the rows are the same as the single-game queries returned (ESPN rows ordered by
+    last_modified_utc; Kalshi rows ordered by team side, then period_ts).
+    """
+    inputs: dict[str, dict[str, Any]] = {}
+    if not game_ids:
+        return inputs
+    
+    # ESPN probabilities with final score and winner (winner is per game, so it's computed once per game)
+    espn_sql = """
+    WITH outcomes AS (
+        SELECT e.game_id, MAX(e.final_winning_team) as winner
+        FROM espn.prob_event_state e
+        WHERE e.game_id = ANY(%s)
+        GROUP BY e.game_id
+    )
+    SELECT DISTINCT
+        p.game_id,
+        p.last_modified_utc,
+        p.home_win_percentage,
+        p.away_win_percentage,
+        sg.home_score as final_home_score,
+        sg.away_score as final_away_score,
+        o.winner
+    FROM espn.probabilities_raw_items p
+    LEFT JOIN espn.scoreboard_games sg ON p.game_id = sg.event_id
+    LEFT JOIN outcomes o ON p.game_id = o.game_id
+    WHERE p.game_id = ANY(%s)
+    AND p.season_label = %s
+    ORDER BY p.game_id, p.last_modified_utc ASC
+    """
+    espn_rows = conn.execute(espn_sql, (game_ids, game_ids, STATS_SEASON_LABEL)).fetchall()
+    for row in espn_rows:
+        game = inputs.setdefault(row[0], {
+            "espn_rows": [],
+            "game_start_utc": None,
+            "kalshi_rows": [],
+            "metadata": {"season_label": STATS_SEASON_LABEL, "home_team_abbrev": None, "away_team_abbrev": None},
+        })
+        game["espn_rows"].append(tuple(row[1:]))
+    if not inputs:
+        return inputs
+    found = list(inputs)
+    
+    # Game start time (time-sliced metrics) and team abbreviations (stored with completed games)
+    games_sql = """
+    SELECT DISTINCT ON (sg.event_id)
+        sg.event_id,
+        sg.event_date,
+        sg.home_team_abbrev,
+        sg.away_team_abbrev
+    FROM espn.scoreboard_games sg
+    WHERE sg.event_id = ANY(%s)
+    ORDER BY sg.event_id
+    """
+    for row in conn.execute(games_sql, (found,)).fetchall():
+        game = inputs[row[0]]
+        game["game_start_utc"] = row[1]
+        game["metadata"]["home_team_abbrev"] = row[2]
+        game["metadata"]["away_team_abbrev"] = row[3]
+    
+    # Kalshi candlesticks within each game's window
+    kalshi_sql = """
+    WITH espn_game_info AS (
+        SELECT 
+            sg.event_id,
+            sg.event_date as game_start,
+            EXTRACT(EPOCH FROM (MAX(p.last_modified_utc) - MIN(p.last_modified_utc)))::INTEGER as espn_duration_seconds
+        FROM espn.scoreboard_games sg
+        JOIN espn.probabilities_raw_items p ON sg.event_id = p.game_id
+        WHERE sg.event_id = ANY(%s)
+        GROUP BY sg.event_id, sg.event_date
+    ),
+    game_markets AS (
+        SELECT DISTINCT ON (kmw.ticker)
+            kmw.ticker,
+            kmw.espn_event_id,
+            kmw.kalshi_team_side,
+            egi.game_start,
+            egi.espn_duration_seconds
+        FROM kalshi.markets_with_games kmw
+        JOIN espn_game_info egi ON egi.event_id = kmw.espn_event_id
+        WHERE kmw.espn_event_id = ANY(%s)
+          AND kmw.kalshi_team_side IS NOT NULL
+        ORDER BY kmw.ticker, kmw.snapshot_id DESC
+    )
+    SELECT 
+        gm.espn_event_id,
+        gm.kalshi_team_side,
+        c.period_ts,
+        c.price_close,
+        c.yes_bid_close,
+        c.yes_ask_close
+    FROM kalshi.candlesticks c
+    JOIN game_markets gm ON c.ticker = gm.ticker
+    WHERE (
+        c.price_close IS NOT NULL 
+        OR (c.yes_bid_close IS NOT NULL AND c.yes_ask_close IS NOT NULL)
+    )
+    AND c.period_ts >= gm.game_start
+    AND c.period_ts <= (gm.game_start + (gm.espn_duration_seconds || ' seconds')::INTERVAL)
+    ORDER BY gm.espn_event_id, gm.kalshi_team_side, c.period_ts
+    """
+    for row in conn.execute(kalshi_sql, (found, found)).fetchall():
+        if row[0] in inputs:
+            inputs[row[0]]["kalshi_rows"].append(tuple(row[1:]))
+    return inputs
+
+
+def compute_game_stats(
+    game_id: str,
+    espn_rows: list[tuple],
+    game_start_utc: Any,
+    kalshi_rows: list[tuple],
+) -> Optional[dict[str, Any]]:
+    """
+    Calculate one game's stats from its fetched rows (pure: no database access).
+    
+    Args:
+        game_id: Game ID
+        espn_rows: (last_modified_utc, home_win_pct, away_win_pct, final_home_score, final_away_score, winner)
+                   ordered by last_modified_utc
+        game_start_utc: Scheduled start (datetime) or None
+        kalshi_rows: (team_side, period_ts, price_close, yes_bid_close, yes_ask_close) ordered by side, period_ts
     
-    # Run save in background thread (non-blocking)
-    thread = threading.Thread(target=_save, daemon=True)
-    thread.start()
+    Returns:
+        The get_game_stats result, or None if there are no ESPN rows
+    """
+    if not espn_rows:
+        return None
+    
+    # Get game outcome
+    first_row = espn_rows[0]
+    final_home_score = first_row[3]
+    final_away_score = first_row[4]
+    winner = first_row[5]
+    home_won = winner == 0 if winner is not None else (final_home_score > final_away_score if final_home_score and final_away_score else None)
+    
+    # Get game start time for time-sliced calculations
+    game_start_timestamp = int(game_start_utc.timestamp()) if game_start_utc else None
+    
+    # Calculate game duration from ESPN data
+    first_timestamp = min(int(row[0].timestamp()) for row in espn_rows if row[0] is not None)
+    last_timestamp = max(int(row[0].timestamp()) for row in espn_rows if row[0] is not None)
+    # Align timestamps to game timeline
+    if game_start_timestamp is not None:
+        elapsed_from_first = last_timestamp - first_timestamp
+        game_end_timestamp = game_start_timestamp + elapsed_from_first
+        game_duration_seconds = int(game_end_timestamp - game_start_timestamp)
+    else:
+        game_duration_seconds = int(last_timestamp - first_timestamp)
+    
+    # Extract ESPN probabilities and timestamps (aligned to game timeline)
+    espn_home_probs = []
+    espn_times = []
+    first_espn_timestamp = None
+    
+    for row in espn_rows:
+        last_modified_utc = row[0]
+        if last_modified_utc is None:
+            continue
+        
+        espn_recording_timestamp = int(last_modified_utc.timestamp())
+        if first_espn_timestamp is None:
+            first_espn_timestamp = espn_recording_timestamp
+        
+        # Align to game timeline (same logic as probabilities endpoint)
+        if game_start_timestamp is not None and first_espn_timestamp is not None:
+            elapsed_from_first = espn_recording_timestamp - first_espn_timestamp
+            aligned_timestamp = game_start_timestamp + elapsed_from_first
+        else:
+            aligned_timestamp = espn_recording_timestamp
+        
+        if row[1] is not None:
+            espn_home_probs.append(float(row[1]))
+            espn_times.append(aligned_timestamp)
+    
+    # Kalshi home series (cents -> probability) and whether bid/ask existed at each point
+    kalshi_home_rows = [row for row in kalshi_rows if row[0] == 'home' and row[1] is not None]
+    kalshi_home_probs = kalshi_home_times = kalshi_bid_ask_exists = None
+    if kalshi_home_rows:
+        kalshi_home_times = [int(row[1].timestamp()) for row in kalshi_home_rows]
+        kalshi_home_probs = [float(row[2] or (row[3] + row[4]) / 2.0) / 100.0 for row in kalshi_home_rows]
+        kalshi_bid_ask_exists = [row[3] is not None and row[4] is not None for row in kalshi_home_rows]
+    
+    # Every metric from the arrays in a few vectorized passes (same values as the calculate_* functions)
+    espn_stats, kalshi_stats, divergence_stats = stats_kernel.game_stats(
+        espn_home_probs, espn_times,
+        kalshi_home_probs, kalshi_home_times, kalshi_bid_ask_exists,
+        home_won, game_start_timestamp, game_duration_seconds
+    )
+    
+    return {
+        "game_id": game_id,
+        "home_won": home_won,
+        "final_score": {
+            "home": final_home_score,
+            "away": final_away_score,
+        },
+        "espn": espn_stats,
+        "kalshi": kalshi_stats,
+        "divergence": divergence_stats,
+    }
+
+
+def compute_stats_batch(
+    conn,
+    game_ids: list[str],
+    *,
+    use_stored: bool = True,
+    writer: Optional[GameStatsWriter] = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Stats for many games from one batched fetch.
+    
+    Completed games with stored stats are read from derived.game_stats (unless use_stored is False);
+    the rest are fetched together (_fetch_game_inputs) and computed with compute_game_stats. Newly
+    computed completed games are handed to writer (write-behind) for storage; in-progress games never are.
+    
+    Returns:
+        {game_id: stats} in request order; games without ESPN data are omitted
+    """
+    game_ids = list(dict.fromkeys(game_ids))
+    if not game_ids:
+        return {}
+    completed = _completed_game_ids(conn, game_ids)
+    results = _get_stored_stats(conn, [g for g in game_ids if g in completed]) if use_stored and completed else {}
+    todo = [g for g in game_ids if g not in results]
+    logger.debug(f"Stats batch: {len(game_ids)} games, {len(results)} stored, {len(todo)} to compute")
+    
+    inputs = _fetch_game_inputs(conn, todo)
+    for game_id in todo:
+        game = inputs.get(game_id)
+        stats = compute_game_stats(game_id, game["espn_rows"], game["game_start_utc"], game["kalshi_rows"]) if game else None
+        if stats is None:
+            logger.warning(f"No ESPN probability data found for game {game_id}")
+            continue
+        results[game_id] = stats
+        if game_id in completed and writer is not None:
+            writer.enqueue(game_id, stats, game["metadata"])
+    return {g: results[g] for g in game_ids if g in results}
+
+
+def get_game_stats_batch(game_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """compute_stats_batch on a pooled connection, storing completed games through the shared write-behind queue."""
+    with get_db_connection() as conn:
+        return compute_stats_batch(conn, game_ids, writer=get_game_stats_writer())
+
+
+def _iter_stats_batches(game_ids: list[str]):
+    """Yield (game_id, stats or None) in request order, fetching STATS_BATCH_SIZE games at a time."""
+    for start in range(0, len(game_ids), STATS_BATCH_SIZE):
+        chunk = game_ids[start:start + STATS_BATCH_SIZE]
+        batch = get_game_stats_batch(chunk)
+        for game_id in chunk:
+            yield game_id, batch.get(game_id)
 
 
 @router.get("/games/{game_id}/stats")
@@ -1091,7 +1265,7 @@ def get_game_stats(game_id: str) -> dict[str, Any]:
     
     For completed games:
     - First checks database for pre-calculated stats
-    - If not found, calculates stats and stores in database (background)
+    - If not found, calculates stats and queues them for storage (write-behind, batched)
     - Subsequent requests read directly from database
     
     For in-progress games:
@@ -1105,358 +1279,16 @@ def get_game_stats(game_id: str) -> dict[str, Any]:
     - Time-weighted averages
     - Maximum/minimum probabilities
     """
-    with get_db_connection() as conn:
-        # Check if game is completed
-        is_completed = _is_game_completed(conn, game_id)
-        
-        # For completed games, try to get stats from database first
-        if is_completed:
-            db_stats = _get_stats_from_db(conn, game_id)
-            if db_stats:
-                logger.debug(f"Returning stats from database for completed game {game_id}")
-                return db_stats
-            logger.debug(f"No stats in database for game {game_id}, will calculate and store")
-        
-        # Calculate stats (either game is in-progress, or stats not in DB yet)
-        # Get ESPN probability data
-        espn_sql = """
-        SELECT 
-            p.last_modified_utc,
-            p.home_win_percentage,
-            p.away_win_percentage,
-            sg.home_score as final_home_score,
-            sg.away_score as final_away_score,
-            MAX(e.final_winning_team) as winner
-        FROM espn.probabilities_raw_items p
-        LEFT JOIN espn.scoreboard_games sg ON p.game_id = sg.event_id
-        LEFT JOIN espn.prob_event_state e ON p.game_id = e.game_id
-        WHERE p.game_id = %s
-        AND p.season_label = '2025-26'
-        GROUP BY p.last_modified_utc, p.home_win_percentage, p.away_win_percentage, 
-                 sg.home_score, sg.away_score
-        ORDER BY p.last_modified_utc ASC
-        """
-        logger.debug(f"Executing ESPN probabilities query for stats: game_id={game_id}")
-        espn_rows = conn.execute(espn_sql, (game_id,)).fetchall()
-        logger.debug(f"ESPN probabilities query returned: {len(espn_rows)} rows")
-        
-        if not espn_rows:
-            logger.warning(f"No ESPN probability data found for game {game_id}")
-            raise HTTPException(
-                status_code=404,
-                detail=f"No ESPN probability data for game {game_id}"
-            )
-        
-        logger.debug(f"Processing {len(espn_rows)} ESPN probability points for stats calculation")
-        
-        # Get game outcome
-        first_row = espn_rows[0]
-        final_home_score = first_row[3]
-        final_away_score = first_row[4]
-        winner = first_row[5]
-        home_won = winner == 0 if winner is not None else (final_home_score > final_away_score if final_home_score and final_away_score else None)
-        
-        # Get game start time for time-sliced calculations
-        game_start_sql = "SELECT event_date FROM espn.scoreboard_games WHERE event_id = %s LIMIT 1"
-        game_start_row = conn.execute(game_start_sql, (game_id,)).fetchone()
-        game_start_utc = game_start_row[0] if game_start_row and game_start_row[0] else None
-        game_start_timestamp = int(game_start_utc.timestamp()) if game_start_utc else None
-        
-        # Calculate game duration from ESPN data
-        if espn_rows:
-            first_timestamp = min(int(row[0].timestamp()) for row in espn_rows if row[0] is not None)
-            last_timestamp = max(int(row[0].timestamp()) for row in espn_rows if row[0] is not None)
-            # Align timestamps to game timeline
-            if game_start_timestamp is not None:
-                first_espn_timestamp = first_timestamp
-                elapsed_from_first = last_timestamp - first_espn_timestamp
-                game_end_timestamp = game_start_timestamp + elapsed_from_first
-                game_duration_seconds = int(game_end_timestamp - game_start_timestamp)
-            else:
-                game_duration_seconds = int(last_timestamp - first_timestamp)
-        else:
-            game_duration_seconds = None
-        
-        # Extract ESPN probabilities and timestamps (aligned to game timeline)
-        espn_home_probs = []
-        espn_away_probs = []
-        espn_times = []
-        first_espn_timestamp = None
-        
-        for row in espn_rows:
-            last_modified_utc = row[0]
-            if last_modified_utc is None:
-                continue
-            
-            espn_recording_timestamp = int(last_modified_utc.timestamp())
-            if first_espn_timestamp is None:
-                first_espn_timestamp = espn_recording_timestamp
-            
-            # Align to game timeline (same logic as probabilities endpoint)
-            if game_start_timestamp is not None and first_espn_timestamp is not None:
-                elapsed_from_first = espn_recording_timestamp - first_espn_timestamp
-                aligned_timestamp = game_start_timestamp + elapsed_from_first
-            else:
-                aligned_timestamp = espn_recording_timestamp
-            
-            if row[1] is not None:
-                espn_home_probs.append(float(row[1]))
-                espn_times.append(aligned_timestamp)
-            if row[2] is not None:
-                espn_away_probs.append(float(row[2]))
-        
-        # Calculate ESPN stats
-        espn_stats = {
-            "data_points": len(espn_home_probs),
-            "min_probability": min(espn_home_probs) if espn_home_probs else None,
-            "max_probability": max(espn_home_probs) if espn_home_probs else None,
-            "mean_probability": sum(espn_home_probs) / len(espn_home_probs) if espn_home_probs else None,
-            "final_probability": espn_home_probs[-1] if espn_home_probs else None,
-            "volatility": calculate_probability_volatility(espn_home_probs),
-            "max_swing": calculate_max_probability_swing(espn_home_probs),
-            "lead_changes": calculate_lead_changes(espn_home_probs),
-            "time_weighted_avg": calculate_time_weighted_average(espn_home_probs, espn_times),
-            # Deviation metrics
-            "standard_deviation": calculate_standard_deviation(espn_home_probs),
-            "variance": calculate_variance(espn_home_probs),
-            "mean_absolute_deviation": calculate_mean_absolute_deviation(espn_home_probs),
-            "coefficient_of_variation": calculate_coefficient_of_variation(espn_home_probs),
-        }
-        
-        # Add calibration metrics if we know the outcome
-        if home_won is not None:
-            actual_outcome = 1 if home_won else 0
-            brier_score = calculate_brier_score(espn_home_probs, actual_outcome)
-            espn_stats["time_averaged_in_game_brier_error"] = brier_score
-            espn_stats["log_loss"] = calculate_log_loss(espn_home_probs, actual_outcome)
-            espn_stats["prediction_correct"] = (espn_home_probs[-1] > 0.5) == home_won if espn_home_probs else None
-            
-            # Calculate time-sliced Brier scores
-            if game_start_timestamp is not None and espn_times:
-                espn_stats["brier_score_time_sliced"] = calculate_time_sliced_brier_scores(
-                    espn_home_probs,
-                    espn_times,
-                    game_start_timestamp,
-                    actual_outcome,
-                    game_duration_seconds
-                )
-            else:
-                espn_stats["brier_score_time_sliced"] = {
-                    "q1": None,
-                    "halftime": None,
-                    "start_q4": None,
-                    "final_2_minutes": None,
-                }
-        
-        # Get Kalshi data if available
-        kalshi_sql = """
-        WITH espn_game_info AS (
-            SELECT 
-                sg.event_id,
-                sg.event_date as game_start,
-                EXTRACT(EPOCH FROM (MAX(p.last_modified_utc) - MIN(p.last_modified_utc)))::INTEGER as espn_duration_seconds
-            FROM espn.scoreboard_games sg
-            JOIN espn.probabilities_raw_items p ON sg.event_id = p.game_id
-            WHERE sg.event_id = %s
-            GROUP BY sg.event_id, sg.event_date
-        ),
-        game_markets AS (
-            SELECT DISTINCT ON (kmw.ticker)
-                kmw.ticker,
-                kmw.kalshi_team_side,
-                egi.game_start,
-                egi.espn_duration_seconds
-            FROM kalshi.markets_with_games kmw
-            CROSS JOIN espn_game_info egi
-            WHERE kmw.espn_event_id = %s
-              AND kmw.kalshi_team_side IS NOT NULL
-            ORDER BY kmw.ticker, kmw.snapshot_id DESC
+    stats = get_game_stats_batch([game_id]).get(game_id)
+    if stats is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No ESPN probability data for game {game_id}"
         )
-        SELECT 
-            gm.kalshi_team_side,
-            c.period_ts,
-            c.price_close,
-            c.yes_bid_close,
-            c.yes_ask_close
-        FROM kalshi.candlesticks c
-        JOIN game_markets gm ON c.ticker = gm.ticker
-        WHERE (
-            c.price_close IS NOT NULL 
-            OR (c.yes_bid_close IS NOT NULL AND c.yes_ask_close IS NOT NULL)
-        )
-        AND c.period_ts >= gm.game_start
-        AND c.period_ts <= (gm.game_start + (gm.espn_duration_seconds || ' seconds')::INTERVAL)
-        ORDER BY gm.kalshi_team_side, c.period_ts
-        """
-        logger.debug(f"Executing Kalshi data query for stats: game_id={game_id}")
-        kalshi_rows = conn.execute(kalshi_sql, (game_id, game_id)).fetchall()
-        logger.debug(f"Kalshi data query returned: {len(kalshi_rows)} rows")
-        
-        kalshi_stats = None
-        divergence_stats = None
-        kalshi_home_probs = None  # Initialize to avoid UnboundLocalError
-        
-        if kalshi_rows:
-            logger.debug(f"Processing {len(kalshi_rows)} Kalshi rows for stats calculation...")
-            # Group by team side
-            kalshi_home_data = [(int(row[1].timestamp()), float(row[2] or (row[3] + row[4]) / 2.0)) 
-                                for row in kalshi_rows if row[0] == 'home' and row[1] is not None]
-            kalshi_away_data = [(int(row[1].timestamp()), float(row[2] or (row[3] + row[4]) / 2.0)) 
-                                for row in kalshi_rows if row[0] == 'away' and row[1] is not None]
-            
-            # Use home team data for stats (convert from cents to probability)
-            if kalshi_home_data:
-                kalshi_home_times, kalshi_home_prices = zip(*kalshi_home_data)
-                kalshi_home_probs = [p / 100.0 for p in kalshi_home_prices]
-                
-                # Track bid/ask existence for decision-weighted metrics
-                kalshi_bid_ask_exists = [
-                    (row[3] is not None and row[4] is not None)
-                    for row in kalshi_rows 
-                    if row[0] == 'home' and row[1] is not None
-                ]
-                
-                kalshi_stats = {
-                    "data_points": len(kalshi_home_probs),
-                    "min_probability": min(kalshi_home_probs) if kalshi_home_probs else None,
-                    "max_probability": max(kalshi_home_probs) if kalshi_home_probs else None,
-                    "mean_probability": sum(kalshi_home_probs) / len(kalshi_home_probs) if kalshi_home_probs else None,
-                    "final_probability": kalshi_home_probs[-1] if kalshi_home_probs else None,
-                    "volatility": calculate_probability_volatility(kalshi_home_probs),
-                    "max_swing": calculate_max_probability_swing(kalshi_home_probs),
-                    "lead_changes": calculate_lead_changes(kalshi_home_probs),
-                    "time_weighted_avg": calculate_time_weighted_average(kalshi_home_probs, list(kalshi_home_times)),
-                    # Deviation metrics
-                    "standard_deviation": calculate_standard_deviation(kalshi_home_probs),
-                    "variance": calculate_variance(kalshi_home_probs),
-                    "mean_absolute_deviation": calculate_mean_absolute_deviation(kalshi_home_probs),
-                    "coefficient_of_variation": calculate_coefficient_of_variation(kalshi_home_probs),
-                }
-                
-                # Add calibration metrics if we know the outcome
-                if home_won is not None:
-                    actual_outcome = 1 if home_won else 0
-                    kalshi_brier_score = calculate_brier_score(kalshi_home_probs, actual_outcome)
-                    kalshi_stats["time_averaged_in_game_brier_error"] = kalshi_brier_score
-                    
-                    # Add time-sliced Brier scores for Kalshi
-                    if game_start_timestamp is not None:
-                        kalshi_stats["brier_score_time_sliced"] = calculate_time_sliced_brier_scores(
-                            kalshi_home_probs,
-                            list(kalshi_home_times),
-                            game_start_timestamp,
-                            actual_outcome,
-                            game_duration_seconds
-                        )
-                    else:
-                        kalshi_stats["brier_score_time_sliced"] = {
-                            "q1": None,
-                            "halftime": None,
-                            "start_q4": None,
-                            "final_2_minutes": None,
-                        }
-                    
-                    # Calculate reliability curve (calibration curve)
-                    # Need to create a list of outcomes (same length as probabilities)
-                    actual_outcomes_list = [actual_outcome] * len(kalshi_home_probs)
-                    kalshi_stats["reliability_curve"] = calculate_reliability_curve(
-                        kalshi_home_probs,
-                        actual_outcomes_list,
-                        bins=10
-                    )
-                else:
-                    kalshi_stats["brier_score_time_sliced"] = {
-                        "q1": None,
-                        "halftime": None,
-                        "start_q4": None,
-                        "final_2_minutes": None,
-                    }
-                
-                # Calculate divergence (with time-sliced correlations)
-                divergence_stats = calculate_espn_kalshi_divergence(
-                    espn_home_probs, kalshi_home_probs,
-                    espn_times, list(kalshi_home_times),
-                    game_start_timestamp,
-                    game_duration_seconds
-                )
-                
-                # Calculate decision-weighted metrics
-                # Align ESPN and Kalshi data for decision-weighted metrics
-                if len(espn_home_probs) > 0 and len(kalshi_home_probs) > 0:
-                    # Create aligned pairs for decision-weighted metrics
-                    aligned_espn = []
-                    aligned_kalshi = []
-                    aligned_kalshi_times = []
-                    aligned_bid_ask_exists = []
-                    
-                    kalshi_idx = 0
-                    for i, espn_time in enumerate(espn_times):
-                        # Find closest Kalshi timestamp
-                        while kalshi_idx < len(kalshi_home_times) - 1 and abs(kalshi_home_times[kalshi_idx] - espn_time) > abs(kalshi_home_times[kalshi_idx + 1] - espn_time):
-                            kalshi_idx += 1
-                        
-                        if kalshi_idx < len(kalshi_home_times):
-                            time_diff = abs(kalshi_home_times[kalshi_idx] - espn_time)
-                            if time_diff <= 60:  # Within 60 seconds
-                                aligned_espn.append(espn_home_probs[i])
-                                aligned_kalshi.append(kalshi_home_probs[kalshi_idx])
-                                aligned_kalshi_times.append(kalshi_home_times[kalshi_idx])
-                                aligned_bid_ask_exists.append(kalshi_bid_ask_exists[kalshi_idx] if kalshi_idx < len(kalshi_bid_ask_exists) else False)
-                    
-                    if aligned_espn and aligned_kalshi:
-                        actual_outcome_for_dw = 1 if home_won else 0 if home_won is not None else None
-                        decision_weighted = calculate_decision_weighted_metrics(
-                            aligned_espn,
-                            aligned_kalshi,
-                            aligned_kalshi_times,
-                            aligned_bid_ask_exists,
-                            actual_outcome_for_dw,
-                            game_start_timestamp,
-                            game_duration_seconds
-                        )
-                        divergence_stats["decision_weighted"] = decision_weighted
-        
-        result = {
-            "game_id": game_id,
-            "home_won": home_won,
-            "final_score": {
-                "home": final_home_score,
-                "away": final_away_score,
-            },
-            "espn": espn_stats,
-            "kalshi": kalshi_stats,
-            "divergence": divergence_stats,
-        }
-        
-        # For completed games, save to database in background (non-blocking)
-        if is_completed:
-            # Get game metadata for storage
-            metadata_sql = """
-            SELECT 
-                p.season_label,
-                sg.home_team_abbrev,
-                sg.away_team_abbrev
-            FROM espn.probabilities_raw_items p
-            JOIN espn.scoreboard_games sg ON p.game_id = sg.event_id
-            WHERE p.game_id = %s
-            AND p.season_label = '2025-26'
-            LIMIT 1
-            """
-            metadata_row = conn.execute(metadata_sql, (game_id,)).fetchone()
-            game_metadata = {
-                "season_label": metadata_row[0] if metadata_row else None,
-                "home_team_abbrev": metadata_row[1] if metadata_row else None,
-                "away_team_abbrev": metadata_row[2] if metadata_row else None,
-            }
-            
-            # Save to database in background (non-blocking)
-            _save_stats_to_db(conn, game_id, result, game_metadata)
-        
-        logger.info(f"get_game_stats returning stats for game {game_id}: "
-                    f"espn_data_points={espn_stats.get('data_points', 0)}, "
-                    f"kalshi_data_points={len(kalshi_home_probs) if kalshi_home_probs is not None else 0}, "
-                    f"from_db={False}, is_completed={is_completed}")
-        return result
+    logger.info(f"get_game_stats returning stats for game {game_id}: "
+                f"espn_data_points={(stats.get('espn') or {}).get('data_points', 0)}, "
+                f"kalshi_data_points={(stats.get('kalshi') or {}).get('data_points', 0)}")
+    return stats
 
 
 @router.get("/games/stats/bulk")
@@ -1468,32 +1300,63 @@ def get_bulk_game_stats(
     Get stats for multiple games in a single request.
     
     Useful for fetching stats for all games returned by the games endpoint.
-    Each game's stats are individually cached with dynamic TTL (long for completed games).
+    Games are fetched and computed STATS_BATCH_SIZE at a time (stored stats are read in one query).
     
     Args:
         game_ids: Comma-separated list of game IDs (e.g., "401810151,401810152")
     
     Returns:
-        Dictionary mapping game_id to stats
+        Dictionary mapping game_id to stats (games without data are skipped)
     """
     game_id_list = [gid.strip() for gid in game_ids.split(",") if gid.strip()]
     
     if not game_id_list:
         return {}
     
-    # Fetch stats for each game (they're individually cached via the get_game_stats function)
-    # We bypass the router decorator and call the function directly to reuse its cache
-    result = {}
-    for game_id in game_id_list:
+    return {game_id: stats for game_id, stats in _iter_stats_batches(game_id_list) if stats is not None}
+
+
+@router.get("/games/stats/bulk/stream")
+def stream_bulk_game_stats(
+    game_ids: str = Query(..., description="Comma-separated list of game IDs"),
+    format: str = Query("ndjson", description="Stream framing: 'ndjson' (one JSON object per line) or 'sse' (Server-Sent Events)"),
+):
+    """
+    Streaming variant of /games/stats/bulk: one record per game as its stats are ready.
+    
+    Records (each has a "type"; with format=sse it is also the SSE event name):
+    - {"type": "game", "game_id", "stats"} per game, in request order
+    - {"type": "skipped", "game_id", "reason"} for games that don't exist or have no data
+    - {"type": "summary", "num_games", "num_requested", "skipped_game_ids"} last
+    - {"type": "error", "message"} instead of the summary if a batch fails after streaming started
+    
+    Games are computed STATS_BATCH_SIZE at a time and each batch is sent as soon as it is ready,
+    so a long game list starts rendering after the first batch instead of after the whole list.
+    """
+    check_stream_format(format)
+    game_id_list = [gid.strip() for gid in game_ids.split(",") if gid.strip()]
+    
+    def records():
+        skipped = []
         try:
-            # Call the function directly - it will use its own cache decorator
-            stats = get_game_stats(game_id)
-            result[game_id] = stats
-        except HTTPException:
-            # Skip games that don't exist or have no data
-            continue
+            for game_id, stats in _iter_stats_batches(game_id_list):
+                if stats is None:
+                    skipped.append(game_id)
+                    yield {"type": "skipped", "game_id": game_id, "reason": f"No ESPN probability data for game {game_id}"}
+                    continue
+                yield {"type": "game", "game_id": game_id, "stats": stats}
+        except Exception as e:
+            logger.error(f"Error streaming bulk game stats: {e}", exc_info=True)
+            yield {"type": "error", "message": f"Error calculating game stats: {getattr(e, 'detail', None) or e}"}
+            return
+        yield {
+            "type": "summary",
+            "num_games": len(game_id_list) - len(skipped),
+            "num_requested": len(game_id_list),
+            "skipped_game_ids": skipped,
+        }
     
-    return result
+    return stream_records(records(), format)
 
 
 @router.get("/games/stats/summary")
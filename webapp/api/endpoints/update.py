@@ -11,16 +11,31 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks, WebSocket, WebSoc
 from datetime import datetime, timedelta, date, timezone
 import subprocess
 import os
+import sys
 import json
 import threading
-import re
 from pathlib import Path
 import asyncio
 
 from ..db import get_db_connection
 from ..logging_config import get_logger
 from ..cache import SimpleCache
-from . import games
+from ..game_catalog import get_game_catalog
+
+# Fetch/load steps run in-process: import the scripts package from the repo root
+repo_root_dir = Path(__file__).parent.parent.parent.parent
+if str(repo_root_dir) not in sys.path:
+    sys.path.insert(0, str(repo_root_dir))
+from scripts.fetch import fetch_espn_probabilities as fetch_espn_probabilities_script
+from scripts.fetch import fetch_espn_scoreboard as fetch_espn_scoreboard_script
+from scripts.lib._db_lib import ConnectionPool, shared_connection_pool
+from scripts.lib._pipeline_lib import PipelineStep, StepResult, call_script_main, run_pipeline
+from scripts.load import load_espn_probabilities_raw_items as load_espn_probabilities_script
+from scripts.load import load_espn_scoreboard as load_espn_scoreboard_script
+from scripts.load import load_kalshi_candlesticks as load_kalshi_candlesticks_script
+from scripts.load import load_kalshi_markets as load_kalshi_markets_script
+from scripts.process import materialize_espn_prob_event_state as materialize_event_state_script
+from scripts.process import refresh_snapshot_features as refresh_snapshot_features_script
 
 # Lock to prevent concurrent update task execution
 _update_task_lock = threading.Lock()
@@ -227,37 +242,6 @@ def check_new_games() -> dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error checking new games: {str(e)}")
 
 
-def run_update_script(script_name: str, args: list[str], timeout: int = 300) -> tuple[int, str, str]:
-    """Run a script as subprocess and return exit code, stdout, stderr."""
-    repo_root = Path(__file__).parent.parent.parent.parent
-    script_path = repo_root / "scripts" / script_name
-    
-    if not script_path.exists():
-        raise FileNotFoundError(f"Script not found: {script_path}")
-    
-    # Get DATABASE_URL from environment
-    env = os.environ.copy()
-    if "DATABASE_URL" not in env:
-        raise ValueError("DATABASE_URL environment variable not set")
-    
-    cmd = [os.environ.get("PYTHON_BIN", "python3"), str(script_path)] + args
-    
-    try:
-        result = subprocess.run(
-            cmd,
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            env=env
-        )
-        return result.returncode, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
-        return -1, "", f"Script timed out after {timeout} seconds"
-    except Exception as e:
-        return -1, "", str(e)
-
-
 def get_repo_root() -> Path:
     """Get the repository root directory."""
     current_file = Path(__file__)
@@ -302,71 +286,31 @@ def fetch_espn_scoreboard_for_date(date_str: str, repo_root: Path) -> tuple[bool
     
     logger.info(f"[FETCH_SCOREBOARD] 🔄 Fetching from ESPN API for {date_str}...")
     
-    script_path = repo_root / "scripts" / "fetch_espn_scoreboard.py"
-    logger.debug(f"[FETCH_SCOREBOARD] Script path: {script_path}")
-    if not script_path.exists():
-        logger.error(f"[FETCH_SCOREBOARD] Script not found: {script_path}")
-        return False, f"Script not found: {script_path}"
-    
-    python_bin = os.environ.get("PYTHON_BIN", "python3")
-    cmd = [python_bin, str(script_path), "--date", date_str, "--out", str(out_file)]
-    logger.info(f"[FETCH_SCOREBOARD] Executing command: {' '.join(cmd)}")
-    logger.debug(f"[FETCH_SCOREBOARD] Working directory: {repo_root}")
-    logger.debug(f"[FETCH_SCOREBOARD] Python binary: {python_bin}")
-    
-    env = os.environ.copy()
-    logger.debug(f"[FETCH_SCOREBOARD] DATABASE_URL set: {'DATABASE_URL' in env}")
+    argv = ["--date", date_str, "--out", str(out_file)]
+    logger.info(f"[FETCH_SCOREBOARD] Running fetch_espn_scoreboard in-process: {' '.join(argv)}")
     
     try:
         start_time = datetime.now()
-        result = subprocess.run(
-            cmd,
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=180,
-            env=env
-        )
+        call_script_main(fetch_espn_scoreboard_script.main, argv)
         elapsed = (datetime.now() - start_time).total_seconds()
-        logger.debug(f"[FETCH_SCOREBOARD] Command completed in {elapsed:.2f} seconds")
-        logger.debug(f"[FETCH_SCOREBOARD] Return code: {result.returncode}")
-        logger.debug(f"[FETCH_SCOREBOARD] Stdout length: {len(result.stdout)} chars")
-        logger.debug(f"[FETCH_SCOREBOARD] Stderr length: {len(result.stderr)} chars")
+        logger.debug(f"[FETCH_SCOREBOARD] Fetch completed in {elapsed:.2f} seconds")
         
-        if result.returncode == 0:
-            if out_file.exists():
-                file_size = out_file.stat().st_size
-                logger.info(f"[FETCH_SCOREBOARD] ✅ Successfully fetched and saved scoreboard for {date_str} ({file_size} bytes) to {out_file.name}")
-                logger.debug(f"[FETCH_SCOREBOARD] Output file exists: {out_file.exists()}")
-                logger.debug(f"[FETCH_SCOREBOARD] Manifest exists: {manifest_file.exists()}")
-            else:
-                logger.warning(f"[FETCH_SCOREBOARD] Command succeeded but output file not found: {out_file}")
-            return True, f"Fetched scoreboard for {date_str}"
+        if out_file.exists():
+            file_size = out_file.stat().st_size
+            logger.info(f"[FETCH_SCOREBOARD] ✅ Successfully fetched and saved scoreboard for {date_str} ({file_size} bytes) to {out_file.name}")
+            logger.debug(f"[FETCH_SCOREBOARD] Manifest exists: {manifest_file.exists()}")
         else:
-            logger.error(f"[FETCH_SCOREBOARD] Command failed with return code {result.returncode}")
-            logger.error(f"[FETCH_SCOREBOARD] Stderr: {result.stderr}")
-            logger.error(f"[FETCH_SCOREBOARD] Stdout: {result.stdout}")
-            return False, f"Error fetching scoreboard (code {result.returncode}): {result.stderr}"
-    except subprocess.TimeoutExpired as e:
-        logger.error(f"[FETCH_SCOREBOARD] Timeout after 180 seconds for {date_str}")
-        logger.error(f"[FETCH_SCOREBOARD] Timeout exception: {str(e)}")
-        return False, f"Timeout fetching scoreboard for {date_str}"
+            logger.warning(f"[FETCH_SCOREBOARD] Fetch succeeded but output file not found: {out_file}")
+        return True, f"Fetched scoreboard for {date_str}"
     except Exception as e:
         logger.error(f"[FETCH_SCOREBOARD] Exception fetching scoreboard for {date_str}: {str(e)}", exc_info=True)
-        return False, f"Exception: {str(e)}"
+        return False, f"Error fetching scoreboard: {str(e)}"
 
 
 def load_espn_scoreboard(repo_root: Path, min_date: date | None = None) -> tuple[bool, str]:
     """Load ESPN scoreboard files into database."""
     logger.info("[LOAD_SCOREBOARD] Starting scoreboard load into database")
     
-    script_path = repo_root / "scripts" / "load_espn_scoreboard.py"
-    logger.debug(f"[LOAD_SCOREBOARD] Script path: {script_path}")
-    if not script_path.exists():
-        logger.error(f"[LOAD_SCOREBOARD] Script not found: {script_path}")
-        return False, f"Script not found: {script_path}"
-    
-    python_bin = os.environ.get("PYTHON_BIN", "python3")
     scoreboard_dir = repo_root / "data" / "raw" / "espn" / "scoreboard"
     logger.debug(f"[LOAD_SCOREBOARD] Scoreboard directory: {scoreboard_dir}")
     logger.debug(f"[LOAD_SCOREBOARD] Scoreboard directory exists: {scoreboard_dir.exists()}")
@@ -399,64 +343,21 @@ def load_espn_scoreboard(repo_root: Path, min_date: date | None = None) -> tuple
         
         logger.debug(f"[LOAD_SCOREBOARD] Files: {[f.name for f in scoreboard_files[:5]]}...")
     
-    cmd = [python_bin, str(script_path), "--scoreboard-dir", str(scoreboard_dir)]
+    argv = ["--scoreboard-dir", str(scoreboard_dir)]
     if min_date:
-        cmd.extend(["--min-date", min_date.strftime("%Y-%m-%d")])
-    logger.info(f"[LOAD_SCOREBOARD] Executing command: {' '.join(cmd)}")
-    logger.debug(f"[LOAD_SCOREBOARD] Working directory: {repo_root}")
-    
-    env = os.environ.copy()
-    logger.debug(f"[LOAD_SCOREBOARD] DATABASE_URL set: {'DATABASE_URL' in env}")
+        argv.extend(["--min-date", min_date.strftime("%Y-%m-%d")])
+    logger.info(f"[LOAD_SCOREBOARD] Running load_espn_scoreboard in-process: {' '.join(argv)}")
     
     try:
         start_time = datetime.now()
-        logger.info(f"[LOAD_SCOREBOARD] Starting subprocess (processing ~3,300 scoreboard files)...")
-        
-        result = subprocess.run(
-            cmd,
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=300,
-            env=env
-        )
+        call_script_main(load_espn_scoreboard_script.main, argv)
         elapsed = (datetime.now() - start_time).total_seconds()
-        logger.info(f"[LOAD_SCOREBOARD] Command completed in {elapsed:.2f} seconds ({elapsed/60:.2f} minutes)")
-        logger.debug(f"[LOAD_SCOREBOARD] Return code: {result.returncode}")
-        logger.debug(f"[LOAD_SCOREBOARD] Stdout length: {len(result.stdout)} chars")
-        logger.debug(f"[LOAD_SCOREBOARD] Stderr length: {len(result.stderr)} chars")
-        
-        # Log progress from stdout
-        if result.stdout:
-            stdout_lines = result.stdout.strip().split('\n')
-            progress_lines = [line for line in stdout_lines if 'heartbeat' in line.lower() or 'commit' in line.lower() or 'done' in line.lower()]
-            if progress_lines:
-                logger.info(f"[LOAD_SCOREBOARD] Progress from script:")
-                for line in progress_lines[-5:]:  # Last 5 progress lines
-                    logger.info(f"[LOAD_SCOREBOARD]   {line}")
-        
-        if result.returncode == 0:
-            logger.info("[LOAD_SCOREBOARD] Successfully loaded scoreboard data")
-            if result.stdout:
-                logger.debug(f"[LOAD_SCOREBOARD] Output: {result.stdout[-500:]}")  # Last 500 chars
-            return True, "Loaded scoreboard data"
-        else:
-            logger.error(f"[LOAD_SCOREBOARD] Command failed with return code {result.returncode}")
-            logger.error(f"[LOAD_SCOREBOARD] Stderr: {result.stderr}")
-            logger.error(f"[LOAD_SCOREBOARD] Stdout: {result.stdout}")
-            # Check if error is about missing table
-            if "does not exist" in result.stdout or "does not exist" in result.stderr:
-                logger.error("[LOAD_SCOREBOARD] NOTE: The script may be trying to insert into 'derived.espn_scoreboard_games'")
-                logger.error("[LOAD_SCOREBOARD] NOTE: But migration 027 moved this table to 'espn.scoreboard_games'")
-                logger.error("[LOAD_SCOREBOARD] NOTE: The script may need to be updated to use the correct table name")
-            return False, f"Error loading scoreboard (code {result.returncode}): {result.stderr}"
-    except subprocess.TimeoutExpired as e:
-        logger.error("[LOAD_SCOREBOARD] Timeout after 300 seconds")
-        logger.error(f"[LOAD_SCOREBOARD] Timeout exception: {str(e)}")
-        return False, "Timeout loading scoreboard"
+        logger.info(f"[LOAD_SCOREBOARD] Load completed in {elapsed:.2f} seconds ({elapsed/60:.2f} minutes)")
+        logger.info("[LOAD_SCOREBOARD] Successfully loaded scoreboard data")
+        return True, "Loaded scoreboard data"
     except Exception as e:
         logger.error(f"[LOAD_SCOREBOARD] Exception loading scoreboard: {str(e)}", exc_info=True)
-        return False, f"Exception: {str(e)}"
+        return False, f"Error loading scoreboard: {str(e)}"
 
 
 def fetch_espn_probabilities_for_game(event_id: str, competition_id: str, repo_root: Path, season: str = "2025-26", game_date: str | None = None) -> tuple[bool, str]:
@@ -530,58 +431,28 @@ def fetch_espn_probabilities_for_game(event_id: str, competition_id: str, repo_r
     
     logger.info(f"[FETCH_PROBABILITIES] 🔄 Fetching from ESPN API for {event_id} (competition_id={competition_id})...")
     
-    script_path = repo_root / "scripts" / "fetch_espn_probabilities.py"
-    logger.debug(f"[FETCH_PROBABILITIES] Script path: {script_path}")
-    if not script_path.exists():
-        logger.error(f"[FETCH_PROBABILITIES] Script not found: {script_path}")
-        return False, f"Script not found: {script_path}"
-    
-    python_bin = os.environ.get("PYTHON_BIN", "python3")
-    cmd = [
-        python_bin, str(script_path),
+    argv = [
         "--event-id", event_id,
         "--competition-id", competition_id,
         "--out", str(out_file)
     ]
-    logger.debug(f"[FETCH_PROBABILITIES] Executing command: {' '.join(cmd)}")
-    logger.debug(f"[FETCH_PROBABILITIES] Working directory: {repo_root}")
-    
-    env = os.environ.copy()
-    logger.debug(f"[FETCH_PROBABILITIES] DATABASE_URL set: {'DATABASE_URL' in env}")
+    logger.debug(f"[FETCH_PROBABILITIES] Running fetch_espn_probabilities in-process: {' '.join(argv)}")
     
     try:
         start_time = datetime.now()
-        result = subprocess.run(
-            cmd,
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=60,
-            env=env
-        )
+        call_script_main(fetch_espn_probabilities_script.main, argv)
         elapsed = (datetime.now() - start_time).total_seconds()
-        logger.debug(f"[FETCH_PROBABILITIES] Command completed in {elapsed:.2f} seconds for {event_id}")
-        logger.debug(f"[FETCH_PROBABILITIES] Return code: {result.returncode}")
+        logger.debug(f"[FETCH_PROBABILITIES] Fetch completed in {elapsed:.2f} seconds for {event_id}")
         
-        if result.returncode == 0:
-            if out_file.exists():
-                file_size = out_file.stat().st_size
-                logger.info(f"[FETCH_PROBABILITIES] ✅ Successfully fetched and saved probabilities for {event_id} ({file_size} bytes) to {out_file.name}")
-            else:
-                logger.warning(f"[FETCH_PROBABILITIES] Command succeeded but output file not found: {out_file}")
-            return True, f"Fetched probabilities for {event_id}"
+        if out_file.exists():
+            file_size = out_file.stat().st_size
+            logger.info(f"[FETCH_PROBABILITIES] ✅ Successfully fetched and saved probabilities for {event_id} ({file_size} bytes) to {out_file.name}")
         else:
-            logger.error(f"[FETCH_PROBABILITIES] Command failed for {event_id} with return code {result.returncode}")
-            logger.error(f"[FETCH_PROBABILITIES] Stderr: {result.stderr}")
-            logger.error(f"[FETCH_PROBABILITIES] Stdout: {result.stdout}")
-            return False, f"Error fetching probabilities (code {result.returncode}): {result.stderr}"
-    except subprocess.TimeoutExpired as e:
-        logger.error(f"[FETCH_PROBABILITIES] Timeout after 60 seconds for {event_id}")
-        logger.error(f"[FETCH_PROBABILITIES] Timeout exception: {str(e)}")
-        return False, f"Timeout fetching probabilities for {event_id}"
+            logger.warning(f"[FETCH_PROBABILITIES] Fetch succeeded but output file not found: {out_file}")
+        return True, f"Fetched probabilities for {event_id}"
     except Exception as e:
         logger.error(f"[FETCH_PROBABILITIES] Exception fetching probabilities for {event_id}: {str(e)}", exc_info=True)
-        return False, f"Exception: {str(e)}"
+        return False, f"Error fetching probabilities: {str(e)}"
 
 
 def get_current_season(date_obj: date = None) -> str:
@@ -709,22 +580,17 @@ def fetch_and_load_kalshi_markets(repo_root: Path) -> tuple[bool, str]:
     """
     Fetch Kalshi markets and load them into the database.
     
-    Uses the TypeScript script fetch_all_markets.ts and then load_kalshi_markets.py.
+    Uses the TypeScript script fetch_all_markets.ts and then load_kalshi_markets (in-process).
     """
     logger.info("[KALSHI_MARKETS] Starting Kalshi markets fetch and load")
     
     kalshi_scripts_dir = repo_root / "scripts" / "kalshi"
     fetch_script = kalshi_scripts_dir / "fetch_all_markets.ts"
-    load_script = repo_root / "scripts" / "load_kalshi_markets.py"
     
     if not fetch_script.exists():
         logger.warning(f"[KALSHI_MARKETS] Fetch script not found: {fetch_script}")
         return False, f"Fetch script not found: {fetch_script}"
     
-    if not load_script.exists():
-        logger.warning(f"[KALSHI_MARKETS] Load script not found: {load_script}")
-        return False, f"Load script not found: {load_script}"
-    
     # Step 1: Fetch markets using TypeScript
     logger.info("[KALSHI_MARKETS] Step 1: Fetching markets from Kalshi API")
     try:
@@ -769,53 +635,29 @@ def fetch_and_load_kalshi_markets(repo_root: Path) -> tuple[bool, str]:
     # Step 2: Load markets into database
     logger.info("[KALSHI_MARKETS] Step 2: Loading markets into database")
     try:
-        python_bin = os.environ.get("PYTHON_BIN", "python3")
-        load_cmd = [python_bin, str(load_script), "--markets-file", str(markets_file)]
-        
-        load_result = subprocess.run(
-            load_cmd,
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=300,
-            env=os.environ.copy()
-        )
-        
-        if load_result.returncode != 0:
-            logger.error(f"[KALSHI_MARKETS] Load failed with return code {load_result.returncode}")
-            logger.error(f"[KALSHI_MARKETS] Stderr: {load_result.stderr}")
-            return False, f"Failed to load Kalshi markets: {load_result.stderr}"
-        
+        call_script_main(load_kalshi_markets_script.main, ["--markets-file", str(markets_file)])
         logger.info("[KALSHI_MARKETS] ✓ Successfully loaded markets")
         return True, "Kalshi markets fetched and loaded successfully"
-        
-    except subprocess.TimeoutExpired:
-        return False, "Timeout loading Kalshi markets"
     except Exception as e:
         logger.error(f"[KALSHI_MARKETS] Exception loading markets: {e}", exc_info=True)
-        return False, f"Exception: {str(e)}"
+        return False, f"Failed to load Kalshi markets: {str(e)}"
 
 
 def fetch_and_load_kalshi_candlesticks(repo_root: Path) -> tuple[bool, str]:
     """
     Fetch Kalshi candlesticks and load them into the database.
     
-    Uses the TypeScript script fetch_all_candlesticks.ts and then load_kalshi_candlesticks.py.
+    Uses the TypeScript script fetch_all_candlesticks.ts and then load_kalshi_candlesticks (in-process).
     """
     logger.info("[KALSHI_CANDLES] Starting Kalshi candlesticks fetch and load")
     
     kalshi_scripts_dir = repo_root / "scripts" / "kalshi"
     fetch_script = kalshi_scripts_dir / "fetch_all_candlesticks.ts"
-    load_script = repo_root / "scripts" / "load_kalshi_candlesticks.py"
     
     if not fetch_script.exists():
         logger.warning(f"[KALSHI_CANDLES] Fetch script not found: {fetch_script}")
         return False, f"Fetch script not found: {fetch_script}"
     
-    if not load_script.exists():
-        logger.warning(f"[KALSHI_CANDLES] Load script not found: {load_script}")
-        return False, f"Load script not found: {load_script}"
-    
     # Step 1: Fetch candlesticks using TypeScript
     logger.info("[KALSHI_CANDLES] Step 1: Fetching candlesticks from Kalshi API")
     try:
@@ -855,31 +697,12 @@ def fetch_and_load_kalshi_candlesticks(repo_root: Path) -> tuple[bool, str]:
     # Step 2: Load candlesticks into database
     logger.info("[KALSHI_CANDLES] Step 2: Loading candlesticks into database")
     try:
-        python_bin = os.environ.get("PYTHON_BIN", "python3")
-        load_cmd = [python_bin, str(load_script), "--candlesticks-dir", str(latest_fetch_dir)]
-        
-        load_result = subprocess.run(
-            load_cmd,
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=600,
-            env=os.environ.copy()
-        )
-        
-        if load_result.returncode != 0:
-            logger.error(f"[KALSHI_CANDLES] Load failed with return code {load_result.returncode}")
-            logger.error(f"[KALSHI_CANDLES] Stderr: {load_result.stderr}")
-            return False, f"Failed to load Kalshi candlesticks: {load_result.stderr}"
-        
+        call_script_main(load_kalshi_candlesticks_script.main, ["--candlesticks-dir", str(latest_fetch_dir)])
         logger.info("[KALSHI_CANDLES] ✓ Successfully loaded candlesticks")
         return True, "Kalshi candlesticks fetched and loaded successfully"
-        
-    except subprocess.TimeoutExpired:
-        return False, "Timeout loading Kalshi candlesticks"
     except Exception as e:
         logger.error(f"[KALSHI_CANDLES] Exception loading candlesticks: {e}", exc_info=True)
-        return False, f"Exception: {str(e)}"
+        return False, f"Failed to load Kalshi candlesticks: {str(e)}"
 
 
 def load_espn_probabilities(repo_root: Path, season_label: str = None, min_date: datetime | None = None) -> tuple[bool, str]:
@@ -894,13 +717,6 @@ def load_espn_probabilities(repo_root: Path, season_label: str = None, min_date:
     """
     logger.info("[LOAD_PROBABILITIES] Starting probabilities load into database")
     
-    script_path = repo_root / "scripts" / "load_espn_probabilities_raw_items.py"
-    logger.debug(f"[LOAD_PROBABILITIES] Script path: {script_path}")
-    if not script_path.exists():
-        logger.error(f"[LOAD_PROBABILITIES] Script not found: {script_path}")
-        return False, f"Script not found: {script_path}"
-    
-    python_bin = os.environ.get("PYTHON_BIN", "python3")
     prob_root = repo_root / "data" / "raw" / "espn" / "probabilities"
     logger.debug(f"[LOAD_PROBABILITIES] Probabilities root: {prob_root}")
     logger.debug(f"[LOAD_PROBABILITIES] Probabilities root exists: {prob_root.exists()}")
@@ -943,174 +759,26 @@ def load_espn_probabilities(repo_root: Path, season_label: str = None, min_date:
         logger.info(f"[LOAD_PROBABILITIES] No new probability files to process for season {season_label}, skipping load")
         return True, "No new files to process"
     
-    cmd = [python_bin, str(script_path), "--probabilities-root", str(prob_root), "--season-label", season_label, "--commit-every", "100"]
+    argv = ["--probabilities-root", str(prob_root), "--season-label", season_label, "--commit-every", "100"]
     if min_date:
         # Format datetime as ISO8601 string for the script
         # Ensure timezone-aware datetime
         if min_date.tzinfo is None:
             min_date = min_date.replace(tzinfo=timezone.utc)
-        # Format with timezone offset
-        offset = min_date.strftime("%z")
-        if offset:
-            min_date_str = min_date.strftime("%Y-%m-%dT%H:%M:%S") + offset[:3] + ":" + offset[3:]
-        else:
-            min_date_str = min_date.strftime("%Y-%m-%dT%H:%M:%S%z")
-        cmd.extend(["--min-modified-time", min_date_str])
-    logger.info(f"[LOAD_PROBABILITIES] Executing command: {' '.join(cmd)}")
-    logger.debug(f"[LOAD_PROBABILITIES] Working directory: {repo_root}")
-    logger.debug(f"[LOAD_PROBABILITIES] Timeout: 600 seconds (10 minutes)")
-    
-    env = os.environ.copy()
-    logger.debug(f"[LOAD_PROBABILITIES] DATABASE_URL set: {'DATABASE_URL' in env}")
+        argv.extend(["--min-modified-time", min_date.isoformat()])
+    logger.info(f"[LOAD_PROBABILITIES] Running load_espn_probabilities_raw_items in-process: {' '.join(argv)}")
     
     try:
         start_time = datetime.now()
-        logger.info(f"[LOAD_PROBABILITIES] Starting subprocess - processing {len(prob_files):,} probability files from season {season_label}")
-        logger.info(f"[LOAD_PROBABILITIES] This may take several minutes. Progress will be logged in real-time.")
-        
-        # Use Popen to stream output in real-time
-        process = subprocess.Popen(
-            cmd,
-            cwd=str(repo_root),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,  # Line buffered
-            env=env
-        )
-        
-        stdout_lines = []
-        stderr_lines = []
-        last_progress_log = [datetime.now()]  # Use list to allow modification in nested function
-        
-        # Use threading to read both stdout and stderr in real-time
-        def read_output(pipe, lines_list):
-            for line in iter(pipe.readline, ''):
-                if line:
-                    line = line.strip()
-                    lines_list.append(line)
-                    
-                    # Parse progress messages and log them
-                    if '[load_espn_prob_raw]' in line:
-                        # Parse heartbeat: "heartbeat file=X/Y total_files=Z total_items=W upserts=U errors=E"
-                        if 'heartbeat' in line:
-                            # Extract numbers from heartbeat
-                            file_match = re.search(r'file=(\d+)/(\d+)', line)
-                            total_files_match = re.search(r'total_files=(\d+)', line)
-                            total_items_match = re.search(r'total_items=(\d+)', line)
-                            upserts_match = re.search(r'upserts=(\d+)', line)
-                            errors_match = re.search(r'errors=(\d+)', line)
-                            
-                            if file_match and total_files_match:
-                                current_file = file_match.group(1)
-                                total_file_count = file_match.group(2)
-                                files_processed = total_files_match.group(1)
-                                items = total_items_match.group(1) if total_items_match else "0"
-                                upserts = upserts_match.group(1) if upserts_match else "0"
-                                errors = errors_match.group(1) if errors_match else "0"
-                                
-                                # Log progress every 5 seconds
-                                now = datetime.now()
-                                if (now - last_progress_log[0]).total_seconds() >= 5:
-                                    logger.info(f"[LOAD_PROBABILITIES] Progress: {files_processed}/{total_file_count} files processed, {items} items, {upserts} upserts, {errors} errors")
-                                    last_progress_log[0] = now
-                        
-                        # Parse commit messages
-                        elif 'commit' in line:
-                            commit_match = re.search(r'commit files=(\d+) items=(\d+) upserts=(\d+) errors=(\d+)', line)
-                            if commit_match:
-                                files = commit_match.group(1)
-                                items = commit_match.group(2)
-                                upserts = commit_match.group(3)
-                                errors = commit_match.group(4)
-                                logger.info(f"[LOAD_PROBABILITIES] Committed: {files} files, {items} items, {upserts} upserts, {errors} errors")
-                        
-                        # Parse done message
-                        elif 'done' in line:
-                            done_match = re.search(r'done files=(\d+) items=(\d+) upserts=(\d+) errors=(\d+)', line)
-                            if done_match:
-                                files = done_match.group(1)
-                                items = done_match.group(2)
-                                upserts = done_match.group(3)
-                                errors = done_match.group(4)
-                                logger.info(f"[LOAD_PROBABILITIES] ✓ Completed: {files} files, {items} items, {upserts} upserts, {errors} errors")
-            pipe.close()
-        
-        # Start threads to read stdout and stderr
-        stdout_thread = threading.Thread(target=read_output, args=(process.stdout, stdout_lines))
-        stderr_thread = threading.Thread(target=read_output, args=(process.stderr, stderr_lines))
-        stdout_thread.daemon = True
-        stderr_thread.daemon = True
-        stdout_thread.start()
-        stderr_thread.start()
-        
-        # Wait for process to complete with timeout
-        try:
-            return_code = process.wait(timeout=600)  # 10 minutes
-        except subprocess.TimeoutExpired:
-            process.kill()
-            return_code = process.wait()
-            logger.error("[LOAD_PROBABILITIES] Process timed out after 600 seconds")
-        
-        # Wait for threads to finish reading (with timeout)
-        stdout_thread.join(timeout=5)
-        stderr_thread.join(timeout=5)
-        
+        logger.info(f"[LOAD_PROBABILITIES] Processing {len(prob_files):,} probability files from season {season_label}")
+        call_script_main(load_espn_probabilities_script.main, argv)
         elapsed = (datetime.now() - start_time).total_seconds()
-        
-        logger.info(f"[LOAD_PROBABILITIES] Command completed in {elapsed:.2f} seconds ({elapsed/60:.2f} minutes)")
-        logger.debug(f"[LOAD_PROBABILITIES] Return code: {return_code}")
-        logger.debug(f"[LOAD_PROBABILITIES] Stdout lines: {len(stdout_lines)}")
-        logger.debug(f"[LOAD_PROBABILITIES] Stderr lines: {len(stderr_lines)}")
-        
-        # Create result-like object for compatibility
-        class Result:
-            def __init__(self, returncode, stdout, stderr):
-                self.returncode = returncode
-                self.stdout = stdout
-                self.stderr = stderr
-        
-        result = Result(return_code, '\n'.join(stdout_lines), '\n'.join(stderr_lines))
-        
-        if result.returncode == 0:
-            logger.info("[LOAD_PROBABILITIES] Successfully loaded probabilities data")
-            # Extract and log key progress information from stdout
-            if result.stdout:
-                stdout_lines = result.stdout.strip().split('\n')
-                # Find heartbeat and commit lines
-                progress_lines = [line for line in stdout_lines if any(keyword in line.lower() for keyword in ['heartbeat', 'commit', 'done', 'start'])]
-                if progress_lines:
-                    logger.info(f"[LOAD_PROBABILITIES] Progress summary from script:")
-                    # Show start, some middle heartbeats, and final result
-                    if len(progress_lines) > 0:
-                        logger.info(f"[LOAD_PROBABILITIES]   {progress_lines[0]}")  # Start
-                    if len(progress_lines) > 1:
-                        # Show a few middle ones if there are many
-                        if len(progress_lines) > 5:
-                            for line in progress_lines[1:4]:
-                                logger.info(f"[LOAD_PROBABILITIES]   {line}")
-                            logger.info(f"[LOAD_PROBABILITIES]   ... (processing continues) ...")
-                        # Show last few
-                        for line in progress_lines[-3:]:
-                            logger.info(f"[LOAD_PROBABILITIES]   {line}")
-                else:
-                    # Fallback: show last 10 lines
-                    logger.debug(f"[LOAD_PROBABILITIES] Last 10 output lines:")
-                    for line in stdout_lines[-10:]:
-                        logger.debug(f"[LOAD_PROBABILITIES]   {line}")
-            return True, "Loaded probabilities data"
-        else:
-            logger.error(f"[LOAD_PROBABILITIES] Command failed with return code {result.returncode}")
-            logger.error(f"[LOAD_PROBABILITIES] Stderr: {result.stderr}")
-            logger.error(f"[LOAD_PROBABILITIES] Stdout (last 1000 chars): {result.stdout[-1000:]}")
-            return False, f"Error loading probabilities (code {result.returncode}): {result.stderr}"
-    except subprocess.TimeoutExpired as e:
-        logger.error("[LOAD_PROBABILITIES] Timeout after 600 seconds")
-        logger.error(f"[LOAD_PROBABILITIES] Timeout exception: {str(e)}")
-        return False, "Timeout loading probabilities"
+        logger.info(f"[LOAD_PROBABILITIES] Load completed in {elapsed:.2f} seconds ({elapsed/60:.2f} minutes)")
+        logger.info("[LOAD_PROBABILITIES] Successfully loaded probabilities data")
+        return True, "Loaded probabilities data"
     except Exception as e:
         logger.error(f"[LOAD_PROBABILITIES] Exception loading probabilities: {str(e)}", exc_info=True)
-        return False, f"Exception: {str(e)}"
+        return False, f"Error loading probabilities: {str(e)}"
 
 
 def get_new_games_from_scoreboard(repo_root: Path, days_back: int = 7) -> list[dict[str, Any]]:
@@ -1211,61 +879,39 @@ def get_new_games_from_scoreboard(repo_root: Path, days_back: int = 7) -> list[d
     return new_games
 
 
-def run_update_task() -> dict[str, Any]:
+# Per-step budgets, carried over from the subprocess runner's timeouts (fetch scoreboards: 180s per
+# date x 7; Kalshi: fetch + load). The probabilities fetch used 60s per game; the step gets a fixed budget.
+UPDATE_STEP_TIMEOUT_SECONDS: dict[str, float] = {
+    "fetch_scoreboards": 7 * 180,
+    "load_scoreboards": 300,
+    "fetch_probabilities": 1800,
+    "load_probabilities": 600,
+    "kalshi_markets": 300 + 300,
+    "kalshi_candlesticks": 600 + 600,
+    "materialize_event_state": 1800,
+    "refresh_snapshot_features": 600,
+}
+
+
+def _require_step(success: bool, message: str) -> str:
+    """Adapt a (success, message) step helper to the pipeline contract: raise on failure."""
+    if not success:
+        raise RuntimeError(message)
+    return message
+
+
+def _build_update_pipeline(repo_root: Path, results: dict[str, Any]) -> list[PipelineStep]:
     """
-    Run the full update task.
-    
-    Note: This function uses a lock to prevent concurrent execution.
-    The scripts are idempotent (use UPSERT), but running multiple updates
-    simultaneously wastes resources.
+    Update DAG. The ESPN branch (scoreboards -> probabilities) and the Kalshi branch
+    (markets -> candlesticks) are independent and run concurrently. Candlesticks follow
+    markets because fetch_all_candlesticks.ts selects tickers from kalshi.markets.
+    Both branches join at the snapshot-features refresh, which only touches games marked dirty:
+    by the materializer for new snapshots, by the Kalshi loaders for new candles or market mappings.
     """
-    global _update_task_running
-    
-    # Acquire lock to prevent concurrent execution
-    if not _update_task_lock.acquire(blocking=False):
-        logger.warning("[UPDATE_TASK] Another update task is already running, skipping")
-        return {
-            "status": "skipped",
-            "message": "Update task is already running",
-            "start_time": datetime.now().isoformat()
-        }
-    
-    try:
-        _update_task_running = True
-        update_start_time = datetime.now()
-        logger.info("=" * 80)
-        logger.info("[UPDATE_TASK] Starting data update task")
-        logger.info(f"[UPDATE_TASK] Start time: {update_start_time.isoformat()}")
-        logger.info("=" * 80)
-        
-        repo_root = get_repo_root()
-        logger.info(f"[UPDATE_TASK] Repository root: {repo_root}")
-        logger.debug(f"[UPDATE_TASK] Repository root exists: {repo_root.exists()}")
-        
-        results = {
-            "scoreboard_fetched": 0,
-            "scoreboard_loaded": False,
-            "probabilities_fetched": 0,
-            "probabilities_loaded": False,
-            "kalshi_markets_fetched": False,
-            "kalshi_markets_loaded": False,
-            "kalshi_candlesticks_fetched": False,
-            "kalshi_candlesticks_loaded": False,
-            "errors": [],
-            "start_time": update_start_time.isoformat(),
-            "end_time": None,
-            "duration_seconds": None
-        }
-        
-        # Step 1: Fetch scoreboards for last 7 days
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("[UPDATE_TASK] Step 1: Fetching ESPN scoreboards for last 7 days")
-        logger.info("=" * 80)
-        step1_start = datetime.now()
+
+    def fetch_scoreboards(upstream: dict[str, Any]) -> str:
         today = date.today()
         logger.info(f"[UPDATE_TASK] Today's date: {today}")
-        
         for i in range(7):
             check_date = today - timedelta(days=i)
             date_str = check_date.strftime("%Y%m%d")
@@ -1273,60 +919,27 @@ def run_update_task() -> dict[str, Any]:
             success, message = fetch_espn_scoreboard_for_date(date_str, repo_root)
             if success:
                 results["scoreboard_fetched"] += 1
-                logger.info(f"[UPDATE_TASK] ✓ Successfully processed scoreboard for {date_str}")
             else:
                 results["errors"].append(f"Scoreboard {date_str}: {message}")
                 logger.warning(f"[UPDATE_TASK] ✗ Failed to process scoreboard for {date_str}: {message}")
-        
-        step1_elapsed = (datetime.now() - step1_start).total_seconds()
-        logger.info(f"[UPDATE_TASK] Step 1 completed in {step1_elapsed:.2f} seconds")
-        logger.info(f"[UPDATE_TASK] Step 1 results: {results['scoreboard_fetched']}/7 scoreboards fetched")
-        
-        # Step 2: Load scoreboards into DB
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("[UPDATE_TASK] Step 2: Loading scoreboards into database")
-        logger.info("=" * 80)
-        step2_start = datetime.now()
-        
+        return f"{results['scoreboard_fetched']}/7 scoreboards fetched"
+
+    def load_scoreboards(upstream: dict[str, Any]) -> str:
         # Get latest scoreboard date to optimize loading
         latest_scoreboard_date = get_latest_espn_scoreboard_date()
-        if latest_scoreboard_date:
+        if latest_scoreboard_date and latest_scoreboard_date > date.today():
             # Safety check: if date is in the future, ignore it (data issue)
-            today = date.today()
-            if latest_scoreboard_date > today:
-                logger.warning(f"[UPDATE_TASK] Latest scoreboard date ({latest_scoreboard_date}) is in the future, ignoring and processing all files")
-                latest_scoreboard_date = None
-            else:
-                logger.info(f"[UPDATE_TASK] Latest scoreboard date in DB: {latest_scoreboard_date}")
-                logger.info(f"[UPDATE_TASK] Only processing scoreboard files after {latest_scoreboard_date}")
-        else:
-            logger.info(f"[UPDATE_TASK] No existing scoreboard data, processing all files")
-        
-        success, message = load_espn_scoreboard(repo_root, min_date=latest_scoreboard_date)
-        results["scoreboard_loaded"] = success
-        if not success:
-            results["errors"].append(f"Load scoreboard: {message}")
-            logger.error(f"[UPDATE_TASK] ✗ Step 2 failed: {message}")
-        else:
-            logger.info(f"[UPDATE_TASK] ✓ Step 2 succeeded: {message}")
-        step2_elapsed = (datetime.now() - step2_start).total_seconds()
-        logger.info(f"[UPDATE_TASK] Step 2 completed in {step2_elapsed:.2f} seconds")
-        
-        # Step 3: Identify new games and fetch probabilities
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("[UPDATE_TASK] Step 3: Identifying new games and fetching probabilities")
-        logger.info("=" * 80)
-        step3_start = datetime.now()
+            logger.warning(f"[UPDATE_TASK] Latest scoreboard date ({latest_scoreboard_date}) is in the future, ignoring and processing all files")
+            latest_scoreboard_date = None
+        if latest_scoreboard_date:
+            logger.info(f"[UPDATE_TASK] Only processing scoreboard files after {latest_scoreboard_date}")
+        message = _require_step(*load_espn_scoreboard(repo_root, min_date=latest_scoreboard_date))
+        results["scoreboard_loaded"] = True
+        return message
+
+    def fetch_probabilities(upstream: dict[str, Any]) -> str:
         new_games = get_new_games_from_scoreboard(repo_root, days_back=7)
         logger.info(f"[UPDATE_TASK] Found {len(new_games)} new games to fetch")
-        
-        if new_games:
-            logger.info(f"[UPDATE_TASK] New games list:")
-            for idx, game in enumerate(new_games, 1):
-                logger.info(f"[UPDATE_TASK]   {idx}. Event {game['event_id']}, Competition {game['competition_id']}, Date {game['date']}")
-        
         for idx, game in enumerate(new_games, 1):
             logger.info(f"[UPDATE_TASK] Processing probabilities {idx}/{len(new_games)}: event_id={game['event_id']}, competition_id={game['competition_id']}, date={game['date']}")
             success, message = fetch_espn_probabilities_for_game(
@@ -1337,95 +950,143 @@ def run_update_task() -> dict[str, Any]:
             )
             if success:
                 results["probabilities_fetched"] += 1
-                logger.info(f"[UPDATE_TASK] ✓ Successfully fetched probabilities for {game['event_id']}")
             else:
                 results["errors"].append(f"Fetch probabilities {game['event_id']}: {message}")
                 logger.warning(f"[UPDATE_TASK] ✗ Failed to fetch probabilities for {game['event_id']}: {message}")
-        
-        step3_elapsed = (datetime.now() - step3_start).total_seconds()
-        logger.info(f"[UPDATE_TASK] Step 3 completed in {step3_elapsed:.2f} seconds")
-        logger.info(f"[UPDATE_TASK] Step 3 results: {results['probabilities_fetched']}/{len(new_games)} probabilities fetched")
-        
-        # Step 4: Load probabilities into DB
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("[UPDATE_TASK] Step 4: Loading probabilities into database")
-        logger.info("=" * 80)
-        step4_start = datetime.now()
-        
-        # Determine current season to only load recent data (much faster!)
+        return f"{results['probabilities_fetched']}/{len(new_games)} probabilities fetched"
+
+    def load_probabilities(upstream: dict[str, Any]) -> str:
+        # Current season only, and only files modified since the latest loaded row
         current_season = get_current_season()
-        logger.info(f"[UPDATE_TASK] Loading probabilities for current season only: {current_season}")
-        
-        # Get latest probability date to optimize loading
         latest_prob_date = get_latest_espn_probability_date()
         if latest_prob_date:
-            logger.info(f"[UPDATE_TASK] Latest probability date in DB: {latest_prob_date}")
             logger.info(f"[UPDATE_TASK] Only processing probability files modified after {latest_prob_date}")
-        else:
-            logger.info(f"[UPDATE_TASK] No existing probability data, processing all files")
-        
-        logger.info(f"[UPDATE_TASK] This will process only new/modified files (much faster!)")
-        
-        success, message = load_espn_probabilities(repo_root, season_label=current_season, min_date=latest_prob_date)
-        results["probabilities_loaded"] = success
-        if not success:
-            results["errors"].append(f"Load probabilities: {message}")
-            logger.error(f"[UPDATE_TASK] ✗ Step 4 failed: {message}")
-        else:
-            logger.info(f"[UPDATE_TASK] ✓ Step 4 succeeded: {message}")
-        step4_elapsed = (datetime.now() - step4_start).total_seconds()
-        logger.info(f"[UPDATE_TASK] Step 4 completed in {step4_elapsed:.2f} seconds")
-        
-        # Step 5: Fetch and load Kalshi markets
-        logger.info("")
+        message = _require_step(*load_espn_probabilities(repo_root, season_label=current_season, min_date=latest_prob_date))
+        results["probabilities_loaded"] = True
+        return message
+
+    def kalshi_markets(upstream: dict[str, Any]) -> str:
+        message = _require_step(*fetch_and_load_kalshi_markets(repo_root))
+        results["kalshi_markets_fetched"] = True
+        results["kalshi_markets_loaded"] = True
+        return message
+
+    def kalshi_candlesticks(upstream: dict[str, Any]) -> str:
+        message = _require_step(*fetch_and_load_kalshi_candlesticks(repo_root))
+        results["kalshi_candlesticks_fetched"] = True
+        results["kalshi_candlesticks_loaded"] = True
+        return message
+
+    def materialize_event_state(upstream: dict[str, Any]) -> str:
+        # Watermarked per game: unchanged games are skipped, in-progress games get only their new snapshots
+        current_season = get_current_season()
+        argv = [
+            "--season-label", current_season,
+            "--probabilities-dir", str(repo_root / "data" / "raw" / "espn" / "probabilities" / current_season),
+            "--plays-dir", str(repo_root / "data" / "raw" / "espn" / "plays" / current_season),
+        ]
+        call_script_main(materialize_event_state_script.main, argv)
+        return f"prob_event_state materialized for {current_season}"
+
+    def refresh_snapshot_features(upstream: dict[str, Any]) -> str:
+        call_script_main(refresh_snapshot_features_script.main, [])
+        return "snapshot features refreshed"
+
+    timeouts = UPDATE_STEP_TIMEOUT_SECONDS
+    return [
+        PipelineStep("fetch_scoreboards", fetch_scoreboards, timeout_seconds=timeouts["fetch_scoreboards"]),
+        PipelineStep("load_scoreboards", load_scoreboards, depends_on=("fetch_scoreboards",),
+                     timeout_seconds=timeouts["load_scoreboards"]),
+        PipelineStep("fetch_probabilities", fetch_probabilities, depends_on=("fetch_scoreboards",),
+                     timeout_seconds=timeouts["fetch_probabilities"]),
+        PipelineStep("load_probabilities", load_probabilities, depends_on=("fetch_probabilities",),
+                     timeout_seconds=timeouts["load_probabilities"]),
+        PipelineStep("kalshi_markets", kalshi_markets, timeout_seconds=timeouts["kalshi_markets"]),
+        PipelineStep("kalshi_candlesticks", kalshi_candlesticks, depends_on=("kalshi_markets",),
+                     timeout_seconds=timeouts["kalshi_candlesticks"]),
+        PipelineStep("materialize_event_state", materialize_event_state, depends_on=("load_probabilities",),
+                     timeout_seconds=timeouts["materialize_event_state"]),
+        PipelineStep(
+            "refresh_snapshot_features",
+            refresh_snapshot_features,
+            depends_on=("materialize_event_state", "kalshi_candlesticks"),
+            timeout_seconds=timeouts["refresh_snapshot_features"],
+        ),
+    ]
+
+
+def run_update_task() -> dict[str, Any]:
+    """
+    Run the full update task.
+    
+    Steps run in-process as a DAG (see _build_update_pipeline) sharing one Postgres
+    connection pool; per-step status and timing are returned under "steps". A step past
+    its timeout is reported failed, but the task only finishes (and releases the pool and
+    lock) once that step's thread has returned.
+    
+    Note: This function uses a lock to prevent concurrent execution.
+    The scripts are idempotent (use UPSERT), but running multiple updates
+    simultaneously wastes resources.
+    """
+    global _update_task_running
+    
+    # Acquire lock to prevent concurrent execution
+    if not _update_task_lock.acquire(blocking=False):
+        logger.warning("[UPDATE_TASK] Another update task is already running, skipping")
+        return {
+            "status": "skipped",
+            "message": "Update task is already running",
+            "start_time": datetime.now().isoformat()
+        }
+    
+    update_start_time = datetime.now()
+    results = {
+        "scoreboard_fetched": 0,
+        "scoreboard_loaded": False,
+        "probabilities_fetched": 0,
+        "probabilities_loaded": False,
+        "kalshi_markets_fetched": False,
+        "kalshi_markets_loaded": False,
+        "kalshi_candlesticks_fetched": False,
+        "kalshi_candlesticks_loaded": False,
+        "steps": [],
+        "errors": [],
+        "start_time": update_start_time.isoformat(),
+        "end_time": None,
+        "duration_seconds": None
+    }
+    
+    try:
+        _update_task_running = True
         logger.info("=" * 80)
-        logger.info("[UPDATE_TASK] Step 5: Fetching and loading Kalshi markets")
+        logger.info("[UPDATE_TASK] Starting data update task")
+        logger.info(f"[UPDATE_TASK] Start time: {update_start_time.isoformat()}")
         logger.info("=" * 80)
-        step5_start = datetime.now()
-        
-        # Get latest Kalshi market date to optimize
-        latest_kalshi_date = get_latest_kalshi_market_date()
-        if latest_kalshi_date:
-            logger.info(f"[UPDATE_TASK] Latest Kalshi market date in DB: {latest_kalshi_date}")
-        else:
-            logger.info(f"[UPDATE_TASK] No existing Kalshi market data")
         
-        success, message = fetch_and_load_kalshi_markets(repo_root)
-        results["kalshi_markets_fetched"] = success
-        results["kalshi_markets_loaded"] = success
-        if not success:
-            results["errors"].append(f"Kalshi markets: {message}")
-            logger.error(f"[UPDATE_TASK] ✗ Step 5 failed: {message}")
-        else:
-            logger.info(f"[UPDATE_TASK] ✓ Step 5 succeeded: {message}")
-        step5_elapsed = (datetime.now() - step5_start).total_seconds()
-        logger.info(f"[UPDATE_TASK] Step 5 completed in {step5_elapsed:.2f} seconds")
+        repo_root = get_repo_root()
+        logger.info(f"[UPDATE_TASK] Repository root: {repo_root}")
         
-        # Step 6: Fetch and load Kalshi candlesticks
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("[UPDATE_TASK] Step 6: Fetching and loading Kalshi candlesticks")
-        logger.info("=" * 80)
-        step6_start = datetime.now()
+        dsn = os.environ.get("DATABASE_URL")
+        if not dsn:
+            raise ValueError("DATABASE_URL environment variable not set")
         
-        # Get latest candlestick date to optimize
-        latest_candle_date = get_latest_kalshi_candlestick_date()
-        if latest_candle_date:
-            logger.info(f"[UPDATE_TASK] Latest Kalshi candlestick date in DB: {latest_candle_date}")
-        else:
-            logger.info(f"[UPDATE_TASK] No existing Kalshi candlestick data")
+        def on_step(step: StepResult) -> None:
+            if step.status == "succeeded":
+                logger.info(f"[UPDATE_TASK] ✓ {step.name} succeeded in {step.elapsed_seconds:.2f}s: {step.value}")
+            elif step.status == "failed":
+                results["errors"].append(f"{step.name}: {step.error}")
+                logger.error(f"[UPDATE_TASK] ✗ {step.name} failed in {step.elapsed_seconds:.2f}s: {step.error}")
+            else:
+                logger.warning(f"[UPDATE_TASK] ⏭️  {step.name} skipped: {step.error}")
         
-        success, message = fetch_and_load_kalshi_candlesticks(repo_root)
-        results["kalshi_candlesticks_fetched"] = success
-        results["kalshi_candlesticks_loaded"] = success
-        if not success:
-            results["errors"].append(f"Kalshi candlesticks: {message}")
-            logger.error(f"[UPDATE_TASK] ✗ Step 6 failed: {message}")
-        else:
-            logger.info(f"[UPDATE_TASK] ✓ Step 6 succeeded: {message}")
-        step6_elapsed = (datetime.now() - step6_start).total_seconds()
-        logger.info(f"[UPDATE_TASK] Step 6 completed in {step6_elapsed:.2f} seconds")
+        with shared_connection_pool(ConnectionPool(dsn, max_size=4)):
+            report = run_pipeline(_build_update_pipeline(repo_root, results), max_workers=4, on_step=on_step)
+            # A timed-out step's thread keeps running: hold the pool and the update lock until it returns,
+            # so it isn't cut off mid-write and the next update can't run the same loader alongside it
+            if report.still_running():
+                logger.warning(f"[UPDATE_TASK] Waiting for timed-out steps to return: {', '.join(report.still_running())}")
+                report.wait_abandoned()
+        results["steps"] = report.as_dict()["steps"]
         
         # Final summary
         update_end_time = datetime.now()
@@ -1438,6 +1099,9 @@ def run_update_task() -> dict[str, Any]:
         logger.info("[UPDATE_TASK] Update task completed")
         logger.info("=" * 80)
         logger.info(f"[UPDATE_TASK] Total duration: {total_duration:.2f} seconds ({total_duration/60:.2f} minutes)")
+        logger.info(f"[UPDATE_TASK] Step timings:")
+        for step in report.steps:
+            logger.info(f"[UPDATE_TASK]   - {step.name}: {step.status} ({step.elapsed_seconds:.2f}s)")
         logger.info(f"[UPDATE_TASK] Results summary:")
         logger.info(f"[UPDATE_TASK]   - Scoreboards fetched: {results['scoreboard_fetched']}/7")
         logger.info(f"[UPDATE_TASK]   - Scoreboards loaded: {results['scoreboard_loaded']}")
@@ -1452,23 +1116,11 @@ def run_update_task() -> dict[str, Any]:
                 logger.warning(f"[UPDATE_TASK]   - {error}")
         logger.info("=" * 80)
         
-        # Clear games cache after successful update
+        # Rebuild the game catalog on the next request instead of waiting for its version check
         if results["probabilities_loaded"] or results["scoreboard_loaded"]:
             logger.info("")
-            logger.info("[UPDATE_TASK] Clearing games endpoint cache to ensure fresh data...")
-            try:
-                cache_dir = Path(__file__).parent.parent.parent / ".cache"
-                cache_file = cache_dir / "list_games.cache"
-                
-                if cache_file.exists():
-                    cache_instance = SimpleCache(ttl_seconds=86400, cache_file="list_games.cache")
-                    cache_size = len(cache_instance.cache)
-                    cache_instance.clear()
-                    logger.info(f"[UPDATE_TASK] ✓ Games cache cleared ({cache_size} entries removed)")
-                else:
-                    logger.debug("[UPDATE_TASK] No cache file to clear")
-            except Exception as e:
-                logger.warning(f"[UPDATE_TASK] Failed to clear cache: {e}")
+            seasons_dropped = get_game_catalog().invalidate()
+            logger.info(f"[UPDATE_TASK] ✓ Game catalog invalidated ({seasons_dropped} seasons dropped)")
         
         return results
         
@@ -1510,28 +1162,12 @@ def clear_games_cache() -> dict[str, Any]:
         
         logger.debug(f"[CLEAR_CACHE] Cache directory: {cache_dir}")
         
-        # Clear games cache
-        games_cache_size_before = 0
-        games_cache_cleared = False
-        
-        try:
-            if hasattr(games.list_games, '_cache_instance'):
-                actual_cache = games.list_games._cache_instance
-                games_cache_size_before = len(actual_cache.cache)
-                logger.info(f"[CLEAR_CACHE] Found games endpoint cache instance: {games_cache_size_before} entries")
-                actual_cache.clear()
-                games_cache_cleared = True
-                logger.info(f"[CLEAR_CACHE] Cleared in-memory cache from games endpoint")
-            else:
-                logger.warning(f"[CLEAR_CACHE] Games endpoint cache instance not found, creating new instance to clear file")
-                # Fallback: create new instance and clear it
-                cache_instance = SimpleCache(ttl_seconds=86400, cache_file="list_games.cache")
-                games_cache_size_before = len(cache_instance.cache)
-                cache_instance.clear()
-        except Exception as e:
-            logger.warning(f"[CLEAR_CACHE] Error accessing games cache instance: {e}")
+        # Clear games catalog
+        games_cache_size_before = get_game_catalog().invalidate()
+        games_cache_cleared = True
+        logger.info(f"[CLEAR_CACHE] Invalidated game catalog: {games_cache_size_before} seasons dropped")
         
-        # Also delete the games cache file to force fresh load on next request
+        # Also delete the games cache file left behind by older versions
         if games_cache_file.exists():
             games_cache_file.unlink()
             logger.info(f"[CLEAR_CACHE] Games cache file deleted: {games_cache_file}")
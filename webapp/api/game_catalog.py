@@ -0,0 +1,391 @@
+"""
+In-memory game catalog behind /api/games and bulk simulation.
+
+Design Pattern: Read-through cache keyed on a data version
+Algorithm: One aggregate query per season, then presorted index orderings with keyset pagination (bisect)
+Big O: O(n log n) per season rebuild; O(log n + k) per page of k games once a filter view exists
+
+The catalog loads every listable game of a season with the aggregate query list_games used to run per
+request (without COUNT(*) wrapper, ORDER BY or LIMIT), keeps it in memory, and serves filtering, sorting
+and pagination from precomputed orderings. The data version is the pg_stat change markers of the source
+tables (scripts/lib/_feature_cache_lib.source_watermarks), checked at most every VERSION_CHECK_SECONDS;
+when it moves, all seasons are rebuilt lazily. Writers that know they changed the data (the update task)
+call invalidate() to skip the wait.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+import sys
+import threading
+import time
+from contextlib import AbstractContextManager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .db import get_db_connection
+from .logging_config import get_logger
+
+repo_root_dir = Path(__file__).parent.parent.parent
+if str(repo_root_dir) not in sys.path:
+    sys.path.insert(0, str(repo_root_dir))
+from scripts.lib._feature_cache_lib import source_watermarks
+
+logger = get_logger(__name__)
+
+# Tables the catalog query reads; any write to one of them moves the data version.
+CATALOG_SOURCE_TABLES: tuple[str, ...] = (
+    "espn.probabilities_raw_items",
+    "kalshi.markets",
+    "espn.prob_event_state",
+    "espn.scoreboard_games",
+)
+
+SORT_FIELDS: tuple[str, ...] = ("date", "volatility", "std_dev", "range", "score")
+
+# How stale the catalog may be before the next request re-reads the data version.
+VERSION_CHECK_SECONDS = 30.0
+
+# Filtered orderings kept per season snapshot (team/date filter combinations).
+MAX_VIEWS = 256
+
+# Games with Kalshi markets and >100 ESPN probability rows in a season, with outcome and team metadata.
+GAMES_SQL = """
+WITH kalshi_games AS MATERIALIZED (
+  SELECT DISTINCT km.espn_event_id
+  FROM kalshi.markets km
+  WHERE km.espn_event_id IS NOT NULL
+),
+game_stats AS MATERIALIZED (
+  SELECT
+      p.game_id,
+      p.season_label,
+      COUNT(*) as prob_count,
+      MAX(p.created_at) as last_updated,
+      MIN(p.home_win_percentage) as min_prob,
+      MAX(p.home_win_percentage) as max_prob,
+      AVG(p.home_win_percentage) as mean_prob,
+      STDDEV(p.home_win_percentage) as std_dev,
+      MAX(p.home_win_percentage) - MIN(p.home_win_percentage) as prob_range
+  FROM espn.probabilities_raw_items p
+  JOIN kalshi_games kg
+    ON kg.espn_event_id = p.game_id
+  WHERE p.season_label = %s
+  GROUP BY p.game_id, p.season_label
+  HAVING COUNT(*) > 100
+),
+game_outcomes AS MATERIALIZED (
+  -- Prefer prob_event_state for final scores/winner; fallback to scoreboard_games.
+  SELECT
+      COALESCE(pe.game_id, sg.event_id) AS game_id,
+      COALESCE(pe.final_home_score, sg.home_score) AS final_home_score,
+      COALESCE(pe.final_away_score, sg.away_score) AS final_away_score,
+      COALESCE(
+        pe.winner,
+        CASE
+          WHEN sg.home_score > sg.away_score THEN 1
+          WHEN sg.away_score > sg.home_score THEN 0
+          ELSE NULL
+        END
+      ) AS winner
+  FROM (
+      SELECT
+          e.game_id,
+          MAX(e.home_score) AS final_home_score,
+          MAX(e.away_score) AS final_away_score,
+          MAX(e.final_winning_team) AS winner
+      FROM espn.prob_event_state e
+      GROUP BY e.game_id
+  ) pe
+  FULL OUTER JOIN espn.scoreboard_games sg
+    ON pe.game_id = sg.event_id
+)
+SELECT
+    g.game_id,
+    g.season_label,
+    g.prob_count,
+    g.last_updated,
+    o.final_home_score,
+    o.final_away_score,
+    o.winner,
+    sg.home_team_abbrev,
+    sg.away_team_abbrev,
+    sg.home_team_display_name,
+    sg.away_team_display_name,
+    sg.event_date,
+    true AS has_kalshi,
+    g.min_prob,
+    g.max_prob,
+    g.mean_prob,
+    g.std_dev,
+    g.prob_range
+FROM game_stats g
+LEFT JOIN game_outcomes o
+  ON g.game_id = o.game_id
+LEFT JOIN espn.scoreboard_games sg
+  ON g.game_id = sg.event_id
+WHERE (
+    (o.final_home_score IS NOT NULL
+     AND (o.final_home_score > 0 OR o.final_away_score > 0))
+    OR sg.event_id IS NOT NULL
+  )
+"""
+
+# (null-last flag, signed sort value, game_id): ascending tuple order == requested order, NULLS LAST
+SortKey = tuple[int, float, str]
+
+
+def _float_or_none(v: Any) -> Optional[float]:
+    return float(v) if v is not None else None
+
+
+def game_from_row(row: tuple) -> dict[str, Any]:
+    """API representation of one GAMES_SQL row (the /api/games item shape)."""
+    return {
+        "game_id": str(row[0]),
+        "season": row[1],
+        "prob_count": row[2],
+        "last_updated": row[3].isoformat() if row[3] else None,
+        "final_home_score": row[4],
+        "final_away_score": row[5],
+        "home_won": row[6] == 0 if row[6] is not None else None,
+        "home_team_abbr": row[7] or "HOME",
+        "away_team_abbr": row[8] or "AWAY",
+        "home_team_name": row[9] or "Home Team",
+        "away_team_name": row[10] or "Away Team",
+        "game_date": row[11].isoformat() if row[11] else None,
+        "has_kalshi": row[12],
+        # Lightweight stats (calculated in SQL)
+        "stats": {
+            "min_probability": _float_or_none(row[13]),
+            "max_probability": _float_or_none(row[14]),
+            "mean_probability": _float_or_none(row[15]),
+            "standard_deviation": _float_or_none(row[16]),
+            "probability_range": _float_or_none(row[17]),
+        },
+    }
+
+
+def _timestamp(v: Any) -> Optional[float]:
+    if v is None:
+        return None
+    if isinstance(v, datetime):
+        return v.timestamp()
+    if isinstance(v, date):
+        return float(v.toordinal())
+    return float(v)
+
+
+def _sort_values(row: tuple) -> dict[str, Optional[float]]:
+    score = row[4] + row[5] if row[4] is not None and row[5] is not None else None
+    std_dev = _float_or_none(row[16])
+    return {
+        "date": _timestamp(row[11]),
+        "volatility": std_dev,  # std_dev as proxy for volatility
+        "std_dev": std_dev,
+        "range": _float_or_none(row[17]),
+        "score": _float_or_none(score),
+    }
+
+
+def _sort_key(value: Optional[float], game_id: str, descending: bool) -> SortKey:
+    if value is None:
+        return (1, 0.0, game_id)
+    return (0, -value if descending else value, game_id)
+
+
+def encode_cursor(sort_by: str, descending: bool, key: SortKey) -> str:
+    payload = json.dumps([sort_by, int(descending), *key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> SortKey:
+    """Sort key of the last game on the previous page; ValueError if malformed or for another ordering."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        c_sort, c_desc, flag, value, game_id = json.loads(raw)
+        key: SortKey = (int(flag), float(value), str(game_id))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from None
+    if c_sort != sort_by or bool(c_desc) != descending:
+        raise ValueError("Cursor was issued for a different sort order")
+    return key
+
+
+def _bound_like(event: Any, bound: datetime) -> Any:
+    # Naive bounds are read in the timezone the database returned the timestamp in (as SQL would).
+    if isinstance(event, datetime):
+        return bound.replace(tzinfo=event.tzinfo) if event.tzinfo is not None else bound
+    return bound.date()
+
+
+class SeasonSnapshot:
+    """All listable games of one season at one data version, with per-sort orderings and filter views."""
+
+    def __init__(self, season: str, rows: list[tuple]) -> None:
+        self.season = season
+        self.games: list[dict[str, Any]] = [game_from_row(r) for r in rows]
+        self._event_dates: list[Any] = [r[11] for r in rows]
+        self._teams: list[tuple[Optional[str], Optional[str]]] = [(r[7], r[8]) for r in rows]
+        self._values: list[dict[str, Optional[float]]] = [_sort_values(r) for r in rows]
+        self._orders: dict[tuple[str, bool], tuple[list[int], list[SortKey]]] = {}
+        self._views: dict[tuple, tuple[list[int], list[SortKey]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def _order(self, sort_by: str, descending: bool) -> tuple[list[int], list[SortKey]]:
+        key = (sort_by, descending)
+        if key not in self._orders:
+            keyed = sorted(
+                (_sort_key(v[sort_by], g["game_id"], descending), i)
+                for i, (v, g) in enumerate(zip(self._values, self.games))
+            )
+            self._orders[key] = ([i for _, i in keyed], [k for k, _ in keyed])
+        return self._orders[key]
+
+    def view(
+        self,
+        sort_by: str,
+        descending: bool,
+        team: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> tuple[list[int], list[SortKey]]:
+        """Game indices matching the filters in the requested order, with their sort keys (memoized)."""
+        vkey = (sort_by, descending, team, date_from, date_to)
+        with self._lock:
+            hit = self._views.get(vkey)
+            if hit is not None:
+                return hit
+            indices, keys = self._order(sort_by, descending)
+            if team or date_from or date_to:
+                keep = [
+                    j for j, i in enumerate(indices)
+                    if (not team or team in self._teams[i])
+                    and (date_from is None or (self._event_dates[i] is not None and self._event_dates[i] >= _bound_like(self._event_dates[i], date_from)))
+                    and (date_to is None or (self._event_dates[i] is not None and self._event_dates[i] <= _bound_like(self._event_dates[i], date_to)))
+                ]
+                indices, keys = [indices[j] for j in keep], [keys[j] for j in keep]
+            if len(self._views) >= MAX_VIEWS:
+                self._views.clear()
+            self._views[vkey] = (indices, keys)
+            return indices, keys
+
+    def page(
+        self,
+        *,
+        sort_by: str = "date",
+        sort_order: str = "desc",
+        team: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: Optional[int] = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        One page of games: {games, total, offset, has_more, next_cursor}.
+
+        Unknown sort fields fall back to date and unknown orders to desc (as the SQL version did). With a
+        cursor (next_cursor of the previous page) the page starts right after that game's sort key, which
+        stays correct when games are added or removed between requests; offset is then ignored and the
+        response reports the page's actual position. limit=None returns every remaining game.
+        """
+        sort_by = sort_by.lower() if sort_by and sort_by.lower() in SORT_FIELDS else "date"
+        descending = str(sort_order).lower() != "asc"
+        indices, keys = self.view(sort_by, descending, team.upper() if team else None, date_from, date_to)
+        start = offset if cursor is None else bisect.bisect_right(keys, decode_cursor(cursor, sort_by, descending))
+        end = len(indices) if limit is None else min(start + limit, len(indices))
+        games = [{**self.games[i], "stats": dict(self.games[i]["stats"])} for i in indices[start:end]]
+        has_more = end < len(indices)
+        return {
+            "games": games,
+            "total": len(indices),
+            "offset": start,
+            "has_more": has_more,
+            "next_cursor": encode_cursor(sort_by, descending, keys[end - 1]) if has_more and end > start else None,
+        }
+
+
+def data_version(conn: Any) -> tuple:
+    """Change marker of everything the catalog query reads."""
+    return tuple(sorted(source_watermarks(conn, CATALOG_SOURCE_TABLES).items()))
+
+
+class GameCatalog:
+    """
+    Process-wide season snapshots, rebuilt when the data version changes.
+
+    connect is a context manager factory yielding a psycopg connection (get_db_connection by default).
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], AbstractContextManager[Any]] = get_db_connection,
+        *,
+        check_interval: float = VERSION_CHECK_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._seasons: dict[str, SeasonSnapshot] = {}
+        self._version: Optional[tuple] = None
+        self._checked_at: Optional[float] = None
+
+    def snapshot(self, season: str) -> SeasonSnapshot:
+        """Current snapshot of a season (one version check per check_interval, one query per rebuild)."""
+        with self._lock:
+            now = self._clock()
+            due = self._checked_at is None or now - self._checked_at >= self.check_interval
+            snap = self._seasons.get(season)
+            if snap is not None and not due:
+                return snap
+            with self._connect() as conn:
+                if due:
+                    version = data_version(conn)
+                    self._checked_at = now
+                    if version != self._version:
+                        if self._version is not None:
+                            logger.info("Game catalog data version changed; rebuilding seasons on demand")
+                        self._seasons.clear()
+                        self._version = version
+                snap = self._seasons.get(season)
+                if snap is None:
+                    start = time.time()
+                    snap = SeasonSnapshot(season, conn.execute(GAMES_SQL, (season,)).fetchall())
+                    self._seasons[season] = snap
+                    logger.info(f"[TIMING] game catalog - built season {season}: {len(snap)} games in {time.time() - start:.3f}s")
+            return snap
+
+    def query(self, season: str, **kwargs: Any) -> dict[str, Any]:
+        """SeasonSnapshot.page() on the current snapshot of `season`."""
+        return self.snapshot(season).page(**kwargs)
+
+    def invalidate(self) -> int:
+        """Drop all snapshots and force a version check on the next request; returns the number dropped."""
+        with self._lock:
+            n = len(self._seasons)
+            self._seasons.clear()
+            self._version = None
+            self._checked_at = None
+            return n
+
+
+_catalog: Optional[GameCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_game_catalog() -> GameCatalog:
+    """The process-wide GameCatalog."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = GameCatalog()
+        return _catalog
@@ -0,0 +1,536 @@
+"""
+Durable background jobs for CPU-heavy analysis (grid search, bulk simulation).
+
+Design Pattern: Job Queue (persistent table) + Worker Processes + Dispatcher thread
+Algorithm: Jobs are rows in a SQLite table (data/jobs/jobs.sqlite3) so they survive API restarts.
+           A dispatcher thread in each API process claims queued jobs - never more than
+           MAX_CONCURRENT_JOBS running across all API processes - and runs each in its own spawned
+           worker process, so analysis never competes with request handling for the GIL.
+           Workers report progress and poll for cancellation through the table; results are written
+           to data/jobs/results/<job_id>.json. Identical requests (same kind + key) share the active job.
+           Dispatchers heartbeat their running jobs; jobs whose dispatcher stopped heartbeating (crash,
+           redeploy) are re-queued, up to MAX_ATTEMPTS.
+Big O: O(1) submit / get / cancel (indexed lookups); O(r) per dispatcher tick where r = running jobs
+
+Environment Variables:
+    JOB_WORKERS: Maximum concurrently running jobs (default: 1)
+    JOBS_DIR: Directory for the job table and results (default: <repo>/data/jobs)
+"""
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from .cache import disable_disk_persistence
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+JOBS_DIR = Path(os.environ.get("JOBS_DIR", Path(__file__).parent.parent.parent / "data" / "jobs"))
+MAX_CONCURRENT_JOBS = max(1, int(os.environ.get("JOB_WORKERS", "1")))
+POLL_INTERVAL_SECONDS = 0.5
+PROGRESS_INTERVAL_SECONDS = 0.5  # Minimum spacing of progress writes from a worker
+HEARTBEAT_TIMEOUT_SECONDS = 60.0  # A running job whose dispatcher is silent this long is re-queued
+CANCEL_GRACE_SECONDS = 30.0  # Terminate a worker that hasn't honored a cancel request by then
+MAX_ATTEMPTS = 3
+RETENTION_SECONDS = 86400 * 30  # Finished jobs and their results are pruned after 30 days
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("complete", "error", "cancelled")
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS jobs (
+  id               TEXT PRIMARY KEY,
+  kind             TEXT NOT NULL,
+  key              TEXT NOT NULL,
+  params           TEXT NOT NULL,
+  status           TEXT NOT NULL,
+  progress         TEXT NOT NULL DEFAULT '{}',
+  error            TEXT,
+  cancel_requested INTEGER NOT NULL DEFAULT 0,
+  attempts         INTEGER NOT NULL DEFAULT 0,
+  owner            TEXT,
+  heartbeat_at     REAL,
+  created_at       REAL NOT NULL,
+  started_at       REAL,
+  finished_at      REAL,
+  updated_at       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_kind_key_idx ON jobs (kind, key);
+CREATE INDEX IF NOT EXISTS jobs_updated_idx ON jobs (updated_at);
+"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancellation was requested."""
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    kind: str
+    key: str
+    params: dict
+    status: str
+    progress: dict
+    error: Optional[str]
+    cancel_requested: bool
+    attempts: int
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    updated_at: float
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            id=row["id"], kind=row["kind"], key=row["key"], params=json.loads(row["params"]),
+            status=row["status"], progress=json.loads(row["progress"]), error=row["error"],
+            cancel_requested=bool(row["cancel_requested"]), attempts=row["attempts"],
+            created_at=row["created_at"], started_at=row["started_at"], finished_at=row["finished_at"],
+            updated_at=row["updated_at"],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """API view (params omitted: they can be large and the client sent them)."""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "cancel_requested": self.cancel_requested,
+            "attempts": self.attempts,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobStore:
+    """The job table and result files. Every call opens its own connection, so it is thread- and process-safe."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.db_path = self.root / "jobs.sqlite3"
+        self.results_dir = self.root / "results"
+        self._initialized = False  # Directory and schema are created on first use, not at import
+
+    def _initialize(self) -> None:
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA_SQL)
+        finally:
+            conn.close()
+        self._initialized = True
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._initialized:
+            self._initialize()
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front, so check-then-write sequences are atomic across processes
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def submit(self, kind: str, key: str, params: dict, now: Optional[float] = None) -> tuple[Job, bool]:
+        """Queue a job, or return the active job with the same kind and key. Returns (job, created)."""
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE kind = ? AND key = ? AND status IN ('queued', 'running') "
+                "ORDER BY created_at LIMIT 1",
+                (kind, key),
+            ).fetchone()
+            if row is not None:
+                return Job.from_row(row), False
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, key, params, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, key, json.dumps(params), now, now),
+            )
+            return Job.from_row(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()), True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        if not self._initialized and not self.db_path.exists():
+            return None  # Nothing was ever queued: don't create the store just to look up an ID
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def claim(self, owner: str, kinds: tuple[str, ...], limit: int, now: Optional[float] = None) -> Optional[Job]:
+        """Mark the oldest queued job of the given kinds running for owner, unless `limit` jobs already run."""
+        if not kinds:
+            return None
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            (running,) = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'running'").fetchone()
+            if running >= limit:
+                return None
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE status = 'queued' AND kind IN ({', '.join('?' * len(kinds))}) "
+                "ORDER BY created_at LIMIT 1",
+                kinds,
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat_at = ?, started_at = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (owner, now, now, now, row["id"]),
+            )
+            return Job.from_row(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+    def heartbeat(self, owner: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND owner = ?", (now, owner))
+
+    def requeue_orphans(self, now: Optional[float] = None, *, timeout: float = HEARTBEAT_TIMEOUT_SECONDS,
+                        max_attempts: int = MAX_ATTEMPTS) -> int:
+        """Re-queue running jobs whose dispatcher stopped heartbeating (fail them after max_attempts)."""
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, attempts, cancel_requested FROM jobs WHERE status = 'running' AND heartbeat_at < ?",
+                (now - timeout,),
+            ).fetchall()
+            for row in rows:
+                if row["cancel_requested"]:
+                    status, error = "cancelled", None
+                elif row["attempts"] >= max_attempts:
+                    status, error = "error", f"Interrupted {row['attempts']} times (worker restarts)"
+                else:
+                    status, error = "queued", None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, owner = NULL, finished_at = ?, updated_at = ? WHERE id = ?",
+                    (status, error, None if status == "queued" else now, now, row["id"]),
+                )
+        if rows:
+            logger.warning(f"[JOBS] Recovered {len(rows)} interrupted job(s)")
+        return len(rows)
+
+    def set_progress(self, job_id: str, progress: dict, now: Optional[float] = None) -> bool:
+        """Store a job's progress; returns whether cancellation has been requested."""
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+                (json.dumps(progress), now, job_id),
+            )
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def request_cancel(self, job_id: str, now: Optional[float] = None) -> Optional[Job]:
+        """Cancel a queued job immediately; flag a running one (the worker stops at its next check)."""
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (now, now, job_id),
+            )
+            conn.execute(
+                "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ? AND status = 'running'",
+                (now, job_id),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """Move a running job to a finished status (no-op if it already left 'running')."""
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+                (status, error, now, now, job_id),
+            )
+        return cur.rowcount > 0
+
+    def changed_since(self, since: float) -> list[Job]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs WHERE updated_at > ? ORDER BY updated_at", (since,)).fetchall()
+        return [Job.from_row(r) for r in rows]
+
+    def result_path(self, job_id: str) -> Path:
+        return self.results_dir / f"{job_id}.json"
+
+    def write_result(self, job_id: str, result: Any) -> None:
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        path = self.result_path(job_id)
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(result, f, default=_json_default)
+        os.replace(tmp, path)  # Readers never see a partial file
+
+    def read_result(self, job_id: str) -> Optional[Any]:
+        path = self.result_path(job_id)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def prune(self, now: Optional[float] = None, *, retention: float = RETENTION_SECONDS) -> int:
+        """Delete finished jobs (and their result files) older than retention."""
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status IN ('complete', 'error', 'cancelled') AND finished_at < ?",
+                (now - retention,),
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(r["id"],) for r in rows])
+        for r in rows:
+            self.result_path(r["id"]).unlink(missing_ok=True)
+        return len(rows)
+
+
+def _json_default(value: Any) -> Any:
+    # Results are plain dicts, but may carry numpy scalars / arrays from the analysis code
+    if hasattr(value, "item") and callable(value.item) and getattr(value, "ndim", 1) == 0:
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JobContext:
+    """Handed to a job's runner inside the worker process: progress reporting and cancellation checks."""
+
+    def __init__(self, store: JobStore, job_id: str, *, interval: float = PROGRESS_INTERVAL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.store = store
+        self.job_id = job_id
+        self._interval = interval
+        self._clock = clock
+        self._last_write = float("-inf")
+        self._last_check = float("-inf")
+        self._cancelled = False
+        self._lock = threading.Lock()  # Runners may report from several threads
+
+    def report(self, progress: dict, force: bool = False) -> None:
+        """Record progress (throttled unless force); raises JobCancelled once cancellation was requested."""
+        with self._lock:
+            now = self._clock()
+            if force or now - self._last_write >= self._interval:
+                self._last_write = self._last_check = now
+                self._cancelled = self.store.set_progress(self.job_id, progress) or self._cancelled
+        self.check_cancelled()
+
+    def cancel_requested(self) -> bool:
+        """Whether cancellation was requested (polls the table at most once per interval)."""
+        with self._lock:
+            now = self._clock()
+            if not self._cancelled and now - self._last_check >= self._interval:
+                self._last_check = now
+                self._cancelled = self.store.is_cancel_requested(self.job_id)
+            return self._cancelled
+
+    def check_cancelled(self) -> None:
+        if self.cancel_requested():
+            raise JobCancelled(f"Job {self.job_id} cancelled")
+
+
+JobRunner = Callable[[dict, JobContext], Any]
+
+
+def _run_job(root: str, job_id: str, runner: JobRunner, params: dict) -> None:
+    """Worker process entry point: run one job and record its outcome."""
+    # Workers read the on-disk caches but must not write their copies back over the API process's
+    disable_disk_persistence()
+    store = JobStore(Path(root))
+    ctx = JobContext(store, job_id)
+    try:
+        result = runner(params, ctx)
+    except JobCancelled:
+        logger.info(f"[JOBS] Job {job_id} cancelled")
+        store.finish(job_id, "cancelled")
+        return
+    except BaseException as e:
+        logger.error(f"[JOBS] Job {job_id} failed: {e}", exc_info=True)
+        store.finish(job_id, "error", error=str(getattr(e, "detail", None) or e or type(e).__name__))
+        return
+    store.write_result(job_id, result)
+    store.finish(job_id, "complete")
+
+
+class JobQueue:
+    """
+    Dispatcher for one API process: launches worker processes for claimed jobs and reports job changes.
+
+    register() kinds at import time (worker processes import the same modules, so runners resolve there);
+    start() begins dispatching. on_update callbacks run on the dispatcher thread for every job change.
+    """
+
+    def __init__(self, store: JobStore, *, max_concurrent: int = MAX_CONCURRENT_JOBS,
+                 poll_interval: float = POLL_INTERVAL_SECONDS, mp_context: Optional[Any] = None):
+        self.store = store
+        self.max_concurrent = max_concurrent
+        self.poll_interval = poll_interval
+        self._mp = mp_context or multiprocessing.get_context("spawn")
+        self._owner = uuid.uuid4().hex
+        self._runners: dict[str, tuple[JobRunner, Optional[Callable[[Job], None]]]] = {}
+        self._processes: dict[str, Any] = {}
+        self._cancel_seen: dict[str, float] = {}
+        self._cursor = time.time()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, kind: str, runner: JobRunner, on_update: Optional[Callable[[Job], None]] = None) -> None:
+        self._runners[kind] = (runner, on_update)
+
+    def submit(self, kind: str, key: str, params: dict) -> tuple[Job, bool]:
+        """Queue a job (or join the identical active one). Returns (job, created)."""
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job, created = self.store.submit(kind, key, params)
+        logger.info(f"[JOBS] {'Queued' if created else 'Joined active'} {kind} job {job.id} (key {key[:16]})")
+        self.start()
+        self._wake.set()
+        return job, created
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def result(self, job_id: str) -> Optional[Any]:
+        return self.store.read_result(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.store.request_cancel(job_id)
+        self._wake.set()
+        return job
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            try:
+                self.store.prune()
+            except Exception as e:
+                logger.warning(f"[JOBS] Pruning old jobs failed: {e}")
+            self._thread = threading.Thread(target=self._loop, name="job-dispatcher", daemon=True)
+            self._thread.start()
+            logger.info(f"[JOBS] Dispatcher started (max {self.max_concurrent} concurrent job(s), store {self.store.root})")
+
+    def stop(self) -> None:
+        """Stop dispatching and terminate running workers (their jobs are re-queued by the next dispatcher)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        for proc in self._processes.values():
+            if proc.is_alive():
+                proc.terminate()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"[JOBS] Dispatcher error: {e}", exc_info=True)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def run_once(self) -> None:
+        """One dispatcher tick: heartbeat, recover orphans, reap/terminate workers, launch jobs, report changes."""
+        now = time.time()
+        self.store.heartbeat(self._owner, now)
+        self.store.requeue_orphans(now)
+        self._reap(now)
+        while len(self._processes) < self.max_concurrent:
+            job = self.store.claim(self._owner, tuple(self._runners), self.max_concurrent, now)
+            if job is None:
+                break
+            runner, _ = self._runners[job.kind]
+            proc = self._mp.Process(
+                target=_run_job, args=(str(self.store.root), job.id, runner, job.params),
+                name=f"job-{job.kind}-{job.id[:8]}", daemon=True,
+            )
+            proc.start()
+            self._processes[job.id] = proc
+            logger.info(f"[JOBS] Started {job.kind} job {job.id} in worker pid {proc.pid} (attempt {job.attempts})")
+        self._report_changes()
+
+    def _reap(self, now: float) -> None:
+        for job_id, proc in list(self._processes.items()):
+            if not proc.is_alive():
+                proc.join()
+                del self._processes[job_id]
+                self._cancel_seen.pop(job_id, None)
+                # A worker that died without recording an outcome (crash, OOM kill) fails its job
+                if self.store.finish(job_id, "error", error=f"Worker exited unexpectedly (exit code {proc.exitcode})", now=now):
+                    logger.error(f"[JOBS] Job {job_id} worker exited with code {proc.exitcode}")
+                continue
+            job = self.store.get(job_id)
+            if job is not None and job.cancel_requested:
+                first_seen = self._cancel_seen.setdefault(job_id, now)
+                if now - first_seen >= CANCEL_GRACE_SECONDS:
+                    logger.warning(f"[JOBS] Job {job_id} ignored cancellation for {CANCEL_GRACE_SECONDS:.0f}s, terminating worker")
+                    proc.terminate()
+                    proc.join(timeout=5)
+                    self.store.finish(job_id, "cancelled", now=now)
+
+    def _report_changes(self) -> None:
+        changed = self.store.changed_since(self._cursor)
+        if not changed:
+            return
+        self._cursor = changed[-1].updated_at
+        for job in changed:
+            _, on_update = self._runners.get(job.kind, (None, None))
+            if on_update is not None:
+                try:
+                    on_update(job)
+                except Exception as e:
+                    logger.warning(f"[JOBS] on_update for job {job.id} failed: {e}")
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue (dispatching starts on the first submit or at app startup)."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(JobStore(JOBS_DIR))
+        return _job_queue
@@ -37,6 +37,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from .logging_config import setup_logging, get_logger, DEBUG_MODE
 from .endpoints import games, probabilities, metadata, stats, aggregate_stats, live_games, live_data, simulation, update, model_evaluation, grid_search, logs, export, model_comparison
 from .websocket_manager import get_websocket_manager
+from .jobs import get_job_queue
+from .stats_writer import get_game_stats_writer
 
 # Global flag for graceful shutdown
 _shutdown_requested = threading.Event()
@@ -191,6 +193,15 @@ async def preload_cache():
     # Start background tasks for connection health monitoring
     asyncio.create_task(websocket_health_monitor())
     
+    # Load + compile win-prob models (incl. CatBoost .cbm files) in the background so the first
+    # simulation / grid search request doesn't pay for it. Independent of PRELOAD_CACHE: it's off the request path.
+    if os.getenv("PRELOAD_MODELS", "true").lower() not in ("false", "0"):
+        from scripts.lib._model_registry_lib import get_registry
+        get_registry().warm_in_background(stop=_shutdown_requested)
+    
+    # Dispatch queued grid search / bulk simulation jobs (including ones interrupted by a restart)
+    get_job_queue().start()
+    
     if not SHOULD_PRELOAD:
         logger.info("Skipping cache preload (PRELOAD_CACHE=false or running in reload mode)")
         logger.info("Note: Cache is persisted to disk, so previous cache will be loaded automatically")
@@ -269,7 +280,7 @@ async def preload_cache():
                 # Preload aggregate stats (will use cache if available)
                 logger.info("Warming aggregate stats cache (will use existing cache if valid)...")
                 try:
-                    # This will use cache if it exists and is not expired (24 hour TTL)
+                    # This will use cache if it exists and is not expired (short TTL; a refresh only recomputes games without a stored partial)
                     # If cache is missing/expired, it will calculate fresh
                     result = aggregate_stats.get_aggregate_stats(season="2025-26")
                     if result:
@@ -318,6 +329,12 @@ async def shutdown_tasks():
     manager = get_websocket_manager()
     stats = manager.get_stats()
     logger.info(f"WebSocket manager stats on shutdown: {stats}")
+    
+    # Stop job workers; their jobs are re-queued when the next dispatcher finds them without a heartbeat
+    get_job_queue().stop()
+    
+    # Write any game stats still queued for derived.game_stats
+    get_game_stats_writer().stop()
 
 # =============================================================================
 # Static Files (serve frontend)
@@ -0,0 +1,223 @@
+"""
+Progress pub/sub for long-running background jobs (bulk simulation, grid search).
+
+Design Pattern: Publish-Subscribe (Observer) with a thread-to-async bridge
+Algorithm: Worker threads publish progress snapshots; each request_id keeps only its latest snapshot.
+           Delivery to WebSocket subscribers is scheduled on their event loop with
+           loop.call_soon_threadsafe and coalesced: bursts of updates within min_interval collapse
+           into one (trailing) delivery, and each subscriber queue holds at most the newest snapshot.
+           Terminal updates (complete / error / cancelled) and forced updates are delivered immediately.
+           Channels with no subscribers are dropped ttl_seconds after their last update.
+Big O: O(1) publish, O(s) delivery where s = subscribers of the request, O(c) periodic sweep over channels
+"""
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+from fastapi import WebSocket
+
+TERMINAL_STATUSES = frozenset({"complete", "error", "cancelled"})
+DEFAULT_MIN_INTERVAL = 0.1  # seconds between deliveries of non-terminal updates per request
+DEFAULT_TTL_SECONDS = 3600.0  # keep idle/finished progress this long for late progress polls
+CLEANUP_INTERVAL_SECONDS = 60.0
+
+
+def is_terminal(state: Optional[dict]) -> bool:
+    return bool(state) and state.get("status") in TERMINAL_STATUSES
+
+
+class _Channel:
+    __slots__ = ("state", "version", "delivered", "subscribers", "scheduled", "last_delivery", "updated_at")
+
+    def __init__(self, now: float):
+        self.state: Optional[dict] = None
+        self.version = 0
+        self.delivered = 0
+        self.subscribers: list[asyncio.Queue] = []
+        self.scheduled = False
+        self.last_delivery = float("-inf")
+        self.updated_at = now
+
+
+class Subscription:
+    """One subscriber's view of a channel: the state at subscribe time, then pushed snapshots."""
+
+    def __init__(self, queue: asyncio.Queue, current: Optional[dict]):
+        self.current = current
+        self._queue = queue
+
+    async def next(self) -> dict:
+        """Wait for the next snapshot (skips a re-delivery of the one already seen)."""
+        while True:
+            state = await self._queue.get()
+            if state is not self.current:
+                self.current = state
+                return state
+
+
+class ProgressBus:
+    """
+    Latest-value progress channels keyed by request_id.
+
+    publish/update are safe to call from any thread; subscribe is used from async handlers.
+    Snapshots are shared between subscribers and must be treated as read-only.
+    """
+
+    def __init__(self, *, min_interval: float = DEFAULT_MIN_INTERVAL, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.min_interval = min_interval
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._channels: dict[str, _Channel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_cleanup = clock()
+
+    def get(self, request_id: str) -> Optional[dict]:
+        """Latest snapshot for request_id (a copy), or None if unknown / expired."""
+        with self._lock:
+            channel = self._channels.get(request_id)
+            return dict(channel.state) if channel is not None and channel.state is not None else None
+
+    def publish(self, request_id: str, state: dict, *, force: bool = False) -> None:
+        """Replace the progress state for request_id and notify subscribers."""
+        self._publish(request_id, dict(state), force)
+
+    def update(self, request_id: str, *, force: bool = False, **fields: Any) -> Optional[dict]:
+        """Merge fields into an existing state (no-op returning None if request_id has no state)."""
+        return self._publish(request_id, fields, force, merge=True)
+
+    def _publish(self, request_id: str, fields: dict, force: bool, merge: bool = False) -> Optional[dict]:
+        now = self._clock()
+        with self._lock:
+            channel = self._channels.get(request_id)
+            if merge:
+                if channel is None or channel.state is None:
+                    return None
+                state = {**channel.state, **fields}
+            else:
+                state = fields
+                if channel is None:
+                    channel = self._channels[request_id] = _Channel(now)
+            channel.state = state
+            channel.version += 1
+            channel.updated_at = now
+            self._maybe_cleanup(now)
+
+            loop = self._loop
+            if not channel.subscribers or loop is None:
+                return state
+            urgent = force or is_terminal(state)
+            if channel.scheduled and not urgent:
+                return state  # Coalesced into the delivery already scheduled
+            channel.scheduled = True
+            delay = 0.0 if urgent else max(0.0, channel.last_delivery + self.min_interval - now)
+        try:
+            loop.call_soon_threadsafe(self._schedule, request_id, delay)
+        except RuntimeError:
+            pass  # Event loop closed (server shutting down)
+        return state
+
+    def _schedule(self, request_id: str, delay: float) -> None:
+        # Runs on the event loop
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._deliver, request_id)
+        else:
+            self._deliver(request_id)
+
+    def _deliver(self, request_id: str) -> None:
+        # Runs on the event loop: hand the newest snapshot to every subscriber queue
+        with self._lock:
+            channel = self._channels.get(request_id)
+            if channel is None:
+                return
+            channel.scheduled = False
+            if channel.delivered == channel.version:
+                return
+            channel.delivered = channel.version
+            channel.last_delivery = self._clock()
+            state = channel.state
+            queues = list(channel.subscribers)
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()  # Drop the stale snapshot the subscriber hasn't read yet
+            queue.put_nowait(state)
+
+    @asynccontextmanager
+    async def subscribe(self, request_id: str) -> AsyncIterator[Subscription]:
+        """Subscribe the running event loop to request_id (the job may not have published yet)."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        now = self._clock()
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            channel = self._channels.get(request_id)
+            if channel is None:
+                channel = self._channels[request_id] = _Channel(now)
+            channel.subscribers.append(queue)
+            current = channel.state
+        try:
+            yield Subscription(queue, current)
+        finally:
+            with self._lock:
+                channel = self._channels.get(request_id)
+                if channel is not None and queue in channel.subscribers:
+                    channel.subscribers.remove(queue)
+
+    def _maybe_cleanup(self, now: float) -> None:
+        # Caller holds the lock
+        if now - self._last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+            self._last_cleanup = now
+            self._sweep(now)
+
+    def cleanup(self, now: Optional[float] = None) -> int:
+        """Drop channels without subscribers whose last update is older than ttl_seconds. Returns the count."""
+        with self._lock:
+            return self._sweep(self._clock() if now is None else now)
+
+    def _sweep(self, now: float) -> int:
+        expired = [rid for rid, ch in self._channels.items()
+                   if not ch.subscribers and now - ch.updated_at > self.ttl_seconds]
+        for rid in expired:
+            del self._channels[rid]
+        return len(expired)
+
+
+async def relay_progress(websocket: WebSocket, subscription: Subscription, initial: dict, *, label: str) -> None:
+    """
+    Send initial progress, then every pushed snapshot, to an accepted WebSocket.
+
+    Answers {"type": "ping"} with a pong while waiting and closes the connection once the job
+    reaches a terminal status. Raises WebSocketDisconnect if the client goes away.
+    """
+    await websocket.send_json({"type": "progress", "progress": initial})
+    if is_terminal(initial):
+        await websocket.close(code=1000, reason=f"{label} {initial['status']}")
+        return
+
+    receive = asyncio.ensure_future(websocket.receive_text())
+    update = asyncio.ensure_future(subscription.next())
+    try:
+        while True:
+            done, _ = await asyncio.wait({receive, update}, return_when=asyncio.FIRST_COMPLETED)
+            if receive in done:
+                message = receive.result()
+                try:
+                    if json.loads(message).get("type") == "ping":
+                        await websocket.send_json({"type": "pong", "timestamp": asyncio.get_running_loop().time()})
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+                receive = asyncio.ensure_future(websocket.receive_text())
+            if update in done:
+                state = update.result()
+                await websocket.send_json({"type": "progress", "progress": state})
+                if is_terminal(state):
+                    await websocket.close(code=1000, reason=f"{label} {state['status']}")
+                    return
+                update = asyncio.ensure_future(subscription.next())
+    finally:
+        for task in (receive, update):
+            task.cancel()
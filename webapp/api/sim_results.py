@@ -0,0 +1,328 @@
+"""
+Compact per-game trading simulation results and the bulk aggregate built from them.
+
+Design Pattern: Immutable value objects (flyweight) shared between the result cache and responses
+Algorithm: Trades as NumPy structured arrays; bulk metrics over the concatenated columns
+Big O: O(T log T) per bulk aggregate where T = total trades (the chronological sort); O(1) per cache hit
+
+simulate_trading_strategy returns a dict with a list of per-trade dicts. Caching that (pickled, then
+deep-copied on every hit) dominated warm bulk requests. GameSimResult keeps the summary as an immutable
+tuple and the trades as a read-only structured array, so a cached result is handed out as-is; game
+metadata (game_id, game_date) is attached only when the response is serialized.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+POSITION_TYPES: tuple[str, ...] = ("long_espn", "short_espn")
+# Index 0 is "no phase" (game start/duration unknown)
+GAME_PHASES: tuple[Optional[str], ...] = (None, "Q1", "Q2-Q3", "Q4")
+
+# Nullable floats are NaN when missing; exit_time is 0 when missing; actual_outcome is -1 when unknown.
+TRADE_DTYPE = np.dtype([
+    ("entry_time", np.int64),
+    ("exit_time", np.int64),
+    ("position_type", np.uint8),
+    ("entry_espn_prob", np.float64),
+    ("entry_kalshi_price", np.float64),
+    ("entry_kalshi_bid", np.float64),
+    ("entry_kalshi_ask", np.float64),
+    ("exit_espn_prob", np.float64),
+    ("exit_kalshi_price", np.float64),
+    ("exit_kalshi_bid", np.float64),
+    ("exit_kalshi_ask", np.float64),
+    ("profit_cents", np.float64),
+    ("net_profit_cents", np.float64),
+    ("actual_outcome", np.int8),
+    ("game_phase", np.uint8),
+])
+
+_PRICE_FIELDS: tuple[str, ...] = (
+    "entry_espn_prob", "entry_kalshi_price", "entry_kalshi_bid", "entry_kalshi_ask",
+    "exit_espn_prob", "exit_kalshi_price", "exit_kalshi_bid", "exit_kalshi_ask",
+)
+
+_POSITION_CODES = {name: i for i, name in enumerate(POSITION_TYPES)}
+_PHASE_CODES = {name: i for i, name in enumerate(GAME_PHASES)}
+
+
+def _nan_if_none(v: Any) -> float:
+    return np.nan if v is None else float(v)
+
+
+def trades_to_array(trades: Iterable[dict[str, Any]]) -> np.ndarray:
+    """simulate_trading_strategy trade dicts -> read-only TRADE_DTYPE array."""
+    rows = [
+        (
+            t["entry_time"],
+            0 if t.get("exit_time") is None else t["exit_time"],
+            _POSITION_CODES[t["position_type"]],
+            *(_nan_if_none(t.get(f)) for f in _PRICE_FIELDS),
+            _nan_if_none(t.get("profit_cents")),
+            _nan_if_none(t.get("net_profit_cents")),
+            -1 if t.get("actual_outcome") is None else int(t["actual_outcome"]),
+            _PHASE_CODES.get(t.get("game_phase"), 0),
+        )
+        for t in trades
+    ]
+    arr = np.array(rows, dtype=TRADE_DTYPE)
+    arr.flags.writeable = False
+    return arr
+
+
+def _nullable(col: np.ndarray) -> list[Optional[float]]:
+    values = col.tolist()
+    if np.isnan(col).any():
+        return [None if v != v else v for v in values]
+    return values
+
+
+def trade_dicts(trades: np.ndarray, game_id: Optional[str], game_date: Optional[str]) -> list[dict[str, Any]]:
+    """TRADE_DTYPE array -> the per-trade dicts the simulation endpoints return (with game metadata)."""
+    if len(trades) == 0:
+        return []
+    cols = {f: _nullable(trades[f]) for f in _PRICE_FIELDS}
+    profit = _nullable(trades["profit_cents"])
+    net = _nullable(trades["net_profit_cents"])
+    outcome = [None if v < 0 else v for v in trades["actual_outcome"].tolist()]
+    return [
+        {
+            "entry_time": entry_time,
+            "exit_time": exit_time or None,
+            "position_type": POSITION_TYPES[position],
+            "entry_espn_prob": cols["entry_espn_prob"][i],
+            "entry_kalshi_price": cols["entry_kalshi_price"][i],
+            "entry_kalshi_bid": cols["entry_kalshi_bid"][i],
+            "entry_kalshi_ask": cols["entry_kalshi_ask"][i],
+            "exit_espn_prob": cols["exit_espn_prob"][i],
+            "exit_kalshi_price": cols["exit_kalshi_price"][i],
+            "exit_kalshi_bid": cols["exit_kalshi_bid"][i],
+            "exit_kalshi_ask": cols["exit_kalshi_ask"][i],
+            "profit_cents": profit[i],
+            "profit_dollars": (profit[i] or 0) / 100.0,
+            "net_profit_cents": net[i],
+            "net_profit_dollars": (net[i] or 0) / 100.0,
+            "actual_outcome": outcome[i],
+            "game_phase": GAME_PHASES[phase],
+            "game_id": game_id,
+            "game_date": game_date,
+        }
+        for i, (entry_time, exit_time, position, phase) in enumerate(zip(
+            trades["entry_time"].tolist(), trades["exit_time"].tolist(),
+            trades["position_type"].tolist(), trades["game_phase"].tolist(),
+        ))
+    ]
+
+
+@dataclass(frozen=True)
+class GameSimResult:
+    """One game's simulation outcome: summary fields (in response order) and the trades array."""
+
+    summary: tuple[tuple[str, Any], ...]
+    trades: np.ndarray
+
+    @classmethod
+    def from_simulation(cls, results: dict[str, Any]) -> "GameSimResult":
+        """Build from a simulate_trading_strategy result (game metadata keys are dropped)."""
+        summary = tuple((k, v) for k, v in results.items() if k not in ("trades", "game_id", "game_date"))
+        return cls(summary=summary, trades=trades_to_array(results.get("trades", [])))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        for k, v in self.summary:
+            if k == key:
+                return v
+        return default
+
+    @property
+    def num_trades(self) -> int:
+        return int(self.get("num_trades", len(self.trades)))
+
+    @property
+    def total_profit_cents(self) -> float:
+        return self.get("total_profit_cents", 0.0)
+
+    def to_dict(self, game_id: Optional[str], game_date: Optional[str], trades: Optional[list[dict]] = None) -> dict[str, Any]:
+        """Response dict for this game (the shape simulate_trading_strategy + game metadata had)."""
+        out = dict(self.summary)
+        out["trades"] = trade_dicts(self.trades, game_id, game_date) if trades is None else trades
+        out["game_id"] = game_id
+        out["game_date"] = game_date
+        return out
+
+
+class GameSimRun(NamedTuple):
+    """A GameSimResult together with the game it belongs to."""
+
+    game_id: str
+    game_date: Optional[str]
+    result: GameSimResult
+
+
+def aggregate_game_results(runs: list[GameSimRun], bet_amount: float, *, include_trades: bool = True) -> dict[str, Any]:
+    """
+    Bulk response body for a list of per-game runs (everything except request echo fields).
+
+    Returns game_results, trades (all games, chronological) and the aggregate metrics. Each trade dict
+    is built once and shared by its game's result and the combined list. With include_trades=False only
+    the metrics are returned (the streaming endpoint has already sent every game's trades).
+    """
+    total_profit_cents = sum(run.result.total_profit_cents for run in runs)
+    total_trades = sum(run.result.num_trades for run in runs)
+    successful_games = len(runs)
+
+    arrays = [run.result.trades for run in runs]
+    trades = np.concatenate(arrays) if arrays else np.empty(0, dtype=TRADE_DTYPE)
+    game_idx = np.repeat(np.arange(len(runs)), [len(a) for a in arrays]).astype(np.int64)
+
+    # Chronological order (game date, then exit time); stable like the list sort it replaces
+    dates = [run.game_date or "" for run in runs]
+    date_rank = {d: i for i, d in enumerate(sorted(set(dates)))}
+    trade_date_rank = np.array([date_rank[d] for d in dates], dtype=np.int64)[game_idx] if len(runs) else np.empty(0, dtype=np.int64)
+    when = np.where(trades["exit_time"] != 0, trades["exit_time"], trades["entry_time"])
+    order = np.lexsort((when, trade_date_rank))
+    trades = trades[order]
+
+    net = np.nan_to_num(trades["net_profit_cents"], nan=0.0)
+    profits = net / 100.0  # dollars, chronological
+    n = len(net)
+    win = net > 0
+    loss = net < 0
+    win_rate = int(win.sum()) / total_trades if total_trades > 0 else 0.0
+    avg_profit_per_trade_cents = total_profit_cents / total_trades if total_trades > 0 else 0.0
+
+    # ROI = profit / (total_trades * bet_amount): per-trade notional, NOT account-level ROI
+    total_capital_deployed_cents = total_trades * bet_amount * 100
+    roi_percentage = (total_profit_cents / total_capital_deployed_cents * 100.0) if total_capital_deployed_cents > 0 else 0.0
+
+    def _side(mask: np.ndarray) -> dict[str, Any]:
+        count = int(mask.sum())
+        profit_cents = float(net[mask].sum())
+        return {
+            "count": count,
+            "profit_dollars": profit_cents / 100.0,
+            "win_rate": int((win & mask).sum()) / count if count else 0.0,
+            "avg_profit_dollars": (profit_cents / count if count else 0.0) / 100.0,
+        }
+
+    position_breakdown = {
+        "long": _side(trades["position_type"] == _POSITION_CODES["long_espn"]),
+        "short": _side(trades["position_type"] == _POSITION_CODES["short_espn"]),
+    }
+
+    max_loss = float(profits.min()) if n else 0.0
+    max_win = float(profits.max()) if n else 0.0
+    std_dev = float(profits.std(ddof=1)) if n > 1 else 0.0
+    median_profit_cents = float(np.median(net)) if n else 0.0
+    trades_per_game = total_trades / successful_games if successful_games > 0 else 0.0
+
+    closed = trades["exit_time"] != 0  # Trades without an exit time have no duration
+    durations = (trades["exit_time"][closed] - trades["entry_time"][closed]).astype(np.float64)
+    avg_trade_duration_seconds = float(durations.mean()) if len(durations) else 0.0
+
+    if n < 2:
+        sharpe_ratio = 0.0
+    else:
+        returns = profits / bet_amount
+        std_dev_return = float(returns.std(ddof=1))
+        sharpe_ratio = float(returns.mean()) / std_dev_return if std_dev_return > 0 else 0.0
+
+    sorted_profits = np.sort(profits)
+    if n > 1:
+        q1, q2, q3 = float(sorted_profits[int(n * 0.25)]), float(np.median(sorted_profits)), float(sorted_profits[int(n * 0.75)])
+    elif n:
+        q1 = q2 = q3 = float(sorted_profits[0])
+    else:
+        q1 = q2 = q3 = 0.0
+
+    entry_div = np.abs(trades["entry_espn_prob"] - trades["entry_kalshi_price"]) * 100
+    exit_div = np.abs(trades["exit_espn_prob"] - trades["exit_kalshi_price"]) * 100
+    entry_div, exit_div = entry_div[~np.isnan(entry_div)], exit_div[~np.isnan(exit_div)]
+
+    # Expectancy = WinRate * AvgWin - LossRate * AvgLoss; Profit factor = gross wins / gross losses
+    winning, losing = profits[win], profits[loss]
+    avg_win = float(winning.mean()) if len(winning) else 0.0
+    avg_loss = abs(float(losing.mean())) if len(losing) else 0.0
+    loss_rate = len(losing) / total_trades if total_trades > 0 else 0.0
+    expectancy = (win_rate * avg_win) - (loss_rate * avg_loss)
+    net_profits = float(winning.sum()) if len(winning) else 0.0
+    net_losses = abs(float(losing.sum())) if len(losing) else 0.0
+    profit_factor = net_profits / net_losses if net_losses > 0 else (net_profits if net_profits > 0 else 0.0)
+
+    # Maximum drawdown on the equity curve; percentage vs. the running peak, or vs. capital deployed
+    # while the curve hasn't been positive yet
+    equity = np.cumsum(profits)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0)) if n else equity
+    drawdown = peak - equity
+    max_drawdown_dollars = 0.0
+    max_drawdown_percent = 0.0
+    if n and float(drawdown.max()) > 0:
+        i = int(np.argmax(drawdown))
+        max_drawdown_dollars = float(drawdown[i])
+        capital = total_trades * bet_amount if total_trades > 0 else bet_amount
+        if peak[i] > 0:
+            max_drawdown_percent = max_drawdown_dollars / float(peak[i]) * 100.0
+        elif capital > 0:
+            max_drawdown_percent = max_drawdown_dollars / capital * 100.0
+    equity_values = equity.tolist()
+
+    out: dict[str, Any] = {
+        "total_profit_cents": total_profit_cents,
+        "total_trades": total_trades,
+        "successful_games": successful_games,
+        "win_rate": win_rate,
+        "avg_profit_per_trade_cents": avg_profit_per_trade_cents,
+    }
+    if include_trades:
+        per_game_trades = [trade_dicts(run.result.trades, run.game_id, run.game_date) for run in runs]
+        flat_trades = [t for game_trades in per_game_trades for t in game_trades]
+        out["game_results"] = [run.result.to_dict(run.game_id, run.game_date, t) for run, t in zip(runs, per_game_trades)]
+        out["trades"] = [flat_trades[i] for i in order.tolist()]
+    out.update({
+        "roi_percentage": roi_percentage,
+        "position_breakdown": position_breakdown,
+        "risk_metrics": {
+            "max_loss_dollars": max_loss,
+            "max_win_dollars": max_win,
+            "std_dev_dollars": std_dev,
+        },
+        "median_profit_cents": median_profit_cents,
+        "trades_per_game": trades_per_game,
+        "avg_trade_duration_seconds": avg_trade_duration_seconds,
+        "avg_trade_duration_minutes": avg_trade_duration_seconds / 60.0,
+        "per_game_summary": [
+            {
+                "game_id": run.game_id,
+                "game_date": run.game_date,
+                "num_trades": run.result.get("num_trades", 0),
+                "profit_dollars": run.result.get("total_profit_cents", 0) / 100.0,
+                "win_rate": run.result.get("win_rate", 0.0),
+            }
+            for run in runs
+        ],
+        "sharpe_ratio": sharpe_ratio,
+        "distribution_quartiles": {
+            "q1_dollars": q1,
+            "q2_dollars": q2,  # median
+            "q3_dollars": q3,
+            "min_dollars": max_loss,
+            "max_dollars": max_win,
+        },
+        "divergence_metrics": {
+            "avg_entry_divergence_cents": float(entry_div.mean()) if len(entry_div) else 0.0,
+            "avg_exit_divergence_cents": float(exit_div.mean()) if len(exit_div) else 0.0,
+        },
+        "expectancy_dollars": expectancy,
+        "profit_factor": profit_factor,
+        "max_drawdown_dollars": max_drawdown_dollars,
+        "max_drawdown_percent": max_drawdown_percent,
+        "equity_curve": [
+            {"trade_number": i + 1, "cumulative_profit_dollars": cp}
+            for i, cp in enumerate(equity_values)
+        ],
+        "sample_size_n": total_trades,
+    })
+    return out
@@ -0,0 +1,496 @@
+"""
+Vectorized per-game stats kernel behind /games/{game_id}/stats.
+
+Design Pattern: Kernel over the game's ESPN and Kalshi arrays (built once per game)
+Algorithm: Each series' summary (min/max/mean, volatility, swings, lead changes, deviation metrics,
+           time-weighted average, time-sliced Brier) comes from one diff and one deviation pass. ESPN
+           points are aligned to their nearest Kalshi point with searchsorted, once per game, and the
+           divergence, time-sliced correlations and decision-weighted metrics are computed on the aligned
+           index arrays. Sums are left-to-right accumulations (np.add.accumulate, not NumPy's pairwise
+           sum) and squares use pow (np.float_power), so values are identical to the scalar calculate_*
+           functions in endpoints/stats.py.
+Big O: O(n + m) per game plus O(n log m) for the alignment (n = ESPN points, m = Kalshi points)
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+repo_root_dir = Path(__file__).parent.parent.parent
+if str(repo_root_dir) not in sys.path:
+    sys.path.insert(0, str(repo_root_dir))
+from scripts.lib import _metrics_lib
+
+ALIGNMENT_WINDOW_SECONDS = 60
+SIGN_FLIP_EPSILON = 0.005  # Both deltas must exceed this to count as a sign flip (noise filter)
+EV_DISAGREEMENT_THRESHOLD = 0.10
+MAX_EV_DETAILS = 10
+RELIABILITY_BINS = 10
+
+# (name, lower bound, upper bound, lower bound inclusive): elapsed seconds from game start
+BRIER_SLICES = (("q1", 0, 720, True), ("halftime", 0, 1440, True), ("start_q4", 0, 2160, True))
+CORRELATION_SLICES = (("q1_q2", 0, 1440, True), ("q3", 1440, 2160, False), ("q4", 2160, 2880, False))
+FINAL_SECONDS = 120
+
+
+def _sum(values: np.ndarray) -> float:
+    """Left-to-right sum (the order the builtin sum() adds in; np.sum is pairwise and can differ in the last bits)."""
+    return float(np.add.accumulate(values)[-1]) if len(values) else 0.0
+
+
+def _square(values: np.ndarray) -> np.ndarray:
+    """x ** 2 via pow, as Python's float ** does (x * x can differ in the last bit)."""
+    return np.float_power(values, 2.0)
+
+
+def _empty_brier_slices() -> dict[str, Any]:
+    return {name: None for name, *_ in BRIER_SLICES} | {"final_2_minutes": None}
+
+
+def _empty_correlation_slices() -> dict[str, Any]:
+    return {name: None for name, *_ in CORRELATION_SLICES} | {"final_2_minutes": None}
+
+
+def _in_slice(elapsed: np.ndarray, lo: int, hi: int, lo_inclusive: bool) -> np.ndarray:
+    return ((elapsed >= lo) if lo_inclusive else (elapsed > lo)) & (elapsed <= hi)
+
+
+def _final_window(elapsed: np.ndarray, game_duration_seconds: Optional[int]) -> np.ndarray:
+    """Mask of the final 2 minutes: of the game if its duration is known, else of the available data."""
+    if game_duration_seconds:
+        return (elapsed >= game_duration_seconds - FINAL_SECONDS) & (elapsed <= game_duration_seconds)
+    max_elapsed = int(elapsed.max())
+    return (elapsed >= max(0, max_elapsed - FINAL_SECONDS)) & (elapsed <= max_elapsed)
+
+
+def reliability_bin_sums(
+    probabilities: Sequence[float],
+    actual_outcomes: Sequence[int],
+    bins: int = RELIABILITY_BINS
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (count, sum of probabilities, sum of outcomes) per reliability bin.
+
+    These sums are additive, so curves over many games can be built by adding per-game sums
+    and passing the totals to reliability_curve_from_sums.
+    """
+    # Bin every prediction in one pass (bincount) instead of grouping row by row
+    bin_size = 1.0 / bins
+    p = np.asarray(probabilities, dtype=np.float64)
+    idx = np.minimum((p / bin_size).astype(np.intp), bins - 1)  # Handle edge case where prob = 1.0
+    return _metrics_lib.binned_sums(idx, p, actual_outcomes, bins)
+
+
+def reliability_curve_from_sums(
+    counts: Any,
+    sum_p: Any,
+    sum_y: Any,
+    bins: int = RELIABILITY_BINS
+) -> dict[str, Any]:
+    """Reliability curve (calculate_reliability_curve's format) from per-bin counts and sums."""
+    bin_size = 1.0 / bins
+
+    # Calculate statistics for each bin
+    reliability_bins = []
+    for bin_idx in range(bins):
+        bin_min = bin_idx * bin_size
+        bin_max = (bin_idx + 1) * bin_size if bin_idx < bins - 1 else 1.0
+
+        count = int(counts[bin_idx])
+        if count > 0:
+            predicted_prob = float(sum_p[bin_idx] / count)
+            actual_freq = float(sum_y[bin_idx] / count)
+            calibration_error = predicted_prob - actual_freq
+        else:
+            predicted_prob = (bin_min + bin_max) / 2.0  # Bin center
+            actual_freq = None
+            calibration_error = None
+
+        reliability_bins.append({
+            "bin_min": bin_min,
+            "bin_max": bin_max,
+            "bin_center": (bin_min + bin_max) / 2.0,
+            "predicted_prob": predicted_prob,
+            "actual_freq": actual_freq,
+            "count": count,
+            "calibration_error": calibration_error,
+        })
+
+    return {"bins": reliability_bins}
+
+
+def series_summary(probs: np.ndarray, times: np.ndarray) -> dict[str, Any]:
+    """Distribution, movement and deviation metrics of one probability series (the per-source stats block)."""
+    n = len(probs)
+    if n == 0:
+        return {
+            "data_points": 0,
+            "min_probability": None,
+            "max_probability": None,
+            "mean_probability": None,
+            "final_probability": None,
+            "volatility": 0.0,
+            "max_swing": {"max_increase": None, "max_decrease": None, "max_swing": None},
+            "lead_changes": 0,
+            "time_weighted_avg": None,
+            "standard_deviation": 0.0,
+            "variance": 0.0,
+            "mean_absolute_deviation": 0.0,
+            "coefficient_of_variation": None,
+        }
+
+    mean = _sum(probs) / n
+    deviations = probs - mean
+    variance = _sum(_square(deviations)) / n if n >= 2 else 0.0
+    std_dev = math.sqrt(variance)
+
+    # Movement metrics from one diff pass
+    changes = np.diff(probs)
+    volatility = 0.0
+    max_increase = max_decrease = 0.0
+    if n >= 2:
+        abs_changes = np.abs(changes)
+        mean_change = _sum(abs_changes) / len(abs_changes)
+        volatility = math.sqrt(_sum(_square(abs_changes - mean_change)) / len(abs_changes))
+        max_increase = max(0.0, float(changes.max()))
+        max_decrease = abs(min(0.0, float(changes.min())))
+    home_favorite = probs > 0.5
+
+    # Linear time weighting (later = higher weight)
+    if n == 1:
+        time_weighted_avg = float(probs[0])
+    else:
+        weights = np.arange(n) / n
+        weight_sum = _sum(weights)
+        time_weighted_avg = _sum(probs * weights) / weight_sum if weight_sum > 0 else None
+
+    return {
+        "data_points": n,
+        "min_probability": float(probs.min()),
+        "max_probability": float(probs.max()),
+        "mean_probability": mean,
+        "final_probability": float(probs[-1]),
+        "volatility": volatility,
+        "max_swing": {
+            "max_increase": max_increase,
+            "max_decrease": max_decrease,
+            "max_swing": max(max_increase, max_decrease),
+        },
+        "lead_changes": int(np.count_nonzero(home_favorite[1:] != home_favorite[:-1])),
+        "time_weighted_avg": time_weighted_avg if len(times) == n else None,
+        # Deviation metrics
+        "standard_deviation": std_dev,
+        "variance": variance,
+        "mean_absolute_deviation": _sum(np.abs(deviations)) / n,
+        "coefficient_of_variation": std_dev / mean if mean != 0 else None,
+    }
+
+
+def _brier(probs: np.ndarray, actual_outcome: int) -> Optional[float]:
+    return _metrics_lib.brier(probs, np.full(len(probs), float(actual_outcome))) if len(probs) else None
+
+
+def time_sliced_brier(
+    probs: np.ndarray,
+    times: np.ndarray,
+    game_start_timestamp: int,
+    actual_outcome: int,
+    game_duration_seconds: Optional[int]
+) -> dict[str, Any]:
+    """Brier scores for Q1, first half, first three quarters and the final 2 minutes (masks over elapsed time)."""
+    if not len(probs) or len(probs) != len(times):
+        return _empty_brier_slices()
+    elapsed = times - game_start_timestamp
+    result: dict[str, Any] = {}
+    counts: dict[str, int] = {}
+    masks = [(name, _in_slice(elapsed, lo, hi, inclusive)) for name, lo, hi, inclusive in BRIER_SLICES]
+    masks.append(("final_2_minutes", _final_window(elapsed, game_duration_seconds)))
+    for name, mask in masks:
+        result[name] = _brier(probs[mask], actual_outcome)
+        counts[name] = int(np.count_nonzero(mask))
+    result["data_points"] = counts
+    return result
+
+
+def align_nearest(
+    espn_times: Sequence[int],
+    kalshi_times: Sequence[int],
+    window: int = ALIGNMENT_WINDOW_SECONDS
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (ESPN indices, Kalshi indices) matching each ESPN point to its nearest Kalshi point within window seconds.
+
+    Nearest points come from searchsorted, ties going to the earlier Kalshi point: exactly what the
+    pointer scan in calculate_espn_kalshi_divergence finds when ESPN times are non-decreasing and Kalshi
+    times strictly increasing (always the case for the stats queries). Other inputs use that scan.
+    """
+    e = np.asarray(espn_times, dtype=np.int64)
+    k = np.asarray(kalshi_times, dtype=np.int64)
+    if not len(e) or not len(k):
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+    if np.all(np.diff(e) >= 0) and np.all(np.diff(k) > 0):
+        pos = np.searchsorted(k, e, side="left")
+        before = np.maximum(pos - 1, 0)
+        after = np.minimum(pos, len(k) - 1)
+        nearest = np.where(np.abs(k[before] - e) <= np.abs(k[after] - e), before, after)
+    else:
+        nearest = np.empty(len(e), dtype=np.intp)
+        kalshi_idx = 0
+        for i, espn_time in enumerate(e.tolist()):
+            while kalshi_idx < len(k) - 1 and abs(k[kalshi_idx] - espn_time) > abs(k[kalshi_idx + 1] - espn_time):
+                kalshi_idx += 1
+            nearest[i] = kalshi_idx
+    matched = np.abs(k[nearest] - e) <= window
+    return np.flatnonzero(matched), nearest[matched]
+
+
+def correlation(espn_probs: np.ndarray, kalshi_probs: np.ndarray) -> Optional[float]:
+    """Pearson correlation of two aligned series (None if fewer than 2 points or zero variance)."""
+    if len(espn_probs) != len(kalshi_probs) or len(espn_probs) < 2:
+        return None
+    espn_dev = espn_probs - _sum(espn_probs) / len(espn_probs)
+    kalshi_dev = kalshi_probs - _sum(kalshi_probs) / len(kalshi_probs)
+    numerator = _sum(espn_dev * kalshi_dev)
+    espn_var = _sum(_square(espn_dev))
+    kalshi_var = _sum(_square(kalshi_dev))
+    if espn_var > 0 and kalshi_var > 0:
+        return numerator / math.sqrt(espn_var * kalshi_var)
+    return None
+
+
+def time_sliced_correlations(
+    espn_probs: np.ndarray,
+    kalshi_probs: np.ndarray,
+    times: np.ndarray,
+    game_start_timestamp: int,
+    game_duration_seconds: Optional[int]
+) -> dict[str, Any]:
+    """Correlations for Q1-Q2, Q3, Q4 and the final 2 minutes of aligned pairs (times: ESPN, game timeline)."""
+    if not len(times):
+        return _empty_correlation_slices()
+    elapsed = times - game_start_timestamp
+    result: dict[str, Any] = {}
+    counts: dict[str, int] = {}
+    masks = [(name, _in_slice(elapsed, lo, hi, inclusive)) for name, lo, hi, inclusive in CORRELATION_SLICES]
+    masks.append(("final_2_minutes", _final_window(elapsed, game_duration_seconds)))
+    for name, mask in masks:
+        counts[name] = int(np.count_nonzero(mask))
+        result[name] = correlation(espn_probs[mask], kalshi_probs[mask]) if counts[name] >= 2 else None
+    result["data_points"] = counts
+    return result
+
+
+def divergence_from_aligned(
+    espn_aligned: np.ndarray,
+    kalshi_aligned: np.ndarray,
+    espn_times_aligned: np.ndarray,
+    game_start_timestamp: Optional[int],
+    game_duration_seconds: Optional[int]
+) -> dict[str, Any]:
+    """calculate_espn_kalshi_divergence's result for already aligned pairs."""
+    if not len(espn_aligned):
+        return {
+            "mean_absolute_difference": None,
+            "max_absolute_difference": None,
+            "correlation": None,
+            "correlation_time_sliced": _empty_correlation_slices(),
+            "sign_flips": None,
+            "data_points": 0,
+        }
+    differences = np.abs(espn_aligned - kalshi_aligned)
+
+    # Sign flips: both moved by more than epsilon, in opposite directions
+    espn_change = np.diff(espn_aligned)
+    kalshi_change = np.diff(kalshi_aligned)
+    flips = (
+        (np.abs(espn_change) > SIGN_FLIP_EPSILON) & (np.abs(kalshi_change) > SIGN_FLIP_EPSILON)
+        & (((espn_change > 0) & (kalshi_change < 0)) | ((espn_change < 0) & (kalshi_change > 0)))
+    )
+
+    correlation_time_sliced = _empty_correlation_slices()
+    if game_start_timestamp is not None:
+        correlation_time_sliced = time_sliced_correlations(
+            espn_aligned, kalshi_aligned, espn_times_aligned, game_start_timestamp, game_duration_seconds
+        )
+
+    return {
+        "mean_absolute_difference": _sum(differences) / len(differences),
+        "max_absolute_difference": float(differences.max()),
+        "correlation": correlation(espn_aligned, kalshi_aligned),
+        "correlation_time_sliced": correlation_time_sliced,
+        "sign_flips": int(np.count_nonzero(flips)),
+        "data_points": len(espn_aligned),
+    }
+
+
+def _weighted_sum(values: np.ndarray, weights: np.ndarray) -> Optional[float]:
+    """sum(v * w / sum(w)), None if the weights sum to <= 0."""
+    weight_sum = _sum(weights)
+    if weight_sum > 0:
+        return _sum(values * (weights / weight_sum))
+    return None
+
+
+def decision_weighted_metrics(
+    espn_probs: np.ndarray,
+    kalshi_probs: np.ndarray,
+    kalshi_times: np.ndarray,
+    bid_ask_exists: np.ndarray,
+    actual_outcome: Optional[int],
+    game_start_timestamp: Optional[int],
+    game_duration_seconds: Optional[int]
+) -> dict[str, Any]:
+    """calculate_decision_weighted_metrics over aligned arrays (masks instead of per-point loops)."""
+    if not len(espn_probs) or not len(kalshi_probs) or len(espn_probs) != len(kalshi_probs):
+        return {
+            "time_weighted_brier_espn": None,
+            "time_weighted_brier_kalshi": None,
+            "distance_weighted_mae": None,
+            "ev_positive_disagreements": None,
+        }
+    active = np.asarray(bid_ask_exists, dtype=bool)
+    if not active.any():
+        return {
+            "time_weighted_brier_espn": None,
+            "time_weighted_brier_kalshi": None,
+            "distance_weighted_mae": None,
+            "ev_positive_disagreements": None,
+            "active_points_count": 0,
+        }
+    espn_active = espn_probs[active]
+    kalshi_active = kalshi_probs[active]
+
+    time_weighted_brier_espn = time_weighted_brier_kalshi = None
+    confidence_weighted_brier_espn = confidence_weighted_brier_kalshi = None
+    ev_details: list[dict[str, Any]] = []
+    ev_positive_count = 0
+    if actual_outcome is not None:
+        espn_errors = _square(espn_active - actual_outcome)
+        kalshi_errors = _square(kalshi_active - actual_outcome)
+        # Time weights (later in game = higher weight), equal weights without game timing
+        if game_start_timestamp and game_duration_seconds:
+            time_weights = (kalshi_times[active] - game_start_timestamp) / game_duration_seconds
+        else:
+            time_weights = np.ones(len(espn_active))
+        if _sum(time_weights) > 0:
+            time_weighted_brier_espn = _weighted_sum(espn_errors, time_weights)
+            time_weighted_brier_kalshi = _weighted_sum(kalshi_errors, time_weights)
+        # Confidence-weighted Brier (w_t = abs(p_t - 0.5))
+        confidence_weighted_brier_espn = _weighted_sum(espn_errors, np.abs(espn_active - 0.5))
+        confidence_weighted_brier_kalshi = _weighted_sum(kalshi_errors, np.abs(kalshi_active - 0.5))
+
+        # Disagreements > 10% where exactly one source has positive EV (even-money bet)
+        disagreement = np.abs(espn_active - kalshi_active)
+        espn_ev = (espn_active * 1.0) - ((1 - espn_active) * 1.0)
+        kalshi_ev = (kalshi_active * 1.0) - ((1 - kalshi_active) * 1.0)
+        events = np.flatnonzero((disagreement > EV_DISAGREEMENT_THRESHOLD) & ((espn_ev > 0) != (kalshi_ev > 0)))
+        ev_positive_count = len(events)
+        home_won = actual_outcome == 1
+        for i in events[:MAX_EV_DETAILS].tolist():
+            espn, kalshi = float(espn_active[i]), float(kalshi_active[i])
+            ev_details.append({
+                "espn_prob": espn,
+                "kalshi_prob": kalshi,
+                "disagreement": float(disagreement[i]),
+                "espn_ev": float(espn_ev[i]),
+                "kalshi_ev": float(kalshi_ev[i]),
+                "correct_prediction": "espn" if (espn > 0.5) == home_won else "kalshi" if (kalshi > 0.5) == home_won else "neither",
+            })
+
+    # Distance-weighted MAE: disagreements near 0.5 weigh most
+    distance_from_50 = np.abs(0.5 - (espn_active + kalshi_active) / 2.0)
+    max_distance = float(distance_from_50.max())
+    distance_weighted_mae = None
+    if max_distance > 0:
+        distance_weighted_mae = _weighted_sum(np.abs(espn_active - kalshi_active), 1.0 - (distance_from_50 / max_distance))
+
+    return {
+        "time_weighted_brier_espn": time_weighted_brier_espn,
+        "time_weighted_brier_kalshi": time_weighted_brier_kalshi,
+        "confidence_weighted_brier_espn": confidence_weighted_brier_espn,
+        "confidence_weighted_brier_kalshi": confidence_weighted_brier_kalshi,
+        "distance_weighted_mae": distance_weighted_mae,
+        "ev_positive_disagreements": {
+            "count": ev_positive_count,
+            "details": ev_details,
+        } if ev_positive_count > 0 else None,
+        "active_points_count": int(np.count_nonzero(active)),
+    }
+
+
+def game_stats(
+    espn_probs: Sequence[float],
+    espn_times: Sequence[int],
+    kalshi_probs: Optional[Sequence[float]],
+    kalshi_times: Optional[Sequence[int]],
+    kalshi_bid_ask_exists: Optional[Sequence[bool]],
+    home_won: Optional[bool],
+    game_start_timestamp: Optional[int],
+    game_duration_seconds: Optional[int]
+) -> tuple[dict[str, Any], Optional[dict[str, Any]], Optional[dict[str, Any]]]:
+    """
+    (espn, kalshi, divergence) stats blocks of get_game_stats for one game.
+
+    Args:
+        espn_probs, espn_times: ESPN home win probabilities and their times (game timeline)
+        kalshi_probs, kalshi_times, kalshi_bid_ask_exists: Kalshi home series (None if there is none)
+        home_won: Outcome (None if unknown)
+        game_start_timestamp, game_duration_seconds: Game timing for the time-sliced metrics
+    """
+    p = np.asarray(espn_probs, dtype=np.float64)
+    t = np.asarray(espn_times, dtype=np.int64)
+    actual_outcome = None if home_won is None else (1 if home_won else 0)
+
+    espn_stats = series_summary(p, t)
+    if actual_outcome is not None:
+        espn_stats["time_averaged_in_game_brier_error"] = _brier(p, actual_outcome)
+        espn_stats["log_loss"] = (
+            _metrics_lib.logloss(p, np.full(len(p), float(actual_outcome)), eps=0.01) if len(p) else None
+        )
+        espn_stats["prediction_correct"] = bool((p[-1] > 0.5) == home_won) if len(p) else None
+        if game_start_timestamp is not None and len(t):
+            espn_stats["brier_score_time_sliced"] = time_sliced_brier(
+                p, t, game_start_timestamp, actual_outcome, game_duration_seconds
+            )
+        else:
+            espn_stats["brier_score_time_sliced"] = _empty_brier_slices()
+
+    if kalshi_probs is None or not len(kalshi_probs):
+        return espn_stats, None, None
+
+    kp = np.asarray(kalshi_probs, dtype=np.float64)
+    kt = np.asarray(kalshi_times, dtype=np.int64)
+    bid_ask = np.asarray(kalshi_bid_ask_exists, dtype=bool)
+
+    kalshi_stats = series_summary(kp, kt)
+    if actual_outcome is not None:
+        kalshi_stats["time_averaged_in_game_brier_error"] = _brier(kp, actual_outcome)
+        if game_start_timestamp is not None:
+            kalshi_stats["brier_score_time_sliced"] = time_sliced_brier(
+                kp, kt, game_start_timestamp, actual_outcome, game_duration_seconds
+            )
+        else:
+            kalshi_stats["brier_score_time_sliced"] = _empty_brier_slices()
+        kalshi_stats["reliability_curve"] = reliability_curve_from_sums(
+            *reliability_bin_sums(kp, np.full(len(kp), actual_outcome), RELIABILITY_BINS), bins=RELIABILITY_BINS
+        )
+    else:
+        kalshi_stats["brier_score_time_sliced"] = _empty_brier_slices()
+
+    # One alignment serves the divergence and the decision-weighted metrics
+    espn_idx, kalshi_idx = align_nearest(t, kt)
+    divergence_stats = divergence_from_aligned(
+        p[espn_idx], kp[kalshi_idx], t[espn_idx], game_start_timestamp, game_duration_seconds
+    )
+    if len(espn_idx):
+        divergence_stats["decision_weighted"] = decision_weighted_metrics(
+            p[espn_idx], kp[kalshi_idx], kt[kalshi_idx], bid_ask[kalshi_idx],
+            actual_outcome, game_start_timestamp, game_duration_seconds
+        )
+    return espn_stats, kalshi_stats, divergence_stats
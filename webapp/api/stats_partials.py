@@ -0,0 +1,599 @@
+"""
+Mergeable per-game partial aggregates behind /api/stats/aggregate.
+
+Design Pattern: Map-reduce over per-game partials, persisted once a game is final
+Algorithm: Each game's ESPN/Kalshi series are reduced once to a partial: its per-game metric values (Brier,
+           volatility, correlation, ...) plus additive sufficient statistics for the point-level aggregates
+           (reliability-bin counts and sums, disagreement-bin counts and wins). The season aggregate merges
+           partials: per-game values are concatenated (the response ships every distribution in full, so
+           medians, percentiles and moments are taken exactly over them) and bin sums are added.
+           Partials of final games never change and are stored in derived.game_stat_partials_v1, so a
+           refresh only reads the series of games that are new or still in progress.
+Big O: O(m) per new game (m = data points); O(g log g) per merge (g = games), independent of m
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+import psycopg
+
+from .endpoints.stats import (
+    calculate_brier_score,
+    calculate_decision_weighted_metrics,
+    calculate_espn_kalshi_divergence,
+    calculate_extreme_probability_rate,
+    calculate_log_loss,
+    calculate_mean_absolute_deviation,
+    calculate_phase_brier_scores,
+    calculate_probability_volatility,
+    calculate_profit_proxy,
+    calculate_standard_deviation,
+    reliability_bin_sums,
+    reliability_curve_from_sums,
+)
+from . import stats_kernel
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when a partial's contents or the metrics behind them change; older stored partials are then recomputed.
+PARTIAL_VERSION = 1
+
+PARTIALS_TABLE = "derived.game_stat_partials_v1"
+
+PARTIALS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS derived.game_stat_partials_v1 (
+  game_id          TEXT PRIMARY KEY,
+  partial_version  INTEGER NOT NULL,
+  partial          JSONB NOT NULL,
+  computed_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+PHASES: tuple[str, ...] = ("early", "mid", "late", "clutch")
+RELIABILITY_BINS = 10
+DISAGREEMENT_BINS: tuple[tuple[float, float], ...] = (
+    (-0.30, -0.20), (-0.20, -0.10), (-0.10, -0.05), (-0.05, 0.0),
+    (0.0, 0.05), (0.05, 0.10), (0.10, 0.20), (0.20, 0.30),
+)
+ALIGNMENT_WINDOW_SECONDS = 60
+
+
+def espn_series(
+    espn_rows: Sequence[tuple], game_start_timestamp: Optional[int]
+) -> tuple[list[float], list[int]]:
+    """
+    (home probabilities, timestamps) from (last_modified_utc, home_win_percentage, away_win_percentage) rows.
+
+    Timestamps are shifted onto the game timeline: the first ESPN row lands on game_start_timestamp.
+    """
+    probs: list[float] = []
+    times: list[int] = []
+    first_timestamp = None
+    for last_modified_utc, home_win_percentage, _away in espn_rows:
+        if last_modified_utc is None:
+            continue
+        recording_timestamp = int(last_modified_utc.timestamp())
+        if first_timestamp is None:
+            first_timestamp = recording_timestamp
+        if game_start_timestamp is not None:
+            aligned_timestamp = game_start_timestamp + (recording_timestamp - first_timestamp)
+        else:
+            aligned_timestamp = recording_timestamp
+        if home_win_percentage is not None:
+            probs.append(float(home_win_percentage))
+            times.append(aligned_timestamp)
+    return probs, times
+
+
+def kalshi_series(kalshi_rows: Sequence[tuple]) -> tuple[list[float], list[int], list[bool]]:
+    """
+    (home probabilities, timestamps, bid/ask present) from (team_side, period_ts, price_close, yes_bid_close,
+    yes_ask_close) candle rows; away markets are flipped, the first market seen at a timestamp wins.
+    """
+    points: dict[int, tuple[float, bool]] = {}
+    for team_side, period_ts, price_close, yes_bid_close, yes_ask_close in kalshi_rows:
+        if period_ts is None:
+            continue
+        timestamp = int(period_ts.timestamp())
+        has_bid_ask = yes_bid_close is not None and yes_ask_close is not None
+        # Same price logic as the probabilities endpoint
+        if price_close is not None:
+            display_price = float(price_close)
+        elif has_bid_ask:
+            display_price = (yes_bid_close + yes_ask_close) / 2.0
+        else:
+            continue
+        prob = display_price / 100.0  # Cents to probability
+        if timestamp in points:
+            continue
+        if team_side == "home":
+            points[timestamp] = (prob, has_bid_ask)
+        elif team_side == "away":
+            points[timestamp] = (1.0 - prob, has_bid_ask)
+    times = sorted(points)
+    return [points[t][0] for t in times], times, [points[t][1] for t in times]
+
+
+def align_nearest(espn_times: Sequence[int], kalshi_times: Sequence[int]) -> list[tuple[int, int]]:
+    """(espn index, kalshi index) pairs matching each ESPN point to its nearest Kalshi point within the window."""
+    espn_idx, kalshi_idx = stats_kernel.align_nearest(espn_times, kalshi_times, ALIGNMENT_WINDOW_SECONDS)
+    return list(zip(espn_idx.tolist(), kalshi_idx.tolist()))
+
+
+def _lead_changes(probs: Sequence[float]) -> int:
+    changes = 0
+    if len(probs) > 1:
+        was_home_favorite = probs[0] > 0.5
+        for prob in probs[1:]:
+            is_home_favorite = prob > 0.5
+            if is_home_favorite != was_home_favorite:
+                changes += 1
+                was_home_favorite = is_home_favorite
+    return changes
+
+
+def _series_partial(
+    probs: list[float],
+    times: list[int],
+    actual_outcome: Optional[int],
+    game_start_timestamp: Optional[int],
+    duration_seconds: Optional[int],
+) -> dict[str, Any]:
+    partial: dict[str, Any] = {
+        "volatility": calculate_probability_volatility(probs),
+        "std_dev": calculate_standard_deviation(probs),
+        "mad": calculate_mean_absolute_deviation(probs),
+        "lead_changes": _lead_changes(probs),
+        "extreme_rate": calculate_extreme_probability_rate(probs),
+        "brier": None,
+        "log_loss": None,
+        "phase_brier": None,
+        "reliability": None,
+    }
+    if actual_outcome is not None:
+        partial["brier"] = calculate_brier_score(probs, actual_outcome)
+        partial["log_loss"] = calculate_log_loss(probs, actual_outcome)
+        counts, sum_p, sum_y = reliability_bin_sums(probs, [actual_outcome] * len(probs), RELIABILITY_BINS)
+        partial["reliability"] = [counts.tolist(), sum_p.tolist(), sum_y.tolist()]
+        if game_start_timestamp is not None and duration_seconds:
+            partial["phase_brier"] = calculate_phase_brier_scores(
+                probs, times, game_start_timestamp, actual_outcome, duration_seconds
+            )
+    return partial
+
+
+def compute_game_partial(
+    info: dict[str, Any],
+    espn_rows: Sequence[tuple],
+    kalshi_rows: Sequence[tuple],
+    duration_seconds: Optional[int],
+) -> Optional[dict[str, Any]]:
+    """
+    The partial aggregate of one game (JSON-serializable), or None when it has no usable ESPN points.
+
+    info carries event_date, home_won and final scores; espn_rows/kalshi_rows are the game's rows as
+    fetched by the aggregate endpoint; duration_seconds is the ESPN recording duration.
+    """
+    event_date = info.get("event_date")
+    game_start_timestamp = int(event_date.timestamp()) if event_date else None
+    espn_probs, espn_times = espn_series(espn_rows, game_start_timestamp)
+    if not espn_probs:
+        return None
+    kalshi_probs, kalshi_times, kalshi_bid_ask = kalshi_series(kalshi_rows)
+    home_won = info.get("home_won")
+    actual_outcome = None if home_won is None else (1 if home_won else 0)
+
+    partial: dict[str, Any] = {
+        "v": PARTIAL_VERSION,
+        # ESPN's last probability is 0 or 1 once the game is over
+        "final": espn_probs[-1] in (0.0, 1.0) and actual_outcome is not None,
+        "espn": _series_partial(espn_probs, espn_times, actual_outcome, game_start_timestamp, duration_seconds),
+        "kalshi": None,
+        "final_margin": None,
+        "divergence": None,
+        "disagreement": None,
+        "decision": None,
+        "profit": None,
+    }
+    if not kalshi_probs:
+        return partial
+
+    partial["kalshi"] = _series_partial(kalshi_probs, kalshi_times, actual_outcome, game_start_timestamp, duration_seconds)
+    if info.get("final_home_score") is not None and info.get("final_away_score") is not None:
+        partial["final_margin"] = abs(info["final_home_score"] - info["final_away_score"])
+
+    divergence = calculate_espn_kalshi_divergence(espn_probs, kalshi_probs, espn_times, kalshi_times)
+    partial["divergence"] = {
+        "correlation": divergence.get("correlation"),
+        "mae": divergence.get("mean_absolute_difference"),
+        "max_error": divergence.get("max_absolute_difference"),
+        "sign_flips": divergence.get("sign_flips"),
+        "data_points": divergence.get("data_points", 0),
+    }
+    if actual_outcome is None:
+        return partial
+
+    pairs = align_nearest(espn_times, kalshi_times)
+    disagreement = [[0, 0] for _ in DISAGREEMENT_BINS]  # [count, home wins] per bin
+    for i, k in pairs:
+        d = espn_probs[i] - kalshi_probs[k]
+        for b, (bin_min, bin_max) in enumerate(DISAGREEMENT_BINS):
+            if bin_min <= d < bin_max:
+                disagreement[b][0] += 1
+                disagreement[b][1] += actual_outcome
+                break
+    partial["disagreement"] = disagreement
+
+    if pairs and game_start_timestamp is not None and duration_seconds:
+        aligned_espn = [espn_probs[i] for i, _ in pairs]
+        aligned_kalshi = [kalshi_probs[k] for _, k in pairs]
+        decision = calculate_decision_weighted_metrics(
+            aligned_espn,
+            aligned_kalshi,
+            [kalshi_times[k] for _, k in pairs],
+            [kalshi_bid_ask[k] for _, k in pairs],
+            actual_outcome,
+            game_start_timestamp,
+            duration_seconds,
+        )
+        partial["decision"] = {
+            "time_weighted_brier_espn": decision.get("time_weighted_brier_espn"),
+            "time_weighted_brier_kalshi": decision.get("time_weighted_brier_kalshi"),
+            "confidence_weighted_brier_espn": decision.get("confidence_weighted_brier_espn"),
+            "confidence_weighted_brier_kalshi": decision.get("confidence_weighted_brier_kalshi"),
+            "distance_weighted_mae": decision.get("distance_weighted_mae"),
+            "ev_positive_disagreements": (decision.get("ev_positive_disagreements") or {}).get("count"),
+        }
+        profit = calculate_profit_proxy(aligned_espn, aligned_kalshi, [actual_outcome] * len(aligned_espn), threshold=0.05)
+        partial["profit"] = {
+            "signal_event_count": profit.get("signal_event_count"),
+            "win_rate_positive_edge": profit.get("win_rate_positive_edge"),
+            "win_rate_negative_edge": profit.get("win_rate_negative_edge"),
+        }
+    return partial
+
+
+# --- Summaries over per-game values -------------------------------------------------------------------
+
+def safe_mean(values: list[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+def safe_median(values: list[float]) -> Optional[float]:
+    if not values:
+        return None
+    sorted_vals = sorted(values)
+    mid = len(sorted_vals) // 2
+    if len(sorted_vals) % 2 == 0:
+        return (sorted_vals[mid - 1] + sorted_vals[mid]) / 2.0
+    return sorted_vals[mid]
+
+
+def safe_std_dev(values: list[float]) -> Optional[float]:
+    if len(values) < 2:
+        return None
+    mean = sum(values) / len(values)
+    variance = sum((v - mean) ** 2 for v in values) / len(values)
+    return math.sqrt(variance)
+
+
+def safe_percentile(values: list[float], percentile: float) -> Optional[float]:
+    """Calculate percentile (0-100)"""
+    if not values:
+        return None
+    sorted_vals = sorted(values)
+    k = (len(sorted_vals) - 1) * (percentile / 100.0)
+    floor = int(k)
+    ceil = floor + 1
+    if ceil >= len(sorted_vals):
+        return sorted_vals[-1]
+    weight = k - floor
+    return sorted_vals[floor] * (1 - weight) + sorted_vals[ceil] * weight
+
+
+def safe_skewness(values: list[float]) -> Optional[float]:
+    """Calculate skewness (measure of asymmetry)"""
+    if len(values) < 3:
+        return None
+    mean = sum(values) / len(values)
+    std_dev = safe_std_dev(values)
+    if std_dev == 0:
+        return None
+    n = len(values)
+    return (n / ((n - 1) * (n - 2))) * sum(((v - mean) / std_dev) ** 3 for v in values)
+
+
+def safe_kurtosis(values: list[float]) -> Optional[float]:
+    """Calculate excess kurtosis (measure of tail heaviness)"""
+    if len(values) < 4:
+        return None
+    mean = sum(values) / len(values)
+    std_dev = safe_std_dev(values)
+    if std_dev == 0:
+        return None
+    n = len(values)
+    return ((n * (n + 1) / ((n - 1) * (n - 2) * (n - 3))) * sum(((v - mean) / std_dev) ** 4 for v in values)
+            - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+
+
+def _distribution(values: list[float], *, full: bool = False) -> dict[str, Any]:
+    out = {
+        "mean": safe_mean(values),
+        "median": safe_median(values),
+        "std_dev": safe_std_dev(values),
+        "min": min(values) if values else None,
+        "max": max(values) if values else None,
+        "p25": safe_percentile(values, 25),
+        "p75": safe_percentile(values, 75),
+        "p90": safe_percentile(values, 90),
+        "p95": safe_percentile(values, 95),
+    }
+    if full:
+        out.update({"skewness": safe_skewness(values), "kurtosis": safe_kurtosis(values), "count": len(values)})
+    out["distribution"] = sorted(values)
+    return out
+
+
+def _values(partials: Iterable[dict[str, Any]], *path: str) -> list[Any]:
+    """Non-null values at path (e.g. "espn", "brier") across partials, in partial order."""
+    out = []
+    for partial in partials:
+        value: Any = partial
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                break
+        if value is not None:
+            out.append(value)
+    return out
+
+
+def _reliability(partials: list[dict[str, Any]], source: str) -> Optional[dict[str, Any]]:
+    sums = _values(partials, source, "reliability")
+    if not sums:
+        return None
+    total = np.sum(np.asarray(sums, dtype=np.float64), axis=0)
+    if total[0].sum() == 0:
+        return None
+    return reliability_curve_from_sums(total[0], total[1], total[2], bins=RELIABILITY_BINS)
+
+
+def _phase_means(partials: list[dict[str, Any]], source: str) -> dict[str, Optional[float]]:
+    return {phase: safe_mean(_values(partials, source, "phase_brier", phase)) for phase in PHASES}
+
+
+def merge_game_partials(partials: Sequence[dict[str, Any]], total_games: int) -> dict[str, Any]:
+    """The /api/stats/aggregate response for the given per-game partials (in game order)."""
+    partials = list(partials)
+    with_kalshi = [p for p in partials if p.get("kalshi")]
+
+    espn_brier = _values(partials, "espn", "brier")
+    espn_log_loss = _values(partials, "espn", "log_loss")
+    espn_volatility = _values(partials, "espn", "volatility")
+    espn_std = _values(partials, "espn", "std_dev")
+    espn_mad = _values(partials, "espn", "mad")
+    espn_lead_changes = _values(partials, "espn", "lead_changes")
+    espn_extreme = _values(partials, "espn", "extreme_rate")
+
+    kalshi_brier = _values(partials, "kalshi", "brier")
+    kalshi_volatility = _values(partials, "kalshi", "volatility")
+    kalshi_std = _values(partials, "kalshi", "std_dev")
+    kalshi_mad = _values(partials, "kalshi", "mad")
+    kalshi_lead_changes = _values(partials, "kalshi", "lead_changes")
+    kalshi_extreme = _values(partials, "kalshi", "extreme_rate")
+    volatility_margins = [p.get("final_margin") for p in with_kalshi]
+
+    correlations = _values(partials, "divergence", "correlation")
+    maes = _values(partials, "divergence", "mae")
+    max_errors = _values(partials, "divergence", "max_error")
+    sign_flips = _values(partials, "divergence", "sign_flips")
+    data_points = _values(partials, "divergence", "data_points")
+    points_per_game = [n for n in data_points if n > 0]
+    total_aligned_points = sum(data_points)
+
+    espn_phases = _phase_means(partials, "espn")
+    kalshi_phases = _phase_means(partials, "kalshi")
+    any_espn_phase = any(_values(partials, "espn", "phase_brier", phase) for phase in PHASES)
+    any_kalshi_phase = any(_values(partials, "kalshi", "phase_brier", phase) for phase in PHASES)
+
+    confidence_espn = _values(partials, "decision", "confidence_weighted_brier_espn")
+    confidence_kalshi = _values(partials, "decision", "confidence_weighted_brier_kalshi")
+    time_weighted_espn = _values(partials, "decision", "time_weighted_brier_espn")
+    time_weighted_kalshi = _values(partials, "decision", "time_weighted_brier_kalshi")
+    distance_mads = _values(partials, "decision", "distance_weighted_mae")
+    ev_positive = [n for n in _values(partials, "decision", "ev_positive_disagreements") if n]
+    signal_counts = _values(partials, "profit", "signal_event_count")
+    win_rates_positive = _values(partials, "profit", "win_rate_positive_edge")
+    win_rates_negative = _values(partials, "profit", "win_rate_negative_edge")
+
+    disagreement_totals = np.zeros((len(DISAGREEMENT_BINS), 2), dtype=np.int64)
+    for bins in _values(partials, "disagreement"):
+        disagreement_totals += np.asarray(bins, dtype=np.int64)
+    binned_disagreement = [
+        {
+            "bin_min": bin_min,
+            "bin_max": bin_max,
+            "bin_center": (bin_min + bin_max) / 2.0,
+            "home_win_rate": int(wins) / int(count),
+            "count": int(count),
+        }
+        for (bin_min, bin_max), (count, wins) in zip(DISAGREEMENT_BINS, disagreement_totals)
+        if count
+    ]
+
+    espn_brier_summary = _distribution(espn_brier, full=True)
+    espn_volatility_summary = _distribution(espn_volatility)
+    kalshi_volatility_summary = _distribution(kalshi_volatility)
+    del kalshi_volatility_summary["min"], kalshi_volatility_summary["max"]
+    mae_summary = _distribution(maes)
+    del mae_summary["min"], mae_summary["max"]
+
+    games_with_stats = len(partials)
+    return {
+        "total_games": total_games,
+        "games_processed": len(partials),
+        "games_with_stats": games_with_stats,
+        "espn": {
+            "time_averaged_in_game_brier_error": espn_brier_summary,
+            "log_loss": {
+                "mean": safe_mean(espn_log_loss),
+                "median": safe_median(espn_log_loss),
+                "std_dev": safe_std_dev(espn_log_loss),
+                "min": min(espn_log_loss) if espn_log_loss else None,
+                "max": max(espn_log_loss) if espn_log_loss else None,
+                "count": len(espn_log_loss),
+            },
+            "volatility": espn_volatility_summary,
+            "standard_deviation": {
+                "mean": safe_mean(espn_std),
+                "median": safe_median(espn_std),
+                "std_dev": safe_std_dev(espn_std),
+            },
+            "mean_absolute_deviation": {
+                "mean": safe_mean(espn_mad),
+                "median": safe_median(espn_mad),
+            },
+            "lead_changes": {
+                "mean": safe_mean(espn_lead_changes),
+                "median": safe_median(espn_lead_changes),
+                "total": sum(espn_lead_changes),
+            },
+            # Story 2.4: Extreme probability rate
+            "extreme_probability_rate": safe_mean(espn_extreme),
+            # Story 3.1: ESPN reliability curve
+            "reliability_curve": _reliability(partials, "espn"),
+            # Story 3.2: Phase-based Brier scores
+            "brier_by_phase": {
+                "espn": espn_phases,
+                "kalshi": kalshi_phases if any_kalshi_phase else None,
+            } if any_espn_phase else None,
+        },
+        "kalshi": {
+            "time_averaged_in_game_brier_error": _distribution(kalshi_brier, full=True) if kalshi_brier else None,
+            "volatility": kalshi_volatility_summary if kalshi_volatility else None,
+            "standard_deviation": {
+                "mean": safe_mean(kalshi_std),
+                "median": safe_median(kalshi_std),
+            } if kalshi_std else None,
+            "mean_absolute_deviation": {
+                "mean": safe_mean(kalshi_mad),
+                "median": safe_median(kalshi_mad),
+            } if kalshi_mad else None,
+            "lead_changes": {
+                "mean": safe_mean(kalshi_lead_changes),
+                "median": safe_median(kalshi_lead_changes),
+                "total": sum(kalshi_lead_changes),
+            } if kalshi_lead_changes else None,
+            # Story 2.4: Extreme probability rate
+            "extreme_probability_rate": safe_mean(kalshi_extreme),
+            "reliability_curve": _reliability(partials, "kalshi"),
+        },
+        "comparison": {
+            "correlation": _distribution(correlations, full=True) if correlations else None,
+            "mean_absolute_difference": mae_summary if maes else None,
+            "max_absolute_difference": {
+                "mean": safe_mean(max_errors),
+                "median": safe_median(max_errors),
+                "p75": safe_percentile(max_errors, 75),
+                "p90": safe_percentile(max_errors, 90),
+                "max": max(max_errors) if max_errors else None,
+                "distribution": sorted(max_errors),  # For optional histogram
+            } if max_errors else None,
+            "sign_flips": {
+                "total": sum(sign_flips),
+                "mean": safe_mean(sign_flips),
+                "median": safe_median(sign_flips),
+                "p75": safe_percentile(sign_flips, 75),
+                "max": max(sign_flips) if sign_flips else None,
+            } if sign_flips else None,
+            "total_aligned_data_points": total_aligned_points,
+            "avg_aligned_points_per_game": total_aligned_points / games_with_stats if games_with_stats > 0 else 0,
+            # Story 3.4: Disagreement vs Outcome
+            "disagreement_vs_outcome": binned_disagreement or None,
+            # Story 4.1: Decision-weighted metrics
+            "decision_weighted_brier": {
+                "confidence_weighted": {
+                    "espn": safe_mean(confidence_espn),
+                    "kalshi": safe_mean(confidence_kalshi),
+                },
+                "market_actionable": {
+                    "espn": safe_mean(time_weighted_espn),
+                    "kalshi": safe_mean(time_weighted_kalshi),
+                },
+            } if (confidence_espn or time_weighted_espn) else None,
+            "distance_weighted_mad": {
+                "mean": safe_mean(distance_mads),
+                "median": safe_median(distance_mads),
+            } if distance_mads else None,
+            "ev_positive_disagreements": {
+                "total": sum(ev_positive),
+                "mean": safe_mean(ev_positive),
+                "median": safe_median(ev_positive),
+            } if ev_positive else None,
+            # Story 4.2: Profit Proxy (Optional - sanity check only)
+            "profit_proxy": {
+                "signal_event_count": sum(signal_counts),
+                "win_rate_positive_edge": safe_mean(win_rates_positive),
+                "win_rate_negative_edge": safe_mean(win_rates_negative),
+            } if signal_counts else None,
+            # Story 2.1: Data Coverage metrics
+            # Alignment window: 60 seconds (see calculate_espn_kalshi_divergence docstring)
+            "data_coverage": {
+                "median_points_per_game": safe_median(points_per_game),
+                "p25_points_per_game": safe_percentile(points_per_game, 25),
+                "p75_points_per_game": safe_percentile(points_per_game, 75),
+                "mean_points_per_game": safe_mean(points_per_game),
+                "min_points_per_game": min(points_per_game) if points_per_game else None,
+                "max_points_per_game": max(points_per_game) if points_per_game else None,
+            } if points_per_game else None,
+            # For scatter plots and correlation analysis
+            "espn_volatility_vs_kalshi_volatility": [
+                {"espn": p["espn"]["volatility"], "kalshi": p["kalshi"]["volatility"], "final_margin": m}
+                for p, m in zip(with_kalshi, volatility_margins)
+            ],
+        },
+    }
+
+
+# --- Storage ------------------------------------------------------------------------------------------
+
+def load_partials(conn: Any, game_ids: Sequence[str]) -> dict[str, dict[str, Any]]:
+    """Stored partials (current PARTIAL_VERSION only) for game_ids; empty if the table doesn't exist yet."""
+    if not game_ids:
+        return {}
+    try:
+        # Savepoint: a missing table must not abort the caller's transaction.
+        with conn.transaction():
+            rows = conn.execute(
+                f"SELECT game_id, partial FROM {PARTIALS_TABLE} WHERE game_id = ANY(%s) AND partial_version = %s",
+                (list(game_ids), PARTIAL_VERSION),
+            ).fetchall()
+    except psycopg.errors.UndefinedTable:
+        return {}
+    return {str(r[0]): (r[1] if isinstance(r[1], dict) else json.loads(r[1])) for r in rows}
+
+
+def save_partials(conn: Any, partials: dict[str, dict[str, Any]]) -> int:
+    """Upsert partials (game_id -> partial) and commit. Returns the number written."""
+    if not partials:
+        return 0
+    conn.execute(PARTIALS_TABLE_SQL)
+    with conn.cursor() as cur:
+        cur.executemany(
+            f"""
+            INSERT INTO {PARTIALS_TABLE} (game_id, partial_version, partial)
+            VALUES (%s, %s, %s::jsonb)
+            ON CONFLICT (game_id) DO UPDATE SET
+                partial_version = EXCLUDED.partial_version,
+                partial = EXCLUDED.partial,
+                computed_at = now()
+            """,
+            [(game_id, PARTIAL_VERSION, json.dumps(partial)) for game_id, partial in partials.items()],
+        )
+    conn.commit()
+    return len(partials)
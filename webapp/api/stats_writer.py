@@ -0,0 +1,217 @@
+"""
+Write-behind queue for derived.game_stats.
+
+Design Pattern: Write-behind (coalescing) buffer flushed by a background thread
+Algorithm: Stats of completed games are queued by game_id (a newer write for the same game replaces the
+           pending one). A flush writes every pending row in one transaction: one transaction-scoped advisory
+           lock with a fixed key (identical in every process, unlike Python's randomized hash()), then a
+           single executemany upsert in game_id order. Rows of a failed flush are re-queued; a row that has
+           been in MAX_FLUSH_ATTEMPTS failed batches is then written on its own and dropped (logged) if it
+           fails alone, so one bad row cannot hold back every later game's stats.
+Big O: O(1) per enqueue; O(k) per flush of k rows
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import zlib
+from contextlib import AbstractContextManager
+from typing import Any, Callable, Optional
+
+from .db import get_db_connection
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+GAME_STATS_TABLE = "derived.game_stats"
+
+# Advisory lock serializing game_stats writers across processes (must not depend on PYTHONHASHSEED).
+GAME_STATS_LOCK_KEY = zlib.crc32(GAME_STATS_TABLE.encode()) & 0x7FFFFFFF
+
+FLUSH_INTERVAL_SECONDS = 2.0
+MAX_FLUSH_ATTEMPTS = 3  # Failed batch writes before a row is retried on its own
+
+_INSERT_SQL = f"""
+INSERT INTO {GAME_STATS_TABLE} (
+    game_id, season_label, home_team_abbrev, away_team_abbrev,
+    final_home_score, final_away_score, home_won,
+    espn_stats, kalshi_stats, divergence_stats
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+_ON_CONFLICT_KEEP = "ON CONFLICT (game_id) DO NOTHING"
+_ON_CONFLICT_OVERWRITE = """ON CONFLICT (game_id) DO UPDATE SET
+    espn_stats = EXCLUDED.espn_stats,
+    kalshi_stats = EXCLUDED.kalshi_stats,
+    divergence_stats = EXCLUDED.divergence_stats,
+    calculated_at = now()"""
+
+
+def game_stats_row(game_id: str, stats: dict[str, Any], metadata: dict[str, Any]) -> tuple:
+    """The derived.game_stats row for one game's get_game_stats result and its metadata."""
+    return (
+        game_id,
+        metadata.get("season_label"),
+        metadata.get("home_team_abbrev"),
+        metadata.get("away_team_abbrev"),
+        stats.get("final_score", {}).get("home"),
+        stats.get("final_score", {}).get("away"),
+        stats.get("home_won"),
+        json.dumps(stats.get("espn", {})),
+        json.dumps(stats.get("kalshi")) if stats.get("kalshi") else None,
+        json.dumps(stats.get("divergence")) if stats.get("divergence") else None,
+    )
+
+
+def write_game_stats(conn: Any, rows: list[tuple], *, overwrite: bool = False) -> int:
+    """
+    Upsert game_stats rows in one transaction and commit. Returns the number of rows sent.
+
+    Existing rows are kept unless overwrite is set. Rows are written in game_id order under
+    GAME_STATS_LOCK_KEY, so concurrent writers never interleave.
+    """
+    if not rows:
+        return 0
+    try:
+        conn.execute("SELECT pg_advisory_xact_lock(%s)", (GAME_STATS_LOCK_KEY,))
+        with conn.cursor() as cur:
+            cur.executemany(
+                _INSERT_SQL + (_ON_CONFLICT_OVERWRITE if overwrite else _ON_CONFLICT_KEEP),
+                sorted(rows, key=lambda row: row[0]),
+            )
+    except Exception:
+        conn.rollback()  # Releases the lock; leaves the (pooled) connection usable
+        raise
+    conn.commit()
+    return len(rows)
+
+
+class GameStatsWriter:
+    """
+    Coalescing write-behind buffer for derived.game_stats.
+
+    enqueue() returns immediately; a daemon thread flushes every FLUSH_INTERVAL_SECONDS (started on the
+    first enqueue unless autostart is False, in which case the owner calls flush()). stop() flushes
+    what is left. Rows that keep failing in batches are isolated after MAX_FLUSH_ATTEMPTS and dropped
+    if they fail on their own.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], AbstractContextManager[Any]] = get_db_connection,
+        *,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        overwrite: bool = False,
+        autostart: bool = True,
+    ):
+        self._connect = connect
+        self.flush_interval = flush_interval
+        self.overwrite = overwrite
+        self.autostart = autostart
+        self._pending: dict[str, tuple] = {}
+        self._attempts: dict[str, int] = {}  # Failed batch writes per queued game (guarded by _lock)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, game_id: str, stats: dict[str, Any], metadata: dict[str, Any]) -> None:
+        row = game_stats_row(game_id, stats, metadata)
+        with self._lock:
+            self._pending[game_id] = row
+            self._attempts.pop(game_id, None)  # A newer row starts over
+            if self.autostart and self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, name="game-stats-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self) -> int:
+        """
+        Write every pending row now. Returns the number written.
+
+        When the batch fails, its rows are re-queued, except those that have now failed MAX_FLUSH_ATTEMPTS
+        times: they are written one at a time, and a row that still fails on its own is dropped.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                with self._connect() as conn:
+                    written = write_game_stats(conn, list(batch.values()), overwrite=self.overwrite)
+            except Exception as e:
+                with self._lock:
+                    exhausted = {}
+                    for game_id, row in batch.items():
+                        if game_id in self._pending:
+                            continue  # A newer enqueue wins
+                        attempts = self._attempts.get(game_id, 0) + 1
+                        if attempts >= MAX_FLUSH_ATTEMPTS:
+                            exhausted[game_id] = row
+                            self._attempts.pop(game_id, None)
+                        else:
+                            self._pending[game_id] = row
+                            self._attempts[game_id] = attempts
+                logger.warning(
+                    f"Failed to write stats for {len(batch)} games ({len(exhausted)} retried individually): {e}",
+                    exc_info=True,
+                )
+                return self._write_individually(exhausted) if exhausted else 0
+            with self._lock:
+                for game_id in batch:
+                    self._attempts.pop(game_id, None)
+            logger.info(f"Saved stats to database for {written} games")
+            return written
+
+    def _write_individually(self, rows: dict[str, tuple]) -> int:
+        """Write rows one transaction each, dropping any that fail. Re-queues all if no connection is available."""
+        written = 0
+        done: set[str] = set()
+        try:
+            with self._connect() as conn:
+                for game_id, row in rows.items():
+                    done.add(game_id)
+                    try:
+                        written += write_game_stats(conn, [row], overwrite=self.overwrite)
+                    except Exception as e:
+                        logger.error(
+                            f"Dropping stats for game {game_id} after {MAX_FLUSH_ATTEMPTS} failed writes: {e}",
+                            exc_info=True,
+                        )
+        except Exception as e:
+            logger.warning(f"Failed to connect to write stats individually, will retry: {e}", exc_info=True)
+            with self._lock:
+                for game_id, row in rows.items():
+                    if game_id not in done and game_id not in self._pending:
+                        self._pending[game_id] = row
+                        self._attempts[game_id] = MAX_FLUSH_ATTEMPTS - 1  # Isolate again on the next failure
+        if written:
+            logger.info(f"Saved stats to database for {written} games")
+        return written
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+
+_writer: Optional[GameStatsWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_game_stats_writer() -> GameStatsWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = GameStatsWriter()
+        return _writer
@@ -0,0 +1,91 @@
+"""
+Incremental (record-at-a-time) responses for the bulk endpoints.
+
+Design Pattern: Iterator Pattern - endpoints yield plain dict records, this module frames them
+Algorithm: Each record is serialized and flushed as soon as it is produced, either as one JSON
+           object per line (NDJSON) or as a Server-Sent Event whose event name is the record's "type"
+Big O: O(r) per record of size r; memory is bounded by the largest single record, not the response
+"""
+
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+STREAM_FORMATS = {"ndjson": NDJSON_MEDIA_TYPE, "sse": SSE_MEDIA_TYPE}
+
+# Same headers as the log tail stream: no caching, no proxy buffering (records must reach the client as written)
+STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable buffering for nginx
+}
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps fallback for numpy scalars/arrays and dates (what the endpoints' dicts can contain)."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _finite(value: Any) -> Any:
+    """Copy of value with NaN/Infinity floats (including inside numpy values) replaced by None."""
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return _finite(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def encode_record(record: dict[str, Any], fmt: str = "ndjson") -> str:
+    """
+    Serialize one record as an NDJSON line or an SSE frame (event: <type>, data: <json>).
+
+    Non-finite floats become null (bare NaN/Infinity tokens are not JSON); records without any are
+    serialized in one pass.
+    """
+    try:
+        payload = json.dumps(record, default=_json_default, separators=(",", ":"), allow_nan=False)
+    except ValueError:
+        payload = json.dumps(_finite(record), default=_json_default, separators=(",", ":"), allow_nan=False)
+    if fmt == "sse":
+        return f"event: {record.get('type', 'message')}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+def encode_records(records: Iterable[dict[str, Any]], fmt: str = "ndjson") -> Iterator[str]:
+    for record in records:
+        yield encode_record(record, fmt)
+
+
+def check_stream_format(fmt: str) -> str:
+    """Validate a format query parameter before any work starts (errors can't be sent once streaming)."""
+    if fmt not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format '{fmt}'. Must be one of: {', '.join(STREAM_FORMATS)}")
+    return fmt
+
+
+def stream_records(records: Iterable[dict[str, Any]], fmt: str = "ndjson") -> StreamingResponse:
+    """
+    Wrap a (sync) record generator in a StreamingResponse.
+
+    Starlette iterates sync generators in its threadpool, so blocking work inside the generator
+    (DB queries, simulations) doesn't stall the event loop.
+    """
+    fmt = check_stream_format(fmt)
+    return StreamingResponse(encode_records(records, fmt), media_type=STREAM_FORMATS[fmt], headers=STREAM_HEADERS)
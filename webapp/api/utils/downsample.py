@@ -0,0 +1,194 @@
+"""
+Shape-preserving downsampling for chart time series (ESPN probabilities, Kalshi candles).
+
+Design Pattern: Pure selection functions + precomputed multi-resolution pyramid
+Algorithm: LTTB (Largest-Triangle-Three-Buckets) keeps, per bucket, the point forming the largest triangle
+           with the previously kept point and the next bucket's average, so peaks and turns survive.
+           Min/max keeps each equal-time (pixel) bucket's lowest and highest point, so every spike survives.
+           Both select existing points: records come back unchanged, only fewer of them.
+           SeriesPyramid precomputes selections at halving sizes; a viewport is served by downsampling the
+           window of the coarsest level still denser than max_points, found by binary search on each
+           level's timestamps, so query cost follows max_points rather than the raw series length.
+Big O: O(n) per downsample; pyramid build O(n) (levels halve); pyramid query O(L log n + max_points)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Union
+
+import numpy as np
+from fastapi import HTTPException
+
+MIN_MAX_POINTS = 16  # Smallest max_points the endpoints accept
+PYRAMID_MIN_POINTS = 128  # Coarsest pyramid level size
+
+ValueGetter = Union[str, Callable[[dict[str, Any]], Any]]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of the LTTB selection of at most max_points points (always includes the first and last point).
+
+    x must be ascending. NaN y values are never chosen as a bucket's representative unless the bucket is all NaN.
+    """
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1][:max(max_points, 0)], dtype=np.int64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Buckets 1..max_points-2 split the interior points evenly; edges[i] is bucket i's first index
+    edges = (np.arange(max_points - 1) * ((n - 2) / (max_points - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    out = np.empty(max_points, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x = x[nlo:nhi].mean()
+        with np.errstate(invalid="ignore"):
+            avg_y = np.nanmean(y[nlo:nhi]) if not np.isnan(y[nlo:nhi]).all() else y[a]
+            area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        area = np.where(np.isnan(area), -1.0, area)
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices keeping the min and max y of each equal-width time bucket, plus the first and last point.
+
+    Uses (max_points - 2) // 2 buckets, so at most max_points points are returned, in time order.
+    """
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 4:
+        return lttb_indices(x, y, max_points)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    num_buckets = (max_points - 2) // 2
+    span = x[-1] - x[0]
+    if span <= 0:
+        bucket = np.zeros(n, dtype=np.int64)
+    else:
+        bucket = np.minimum(((x - x[0]) / span * num_buckets).astype(np.int64), num_buckets - 1)
+
+    nan = np.isnan(y)
+    by_min = np.lexsort((np.where(nan, np.inf, y), bucket))  # Within each bucket: lowest y first
+    by_max = np.lexsort((np.where(nan, np.inf, -y), bucket))  # Within each bucket: highest y first
+    sorted_buckets = bucket[by_min]
+    starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+    keep = np.unique(np.concatenate(([0, n - 1], by_min[starts], by_max[starts])))
+    return keep
+
+
+DOWNSAMPLE_METHODS: dict[str, Callable[[np.ndarray, np.ndarray, int], np.ndarray]] = {
+    "lttb": lttb_indices,
+    "minmax": minmax_indices,
+}
+
+
+def check_downsample_method(method: str) -> None:
+    """Raise 400 for an unknown downsampling method."""
+    if method not in DOWNSAMPLE_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown downsample method '{method}'. Use one of: {', '.join(sorted(DOWNSAMPLE_METHODS))}"
+        )
+
+
+def _as_float(value: Any) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def series_arrays(records: Sequence[dict[str, Any]], x: ValueGetter, y: ValueGetter) -> tuple[np.ndarray, np.ndarray]:
+    """(x, y) float arrays for records; x / y are keys or callables. Datetimes become Unix seconds, None becomes NaN."""
+    get_x = x if callable(x) else (lambda r: r.get(x))
+    get_y = y if callable(y) else (lambda r: r.get(y))
+    xs = np.fromiter((_as_float(get_x(r)) for r in records), dtype=np.float64, count=len(records))
+    ys = np.fromiter((_as_float(get_y(r)) for r in records), dtype=np.float64, count=len(records))
+    return xs, ys
+
+
+def window_bounds(x: np.ndarray, start: Optional[float], end: Optional[float]) -> tuple[int, int]:
+    """[lo, hi) index range of ascending x within [start, end] (open-ended when None)."""
+    lo = 0 if start is None else int(np.searchsorted(x, start, side="left"))
+    hi = len(x) if end is None else int(np.searchsorted(x, end, side="right"))
+    return lo, max(lo, hi)
+
+
+def downsample_records(
+    records: Sequence[dict[str, Any]],
+    max_points: Optional[int],
+    *,
+    x: ValueGetter = "time",
+    y: ValueGetter,
+    method: str = "lttb",
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> list[dict[str, Any]]:
+    """Records within [start, end], downsampled to at most max_points (None keeps every point in the window)."""
+    xs, ys = series_arrays(records, x, y)
+    lo, hi = window_bounds(xs, start, end)
+    if max_points is None or hi - lo <= max_points:
+        return list(records[lo:hi])
+    selected = DOWNSAMPLE_METHODS[method](xs[lo:hi], ys[lo:hi], max_points)
+    return [records[lo + int(i)] for i in selected]
+
+
+class SeriesPyramid:
+    """
+    Precomputed selections of one series at halving sizes, for cheap viewport (zoom) queries.
+
+    levels[0] is every point; each further level downsamples the previous one to half its size,
+    down to PYRAMID_MIN_POINTS. Levels hold indices into the original records; level_x holds each
+    level's timestamps so a query binary-searches them without gathering x per level.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, *, method: str = "lttb", min_points: int = PYRAMID_MIN_POINTS):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.method = method
+        select = DOWNSAMPLE_METHODS[method]
+        self.levels: list[np.ndarray] = [np.arange(len(self.x))]
+        size = len(self.x) // 2
+        while size >= min_points:
+            prev = self.levels[-1]
+            self.levels.append(prev[select(self.x[prev], self.y[prev], size)])
+            size = len(self.levels[-1]) // 2
+        self.level_x: list[np.ndarray] = [self.x] + [self.x[level] for level in self.levels[1:]]
+
+    @classmethod
+    def from_records(cls, records: Sequence[dict[str, Any]], *, x: ValueGetter = "time", y: ValueGetter,
+                     method: str = "lttb") -> "SeriesPyramid":
+        xs, ys = series_arrays(records, x, y)
+        return cls(xs, ys, method=method)
+
+    def select(self, max_points: Optional[int], start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """
+        Indices of at most max_points points within [start, end].
+
+        The window of the finest level that fits is returned as is when it is the full resolution; otherwise
+        the next denser level's window (at most ~2x max_points points) is downsampled to exactly max_points.
+        """
+        denser: Optional[np.ndarray] = None
+        for level, level_x in zip(self.levels, self.level_x):
+            lo, hi = window_bounds(level_x, start, end)
+            window = level[lo:hi]
+            if max_points is None or len(window) <= max_points:
+                if denser is None:
+                    return window
+                break
+            denser = window
+        return denser[DOWNSAMPLE_METHODS[self.method](self.x[denser], self.y[denser], max_points)]
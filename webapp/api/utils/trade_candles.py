@@ -1,9 +1,13 @@
 """
 Trade-derived candlestick aggregation utilities.
 
-Design Pattern: Split Architecture (DB layer + Pure aggregation layer)
-Algorithm: Time-Window OHLC Aggregation
-Big O: fetch_trades() = O(log n + k) with index, aggregate_trades() = O(n log n) worst case
+Design Pattern: Split Architecture (DB layer + Pure aggregation layer) + Aligned block cache
+Algorithm: Time-Window OHLC Aggregation; 1s/10s/60s candles are materialized in kalshi.trade_candles_v1
+           by the trade loader (scripts/lib/_trade_rollups_lib.py) and served by range scan in
+           CANDLE_BLOCK_SECONDS-aligned blocks, so overlapping zoom/pan windows reuse cached blocks;
+           blocks before a ticker's coverage watermark are aggregated from raw trades
+Big O: fetch_candles() = O(log n + c) with c = candles in the blocks not yet cached,
+       fetch_trades() = O(log n + k) with index, aggregate_trades() = O(n log n) worst case
        (O(n) if trades are pre-sorted by created_time, but we sort per-interval)
 
 This module provides functions to generate trade-derived candlesticks from kalshi.trades.
@@ -12,12 +16,14 @@ Trade-derived candles are execution-only (last-trade prices), not bid/ask quotes
 
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Any
 import time
 import threading
 
+from scripts.lib._trade_rollups_lib import ROLLUP_INTERVALS, aggregate_trades, load_trade_rollups
+
 from ..logging_config import get_logger
 from ..cache import CACHE_ENABLED
 
@@ -31,6 +37,14 @@ _trade_cache: dict[tuple[str, int, int], tuple[list[dict[str, Any]], float]] = {
 _cache_lock = threading.Lock()
 _cache_max_size = 1000  # Maximum number of cached entries (LRU eviction)
 
+# Block cache for materialized candles
+# Cache key: (ticker, interval_seconds, block_start), blocks aligned to CANDLE_BLOCK_SECONDS
+# Cache value: (candles whose period starts in the block, cache time)
+# Cache TTL: same rule as _trade_cache, judged on the block's end
+CANDLE_BLOCK_SECONDS = 3600  # A multiple of every rollup interval, so no period straddles two blocks
+_block_cache: OrderedDict[tuple[str, int, int], tuple[list[dict[str, Any]], int]] = OrderedDict()
+_block_cache_max_size = 2000
+
 
 def fetch_trades(
     conn: Any,
@@ -139,149 +153,80 @@ def fetch_trades(
     return trades
 
 
-def aggregate_trades(
-    trade_rows: list[dict[str, Any]],
+def fetch_candles(
+    conn: Any,
+    ticker: str,
     interval_seconds: int,
+    start_ts: int,
+    end_ts: int,
 ) -> list[dict[str, Any]]:
     """
-    Aggregate trade rows into candlesticks by time interval.
-    
-    Pure function (no DB dependency) for testability.
-    Returns sparse series (only intervals with trades).
-    
-    CRITICAL: 
-    - Uses integer cents end-to-end (no float math)
-    - Sorts trades by created_time within each interval
-    - Only returns intervals that contain ≥1 trade with valid price/volume pairs
-    - Derives canonical executed price from yes_price (YES market) or 100 - no_price (NO execution)
-    
-    Args:
-        trade_rows: List of trade dicts with created_time, yes_price, no_price, count, taker_side, etc.
-        interval_seconds: Aggregation interval in seconds (1, 10, 60, etc.)
-    
-    Returns:
-        List of candlestick dicts with keys:
-        - period_ts: End of interval (TIMESTAMPTZ) - matches kalshi.candlesticks.period_ts convention
-        - interval_seconds: Interval length
-        - price_open_cents: First trade executed price in interval (integer cents)
-        - price_high_cents: Highest trade executed price in interval
-        - price_low_cents: Lowest trade executed price in interval
-        - price_close_cents: Last trade executed price in interval
-        - price_mean_cents: VWAP (volume-weighted average price) in cents
-        - volume: Total volume (SUM(count))
-        - yes_price_close_cents: Yes price from last trade
-        - no_price_close_cents: No price from last trade
-        - is_filled: False (actual data, not interpolated)
+    Trade-derived candlesticks for ticker covering trades in [start_ts, end_ts), in aggregate_trades' format.
+
+    Materialized intervals (ROLLUP_INTERVALS) are read from the rollup table one aligned block at a time:
+    cached blocks are reused across requests and the missing ones are loaded with a single range scan.
+    Other intervals, databases without the rollup tables, and windows starting before the ticker's coverage
+    watermark (kalshi.trade_candles_coverage_v1) are aggregated from raw trades (fetch_trades + aggregate_trades).
+
+    Raises:
+        ValueError: If start_ts >= end_ts
     """
-    if not trade_rows:
-        return []
-    
-    # Group trades by interval (truncate to interval boundary)
-    trades_by_interval = defaultdict(list)
-    
-    for trade in trade_rows:
-        created_time = trade["created_time"]
-        if isinstance(created_time, datetime):
-            # Normalize to UTC-aware datetime for consistent bucketing
-            if created_time.tzinfo is None:
-                # Naive datetime - assume UTC
-                created_time = created_time.replace(tzinfo=timezone.utc)
-            elif created_time.tzinfo != timezone.utc:
-                # Convert to UTC
-                created_time = created_time.astimezone(timezone.utc)
-            
-            # Truncate to interval boundary
-            # Example: interval_seconds=1: truncate microseconds
-            # Example: interval_seconds=10: truncate to 10-second boundary
-            if interval_seconds == 1:
-                interval_key = created_time.replace(microsecond=0)
-            else:
-                # Truncate to interval_seconds boundary
-                total_seconds = int(created_time.timestamp())
-                truncated_seconds = (total_seconds // interval_seconds) * interval_seconds
-                interval_key = datetime.fromtimestamp(truncated_seconds, tz=timezone.utc)
-        else:
-            # Fallback: assume it's already a datetime-like object
-            interval_key = created_time
-        
-        trades_by_interval[interval_key].append(trade)
-    
-    candlesticks = []
-    
-    for interval_ts, interval_trades in sorted(trades_by_interval.items()):
-        # CRITICAL: Sort trades by created_time within each interval
-        # Do NOT assume list order
-        interval_trades_sorted = sorted(
-            interval_trades,
-            key=lambda t: t["created_time"]
+    if start_ts >= end_ts:
+        raise ValueError(f"Invalid time window: start_ts ({start_ts}) >= end_ts ({end_ts})")
+    if interval_seconds not in ROLLUP_INTERVALS:
+        return aggregate_trades(fetch_trades(conn, ticker, start_ts, end_ts), interval_seconds)
+
+    first_period = start_ts - start_ts % interval_seconds  # Period containing start_ts
+    blocks = range(first_period - first_period % CANDLE_BLOCK_SECONDS, end_ts, CANDLE_BLOCK_SECONDS)
+    now_ts = int(time.time())
+    by_block: dict[int, list[dict[str, Any]]] = {}
+
+    if CACHE_ENABLED:
+        with _cache_lock:
+            for block in blocks:
+                key = (ticker, interval_seconds, block)
+                entry = _block_cache.get(key)
+                if entry is None:
+                    continue
+                is_completed_block = block + CANDLE_BLOCK_SECONDS < now_ts - 3600
+                if is_completed_block or now_ts - entry[1] < 300:
+                    _block_cache.move_to_end(key)
+                    by_block[block] = entry[0]
+                else:
+                    del _block_cache[key]
+
+    missing = [block for block in blocks if block not in by_block]
+    if missing:
+        span_start, span_end = missing[0], missing[-1] + CANDLE_BLOCK_SECONDS
+        query_start = time.time()
+        loaded = load_trade_rollups(conn, ticker, interval_seconds, span_start, span_end)
+        if loaded is None:
+            return aggregate_trades(fetch_trades(conn, ticker, start_ts, end_ts), interval_seconds)
+        logger.info(
+            f"[TIMING] fetch_candles({ticker}) - rollup_sql: {time.time() - query_start:.3f}s - "
+            f"blocks={len(missing)}/{len(blocks)} - rows={len(loaded)}"
         )
-        
-        # Build paired (price, volume) tuples to ensure correct VWAP calculation
-        # Derive canonical executed price: use yes_price if available, else derive from no_price
-        # For YES market: executed price is yes_price (when taker_side='yes') or yes_price (when taker_side='no', still represents YES price)
-        # If yes_price is None but no_price exists, derive: 100 - no_price (convert NO market to YES market space)
-        pairs = []
-        for t in interval_trades_sorted:
-            executed_price_cents = None
-            volume = t.get("count")
-            
-            # Determine executed price in YES market space (cents)
-            if t.get("yes_price") is not None:
-                executed_price_cents = int(t["yes_price"])
-            elif t.get("no_price") is not None:
-                # Convert NO market price to YES market space: YES = 100 - NO
-                executed_price_cents = 100 - int(t["no_price"])
-            elif t.get("price") is not None:
-                # Fallback: use price field if it exists (convert from 0-1 to cents)
-                executed_price_cents = int(float(t["price"]) * 100)
-            
-            # Only include trades with both valid price and volume
-            if executed_price_cents is not None and volume is not None:
-                pairs.append((executed_price_cents, volume))
-        
-        if not pairs:
-            continue  # Skip intervals with no valid price/volume pairs
-        
-        # Extract prices and volumes from paired tuples (guaranteed aligned)
-        executed_prices_cents = [p for p, _ in pairs]
-        volumes = [v for _, v in pairs]
-        
-        # Calculate OHLC using integer cents
-        price_open_cents = executed_prices_cents[0]  # First trade in interval
-        price_close_cents = executed_prices_cents[-1]  # Last trade in interval
-        price_high_cents = max(executed_prices_cents)
-        price_low_cents = min(executed_prices_cents)
-        
-        # Calculate VWAP in cents (volume-weighted average)
-        # Use paired tuples to ensure correct alignment (fixes VWAP bug)
-        # Use integer division for cents VWAP (floors); if you want rounding, add + total_volume/2 before //
-        total_price_volume = sum(p * v for p, v in pairs)
-        total_volume = sum(volumes)
-        price_mean_cents = total_price_volume // total_volume if total_volume > 0 else price_close_cents
-        
-        # Get yes/no prices from last trade (for reference)
-        # Note: These are the raw prices from the trade, not the executed price we calculated
-        last_trade = interval_trades_sorted[-1]
-        
-        # period_ts as Unix timestamp (seconds) for frontend compatibility
-        period_end = interval_ts + timedelta(seconds=interval_seconds)
-        candlestick = {
-            "period_ts": int(period_end.timestamp()),  # Unix timestamp (seconds) - end of period
-            "interval_seconds": interval_seconds,
-            "price_open_cents": price_open_cents,
-            "price_high_cents": price_high_cents,
-            "price_low_cents": price_low_cents,
-            "price_close_cents": price_close_cents,
-            "price_mean_cents": price_mean_cents,
-            "volume": total_volume,
-            "yes_price_close_cents": last_trade.get("yes_price"),
-            "no_price_close_cents": last_trade.get("no_price"),
-            "is_filled": False,  # Actual data, not interpolated
-        }
-        
-        candlesticks.append(candlestick)
-    
-    return candlesticks
+        fresh: dict[int, list[dict[str, Any]]] = {block: [] for block in missing}
+        for candle in loaded:
+            block = candle["period_ts"] - interval_seconds
+            block -= block % CANDLE_BLOCK_SECONDS
+            if block in fresh:
+                fresh[block].append(candle)
+        by_block.update(fresh)
+
+        if CACHE_ENABLED:
+            with _cache_lock:
+                for block, candles in fresh.items():
+                    _block_cache[(ticker, interval_seconds, block)] = (candles, now_ts)
+                while len(_block_cache) > _block_cache_max_size:
+                    _block_cache.popitem(last=False)
+
+    return [
+        candle
+        for block in blocks
+        for candle in by_block[block]
+        if first_period <= candle["period_ts"] - interval_seconds < end_ts
+    ]
 
 
 def derive_game_window(
@@ -49,14 +49,25 @@ async function getGameMetadata(gameId) {
     return fetchJSON(`/api/games/${gameId}/meta`);
 }
 
+/**
+ * Points worth sending for a series drawn across the chart: about one per device pixel.
+ * The server downsamples (shape-preserving) to this, so payloads follow screen width, not data density.
+ */
+function chartPointBudget() {
+    const chart = document.getElementById('chart');
+    const cssWidth = (chart && chart.clientWidth) || window.innerWidth || 1200;
+    return Math.max(200, Math.round(cssWidth * (window.devicePixelRatio || 1)));
+}
+
 async function getGameProbabilities(gameId) {
-    return fetchJSON(`/api/games/${gameId}/probs`);
+    return fetchJSON(`/api/games/${gameId}/probs?max_points=${chartPointBudget()}`);
 }
 
 async function getKalshiCandles(gameId, intervalSeconds, source = 'auto', ticker = null, startTs = null, endTs = null) {
     const params = new URLSearchParams({
         interval_seconds: intervalSeconds.toString(),
         source: source,
+        max_points: chartPointBudget().toString(),
     });
     if (ticker) {
         params.append('ticker', ticker);
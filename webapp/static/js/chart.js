@@ -83,7 +83,7 @@ async function updateCandlestickResolution(gameId, resolution) {
         // Get zoom window if available (for 1-second resolution)
         const zoomWindow = getZoomWindow();
         
-        let url = `/api/probabilities/${gameId}/kalshi-candles?interval_seconds=${resolution}&source=${source}`;
+        let url = `/api/probabilities/${gameId}/kalshi-candles?interval_seconds=${resolution}&source=${source}&max_points=${chartPointBudget()}`;
         if (zoomWindow && resolution === 1) {
             url += `&start_ts=${zoomWindow.start_ts}&end_ts=${zoomWindow.end_ts}`;
         }